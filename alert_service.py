@@ -33,6 +33,7 @@ Setup:
 import logging
 import os
 import smtplib
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
@@ -42,6 +43,7 @@ from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 
+from observability import get_metrics
 from timezone_utils import utc_now
 
 # Load environment variables
@@ -806,6 +808,10 @@ class AlertManager:
             86400  # 24 hours for same type on same truck
         )
 
+        # 🆕 v5.12.24: Outcome of this thread's last send_alert(), so the
+        # notification outbox can tell a deliberate skip from a failed send
+        self._outcome = threading.local()
+
     def _format_alert_message(self, alert: Alert) -> str:
         """Format alert for SMS/WhatsApp"""
         priority_emoji = {
@@ -905,12 +911,17 @@ class AlertManager:
 
         # Rate limiting
         if not self._should_send_alert(alert):
+            self._outcome.value = "rate_limited"
             return False
 
         # Update last alert time (both general and per-type)
-        self._last_alert_by_truck[alert.truck_id] = utc_now()
         # 🔧 v5.7.4: Track per alert type to prevent same-type spam
         type_key = f"{alert.truck_id}:{alert.alert_type.value}"
+        previous = (
+            self._last_alert_by_truck.get(alert.truck_id),
+            self._last_alert_by_type.get(type_key),
+        )
+        self._last_alert_by_truck[alert.truck_id] = utc_now()
         self._last_alert_by_type[type_key] = utc_now()
 
         # Default channels based on priority
@@ -926,29 +937,85 @@ class AlertManager:
             logger.info(
                 f"Alert logged (no channels): {alert.truck_id} - {alert.alert_type.value}"
             )
+            self._outcome.value = "sent"
             return True
 
         message = self._format_alert_message(alert)
         success = False
+        # 🆕 v5.12.19: delivery time / result per channel
+        metrics = get_metrics()
 
         if "sms" in channels:
-            results = self.twilio.broadcast_sms(message)
-            if any(results.values()):
+            with metrics.time("notification_seconds", {"channel": "sms"}):
+                results = self.twilio.broadcast_sms(message)
+            sent = any(results.values())
+            self._count_delivery(metrics, "sms", alert, sent)
+            if sent:
                 success = True
 
         if "whatsapp" in channels:
-            for number in self.twilio.config.to_numbers:
-                if self.twilio.send_whatsapp(number, message):
-                    success = True
+            with metrics.time("notification_seconds", {"channel": "whatsapp"}):
+                sent = False
+                for number in self.twilio.config.to_numbers:
+                    if self.twilio.send_whatsapp(number, message):
+                        sent = True
+            self._count_delivery(metrics, "whatsapp", alert, sent)
+            if sent:
+                success = True
 
         # 🆕 Email channel
         if "email" in channels:
-            subject, plain_body, html_body = self.email.format_alert_email(alert)
-            if self.email.send_email(subject, plain_body, html_body):
+            with metrics.time("notification_seconds", {"channel": "email"}):
+                subject, plain_body, html_body = self.email.format_alert_email(alert)
+                sent = self.email.send_email(subject, plain_body, html_body)
+            self._count_delivery(metrics, "email", alert, sent)
+            if sent:
                 success = True
 
+        attempted = (
+            ("sms" in channels or "whatsapp" in channels)
+            and self.twilio.config.is_configured()
+        ) or ("email" in channels and self.email.config.is_configured())
+        if success:
+            self._outcome.value = "sent"
+        elif attempted:
+            # 🆕 v5.12.24: Nothing went out - don't let this attempt rate-limit
+            # the retry
+            self._restore_last_alert(alert.truck_id, type_key, previous)
+            self._outcome.value = "failed"
+        else:
+            self._outcome.value = "not_configured"
+
         return success
 
+    def _restore_last_alert(self, truck_id: str, type_key: str, previous) -> None:
+        for stamps, key, value in (
+            (self._last_alert_by_truck, truck_id, previous[0]),
+            (self._last_alert_by_type, type_key, previous[1]),
+        ):
+            if value is None:
+                stamps.pop(key, None)
+            else:
+                stamps[key] = value
+
+    def last_send_outcome(self) -> Optional[str]:
+        """
+        🆕 v5.12.24: Why this thread's last send_alert() returned what it did:
+        'sent', 'rate_limited', 'not_configured' or 'failed' (None if never)
+        """
+        return getattr(self._outcome, "value", None)
+
+    @staticmethod
+    def _count_delivery(metrics, channel: str, alert: Alert, sent: bool) -> None:
+        metrics.inc(
+            "notifications_total",
+            labels={
+                "channel": channel,
+                "alert_type": alert.alert_type.value,
+                "result": "sent" if sent else "failed",
+            },
+        )
+
     # Convenience methods for common alerts
 
     def alert_theft_suspected(
@@ -2616,7 +2616,10 @@ async def get_fleet_utilization(
     ⚠️ NOTE: With limited data (~2 days), utilization is estimated based on current status
     """
     try:
-        from database_async import execute_query
+        import asyncio
+
+        from database_mysql import get_sqlalchemy_engine
+        from src.repositories.latest_state_repository import get_latest_states
 
         # Determine date range
         if period == "week":
@@ -2628,25 +2631,22 @@ async def get_fleet_utilization(
 
         # Get latest status per truck instead of summing all records
         # This avoids counting the same hours thousands of times
-        query = """
-        SELECT 
-            truck_id,
-            truck_status,
-            idle_gph,
-            engine_hours,
-            idle_hours_ecu,
-            COUNT(DISTINCT DATE(timestamp_utc)) as days_with_data
-        FROM fuel_metrics fm1
-        WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL %s DAY)
-        AND timestamp_utc = (
-            SELECT MAX(timestamp_utc) 
-            FROM fuel_metrics fm2 
-            WHERE fm2.truck_id = fm1.truck_id
+        # 🆕 v5.12.15: Read from fuel_metrics_latest off the event loop
+        trucks = await asyncio.to_thread(
+            get_latest_states,
+            get_sqlalchemy_engine(),
+            columns=[
+                "truck_id",
+                "truck_status",
+                "idle_gph",
+                "engine_hours",
+                "idle_hours_ecu",
+            ],
+            max_age_hours=days * 24,
         )
-        GROUP BY truck_id, truck_status, idle_gph, engine_hours, idle_hours_ecu
-        """
-
-        trucks = await execute_query(query, (days,))
+        for truck in trucks:
+            # One latest row per truck = one day with data
+            truck["days_with_data"] = 1
 
         truck_utilization = []
         total_active = 0
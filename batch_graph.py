@@ -0,0 +1,152 @@
+"""
+Batch Dependency Graph v5.12.22
+═══════════════════════════════════════════════════════════════════════════════
+
+Per-request dependency graph for the /batch endpoints. A batch asks for a
+set of sections (fleet, alerts, refuels, kpis, ...); several of them are
+built from the same intermediate data - the latest state of every truck,
+most of all - which each section used to fetch (and cache) on its own.
+
+Shared results are declared once on the graph and computed lazily, at most
+once per request, by whichever section asks for them first; every other
+section awaits the same task. Sections run concurrently with asyncio.gather,
+each under its own timeout, so one slow section reports an error instead of
+holding back the whole dashboard load. A section timing out never cancels a
+shared result another section is still waiting for.
+
+Usage:
+    graph = BatchGraph(section_timeout=10)
+    graph.shared("latest_states", lambda batch: async_db.get_latest_states())
+
+    async def fleet(batch):
+        return await async_db.get_fleet_summary(
+            latest=await batch.get("latest_states")
+        )
+
+    graph.section("fleet", fleet)
+    result = await graph.run(["fleet", "alerts"])
+    result.data, result.errors, result.timings
+
+Author: Fuel Copilot Team
+Version: 5.12.22
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds one batch section may take before it is reported as timed out
+BATCH_SECTION_TIMEOUT = float(os.getenv("BATCH_SECTION_TIMEOUT", "10"))
+
+BatchFunc = Callable[["BatchRun"], Awaitable[Any]]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch: section data, per-section errors and timings"""
+
+    data: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, Any] = field(default_factory=dict)
+
+
+class BatchRun:
+    """State of one request: the shared-result tasks and their timings"""
+
+    def __init__(self, graph: "BatchGraph") -> None:
+        self.graph = graph
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.shared_ms: Dict[str, float] = {}
+
+    async def _compute(self, name: str) -> Any:
+        started = time.perf_counter()
+        try:
+            return await self.graph._shared[name](self)
+        finally:
+            self.shared_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def get(self, name: str) -> Any:
+        """Shared result `name`, computed on first use and reused afterwards"""
+        if name not in self.graph._shared:
+            raise KeyError(f"Unknown shared result: {name}")
+        task = self._tasks.get(name)
+        if task is None:
+            task = asyncio.create_task(self._compute(name))
+            self._tasks[name] = task
+        # shield: a section timing out must not cancel it for the others
+        return await asyncio.shield(task)
+
+    def cancel_pending(self) -> None:
+        """Stop shared work nobody is waiting for any more"""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+
+
+class BatchGraph:
+    """Sections and the shared results they draw on, for one batch request"""
+
+    def __init__(self, section_timeout: Optional[float] = None) -> None:
+        self.section_timeout = section_timeout or BATCH_SECTION_TIMEOUT
+        self._shared: Dict[str, BatchFunc] = {}
+        self._sections: Dict[str, BatchFunc] = {}
+
+    def shared(self, name: str, func: BatchFunc) -> None:
+        """Declare an intermediate result; func(batch) may get() others"""
+        self._shared[name] = func
+
+    def section(self, name: str, func: BatchFunc) -> None:
+        """Declare a requestable section; func(batch) returns its data"""
+        self._sections[name] = func
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sections
+
+    async def _run_section(
+        self, batch: BatchRun, name: str, result: BatchResult
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            result.data[name] = await asyncio.wait_for(
+                self._sections[name](batch), timeout=self.section_timeout
+            )
+        except asyncio.TimeoutError:
+            result.errors[name] = f"Timed out after {self.section_timeout:g}s"
+            logger.warning(f"⚠️ Batch section {name} timed out")
+        except Exception as e:
+            result.errors[name] = f"{name.capitalize()} fetch error: {e}"
+        finally:
+            result.timings["sections"][name] = round(
+                (time.perf_counter() - started) * 1000, 1
+            )
+
+    async def run(self, names: Iterable[str]) -> BatchResult:
+        """Run the requested sections concurrently; unknown names are errors"""
+        started = time.perf_counter()
+        result = BatchResult(timings={"sections": {}})
+        batch = BatchRun(self)
+
+        requested = []
+        for name in names:
+            if name not in self._sections:
+                result.errors[name] = f"Unknown endpoint: {name}"
+            elif name not in requested:
+                requested.append(name)
+
+        try:
+            await asyncio.gather(
+                *(self._run_section(batch, name, result) for name in requested)
+            )
+        finally:
+            batch.cancel_pending()
+
+        # Sections finish in any order; report them in the order requested
+        result.data = {n: result.data[n] for n in requested if n in result.data}
+        result.timings["shared"] = dict(batch.shared_ms)
+        result.timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
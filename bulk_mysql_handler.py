@@ -16,10 +16,10 @@ import logging
 from typing import Dict, List
 from threading import Lock
 from contextlib import contextmanager
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
+from connection_manager import get_connection_manager
 from timezone_utils import utc_now
 from datetime import datetime  # For isinstance check only
 
@@ -43,14 +43,14 @@ def get_local_db_config() -> Dict[str, any]:
 
 
 def get_local_engine():
-    """Create SQLAlchemy engine for Local MySQL"""
-    config = get_local_db_config()
-    connection_string = (
-        f"mysql+pymysql://{config['user']}:{config['password']}"
-        f"@{config['host']}:{config['port']}/{config['database']}"
-        f"?charset=utf8mb4"
-    )
-    return create_engine(connection_string, pool_pre_ping=True)
+    """
+    SQLAlchemy engine for Local MySQL.
+
+    🆕 v5.12.16: Shared connection_manager engine (was a new engine - and
+    pool - per call)
+    """
+    manager = get_connection_manager()
+    return manager.engine(manager.pool_for(get_local_db_config()))
 
 
 def get_local_session():
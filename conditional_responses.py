@@ -0,0 +1,307 @@
+"""
+Conditional Responses v5.12.23
+═══════════════════════════════════════════════════════════════════════════════
+
+ETag / If-None-Match for the endpoints the dashboard polls every few seconds
+(/fleet, /kpis, /alerts, /v2/command-center). Their data only changes when
+the sync cycle writes new rows (every ~30s), yet every poll used to rebuild,
+re-serialize, re-gzip and re-send the full payload.
+
+The ETag of a response is derived from (path, query string, data version).
+The data version is read from sync_cycle_state - the per-source versions
+the sync process publishes at the end of every cycle - so computing it never
+touches the database:
+
+- If-None-Match matches        -> 304, no handler, no DB, no body
+- body cached for this version -> cached bytes (already gzipped), no handler
+- otherwise                    -> handler runs once; its body is compressed
+                                  once and cached for the version
+
+Bodies are gzipped here (GZipMiddleware leaves responses that already carry
+Content-Encoding alone) so the compressed bytes are reused as well. Small
+bodies are compressed too: behind the rate limiter (a BaseHTTPMiddleware,
+which streams every body) GZipMiddleware compressed them anyway. The ETag
+is weak (W/) and shared by the gzip and identity variants; responses carry
+Vary: Accept-Encoding.
+
+Without a sync process (no marker yet, cycle 0) there is no way to know when
+the data changes, and requests pass through untouched. Fields derived from
+the wall clock (offline detection, ages) are covered by also rolling the
+ETag every CONDITIONAL_MAX_AGE seconds (default 300). A body built from an
+endpoint cache entry that predates the newest cycle is replaced on the next
+version, i.e. it lags by at most one cycle.
+
+Usage:
+    app.add_middleware(
+        ConditionalResponseMiddleware,
+        routes={
+            "/fuelAnalytics/api/fleet": ("fuel_metrics", "dtc_events"),
+            "/fuelAnalytics/api/v2/command-center": None,  # any source
+        },
+    )
+
+    get_conditional_cache().get_stats()
+
+Author: Fuel Copilot Team
+Version: 5.12.23
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Seconds after which an ETag rolls even without a new sync cycle
+CONDITIONAL_MAX_AGE = int(os.getenv("CONDITIONAL_MAX_AGE", "300"))
+# Cached bodies (one per endpoint, params, version and encoding)
+CONDITIONAL_CACHE_ENTRIES = int(os.getenv("CONDITIONAL_CACHE_ENTRIES", "64"))
+
+# Headers of the handler's response that are replaced, not replayed
+_VARIANT_HEADERS = {b"content-length", b"content-encoding", b"etag", b"vary"}
+
+
+@dataclass
+class CachedBody:
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+class ConditionalCache:
+    """LRU of encoded response bodies keyed by (ETag, encoding), plus stats"""
+
+    def __init__(self, max_entries: int = CONDITIONAL_CACHE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._bodies: "OrderedDict[Tuple[str, str], CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "not_modified": 0,
+            "body_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "bytes_saved": 0,
+        }
+
+    def get(self, etag: str, encoding: str) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._bodies.get((etag, encoding))
+            if entry is not None:
+                self._bodies.move_to_end((etag, encoding))
+            return entry
+
+    def set(self, etag: str, encoding: str, entry: CachedBody) -> None:
+        with self._lock:
+            self._bodies[(etag, encoding)] = entry
+            self._bodies.move_to_end((etag, encoding))
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+
+    def count(self, stat: str, saved_bytes: int = 0) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+            self._stats["bytes_saved"] += saved_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            served = sum(
+                self._stats[k] for k in ("not_modified", "body_hits", "misses")
+            )
+            hits = self._stats["not_modified"] + self._stats["body_hits"]
+            return {
+                **self._stats,
+                "entries": len(self._bodies),
+                "hit_rate": round(hits / served * 100, 1) if served else 0.0,
+            }
+
+
+def _sync_versions() -> Optional[Tuple[int, Dict[str, int]]]:
+    """(cycle, per-source versions), or None before the first sync cycle"""
+    try:
+        from sync_cycle_state import get_sync_cycle_state
+
+        state = get_sync_cycle_state()
+        cycle = state.cycle
+        if not cycle:
+            return None
+        return cycle, state.versions()
+    except Exception as e:
+        logger.debug(f"Sync cycle versions unavailable: {e}")
+        return None
+
+
+def compute_etag(
+    path: str,
+    query_string: bytes,
+    sources: Optional[Sequence[str]],
+    now: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Weak ETag for (path, params, data version); None when no version is known.
+
+    sources: sync sources the endpoint reads; None means any source (the
+    cycle number itself)
+    """
+    versions = _sync_versions()
+    if versions is None:
+        return None
+    cycle, by_source = versions
+    if sources is None:
+        version = str(cycle)
+    else:
+        version = ",".join(f"{s}={by_source.get(s, 0)}" for s in sources)
+    epoch = int((now if now is not None else time.time()) // CONDITIONAL_MAX_AGE)
+    params = "&".join(sorted(query_string.decode("latin-1").split("&")))
+    digest = hashlib.blake2b(
+        f"{path}?{params}|{version}|{epoch}".encode(), digest_size=10
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class ConditionalResponseMiddleware:
+    """Pure ASGI middleware: 304s and cached bodies for the configured routes"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Dict[str, Optional[Sequence[str]]],
+        cache: Optional[ConditionalCache] = None,
+    ) -> None:
+        self.app = app
+        self.routes = {path.rstrip("/"): sources for path, sources in routes.items()}
+        self.cache = cache or get_conditional_cache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "").rstrip("/")
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or path not in self.routes
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        etag = compute_etag(path, scope.get("query_string", b""), self.routes[path])
+        if etag is None:
+            self.cache.count("bypassed")
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = "gzip" if "gzip" in headers.get("accept-encoding", "") else ""
+        cached = self.cache.get(etag, encoding)
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            self.cache.count("not_modified", len(cached.body) if cached else 0)
+            await self._send(send, 304, self._validators(etag), b"")
+            return
+
+        if cached is not None:
+            self.cache.count("body_hits")
+            await self._send(send, 200, cached.headers, cached.body)
+            return
+
+        self.cache.count("misses")
+        await self._respond(scope, receive, send, etag, encoding)
+
+    @staticmethod
+    def _validators(etag: str) -> List[Tuple[bytes, bytes]]:
+        return [
+            (b"etag", etag.encode()),
+            (b"cache-control", b"no-cache"),
+            (b"vary", b"Accept-Encoding"),
+        ]
+
+    @staticmethod
+    async def _send(
+        send: Send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes
+    ) -> None:
+        if status != 304:
+            headers = headers + [(b"content-length", str(len(body)).encode())]
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _respond(
+        self, scope: Scope, receive: Receive, send: Send, etag: str, encoding: str
+    ) -> None:
+        """Run the handler, buffer a 200 body, encode and cache it once"""
+        start: Optional[Message] = None
+        passthrough = False
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                # Errors and pre-encoded bodies go out as they are
+                passthrough = message["status"] != 200 or (
+                    "content-encoding" in Headers(raw=message["headers"])
+                )
+                if passthrough:
+                    await send(message)
+            elif passthrough:
+                await send(message)
+            else:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await self._finish(send, start, b"".join(chunks), etag, encoding)
+
+        await self.app(scope, receive, capture)
+
+    async def _finish(
+        self, send: Send, start: Message, body: bytes, etag: str, encoding: str
+    ) -> None:
+        headers = [
+            (k, v) for k, v in start["headers"] if k.lower() not in _VARIANT_HEADERS
+        ]
+        if encoding == "gzip":
+            body = gzip.compress(body, compresslevel=9)
+            headers.append((b"content-encoding", b"gzip"))
+        headers.extend(self._validators(etag))
+
+        self.cache.set(etag, encoding, CachedBody(headers, body))
+        await self._send(send, 200, headers, body)
+
+
+# Global instance
+_conditional_cache: Optional[ConditionalCache] = None
+_conditional_cache_lock = threading.Lock()
+
+
+def get_conditional_cache() -> ConditionalCache:
+    """Get or create the global conditional response cache"""
+    global _conditional_cache
+    if _conditional_cache is None:
+        with _conditional_cache_lock:
+            if _conditional_cache is None:
+                _conditional_cache = ConditionalCache()
+    return _conditional_cache
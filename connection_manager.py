@@ -0,0 +1,733 @@
+"""
+Connection Manager v5.12.18
+═══════════════════════════════════════════════════════════════════════════════
+
+One place that owns every MySQL connection the backend uses.
+
+Routers and repositories used to call pymysql.connect() per request (paying
+TCP + auth + SET NAMES on every call), while database_mysql, database_pool,
+database_async, db_connection and bulk_mysql_handler each kept a private
+pool with its own sizing. All of them now check connections out of named
+pools held here:
+
+    "local"   fuel_copilot     (settings.DATABASE)
+    "wialon"  wialon_collect   (settings.WIALON_DB)
+
+Each named pool provides:
+    - connection() / checkout(): pooled pymysql connections (DictCursor);
+      conn.close() returns the connection to the pool
+    - engine(): SQLAlchemy Engine for text()/pandas callers
+    - async_connection(): aiomysql connections (created on first use)
+
+Health checks / instrumentation:
+    - Connections idle for more than PING_AFTER_IDLE_SECONDS are pinged on
+      checkout; dead ones are replaced before the caller sees them
+    - Checkout latency and wait histograms per pool and driver (a checkout
+      "waits" when no idle connection was available and it had to connect
+      or block for one)
+    - Leak detection: every checkout records its caller; check_leaks() reports
+      connections held longer than `leak_threshold_seconds`
+    - 🆕 v5.12.18: every connection is wrapped by query_profiler, so each
+      statement's fingerprint, caller, rows and wall time are aggregated
+
+Usage:
+    from connection_manager import get_connection_manager
+
+    with get_connection_manager().connection("local") as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT ...")
+
+    engine = get_connection_manager().engine("wialon")
+
+    async with get_connection_manager().async_connection() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute("SELECT ...")
+
+Author: Fuel Copilot Team
+Version: 5.12.18
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pymysql
+import sqlalchemy
+from pymysql.cursors import DictCursor
+from sqlalchemy import create_engine, event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from query_profiler import CallerResolver, instrument_aiomysql, instrument_pymysql
+
+try:
+    import aiomysql
+
+    AIOMYSQL_AVAILABLE = True
+except ImportError:
+    AIOMYSQL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+LOCAL = "local"
+WIALON = "wialon"
+
+# Seconds; sub-millisecond buckets because a warm checkout should cost ~nothing
+CHECKOUT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Connections idle for less than this are handed out without a ping
+PING_AFTER_IDLE_SECONDS = 10.0
+
+HELD_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection parameters and sizing for one named pool"""
+
+    host: str
+    port: int
+    user: str
+    password: str
+    database: str
+    charset: str = "utf8mb4"
+    pool_size: int = 10
+    max_overflow: int = 5
+    pool_recycle: int = 3600
+    pool_timeout: int = 30
+    async_pool_min_size: int = 1
+    async_pool_max_size: int = 10
+    leak_threshold_seconds: float = 60.0
+    connect_timeout: int = 10
+
+    @classmethod
+    def from_settings(cls, db_settings) -> "PoolConfig":
+        """Build from settings.DatabaseSettings / settings.WialonDatabaseSettings"""
+        return cls(
+            host=db_settings.host,
+            port=db_settings.port,
+            user=db_settings.user,
+            password=db_settings.password,
+            database=db_settings.database,
+            charset=db_settings.charset,
+            pool_size=db_settings.pool_size,
+            max_overflow=db_settings.max_overflow,
+            pool_recycle=db_settings.pool_recycle,
+            pool_timeout=db_settings.pool_timeout,
+            async_pool_min_size=db_settings.async_pool_min_size,
+            async_pool_max_size=db_settings.async_pool_max_size,
+            leak_threshold_seconds=db_settings.leak_threshold_seconds,
+        )
+
+    @property
+    def identity(self) -> Tuple[str, int, str, str]:
+        return (self.host, int(self.port), self.user, self.database)
+
+    def pymysql_kwargs(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "port": int(self.port),
+            "user": self.user,
+            "password": self.password,
+            "database": self.database,
+            "charset": self.charset,
+            "connect_timeout": self.connect_timeout,
+            "autocommit": True,
+            "cursorclass": DictCursor,
+            # TLS when the server offers it (Azure), plain otherwise
+            "ssl": {"ca": None, "check_hostname": False},
+        }
+
+    def sqlalchemy_url(self) -> str:
+        return (
+            f"mysql+pymysql://{self.user}:{self.password}@"
+            f"{self.host}:{self.port}/{self.database}?charset={self.charset}"
+        )
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds (not thread-safe)"""
+
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets: Tuple[float, ...] = CHECKOUT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max for overflow)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = []
+        running = 0
+        for n in self.counts[:-1]:
+            running += n
+            cumulative.append(running)
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "buckets": dict(zip(self.buckets, cumulative)),
+        }
+
+
+# Frames from these files are skipped when recording who checked a connection out
+_caller = CallerResolver(
+    __file__,
+    contextlib.__file__,
+    os.path.dirname(sqlalchemy.__file__),
+)
+
+
+class _InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout latency to its NamedPool"""
+
+    owner: Optional["NamedPool"] = None
+    driver: str = "pymysql"
+
+    def _do_get(self):
+        owner = self.owner
+        if owner is None:
+            return super()._do_get()
+        waited = self.checkedin() == 0
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except sa_exc.TimeoutError:
+            owner._record_timeout(self.driver)
+            raise
+        owner._record_checkout(self.driver, time.perf_counter() - start, waited)
+        return record
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.owner = self.owner
+        pool.driver = self.driver
+        return pool
+
+
+class NamedPool:
+    """pymysql, SQLAlchemy and aiomysql pools for one database"""
+
+    DRIVERS = ("pymysql", "sqlalchemy", "aiomysql")
+
+    def __init__(self, name: str, config: PoolConfig):
+        self.name = name
+        self.config = config
+        self._lock = threading.Lock()
+        self._checkout_hist = {d: LatencyHistogram() for d in self.DRIVERS}
+        self._wait_hist = {d: LatencyHistogram() for d in self.DRIVERS}
+        self._held_hist = {d: LatencyHistogram(HELD_BUCKETS) for d in self.DRIVERS}
+        self._counters = {
+            d: {"checkouts": 0, "waits": 0, "timeouts": 0} for d in self.DRIVERS
+        }
+        self._stale_replaced = 0
+        self._leaks_reported = 0
+        # id(connection record) -> (driver, checkout monotonic time, caller)
+        self._held: Dict[int, Tuple[str, float, str]] = {}
+        self._reported: set = set()
+
+        self._raw_pool = self._build_raw_pool()
+        self._engine: Optional[Engine] = None
+        self._async_pool = None
+        self._async_loop = None
+
+    # ------------------------------------------------------------------
+    # Pool construction
+    # ------------------------------------------------------------------
+
+    def _build_raw_pool(self) -> QueuePool:
+        kwargs = self.config.pymysql_kwargs()
+        pool = _InstrumentedQueuePool(
+            lambda: pymysql.connect(**kwargs),
+            pool_size=self.config.pool_size,
+            max_overflow=self.config.max_overflow,
+            timeout=self.config.pool_timeout,
+            recycle=self.config.pool_recycle,
+            use_lifo=True,
+        )
+        pool.owner = self
+        pool.driver = "pymysql"
+        # Ping first: a failed ping raises DisconnectionError and the pool
+        # retries with a fresh connection, so the leak hook never sees it
+        event.listen(pool, "checkout", self._ping_on_checkout)
+        self._track(pool, "pymysql")
+        return pool
+
+    def _track(self, pool, driver: str) -> None:
+        event.listen(pool, "connect", self._profile_connection)
+        event.listen(pool, "checkout", self._checkout_hook(driver))
+        event.listen(pool, "checkin", self._on_checkin)
+
+    def _profile_connection(self, dbapi_connection, connection_record) -> None:
+        # 🆕 v5.12.18: per-statement timings for every cursor on this connection
+        instrument_pymysql(dbapi_connection, self.name, explain=self._raw_pool.connect)
+
+    def _ping_on_checkout(self, dbapi_connection, connection_record, proxy) -> None:
+        # Fresh or recently used connections are known good; only ping the
+        # ones that sat idle long enough for MySQL/the network to drop them
+        checked_in = connection_record.info.get("checked_in_at")
+        if (
+            checked_in is None
+            or time.monotonic() - checked_in < PING_AFTER_IDLE_SECONDS
+        ):
+            return
+        try:
+            dbapi_connection.ping(reconnect=False)
+        except Exception:
+            with self._lock:
+                self._stale_replaced += 1
+            raise sa_exc.DisconnectionError()
+
+    def _checkout_hook(self, driver: str) -> Callable:
+        def on_checkout(dbapi_connection, connection_record, proxy) -> None:
+            self._hold(id(connection_record), driver)
+
+        return on_checkout
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+        self._release(id(connection_record))
+
+    @property
+    def engine(self) -> Engine:
+        """SQLAlchemy Engine sharing this pool's sizing and instrumentation"""
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    engine = create_engine(
+                        self.config.sqlalchemy_url(),
+                        poolclass=_InstrumentedQueuePool,
+                        pool_size=self.config.pool_size,
+                        max_overflow=self.config.max_overflow,
+                        pool_timeout=self.config.pool_timeout,
+                        pool_recycle=self.config.pool_recycle,
+                        pool_pre_ping=True,
+                        pool_use_lifo=True,
+                        connect_args={"connect_timeout": self.config.connect_timeout},
+                    )
+                    engine.pool.owner = self
+                    engine.pool.driver = "sqlalchemy"
+                    self._track(engine.pool, "sqlalchemy")
+                    self._engine = engine
+        return self._engine
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+
+    def _record_checkout(self, driver: str, seconds: float, waited: bool) -> None:
+        with self._lock:
+            counters = self._counters[driver]
+            counters["checkouts"] += 1
+            self._checkout_hist[driver].observe(seconds)
+            if waited:
+                counters["waits"] += 1
+                self._wait_hist[driver].observe(seconds)
+
+    def _record_timeout(self, driver: str) -> None:
+        with self._lock:
+            self._counters[driver]["timeouts"] += 1
+
+    def _hold(self, key: int, driver: str) -> None:
+        caller = _caller()
+        with self._lock:
+            self._held[key] = (driver, time.monotonic(), caller)
+
+    def _release(self, key: int) -> None:
+        with self._lock:
+            held = self._held.pop(key, None)
+            self._reported.discard(key)
+            if held is not None:
+                driver, started, _ = held
+                self._held_hist[driver].observe(time.monotonic() - started)
+
+    def leaks(self, threshold_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Connections checked out for longer than the threshold"""
+        threshold = (
+            self.config.leak_threshold_seconds
+            if threshold_seconds is None
+            else threshold_seconds
+        )
+        now = time.monotonic()
+        with self._lock:
+            held = list(self._held.items())
+        return sorted(
+            (
+                {
+                    "driver": driver,
+                    "held_seconds": round(now - started, 1),
+                    "caller": caller,
+                }
+                for _, (driver, started, caller) in held
+                if now - started > threshold
+            ),
+            key=lambda leak: -leak["held_seconds"],
+        )
+
+    def check_leaks(self) -> List[Dict[str, Any]]:
+        """Log newly detected leaks (once per checkout) and return all current ones"""
+        threshold = self.config.leak_threshold_seconds
+        now = time.monotonic()
+        fresh = []
+        with self._lock:
+            for key, (driver, started, caller) in self._held.items():
+                if now - started > threshold and key not in self._reported:
+                    self._reported.add(key)
+                    fresh.append((driver, now - started, caller))
+            self._leaks_reported += len(fresh)
+        for driver, held_for, caller in fresh:
+            logger.warning(
+                f"🔌 [{self.name}] {driver} connection held {held_for:.0f}s "
+                f"(checked out at {caller}) - possible leak"
+            )
+        return self.leaks(threshold)
+
+    def stats(self) -> Dict[str, Any]:
+        raw = self._raw_pool
+        with self._lock:
+            drivers = {
+                driver: {
+                    **self._counters[driver],
+                    "checkout": self._checkout_hist[driver].snapshot(),
+                    "wait": self._wait_hist[driver].snapshot(),
+                    "held": self._held_hist[driver].snapshot(),
+                }
+                for driver in self.DRIVERS
+            }
+            stats = {
+                "database": self.config.database,
+                "host": self.config.host,
+                "pool_size": self.config.pool_size,
+                "max_overflow": self.config.max_overflow,
+                "checked_out": len(self._held),
+                "stale_replaced": self._stale_replaced,
+                "leaks_reported": self._leaks_reported,
+            }
+        stats["pymysql_pool"] = {
+            "idle": raw.checkedin(),
+            "in_use": raw.checkedout(),
+            "overflow": max(raw.overflow(), 0),
+        }
+        if self._engine is not None:
+            pool = self._engine.pool
+            stats["sqlalchemy_pool"] = {
+                "idle": pool.checkedin(),
+                "in_use": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        if self._async_pool is not None:
+            stats["aiomysql_pool"] = {
+                "idle": self._async_pool.freesize,
+                "in_use": self._async_pool.size - self._async_pool.freesize,
+                "maxsize": self._async_pool.maxsize,
+            }
+        stats["drivers"] = drivers
+        return stats
+
+    # ------------------------------------------------------------------
+    # Checkout
+    # ------------------------------------------------------------------
+
+    def checkout(self):
+        """Pooled pymysql connection; close() hands it back to the pool"""
+        return self._raw_pool.connect()
+
+    def warm(self, connections: Optional[int] = None) -> int:
+        """Open connections up front so the first requests don't pay for them"""
+        wanted = min(connections or self.config.pool_size, self.config.pool_size)
+        opened = []
+        try:
+            for _ in range(max(wanted - self._raw_pool.checkedin(), 0)):
+                opened.append(self._raw_pool.connect())
+        finally:
+            for conn in opened:
+                conn.close()
+        return self._raw_pool.checkedin()
+
+    async def async_pool(self):
+        """aiomysql pool bound to the running event loop"""
+        if not AIOMYSQL_AVAILABLE:
+            raise RuntimeError("aiomysql is not installed - async pools unavailable")
+        loop = asyncio.get_running_loop()
+        if self._async_pool is None or self._async_loop is not loop:
+            cfg = self.config
+            self._async_pool = await aiomysql.create_pool(
+                host=cfg.host,
+                port=int(cfg.port),
+                user=cfg.user,
+                password=cfg.password,
+                db=cfg.database,
+                charset=cfg.charset,
+                autocommit=True,
+                connect_timeout=cfg.connect_timeout,
+                minsize=cfg.async_pool_min_size,
+                maxsize=cfg.async_pool_max_size,
+                pool_recycle=cfg.pool_recycle,
+            )
+            self._async_loop = loop
+            logger.info(
+                f"🔌 [{self.name}] aiomysql pool ready "
+                f"({cfg.async_pool_min_size}-{cfg.async_pool_max_size})"
+            )
+        return self._async_pool
+
+    @asynccontextmanager
+    async def async_connection(self):
+        pool = await self.async_pool()
+        waited = pool.freesize == 0
+        start = time.perf_counter()
+        try:
+            conn = await asyncio.wait_for(
+                pool.acquire(), timeout=self.config.pool_timeout
+            )
+        except asyncio.TimeoutError:
+            self._record_timeout("aiomysql")
+            raise
+        try:
+            await conn.ping(reconnect=True)
+        except Exception:
+            with self._lock:
+                self._stale_replaced += 1
+            await pool.release(conn)
+            raise
+        self._record_checkout("aiomysql", time.perf_counter() - start, waited)
+        instrument_aiomysql(conn, self.name, explain=self._raw_pool.connect)
+        key = id(conn)
+        self._hold(key, "aiomysql")
+        try:
+            yield conn
+        finally:
+            self._release(key)
+            await pool.release(conn)
+
+    # ------------------------------------------------------------------
+    # Health / shutdown
+    # ------------------------------------------------------------------
+
+    def health_check(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            conn = self.checkout()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            finally:
+                conn.close()
+        except Exception as e:
+            return {"status": "unhealthy", "message": str(e)}
+        return {
+            "status": "healthy",
+            "message": "Connected",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            "leaks": len(self.check_leaks()),
+        }
+
+    async def close_async(self) -> None:
+        """Close only the aiomysql pool (sync pools stay up)"""
+        if self._async_pool is not None:
+            self._async_pool.close()
+            await self._async_pool.wait_closed()
+            self._async_pool = None
+            self._async_loop = None
+
+    def dispose(self) -> None:
+        self._raw_pool.dispose()
+        if self._engine is not None:
+            self._engine.dispose()
+        if self._async_pool is not None:
+            self._async_pool.close()
+            self._async_pool = None
+            self._async_loop = None
+
+    async def aclose(self) -> None:
+        await self.close_async()
+        self.dispose()
+
+
+def _default_configs() -> Dict[str, PoolConfig]:
+    from settings import settings
+
+    return {
+        LOCAL: PoolConfig.from_settings(settings.database),
+        WIALON: PoolConfig.from_settings(settings.wialon_db),
+    }
+
+
+class ConnectionManager:
+    """Registry of NamedPools (created on first use)"""
+
+    def __init__(self, configs: Optional[Dict[str, PoolConfig]] = None):
+        self._configs: Dict[str, PoolConfig] = (
+            dict(configs) if configs is not None else _default_configs()
+        )
+        self._pools: Dict[str, NamedPool] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, config: PoolConfig) -> None:
+        """Add (or replace, before first use) a named pool"""
+        with self._lock:
+            if name in self._pools:
+                raise ValueError(f"Pool {name!r} is already in use")
+            self._configs[name] = config
+
+    def pool_for(self, db_config: Dict[str, Any]) -> str:
+        """
+        Name of the pool serving a pymysql-style config dict.
+
+        Repositories still receive a db_config; configs pointing at a known
+        database map onto its pool, anything else gets its own pool sized
+        like "local".
+        """
+        identity = (
+            db_config.get("host"),
+            int(db_config.get("port", 3306)),
+            db_config.get("user"),
+            db_config.get("database") or db_config.get("db"),
+        )
+        with self._lock:
+            for name, config in self._configs.items():
+                if config.identity == identity:
+                    return name
+            name = f"{identity[3]}@{identity[0]}:{identity[1]}"
+            if name not in self._configs:
+                base = self._configs.get(LOCAL) or next(iter(self._configs.values()))
+                self._configs[name] = replace(
+                    base,
+                    host=identity[0],
+                    port=identity[1],
+                    user=identity[2],
+                    password=db_config.get("password", ""),
+                    database=identity[3],
+                )
+            return name
+
+    def pool(self, name: str = LOCAL) -> NamedPool:
+        pool = self._pools.get(name)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(name)
+                if pool is None:
+                    if name not in self._configs:
+                        raise KeyError(f"Unknown connection pool: {name!r}")
+                    pool = NamedPool(name, self._configs[name])
+                    self._pools[name] = pool
+                    cfg = pool.config
+                    logger.info(
+                        f"🔌 [{name}] pool created for {cfg.database}@{cfg.host} "
+                        f"(size={cfg.pool_size}, overflow={cfg.max_overflow})"
+                    )
+        return pool
+
+    def checkout(self, name: str = LOCAL):
+        """Pooled pymysql connection (DictCursor); close() returns it"""
+        return self.pool(name).checkout()
+
+    @contextmanager
+    def connection(self, name: str = LOCAL) -> Iterator[Any]:
+        conn = self.checkout(name)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def engine(self, name: str = LOCAL) -> Engine:
+        return self.pool(name).engine
+
+    def async_connection(self, name: str = LOCAL):
+        return self.pool(name).async_connection()
+
+    async def async_pool(self, name: str = LOCAL):
+        return await self.pool(name).async_pool()
+
+    def warm(self, *names: str, connections: Optional[int] = None) -> Dict[str, Any]:
+        """Pre-open connections; failures are logged, never raised"""
+        result = {}
+        for name in names or (LOCAL,):
+            try:
+                result[name] = self.pool(name).warm(connections)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not warm pool {name!r}: {e}")
+                result[name] = str(e)
+        return result
+
+    def health_check(self, *names: str) -> Dict[str, Dict[str, Any]]:
+        return {name: self.pool(name).health_check() for name in names or self._configs}
+
+    def check_leaks(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {name: pool.check_leaks() for name, pool in list(self._pools.items())}
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: pool.stats() for name, pool in list(self._pools.items())}
+
+    def dispose(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.dispose()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.aclose()
+
+
+_connection_manager: Optional[ConnectionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_connection_manager() -> ConnectionManager:
+    """Process-wide ConnectionManager"""
+    global _connection_manager
+    if _connection_manager is None:
+        with _manager_lock:
+            if _connection_manager is None:
+                _connection_manager = ConnectionManager()
+    return _connection_manager
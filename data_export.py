@@ -23,6 +23,64 @@ logger = logging.getLogger(__name__)
 
 # Centralized database connection
 from db_connection import get_pymysql_connection as get_db_connection
+from partition_manager import reaches_archive, read_archived, with_archived
+
+METRICS_EXPORT_COLUMNS = (
+    "timestamp_utc",
+    "truck_id",
+    "carrier_id",
+    "sensor_pct",
+    "estimated_pct",
+    "fuel_gallons",
+    "mpg_current",
+    "speed_mph",
+    "mileage_delta",
+    "consumption_gph",
+    "truck_status",
+    "idle_duration_minutes",
+    "latitude",
+    "longitude",
+)
+SUMMARY_SOURCE_COLUMNS = (
+    "timestamp_utc",
+    "truck_id",
+    "carrier_id",
+    "estimated_pct",
+    "mpg_current",
+    "mileage_delta",
+    "consumption_gph",
+    "idle_duration_minutes",
+)
+
+# Per-truck partial aggregates that can be merged across hot and archived rows
+SUMMARY_PARTIALS_SQL = """
+    truck_id,
+    carrier_id,
+    COUNT(*) as data_points,
+    MIN(timestamp_utc) as first_reading,
+    MAX(timestamp_utc) as last_reading,
+    SUM(estimated_pct) as fuel_pct_sum,
+    COUNT(estimated_pct) as fuel_pct_count,
+    SUM(mpg_current) as mpg_sum,
+    COUNT(mpg_current) as mpg_count,
+    SUM(mileage_delta) as total_miles,
+    SUM(consumption_gph * 0.5) as total_gallons,
+    SUM(idle_duration_minutes) as total_idle_minutes
+"""
+SUMMARY_PARTIAL_COLUMNS = [
+    "truck_id",
+    "carrier_id",
+    "data_points",
+    "first_reading",
+    "last_reading",
+    "fuel_pct_sum",
+    "fuel_pct_count",
+    "mpg_sum",
+    "mpg_count",
+    "total_miles",
+    "total_gallons",
+    "total_idle_minutes",
+]
 
 
 # =============================================================================
@@ -146,7 +204,32 @@ class DataExporter:
                     ORDER BY truck_id
                 """
 
-                df = pd.read_sql(query, conn, params=params)
+                # 🆕 v5.12.17: Ranges reaching archived partitions: MySQL
+                # aggregates the hot rows, pandas the archived ones, and the
+                # per-truck partials are merged
+                if reaches_archive(params[0]):
+                    hot = pd.read_sql(
+                        f"""
+                        SELECT {SUMMARY_PARTIALS_SQL}
+                        FROM fuel_metrics
+                        WHERE {where_sql}
+                        GROUP BY truck_id, carrier_id
+                        """,
+                        conn,
+                        params=params,
+                    )
+                    archived = self._summary_partials(
+                        read_archived(
+                            params[0],
+                            params[1],
+                            SUMMARY_SOURCE_COLUMNS,
+                            truck_ids=config.truck_ids or None,
+                            carrier_id=config.carrier_id,
+                        )
+                    )
+                    df = self._combine_summary_partials([hot, archived])
+                else:
+                    df = pd.read_sql(query, conn, params=params)
 
                 # Calculate additional metrics
                 if not df.empty:
@@ -185,34 +268,116 @@ class DataExporter:
 
                 where_sql = " AND ".join(where_clauses)
 
-                query = f"""
-                    SELECT 
-                        timestamp_utc,
-                        truck_id,
-                        carrier_id,
-                        sensor_pct,
-                        estimated_pct,
-                        fuel_gallons,
-                        mpg_current,
-                        speed_mph,
-                        mileage_delta,
-                        consumption_gph,
-                        truck_status,
-                        idle_duration_minutes,
-                        latitude,
-                        longitude
-                    FROM fuel_metrics
-                    WHERE {where_sql}
-                    ORDER BY timestamp_utc DESC
-                    LIMIT 50000
-                """
-
-                return pd.read_sql(query, conn, params=params)
+                return self._fetch_metrics(
+                    conn, config, params, where_sql, METRICS_EXPORT_COLUMNS
+                )
 
         except Exception as e:
             logger.error(f"Error getting metrics data: {e}")
             return pd.DataFrame()
 
+    def _fetch_metrics(self, conn, config, params, where_sql, columns, limit=50000):
+        """
+        fuel_metrics rows for the export range, newest first
+
+        🆕 v5.12.17: Rows of archived partitions are read from Parquet
+        """
+        import pandas as pd
+
+        query = f"""
+            SELECT {", ".join(columns)}
+            FROM fuel_metrics
+            WHERE {where_sql}
+            ORDER BY timestamp_utc DESC
+        """
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        df = pd.read_sql(query, conn, params=params)
+        return with_archived(
+            df,
+            params[0],
+            params[1],
+            columns,
+            truck_ids=config.truck_ids or None,
+            carrier_id=config.carrier_id,
+            descending=True,
+            limit=limit,
+        )
+
+    @staticmethod
+    def _summary_partials(df):
+        """Per-truck SUMMARY_PARTIALS_SQL columns computed over raw rows"""
+        import pandas as pd
+
+        if df.empty:
+            return pd.DataFrame(columns=SUMMARY_PARTIAL_COLUMNS)
+        df = df.assign(gallons=pd.to_numeric(df["consumption_gph"]) * 0.5)
+        grouped = df.groupby(["truck_id", "carrier_id"], dropna=False)
+        partials = grouped.agg(
+            data_points=("timestamp_utc", "size"),
+            first_reading=("timestamp_utc", "min"),
+            last_reading=("timestamp_utc", "max"),
+            fuel_pct_sum=("estimated_pct", lambda s: s.sum(min_count=1)),
+            fuel_pct_count=("estimated_pct", "count"),
+            mpg_sum=("mpg_current", lambda s: s.sum(min_count=1)),
+            mpg_count=("mpg_current", "count"),
+            total_miles=("mileage_delta", lambda s: s.sum(min_count=1)),
+            total_gallons=("gallons", lambda s: s.sum(min_count=1)),
+            total_idle_minutes=("idle_duration_minutes", lambda s: s.sum(min_count=1)),
+        )
+        return partials.reset_index()
+
+    @staticmethod
+    def _combine_summary_partials(frames):
+        """Merge per-truck partials into the summary columns of the SQL aggregate"""
+        import pandas as pd
+
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
+        for column in ("first_reading", "last_reading"):
+            df[column] = pd.to_datetime(df[column])
+        numeric = [c for c in SUMMARY_PARTIAL_COLUMNS if c.endswith(("_sum", "_count"))]
+        numeric += ["data_points", "total_miles", "total_gallons", "total_idle_minutes"]
+        df[numeric] = df[numeric].apply(pd.to_numeric)
+
+        # min_count=1: a truck with no values in any partial stays NULL, as in SQL
+        grouped = df.groupby(["truck_id", "carrier_id"], dropna=False)
+        summary = grouped.agg(
+            data_points=("data_points", "sum"),
+            first_reading=("first_reading", "min"),
+            last_reading=("last_reading", "max"),
+            fuel_pct_sum=("fuel_pct_sum", lambda s: s.sum(min_count=1)),
+            fuel_pct_count=("fuel_pct_count", "sum"),
+            mpg_sum=("mpg_sum", lambda s: s.sum(min_count=1)),
+            mpg_count=("mpg_count", "sum"),
+            total_miles=("total_miles", lambda s: s.sum(min_count=1)),
+            total_gallons=("total_gallons", lambda s: s.sum(min_count=1)),
+            total_idle_minutes=("total_idle_minutes", lambda s: s.sum(min_count=1)),
+        ).reset_index()
+
+        summary["avg_fuel_pct"] = summary["fuel_pct_sum"] / summary["fuel_pct_count"].where(
+            summary["fuel_pct_count"] > 0
+        )
+        summary["avg_mpg"] = summary["mpg_sum"] / summary["mpg_count"].where(
+            summary["mpg_count"] > 0
+        )
+        return summary[
+            [
+                "truck_id",
+                "carrier_id",
+                "data_points",
+                "first_reading",
+                "last_reading",
+                "avg_fuel_pct",
+                "avg_mpg",
+                "total_miles",
+                "total_gallons",
+                "total_idle_minutes",
+            ]
+        ].sort_values("truck_id", ignore_index=True)
+
     def _get_refuels_data(self, config: ExportConfig):
         """Get refuel events data for export."""
         import pandas as pd
@@ -17,6 +17,363 @@ from timezone_utils import calculate_age_minutes, ensure_utc, is_stale, utc_now
 logger = logging.getLogger(__name__)
 
 
+# 🆕 v5.12.21: Fleet-table columns and averages shared by
+# DatabaseManager._get_truck_details_from_mysql() and database_async_reads
+TRUCK_DETAIL_COLUMNS = (
+    "truck_id",
+    "truck_status",
+    "estimated_pct",
+    "sensor_pct",
+    "drift_pct",
+    "speed_mph",
+    "consumption_gph",
+    "timestamp_utc",
+    "rpm",
+    "idle_method",
+    "mpg_current",
+    # 🆕 v3.15.1: Gallons for display
+    "estimated_gallons",
+    "sensor_gallons",
+    # 🆕 v5.4.8: Real idle_gph from sensor
+    "idle_gph",
+)
+
+# 🔧 FIX v5.4.8: Use idle_gph column (real sensor data) instead of consumption_gph
+TRUCK_DETAIL_AVERAGES_QUERY = """
+    SELECT
+        truck_id,
+        AVG(CASE
+            WHEN truck_status = 'MOVING'
+             AND mpg_current > 3.5 AND mpg_current < 12
+            THEN mpg_current END) as avg_mpg_24h,
+        AVG(CASE
+            WHEN truck_status = 'STOPPED'
+             AND idle_method != 'NOT_IDLE'
+             AND idle_gph > 0.05 AND idle_gph < 2.0
+            THEN idle_gph END) as avg_idle_gph_24h
+    FROM fuel_metrics
+    WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
+      AND truck_id IN :truck_ids
+    GROUP BY truck_id
+"""
+
+
+def build_truck_details(rows: List[Dict], averages: Dict[str, tuple]) -> List[Dict]:
+    """
+    Fleet-table rows from TRUCK_DETAIL_COLUMNS latest states
+
+    Args:
+        rows: Latest-state dicts
+        averages: truck_id -> (avg_mpg_24h, avg_idle_gph_24h)
+    """
+    trucks = []
+    for row in rows:
+        truck_id = row["truck_id"]
+        status = row["truck_status"]
+        estimated_pct = row["estimated_pct"]
+        sensor_pct = row["sensor_pct"]
+        drift_pct = row["drift_pct"]
+        speed_mph = row["speed_mph"]
+        consumption_gph = row["consumption_gph"]
+        timestamp = row["timestamp_utc"]
+        rpm = row["rpm"]
+        idle_method = row["idle_method"]
+        mpg_current = row["mpg_current"]
+        avg_mpg_24h, avg_idle_gph_24h = averages.get(truck_id, (None, None))
+        # 🆕 v3.15.1: Gallons for dashboard display
+        estimated_gallons = row["estimated_gallons"]
+        sensor_gallons = row["sensor_gallons"]
+        # 🆕 v5.4.8: Real idle_gph from sensor
+        idle_gph_sensor = row["idle_gph"]
+
+        # 🔧 v3.12.13: Display MPG only for MOVING, Idle only for STOPPED
+        display_mpg = None
+        display_idle = None
+
+        if status == "MOVING":
+            # Use 24h average if available, otherwise current
+            mpg_val = avg_mpg_24h if avg_mpg_24h else mpg_current
+            if mpg_val is not None and 2.5 <= mpg_val <= 15:
+                display_mpg = round(mpg_val, 1)
+
+        # 🔧 v5.4.8: STOPPED trucks show idle consumption from SENSOR
+        if status == "STOPPED":
+            # Priority 1: Current idle_gph from sensor (BEST - real data!)
+            if idle_gph_sensor is not None and 0.05 <= idle_gph_sensor <= 2.0:
+                display_idle = round(idle_gph_sensor, 2)
+            # Priority 2: 24h average from idle_gph
+            elif avg_idle_gph_24h is not None and avg_idle_gph_24h > 0.05:
+                display_idle = round(avg_idle_gph_24h, 2)
+            # Priority 3: Fallback only if engine clearly running
+            elif (rpm and rpm > 400) or (
+                idle_method and idle_method not in ["NOT_IDLE", "ENGINE_OFF", None, ""]
+            ):
+                display_idle = 0.5  # Conservative fallback (NOT 0.8!)
+
+        trucks.append(
+            {
+                "truck_id": truck_id,
+                "status": status if status else "OFFLINE",
+                "fuel_level": (round(estimated_pct, 1) if estimated_pct else 0),
+                "estimated_pct": (round(estimated_pct, 1) if estimated_pct else 0),
+                # 🆕 v3.15.1: Add gallons for dashboard display
+                "estimated_gallons": (
+                    round(estimated_gallons, 1) if estimated_gallons else None
+                ),
+                "sensor_pct": round(sensor_pct, 1) if sensor_pct else 0,
+                "sensor_gallons": (
+                    round(sensor_gallons, 1) if sensor_gallons else None
+                ),
+                "drift": round(drift_pct, 1) if drift_pct else 0,
+                "drift_pct": round(drift_pct, 1) if drift_pct else 0,
+                "mpg": display_mpg,
+                "idle_gph": display_idle,
+                "speed": round(speed_mph, 1) if speed_mph else 0,
+                "speed_mph": round(speed_mph, 1) if speed_mph else 0,
+                "rpm": int(rpm) if rpm else None,
+                "idle_method": idle_method,
+                "last_update": timestamp.isoformat() if timestamp else None,
+                "health_score": 75,  # Default
+                "health_category": "healthy",
+            }
+        )
+    return trucks
+
+
+def enrich_truck_record(record: Dict) -> Dict:
+    """
+    🆕 v3.12.9: Enrich truck record with calculated fields
+
+    Calculates idle_gph for STOPPED trucks using:
+    1. 24h average idle consumption (if available)
+    2. Current consumption_gph (if > 0.1)
+    3. Default 0.8 GPH (if engine is running)
+
+    Also adds health_score and health_category
+
+    🆕 v5.7.5: Added voltage, gps_satellites, gps_quality, voltage_status
+    mappings for frontend compatibility
+    🆕 v5.12.21: Module-level so database_async_reads enriches the same way
+    """
+    truck_status = record.get("truck_status", "OFFLINE")
+    consumption_gph = record.get("consumption_gph")
+
+    # Calculate idle_gph for STOPPED trucks
+    idle_gph = None
+    if truck_status == "STOPPED":
+        avg_idle_gph_24h = record.get("avg_idle_gph_24h")
+        idle_readings_24h = record.get("idle_readings_24h", 0)
+
+        # Priority 1: 24h average if we have enough readings
+        if (
+            avg_idle_gph_24h is not None
+            and not pd.isna(avg_idle_gph_24h)
+            and idle_readings_24h
+            and idle_readings_24h >= 3
+        ):
+            idle_gph = float(avg_idle_gph_24h)
+        # Priority 2: Current consumption value
+        elif (
+            consumption_gph is not None
+            and not pd.isna(consumption_gph)
+            and consumption_gph > 0.1
+        ):
+            idle_gph = float(consumption_gph)
+        # Priority 3: Fallback if engine is running
+        else:
+            rpm_val = record.get("rpm")
+            idle_method_val = record.get("idle_method", "")
+            # Check if engine is running
+            if (rpm_val and not pd.isna(rpm_val) and rpm_val > 0) or (
+                idle_method_val
+                and idle_method_val not in ["NOT_IDLE", "ENGINE_OFF", None, ""]
+            ):
+                idle_gph = 0.8  # Conservative fallback
+
+    record["idle_gph"] = round(idle_gph, 2) if idle_gph is not None else None
+
+    # Add health_score and health_category
+    if "health_score" not in record or record.get("health_score") is None:
+        record["health_score"] = 75  # Default healthy
+
+    health_score = record.get("health_score", 75)
+    if health_score < 50:
+        record["health_category"] = "critical"
+    elif health_score < 75:
+        record["health_category"] = "warning"
+    else:
+        record["health_category"] = "healthy"
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # 🆕 v5.7.5: Frontend compatibility mappings for diagnostics display
+    # ═══════════════════════════════════════════════════════════════════════
+
+    # Map battery_voltage -> voltage (frontend expects 'voltage')
+    battery_voltage = record.get("battery_voltage")
+    if battery_voltage is not None and not pd.isna(battery_voltage):
+        record["voltage"] = float(battery_voltage)
+        # Calculate voltage_status based on engine state
+        rpm_val = record.get("rpm", 0) or 0
+        is_running = rpm_val > 100
+        if is_running:
+            # Engine running: expect 13.5-14.8V
+            if battery_voltage < 12.0:
+                record["voltage_status"] = "CRITICAL_LOW"
+            elif battery_voltage < 13.2:
+                record["voltage_status"] = "LOW"
+            elif battery_voltage > 15.5:
+                record["voltage_status"] = "CRITICAL_HIGH"
+            elif battery_voltage > 14.8:
+                record["voltage_status"] = "HIGH"
+            else:
+                record["voltage_status"] = "NORMAL"
+        else:
+            # Engine off: expect 12.2-12.8V
+            if battery_voltage < 11.5:
+                record["voltage_status"] = "CRITICAL_LOW"
+            elif battery_voltage < 12.2:
+                record["voltage_status"] = "LOW"
+            elif battery_voltage > 13.2:
+                record["voltage_status"] = "HIGH"  # Unusual when off
+            else:
+                record["voltage_status"] = "NORMAL"
+
+    # Map sats -> gps_satellites (frontend expects 'gps_satellites')
+    sats = record.get("sats")
+    if sats is not None and not pd.isna(sats):
+        record["gps_satellites"] = int(sats)
+
+    # Parse gps_quality from descriptive format "GOOD|sats=10|acc=3m" to simple "GOOD"
+    gps_quality_raw = record.get("gps_quality")
+    if gps_quality_raw and isinstance(gps_quality_raw, str) and "|" in gps_quality_raw:
+        # Extract just the quality level (first part before |)
+        record["gps_quality"] = gps_quality_raw.split("|")[0]
+    elif gps_quality_raw:
+        # Already simple format
+        record["gps_quality"] = gps_quality_raw
+
+    # 🆕 v5.7.5: Map DTC data for frontend
+    # dtc_code contains actual codes (e.g., "100.4,157.3")
+    # dtc may be a count (0-N) or flag (0/1)
+    dtc_code = record.get("dtc_code")
+    dtc_flag = record.get("dtc")
+
+    if dtc_code and str(dtc_code).strip():
+        # We have actual codes - use them directly
+        record["dtc_codes"] = str(dtc_code)
+        record["dtc_count"] = len(str(dtc_code).split(","))
+    elif dtc_flag is not None and not pd.isna(dtc_flag):
+        dtc_val = float(dtc_flag) if dtc_flag else 0
+        if dtc_val > 0:
+            # We have a count/flag indicating active DTCs but no codes
+            count = int(dtc_val) if dtc_val > 1 else 1
+            record["dtc_count"] = count
+            # Note: dtc_codes will be None - frontend should show count instead
+
+    return record
+
+
+def finish_fleet_summary(summary: Dict, truck_details: List[Dict]) -> Dict:
+    """
+    Health counts + dashboard truck table on top of a MySQL fleet summary
+
+    🆕 v5.12.21: Shared by get_fleet_summary() and database_async_reads
+    """
+    # 🔧 FIX v3.12.21: Calculate health counts based on truck status
+    critical_count = sum(
+        1
+        for t in truck_details
+        if t.get("fuel_pct", 100) < 15 or t.get("status") == "OFFLINE"
+    )
+    warning_count = sum(1 for t in truck_details if 15 <= t.get("fuel_pct", 100) < 25)
+    healthy_count = summary["total_trucks"] - critical_count - warning_count
+
+    summary["critical_count"] = critical_count
+    summary["warning_count"] = warning_count
+    summary["healthy_count"] = max(0, healthy_count)
+    summary["avg_idle_gph"] = summary.get("avg_consumption", 0)
+
+    # 🔧 FIX v3.11.2: Populate truck_details for dashboard table
+    summary["truck_details"] = truck_details
+    summary["timestamp"] = datetime.now()
+    return summary
+
+
+def truck_alerts(truck_id: str, record: Dict, timestamp: datetime) -> List[Dict]:
+    """
+    Alert rules for one truck's latest record
+
+    🆕 v5.12.21: Shared by get_alerts() and database_async_reads
+    """
+    alerts = []
+    age_minutes = (datetime.now() - timestamp).total_seconds() / 60
+
+    # Offline alert
+    if age_minutes > 5:
+        alerts.append(
+            {
+                "truck_id": truck_id,
+                "type": "offline",
+                "severity": "warning",
+                "message": f"Truck offline for {int(age_minutes)} minutes",
+                "timestamp": timestamp.isoformat(),
+            }
+        )
+        return alerts
+
+    # High idle alert
+    # 🔧 FIX v3.9.1: Use correct field consumption_gph (not idle_consumption_gph)
+    idle_gph = record.get("consumption_gph", 0)
+    if idle_gph and idle_gph > 1.5:
+        alerts.append(
+            {
+                "truck_id": truck_id,
+                "type": "high_idle",
+                "severity": "warning",
+                "message": f"High idle consumption: {idle_gph:.2f} GPH",
+                "timestamp": timestamp.isoformat(),
+            }
+        )
+
+    # Low MPG alert
+    mpg = record.get("mpg_current") or 0
+    if mpg > 0 and mpg < 5.0:
+        alerts.append(
+            {
+                "truck_id": truck_id,
+                "type": "low_mpg",
+                "severity": "warning",
+                "message": f"Low MPG: {mpg:.2f}",
+                "timestamp": timestamp.isoformat(),
+            }
+        )
+
+    # Low fuel alert
+    # 🔧 FIX v3.9.1: Use correct field estimated_pct (not fuel_percent)
+    fuel_percent = record.get("estimated_pct", 100)
+    if fuel_percent and fuel_percent < 15:
+        alerts.append(
+            {
+                "truck_id": truck_id,
+                "type": "low_fuel",
+                "severity": "critical",
+                "message": f"Low fuel: {fuel_percent:.1f}%",
+                "timestamp": timestamp.isoformat(),
+            }
+        )
+    return alerts
+
+
+def sort_alerts(alerts: List[Dict]) -> List[Dict]:
+    """Sort by severity (critical first) then by timestamp"""
+    severity_order = {"critical": 0, "warning": 1, "info": 2}
+    alerts.sort(
+        key=lambda x: (severity_order.get(x["severity"], 3), x["timestamp"]),
+        reverse=True,
+    )
+    return alerts
+
+
 class DatabaseManager:
     """Manages access to MySQL (primary) and CSV reports (fallback)"""
 
@@ -108,139 +465,8 @@ class DatabaseManager:
             return None
 
     def _enrich_truck_record(self, record: Dict) -> Dict:
-        """
-        🆕 v3.12.9: Enrich truck record with calculated fields
-
-        Calculates idle_gph for STOPPED trucks using:
-        1. 24h average idle consumption (if available)
-        2. Current consumption_gph (if > 0.1)
-        3. Default 0.8 GPH (if engine is running)
-
-        Also adds health_score and health_category
-
-        🆕 v5.7.5: Added voltage, gps_satellites, gps_quality, voltage_status
-        mappings for frontend compatibility
-        """
-        truck_status = record.get("truck_status", "OFFLINE")
-        consumption_gph = record.get("consumption_gph")
-
-        # Calculate idle_gph for STOPPED trucks
-        idle_gph = None
-        if truck_status == "STOPPED":
-            avg_idle_gph_24h = record.get("avg_idle_gph_24h")
-            idle_readings_24h = record.get("idle_readings_24h", 0)
-
-            # Priority 1: 24h average if we have enough readings
-            if (
-                avg_idle_gph_24h is not None
-                and not pd.isna(avg_idle_gph_24h)
-                and idle_readings_24h
-                and idle_readings_24h >= 3
-            ):
-                idle_gph = float(avg_idle_gph_24h)
-            # Priority 2: Current consumption value
-            elif (
-                consumption_gph is not None
-                and not pd.isna(consumption_gph)
-                and consumption_gph > 0.1
-            ):
-                idle_gph = float(consumption_gph)
-            # Priority 3: Fallback if engine is running
-            else:
-                rpm_val = record.get("rpm")
-                idle_method_val = record.get("idle_method", "")
-                # Check if engine is running
-                if (rpm_val and not pd.isna(rpm_val) and rpm_val > 0) or (
-                    idle_method_val
-                    and idle_method_val not in ["NOT_IDLE", "ENGINE_OFF", None, ""]
-                ):
-                    idle_gph = 0.8  # Conservative fallback
-
-        record["idle_gph"] = round(idle_gph, 2) if idle_gph is not None else None
-
-        # Add health_score and health_category
-        if "health_score" not in record or record.get("health_score") is None:
-            record["health_score"] = 75  # Default healthy
-
-        health_score = record.get("health_score", 75)
-        if health_score < 50:
-            record["health_category"] = "critical"
-        elif health_score < 75:
-            record["health_category"] = "warning"
-        else:
-            record["health_category"] = "healthy"
-
-        # ═══════════════════════════════════════════════════════════════════════
-        # 🆕 v5.7.5: Frontend compatibility mappings for diagnostics display
-        # ═══════════════════════════════════════════════════════════════════════
-
-        # Map battery_voltage -> voltage (frontend expects 'voltage')
-        battery_voltage = record.get("battery_voltage")
-        if battery_voltage is not None and not pd.isna(battery_voltage):
-            record["voltage"] = float(battery_voltage)
-            # Calculate voltage_status based on engine state
-            rpm_val = record.get("rpm", 0) or 0
-            is_running = rpm_val > 100
-            if is_running:
-                # Engine running: expect 13.5-14.8V
-                if battery_voltage < 12.0:
-                    record["voltage_status"] = "CRITICAL_LOW"
-                elif battery_voltage < 13.2:
-                    record["voltage_status"] = "LOW"
-                elif battery_voltage > 15.5:
-                    record["voltage_status"] = "CRITICAL_HIGH"
-                elif battery_voltage > 14.8:
-                    record["voltage_status"] = "HIGH"
-                else:
-                    record["voltage_status"] = "NORMAL"
-            else:
-                # Engine off: expect 12.2-12.8V
-                if battery_voltage < 11.5:
-                    record["voltage_status"] = "CRITICAL_LOW"
-                elif battery_voltage < 12.2:
-                    record["voltage_status"] = "LOW"
-                elif battery_voltage > 13.2:
-                    record["voltage_status"] = "HIGH"  # Unusual when off
-                else:
-                    record["voltage_status"] = "NORMAL"
-
-        # Map sats -> gps_satellites (frontend expects 'gps_satellites')
-        sats = record.get("sats")
-        if sats is not None and not pd.isna(sats):
-            record["gps_satellites"] = int(sats)
-
-        # Parse gps_quality from descriptive format "GOOD|sats=10|acc=3m" to simple "GOOD"
-        gps_quality_raw = record.get("gps_quality")
-        if (
-            gps_quality_raw
-            and isinstance(gps_quality_raw, str)
-            and "|" in gps_quality_raw
-        ):
-            # Extract just the quality level (first part before |)
-            record["gps_quality"] = gps_quality_raw.split("|")[0]
-        elif gps_quality_raw:
-            # Already simple format
-            record["gps_quality"] = gps_quality_raw
-
-        # 🆕 v5.7.5: Map DTC data for frontend
-        # dtc_code contains actual codes (e.g., "100.4,157.3")
-        # dtc may be a count (0-N) or flag (0/1)
-        dtc_code = record.get("dtc_code")
-        dtc_flag = record.get("dtc")
-
-        if dtc_code and str(dtc_code).strip():
-            # We have actual codes - use them directly
-            record["dtc_codes"] = str(dtc_code)
-            record["dtc_count"] = len(str(dtc_code).split(","))
-        elif dtc_flag is not None and not pd.isna(dtc_flag):
-            dtc_val = float(dtc_flag) if dtc_flag else 0
-            if dtc_val > 0:
-                # We have a count/flag indicating active DTCs but no codes
-                count = int(dtc_val) if dtc_val > 1 else 1
-                record["dtc_count"] = count
-                # Note: dtc_codes will be None - frontend should show count instead
-
-        return record
+        """🆕 v3.12.9: Enrich truck record with calculated fields (see enrich_truck_record)"""
+        return enrich_truck_record(record)
 
     def get_truck_latest_record(self, truck_id: str) -> Optional[Dict]:
         """Get the most recent record for a truck (MySQL first, then CSV fallback)
@@ -352,35 +578,19 @@ class DatabaseManager:
         # Try MySQL batch query first
         if self.mysql_available:
             try:
-                from sqlalchemy import text
-
                 from database_mysql import get_sqlalchemy_engine
+                from src.repositories.latest_state_repository import get_latest_states
 
                 engine = get_sqlalchemy_engine()
-                placeholders = ",".join([f"'{tid}'" for tid in truck_ids])
-
-                with engine.connect() as conn:
-                    query = text(
-                        f"""
-                        SELECT fm.* FROM fuel_metrics fm
-                        INNER JOIN (
-                            SELECT truck_id, MAX(timestamp_utc) as max_ts
-                            FROM fuel_metrics
-                            WHERE truck_id IN ({placeholders})
-                            AND timestamp_utc > NOW() - INTERVAL 24 HOUR
-                            GROUP BY truck_id
-                        ) latest ON fm.truck_id = latest.truck_id 
-                        AND fm.timestamp_utc = latest.max_ts
-                    """
-                    )
-                    rows = conn.execute(query)
 
-                    for row in rows:
-                        row_dict = dict(row._mapping)
-                        truck_id = row_dict.get("truck_id")
-                        if truck_id:
-                            row_dict = self._enrich_truck_record(row_dict)
-                            result[truck_id] = row_dict
+                # 🆕 v5.12.15: Latest rows from fuel_metrics_latest
+                for row_dict in get_latest_states(
+                    engine, truck_ids=truck_ids, max_age_hours=24
+                ):
+                    truck_id = row_dict.get("truck_id")
+                    if truck_id:
+                        row_dict = self._enrich_truck_record(row_dict)
+                        result[truck_id] = row_dict
 
                 logger.info(f"✅ Batch fetched {len(result)} trucks from MySQL")
                 return result
@@ -411,31 +621,9 @@ class DatabaseManager:
                     # Enrich with missing fields required by FleetSummary model
                     mysql_summary["data_source"] = "MySQL"
 
-                    # 🔧 FIX v3.12.21: Calculate health counts based on truck status
-                    truck_details = self._get_truck_details_from_mysql()
-                    critical_count = sum(
-                        1
-                        for t in truck_details
-                        if t.get("fuel_pct", 100) < 15 or t.get("status") == "OFFLINE"
-                    )
-                    warning_count = sum(
-                        1 for t in truck_details if 15 <= t.get("fuel_pct", 100) < 25
-                    )
-                    healthy_count = (
-                        mysql_summary["total_trucks"] - critical_count - warning_count
-                    )
-
-                    mysql_summary["critical_count"] = critical_count
-                    mysql_summary["warning_count"] = warning_count
-                    mysql_summary["healthy_count"] = max(0, healthy_count)
-                    mysql_summary["avg_idle_gph"] = mysql_summary.get(
-                        "avg_consumption", 0
+                    return finish_fleet_summary(
+                        mysql_summary, self._get_truck_details_from_mysql()
                     )
-
-                    # 🔧 FIX v3.11.2: Populate truck_details for dashboard table
-                    mysql_summary["truck_details"] = truck_details
-                    mysql_summary["timestamp"] = datetime.now()
-                    return mysql_summary
             except Exception as e:
                 logger.warning(f"MySQL fleet summary failed, using CSV: {e}")
 
@@ -605,154 +793,30 @@ class DatabaseManager:
 
             # 🚀 OPTIMIZATION: Import get_allowed_trucks
             from config import get_allowed_trucks
+            from src.repositories.latest_state_repository import get_latest_states
 
             engine = get_sqlalchemy_engine()
             with engine.connect() as conn:
-                # 🔧 v3.15.1: Added gallons columns for dashboard display
-                # 🔧 v5.4.8: Added idle_gph for real sensor data
-                result = conn.execute(
-                    text(
-                        """
-                    SELECT 
-                        t1.truck_id,
-                        t1.truck_status,
-                        t1.estimated_pct,
-                        t1.sensor_pct,
-                        t1.drift_pct,
-                        t1.speed_mph,
-                        t1.consumption_gph,
-                        t1.timestamp_utc,
-                        t1.rpm,
-                        t1.idle_method,
-                        t1.mpg_current,
-                        -- 24h averages
-                        mpg_avg.avg_mpg_24h,
-                        idle_avg.avg_idle_gph_24h,
-                        -- 🆕 v3.15.1: Gallons for display
-                        t1.estimated_gallons,
-                        t1.sensor_gallons,
-                        -- 🆕 v5.4.8: Real idle_gph from sensor
-                        t1.idle_gph
-                    FROM fuel_metrics t1
-                    INNER JOIN (
-                        SELECT truck_id, MAX(timestamp_utc) as max_time
-                        FROM fuel_metrics
-                        WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
-                        GROUP BY truck_id
-                    ) t2 ON t1.truck_id = t2.truck_id AND t1.timestamp_utc = t2.max_time
-                    -- Join with 24h MPG averages
-                    LEFT JOIN (
-                        SELECT 
-                            truck_id,
-                            AVG(mpg_current) as avg_mpg_24h
-                        FROM fuel_metrics
-                        WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
-                          AND truck_status = 'MOVING'
-                          AND mpg_current > 3.5 AND mpg_current < 12
-                        GROUP BY truck_id
-                    ) mpg_avg ON t1.truck_id = mpg_avg.truck_id
-                    -- Join with 24h idle averages
-                    -- 🔧 FIX v5.4.8: Use idle_gph column (real sensor data) instead of consumption_gph
-                    LEFT JOIN (
-                        SELECT 
-                            truck_id,
-                            AVG(idle_gph) as avg_idle_gph_24h
-                        FROM fuel_metrics
-                        WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
-                          AND truck_status = 'STOPPED'
-                          AND idle_method != 'NOT_IDLE'
-                          AND idle_gph > 0.05 AND idle_gph < 2.0
-                        GROUP BY truck_id
-                    ) idle_avg ON t1.truck_id = idle_avg.truck_id
-                    WHERE t1.truck_id IN :truck_ids
-                    ORDER BY t1.truck_id
-                """
-                    ),
-                    {"truck_ids": tuple(get_allowed_trucks())},
+                # 🆕 v5.12.15: Latest row per truck from fuel_metrics_latest
+                allowed_trucks = list(get_allowed_trucks())
+                result = get_latest_states(
+                    conn,
+                    columns=TRUCK_DETAIL_COLUMNS,
+                    truck_ids=allowed_trucks,
+                    max_age_hours=24,
                 )
 
-                trucks = []
-                for row in result:
-                    truck_id = row[0]
-                    status = row[1]
-                    estimated_pct = row[2]
-                    sensor_pct = row[3]
-                    drift_pct = row[4]
-                    speed_mph = row[5]
-                    consumption_gph = row[6]
-                    timestamp = row[7]
-                    rpm = row[8]
-                    idle_method = row[9]
-                    mpg_current = row[10]
-                    avg_mpg_24h = row[11]
-                    avg_idle_gph_24h = row[12]
-                    # 🆕 v3.15.1: Gallons for dashboard display
-                    estimated_gallons = row[13]
-                    sensor_gallons = row[14]
-                    # 🆕 v5.4.8: Real idle_gph from sensor
-                    idle_gph_sensor = row[15]
-
-                    # 🔧 v3.12.13: Display MPG only for MOVING, Idle only for STOPPED
-                    display_mpg = None
-                    display_idle = None
-
-                    if status == "MOVING":
-                        # Use 24h average if available, otherwise current
-                        mpg_val = avg_mpg_24h if avg_mpg_24h else mpg_current
-                        if mpg_val is not None and 2.5 <= mpg_val <= 15:
-                            display_mpg = round(mpg_val, 1)
-
-                    # 🔧 v5.4.8: STOPPED trucks show idle consumption from SENSOR
-                    if status == "STOPPED":
-                        # Priority 1: Current idle_gph from sensor (BEST - real data!)
-                        if (
-                            idle_gph_sensor is not None
-                            and 0.05 <= idle_gph_sensor <= 2.0
-                        ):
-                            display_idle = round(idle_gph_sensor, 2)
-                        # Priority 2: 24h average from idle_gph
-                        elif avg_idle_gph_24h is not None and avg_idle_gph_24h > 0.05:
-                            display_idle = round(avg_idle_gph_24h, 2)
-                        # Priority 3: Fallback only if engine clearly running
-                        elif (rpm and rpm > 400) or (
-                            idle_method
-                            and idle_method not in ["NOT_IDLE", "ENGINE_OFF", None, ""]
-                        ):
-                            display_idle = 0.5  # Conservative fallback (NOT 0.8!)
-
-                    trucks.append(
-                        {
-                            "truck_id": truck_id,
-                            "status": status if status else "OFFLINE",
-                            "fuel_level": (
-                                round(estimated_pct, 1) if estimated_pct else 0
-                            ),
-                            "estimated_pct": (
-                                round(estimated_pct, 1) if estimated_pct else 0
-                            ),
-                            # 🆕 v3.15.1: Add gallons for dashboard display
-                            "estimated_gallons": (
-                                round(estimated_gallons, 1)
-                                if estimated_gallons
-                                else None
-                            ),
-                            "sensor_pct": round(sensor_pct, 1) if sensor_pct else 0,
-                            "sensor_gallons": (
-                                round(sensor_gallons, 1) if sensor_gallons else None
-                            ),
-                            "drift": round(drift_pct, 1) if drift_pct else 0,
-                            "drift_pct": round(drift_pct, 1) if drift_pct else 0,
-                            "mpg": display_mpg,
-                            "idle_gph": display_idle,
-                            "speed": round(speed_mph, 1) if speed_mph else 0,
-                            "speed_mph": round(speed_mph, 1) if speed_mph else 0,
-                            "rpm": int(rpm) if rpm else None,
-                            "idle_method": idle_method,
-                            "last_update": timestamp.isoformat() if timestamp else None,
-                            "health_score": 75,  # Default
-                            "health_category": "healthy",
-                        }
+                # 24h MPG and idle averages
+                averages = {}
+                if allowed_trucks:
+                    avg_rows = conn.execute(
+                        text(TRUCK_DETAIL_AVERAGES_QUERY),
+                        {"truck_ids": tuple(allowed_trucks)},
                     )
+                    averages = {row[0]: (row[1], row[2]) for row in avg_rows}
+
+                trucks = build_truck_details(result, averages)
+
                 # 🔍 DEBUG Dec 23: Check sensor_pct presence
                 if trucks:
                     logger.error(
@@ -1157,6 +1221,21 @@ class DatabaseManager:
 
         # Try MySQL first
         if self.mysql_available:
+            # 🆕 v5.12.2: Recent windows come from the in-process columnar store
+            try:
+                from fuel_metrics_timeseries import get_timeseries_store
+
+                records = get_timeseries_store().get_records(
+                    truck_id, hours, descending=True
+                )
+                if records:
+                    for record in records:
+                        record["truck_id"] = truck_id
+                        record["timestamp"] = record["timestamp_utc"].isoformat()
+                    return records
+            except Exception as e:
+                logger.debug(f"Time-series store unavailable for {truck_id}: {e}")
+
             try:
                 df = self.mysql_get_history(truck_id, hours_back=hours)
                 if not df.empty:
@@ -1414,74 +1493,13 @@ class DatabaseManager:
                 if not ts_val:
                     continue
                 timestamp = pd.to_datetime(ts_val)
-                age_minutes = (datetime.now() - timestamp).total_seconds() / 60
-
-                # Offline alert
-                if age_minutes > 5:
-                    alerts.append(
-                        {
-                            "truck_id": truck_id,
-                            "type": "offline",
-                            "severity": "warning",
-                            "message": f"Truck offline for {int(age_minutes)} minutes",
-                            "timestamp": timestamp.isoformat(),
-                        }
-                    )
-                    continue
-
-                # High idle alert
-                # 🔧 FIX v3.9.1: Use correct field consumption_gph (not idle_consumption_gph)
-                idle_gph = record.get("consumption_gph", 0)
-                if idle_gph and idle_gph > 1.5:
-                    alerts.append(
-                        {
-                            "truck_id": truck_id,
-                            "type": "high_idle",
-                            "severity": "warning",
-                            "message": f"High idle consumption: {idle_gph:.2f} GPH",
-                            "timestamp": timestamp.isoformat(),
-                        }
-                    )
-
-                # Low MPG alert
-                mpg = record.get("mpg_current", 0)
-                if mpg > 0 and mpg < 5.0:
-                    alerts.append(
-                        {
-                            "truck_id": truck_id,
-                            "type": "low_mpg",
-                            "severity": "warning",
-                            "message": f"Low MPG: {mpg:.2f}",
-                            "timestamp": timestamp.isoformat(),
-                        }
-                    )
-
-                # Low fuel alert
-                # 🔧 FIX v3.9.1: Use correct field estimated_pct (not fuel_percent)
-                fuel_percent = record.get("estimated_pct", 100)
-                if fuel_percent and fuel_percent < 15:
-                    alerts.append(
-                        {
-                            "truck_id": truck_id,
-                            "type": "low_fuel",
-                            "severity": "critical",
-                            "message": f"Low fuel: {fuel_percent:.1f}%",
-                            "timestamp": timestamp.isoformat(),
-                        }
-                    )
+                alerts.extend(truck_alerts(truck_id, record, timestamp))
 
             except Exception as e:
                 print(f"Error checking alerts for {truck_id}: {e}")
                 continue
 
-        # Sort by severity (critical first) then by timestamp
-        severity_order = {"critical": 0, "warning": 1, "info": 2}
-        alerts.sort(
-            key=lambda x: (severity_order.get(x["severity"], 3), x["timestamp"]),
-            reverse=True,
-        )
-
-        return alerts
+        return sort_alerts(alerts)
 
 
 # Singleton instance
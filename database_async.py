@@ -37,6 +37,8 @@ from typing import Any, Dict, List, Optional, Tuple
 import aiomysql
 from dotenv import load_dotenv
 
+from connection_manager import get_connection_manager
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -55,7 +57,8 @@ DB_CONFIG = {
     "autocommit": True,
 }
 
-# Pool configuration
+# Pool configuration (reported only - connection_manager sizes the pool from
+# the same DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE settings)
 POOL_CONFIG = {
     "minsize": int(os.getenv("DB_POOL_MIN_SIZE", 5)),
     "maxsize": int(os.getenv("DB_POOL_MAX_SIZE", 20)),
@@ -63,10 +66,31 @@ POOL_CONFIG = {
 }
 
 
+def _pool_name() -> str:
+    """connection_manager pool serving DB_CONFIG"""
+    return get_connection_manager().pool_for(
+        {
+            "host": DB_CONFIG["host"],
+            "port": DB_CONFIG["port"],
+            "user": DB_CONFIG["user"],
+            "password": DB_CONFIG["password"],
+            "database": DB_CONFIG["db"],
+        }
+    )
+
+
+def _connection():
+    """Instrumented async connection (checkout histograms, leak tracking)"""
+    return get_connection_manager().async_connection(_pool_name())
+
+
 async def get_async_pool() -> aiomysql.Pool:
     """
     Get or create the async MySQL connection pool.
 
+    🆕 v5.12.16: The aiomysql pool is owned by connection_manager
+    (sized by DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE via settings)
+
     Returns:
         aiomysql.Pool: Active connection pool
 
@@ -75,33 +99,11 @@ async def get_async_pool() -> aiomysql.Pool:
     """
     global _pool
 
-    if _pool is None:
-        try:
-            logger.info("🔄 Creating async MySQL connection pool...")
-            logger.info(f"   Host: {DB_CONFIG['host']}:{DB_CONFIG['port']}")
-            logger.info(f"   Database: {DB_CONFIG['db']}")
-            logger.info(
-                f"   Pool size: {POOL_CONFIG['minsize']}-{POOL_CONFIG['maxsize']}"
-            )
-
-            _pool = await aiomysql.create_pool(
-                host=DB_CONFIG["host"],
-                port=DB_CONFIG["port"],
-                user=DB_CONFIG["user"],
-                password=DB_CONFIG["password"],
-                db=DB_CONFIG["db"],
-                charset=DB_CONFIG["charset"],
-                autocommit=DB_CONFIG["autocommit"],
-                minsize=POOL_CONFIG["minsize"],
-                maxsize=POOL_CONFIG["maxsize"],
-                echo=POOL_CONFIG["echo"],
-            )
-
-            logger.info("✅ Async MySQL connection pool created successfully")
-
-        except Exception as e:
-            logger.error(f"❌ Failed to create async MySQL pool: {e}")
-            raise
+    try:
+        _pool = await get_connection_manager().async_pool(_pool_name())
+    except Exception as e:
+        logger.error(f"❌ Failed to create async MySQL pool: {e}")
+        raise
 
     return _pool
 
@@ -116,8 +118,7 @@ async def close_async_pool():
 
     if _pool:
         logger.info("🔄 Closing async MySQL connection pool...")
-        _pool.close()
-        await _pool.wait_closed()
+        await get_connection_manager().pool(_pool_name()).close_async()
         _pool = None
         logger.info("✅ Async MySQL connection pool closed")
 
@@ -142,10 +143,8 @@ async def execute_query(
             ("active",)
         )
     """
-    pool = await get_async_pool()
-
     try:
-        async with pool.acquire() as conn:
+        async with _connection() as conn:
             async with conn.cursor(cursor_class) as cursor:
                 await cursor.execute(query, params)
                 results = await cursor.fetchall()
@@ -178,10 +177,8 @@ async def execute_query_one(
             ("FL-0208",)
         )
     """
-    pool = await get_async_pool()
-
     try:
-        async with pool.acquire() as conn:
+        async with _connection() as conn:
             async with conn.cursor(cursor_class) as cursor:
                 await cursor.execute(query, params)
                 result = await cursor.fetchone()
@@ -211,10 +208,8 @@ async def execute_insert(query: str, params: Optional[Tuple] = None) -> int:
             ("FL-0208", "refuel")
         )
     """
-    pool = await get_async_pool()
-
     try:
-        async with pool.acquire() as conn:
+        async with _connection() as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute(query, params)
                 return cursor.lastrowid
@@ -243,10 +238,8 @@ async def execute_update(query: str, params: Optional[Tuple] = None) -> int:
             ("inactive", "FL-0208")
         )
     """
-    pool = await get_async_pool()
-
     try:
-        async with pool.acquire() as conn:
+        async with _connection() as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute(query, params)
                 return cursor.rowcount
@@ -275,10 +268,8 @@ async def execute_delete(query: str, params: Optional[Tuple] = None) -> int:
             (cutoff_date,)
         )
     """
-    pool = await get_async_pool()
-
     try:
-        async with pool.acquire() as conn:
+        async with _connection() as conn:
             async with conn.cursor() as cursor:
                 await cursor.execute(query, params)
                 return cursor.rowcount
@@ -307,10 +298,8 @@ async def execute_many(query: str, params_list: List[Tuple]) -> int:
             [("FL-0208", 50), ("FL-0209", 45), ("FL-0210", 52)]
         )
     """
-    pool = await get_async_pool()
-
     try:
-        async with pool.acquire() as conn:
+        async with _connection() as conn:
             async with conn.cursor() as cursor:
                 await cursor.executemany(query, params_list)
                 return cursor.rowcount
@@ -390,17 +379,17 @@ class AsyncConnection:
     """
 
     def __init__(self):
-        self.pool = None
+        self._checkout = None
         self.conn = None
 
     async def __aenter__(self):
-        self.pool = await get_async_pool()
-        self.conn = await self.pool.acquire()
+        self._checkout = _connection()
+        self.conn = await self._checkout.__aenter__()
         return self.conn
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.conn:
-            await self.pool.release(self.conn)
+        if self._checkout:
+            await self._checkout.__aexit__(exc_type, exc_val, exc_tb)
 
 
 # ============================================================================
@@ -0,0 +1,346 @@
+"""
+Async Read Paths v5.12.21
+═══════════════════════════════════════════════════════════════════════════════
+
+Native aiomysql versions of the dashboard's hot reads: fleet summary, truck
+detail, refuels, alerts and KPIs. They used to run the synchronous
+DatabaseManager methods in the default executor, each call holding a pooled
+SQLAlchemy connection and a worker thread while pandas built a DataFrame that
+was immediately turned back into dicts. Here every query awaits on the
+aiomysql pool owned by connection_manager and rows stay plain dicts/tuples.
+
+The SQL and the row -> payload logic are the same objects the sync path uses
+(database_mysql / database), so both paths return identical payloads:
+
+- fleet_summary():        one latest-state read + NOW() + DTC count + 24h
+                          averages, on one connection (sync: two latest-state
+                          reads on two connections)
+- truck_latest_record():  the truck's latest row + its own 24h averages
+                          (sync: the whole fleet, then filtered in pandas)
+- refuel_history() /
+  all_refuels():          refuel_events for every truck in one query, the
+                          fuel_metrics fallback for the rest in one more
+                          (sync: two queries per truck)
+- active_alerts():        one latest-state read (sync: one full-fleet read
+                          per truck)
+- fleet_kpis():           the KPI aggregate, sharing get_kpi_summary()'s
+                          cache entry
+
+Functions return None when MySQL has nothing for them so the caller
+(database_async_wrapper) can fall back to the sync/CSV path, and raise on
+database errors for the same reason.
+
+🆕 v5.12.22: fleet_summary(), active_alerts() and all_refuels() accept the
+rows of one shared latest_states() read, so /batch reads the latest state of
+every truck once for all of its sections.
+
+Usage:
+    from database_async_reads import fleet_summary
+
+    summary = await fleet_summary()
+
+Author: Fuel Copilot Team
+Version: 5.12.21
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+import aiomysql
+
+from config import FUEL, get_allowed_trucks
+from database import (
+    TRUCK_DETAIL_AVERAGES_QUERY,
+    TRUCK_DETAIL_COLUMNS,
+    build_truck_details,
+    enrich_truck_record,
+    finish_fleet_summary,
+    sort_alerts,
+    truck_alerts,
+)
+from database_async import AsyncConnection
+from database_mysql import (
+    FLEET_SUMMARY_COLUMNS,
+    KPI_SUMMARY_QUERY,
+    LATEST_TRUCK_DATA_COLUMNS,
+    REFUEL_EVENTS_QUERY,
+    REFUEL_METRICS_QUERY,
+    TRUCK_AVERAGES_24H_QUERY,
+    build_fleet_summary,
+    build_kpi_summary,
+    consolidate_refuels,
+    format_refuel_event,
+    get_kpi_summary,
+)
+from src.repositories.latest_state_repository import aget_latest_states
+
+try:
+    from memory_cache import cache as memory_cache
+except ImportError:
+    memory_cache = None
+
+logger = logging.getLogger(__name__)
+
+# One latest-state read feeds both the aggregates and the dashboard table
+FLEET_READ_COLUMNS = FLEET_SUMMARY_COLUMNS + tuple(
+    c for c in TRUCK_DETAIL_COLUMNS if c not in FLEET_SUMMARY_COLUMNS
+)
+ALERT_COLUMNS = (
+    "truck_id",
+    "timestamp_utc",
+    "consumption_gph",
+    "mpg_current",
+    "estimated_pct",
+)
+# Columns of the shared /batch read: enough for every latest-state consumer
+SHARED_STATE_COLUMNS = FLEET_READ_COLUMNS
+TRUCK_AVERAGE_KEYS = (
+    "avg_mpg_24h",
+    "mpg_readings_24h",
+    "avg_idle_gph_24h",
+    "idle_readings_24h",
+)
+
+ACTIVE_DTC_COUNT_QUERY = """
+    SELECT COUNT(DISTINCT CONCAT(truck_id, '-', dtc_code))
+    FROM dtc_events
+    WHERE status = 'ACTIVE'
+      AND truck_id IN %(truck_ids)s
+"""
+
+_NAMED_PARAM = re.compile(r"(?<![:\w]):(\w+)")
+
+
+def _pyformat(sql: str) -> str:
+    """SQLAlchemy :name placeholders -> aiomysql %(name)s"""
+    return _NAMED_PARAM.sub(r"%(\1)s", sql)
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+async def _fetch_all(
+    conn, sql: str, params: Optional[Dict[str, Any]] = None, cursor_class=None
+) -> List[Any]:
+    async with conn.cursor(cursor_class or aiomysql.DictCursor) as cursor:
+        await cursor.execute(sql, params)
+        return list(await cursor.fetchall())
+
+
+# =============================================================================
+# Fleet summary
+# =============================================================================
+
+
+async def latest_states() -> List[Dict[str, Any]]:
+    """
+    Latest row (SHARED_STATE_COLUMNS) of every truck reporting in the last
+    24h - the input the fleet, alert and refuel reads have in common
+    """
+    async with AsyncConnection() as conn:
+        return await aget_latest_states(
+            conn, columns=SHARED_STATE_COLUMNS, max_age_hours=24
+        )
+
+
+async def fleet_summary(
+    latest: Optional[List[Dict[str, Any]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    DatabaseManager.get_fleet_summary() (MySQL branch) on aiomysql
+
+    latest: rows from latest_states(), narrowed here to the allowed trucks
+    """
+    allowed_trucks = list(get_allowed_trucks())
+    if not allowed_trucks:
+        return None
+    truck_ids = {"truck_ids": tuple(allowed_trucks)}
+
+    async with AsyncConnection() as conn:
+        if latest is None:
+            latest = await aget_latest_states(
+                conn,
+                columns=FLEET_READ_COLUMNS,
+                truck_ids=allowed_trucks,
+                max_age_hours=24,
+            )
+        else:
+            allowed = set(allowed_trucks)
+            latest = [row for row in latest if row["truck_id"] in allowed]
+        if not latest:
+            return None
+        ((db_now,),) = await _fetch_all(conn, "SELECT NOW()", None, aiomysql.Cursor)
+
+        active_dtc_count = 0
+        try:
+            ((active_dtc_count,),) = await _fetch_all(
+                conn, ACTIVE_DTC_COUNT_QUERY, truck_ids, aiomysql.Cursor
+            )
+        except Exception as dtc_error:
+            logger.warning(f"DTC query failed (table may not exist): {dtc_error}")
+
+        avg_rows = await _fetch_all(
+            conn, _pyformat(TRUCK_DETAIL_AVERAGES_QUERY), truck_ids, aiomysql.Cursor
+        )
+
+    summary = build_fleet_summary(latest, db_now, active_dtc_count or 0)
+    summary["data_source"] = "MySQL"
+    averages = {
+        row[0]: (_float_or_none(row[1]), _float_or_none(row[2])) for row in avg_rows
+    }
+    return finish_fleet_summary(summary, build_truck_details(latest, averages))
+
+
+# =============================================================================
+# Truck detail
+# =============================================================================
+
+
+async def truck_latest_record(truck_id: str) -> Optional[Dict[str, Any]]:
+    """DatabaseManager.get_truck_latest_record() (MySQL branch) on aiomysql"""
+    averages_sql = _pyformat(
+        TRUCK_AVERAGES_24H_QUERY.format(truck_filter="AND truck_id = :truck_id")
+    )
+    async with AsyncConnection() as conn:
+        rows = await aget_latest_states(
+            conn,
+            columns=LATEST_TRUCK_DATA_COLUMNS,
+            truck_ids=[truck_id],
+            max_age_hours=24,
+        )
+        if not rows:
+            return None
+        averages = await _fetch_all(conn, averages_sql, {"truck_id": truck_id})
+
+    # Same shaping as database_mysql.get_latest_truck_data()
+    record = rows[0]
+    if record["mpg_current"] is not None:
+        record["mpg_current"] = min(record["mpg_current"], 8.2)
+    gph = record["consumption_gph"]
+    record["consumption_lph"] = round(gph * 3.78541, 2) if gph is not None else None
+    average = averages[0] if averages else {}
+    for key in TRUCK_AVERAGE_KEYS:
+        record[key] = _float_or_none(average.get(key))
+    if record["timestamp_utc"] is not None:
+        record["timestamp"] = record["timestamp_utc"].isoformat()
+
+    return enrich_truck_record(record)
+
+
+# =============================================================================
+# Refuels
+# =============================================================================
+
+
+async def _refuels(conn, truck_ids: List[str], days_back: int) -> List[Dict]:
+    """
+    Per truck: refuel_events rows if it has any, else consolidated
+    fuel_metrics refuels - database_mysql.get_refuel_history() semantics,
+    two queries for any number of trucks
+    """
+    truck_filter = "AND truck_id IN :truck_ids"
+    params = {"days_back": days_back, "truck_ids": tuple(truck_ids)}
+
+    try:
+        events = await _fetch_all(
+            conn,
+            _pyformat(REFUEL_EVENTS_QUERY.format(truck_filter=truck_filter)),
+            params,
+        )
+    except Exception as e:
+        logger.warning(f"Could not read from refuel_events table: {e}")
+        events = []
+
+    refuels = [format_refuel_event(row) for row in events]
+    with_events = {row["truck_id"] for row in events}
+    missing = [t for t in truck_ids if t not in with_events]
+    if missing:
+        rows = await _fetch_all(
+            conn,
+            _pyformat(REFUEL_METRICS_QUERY.format(truck_filter=truck_filter)),
+            {"days_back": days_back, "truck_ids": tuple(missing)},
+        )
+        refuels.extend(consolidate_refuels(rows))
+
+    refuels.sort(key=lambda x: x["timestamp"], reverse=True)
+    return refuels
+
+
+async def refuel_history(truck_id: str, days_back: int = 30) -> List[Dict]:
+    """database_mysql.get_refuel_history(truck_id) on aiomysql"""
+    async with AsyncConnection() as conn:
+        return await _refuels(conn, [truck_id], days_back)
+
+
+async def all_refuels(
+    days_back: int = 7, latest: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict]:
+    """DatabaseManager.get_all_refuels() without the per-truck round trips"""
+    async with AsyncConnection() as conn:
+        trucks = latest
+        if trucks is None:
+            trucks = await aget_latest_states(
+                conn, columns=["truck_id"], max_age_hours=24
+            )
+        if not trucks:
+            return []
+        return await _refuels(conn, [row["truck_id"] for row in trucks], days_back)
+
+
+# =============================================================================
+# Alerts
+# =============================================================================
+
+
+def _alerts(rows: Iterable[Dict[str, Any]]) -> List[Dict]:
+    alerts = []
+    for row in rows:
+        if row["timestamp_utc"] is None:
+            continue
+        try:
+            alerts.extend(truck_alerts(row["truck_id"], row, row["timestamp_utc"]))
+        except Exception as e:
+            logger.warning(f"Error checking alerts for {row['truck_id']}: {e}")
+    return sort_alerts(alerts)
+
+
+async def active_alerts(latest: Optional[List[Dict[str, Any]]] = None) -> List[Dict]:
+    """DatabaseManager.get_alerts() from a single latest-state read"""
+    if latest is None:
+        async with AsyncConnection() as conn:
+            latest = await aget_latest_states(
+                conn, columns=ALERT_COLUMNS, max_age_hours=24
+            )
+    return _alerts(latest)
+
+
+# =============================================================================
+# KPIs
+# =============================================================================
+
+
+async def fleet_kpis(days_back: int = 1) -> Dict[str, Any]:
+    """database_mysql.get_kpi_summary() on aiomysql (same cache entry)"""
+    cache_key = None
+    if memory_cache is not None:
+        # Key and TTL come from @cached on get_kpi_summary, so both paths
+        # hit and fill the same entry
+        cache_key = get_kpi_summary.cache_key(days_back=days_back)
+        cached = memory_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    async with AsyncConnection() as conn:
+        (row,) = await _fetch_all(
+            conn,
+            _pyformat(KPI_SUMMARY_QUERY),
+            {"days_back": days_back},
+            aiomysql.Cursor,
+        )
+
+    kpis = build_kpi_summary(row, days_back, FUEL.PRICE_PER_GALLON)
+    if memory_cache is not None:
+        memory_cache.set(cache_key, kpis, ttl=get_kpi_summary.ttl_seconds)
+    return kpis
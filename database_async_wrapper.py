@@ -5,26 +5,86 @@ Async Wrapper for database.py
 Wraps synchronous database.py methods with async equivalents
 to eliminate blocking I/O in FastAPI endpoints.
 
+🆕 v5.12.21: The hot dashboard reads (fleet summary, truck detail, refuels,
+alerts, KPIs) run natively on aiomysql (database_async_reads) and only fall
+back to the sync DatabaseManager - MySQL errors, no MySQL data (CSV mode) or
+API_NATIVE_READS=false. Sync work runs on a dedicated executor sized by
+API_DB_EXECUTOR_WORKERS instead of asyncio's shared default pool, so it
+cannot starve (or be starved by) unrelated to_thread() users.
+
+🆕 v5.12.22: get_latest_states() plus a `latest` argument on the fleet,
+alert and refuel reads let /batch share one latest-state read between them.
+
 Author: Fuel Copilot Team
 Date: December 26, 2025
-Version: 1.0.0 with complete type hints
+Version: 1.2.0 with shared latest-state reads
 """
 
 import asyncio
-from functools import wraps
+import logging
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
 from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, cast
 
 from database import DatabaseManager, db
 
+logger = logging.getLogger(__name__)
+
+try:
+    import database_async_reads
+
+    NATIVE_READS_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"⚠️ Native async reads unavailable, using sync paths: {e}")
+    database_async_reads = None
+    NATIVE_READS_AVAILABLE = False
+
 # Type variable for generic function wrapping
 T = TypeVar("T")
 
+# One thread per SQLAlchemy connection (MYSQL_POOL_SIZE + MYSQL_MAX_OVERFLOW):
+# more threads than that would only queue on the pool while holding memory
+DB_EXECUTOR_WORKERS = int(os.getenv("API_DB_EXECUTOR_WORKERS", "15"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Dedicated thread pool for the remaining synchronous database calls"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="api-db"
+                )
+    return _executor
+
+
+def shutdown_db_executor() -> None:
+    """Stop the executor without blocking the event loop (shutdown hook)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database call on the dedicated executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), partial(func, *args, **kwargs))
+
 
 def async_wrapper(sync_func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
     """
     Decorator to wrap synchronous database functions as async.
 
-    Runs sync function in thread pool to avoid blocking event loop.
+    Runs sync function in the database executor to avoid blocking event loop.
 
     Args:
         sync_func: Synchronous function to wrap
@@ -35,8 +95,7 @@ def async_wrapper(sync_func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
 
     @wraps(sync_func)
     async def wrapper(*args: Any, **kwargs: Any) -> T:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: sync_func(*args, **kwargs))
+        return await run_sync(sync_func, *args, **kwargs)
 
     return wrapper
 
@@ -49,14 +108,72 @@ class AsyncDatabaseWrapper:
     blocking the FastAPI event loop.
     """
 
-    def __init__(self, db_instance: DatabaseManager = db) -> None:
+    def __init__(
+        self, db_instance: DatabaseManager = db, native_reads: Optional[bool] = None
+    ) -> None:
         """
         Initialize wrapper with database instance.
 
         Args:
             db_instance: DatabaseManager instance to wrap (default: global db)
+            native_reads: Use the aiomysql hot paths (default: API_NATIVE_READS,
+                true unless set to false)
         """
         self._db = db_instance
+        if native_reads is None:
+            native_reads = os.getenv("API_NATIVE_READS", "true").lower() != "false"
+        self.native_reads = native_reads and NATIVE_READS_AVAILABLE
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"native": 0, "sync": 0, "native_errors": 0}
+        )
+
+    async def _read(
+        self,
+        name: str,
+        native: Callable[..., Awaitable[Any]],
+        sync: Callable[..., Any],
+        *args: Any,
+        fallback_on_empty: bool = False,
+    ) -> Any:
+        """
+        Native aiomysql read, falling back to the sync DatabaseManager method.
+
+        fallback_on_empty: also fall back when MySQL returned nothing, for
+        methods whose sync version tries the CSV reports next
+        """
+        stats = self.stats[name]
+        if self.native_reads and self._db.mysql_available:
+            try:
+                result = await native(*args)
+                if result or not fallback_on_empty:
+                    stats["native"] += 1
+                    return result
+            except Exception as e:
+                stats["native_errors"] += 1
+                logger.warning(f"⚠️ Native {name} failed, using sync path: {e}")
+        stats["sync"] += 1
+        return await run_sync(sync, *args)
+
+    def _native(self, name: str, **kwargs: Any) -> Optional[Callable[..., Any]]:
+        """database_async_reads.<name>, with keyword arguments bound"""
+        if database_async_reads is None:
+            return None
+        return partial(getattr(database_async_reads, name), **kwargs)
+
+    async def get_latest_states(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        🆕 v5.12.22: Latest state of every truck for sharing between reads.
+
+        None when the native path is unavailable (CSV mode, MySQL down,
+        API_NATIVE_READS=false): callers then let each read fetch its own.
+        """
+        if not (self.native_reads and self._db.mysql_available):
+            return None
+        try:
+            return await database_async_reads.latest_states()
+        except Exception as e:
+            logger.warning(f"⚠️ Native latest_states failed: {e}")
+            return None
 
     async def get_all_trucks(self) -> List[str]:
         """
@@ -65,8 +182,7 @@ class AsyncDatabaseWrapper:
         Returns:
             List of truck ID strings
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._db.get_all_trucks)
+        return await run_sync(self._db.get_all_trucks)
 
     async def get_truck_latest_record(self, truck_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -78,9 +194,12 @@ class AsyncDatabaseWrapper:
         Returns:
             Latest truck record dict or None if not found
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None, self._db.get_truck_latest_record, truck_id
+        return await self._read(
+            "truck_latest_record",
+            database_async_reads and database_async_reads.truck_latest_record,
+            self._db.get_truck_latest_record,
+            truck_id,
+            fallback_on_empty=True,
         )
 
     async def get_trucks_batch(self, truck_ids: List[str]) -> Dict[str, Dict[str, Any]]:
@@ -93,18 +212,26 @@ class AsyncDatabaseWrapper:
         Returns:
             Dictionary mapping truck_id to truck record
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._db.get_trucks_batch, truck_ids)
+        return await run_sync(self._db.get_trucks_batch, truck_ids)
 
-    async def get_fleet_summary(self) -> Dict[str, Any]:
+    async def get_fleet_summary(
+        self, latest: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Get fleet summary statistics (async).
 
+        Args:
+            latest: Shared rows from get_latest_states() (native path only)
+
         Returns:
             Dictionary with fleet metrics (active_trucks, avg_mpg, etc.)
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._db.get_fleet_summary)
+        return await self._read(
+            "fleet_summary",
+            self._native("fleet_summary", latest=latest),
+            self._db.get_fleet_summary,
+            fallback_on_empty=True,
+        )
 
     async def get_truck_history(
         self, truck_id: str, hours: int = 24
@@ -119,10 +246,7 @@ class AsyncDatabaseWrapper:
         Returns:
             List of historical data point dicts
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None, self._db.get_truck_history, truck_id, hours
-        )
+        return await run_sync(self._db.get_truck_history, truck_id, hours)
 
     async def get_refuel_history(
         self, truck_id: str, days: int = 30
@@ -137,23 +261,34 @@ class AsyncDatabaseWrapper:
         Returns:
             List of refuel event dicts
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None, self._db.get_refuel_history, truck_id, days
+        return await self._read(
+            "refuel_history",
+            database_async_reads and database_async_reads.refuel_history,
+            self._db.get_refuel_history,
+            truck_id,
+            days,
+            fallback_on_empty=True,
         )
 
-    async def get_all_refuels(self, days: int = 7) -> List[Dict[str, Any]]:
+    async def get_all_refuels(
+        self, days: int = 7, latest: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get all refuels for entire fleet (async).
 
         Args:
             days: Number of days of history (default: 7)
+            latest: Shared rows from get_latest_states() (native path only)
 
         Returns:
             List of refuel event dicts for all trucks
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._db.get_all_refuels, days)
+        return await self._read(
+            "all_refuels",
+            self._native("all_refuels", latest=latest),
+            self._db.get_all_refuels,
+            days,
+        )
 
     async def get_efficiency_rankings(self) -> List[Dict[str, Any]]:
         """
@@ -162,18 +297,28 @@ class AsyncDatabaseWrapper:
         Returns:
             List of truck efficiency dicts sorted by MPG
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._db.get_efficiency_rankings)
+        return await run_sync(self._db.get_efficiency_rankings)
 
-    async def get_active_alerts(self) -> List[Dict[str, Any]]:
+    async def get_active_alerts(
+        self, latest: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get active alerts (async).
 
+        🆕 v5.12.21: DatabaseManager has no get_active_alerts(); the sync
+        fallback is get_alerts()
+
+        Args:
+            latest: Shared rows from get_latest_states() (native path only)
+
         Returns:
             List of active alert dicts
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._db.get_active_alerts)
+        return await self._read(
+            "active_alerts",
+            self._native("active_alerts", latest=latest),
+            self._db.get_alerts,
+        )
 
     async def get_alerts(self) -> List[Dict[str, Any]]:
         """
@@ -184,15 +329,27 @@ class AsyncDatabaseWrapper:
         """
         return await self.get_active_alerts()
 
-    async def get_fleet_kpis(self) -> Dict[str, Any]:
+    async def get_fleet_kpis(self, days: int = 1) -> Dict[str, Any]:
         """
         Get fleet KPIs (async).
 
+        🆕 v5.12.21: Sync fallback is database_mysql.get_kpi_summary()
+        (DatabaseManager has no get_fleet_kpis())
+
+        Args:
+            days: Number of days to analyze (default: 1)
+
         Returns:
             Dictionary with KPI metrics
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._db.get_fleet_kpis)
+        from database_mysql import get_kpi_summary
+
+        return await self._read(
+            "fleet_kpis",
+            database_async_reads and database_async_reads.fleet_kpis,
+            get_kpi_summary,
+            days,
+        )
 
 
 # Global async wrapper instance
@@ -83,10 +83,15 @@ def get_raw_sensor_history(
         return pd.DataFrame()
 
 
-def get_fuel_consumption_trend(truck_id: str, hours_back: int = 48) -> Dict[str, Any]:
+def get_fuel_consumption_trend(
+    truck_id: str, hours_back: int = 48, max_points: Optional[int] = None
+) -> Dict[str, Any]:
     """
     NEW FEATURE: Analyze fuel consumption trend from raw sensor data
     Shows actual fuel level changes over time
+
+    🆕 v5.12.3: With max_points the timeline is always returned, reduced with
+    LTTB, plus min/max/avg bands (instead of being dropped above 500 points)
     """
     df = get_raw_sensor_history(truck_id, hours_back, "fuel_lvl")
 
@@ -108,6 +113,21 @@ def get_fuel_consumption_trend(truck_id: str, hours_back: int = 48) -> Dict[str,
     # Filter out refuels (large positive changes)
     df_consumption = df[df["fuel_delta"] < 5].copy()  # Skip refuels
 
+    if max_points:
+        from downsampling import bucket_bands, bands_to_records, lttb_indices
+
+        epochs = df["epoch"].to_numpy(dtype=float)
+        values = df["value"].to_numpy(dtype=float)
+        timeline = df[["timestamp_utc", "value"]].iloc[
+            lttb_indices(epochs, values, max_points)
+        ]
+        bands = bands_to_records(
+            bucket_bands(epochs, values, max(1, max_points // 4)), "timestamp_utc"
+        )
+    else:
+        timeline = df[["timestamp_utc", "value"]] if len(df) < 500 else None
+        bands = None
+
     return {
         "truck_id": truck_id,
         "hours_analyzed": hours_back,
@@ -120,9 +140,8 @@ def get_fuel_consumption_trend(truck_id: str, hours_back: int = 48) -> Dict[str,
             if len(df_consumption) > 0
             else None
         ),
-        "timeline": (
-            df[["timestamp_utc", "value"]].to_dict("records") if len(df) < 500 else None
-        ),
+        "timeline": timeline.to_dict("records") if timeline is not None else None,
+        **({"bands": bands} if bands is not None else {}),
     }
 
 
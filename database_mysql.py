@@ -19,9 +19,12 @@ from typing import Any, Dict, Generator, List, Optional
 
 import pandas as pd
 import pymysql
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Connection, Engine
-from sqlalchemy.pool import QueuePool
+
+from connection_manager import get_connection_manager
+from partition_manager import with_archived
+from src.repositories.latest_state_repository import get_latest_states
 
 logger = logging.getLogger(__name__)
 
@@ -112,33 +115,18 @@ _engine = None
 
 def get_sqlalchemy_engine() -> Engine:
     """
-    Get or create SQLAlchemy engine with connection pooling.
+    Get SQLAlchemy engine with connection pooling.
 
     🔧 FIX v3.9.2: Enhanced pooling configuration
-    - pool_size=10: Base pool size
-    - max_overflow=5: Extra connections under load
-    - pool_recycle=3600: Recycle after 1 hour
-    - pool_pre_ping=True: Health check before use
+    🆕 v5.12.16: Engine/pool owned by connection_manager (sized from settings,
+    pre-ping, checkout histograms, leak detection) and shared with every
+    other caller that points at the same database
     """
     global _engine
     if _engine is None:
-        connection_string = (
-            f"mysql+pymysql://{MYSQL_CONFIG['user']}:{MYSQL_CONFIG['password']}@"
-            f"{MYSQL_CONFIG['host']}:{MYSQL_CONFIG['port']}/{MYSQL_CONFIG['database']}"
-            f"?charset={MYSQL_CONFIG['charset']}"
-        )
-        _engine = create_engine(
-            connection_string,
-            poolclass=QueuePool,
-            pool_size=10,  # 🔧 FIX v3.9.2: Increased from default (5)
-            max_overflow=5,  # 🔧 FIX v3.9.2: Allow burst capacity
-            pool_pre_ping=True,  # Health check connections
-            pool_recycle=3600,  # Recycle after 1 hour
-            echo=False,  # Disable SQL logging in production
-        )
-        logger.info(
-            "✅ SQLAlchemy engine created with connection pooling (10+5 connections)"
-        )
+        manager = get_connection_manager()
+        _engine = manager.engine(manager.pool_for(MYSQL_CONFIG))
+        logger.info("✅ SQLAlchemy engine attached to connection_manager pool")
     return _engine
 
 
@@ -160,6 +148,81 @@ def get_db_connection() -> Generator[Connection, None, None]:
         conn.close()
 
 
+# 🆕 v5.12.15: Latest-state columns served by get_latest_truck_data()
+LATEST_TRUCK_DATA_COLUMNS = (
+    "truck_id",
+    "timestamp_utc",
+    "truck_status",
+    "latitude",
+    "longitude",
+    "speed_mph",
+    "estimated_liters",
+    "estimated_pct",
+    "sensor_pct",
+    "sensor_liters",
+    "consumption_gph",
+    "idle_method",
+    "mpg_current",
+    "rpm",
+    "odometer_mi",
+    "anchor_type",
+    "anchor_detected",
+    "data_age_min",
+    "idle_mode",
+    "drift_pct",
+    "drift_warning",
+    "altitude_ft",
+    "coolant_temp_f",
+    "battery_voltage",
+    "sats",
+    "pwr_int",
+    "gps_quality",
+    "dtc",
+    "dtc_code",
+    "terrain_factor",
+    "idle_hours_ecu",
+    "idle_gph",
+    "engine_hours",
+    "estimated_gallons",
+    "sensor_gallons",
+    "def_level_pct",
+    "oil_pressure_psi",
+    "oil_temp_f",
+    "engine_load_pct",
+    "ambient_temp_f",
+    "intake_air_temp_f",
+    "trans_temp_f",
+    "fuel_temp_f",
+)
+
+
+# 🆕 v5.12.21: Shared with database_async_reads.truck_latest_record()
+TRUCK_AVERAGES_24H_QUERY = """
+        SELECT
+            truck_id,
+            -- 🆕 24h MPG averages (MOVING trucks only)
+            AVG(CASE WHEN truck_status = 'MOVING'
+                      AND mpg_current > 3.5 AND mpg_current < 12
+                     THEN LEAST(mpg_current, 8.2) END) as avg_mpg_24h,
+            SUM(CASE WHEN truck_status = 'MOVING'
+                      AND mpg_current > 3.5 AND mpg_current < 12
+                     THEN 1 END) as mpg_readings_24h,
+            -- 🆕 24h idle averages (STOPPED trucks with motor on)
+            AVG(CASE WHEN truck_status = 'STOPPED'
+                      AND idle_method != 'NOT_IDLE'
+                      AND consumption_gph > 0.1 AND consumption_gph < 5.0
+                     THEN consumption_gph END) as avg_idle_gph_24h,
+            SUM(CASE WHEN truck_status = 'STOPPED'
+                      AND idle_method != 'NOT_IDLE'
+                      AND consumption_gph > 0.1 AND consumption_gph < 5.0
+                     THEN 1 END) as idle_readings_24h
+        FROM fuel_metrics
+        WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
+        {truck_filter}
+        GROUP BY truck_id
+    """
+
+
 def get_latest_truck_data(hours_back: int = 24) -> pd.DataFrame:
     """
     Get latest record for each truck from last N hours
@@ -171,101 +234,29 @@ def get_latest_truck_data(hours_back: int = 24) -> pd.DataFrame:
     🔧 FIX Dec 19 2025: Removed non-existent columns (refuel_gallons, refuel_events_total, flags)
     Real columns: speed_mph, estimated_pct, estimated_liters, sensor_pct,
     sensor_liters, rpm, drift_pct, idle_mode, etc.
+    🆕 v5.12.15: Latest rows come from fuel_metrics_latest (PK scan) via
+    get_latest_states(); only the 24h averages still aggregate fuel_metrics.
     """
-    query = text(
-        """
-        SELECT 
-            t1.truck_id,
-            t1.timestamp_utc,
-            t1.truck_status,
-            t1.latitude,
-            t1.longitude,
-            t1.speed_mph,
-            t1.estimated_liters,
-            t1.estimated_pct,
-            t1.sensor_pct,
-            t1.sensor_liters,
-            t1.consumption_gph,
-            t1.idle_method,
-            LEAST(t1.mpg_current, 8.2) as mpg_current,
-            t1.rpm,
-            t1.odometer_mi,
-            t1.anchor_type,
-            t1.anchor_detected,
-            t1.data_age_min,
-            t1.idle_mode,
-            t1.drift_pct,
-            t1.drift_warning,
-            t1.altitude_ft,
-            t1.coolant_temp_f,
-            -- 🆕 v5.7.6: Diagnostic fields for Sensor Health dashboard
-            t1.battery_voltage,
-            t1.sats,
-            t1.pwr_int,
-            t1.gps_quality,
-            t1.dtc,
-            t1.dtc_code,
-            t1.terrain_factor,
-            t1.idle_hours_ecu,
-            t1.idle_gph,
-            t1.engine_hours,
-            t1.estimated_gallons,
-            t1.sensor_gallons,
-            t1.def_level_pct,
-            t1.oil_pressure_psi,
-            t1.oil_temp_f,
-            t1.engine_load_pct,
-            t1.ambient_temp_f,
-            t1.intake_air_temp_f,
-            t1.trans_temp_f,
-            t1.fuel_temp_f,
-            -- 🆕 v3.12.14: Consumption in LPH (GPH * 3.78541)
-            ROUND(t1.consumption_gph * 3.78541, 2) as consumption_lph,
-            -- 🆕 24h averages for stable metrics
-            mpg_avg.avg_mpg_24h,
-            mpg_avg.mpg_readings_24h,
-            idle_avg.avg_idle_gph_24h,
-            idle_avg.idle_readings_24h
-        FROM fuel_metrics t1
-        INNER JOIN (
-            SELECT truck_id, MAX(timestamp_utc) as max_time
-            FROM fuel_metrics
-            WHERE timestamp_utc > NOW() - INTERVAL :hours_back HOUR
-            GROUP BY truck_id
-        ) t2 ON t1.truck_id = t2.truck_id AND t1.timestamp_utc = t2.max_time
-        -- 🆕 Join with 24h MPG averages (MOVING trucks only)
-        LEFT JOIN (
-            SELECT 
-                truck_id,
-                AVG(LEAST(mpg_current, 8.2)) as avg_mpg_24h,
-                COUNT(*) as mpg_readings_24h
-            FROM fuel_metrics
-            WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
-              AND truck_status = 'MOVING'
-              AND mpg_current > 3.5 AND mpg_current < 12
-            GROUP BY truck_id
-        ) mpg_avg ON t1.truck_id = mpg_avg.truck_id
-        -- 🆕 Join with 24h idle averages (STOPPED trucks with motor on)
-        LEFT JOIN (
-            SELECT 
-                truck_id,
-                AVG(consumption_gph) as avg_idle_gph_24h,
-                COUNT(*) as idle_readings_24h
-            FROM fuel_metrics
-            WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
-              AND truck_status = 'STOPPED'
-              AND idle_method != 'NOT_IDLE'
-              AND consumption_gph > 0.1 AND consumption_gph < 5.0
-            GROUP BY truck_id
-        ) idle_avg ON t1.truck_id = idle_avg.truck_id
-        ORDER BY t1.truck_id
-    """
-    )
+    averages_query = text(TRUCK_AVERAGES_24H_QUERY.format(truck_filter=""))
 
     try:
         # ✅ FIX: Use SQLAlchemy engine for pandas compatibility with positional params
         engine = get_sqlalchemy_engine()
-        df = pd.read_sql_query(query, engine, params={"hours_back": hours_back})
+        with engine.connect() as conn:
+            latest = get_latest_states(
+                conn, columns=LATEST_TRUCK_DATA_COLUMNS, max_age_hours=hours_back
+            )
+            averages = pd.read_sql_query(averages_query, conn)
+
+        df = pd.DataFrame(latest, columns=list(LATEST_TRUCK_DATA_COLUMNS))
+        if df.empty:
+            logger.info("Retrieved 0 trucks from MySQL")
+            return df
+
+        df["mpg_current"] = df["mpg_current"].clip(upper=8.2)
+        # 🆕 v3.12.14: Consumption in LPH (GPH * 3.78541)
+        df["consumption_lph"] = (df["consumption_gph"] * 3.78541).round(2)
+        df = df.merge(averages, on="truck_id", how="left")
 
         # Convert timestamp column explicitly
         if "timestamp_utc" in df.columns and not df.empty:
@@ -279,6 +270,28 @@ def get_latest_truck_data(hours_back: int = 24) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+TRUCK_HISTORY_COLUMNS = (
+    "truck_id",
+    "timestamp_utc",
+    "truck_status",
+    "estimated_pct",
+    "sensor_pct",
+    "estimated_gallons",
+    "drift_pct",
+    "mpg_current",
+    "speed_mph",
+    "rpm",
+    "consumption_gph",
+    "consumption_lph",
+    "idle_gph",
+    "idle_method",
+    "odometer_mi",
+    "coolant_temp_f",
+    "engine_load_pct",
+    "confidence_indicator",
+)
+
+
 def get_truck_history(truck_id: str, hours_back: int = 168) -> pd.DataFrame:
     """
     Get historical data for specific truck
@@ -286,9 +299,11 @@ def get_truck_history(truck_id: str, hours_back: int = 168) -> pd.DataFrame:
         truck_id: Truck identifier (e.g., 'DO9356')
         hours_back: Hours of history to retrieve (default 7 days = 168 hours)
     """
+    # 🆕 v5.12.3: Project the columns history/trend endpoints read instead of
+    # SELECT * (fuel_metrics has 60+ columns)
     query = text(
-        """
-        SELECT *
+        f"""
+        SELECT {", ".join(TRUCK_HISTORY_COLUMNS)}
         FROM fuel_metrics
         WHERE truck_id = :truck_id
           AND timestamp_utc > NOW() - INTERVAL :hours_back HOUR
@@ -303,6 +318,17 @@ def get_truck_history(truck_id: str, hours_back: int = 168) -> pd.DataFrame:
             query, engine, params={"truck_id": truck_id, "hours_back": hours_back}
         )
 
+        # 🆕 v5.12.17: Ranges older than the retention window come from the archive
+        end = datetime.now(timezone.utc)
+        df = with_archived(
+            df,
+            end - timedelta(hours=hours_back),
+            end,
+            TRUCK_HISTORY_COLUMNS,
+            truck_ids=[truck_id],
+            descending=True,
+        )
+
         if "timestamp_utc" in df.columns:
             df["timestamp_utc"] = pd.to_datetime(df["timestamp_utc"])
 
@@ -313,6 +339,178 @@ def get_truck_history(truck_id: str, hours_back: int = 168) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+# 🔧 DEC 26 FIX: Fixed column names to match actual table schema
+# - timestamp_utc -> refuel_time
+# - fuel_after -> after_pct
+# - fuel_before -> before_pct
+# 🆕 v5.12.21: Module-level so database_async_reads runs the same SQL
+REFUEL_EVENTS_QUERY = """
+        SELECT 
+            truck_id,
+            refuel_time as timestamp_utc,
+            gallons_added as refuel_gallons,
+            after_pct as fuel_level_after_pct,
+            before_pct as fuel_level_before_pct,
+            refuel_type,
+            confidence
+        FROM refuel_events
+        WHERE refuel_time > NOW() - INTERVAL :days_back DAY
+        {truck_filter}
+        ORDER BY refuel_time DESC
+    """
+
+REFUEL_METRICS_QUERY = """
+        SELECT 
+            truck_id,
+            timestamp_utc,
+            refuel_gallons,
+            estimated_pct as fuel_level_after_pct,
+            estimated_liters as fuel_level_after_liters,
+            estimated_gallons as fuel_level_after_gallons,
+            truck_status as status,
+            odometer_mi
+        FROM fuel_metrics
+        WHERE refuel_gallons > 0
+          AND timestamp_utc > NOW() - INTERVAL :days_back DAY
+          {truck_filter}
+        ORDER BY timestamp_utc ASC
+    """
+
+
+def format_refuel_event(row: Dict[str, Any]) -> Dict[str, Any]:
+    """One refuel_events row -> RefuelEvent dict"""
+    ts = row["timestamp_utc"]
+    if isinstance(ts, str):
+        ts = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+
+    gallons = float(row.get("refuel_gallons", 0) or 0)
+    fuel_after = float(row.get("fuel_level_after_pct", 0) or 0)
+    fuel_before = float(row.get("fuel_level_before_pct", 0) or 0)
+
+    # Convert fuel_after from gallons to percentage if needed
+    # The refuel_events table stores actual percentage values
+    if fuel_after > 100:
+        # It's in gallons, convert to percentage assuming 200 gal tank
+        fuel_after_pct = (fuel_after / 200) * 100
+    else:
+        fuel_after_pct = fuel_after
+
+    # 🔧 DEC 26 FIX: Match field names to RefuelEvent model in trucks_router.py
+    return {
+        "truck_id": row["truck_id"],
+        "timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"),
+        "date": ts.strftime("%Y-%m-%d"),
+        "time": ts.strftime("%H:%M:%S"),
+        "gallons": round(gallons, 1),  # Legacy field
+        "liters": round(gallons * 3.78541, 1),  # Legacy field
+        "gallons_added": round(gallons, 1),  # New field name
+        "liters_added": round(gallons * 3.78541, 1),  # New field name
+        "fuel_before_pct": (round(fuel_before, 1) if fuel_before > 0 else 0.0),
+        "fuel_after_pct": (round(fuel_after_pct, 1) if fuel_after_pct > 0 else 0.0),
+        "fuel_level_after": (  # Legacy field
+            round(fuel_after_pct, 1) if fuel_after_pct > 0 else None
+        ),
+        "fuel_level_before": (  # Legacy field
+            round(fuel_before, 1) if fuel_before > 0 else None
+        ),
+        "source": "refuel_events",
+    }
+
+
+def consolidate_refuels(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    fuel_metrics refuel rows -> one refuel per truck per day
+
+    🔧 v3.10.13: Consolidate BY DAY - the LARGEST single refuel of each day,
+    most recent first
+    """
+    # Group records by (truck_id, date)
+    truck_day_records = {}
+    for row in results:
+        tid = row["truck_id"]
+        timestamp_utc = row["timestamp_utc"]
+        if isinstance(timestamp_utc, datetime):
+            ts = timestamp_utc
+        else:
+            ts = datetime.strptime(str(timestamp_utc), "%Y-%m-%d %H:%M:%S")
+
+        date_str = ts.strftime("%Y-%m-%d")
+        key = (tid, date_str)
+        if key not in truck_day_records:
+            truck_day_records[key] = []
+        truck_day_records[key].append((ts, row))
+
+    # Process each day: take the LARGEST single refuel
+    consolidated_results = []
+    # 🔧 FIX v5.6.1: Was 40, now 10 to match detection threshold in wialon_sync_enhanced.py
+    # This was causing ~30% of detected refuels to be filtered out in queries!
+    MIN_REFUEL_GAL = 10
+
+    for (tid, date_str), day_records in truck_day_records.items():
+        # Find the record with largest refuel_gallons
+        best_ts, best_row = max(
+            day_records, key=lambda x: float(x[1].get("refuel_gallons", 0))
+        )
+
+        max_gallons = float(best_row.get("refuel_gallons", 0))
+
+        # Skip if below minimum threshold
+        if max_gallons < MIN_REFUEL_GAL:
+            continue
+
+        fuel_level_after_pct = (
+            float(best_row.get("fuel_level_after_pct", 0))
+            if best_row.get("fuel_level_after_pct")
+            else 0
+        )
+
+        # 🔧 v3.12.0: Lowered threshold from 55% to 40% to capture partial refuels
+        # A real refuel should result in fuel > 40% (allows emergency/partial fills)
+        if fuel_level_after_pct < 40:
+            continue
+
+        # Cap at reasonable max
+        total_gallons = min(max_gallons, 200.0)
+
+        fuel_level_after_gallons = (
+            float(best_row.get("fuel_level_after_gallons", 0))
+            if best_row.get("fuel_level_after_gallons")
+            else 0
+        )
+
+        # Estimate fuel_before
+        if fuel_level_after_gallons > 0 and fuel_level_after_pct > 0:
+            fuel_before_gal = max(0, fuel_level_after_gallons - total_gallons)
+            fuel_level_before = (
+                fuel_before_gal / fuel_level_after_gallons
+            ) * fuel_level_after_pct
+        else:
+            fuel_level_before = None
+
+        timestamp_str = best_ts.strftime("%Y-%m-%d %H:%M:%S")
+
+        refuel_event = {
+            "truck_id": tid,
+            "timestamp": timestamp_str,
+            "date": date_str,
+            "time": best_ts.strftime("%H:%M:%S"),
+            "gallons": round(total_gallons, 1),
+            "liters": round(total_gallons * 3.78541, 1),
+            "fuel_level_after": (
+                fuel_level_after_pct if fuel_level_after_pct > 0 else None
+            ),
+            "fuel_level_before": (
+                round(fuel_level_before, 1) if fuel_level_before else None
+            ),
+            "consolidated_from": len(day_records),
+        }
+        consolidated_results.append(refuel_event)
+
+    # Sort by timestamp descending (most recent first)
+    consolidated_results.sort(key=lambda x: x["timestamp"], reverse=True)
+    return consolidated_results
+
+
 def get_refuel_history(
     truck_id: Optional[str] = None, days_back: int = 7
 ) -> List[Dict[str, Any]]:
@@ -334,35 +532,14 @@ def get_refuel_history(
         - liters: float
         - fuel_level_after: float (optional)
     """
-
-    # First, try to get from refuel_events table (where detected refuels are saved)
-    # 🔧 DEC 26 FIX: Fixed column names to match actual table schema
-    # - timestamp_utc -> refuel_time
-    # - fuel_after -> after_pct
-    # - fuel_before -> before_pct
-    refuel_events_query = text(
-        """
-        SELECT 
-            truck_id,
-            refuel_time as timestamp_utc,
-            gallons_added as refuel_gallons,
-            after_pct as fuel_level_after_pct,
-            before_pct as fuel_level_before_pct,
-            refuel_type,
-            confidence
-        FROM refuel_events
-        WHERE refuel_time > NOW() - INTERVAL :days_back DAY
-        {truck_filter}
-        ORDER BY refuel_time DESC
-    """.format(
-            truck_filter="AND truck_id = :truck_id" if truck_id else ""
-        )
-    )
-
+    truck_filter = "AND truck_id = :truck_id" if truck_id else ""
     params = {"days_back": days_back}
     if truck_id:
         params["truck_id"] = truck_id
 
+    # First, try to get from refuel_events table (where detected refuels are saved)
+    refuel_events_query = text(REFUEL_EVENTS_QUERY.format(truck_filter=truck_filter))
+
     try:
         engine = get_sqlalchemy_engine()
         with engine.connect() as conn:
@@ -373,96 +550,13 @@ def get_refuel_history(
                 logger.info(
                     f"Found {len(refuel_events_rows)} refuels in refuel_events table"
                 )
-
-                consolidated_results = []
-                for row in refuel_events_rows:
-                    ts = row["timestamp_utc"]
-                    if isinstance(ts, str):
-                        ts = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-
-                    gallons = float(row.get("refuel_gallons", 0) or 0)
-                    fuel_after = float(row.get("fuel_level_after_pct", 0) or 0)
-                    fuel_before = float(row.get("fuel_level_before_pct", 0) or 0)
-
-                    # Convert fuel_after from gallons to percentage if needed
-                    # The refuel_events table stores actual percentage values
-                    if fuel_after > 100:
-                        # It's in gallons, convert to percentage assuming 200 gal tank
-                        fuel_after_pct = (fuel_after / 200) * 100
-                    else:
-                        fuel_after_pct = fuel_after
-
-                    # 🔧 DEC 26 FIX: Match field names to RefuelEvent model in trucks_router.py
-                    refuel_event = {
-                        "truck_id": row["truck_id"],
-                        "timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"),
-                        "date": ts.strftime("%Y-%m-%d"),
-                        "time": ts.strftime("%H:%M:%S"),
-                        "gallons": round(gallons, 1),  # Legacy field
-                        "liters": round(gallons * 3.78541, 1),  # Legacy field
-                        "gallons_added": round(gallons, 1),  # New field name
-                        "liters_added": round(gallons * 3.78541, 1),  # New field name
-                        "fuel_before_pct": (
-                            round(fuel_before, 1) if fuel_before > 0 else 0.0
-                        ),
-                        "fuel_after_pct": (
-                            round(fuel_after_pct, 1) if fuel_after_pct > 0 else 0.0
-                        ),
-                        "fuel_level_after": (  # Legacy field
-                            round(fuel_after_pct, 1) if fuel_after_pct > 0 else None
-                        ),
-                        "fuel_level_before": (  # Legacy field
-                            round(fuel_before, 1) if fuel_before > 0 else None
-                        ),
-                        "source": "refuel_events",
-                    }
-                    consolidated_results.append(refuel_event)
-
-                return consolidated_results
+                return [format_refuel_event(row) for row in refuel_events_rows]
 
     except Exception as e:
         logger.warning(f"Could not read from refuel_events table: {e}")
 
     # Fallback: read from fuel_metrics table
-    if truck_id:
-        query = text(
-            """
-            SELECT 
-                truck_id,
-                timestamp_utc,
-                refuel_gallons,
-                estimated_pct as fuel_level_after_pct,
-                estimated_liters as fuel_level_after_liters,
-                estimated_gallons as fuel_level_after_gallons,
-                truck_status as status,
-                odometer_mi
-            FROM fuel_metrics
-            WHERE truck_id = :truck_id
-              AND refuel_gallons > 0
-              AND timestamp_utc > NOW() - INTERVAL :days_back DAY
-            ORDER BY timestamp_utc ASC
-        """
-        )
-        params = {"truck_id": truck_id, "days_back": days_back}
-    else:
-        query = text(
-            """
-            SELECT 
-                truck_id,
-                timestamp_utc,
-                refuel_gallons,
-                estimated_pct as fuel_level_after_pct,
-                estimated_liters as fuel_level_after_liters,
-                estimated_gallons as fuel_level_after_gallons,
-                truck_status as status,
-                odometer_mi
-            FROM fuel_metrics
-            WHERE refuel_gallons > 0
-              AND timestamp_utc > NOW() - INTERVAL :days_back DAY
-            ORDER BY timestamp_utc ASC
-        """
-        )
-        params = {"days_back": days_back}
+    query = text(REFUEL_METRICS_QUERY.format(truck_filter=truck_filter))
 
     try:
         # 🔧 FIX v3.9.2: Use SQLAlchemy pooled connection
@@ -474,100 +568,169 @@ def get_refuel_history(
             if not results:
                 return []
 
-            # 🔧 v3.10.13: Consolidate BY DAY - one refuel per truck per day
-            # Group records by (truck_id, date)
-            truck_day_records = {}
-            for row in results:
-                tid = row["truck_id"]
-                timestamp_utc = row["timestamp_utc"]
-                if isinstance(timestamp_utc, datetime):
-                    ts = timestamp_utc
-                else:
-                    ts = datetime.strptime(str(timestamp_utc), "%Y-%m-%d %H:%M:%S")
-
-                date_str = ts.strftime("%Y-%m-%d")
-                key = (tid, date_str)
-                if key not in truck_day_records:
-                    truck_day_records[key] = []
-                truck_day_records[key].append((ts, row))
-
-            # Process each day: take the LARGEST single refuel
-            consolidated_results = []
-            # 🔧 FIX v5.6.1: Was 40, now 10 to match detection threshold in wialon_sync_enhanced.py
-            # This was causing ~30% of detected refuels to be filtered out in queries!
-            MIN_REFUEL_GAL = 10
-
-            for (tid, date_str), day_records in truck_day_records.items():
-                # Find the record with largest refuel_gallons
-                best_ts, best_row = max(
-                    day_records, key=lambda x: float(x[1].get("refuel_gallons", 0))
-                )
+            consolidated_results = consolidate_refuels(results)
 
-                max_gallons = float(best_row.get("refuel_gallons", 0))
+            logger.info(
+                f"Retrieved {len(consolidated_results)} refuel events (consolidated from {len(results)} raw records)"
+            )
+            return consolidated_results
 
-                # Skip if below minimum threshold
-                if max_gallons < MIN_REFUEL_GAL:
-                    continue
+    except Exception as e:
+        logger.error(f"Error getting refuel history: {e}")
+        return []
 
-                fuel_level_after_pct = (
-                    float(best_row.get("fuel_level_after_pct", 0))
-                    if best_row.get("fuel_level_after_pct")
-                    else 0
-                )
 
-                # 🔧 v3.12.0: Lowered threshold from 55% to 40% to capture partial refuels
-                # A real refuel should result in fuel > 40% (allows emergency/partial fills)
-                if fuel_level_after_pct < 40:
-                    continue
+# 🆕 v5.12.15: Latest-state columns read by get_fleet_summary()
+FLEET_SUMMARY_COLUMNS = (
+    "truck_id",
+    "timestamp_utc",
+    "truck_status",
+    "estimated_pct",
+    "sensor_pct",
+    "drift_pct",
+    "drift_warning",
+    "mpg_current",
+    "consumption_lph",
+    "consumption_gph",
+    "idle_gph",
+    "oil_pressure_psi",
+    "oil_temp_f",
+    "def_level_pct",
+    "engine_load_pct",
+    "rpm",
+    "coolant_temp_f",
+    "intake_press_kpa",
+    "intake_air_temp_f",
+    "intercooler_temp_f",
+    "fuel_temp_f",
+    "ambient_temp_f",
+    "battery_voltage",
+    "engine_hours",
+    "idle_hours_ecu",
+    "dtc",
+    "dtc_code",
+    "latitude",
+    "longitude",
+    "speed_mph",
+    "altitude_ft",
+    "odometer_mi",
+)
 
-                # Cap at reasonable max
-                total_gallons = min(max_gallons, 200.0)
 
-                fuel_level_after_gallons = (
-                    float(best_row.get("fuel_level_after_gallons", 0))
-                    if best_row.get("fuel_level_after_gallons")
-                    else 0
-                )
+def _avg(values: List[Any]) -> Optional[float]:
+    """SQL AVG semantics: ignore NULLs, None when nothing is left"""
+    present = [float(v) for v in values if v is not None]
+    return sum(present) / len(present) if present else None
 
-                # Estimate fuel_before
-                if fuel_level_after_gallons > 0 and fuel_level_after_pct > 0:
-                    fuel_before_gal = max(0, fuel_level_after_gallons - total_gallons)
-                    fuel_level_before = (
-                        fuel_before_gal / fuel_level_after_gallons
-                    ) * fuel_level_after_pct
-                else:
-                    fuel_level_before = None
 
-                timestamp_str = best_ts.strftime("%Y-%m-%d %H:%M:%S")
+def _float_or_none(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
 
-                refuel_event = {
-                    "truck_id": tid,
-                    "timestamp": timestamp_str,
-                    "date": date_str,
-                    "time": best_ts.strftime("%H:%M:%S"),
-                    "gallons": round(total_gallons, 1),
-                    "liters": round(total_gallons * 3.78541, 1),
-                    "fuel_level_after": (
-                        fuel_level_after_pct if fuel_level_after_pct > 0 else None
-                    ),
-                    "fuel_level_before": (
-                        round(fuel_level_before, 1) if fuel_level_before else None
-                    ),
-                    "consolidated_from": len(day_records),
-                }
-                consolidated_results.append(refuel_event)
 
-            # Sort by timestamp descending (most recent first)
-            consolidated_results.sort(key=lambda x: x["timestamp"], reverse=True)
+def build_fleet_summary(
+    latest: List[Dict[str, Any]], db_now: Any, active_dtc_count: int
+) -> Dict[str, Any]:
+    """
+    Fleet aggregates + truck_details from FLEET_SUMMARY_COLUMNS rows
 
-            logger.info(
-                f"Retrieved {len(consolidated_results)} refuel events (consolidated from {len(results)} raw records)"
-            )
-            return consolidated_results
+    🆕 v5.12.21: Split out of get_fleet_summary() so the aiomysql path
+    (database_async_reads.fleet_summary) builds the same payload
+    """
+    total_trucks = len(latest)
+    statuses = [row["truck_status"] for row in latest]
+    active_trucks = sum(1 for st in statuses if st is not None and st != "OFFLINE")
+    offline_trucks = sum(1 for st in statuses if st == "OFFLINE")
+    avg_fuel_level = _avg([row["estimated_pct"] for row in latest])
+    avg_mpg = _avg(
+        [
+            row["mpg_current"]
+            for row in latest
+            if row["truck_status"] == "MOVING"
+            and row["mpg_current"] is not None
+            and 3.5 < row["mpg_current"] < 12
+        ]
+    )
+    avg_consumption = _avg([row["consumption_lph"] for row in latest])
+    trucks_with_drift = sum(1 for row in latest if row["drift_warning"] == "YES")
+
+    # Apply health score algorithm (from 190h refactoring)
+    health_score = calculate_fleet_health_score(active_dtc_count, total_trucks)
+
+    # 🆕 v6.5.0: Get truck_details with all sensor data (fixes N/A display)
+    # 🆕 v5.12.15: Trucks that reported in the last 5 minutes, from the
+    # same latest-state rows
+    truck_details = []
+    for row in latest:
+        ts = row["timestamp_utc"]
+        data_age_seconds = int((db_now - ts).total_seconds()) if ts and db_now else None
+        if data_age_seconds is None or data_age_seconds >= 300:
+            continue
+
+        truck_details.append(
+            {
+                "truck_id": row["truck_id"],
+                "timestamp": ts.isoformat() if ts else None,
+                "data_available": True,
+                "data_age_seconds": data_age_seconds,
+                "oil_pressure_psi": _float_or_none(row["oil_pressure_psi"]),
+                "oil_temp_f": _float_or_none(row["oil_temp_f"]),
+                "oil_level_pct": None,
+                "def_level_pct": _float_or_none(row["def_level_pct"]),
+                "engine_load_pct": _float_or_none(row["engine_load_pct"]),
+                "rpm": int(row["rpm"]) if row["rpm"] is not None else None,
+                "coolant_temp_f": _float_or_none(row["coolant_temp_f"]),
+                "coolant_level_pct": None,
+                "gear": None,
+                "brake_active": None,
+                "intake_pressure_bar": _float_or_none(row["intake_press_kpa"]),
+                "intake_temp_f": _float_or_none(row["intake_air_temp_f"]),
+                "intercooler_temp_f": _float_or_none(row["intercooler_temp_f"]),
+                "fuel_temp_f": _float_or_none(row["fuel_temp_f"]),
+                "fuel_level_pct": _float_or_none(row["sensor_pct"]),
+                "fuel_rate_gph": _float_or_none(row["consumption_gph"]),
+                "ambient_temp_f": _float_or_none(row["ambient_temp_f"]),
+                "barometric_pressure_inhg": None,
+                "voltage": _float_or_none(row["battery_voltage"]),
+                "backup_voltage": None,
+                "engine_hours": _float_or_none(row["engine_hours"]),
+                "idle_hours": _float_or_none(row["idle_hours_ecu"]),
+                "pto_hours": None,
+                "total_idle_fuel_gal": None,
+                "total_fuel_used_gal": None,
+                "dtc_count": int(row["dtc"]) if row["dtc"] is not None else None,
+                "dtc_code": row["dtc_code"],
+                "latitude": _float_or_none(row["latitude"]),
+                "longitude": _float_or_none(row["longitude"]),
+                "speed_mph": _float_or_none(row["speed_mph"]),
+                "altitude_ft": _float_or_none(row["altitude_ft"]),
+                "odometer_mi": _float_or_none(row["odometer_mi"]),
+                # From fuel_metrics
+                "estimated_pct": _float_or_none(row["estimated_pct"]),
+                "sensor_pct": _float_or_none(row["sensor_pct"]),
+                "drift_pct": _float_or_none(row["drift_pct"]),
+                "mpg": _float_or_none(row["mpg_current"]),
+                "idle_gph": _float_or_none(row["idle_gph"]),
+                "status": row["truck_status"] or "UNKNOWN",
+                "health_score": 80,
+                "health_category": "healthy",
+            }
+        )
 
-    except Exception as e:
-        logger.error(f"Error getting refuel history: {e}")
-        return []
+    return {
+        "total_trucks": total_trucks,
+        "active_trucks": active_trucks,
+        "offline_trucks": offline_trucks,
+        "avg_fuel_level": float(avg_fuel_level or 0),
+        "avg_mpg": float(avg_mpg or 0),
+        "avg_consumption": float(avg_consumption or 0),
+        "trucks_with_drift": trucks_with_drift,
+        # 🆕 Health metrics (190h algorithm)
+        "active_dtcs": active_dtc_count,
+        "health_score": health_score,
+        # 🆕 v6.5.0: Truck details with all sensors
+        "truck_details": truck_details,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
 
 
 @cached(ttl_seconds=30, key_prefix="get_fleet_summary")
@@ -579,6 +742,8 @@ def get_fleet_summary() -> Dict[str, Any]:
     🔧 FIX v3.9.2: Now uses SQLAlchemy connection pooling
     🆕 v3.12.22: Cached for 30 seconds
     🆕 v5.4.2: Now uses centralized get_allowed_trucks() from config.py
+    🆕 v5.12.15: One fuel_metrics_latest read feeds both the fleet
+    aggregates and truck_details (was two MAX(timestamp_utc) joins)
     """
     # 🆕 v5.4.2: Use centralized truck filtering
     allowed_trucks = list(get_allowed_trucks())
@@ -587,265 +752,41 @@ def get_fleet_summary() -> Dict[str, Any]:
         logger.warning("⚠️ No allowed trucks found, using empty list")
         return _empty_fleet_summary()
 
-    query = text(
-        f"""
-        SELECT 
-            COUNT(DISTINCT truck_id) as total_trucks,
-            SUM(CASE WHEN truck_status != 'OFFLINE' THEN 1 ELSE 0 END) as active_trucks,
-            SUM(CASE WHEN truck_status = 'OFFLINE' THEN 1 ELSE 0 END) as offline_trucks,
-            AVG(estimated_pct) as avg_fuel_level,
-            AVG(CASE WHEN truck_status = 'MOVING' AND mpg_current > 3.5 AND mpg_current < 12 THEN mpg_current END) as avg_mpg,
-            AVG(consumption_lph) as avg_consumption,
-            SUM(CASE WHEN drift_warning = 'YES' THEN 1 ELSE 0 END) as trucks_with_drift
-        FROM (
-            SELECT t1.*
-            FROM fuel_metrics t1
-            INNER JOIN (
-                SELECT truck_id, MAX(timestamp_utc) as max_time
-                FROM fuel_metrics
-                WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
-                  AND truck_id IN ({','.join(f"'{t}'" for t in allowed_trucks)})
-                GROUP BY truck_id
-            ) t2 ON t1.truck_id = t2.truck_id AND t1.timestamp_utc = t2.max_time
-        ) latest
-    """
-    )
-
     try:
         engine = get_sqlalchemy_engine()
         with engine.connect() as conn:
-            result = conn.execute(query).fetchone()
-
-            if result:
-                total_trucks = result[0] or 0
-
-                # 🆕 Calculate health score from active DTCs
-                # Query for active DTCs count
-                # 🔧 FIX Dec 20 2025: Tabla dtc_events tiene columna 'status', usar status = 'ACTIVE'
-                # 🔧 FIX Dec 23 2025: Catch table missing error gracefully
-                active_dtc_count = 0
-                try:
-                    dtc_query = text(
-                        """
-                        SELECT COUNT(DISTINCT CONCAT(truck_id, '-', dtc_code))
-                        FROM dtc_events
-                        WHERE status = 'ACTIVE'
-                          AND truck_id IN ({})
-                    """.format(
-                            ",".join(f"'{t}'" for t in allowed_trucks)
-                        )
-                    )
-
-                    dtc_result = conn.execute(dtc_query).fetchone()
-                    active_dtc_count = dtc_result[0] if dtc_result else 0
-                except Exception as dtc_error:
-                    logger.warning(
-                        f"DTC query failed (table may not exist): {dtc_error}"
-                    )
-                    active_dtc_count = 0
-
-                # Apply health score algorithm (from 190h refactoring)
-                health_score = calculate_fleet_health_score(
-                    active_dtc_count, total_trucks
-                )
-
-                # 🆕 v6.5.0: Get truck_details with all sensor data (fixes N/A display)
-                # � STAGING FIX Dec 23 2025: Read directly from fuel_metrics (truck_sensors_cache doesn't match prod structure)
-                truck_details = []
-                sensor_query = text(
+            latest = get_latest_states(
+                conn,
+                columns=FLEET_SUMMARY_COLUMNS,
+                truck_ids=allowed_trucks,
+                max_age_hours=24,
+            )
+            db_now = conn.execute(text("SELECT NOW()")).scalar()
+
+            # 🆕 Calculate health score from active DTCs
+            # Query for active DTCs count
+            # 🔧 FIX Dec 20 2025: Tabla dtc_events tiene columna 'status', usar status = 'ACTIVE'
+            # 🔧 FIX Dec 23 2025: Catch table missing error gracefully
+            active_dtc_count = 0
+            try:
+                dtc_query = text(
                     """
-                    SELECT 
-                        truck_id,
-                        timestamp_utc,
-                        TIMESTAMPDIFF(SECOND, timestamp_utc, NOW()) as data_age_seconds,
-                        oil_pressure_psi,
-                        oil_temp_f,
-                        NULL as oil_level_pct,
-                        def_level_pct,
-                        engine_load_pct,
-                        rpm,
-                        coolant_temp_f,
-                        NULL as coolant_level_pct,
-                        NULL as gear,
-                        NULL as brake_active,
-                        intake_press_kpa,
-                        intake_air_temp_f,
-                        intercooler_temp_f,
-                        fuel_temp_f,
-                        sensor_pct,
-                        consumption_gph,
-                        ambient_temp_f,
-                        NULL as barometric_pressure_inhg,
-                        battery_voltage,
-                        NULL as backup_voltage,
-                        engine_hours,
-                        idle_hours_ecu,
-                        NULL as pto_hours,
-                        NULL as total_idle_fuel_gal,
-                        NULL as total_fuel_used_gal,
-                        dtc,
-                        dtc_code,
-                        latitude,
-                        longitude,
-                        speed_mph,
-                        altitude_ft,
-                        odometer_mi,
-                        estimated_pct,
-                        sensor_pct as sensor_fuel_pct,
-                        drift_pct,
-                        mpg_current,
-                        idle_gph,
-                        truck_status
-                    FROM (
-                        SELECT fm1.* 
-                        FROM fuel_metrics fm1
-                        INNER JOIN (
-                            SELECT truck_id, MAX(timestamp_utc) as max_time
-                            FROM fuel_metrics
-                            WHERE timestamp_utc > NOW() - INTERVAL 2 HOUR
-                              AND truck_id IN ({})
-                            GROUP BY truck_id
-                        ) fm2 ON fm1.truck_id = fm2.truck_id 
-                            AND fm1.timestamp_utc = fm2.max_time
-                    ) latest
-                    WHERE TIMESTAMPDIFF(SECOND, timestamp_utc, NOW()) < 300
-                    ORDER BY truck_id
+                    SELECT COUNT(DISTINCT CONCAT(truck_id, '-', dtc_code))
+                    FROM dtc_events
+                    WHERE status = 'ACTIVE'
+                      AND truck_id IN ({})
                 """.format(
                         ",".join(f"'{t}'" for t in allowed_trucks)
                     )
                 )
 
-                sensor_result = conn.execute(sensor_query).fetchall()
-
-                # 🐛 DEBUG: Log first row to verify sensor_pct column index
-                if sensor_result:
-                    logger.info(
-                        f"🔍 DEBUG: First row columns: truck_id={sensor_result[0][0]}, sensor_pct(row[36])={sensor_result[0][36]}, estimated_pct(row[35])={sensor_result[0][35]}"
-                    )
-
-                for row in sensor_result:
-                    truck_details.append(
-                        {
-                            "truck_id": row[0],
-                            "timestamp": row[1].isoformat() if row[1] else None,
-                            "data_available": True,
-                            "data_age_seconds": row[2],
-                            "oil_pressure_psi": (
-                                float(row[3]) if row[3] is not None else None
-                            ),
-                            "oil_temp_f": float(row[4]) if row[4] is not None else None,
-                            "oil_level_pct": (
-                                float(row[5]) if row[5] is not None else None
-                            ),
-                            "def_level_pct": (
-                                float(row[6]) if row[6] is not None else None
-                            ),
-                            "engine_load_pct": (
-                                float(row[7]) if row[7] is not None else None
-                            ),
-                            "rpm": int(row[8]) if row[8] is not None else None,
-                            "coolant_temp_f": (
-                                float(row[9]) if row[9] is not None else None
-                            ),
-                            "coolant_level_pct": (
-                                float(row[10]) if row[10] is not None else None
-                            ),
-                            "gear": int(row[11]) if row[11] is not None else None,
-                            "brake_active": (
-                                bool(row[12]) if row[12] is not None else None
-                            ),
-                            "intake_pressure_bar": (
-                                float(row[13]) if row[13] is not None else None
-                            ),
-                            "intake_temp_f": (
-                                float(row[14]) if row[14] is not None else None
-                            ),
-                            "intercooler_temp_f": (
-                                float(row[15]) if row[15] is not None else None
-                            ),
-                            "fuel_temp_f": (
-                                float(row[16]) if row[16] is not None else None
-                            ),
-                            "fuel_level_pct": (
-                                float(row[17]) if row[17] is not None else None
-                            ),
-                            "fuel_rate_gph": (
-                                float(row[18]) if row[18] is not None else None
-                            ),
-                            "ambient_temp_f": (
-                                float(row[19]) if row[19] is not None else None
-                            ),
-                            "barometric_pressure_inhg": (
-                                float(row[20]) if row[20] is not None else None
-                            ),
-                            "voltage": float(row[21]) if row[21] is not None else None,
-                            "backup_voltage": (
-                                float(row[22]) if row[22] is not None else None
-                            ),
-                            "engine_hours": (
-                                float(row[23]) if row[23] is not None else None
-                            ),
-                            "idle_hours": (
-                                float(row[24]) if row[24] is not None else None
-                            ),
-                            "pto_hours": (
-                                float(row[25]) if row[25] is not None else None
-                            ),
-                            "total_idle_fuel_gal": (
-                                float(row[26]) if row[26] is not None else None
-                            ),
-                            "total_fuel_used_gal": (
-                                float(row[27]) if row[27] is not None else None
-                            ),
-                            "dtc_count": int(row[28]) if row[28] is not None else None,
-                            "dtc_code": row[29],
-                            "latitude": float(row[30]) if row[30] is not None else None,
-                            "longitude": (
-                                float(row[31]) if row[31] is not None else None
-                            ),
-                            "speed_mph": (
-                                float(row[32]) if row[32] is not None else None
-                            ),
-                            "altitude_ft": (
-                                float(row[33]) if row[33] is not None else None
-                            ),
-                            "odometer_mi": (
-                                float(row[34]) if row[34] is not None else None
-                            ),
-                            # From fuel_metrics
-                            "estimated_pct": (
-                                float(row[35]) if row[35] is not None else None
-                            ),
-                            "sensor_pct": (
-                                float(row[36]) if row[36] is not None else None
-                            ),
-                            "drift_pct": (
-                                float(row[37]) if row[37] is not None else None
-                            ),
-                            "mpg": float(row[38]) if row[38] is not None else None,
-                            "idle_gph": float(row[39]) if row[39] is not None else None,
-                            "status": row[40] if row[40] else "UNKNOWN",
-                            "health_score": 80,
-                            "health_category": "healthy",
-                        }
-                    )
+                dtc_result = conn.execute(dtc_query).fetchone()
+                active_dtc_count = dtc_result[0] if dtc_result else 0
+            except Exception as dtc_error:
+                logger.warning(f"DTC query failed (table may not exist): {dtc_error}")
+                active_dtc_count = 0
 
-                return {
-                    "total_trucks": total_trucks,
-                    "active_trucks": result[1] or 0,
-                    "offline_trucks": result[2] or 0,
-                    "avg_fuel_level": float(result[3] or 0),
-                    "avg_mpg": float(result[4] or 0),
-                    "avg_consumption": float(result[5] or 0),
-                    "trucks_with_drift": result[6] or 0,
-                    # 🆕 Health metrics (190h algorithm)
-                    "active_dtcs": active_dtc_count,
-                    "health_score": health_score,
-                    # 🆕 v6.5.0: Truck details with all sensors
-                    "truck_details": truck_details,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                }
-            return _empty_fleet_summary()
+        return build_fleet_summary(latest, db_now, active_dtc_count)
 
     except Exception as e:
         logger.error(f"Error getting fleet summary: {e}")
@@ -953,7 +894,30 @@ def get_fuel_rate_analysis(truck_id: str, hours_back: int = 48) -> pd.DataFrame:
     """
     Get fuel consumption rate over time for analysis
     Example use case: "muéstrame fuel_rate promedio de últimas 48hrs"
+
+    🆕 v5.12.2: Served from the in-process fuel_metrics time-series store
+    when available (same columns, same order)
     """
+    columns = [
+        "consumption_lph",
+        "consumption_gph",
+        "mpg_current",
+        "speed_mph",
+        "rpm",
+        "truck_status",
+        "idle_method",
+    ]
+    try:
+        from fuel_metrics_timeseries import get_timeseries_store
+
+        cols = get_timeseries_store().get_columns(truck_id, hours_back, columns)
+        if cols is not None:
+            df = pd.DataFrame({c: cols[c] for c in columns})
+            df.insert(0, "timestamp_utc", pd.to_datetime(cols["timestamp_utc"], unit="s"))
+            return df
+    except Exception as e:
+        logger.debug(f"Time-series store unavailable for {truck_id}: {e}")
+
     query = text(
         """
         SELECT 
@@ -989,26 +953,8 @@ def get_fuel_rate_analysis(truck_id: str, hours_back: int = 48) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@cached(ttl_seconds=60, key_prefix="get_kpi_summary")
-def get_kpi_summary(days_back: int = 1) -> Dict[str, Any]:
-    """
-    🆕 v3.8.1: Optimized KPI calculation using single MySQL query
-    🆕 v3.12.22: Cached for 60 seconds
-
-    Calculates fleet KPIs directly from MySQL for better performance:
-    - Total fuel consumed (excluding OFFLINE status)
-    - Idle waste (STOPPED status only)
-    - Fleet average MPG (weighted by readings count)
-    - Total distance from odometer deltas
-
-    Args:
-        days_back: Number of days to analyze (1=today, 7=week, 30=month)
-
-    Returns:
-        Dict with KPI metrics
-    """
-    query = text(
-        """
+# 🆕 v5.12.21: Module-level so database_async_reads runs the same SQL
+KPI_SUMMARY_QUERY = """
         SELECT 
             -- Total records and trucks
             COUNT(*) as total_records,
@@ -1073,8 +1019,99 @@ def get_kpi_summary(days_back: int = 1) -> Dict[str, Any]:
         FROM fuel_metrics
         WHERE timestamp_utc > NOW() - INTERVAL :days_back DAY
     """
+
+
+def build_kpi_summary(
+    result: Any, days_back: int, fuel_price_per_gal: float
+) -> Dict[str, Any]:
+    """
+    KPI metrics from one KPI_SUMMARY_QUERY row (a tuple, in SELECT order)
+
+    🆕 v5.12.21: Split out of get_kpi_summary() for the aiomysql path
+    """
+    # Extract values
+    total_records = result[0] or 0
+    truck_count = result[1] or 0
+    mpg_sum = float(result[2] or 0)
+    mpg_count = int(result[3] or 0)
+    idle_gph_sum = float(result[4] or 0)
+    idle_count = int(result[5] or 0)
+    moving_gph_sum = float(result[6] or 0)
+    moving_count = int(result[7] or 0)
+    consumption_gph_sum = float(result[8] or 0)
+    consumption_count = int(result[9] or 0)
+
+    # Calculate weighted averages
+    fleet_avg_mpg = mpg_sum / mpg_count if mpg_count > 0 else 0
+    avg_idle_gph = idle_gph_sum / idle_count if idle_count > 0 else 0
+    avg_moving_gph = moving_gph_sum / moving_count if moving_count > 0 else 0
+    avg_consumption_gph = (
+        consumption_gph_sum / consumption_count if consumption_count > 0 else 0
     )
 
+    # Each record represents ~1 minute interval
+    record_interval_hours = 1 / 60  # 1 minute = 1/60 hour
+
+    # Moving fuel consumed
+    moving_fuel_gal = moving_count * record_interval_hours * avg_moving_gph
+
+    # Total fuel = all consumption (moving + idle)
+    total_fuel_gal = consumption_count * record_interval_hours * avg_consumption_gph
+
+    # Idle waste = idle_count * interval * avg_idle
+    total_idle_gal = idle_count * record_interval_hours * avg_idle_gph
+
+    # 🔧 FIX: Distance = moving fuel consumed * MPG
+    # This is more accurate than odometer which has noise
+    total_distance_mi = moving_fuel_gal * fleet_avg_mpg if fleet_avg_mpg > 0 else 0
+
+    # Calculate hours for utilization metrics
+    # Each record = ~1 minute, so hours = records / 60
+    total_moving_hours = round(moving_count * record_interval_hours, 1)
+    total_idle_hours = round(idle_count * record_interval_hours, 1)
+    total_active_hours = total_moving_hours  # Active = Moving for now
+
+    kpi_data = {
+        "total_fuel_consumed_gal": round(total_fuel_gal, 2),
+        "total_fuel_cost_usd": round(total_fuel_gal * fuel_price_per_gal, 2),
+        "total_idle_waste_gal": round(total_idle_gal, 2),
+        "total_idle_cost_usd": round(total_idle_gal * fuel_price_per_gal, 2),
+        "avg_fuel_price_per_gal": fuel_price_per_gal,
+        "total_distance_mi": round(total_distance_mi, 2),
+        "fleet_avg_mpg": round(fleet_avg_mpg, 2),
+        # Hours for utilization dashboard
+        "total_moving_hours": total_moving_hours,
+        "total_idle_hours": total_idle_hours,
+        "total_active_hours": total_active_hours,
+        # Additional context
+        "period_days": days_back,
+        "truck_count": truck_count,
+        "total_records": total_records,
+        "avg_idle_gph": round(avg_idle_gph, 3),
+    }
+    return kpi_data
+
+
+@cached(ttl_seconds=60, key_prefix="get_kpi_summary")
+def get_kpi_summary(days_back: int = 1) -> Dict[str, Any]:
+    """
+    🆕 v3.8.1: Optimized KPI calculation using single MySQL query
+    🆕 v3.12.22: Cached for 60 seconds
+
+    Calculates fleet KPIs directly from MySQL for better performance:
+    - Total fuel consumed (excluding OFFLINE status)
+    - Idle waste (STOPPED status only)
+    - Fleet average MPG (weighted by readings count)
+    - Total distance from odometer deltas
+
+    Args:
+        days_back: Number of days to analyze (1=today, 7=week, 30=month)
+
+    Returns:
+        Dict with KPI metrics
+    """
+    query = text(KPI_SUMMARY_QUERY)
+
     # 🔧 FIX v3.9.2: Use centralized config
     fuel_price_per_gal = FUEL.PRICE_PER_GALLON
 
@@ -1086,73 +1123,10 @@ def get_kpi_summary(days_back: int = 1) -> Dict[str, Any]:
             if not result:
                 return _empty_kpi_response(fuel_price_per_gal)
 
-            # Extract values
-            total_records = result[0] or 0
-            truck_count = result[1] or 0
-            mpg_sum = float(result[2] or 0)
-            mpg_count = int(result[3] or 0)
-            idle_gph_sum = float(result[4] or 0)
-            idle_count = int(result[5] or 0)
-            moving_gph_sum = float(result[6] or 0)
-            moving_count = int(result[7] or 0)
-            consumption_gph_sum = float(result[8] or 0)
-            consumption_count = int(result[9] or 0)
-
-            # Calculate weighted averages
-            fleet_avg_mpg = mpg_sum / mpg_count if mpg_count > 0 else 0
-            avg_idle_gph = idle_gph_sum / idle_count if idle_count > 0 else 0
-            avg_moving_gph = moving_gph_sum / moving_count if moving_count > 0 else 0
-            avg_consumption_gph = (
-                consumption_gph_sum / consumption_count if consumption_count > 0 else 0
-            )
-
-            # Each record represents ~1 minute interval
-            record_interval_hours = 1 / 60  # 1 minute = 1/60 hour
-
-            # Moving fuel consumed
-            moving_fuel_gal = moving_count * record_interval_hours * avg_moving_gph
-
-            # Total fuel = all consumption (moving + idle)
-            total_fuel_gal = (
-                consumption_count * record_interval_hours * avg_consumption_gph
-            )
-
-            # Idle waste = idle_count * interval * avg_idle
-            total_idle_gal = idle_count * record_interval_hours * avg_idle_gph
-
-            # 🔧 FIX: Distance = moving fuel consumed * MPG
-            # This is more accurate than odometer which has noise
-            total_distance_mi = (
-                moving_fuel_gal * fleet_avg_mpg if fleet_avg_mpg > 0 else 0
-            )
-
-            # Calculate hours for utilization metrics
-            # Each record = ~1 minute, so hours = records / 60
-            total_moving_hours = round(moving_count * record_interval_hours, 1)
-            total_idle_hours = round(idle_count * record_interval_hours, 1)
-            total_active_hours = total_moving_hours  # Active = Moving for now
-
-            kpi_data = {
-                "total_fuel_consumed_gal": round(total_fuel_gal, 2),
-                "total_fuel_cost_usd": round(total_fuel_gal * fuel_price_per_gal, 2),
-                "total_idle_waste_gal": round(total_idle_gal, 2),
-                "total_idle_cost_usd": round(total_idle_gal * fuel_price_per_gal, 2),
-                "avg_fuel_price_per_gal": fuel_price_per_gal,
-                "total_distance_mi": round(total_distance_mi, 2),
-                "fleet_avg_mpg": round(fleet_avg_mpg, 2),
-                # Hours for utilization dashboard
-                "total_moving_hours": total_moving_hours,
-                "total_idle_hours": total_idle_hours,
-                "total_active_hours": total_active_hours,
-                # Additional context
-                "period_days": days_back,
-                "truck_count": truck_count,
-                "total_records": total_records,
-                "avg_idle_gph": round(avg_idle_gph, 3),
-            }
+            kpi_data = build_kpi_summary(result, days_back, fuel_price_per_gal)
 
             logger.info(
-                f"✅ KPIs calculated from MySQL: {truck_count} trucks, {total_records} records, {days_back}d period"
+                f"✅ KPIs calculated from MySQL: {kpi_data['truck_count']} trucks, {kpi_data['total_records']} records, {days_back}d period"
             )
             return kpi_data
 
@@ -2,16 +2,19 @@
 Database Connection Pool Manager
 Centralized SQLAlchemy engine with connection pooling for all database operations
 Replaces individual pymysql connections to prevent connection exhaustion
+
+🆕 v5.12.16: Engines come from connection_manager (one pool per database)
 """
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 import logging
 from typing import Generator
 import os
 
+from connection_manager import get_connection_manager
+
 logger = logging.getLogger(__name__)
 
 # MySQL Configuration
@@ -55,52 +58,60 @@ _local_engine = None
 _LocalSessionLocal = None
 
 
+def _wialon_pool() -> str:
+    """connection_manager pool serving MYSQL_* (Wialon)"""
+    return get_connection_manager().pool_for(
+        {
+            "host": MYSQL_HOST,
+            "port": MYSQL_PORT,
+            "user": MYSQL_USER,
+            "password": MYSQL_PASSWORD,
+            "database": MYSQL_DATABASE,
+        }
+    )
+
+
+def _local_pool() -> str:
+    """connection_manager pool serving LOCAL_DB_* (fuel_copilot)"""
+    return get_connection_manager().pool_for(
+        {
+            "host": LOCAL_DB_HOST,
+            "port": LOCAL_DB_PORT,
+            "user": LOCAL_DB_USER,
+            "password": LOCAL_DB_PASSWORD,
+            "database": LOCAL_DB_NAME,
+        }
+    )
+
+
 def get_engine():
     """
     Get or create the global SQLAlchemy engine with connection pooling
 
-    Pool Configuration (UPGRADED for 1000+ trucks):
-    - pool_size: 50 persistent connections (was 10)
-    - max_overflow: 100 additional connections under load (was 20)
-    - pool_timeout: 60s wait for connection (was 30s)
-    - pool_recycle: 1800s (30min) recycle connections (was 3600s)
-    - pool_pre_ping: Test connection before use (detect stale connections)
-    - pool_use_lifo: LIFO queue for better burst handling
-
-    Total max connections: 150 (pool_size + max_overflow)
-    Designed for: 100+ parallel workers + dashboard queries
+    🆕 v5.12.16: The engine and its pool live in connection_manager, sized from
+    settings (MYSQL_POOL_SIZE / MYSQL_MAX_OVERFLOW / MYSQL_POOL_TIMEOUT /
+    MYSQL_POOL_RECYCLE) with pre-ping, LIFO checkout, checkout latency
+    histograms and leak detection. Any other module pointing at the same
+    database shares the pool instead of opening its own.
     """
     global _engine
 
     if _engine is None:
-        logger.info("🔌 Creating SQLAlchemy engine with connection pool...")
-
-        _engine = create_engine(
-            DATABASE_URL,
-            poolclass=QueuePool,
-            pool_size=50,  # Base pool size (INCREASED 10→50 for 1000+ trucks)
-            max_overflow=100,  # Additional connections under load (INCREASED 20→100)
-            pool_timeout=60,  # Wait 60s for connection (INCREASED 30→60)
-            pool_recycle=1800,  # Recycle connections every 30min (DECREASED 3600→1800)
-            pool_pre_ping=True,  # Validate connections before use
-            pool_use_lifo=True,  # Use LIFO for better burst handling
-            echo=False,  # Set True for SQL query debugging
-            echo_pool=False,  # Set True for pool debugging
-        )
+        logger.info("🔌 Attaching SQLAlchemy engine to connection_manager pool...")
+
+        engine = get_connection_manager().engine(_wialon_pool())
 
         # Test connection
         try:
-            with _engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                logger.info(f"✅ Database connection pool initialized successfully")
-                logger.info(
-                    f"   Pool size: 50 | Max overflow: 100 | Total max: 150 (UPGRADED for scale)"
-                )
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            logger.info(f"✅ Database connection pool initialized successfully")
         except Exception as e:
             logger.error(f"❌ Failed to connect to MySQL: {e}")
-            _engine = None
             raise
 
+        _engine = engine
+
     return _engine
 
 
@@ -127,46 +138,30 @@ def get_local_engine():
     This pool is for local MySQL queries (fuel_metrics, etc.)
     Separate from Wialon remote database pool.
 
-    Pool Configuration:
-    - pool_size: 20 persistent connections
-    - max_overflow: 30 additional connections under load
-    - pool_timeout: 30s wait for connection
-    - pool_recycle: 1800s (30min) recycle connections
-    - pool_pre_ping: Test connection before use
+    🆕 v5.12.16: Pool owned by connection_manager (see get_engine)
     """
     global _local_engine
 
     if _local_engine is None:
         logger.info(
-            "🔌 Creating LOCAL SQLAlchemy engine (fuel_copilot) with connection pool..."
+            "🔌 Attaching LOCAL SQLAlchemy engine (fuel_copilot) to connection_manager pool..."
         )
 
-        _local_engine = create_engine(
-            LOCAL_DATABASE_URL,
-            poolclass=QueuePool,
-            pool_size=20,  # Smaller than Wialon pool (local has less traffic)
-            max_overflow=30,
-            pool_timeout=30,
-            pool_recycle=1800,
-            pool_pre_ping=True,
-            pool_use_lifo=True,
-            echo=False,
-            echo_pool=False,
-        )
+        engine = get_connection_manager().engine(_local_pool())
 
         # Test connection
         try:
-            with _local_engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                logger.info(
-                    f"✅ LOCAL database pool (fuel_copilot) initialized successfully"
-                )
-                logger.info(f"   Pool size: 20 | Max overflow: 30 | Total max: 50")
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            logger.info(
+                f"✅ LOCAL database pool (fuel_copilot) initialized successfully"
+            )
         except Exception as e:
             logger.error(f"❌ Failed to connect to LOCAL MySQL (fuel_copilot): {e}")
-            _local_engine = None
             raise
 
+        _local_engine = engine
+
     return _local_engine
 
 
@@ -287,28 +282,18 @@ def get_pool_stats() -> dict:
 
     Returns:
         Dict with pool metrics for both Wialon and Local pools
+
+    🆕 v5.12.16: connection_manager stats (occupancy, checkout latency / wait
+    histograms, leaks) instead of the engine URL only
     """
     stats = {}
+    manager = get_connection_manager()
 
-    try:
-        engine = get_engine()
-        stats["wialon"] = {
-            "engine_url": str(engine.url).replace(MYSQL_PASSWORD, "****"),
-            "pool_class": engine.pool.__class__.__name__,
-            "status": "healthy",
-        }
-    except Exception as e:
-        stats["wialon"] = {"status": "error", "error": str(e)}
-
-    try:
-        local_engine = get_local_engine()
-        stats["local"] = {
-            "engine_url": str(local_engine.url).replace(LOCAL_DB_PASSWORD, "****"),
-            "pool_class": local_engine.pool.__class__.__name__,
-            "status": "healthy",
-        }
-    except Exception as e:
-        stats["local"] = {"status": "error", "error": str(e)}
+    for key, pool_name in (("wialon", _wialon_pool), ("local", _local_pool)):
+        try:
+            stats[key] = {"status": "healthy", **manager.pool(pool_name()).stats()}
+        except Exception as e:
+            stats[key] = {"status": "error", "error": str(e)}
 
     return stats
 
@@ -317,29 +302,21 @@ def close_engine():
     """
     Close both engines and dispose all connections
     Call this on application shutdown
+
+    🆕 v5.12.16: Wialon and local engines are connection_manager pools, so this
+    disposes every managed pool
     """
     global _engine, _SessionLocal, _local_engine, _LocalSessionLocal
 
-    if _engine:
-        logger.info("🔌 Disposing Wialon database connection pool...")
-        _engine.dispose()
-        _engine = None
-        _SessionLocal = None
-        logger.info("✅ Wialon database pool disposed")
-
-    if _local_engine:
-        logger.info("🔌 Disposing LOCAL database connection pool...")
-        _local_engine.dispose()
-        _local_engine = None
-        _LocalSessionLocal = None
-        logger.info("✅ Local database pool disposed")
-
-
-# Initialize engines on module import
-try:
-    get_engine()
-except Exception as e:
-    logger.warning(f"⚠️ Could not initialize Wialon database pool on import: {e}")
-    logger.warning("   Pool will be created on first use")
-
-# Don't auto-init local pool - it may not exist in all environments
+    logger.info("🔌 Disposing Wialon and LOCAL database connection pools...")
+    get_connection_manager().dispose()
+    _engine = None
+    _SessionLocal = None
+    _local_engine = None
+    _LocalSessionLocal = None
+    logger.info("✅ Database pools disposed")
+
+
+# 🔧 v5.12.20: Engines are created on first use (or by the API warm-up task).
+# Connecting here made every importer - including each uvicorn worker - wait on
+# MySQL before it could serve /health.
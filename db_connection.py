@@ -21,9 +21,10 @@ from functools import wraps
 
 import pymysql
 from pymysql.cursors import DictCursor
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.engine import Engine, Connection
-from sqlalchemy.pool import QueuePool
+
+from connection_manager import get_connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -31,11 +32,7 @@ logger = logging.getLogger(__name__)
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
-# Connection pool settings
-POOL_SIZE = 10
-MAX_OVERFLOW = 5
-POOL_RECYCLE = 3600  # Recycle connections after 1 hour
-POOL_PRE_PING = True  # Test connections before using
+# 🆕 v5.12.16: Pool sizing / pre-ping come from settings via connection_manager
 
 # Retry settings
 MAX_RETRIES = 3
@@ -135,33 +132,25 @@ def get_sqlalchemy_engine() -> Engine:
     """
     Get SQLAlchemy engine with connection pooling (singleton).
 
+    🆕 v5.12.16: Engine/pool owned by connection_manager and sized from settings
+
     Returns:
         SQLAlchemy Engine with configured connection pool
     """
     global _engine
 
     if _engine is None:
-        try:
-            _engine = create_engine(
-                _get_connection_string(),
-                poolclass=QueuePool,
-                pool_size=POOL_SIZE,
-                max_overflow=MAX_OVERFLOW,
-                pool_recycle=POOL_RECYCLE,
-                pool_pre_ping=POOL_PRE_PING,
-                echo=False,
-            )
-            logger.info(
-                f"✅ SQLAlchemy engine created with pooling "
-                f"(pool_size={POOL_SIZE}, max_overflow={MAX_OVERFLOW})"
-            )
-        except Exception as e:
-            logger.error(f"❌ Failed to create SQLAlchemy engine: {e}")
-            raise
+        _engine = get_connection_manager().engine(_pool_name())
+        logger.info("✅ SQLAlchemy engine attached to connection_manager pool")
 
     return _engine
 
 
+def _pool_name() -> str:
+    """connection_manager pool serving _get_db_config()"""
+    return get_connection_manager().pool_for(_get_db_config())
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONNECTION CONTEXT MANAGERS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -211,9 +200,10 @@ def get_pymysql_connection() -> Generator[pymysql.Connection, None, None]:
     Yields:
         pymysql Connection object
     """
+    # 🆕 v5.12.16: Pooled (close() hands the connection back)
     conn = None
     try:
-        conn = pymysql.connect(**_get_db_config())
+        conn = get_connection_manager().checkout(_pool_name())
         yield conn
     except Exception as e:
         logger.error(f"PyMySQL connection error: {e}")
@@ -242,7 +232,7 @@ def get_db_cursor(dict_cursor: bool = True) -> Generator[Any, None, None]:
     conn = None
     cursor = None
     try:
-        conn = pymysql.connect(**_get_db_config())
+        conn = get_connection_manager().checkout(_pool_name())
         cursor_class = DictCursor if dict_cursor else None
         cursor = conn.cursor(cursor_class)
         yield cursor
@@ -0,0 +1,274 @@
+"""
+Downsampling Engine v5.12.3
+═══════════════════════════════════════════════════════════════════════════════
+
+Server-side reduction of time series for chart endpoints.
+
+A week of fuel_metrics is thousands of points per truck, far more than a
+chart can draw. These helpers reduce a series to `max_points` on NumPy
+arrays before it is serialized:
+
+- lttb_indices:     Largest-Triangle-Three-Buckets - keeps the visual shape
+                    of a line (peaks, drops, refuels) with few points
+- minmax_indices:   first/min/max/last per bucket - never loses an extreme
+- bucket_bands:     min/max/avg per equal-time bucket - for range bands
+- downsample_records / record_bands: the same on lists of row dicts
+
+All index-returning functions return sorted original indices so callers
+can pick rows (and every other column) without copying data around.
+
+Usage:
+    idx = lttb_indices(ts_epoch, fuel_pct, max_points=500)
+    rows = downsample_records(rows, 500, x_key="timestamp", y_keys=("mpg",))
+    bands = bucket_bands(ts_epoch, mpg, n_buckets=200)
+    bands = record_bands(rows, "timestamp", "fuel_pct", n_buckets=100)
+
+Author: Fuel Copilot Team
+Version: 5.12.3
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MIN_POINTS = 3
+
+
+def _as_float(values: Sequence) -> np.ndarray:
+    return np.array(
+        [np.nan if v is None else float(v) for v in values], dtype=np.float64
+    )
+
+
+def _fill_gaps(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Linearly interpolate NaN y over ascending x (NaN x stays NaN)"""
+    known = ~(np.isnan(x) | np.isnan(y))
+    gaps = ~np.isnan(x) & np.isnan(y)
+    if not gaps.any():
+        return y
+    y = y.copy()
+    y[gaps] = np.interp(x[gaps], x[known], y[known])
+    return y
+
+
+def as_epoch(values: Sequence) -> np.ndarray:
+    """datetime / ISO string / pandas Timestamp / number → epoch seconds"""
+    out = np.empty(len(values), dtype=np.float64)
+    for i, v in enumerate(values):
+        if v is None:
+            out[i] = np.nan
+        elif isinstance(v, str):
+            try:
+                v = datetime.fromisoformat(v.replace("Z", "+00:00"))
+            except ValueError:
+                out[i] = np.nan
+                continue
+        if isinstance(v, datetime):
+            if v.tzinfo is None:
+                v = v.replace(tzinfo=timezone.utc)
+            out[i] = v.timestamp()
+        elif v is not None:
+            out[i] = float(v)
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LINE DOWNSAMPLING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets (Steinarsson, 2013).
+
+    First and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the point chosen
+    in the previous bucket and the average of the next bucket. NaN values in
+    `y` are skipped.
+
+    Returns:
+        Sorted indices into x / y (at most max_points)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    n = len(valid)
+    if max_points >= n or n <= MIN_POINTS:
+        return valid
+    max_points = max(max_points, MIN_POINTS)
+
+    xv, yv = x[valid], y[valid]
+    # Bucket edges over the interior points [1, n-1)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        nxt_start, nxt_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        if nxt_end <= nxt_start:
+            nxt_start, nxt_end = n - 1, n
+        avg_x = xv[nxt_start:nxt_end].mean()
+        avg_y = yv[nxt_start:nxt_end].mean()
+
+        # Twice the triangle area; the constant factor does not change argmax
+        area = np.abs(
+            (xv[a] - avg_x) * (yv[start:end] - yv[a])
+            - (xv[a] - xv[start:end]) * (avg_y - yv[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return valid[np.unique(selected)]
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Per equal-count bucket keep first, min, max and last (M4 style).
+
+    Guarantees every local extreme survives; returns at most max_points
+    sorted indices.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    n = len(valid)
+    if max_points >= n or n <= MIN_POINTS:
+        return valid
+
+    n_buckets = max(1, max_points // 4)
+    starts = np.linspace(0, n, n_buckets + 1).astype(np.int64)[:-1]
+    yv = y[valid]
+    ends = np.append(starts[1:], n)
+
+    # argmin/argmax per bucket via sorting (bucket id, value)
+    bucket_id = np.repeat(np.arange(n_buckets), ends - starts)
+    order = np.lexsort((yv, bucket_id))
+    first_in_bucket = np.searchsorted(bucket_id[order], np.arange(n_buckets), side="left")
+    last_in_bucket = np.searchsorted(bucket_id[order], np.arange(n_buckets), side="right") - 1
+
+    keep = np.concatenate(
+        (starts, ends - 1, order[first_in_bucket], order[last_in_bucket])
+    )
+    return valid[np.unique(keep)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BANDS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def bucket_bands(x: np.ndarray, y: np.ndarray, n_buckets: int) -> Dict[str, np.ndarray]:
+    """
+    min / max / avg of `y` in equal-time buckets over the span of `x`.
+
+    Returns:
+        {"x": bucket start, "min", "max", "avg", "count"} for non-empty
+        buckets only
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    if len(x) == 0 or n_buckets <= 0:
+        empty = np.empty(0)
+        return {"x": empty, "min": empty, "max": empty, "avg": empty, "count": empty}
+
+    order = np.argsort(x, kind="stable")
+    x, y = x[order], y[order]
+    lo, hi = x[0], x[-1]
+    width = (hi - lo) / n_buckets if hi > lo else 1.0
+    bucket = np.minimum(((x - lo) / width).astype(np.int64), n_buckets - 1)
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    counts = np.diff(np.append(starts, len(y)))
+    return {
+        "x": lo + bucket[starts] * width,
+        "min": np.minimum.reduceat(y, starts),
+        "max": np.maximum.reduceat(y, starts),
+        "avg": np.add.reduceat(y, starts) / counts,
+        "count": counts,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RECORD HELPERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def downsample_records(
+    records: List[Dict[str, Any]],
+    max_points: Optional[int],
+    x_key: str,
+    y_keys: Sequence[str],
+    method: str = "lttb",
+) -> List[Dict[str, Any]]:
+    """
+    Reduce a list of row dicts to at most `max_points` rows.
+
+    The first key in `y_keys` with at least MIN_POINTS non-null values drives
+    point selection; the chosen rows are returned whole and in their
+    original order (ascending or descending). Rows where that key is null
+    (mpg while idling) stay eligible: selection runs on the series linearly
+    interpolated across the gaps. Records are returned unchanged when
+    already small enough or when no usable series exists.
+    """
+    if not max_points or len(records) <= max_points:
+        return records
+
+    x = as_epoch([r.get(x_key) for r in records])
+    for key in y_keys:
+        y = _as_float([r.get(key) for r in records])
+        if np.count_nonzero(~(np.isnan(x) | np.isnan(y))) >= MIN_POINTS:
+            break
+    else:
+        return records
+
+    # The algorithms expect ascending x
+    descending = len(x) > 1 and x[0] > x[-1]
+    if descending:
+        x, y = x[::-1], y[::-1]
+    y = _fill_gaps(x, y)
+
+    select = lttb_indices if method == "lttb" else minmax_indices
+    idx = select(x, y, max_points)
+    if descending:
+        idx = (len(records) - 1 - idx)[::-1]
+    return [records[i] for i in idx]
+
+
+def record_bands(
+    records: List[Dict[str, Any]], x_key: str, y_key: str, n_buckets: int
+) -> List[Dict[str, Any]]:
+    """min/max/avg bands of one field of a list of row dicts"""
+    x = as_epoch([r.get(x_key) for r in records])
+    y = _as_float([r.get(y_key) for r in records])
+    return bands_to_records(bucket_bands(x, y, max(1, n_buckets)), x_key=x_key)
+
+
+def bands_to_records(
+    bands: Dict[str, np.ndarray], x_key: str = "timestamp"
+) -> List[Dict[str, Any]]:
+    """bucket_bands output → JSON-ready list (x as ISO UTC timestamp)"""
+    return [
+        {
+            x_key: datetime.fromtimestamp(x, timezone.utc).replace(tzinfo=None).isoformat(),
+            "min": round(mn, 3),
+            "max": round(mx, 3),
+            "avg": round(avg, 3),
+            "count": int(c),
+        }
+        for x, mn, mx, avg, c in zip(
+            bands["x"].tolist(),
+            bands["min"].tolist(),
+            bands["max"].tolist(),
+            bands["avg"].tolist(),
+            bands["count"].tolist(),
+        )
+    ]
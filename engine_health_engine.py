@@ -17,6 +17,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 import statistics
+import numpy as np
 from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
@@ -618,17 +619,27 @@ class EngineHealthAnalyzer:
         return status
 
     def analyze_fleet_health(
-        self, fleet_data: List[Dict[str, Any]]
+        self,
+        fleet_data: List[Dict[str, Any]],
+        vectorized: bool = False,
+        baselines: Optional[Dict[str, Dict[str, SensorBaseline]]] = None,
     ) -> FleetHealthSummary:
         """
         Analyze health status for entire fleet.
 
         Args:
             fleet_data: List of current readings for all trucks
+            vectorized: 🆕 v5.12.13 - Evaluate every rule as a NumPy mask across
+                the fleet instead of calling analyze_truck_health per truck
+            baselines: Pre-loaded baselines by truck_id (vectorized mode; loaded
+                with one query when omitted)
 
         Returns:
             FleetHealthSummary with counts and top alerts
         """
+        if vectorized:
+            return self._analyze_fleet_vectorized(fleet_data, baselines)
+
         now = datetime.now(timezone.utc)
 
         healthy = []
@@ -707,6 +718,322 @@ class EngineHealthAnalyzer:
             },
         )
 
+    # ───────────────────────────────────────────────────────────────────────────
+    # 🆕 v5.12.13: VECTORIZED FLEET ANALYSIS
+    # ───────────────────────────────────────────────────────────────────────────
+
+    FLEET_COLUMNS = (
+        "oil_pressure_psi",
+        "coolant_temp_f",
+        "oil_temp_f",
+        "battery_voltage",
+        "def_level_pct",
+        "engine_load_pct",
+        "rpm",
+    )
+
+    @staticmethod
+    def _elif_masks(scope: np.ndarray, *conditions: np.ndarray) -> List[np.ndarray]:
+        """Vectorized if/elif chain: each mask holds where its branch would be taken"""
+        taken = ~scope
+        masks = []
+        for condition in conditions:
+            masks.append(condition & ~taken)
+            taken = taken | condition
+        return masks
+
+    def _analyze_fleet_vectorized(
+        self,
+        fleet_data: List[Dict[str, Any]],
+        baselines: Optional[Dict[str, Dict[str, SensorBaseline]]] = None,
+    ) -> FleetHealthSummary:
+        """
+        Same rules and alerts as analyze_truck_health, evaluated for the whole
+        fleet at once.
+
+        Readings become one float array per sensor (NaN = missing) and every
+        threshold / baseline-deviation rule is a boolean mask over the fleet.
+        Alert objects are only built for the (truck, rule) pairs that fire, in
+        the per-truck order, so cooldown filtering and the resulting
+        FleetHealthSummary match the per-truck path. Per-sensor status strings
+        and maintenance predictions are not part of the summary and are skipped.
+        """
+        now = datetime.now(timezone.utc)
+        n = len(fleet_data)
+        truck_ids = [d.get("truck_id", "unknown") for d in fleet_data]
+
+        # Data age - more than 15 minutes old = offline
+        ages = np.empty(n)
+        for i, d in enumerate(fleet_data):
+            timestamp = d.get("timestamp_utc")
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+            elif timestamp is None:
+                timestamp = now
+            ages[i] = (now - timestamp).total_seconds() / 60.0
+        online = ~(ages > 15)
+
+        raw = {k: [d.get(k) for d in fleet_data] for k in self.FLEET_COLUMNS}
+        present = {
+            k: online & np.fromiter((v is not None for v in vals), dtype=bool, count=n)
+            for k, vals in raw.items()
+        }
+        # None -> NaN, which fails every comparison just like the per-truck checks
+        op, ct, ot, bv, dl, el, rpm = (
+            np.array(raw[k], dtype=float) for k in self.FLEET_COLUMNS
+        )
+
+        # Baselines: one query for every online truck not cached yet
+        if baselines is None:
+            baselines = (
+                self._get_fleet_baselines([t for t, o in zip(truck_ids, online) if o])
+                if self.db
+                else {}
+            )
+
+        def baseline_column(sensor: str, attr: str) -> np.ndarray:
+            # NaN where missing or falsy (the per-truck path checks `if baseline.mean_30d`)
+            return np.array(
+                [
+                    getattr((baselines.get(t) or {}).get(sensor), attr, None) or np.nan
+                    for t in truck_ids
+                ],
+                dtype=float,
+            )
+
+        op_base = baseline_column("oil_pressure_psi", "mean_30d")
+        running = rpm > 400
+
+        # ─────────────────────────────────────────────────────────────────────
+        # RULE MASKS (same branches as the _analyze_* methods)
+        # ─────────────────────────────────────────────────────────────────────
+        t_op = self.thresholds["oil_pressure_psi"]
+        t_ct = self.thresholds["coolant_temp_f"]
+        t_ot = self.thresholds["oil_temp_f"]
+        t_bv = self.thresholds["battery_voltage"]
+        t_dl = self.thresholds["def_level_pct"]
+        t_el = self.thresholds["engine_load_pct"]
+
+        op_on = present["oil_pressure_psi"] & running
+        op_crit, op_warn = self._elif_masks(
+            op_on, op < t_op["critical_low"], op < t_op["warning_low"]
+        )
+        op_drop = op_on & ~op_crit & (op - op_base < t_op["trend_critical_drop"])
+
+        ct_crit, ct_warn, _, ct_cold = self._elif_masks(
+            present["coolant_temp_f"],
+            ct >= t_ct["critical_high"],
+            ct >= t_ct["warning_high"],
+            ct >= t_ct["watch_high"],
+            running & (ct < t_ct["cold_warning"]),
+        )
+
+        ot_crit, ot_warn = self._elif_masks(
+            present["oil_temp_f"],
+            ot >= t_ot["critical_high"],
+            ot >= t_ot["warning_high"],
+        )
+        ot_diff = (
+            present["oil_temp_f"]
+            & present["coolant_temp_f"]
+            & (ot - ct > t_ot["coolant_diff_critical"])
+        )
+
+        bv_on_crit, bv_on_warn, bv_on_high = self._elif_masks(
+            present["battery_voltage"] & running,
+            bv < t_bv["on_critical_low"],
+            bv < t_bv["on_warning_low"],
+            bv > t_bv["on_critical_high"],
+        )
+        bv_off_crit, bv_off_warn = self._elif_masks(
+            present["battery_voltage"] & ~running,
+            bv < t_bv["off_critical_low"],
+            bv < t_bv["off_warning_low"],
+        )
+
+        dl_crit, dl_warn = self._elif_masks(
+            present["def_level_pct"],
+            dl <= t_dl["critical_low"],
+            dl <= t_dl["warning_low"],
+        )
+        el_crit = present["engine_load_pct"] & (el >= t_el["critical_high"])
+
+        # ─────────────────────────────────────────────────────────────────────
+        # ALERT BUILDERS (only called for firing rules)
+        # ─────────────────────────────────────────────────────────────────────
+        def alert(i, category, severity, sensor, value, threshold, message, action, **kw):
+            return EngineHealthAlert(
+                truck_id=truck_ids[i],
+                category=category,
+                severity=severity,
+                sensor_name=sensor,
+                current_value=value,
+                threshold_value=threshold,
+                message=message,
+                action_required=action,
+                **kw,
+            )
+
+        def v(sensor, i):
+            return raw[sensor][i]
+
+        def oil_drop(i):
+            mean = float(op_base[i])
+            diff = v("oil_pressure_psi", i) - mean
+            return alert(
+                i, AlertCategory.TREND, AlertSeverity.WARNING, "oil_pressure_psi",
+                v("oil_pressure_psi", i), mean,
+                f"Oil pressure dropped {abs(diff):.1f} psi below 30-day average ({mean:.1f} psi)",
+                "Schedule oil change and pump inspection",
+                baseline_value=mean, trend_direction="falling",
+            )
+
+        def oil_coolant_diff(i):
+            oil_temp, coolant_temp = v("oil_temp_f", i), v("coolant_temp_f", i)
+            differential = oil_temp - coolant_temp
+            return alert(
+                i, AlertCategory.DIFFERENTIAL, AlertSeverity.WARNING, "oil_coolant_diff",
+                differential, t_ot["coolant_diff_critical"],
+                f"High oil-coolant differential: {differential:.0f}°F (oil {oil_temp}°F, coolant {coolant_temp}°F)",
+                "Check oil cooler and cooling system efficiency",
+            )
+
+        C, W = AlertSeverity.CRITICAL, AlertSeverity.WARNING
+        rules = [
+            (op_crit, lambda i: alert(
+                i, AlertCategory.OIL_PRESSURE, C, "oil_pressure_psi", v("oil_pressure_psi", i),
+                t_op["critical_low"],
+                f"CRITICAL: Oil pressure {v('oil_pressure_psi', i)} psi is below {t_op['critical_low']} psi",
+                t_op["action_critical"])),
+            (op_warn, lambda i: alert(
+                i, AlertCategory.OIL_PRESSURE, W, "oil_pressure_psi", v("oil_pressure_psi", i),
+                t_op["warning_low"],
+                f"WARNING: Oil pressure {v('oil_pressure_psi', i)} psi is below {t_op['warning_low']} psi",
+                t_op["action_warning"])),
+            (op_drop, oil_drop),
+            (ct_crit, lambda i: alert(
+                i, AlertCategory.COOLANT_TEMP, C, "coolant_temp_f", v("coolant_temp_f", i),
+                t_ct["critical_high"],
+                f"CRITICAL: Coolant temp {v('coolant_temp_f', i)}°F exceeds {t_ct['critical_high']}°F",
+                t_ct["action_critical"])),
+            (ct_warn, lambda i: alert(
+                i, AlertCategory.COOLANT_TEMP, W, "coolant_temp_f", v("coolant_temp_f", i),
+                t_ct["warning_high"],
+                f"WARNING: Coolant temp {v('coolant_temp_f', i)}°F is above {t_ct['warning_high']}°F",
+                t_ct["action_warning"])),
+            (ct_cold, lambda i: alert(
+                i, AlertCategory.COOLANT_TEMP, AlertSeverity.WATCH, "coolant_temp_f",
+                v("coolant_temp_f", i), t_ct["cold_warning"],
+                f"Engine not warming up - coolant only {v('coolant_temp_f', i)}°F after running",
+                "Check thermostat - may be stuck open")),
+            (ot_crit, lambda i: alert(
+                i, AlertCategory.OIL_TEMP, C, "oil_temp_f", v("oil_temp_f", i),
+                t_ot["critical_high"],
+                f"CRITICAL: Oil temp {v('oil_temp_f', i)}°F - oil viscosity breakdown risk",
+                t_ot["action_critical"])),
+            (ot_warn, lambda i: alert(
+                i, AlertCategory.OIL_TEMP, W, "oil_temp_f", v("oil_temp_f", i),
+                t_ot["warning_high"],
+                f"WARNING: Oil temp {v('oil_temp_f', i)}°F is above {t_ot['warning_high']}°F",
+                t_ot["action_warning"])),
+            (ot_diff, oil_coolant_diff),
+            (bv_on_crit, lambda i: alert(
+                i, AlertCategory.BATTERY, C, "battery_voltage", v("battery_voltage", i),
+                t_bv["on_critical_low"],
+                f"CRITICAL: Battery {v('battery_voltage', i)}V while running - alternator not charging",
+                t_bv["action_critical"])),
+            (bv_on_warn, lambda i: alert(
+                i, AlertCategory.BATTERY, W, "battery_voltage", v("battery_voltage", i),
+                t_bv["on_warning_low"],
+                f"WARNING: Battery {v('battery_voltage', i)}V while running - charging system weak",
+                t_bv["action_warning"])),
+            (bv_on_high, lambda i: alert(
+                i, AlertCategory.BATTERY, C, "battery_voltage", v("battery_voltage", i),
+                t_bv["on_critical_high"],
+                f"CRITICAL: Battery {v('battery_voltage', i)}V - voltage regulator failed (overcharging)",
+                "Check voltage regulator immediately")),
+            (bv_off_crit, lambda i: alert(
+                i, AlertCategory.BATTERY, C, "battery_voltage", v("battery_voltage", i),
+                t_bv["off_critical_low"],
+                f"CRITICAL: Battery {v('battery_voltage', i)}V - may not start engine",
+                "Charge or replace battery before next trip")),
+            (bv_off_warn, lambda i: alert(
+                i, AlertCategory.BATTERY, W, "battery_voltage", v("battery_voltage", i),
+                t_bv["off_warning_low"],
+                f"WARNING: Battery {v('battery_voltage', i)}V - battery weak, replace soon",
+                "Schedule battery replacement")),
+            (dl_crit, lambda i: alert(
+                i, AlertCategory.DEF_LEVEL, C, "def_level_pct", v("def_level_pct", i),
+                t_dl["critical_low"],
+                f"CRITICAL: DEF level {v('def_level_pct', i)}% - engine derate imminent",
+                t_dl["action_critical"])),
+            (dl_warn, lambda i: alert(
+                i, AlertCategory.DEF_LEVEL, W, "def_level_pct", v("def_level_pct", i),
+                t_dl["warning_low"],
+                f"WARNING: DEF level {v('def_level_pct', i)}% - refill needed soon",
+                t_dl["action_warning"])),
+            (el_crit, lambda i: alert(
+                i, AlertCategory.ENGINE_LOAD, W, "engine_load_pct", v("engine_load_pct", i),
+                t_el["critical_high"],
+                f"High engine load: {v('engine_load_pct', i)}% - sustained overload",
+                t_el["action_critical"])),
+        ]
+
+        # (truck, rule) pairs that fire, ordered by truck then rule
+        fired_trucks, fired_rules = np.nonzero(np.vstack([m for m, _ in rules]).T)
+        alerts = [rules[r][1](i) for i, r in zip(fired_trucks.tolist(), fired_rules.tolist())]
+        kept = {id(a) for a in self._filter_alerts_by_cooldown(alerts)}
+
+        critical_count = np.zeros(n, dtype=int)
+        warning_count = np.zeros(n, dtype=int)
+        all_critical_alerts = []
+        all_warning_alerts = []
+        for i, a in zip(fired_trucks.tolist(), alerts):
+            if id(a) not in kept:
+                continue
+            if a.severity == AlertSeverity.CRITICAL:
+                critical_count[i] += 1
+                all_critical_alerts.append(a)
+            elif a.severity == AlertSeverity.WARNING:
+                warning_count[i] += 1
+                all_warning_alerts.append(a)
+
+        is_critical = online & (critical_count > 0)
+        is_warning = online & ~is_critical & (warning_count > 0)
+        is_healthy = online & ~is_critical & ~is_warning
+
+        def ids(mask):
+            return [truck_ids[i] for i in np.flatnonzero(mask)]
+
+        # Sort alerts by timestamp (most recent first)
+        all_critical_alerts.sort(key=lambda x: x.timestamp, reverse=True)
+        all_warning_alerts.sort(key=lambda x: x.timestamp, reverse=True)
+
+        return FleetHealthSummary(
+            timestamp=now,
+            total_trucks=n,
+            trucks_healthy=int(is_healthy.sum()),
+            trucks_warning=int(is_warning.sum()),
+            trucks_critical=int(is_critical.sum()),
+            trucks_offline=int((~online).sum()),
+            critical_alerts=all_critical_alerts,
+            warning_alerts=all_warning_alerts,
+            sensor_coverage={
+                "oil_pressure": int(present["oil_pressure_psi"].sum()),
+                "coolant_temp": int(present["coolant_temp_f"].sum()),
+                "oil_temp": int(present["oil_temp_f"].sum()),
+                "battery": int(present["battery_voltage"].sum()),
+                "def_level": int(present["def_level_pct"].sum()),
+                "engine_load": int(present["engine_load_pct"].sum()),
+            },
+            trucks_by_status={
+                "healthy": ids(is_healthy),
+                "warning": ids(is_warning),
+                "critical": ids(is_critical),
+                "offline": ids(~online),
+            },
+        )
+
     # ───────────────────────────────────────────────────────────────────────────
     # INDIVIDUAL SENSOR ANALYSIS
     # ───────────────────────────────────────────────────────────────────────────
@@ -1319,19 +1646,7 @@ class EngineHealthAnalyzer:
                         )
 
                         for row in result:
-                            sensor_name = row[0]
-                            baselines[sensor_name] = SensorBaseline(
-                                sensor_name=sensor_name,
-                                truck_id=truck_id,
-                                mean_30d=float(row[1]) if row[1] else None,
-                                std_30d=float(row[2]) if row[2] else None,
-                                min_30d=float(row[3]) if row[3] else None,
-                                max_30d=float(row[4]) if row[4] else None,
-                                sample_count=int(row[6]) if row[6] else 0,
-                                last_updated=(
-                                    row[8] if row[8] else datetime.now(timezone.utc)
-                                ),
-                            )
+                            baselines[row[0]] = self._baseline_from_row(truck_id, row)
 
                         if baselines:
                             logger.info(
@@ -1344,6 +1659,70 @@ class EngineHealthAnalyzer:
 
         return baselines
 
+    @staticmethod
+    def _baseline_from_row(truck_id: str, row) -> SensorBaseline:
+        """Build a SensorBaseline from an engine_health_baselines row"""
+        return SensorBaseline(
+            sensor_name=row[0],
+            truck_id=truck_id,
+            mean_30d=float(row[1]) if row[1] else None,
+            std_30d=float(row[2]) if row[2] else None,
+            min_30d=float(row[3]) if row[3] else None,
+            max_30d=float(row[4]) if row[4] else None,
+            sample_count=int(row[6]) if row[6] else 0,
+            last_updated=row[8] if row[8] else datetime.now(timezone.utc),
+        )
+
+    def _get_fleet_baselines(
+        self, truck_ids: List[str]
+    ) -> Dict[str, Dict[str, SensorBaseline]]:
+        """
+        🆕 v5.12.13: Load baselines for many trucks with a single query.
+
+        Trucks already in the memory cache are not queried again; trucks
+        without baselines are simply missing from the result.
+        """
+        fleet = {t: self._baselines_cache[t] for t in truck_ids if t in self._baselines_cache}
+        missing = sorted({t for t in truck_ids if t not in fleet})
+        if not missing or not self.db:
+            return fleet
+
+        try:
+            from sqlalchemy import bindparam
+            from database_pool import get_local_engine
+
+            engine = get_local_engine()
+            if engine:
+                query = text(
+                    """
+                    SELECT sensor_name, mean_value, std_dev, min_value, max_value,
+                           median_value, sample_count, days_analyzed, last_updated,
+                           truck_id
+                    FROM engine_health_baselines
+                    WHERE truck_id IN :truck_ids
+                    AND last_updated > NOW() - INTERVAL :days DAY
+                """
+                ).bindparams(bindparam("truck_ids", expanding=True))
+                with engine.connect() as conn:
+                    result = conn.execute(query, {"truck_ids": missing, "days": 60})
+                    for row in result:
+                        truck_id = row[9]
+                        fleet.setdefault(truck_id, {})[row[0]] = self._baseline_from_row(
+                            truck_id, row
+                        )
+
+                for truck_id in missing:
+                    if truck_id in fleet:
+                        self._baselines_cache[truck_id] = fleet[truck_id]
+                logger.info(
+                    f"📥 Loaded baselines for {sum(t in fleet for t in missing)}/"
+                    f"{len(missing)} trucks from DB"
+                )
+        except Exception as e:
+            logger.debug(f"Could not load fleet baselines from DB: {e}")
+
+        return fleet
+
     def _save_baselines(self, truck_id: str, baselines: Dict[str, SensorBaseline]):
         """
         🔧 v6.2.2: BUG-001 FIX - Persist baselines to database.
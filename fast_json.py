@@ -0,0 +1,165 @@
+"""
+Fast JSON Responses v5.12.4
+═══════════════════════════════════════════════════════════════════════════════
+
+Response-encoding layer for large API payloads.
+
+FastAPI's default path walks every response through `jsonable_encoder`, then
+re-validates it against `response_model`, then serializes with the stdlib
+`json` module (which rejects NaN, hence `sanitize_nan` everywhere). For the
+fleet, command-center, alerts and theft payloads that walk dominates the
+request. This module encodes natively with orjson instead:
+
+- dataclasses, datetime/date, Enum, UUID, NumPy scalars/arrays: native
+- NaN / ±Infinity → null (same result as sanitize_nan)
+- Decimal, pandas Timestamp, sets, pydantic models, object arrays: `_default`
+- Already-encoded bytes are sent as-is
+
+Returning a `FastJSONResponse` from an endpoint skips `response_model`
+re-validation, so only use it for trusted internal payloads (or validate
+once before caching, as /fleet does).
+
+Encoded bytes can be cached next to the object in memory_cache so cache hits
+skip encoding entirely:
+
+    cached = cached_json_response("command_center:dashboard")
+    if cached is not None:
+        return cached
+    ...
+    return cache_json_response("command_center:dashboard", payload, ttl=30)
+
+Falls back to the stdlib `json` module (with NaN → null) when orjson is not
+installed.
+
+Author: Fuel Copilot Team
+Version: 5.12.4
+"""
+
+import dataclasses
+import json
+import logging
+import math
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+    logger.warning("⚠️ orjson not installed - fast_json uses stdlib json")
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is a core dependency
+    np = None
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not serialize natively (mirrors jsonable_encoder)"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, datetime):  # pandas Timestamp
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):  # pydantic v2
+        return obj.model_dump()
+    if np is not None:
+        if isinstance(obj, np.ndarray):  # object / string arrays
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "isoformat"):  # pandas NaT, time
+        return None if str(obj) == "NaT" else obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _stdlib_prepare(obj: Any) -> Any:
+    """Stdlib fallback: convert what json cannot handle, NaN → None"""
+    if isinstance(obj, float):
+        return None if math.isnan(obj) or math.isinf(obj) else obj
+    if isinstance(obj, dict):
+        return {
+            (k.value if isinstance(k, Enum) else str(k) if not isinstance(k, str) else k): _stdlib_prepare(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [_stdlib_prepare(v) for v in obj]
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return _stdlib_prepare(dataclasses.asdict(obj))
+    if isinstance(obj, Enum):
+        return _stdlib_prepare(obj.value)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (str, int, bool)) or obj is None:
+        return obj
+    return _stdlib_prepare(_default(obj))
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        _stdlib_prepare(obj), separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response encoded with `dumps`.
+
+    Accepts any payload `dumps` understands, or pre-encoded bytes.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENCODED-BYTES CACHE (memory_cache)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def cached_json_response(
+    key: str, encoder: Callable[[Any], bytes] = dumps
+) -> Optional[FastJSONResponse]:
+    """
+    Serve a memory_cache entry as JSON without re-encoding.
+
+    The entry's bytes are produced once (with `encoder`) and reused until the
+    entry is replaced or expires. Returns None on a cache miss.
+    """
+    from memory_cache import cache
+
+    encoded = cache.get_encoded(key, encoder)
+    return FastJSONResponse(encoded) if encoded is not None else None
+
+
+def cache_json_response(key: str, payload: Any, ttl: int = 30) -> FastJSONResponse:
+    """Encode `payload` once, cache object + bytes, and return the response"""
+    from memory_cache import cache
+
+    encoded = dumps(payload)
+    cache.set(key, payload, ttl=ttl, encoded=encoded)
+    return FastJSONResponse(encoded)
@@ -122,8 +122,13 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
+import numpy as np
 import yaml
 
+from source_collectors import SourceCollector, SourceCollectorRunner
+from trend_engine import TREND_DOWN, TREND_STABLE, TREND_UP, TrendEngine
+from write_behind_queue import WriteBehindQueue
+
 # Optional Redis import for trend persistence
 try:
     import redis
@@ -1074,8 +1079,8 @@ class FleetCommandCenter:
     _sensor_buffer_lock = threading.Lock()
 
     # v1.5.0 FASE 4.3: EWMA state for trend detection
-    _ewma_state: Dict[str, Dict[str, float]] = {}
-    _cusum_state: Dict[str, Dict[str, float]] = {}
+    # 🆕 v5.12.10: Array-backed EWMA/CUSUM state for all (truck, sensor) keys
+    _trend_engine: Optional[TrendEngine] = None
 
     # v1.5.0 FASE 4.4: Per-truck risk scores cache
     _truck_risk_cache: Dict[str, TruckRiskScore] = {}
@@ -1085,6 +1090,29 @@ class FleetCommandCenter:
     # v1.5.0 FASE 4.8: Redis client for persistence (optional)
     _redis_client: Optional[Any] = None
 
+    # v1.5.0 FASE 5.6: risk_level -> cc_risk_history.risk_level ENUM
+    RISK_LEVEL_ENUM = {
+        "critical": "CRITICAL",
+        "high": "HIGH",
+        "medium": "MEDIUM",
+        "low": "LOW",
+        "healthy": "LOW",
+    }
+
+    # 🆕 v5.12.11: Per-source cache policy: (TTL seconds, sync-cycle inputs).
+    # A source is recomputed when its TTL expires or when one of its inputs
+    # changed in the last sync cycle (see sync_cycle_state).
+    SOURCE_CACHE_POLICY: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+        # Day-scale trends / 30-day models: TTL only
+        "predictive_maintenance": (300, ()),
+        "ml_anomaly": (300, ()),
+        "sensor_health": (60, ("fuel_metrics", "dtc_events")),
+        # Written by the API (engine-health analyze-now) -> invalidate_sources()
+        "engine_health_alerts": (120, ()),
+        "dtc_events": (120, ("dtc_events",)),
+        "realtime_predictive": (60, ("fuel_metrics",)),
+    }
+
     def __init__(self, config_path: Optional[str] = None):
         """
         Initialize Fleet Command Center.
@@ -1103,8 +1131,14 @@ class FleetCommandCenter:
         FleetCommandCenter._sensor_readings_buffer = {}
 
         # v1.5.0 FASE 4.3: Initialize EWMA/CUSUM state
-        FleetCommandCenter._ewma_state = {}
-        FleetCommandCenter._cusum_state = {}
+        FleetCommandCenter._trend_engine = TrendEngine()
+
+        # 🆕 v5.12.11: Cached, concurrently refreshed data sources
+        self._source_runner = self._build_source_runner()
+
+        # 🆕 v5.12.12: Write-behind queue for persistence (attached by the API
+        # lifecycle). None = persist_* methods write synchronously.
+        self.write_behind: Optional[WriteBehindQueue] = None
 
         # v1.5.0 FASE 4.4: Initialize risk cache
         FleetCommandCenter._truck_risk_cache = {}
@@ -1295,8 +1329,12 @@ class FleetCommandCenter:
             risk: TruckRiskScore to persist
 
         Returns:
-            True if successful, False otherwise
+            True if successful (or queued), False otherwise
         """
+        # 🆕 v5.12.12: Off the request path when the write-behind queue is attached
+        if self.write_behind is not None:
+            return self.write_behind.submit("cc_risk_history", self._risk_row(risk))
+
         try:
             from sqlalchemy import text
 
@@ -1305,13 +1343,7 @@ class FleetCommandCenter:
             engine = get_sqlalchemy_engine()
 
             # Map risk level to ENUM
-            risk_level_map = {
-                "critical": "CRITICAL",
-                "high": "HIGH",
-                "medium": "MEDIUM",
-                "low": "LOW",
-                "healthy": "LOW",
-            }
+            risk_level_map = self.RISK_LEVEL_ENUM
 
             with engine.connect() as conn:
                 query = text(
@@ -1375,8 +1407,25 @@ class FleetCommandCenter:
             z_score: Z-score if applicable
 
         Returns:
-            True if successful, False otherwise
+            True if successful (or queued), False otherwise
         """
+        # 🆕 v5.12.12: Off the request path when the write-behind queue is attached
+        if self.write_behind is not None:
+            return self.write_behind.submit(
+                "cc_anomaly_history",
+                {
+                    "truck_id": truck_id,
+                    "sensor_name": sensor_name,
+                    "anomaly_type": anomaly_type.upper(),
+                    "severity": severity.upper(),
+                    "sensor_value": sensor_value,
+                    "ewma_value": ewma_value,
+                    "cusum_value": cusum_value,
+                    "threshold_used": threshold,
+                    "z_score": z_score,
+                },
+            )
+
         try:
             from sqlalchemy import text
 
@@ -1551,8 +1600,25 @@ class FleetCommandCenter:
             recommended_action: Recommended maintenance action
 
         Returns:
-            True if successful, False otherwise
+            True if successful (or queued), False otherwise
         """
+        # 🆕 v5.12.12: Off the request path when the write-behind queue is attached
+        if self.write_behind is not None:
+            return self.write_behind.submit(
+                "cc_correlation_events",
+                {
+                    "truck_id": truck_id,
+                    "pattern_name": pattern_name,
+                    "pattern_description": pattern_description,
+                    "confidence": confidence,
+                    "sensors_involved": json.dumps(sensors_involved),
+                    "sensor_values": json.dumps(sensor_values),
+                    "predicted_component": predicted_component,
+                    "predicted_failure_days": predicted_failure_days,
+                    "recommended_action": recommended_action,
+                },
+            )
+
         try:
             from sqlalchemy import text
 
@@ -1624,8 +1690,22 @@ class FleetCommandCenter:
             is_refill: True if this is a refill event
 
         Returns:
-            True if successful, False otherwise
+            True if successful (or queued), False otherwise
         """
+        # 🆕 v5.12.12: Off the request path when the write-behind queue is attached
+        if self.write_behind is not None:
+            return self.write_behind.submit(
+                "cc_def_history",
+                {
+                    "truck_id": truck_id,
+                    "def_level": def_level,
+                    "fuel_used_since_refill": fuel_used,
+                    "estimated_def_used": estimated_def_used,
+                    "consumption_rate": consumption_rate,
+                    "is_refill_event": is_refill,
+                },
+            )
+
         try:
             from sqlalchemy import text
 
@@ -1723,6 +1803,16 @@ class FleetCommandCenter:
             logger.warning(f"⚠️ Could not load algorithm state: {e}")
             return None
 
+    def _risk_row(self, risk: "TruckRiskScore") -> Dict[str, Any]:
+        """cc_risk_history row for the write-behind queue"""
+        return {
+            "truck_id": risk.truck_id,
+            "risk_score": risk.risk_score,
+            "risk_level": self.RISK_LEVEL_ENUM.get(risk.risk_level, "LOW"),
+            "active_issues_count": risk.active_issues_count,
+            "days_since_maintenance": risk.days_since_last_maintenance,
+        }
+
     def batch_persist_risk_scores(self, risks: List["TruckRiskScore"]) -> int:
         """
         Batch persist multiple risk scores for efficiency.
@@ -1733,11 +1823,17 @@ class FleetCommandCenter:
             risks: List of TruckRiskScore to persist
 
         Returns:
-            Number of successfully persisted records
+            Number of successfully persisted (or queued) records
         """
         if not risks:
             return 0
 
+        # 🆕 v5.12.12: One multi-row INSERT from the write-behind flusher
+        if self.write_behind is not None:
+            return self.write_behind.submit_many(
+                "cc_risk_history", [self._risk_row(r) for r in risks]
+            )
+
         try:
             from sqlalchemy import text
 
@@ -1745,13 +1841,7 @@ class FleetCommandCenter:
 
             engine = get_sqlalchemy_engine()
 
-            risk_level_map = {
-                "critical": "CRITICAL",
-                "high": "HIGH",
-                "medium": "MEDIUM",
-                "low": "LOW",
-                "healthy": "LOW",
-            }
+            risk_level_map = self.RISK_LEVEL_ENUM
 
             values = []
             for risk in risks:
@@ -1891,20 +1981,10 @@ class FleetCommandCenter:
         Returns:
             Current EWMA value
         """
-        key = f"{truck_id}:{sensor_name}"
-
-        if key not in self._ewma_state:
-            self._ewma_state[key] = {"ewma": new_value, "count": 1}
-            return new_value
-
-        state = self._ewma_state[key]
-        old_ewma = state["ewma"]
-        new_ewma = alpha * new_value + (1 - alpha) * old_ewma
-
-        state["ewma"] = new_ewma
-        state["count"] += 1
-
-        return new_ewma
+        update = self._trend_engine.update(
+            truck_id, sensor_name, new_value, alpha=alpha, cusum=False
+        )
+        return float(update.ewma[-1])
 
     def _calculate_cusum(
         self,
@@ -1930,22 +2010,14 @@ class FleetCommandCenter:
         Returns:
             Tuple of (cusum_high, cusum_low, is_alert)
         """
-        key = f"{truck_id}:{sensor_name}"
-
-        if key not in self._cusum_state:
-            self._cusum_state[key] = {"high": 0.0, "low": 0.0}
-
-        state = self._cusum_state[key]
-        deviation = new_value - target
-
-        # Update CUSUM values
-        state["high"] = max(0, state["high"] + deviation)
-        state["low"] = min(0, state["low"] + deviation)
-
-        # Check for alert condition
-        is_alert = state["high"] > threshold or abs(state["low"]) > threshold
-
-        return state["high"], state["low"], is_alert
+        update = self._trend_engine.update(
+            truck_id, sensor_name, new_value, target, threshold=threshold, ewma=False
+        )
+        return (
+            float(update.cusum_high[-1]),
+            float(update.cusum_low[-1]),
+            bool(update.alert[-1]),
+        )
 
     def _detect_trend_with_ewma_cusum(
         self,
@@ -1964,6 +2036,10 @@ class FleetCommandCenter:
 
         v1.5.0 FASE 5.6: Now persists anomalies and algorithm state to MySQL.
 
+        🆕 v5.12.10: All values go through the trend engine in one vectorized
+        update; algorithm state is marked dirty and flushed in bulk by
+        persist_trend_state() instead of one UPSERT per call.
+
         Args:
             truck_id: Truck identifier
             sensor_name: Sensor name
@@ -1985,18 +2061,11 @@ class FleetCommandCenter:
         baseline = baseline if baseline is not None else values[0]
 
         # Process all values through EWMA and CUSUM
-        ewma_value = None
-        cusum_alert = False
-        cusum_high = 0.0
-        cusum_low = 0.0
-
-        for value in values:
-            ewma_value = self._calculate_ewma(truck_id, sensor_name, value)
-            cusum_high, cusum_low, alert = self._calculate_cusum(
-                truck_id, sensor_name, value, baseline
-            )
-            if alert:
-                cusum_alert = True
+        update = self._trend_engine.update(truck_id, sensor_name, values, baseline)
+        ewma_value = float(update.ewma[-1])
+        cusum_high = float(update.cusum_high[-1])
+        cusum_low = float(update.cusum_low[-1])
+        cusum_alert = bool(update.alert.any())
 
         # Determine trend direction
         if ewma_value is not None and baseline is not None:
@@ -2024,21 +2093,19 @@ class FleetCommandCenter:
             else:
                 std_val = None
 
-            # Persist algorithm state
-            self.persist_algorithm_state(
-                truck_id=truck_id,
-                sensor_name=sensor_name,
-                ewma_value=ewma_value,
-                cusum_high=cusum_high,
-                cusum_low=cusum_low,
+            # Record algorithm state (bulk-flushed by persist_trend_state)
+            self._trend_engine.mark_trend(
+                update.index[-1],
                 baseline_mean=baseline,
                 baseline_std=std_val,
-                samples_count=len(values),
-                trend_direction=(
-                    trend.upper() if trend in ("increasing", "decreasing") else "STABLE"
+                samples=len(values),
+                direction={"increasing": TREND_UP, "decreasing": TREND_DOWN}.get(
+                    trend, TREND_STABLE
                 ),
-                trend_slope=pct_change if pct_change else None,
+                slope=pct_change if pct_change else None,
             )
+            if self._trend_engine.flush_due():
+                self.persist_trend_state()
 
             # Persist anomaly if CUSUM detected change
             if cusum_alert:
@@ -2064,6 +2131,140 @@ class FleetCommandCenter:
             "pct_change": round(pct_change, 1) if pct_change else 0,
         }
 
+    def detect_trends_batch(
+        self,
+        truck_ids: List[str],
+        sensor_names: List[str],
+        values: List[float],
+        baselines: List[float],
+        persist: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        EWMA/CUSUM trend analysis for a whole batch of readings at once.
+
+        🆕 v5.12.10: One vectorized trend engine update for every reading of
+        the cycle (10k+ keys in a few ms). Readings of the same key are applied
+        in order; the result for each reading matches
+        _detect_trend_with_ewma_cusum() with a single value.
+
+        Args:
+            truck_ids: Truck ID per reading
+            sensor_names: Sensor name per reading
+            values: Reading values
+            baselines: CUSUM target / trend baseline per reading
+            persist: Record CUSUM anomalies and flush state when due
+
+        Returns:
+            List of trend dicts aligned with the input readings
+        """
+        if not values:
+            return []
+
+        engine = self._trend_engine
+        baseline = np.asarray(baselines, dtype=np.float64)
+        update = engine.update(truck_ids, sensor_names, values, baseline)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(baseline != 0, (update.ewma - baseline) / baseline * 100, 0.0)
+        direction = np.where(
+            pct > 5, TREND_UP, np.where(pct < -5, TREND_DOWN, TREND_STABLE)
+        ).astype(np.int8)
+        engine.mark_trend(
+            update.index,
+            baseline_mean=baseline,
+            samples=1,
+            direction=direction,
+            slope=np.where(pct != 0, pct, np.nan),
+        )
+
+        if persist:
+            for i in np.flatnonzero(update.alert):
+                self.persist_anomaly(
+                    truck_id=truck_ids[i],
+                    sensor_name=sensor_names[i],
+                    anomaly_type="CUSUM",
+                    severity="HIGH" if abs(pct[i]) > 15 else "MEDIUM",
+                    sensor_value=values[i],
+                    ewma_value=float(update.ewma[i]),
+                    cusum_value=max(
+                        float(update.cusum_high[i]), abs(float(update.cusum_low[i]))
+                    ),
+                    threshold=5.0,
+                    z_score=float(pct[i]) / 100 if pct[i] else None,
+                )
+            if self._trend_engine.flush_due():
+                self.persist_trend_state()
+
+        names = {TREND_UP: "increasing", TREND_DOWN: "decreasing", TREND_STABLE: "stable"}
+        return [
+            {
+                "trend": names[int(d)],
+                "ewma": round(float(e), 2) if e else None,
+                "baseline": round(float(b), 2) if b else None,
+                "cusum_alert": bool(a),
+                "change_detected": bool(a),
+                "pct_change": round(float(p), 1) if p else 0,
+            }
+            for e, b, a, p, d in zip(update.ewma, baseline, update.alert, pct, direction)
+        ]
+
+    def _update_fleet_trends(
+        self, fleet_sensors: Dict[str, Dict[str, Any]]
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Feed the cycle's latest reading of every (truck, sensor) through the
+        trend engine in one detect_trends_batch() call.
+
+        Baseline is the sensor's valid-range midpoint, as in detect_issue().
+
+        Returns:
+            {(truck_id, sensor_name): trend dict}
+        """
+        truck_ids: List[str] = []
+        sensor_names: List[str] = []
+        values: List[float] = []
+        baselines: List[float] = []
+        for truck_id, sensors in fleet_sensors.items():
+            for sensor_name, value in sensors.items():
+                valid_range = self.SENSOR_VALID_RANGES.get(sensor_name)
+                if valid_range is None or value is None:
+                    continue
+                truck_ids.append(truck_id)
+                sensor_names.append(sensor_name)
+                values.append(float(value))
+                baselines.append((valid_range["max"] + valid_range["min"]) / 2)
+
+        trends = self.detect_trends_batch(truck_ids, sensor_names, values, baselines)
+        return dict(zip(zip(truck_ids, sensor_names), trends))
+
+    def persist_trend_state(self) -> int:
+        """
+        Flush dirty EWMA/CUSUM state to cc_algorithm_state.
+
+        🆕 v5.12.10: One multi-row UPSERT per 1000 keys instead of one
+        round trip per (truck, sensor).
+        🆕 v5.12.12: Handed to the write-behind queue when attached.
+
+        Returns:
+            Number of keys written (or queued)
+        """
+        if self.write_behind is not None:
+            return self.write_behind.submit_many(
+                "cc_algorithm_state", self._trend_engine.take_dirty_rows()
+            )
+        return self._trend_engine.persist()
+
+    def load_trend_state(self, truck_ids: Optional[List[str]] = None) -> int:
+        """
+        Restore EWMA/CUSUM state for all keys with a single SELECT.
+
+        🆕 v5.12.10: Bulk counterpart of load_algorithm_state() used at startup.
+
+        Returns:
+            Number of keys restored
+        """
+        return self._trend_engine.load(truck_ids=truck_ids)
+
     # ═══════════════════════════════════════════════════════════════════════════════
     # v1.5.0 FASE 4.4: TRUCK RISK SCORE (0-100)
     # ═══════════════════════════════════════════════════════════════════════════════
@@ -3810,18 +4011,16 @@ class FleetCommandCenter:
             ),
         )
 
-    def generate_command_center_data(self) -> CommandCenterData:
-        """
-        Main method - generates complete command center data by combining all sources.
-        """
-        self._action_counter = 0
-        action_items: List[ActionItem] = []
+    # ═══════════════════════════════════════════════════════════════════════════════
+    # 🆕 v5.12.11: COMMAND CENTER SOURCE COLLECTORS
+    # Each data source is collected independently so it can be cached with its
+    # own TTL / sync-cycle inputs and refreshed concurrently with the others.
+    # ═══════════════════════════════════════════════════════════════════════════════
 
-        # ═══════════════════════════════════════════════════════════════════
-        # GATHER DATA FROM ALL SOURCES
-        # ═══════════════════════════════════════════════════════════════════
+    def _collect_predictive_maintenance(self) -> List[ActionItem]:
+        """Source: Predictive Maintenance Engine (trend-based)."""
+        action_items: List[ActionItem] = []
 
-        # 1. Predictive Maintenance Engine (trend-based)
         try:
             from predictive_maintenance_engine import get_predictive_maintenance_engine
 
@@ -3914,8 +4113,14 @@ class FleetCommandCenter:
 
         except Exception as e:
             logger.warning(f"Could not get PM data: {e}")
+            raise  # the source runner keeps the last good value
+
+        return action_items
+
+    def _collect_ml_anomalies(self) -> List[ActionItem]:
+        """Source: ML Anomaly Detection (isolation forest scores >= 60)."""
+        action_items: List[ActionItem] = []
 
-        # 2. ML Anomaly Detection
         try:
             from ml_engines.anomaly_detector import analyze_fleet_anomalies
 
@@ -3966,9 +4171,20 @@ class FleetCommandCenter:
                     )
         except Exception as e:
             logger.debug(f"Could not get ML anomaly data: {e}")
+            raise  # the source runner keeps the last good value
+
+        return action_items
 
-        # 3. Sensor Health (GPS, Voltage, DTC)
+    def _collect_sensor_health(self) -> Tuple[SensorStatus, List[ActionItem]]:
+        """
+        Source: Sensor Health (GPS, Voltage, DTC, oil, DEF, load, coolant).
+
+        Returns:
+            Tuple of (SensorStatus, action items)
+        """
+        action_items: List[ActionItem] = []
         sensor_status = SensorStatus()
+
         try:
             from database_mysql import (
                 get_sensor_health_summary,
@@ -4249,8 +4465,14 @@ class FleetCommandCenter:
 
         except Exception as e:
             logger.debug(f"Could not get sensor health data: {e}")
+            raise  # the source runner keeps the last good value
+
+        return sensor_status, action_items
+
+    def _collect_engine_health_alerts(self) -> List[ActionItem]:
+        """Source: Engine Health Alerts stored by real-time monitoring (last 7 days)."""
+        action_items: List[ActionItem] = []
 
-        # 4. Engine Health Alerts (database-stored alerts from real-time monitoring)
         try:
             from sqlalchemy import text
 
@@ -4353,8 +4575,14 @@ class FleetCommandCenter:
 
         except Exception as e:
             logger.debug(f"Could not get engine health alerts from DB: {e}")
+            raise  # the source runner keeps the last good value
+
+        return action_items
+
+    def _collect_dtc_events(self) -> List[ActionItem]:
+        """Source: active DTC events written by wialon_sync (last 48 hours)."""
+        action_items: List[ActionItem] = []
 
-        # 5. DTC Events (real-time DTC codes from wialon_sync)
         try:
             from sqlalchemy import text
 
@@ -4456,12 +4684,19 @@ class FleetCommandCenter:
 
         except Exception as e:
             logger.debug(f"Could not get DTC events from DB: {e}")
+            raise  # the source runner keeps the last good value
+
+        return action_items
+
+    def _collect_realtime_predictive(self) -> List[ActionItem]:
+        """
+        Source: Real-Time Predictive Engine (TRUE predictive maintenance).
+
+        v1.2.0: Analyzes live sensor data to predict failures BEFORE they happen.
+        v1.3.0: Added try/except, optimized query, sensor validation.
+        """
+        action_items: List[ActionItem] = []
 
-        # ═══════════════════════════════════════════════════════════════════
-        # 6. REAL-TIME PREDICTIVE ENGINE (TRUE Predictive Maintenance) 🆕 v1.2.0
-        # v1.3.0: Added try/except, optimized query, sensor validation
-        # Analyzes live sensor data to predict failures BEFORE they happen
-        # ═══════════════════════════════════════════════════════════════════
         try:
             # v1.3.0: Graceful import with fallback
             try:
@@ -4547,6 +4782,12 @@ class FleetCommandCenter:
 
                     fleet_sensors[truck_id] = validated
 
+            # 🆕 v5.12.10: One trend engine update for the whole fleet's readings
+            try:
+                self._update_fleet_trends(fleet_sensors)
+            except Exception as e:
+                logger.warning(f"Fleet trend update failed: {e}")
+
             # Analyze all trucks
             rt_summary = rt_engine.get_fleet_summary(fleet_sensors)
 
@@ -4647,6 +4888,71 @@ class FleetCommandCenter:
 
         except Exception as e:
             logger.debug(f"Could not get real-time predictive data: {e}")
+            raise  # the source runner keeps the last good value
+
+        return action_items
+
+    def _build_source_runner(self) -> SourceCollectorRunner:
+        """Wrap every source in a cached collector (see SOURCE_CACHE_POLICY)"""
+        collectors = {
+            "predictive_maintenance": (self._collect_predictive_maintenance, []),
+            "ml_anomaly": (self._collect_ml_anomalies, []),
+            "sensor_health": (self._collect_sensor_health, (SensorStatus(), [])),
+            "engine_health_alerts": (self._collect_engine_health_alerts, []),
+            "dtc_events": (self._collect_dtc_events, []),
+            "realtime_predictive": (self._collect_realtime_predictive, []),
+        }
+        return SourceCollectorRunner(
+            SourceCollector(
+                name=name,
+                collect=collect,
+                ttl_seconds=self.SOURCE_CACHE_POLICY[name][0],
+                inputs=self.SOURCE_CACHE_POLICY[name][1],
+                default=default,
+            )
+            for name, (collect, default) in collectors.items()
+        )
+
+    def invalidate_sources(self, name: Optional[str] = None) -> None:
+        """
+        Force the next generation to recompute one source (or all of them).
+
+        🆕 v5.12.11: For in-process writers (e.g. engine-health analyze-now)
+        whose changes aren't visible through the sync-cycle versions.
+        """
+        self._source_runner.invalidate(name)
+
+    def generate_command_center_data(
+        self, force_refresh: bool = False
+    ) -> CommandCenterData:
+        """
+        Main method - generates complete command center data by combining all sources.
+
+        🆕 v5.12.11: Sources are independently cached collectors. Only the ones
+        whose TTL expired or whose sync-cycle inputs changed are recomputed (in
+        parallel); per-source latency and cache hits are reported in
+        data_quality["sources"].
+
+        Args:
+            force_refresh: Recompute every source, ignoring collector caches
+        """
+        self._action_counter = 0
+
+        # ═══════════════════════════════════════════════════════════════════
+        # GATHER DATA FROM ALL SOURCES
+        # ═══════════════════════════════════════════════════════════════════
+        sources, source_meta = self._source_runner.collect(force=force_refresh)
+        sensor_status, sensor_items = sources["sensor_health"]
+
+        # Same order as the sources were originally gathered (dedup keeps the first)
+        action_items: List[ActionItem] = [
+            *sources["predictive_maintenance"],
+            *sources["ml_anomaly"],
+            *sensor_items,
+            *sources["engine_health_alerts"],
+            *sources["dtc_events"],
+            *sources["realtime_predictive"],
+        ]
 
         # ═══════════════════════════════════════════════════════════════════
         # v1.2.0: DEDUPLICATE ACTION ITEMS
@@ -4730,6 +5036,9 @@ class FleetCommandCenter:
         # Estimate costs
         cost_projection = self._estimate_costs(action_items)
 
+        # 🆕 v5.12.10: Flush trend state touched during this generation in bulk
+        self.persist_trend_state()
+
         # Build response
         return CommandCenterData(
             generated_at=datetime.now(timezone.utc).isoformat(),
@@ -4754,6 +5063,11 @@ class FleetCommandCenter:
                 "ml_anomaly": False,
                 "sensor_health": sensor_status.total_trucks > 0,
                 "last_sync": datetime.now(timezone.utc).isoformat(),
+                # 🆕 v5.12.11: Per-source latency / cache stats
+                "sources": source_meta["sources"],
+                "recomputed_sources": source_meta["recomputed"],
+                "collect_ms": source_meta["collect_ms"],
+                "sync_versions": source_meta["sync_versions"],
             },
         )
 
@@ -4780,6 +5094,8 @@ def get_command_center() -> FleetCommandCenter:
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from fast_json import FastJSONResponse, cache_json_response, cached_json_response
+
 router = APIRouter(
     prefix="/fuelAnalytics/api/command-center", tags=["Fleet Command Center"]
 )
@@ -4827,6 +5143,11 @@ async def get_command_center_dashboard(
         # v1.1.0: Try cache first
         from_cache = False
         if not bypass_cache:
+            # v1.2.0: Encoded bytes of the cached response (no re-serialization)
+            cached_response = cached_json_response(CACHE_KEY_DASHBOARD)
+            if cached_response is not None:
+                return cached_response
+
             try:
                 from cache_service import get_cache
 
@@ -4834,11 +5155,11 @@ async def get_command_center_dashboard(
                 cached_data = await cache.get(CACHE_KEY_DASHBOARD)
                 if cached_data:
                     logger.debug("Command Center dashboard served from cache")
-                    return {
-                        "success": True,
-                        "data": cached_data,
-                        "cached": True,
-                    }
+                    return cache_json_response(
+                        CACHE_KEY_DASHBOARD,
+                        {"success": True, "data": cached_data, "cached": True},
+                        ttl=CACHE_TTL_DASHBOARD,
+                    )
             except Exception as cache_err:
                 logger.warning(
                     f"Cache read failed, falling back to fresh data: {cache_err}"
@@ -4846,7 +5167,7 @@ async def get_command_center_dashboard(
 
         # Generate fresh data
         cc = get_command_center()
-        data = cc.generate_command_center_data()
+        data = cc.generate_command_center_data(force_refresh=bypass_cache)
         data_dict = data.to_dict()
 
         # v1.1.0: Store in cache
@@ -4859,11 +5180,16 @@ async def get_command_center_dashboard(
         except Exception as cache_err:
             logger.warning(f"Cache write failed: {cache_err}")
 
-        return {
-            "success": True,
-            "data": data_dict,
-            "cached": False,
-        }
+        # Cache the object only: the first hit encodes it (get_encoded), so
+        # this request serializes the dashboard once
+        from memory_cache import cache as response_cache
+
+        response_cache.set(
+            CACHE_KEY_DASHBOARD,
+            {"success": True, "data": data_dict, "cached": True},
+            ttl=CACHE_TTL_DASHBOARD,
+        )
+        return FastJSONResponse({"success": True, "data": data_dict, "cached": False})
     except Exception as e:
         import traceback
 
@@ -4989,6 +5315,13 @@ async def command_center_health_check():
             "version": cc.VERSION,
             "data_sources": data.data_quality,
             "trucks_analyzed": data.trucks_analyzed,
+            # 🆕 v5.12.12: Write-behind persistence / trend engine state
+            "persistence": (
+                cc.write_behind.get_stats()
+                if cc.write_behind is not None
+                else {"mode": "synchronous"}
+            ),
+            "trend_engine": cc._trend_engine.get_stats(),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     except Exception as e:
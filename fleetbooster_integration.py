@@ -13,6 +13,7 @@ Date: December 30, 2025
 """
 
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
@@ -32,6 +33,18 @@ _last_dtc_alert: Dict[str, str] = {}  # truck_id -> last_dtc_code
 # Fuel update interval (60 seconds)
 FUEL_UPDATE_INTERVAL = timedelta(seconds=60)
 
+# Why this thread's last send returned what it did (see last_send_outcome)
+_outcome = threading.local()
+
+
+def last_send_outcome() -> Optional[str]:
+    """
+    Outcome of this thread's last send_fuel_level_update() / send_dtc_alert():
+    'sent', 'rate_limited', 'duplicate', 'invalid' or 'failed' (None if never).
+    Only 'failed' means a POST was attempted and did not go through.
+    """
+    return getattr(_outcome, "value", None)
+
 
 def send_fuel_level_update(
     truck_id: str,
@@ -62,17 +75,20 @@ def send_fuel_level_update(
             f"[FLEETBOOSTER] {truck_id}: Skipping fuel update "
             f"(last update {(now - last_update).total_seconds():.0f}s ago)"
         )
+        _outcome.value = "rate_limited"
         return False
 
     # Validate inputs
     if fuel_pct is None or fuel_gallons is None:
         logger.debug(f"[FLEETBOOSTER] {truck_id}: Skipping - fuel data is None")
+        _outcome.value = "invalid"
         return False
 
     if fuel_pct < 0 or fuel_pct > 100 or fuel_gallons < 0:
         logger.warning(
             f"[FLEETBOOSTER] {truck_id}: Invalid fuel data (pct={fuel_pct}, gal={fuel_gallons})"
         )
+        _outcome.value = "invalid"
         return False
 
     try:
@@ -106,19 +122,23 @@ def send_fuel_level_update(
                 f"({fuel_pct:.1f}%, {fuel_gallons:.1f} gal, {fuel_source})"
             )
             _last_fuel_update[truck_id] = now
+            _outcome.value = "sent"
             return True
         else:
             logger.warning(
                 f"[FLEETBOOSTER] ✗ {truck_id}: Fuel update failed "
                 f"(HTTP {response.status_code}): {response.text[:200]}"
             )
+            _outcome.value = "failed"
             return False
 
     except requests.Timeout:
         logger.warning(f"[FLEETBOOSTER] {truck_id}: Timeout sending fuel update")
+        _outcome.value = "failed"
         return False
     except Exception as e:
         logger.error(f"[FLEETBOOSTER] {truck_id}: Error sending fuel update: {e}")
+        _outcome.value = "failed"
         return False
 
 
@@ -148,6 +168,7 @@ def send_dtc_alert(
         logger.debug(
             f"[FLEETBOOSTER] {truck_id}: Skipping duplicate DTC alert ({dtc_code})"
         )
+        _outcome.value = "duplicate"
         return False
 
     try:
@@ -187,19 +208,23 @@ def send_dtc_alert(
                 f"({dtc_code} - {severity})"
             )
             _last_dtc_alert[truck_id] = dtc_code
+            _outcome.value = "sent"
             return True
         else:
             logger.warning(
                 f"[FLEETBOOSTER] ✗ {truck_id}: DTC alert failed "
                 f"(HTTP {response.status_code}): {response.text[:200]}"
             )
+            _outcome.value = "failed"
             return False
 
     except requests.Timeout:
         logger.warning(f"[FLEETBOOSTER] {truck_id}: Timeout sending DTC alert")
+        _outcome.value = "failed"
         return False
     except Exception as e:
         logger.error(f"[FLEETBOOSTER] {truck_id}: Error sending DTC alert: {e}")
+        _outcome.value = "failed"
         return False
 
 
@@ -0,0 +1,565 @@
+"""
+Fuel Metrics Time-Series Store v5.12.2
+═══════════════════════════════════════════════════════════════════════════════
+
+Per-process columnar cache of recent fuel_metrics rows.
+
+Truck history, fuel rate analysis, sensor anomaly detection and the MPG
+history chart all re-query the same last 24h-7d of fuel_metrics for every
+request. This store keeps that window in memory per truck as contiguous
+NumPy arrays (one per metric, text columns dictionary-encoded), and answers
+range, aggregate and resample queries without touching MySQL:
+
+- First request for a truck loads its window once (miss)
+- Every TAIL_INTERVAL_SECONDS one fleet-wide query pulls rows newer than the
+  high-water mark of `timestamp_utc` and appends them to resident trucks
+- Rows older than MAX_HOURS are trimmed; the whole store is bounded by bytes
+  and the least recently used trucks are evicted first
+
+The sync process writes fuel_metrics and the API process tails it, so no
+cross-process coordination is needed.
+
+Usage:
+    store = get_timeseries_store()
+
+    cols = store.get_columns("CO0681", hours=48, columns=["mpg_current"])
+    rows = store.get_records("CO0681", hours=24)           # list of dicts
+    stats = store.aggregate("CO0681", hours=24, column="speed_mph")
+    buckets = store.resample("CO0681", 168, "estimated_pct", bucket_seconds=3600)
+
+    store.get_stats()   # hit rate, bytes, trucks, evictions
+
+Every read returns None when the store cannot serve the request (database
+unavailable, unknown column), so callers keep their SQL path as fallback.
+
+Author: Fuel Copilot Team
+Version: 5.12.2
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCHEMA
+# ═══════════════════════════════════════════════════════════════════════════════
+
+NUMERIC_COLUMNS: Tuple[str, ...] = (
+    "estimated_pct",
+    "sensor_pct",
+    "estimated_gallons",
+    "speed_mph",
+    "rpm",
+    "mpg_current",
+    "consumption_gph",
+    "consumption_lph",
+    "idle_gph",
+    "odometer_mi",
+    "coolant_temp_f",
+    "engine_load_pct",
+    "drift_pct",
+)
+
+TEXT_COLUMNS: Tuple[str, ...] = ("truck_status", "idle_method", "confidence_indicator")
+
+_NUM_INDEX = {name: i for i, name in enumerate(NUMERIC_COLUMNS)}
+_TEXT_INDEX = {name: i for i, name in enumerate(TEXT_COLUMNS)}
+
+_SELECT_COLUMNS = ", ".join(("truck_id", "timestamp_utc") + NUMERIC_COLUMNS + TEXT_COLUMNS)
+
+
+def _to_epoch(ts: Any) -> float:
+    """fuel_metrics.timestamp_utc (naive UTC datetime) → epoch seconds"""
+    if ts is None:
+        return float("nan")
+    if isinstance(ts, datetime):
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp()
+    return float(ts)
+
+
+def _from_epoch(epoch: float) -> datetime:
+    """epoch seconds → naive UTC datetime (same shape MySQL returns)"""
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PER-TRUCK SERIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class TruckSeries:
+    """
+    Append-only columnar buffer for one truck, sorted by timestamp.
+
+    Numeric metrics live in a (metrics x capacity) float64 matrix so each
+    metric is a contiguous row; text metrics are int16 codes (-1 = NULL).
+    Capacity doubles on growth so appends are amortized O(1).
+    """
+
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, truck_id: str):
+        self.truck_id = truck_id
+        self.size = 0
+        self.timestamps = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+        self.numeric = np.empty(
+            (len(NUMERIC_COLUMNS), self.INITIAL_CAPACITY), dtype=np.float64
+        )
+        self.text = np.empty((len(TEXT_COLUMNS), self.INITIAL_CAPACITY), dtype=np.int16)
+        self.covered_from = float("inf")  # every row since this epoch is present
+        self.loaded_at = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.numeric.nbytes + self.text.nbytes
+
+    @property
+    def last_timestamp(self) -> float:
+        return float(self.timestamps[self.size - 1]) if self.size else float("-inf")
+
+    def _reserve(self, extra: int):
+        needed = self.size + extra
+        capacity = len(self.timestamps)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        timestamps = np.empty(capacity, dtype=np.float64)
+        numeric = np.empty((len(NUMERIC_COLUMNS), capacity), dtype=np.float64)
+        text = np.empty((len(TEXT_COLUMNS), capacity), dtype=np.int16)
+        timestamps[: self.size] = self.timestamps[: self.size]
+        numeric[:, : self.size] = self.numeric[:, : self.size]
+        text[:, : self.size] = self.text[:, : self.size]
+        self.timestamps, self.numeric, self.text = timestamps, numeric, text
+
+    def append(self, timestamps: np.ndarray, numeric: np.ndarray, text: np.ndarray) -> int:
+        """Append rows newer than the last stored timestamp. Returns rows added."""
+        keep = timestamps > self.last_timestamp
+        if not keep.all():
+            timestamps, numeric, text = timestamps[keep], numeric[:, keep], text[:, keep]
+        n = len(timestamps)
+        if n == 0:
+            return 0
+        self._reserve(n)
+        end = self.size + n
+        self.timestamps[self.size : end] = timestamps
+        self.numeric[:, self.size : end] = numeric
+        self.text[:, self.size : end] = text
+        self.size = end
+        return n
+
+    def trim(self, before: float):
+        """Drop rows older than `before` (epoch seconds)"""
+        k = int(np.searchsorted(self.timestamps[: self.size], before, side="left"))
+        if k:
+            remaining = self.size - k
+            self.timestamps[:remaining] = self.timestamps[k : self.size]
+            self.numeric[:, :remaining] = self.numeric[:, k : self.size]
+            self.text[:, :remaining] = self.text[:, k : self.size]
+            self.size = remaining
+        self.covered_from = max(self.covered_from, before)
+
+    def window_start(self, since: float) -> int:
+        return int(np.searchsorted(self.timestamps[: self.size], since, side="left"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class FuelMetricsTimeSeriesStore:
+    """
+    Thread-safe, byte-bounded, LRU-evicted store of per-truck series.
+
+    `query_fn(sql, params) -> List[tuple]` runs a SELECT returning rows in
+    `_SELECT_COLUMNS` order; by default it uses the shared SQLAlchemy engine.
+    """
+
+    MAX_HOURS = 168  # 7 days - longest window served by the history endpoints
+    PRELOAD_HOURS = 48  # load at least this much on a miss
+    TAIL_INTERVAL_SECONDS = 15  # one sync cycle
+    TAIL_OVERLAP_SECONDS = 120  # re-read a little behind the high-water mark
+    RELOAD_SECONDS = 900  # full per-truck reload picks up late / updated rows
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        query_fn: Optional[Callable[[str, Dict[str, Any]], List[tuple]]] = None,
+    ):
+        self.max_bytes = max_bytes
+        self._query_fn = query_fn or self._default_query
+        self._series: "OrderedDict[str, TruckSeries]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Dictionary encoding for text columns (shared by all trucks)
+        self._vocab: Dict[str, int] = {}
+        self._decode = np.array([None], dtype=object)  # index -1 → None
+
+        self._high_water = float("-inf")
+        self._last_tail = 0.0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._tail_runs = 0
+        self._tail_rows = 0
+        self._load_rows = 0
+        self._errors = 0
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Database access
+    # ───────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _default_query(sql: str, params: Dict[str, Any]) -> List[tuple]:
+        from sqlalchemy import text
+
+        from database_mysql import get_sqlalchemy_engine
+
+        with get_sqlalchemy_engine().connect() as conn:
+            return [tuple(row) for row in conn.execute(text(sql), params)]
+
+    def _fetch_truck(self, truck_id: str, since: float) -> List[tuple]:
+        return self._query_fn(
+            f"""
+            SELECT {_SELECT_COLUMNS}
+            FROM fuel_metrics
+            WHERE truck_id = :truck_id
+              AND timestamp_utc >= :since
+            ORDER BY timestamp_utc ASC
+            """,
+            {"truck_id": truck_id, "since": _from_epoch(since)},
+        )
+
+    def _fetch_tail(self, since: float) -> List[tuple]:
+        return self._query_fn(
+            f"""
+            SELECT {_SELECT_COLUMNS}
+            FROM fuel_metrics
+            WHERE timestamp_utc > :since
+            ORDER BY truck_id, timestamp_utc ASC
+            """,
+            {"since": _from_epoch(since)},
+        )
+
+    def _encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self._vocab.get(value)
+        if code is None:
+            code = len(self._vocab)
+            self._vocab[value] = code
+            # Keep None as the last element so code -1 decodes to None
+            self._decode = np.array(list(self._vocab) + [None], dtype=object)
+        return code
+
+    def _rows_to_columns(
+        self, rows: Sequence[tuple]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """rows → (truck_ids, timestamps, numeric matrix, text codes)"""
+        n = len(rows)
+        n_num = len(NUMERIC_COLUMNS)
+        truck_ids = np.array([r[0] for r in rows], dtype=object)
+        timestamps = np.array([_to_epoch(r[1]) for r in rows], dtype=np.float64)
+        numeric = np.array(
+            [
+                [np.nan if v is None else float(v) for v in r[2 : 2 + n_num]]
+                for r in rows
+            ],
+            dtype=np.float64,
+        ).reshape(n, n_num).T.copy()
+        text = np.array(
+            [[self._encode(v) for v in r[2 + n_num :]] for r in rows], dtype=np.int16
+        ).reshape(n, len(TEXT_COLUMNS)).T.copy()
+        return truck_ids, timestamps, numeric, text
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Maintenance
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def _load_truck(self, truck_id: str, hours: float, now: float) -> TruckSeries:
+        since = now - min(max(hours, self.PRELOAD_HOURS), self.MAX_HOURS) * 3600
+        rows = self._fetch_truck(truck_id, since)  # outside the lock
+
+        with self._lock:
+            _, timestamps, numeric, text = self._rows_to_columns(rows)
+            order = np.argsort(timestamps, kind="stable")
+            series = TruckSeries(truck_id)
+            series.append(timestamps[order], numeric[:, order], text[:, order])
+            series.covered_from = since
+            series.loaded_at = now
+            self._last_tail = max(self._last_tail, now)  # load is as fresh as a tail
+
+            self._series[truck_id] = series
+            self._series.move_to_end(truck_id)
+            self._load_rows += len(rows)
+            if series.size:
+                self._high_water = max(self._high_water, series.last_timestamp)
+            self._evict(keep=truck_id)
+            return series
+
+    def _tail(self, now: float):
+        """Append rows newer than the high-water mark to resident trucks"""
+        with self._lock:
+            if not self._series or now - self._last_tail < self.TAIL_INTERVAL_SECONDS:
+                return
+            self._last_tail = now
+            # Anything older than RELOAD_SECONDS is picked up by per-truck reloads
+            since = (
+                max(self._high_water, now - self.RELOAD_SECONDS)
+                - self.TAIL_OVERLAP_SECONDS
+            )
+
+        rows = self._fetch_tail(since)
+
+        with self._lock:
+            self._tail_runs += 1
+            if not rows:
+                return
+            truck_ids, timestamps, numeric, text = self._rows_to_columns(rows)
+            cutoff = now - self.MAX_HOURS * 3600
+
+            # rows arrive grouped by truck: split at truck boundaries
+            boundaries = np.flatnonzero(truck_ids[1:] != truck_ids[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(rows)]))
+            for start, end in zip(starts, ends):
+                series = self._series.get(truck_ids[start])
+                if series is None:
+                    continue
+                self._tail_rows += series.append(
+                    timestamps[start:end], numeric[:, start:end], text[:, start:end]
+                )
+                series.trim(cutoff)
+
+            self._high_water = max(self._high_water, float(np.nanmax(timestamps)))
+            self._evict()
+
+    def _evict(self, keep: Optional[str] = None):
+        total = sum(s.nbytes for s in self._series.values())
+        while total > self.max_bytes and len(self._series) > 1:
+            truck_id, series = next(iter(self._series.items()))
+            if truck_id == keep:
+                self._series.move_to_end(truck_id)
+                truck_id, series = next(iter(self._series.items()))
+            del self._series[truck_id]
+            total -= series.nbytes
+            self._evictions += 1
+
+    def _series_for(self, truck_id: str, hours: float) -> Optional[TruckSeries]:
+        now = time.time()
+        try:
+            self._tail(now)
+        except Exception as e:
+            # Serve what we have; the next request retries the tail
+            self._errors += 1
+            logger.warning(f"fuel_metrics tail failed: {e}")
+
+        since = now - hours * 3600
+        with self._lock:
+            series = self._series.get(truck_id)
+            fresh = (
+                series is not None
+                and since >= series.covered_from
+                and now - series.loaded_at < self.RELOAD_SECONDS
+            )
+            if fresh:
+                self._hits += 1
+                self._series.move_to_end(truck_id)
+                return series
+            self._misses += 1
+
+        try:
+            return self._load_truck(truck_id, hours, now)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"fuel_metrics load failed for {truck_id}: {e}")
+            return None
+
+    def invalidate(self, truck_id: Optional[str] = None):
+        """Drop one truck (or everything) so the next read reloads it"""
+        with self._lock:
+            if truck_id is None:
+                self._series.clear()
+                self._high_water = float("-inf")
+            else:
+                self._series.pop(truck_id, None)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Queries
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def get_columns(
+        self,
+        truck_id: str,
+        hours: float,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Rows of the last `hours` for a truck, oldest first, as arrays.
+
+        Returns:
+            {"timestamp_utc": epoch seconds, <column>: values, ...}
+            (numeric NULL → NaN, text NULL → None), or None if the store
+            cannot serve the request.
+        """
+        columns = list(columns) if columns is not None else list(NUMERIC_COLUMNS + TEXT_COLUMNS)
+        if any(c not in _NUM_INDEX and c not in _TEXT_INDEX for c in columns):
+            return None
+
+        if hours > self.MAX_HOURS:
+            return None
+
+        series = self._series_for(truck_id, hours)
+        if series is None:
+            return None
+
+        with self._lock:
+            start = series.window_start(time.time() - hours * 3600)
+            end = series.size
+            out = {"timestamp_utc": series.timestamps[start:end].copy()}
+            for name in columns:
+                if name in _NUM_INDEX:
+                    out[name] = series.numeric[_NUM_INDEX[name], start:end].copy()
+                else:
+                    out[name] = self._decode[series.text[_TEXT_INDEX[name], start:end]]
+            return out
+
+    def get_records(
+        self,
+        truck_id: str,
+        hours: float,
+        columns: Optional[Sequence[str]] = None,
+        descending: bool = False,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Same as get_columns but as row dicts (datetime timestamps, NaN → None)"""
+        cols = self.get_columns(truck_id, hours, columns)
+        if cols is None:
+            return None
+        return columns_to_records(cols, descending=descending)
+
+    def aggregate(
+        self, truck_id: str, hours: float, column: str
+    ) -> Optional[Dict[str, Any]]:
+        """count / mean / min / max / std of a numeric column (NULLs ignored)"""
+        if column not in _NUM_INDEX:
+            return None
+        cols = self.get_columns(truck_id, hours, [column])
+        if cols is None:
+            return None
+        values = cols[column][~np.isnan(cols[column])]
+        if len(values) == 0:
+            return {"count": 0, "mean": None, "min": None, "max": None, "std": None}
+        return {
+            "count": int(len(values)),
+            "mean": float(values.mean()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        }
+
+    def resample(
+        self, truck_id: str, hours: float, column: str, bucket_seconds: int
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Fixed-width time buckets of a numeric column.
+
+        Returns:
+            {"timestamp_utc": bucket start, "mean", "min", "max", "count"}
+            for non-empty buckets only
+        """
+        if column not in _NUM_INDEX or bucket_seconds <= 0:
+            return None
+        cols = self.get_columns(truck_id, hours, [column])
+        if cols is None:
+            return None
+
+        values = cols[column]
+        valid = ~np.isnan(values)
+        ts, values = cols["timestamp_utc"][valid], values[valid]
+        if len(values) == 0:
+            empty = np.empty(0)
+            return {"timestamp_utc": empty, "mean": empty, "min": empty, "max": empty, "count": empty}
+
+        bucket = np.floor(ts / bucket_seconds).astype(np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+        counts = np.diff(np.concatenate((starts, [len(values)])))
+        return {
+            "timestamp_utc": bucket[starts].astype(np.float64) * bucket_seconds,
+            "mean": np.add.reduceat(values, starts) / counts,
+            "min": np.minimum.reduceat(values, starts),
+            "max": np.maximum.reduceat(values, starts),
+            "count": counts,
+        }
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Monitoring
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                "trucks": len(self._series),
+                "rows": sum(s.size for s in self._series.values()),
+                "bytes": sum(s.nbytes for s in self._series.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / requests, 4) if requests else 0.0,
+                "evictions": self._evictions,
+                "tail_runs": self._tail_runs,
+                "tail_rows": self._tail_rows,
+                "load_rows": self._load_rows,
+                "errors": self._errors,
+                "high_water": (
+                    _from_epoch(self._high_water).isoformat()
+                    if self._high_water != float("-inf")
+                    else None
+                ),
+            }
+
+
+def columns_to_records(
+    cols: Dict[str, np.ndarray], descending: bool = False
+) -> List[Dict[str, Any]]:
+    """Column arrays (as returned by get_columns) → list of row dicts"""
+    names = list(cols)
+    lists = []
+    for name in names:
+        values = cols[name]
+        if name == "timestamp_utc":
+            lists.append([_from_epoch(t) for t in values.tolist()])
+        elif values.dtype.kind == "f":
+            lists.append(
+                [None if v != v else v for v in values.tolist()]  # NaN → None
+            )
+        else:
+            lists.append(values.tolist())
+    records = [dict(zip(names, row)) for row in zip(*lists)]
+    if descending:
+        records.reverse()
+    return records
+
+
+# Global store instance
+_timeseries_store: Optional[FuelMetricsTimeSeriesStore] = None
+
+
+def get_timeseries_store() -> FuelMetricsTimeSeriesStore:
+    """Get or create global fuel_metrics time-series store"""
+    global _timeseries_store
+    if _timeseries_store is None:
+        _timeseries_store = FuelMetricsTimeSeriesStore()
+    return _timeseries_store
@@ -1,6 +1,9 @@
 """
 Health Check Endpoint and System Diagnostics
 Provides detailed health status for monitoring
+
+🆕 v5.12.20: /health no longer blocks the event loop for a second sampling
+CPU; /health/imports reports the startup import profile and lazy routers
 """
 
 import asyncio
@@ -8,14 +11,20 @@ from datetime import datetime, timezone
 from typing import Any, Dict
 
 import psutil
-from fastapi import APIRouter, Response, status
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import PlainTextResponse
+
+from import_profiler import get_import_profiler
 
 router = APIRouter(tags=["health"])
 
+# Prime the counter: cpu_percent(interval=None) reports usage since last call
+psutil.cpu_percent(interval=None)
+
 
 def get_system_health() -> Dict[str, Any]:
     """Get comprehensive system health metrics"""
-    cpu_percent = psutil.cpu_percent(interval=1)
+    cpu_percent = psutil.cpu_percent(interval=None)
     memory = psutil.virtual_memory()
     disk = psutil.disk_usage("/")
 
@@ -100,3 +109,27 @@ async def liveness_check():
     Use this for Kubernetes liveness probes
     """
     return {"status": "alive", "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+@router.get("/health/imports")
+async def import_profile(
+    request: Request,
+    limit: int = Query(25, ge=1, le=500),
+    format: str = Query("json", pattern="^(json|importtime)$"),
+):
+    """
+    🆕 v5.12.20: Where worker startup time went
+
+    Slowest imports (importtime-style self/cumulative), startup milestones in
+    seconds since process start, and the state of lazily loaded routers.
+    format=importtime returns the raw `python -X importtime` layout.
+    """
+    profiler = get_import_profiler()
+    if format == "importtime":
+        return PlainTextResponse(profiler.format_importtime())
+
+    report = profiler.report(limit=limit)
+    lazy = getattr(request.app.state, "lazy_routers", None)
+    report["lazy_routers"] = lazy.status() if lazy is not None else None
+    report["timestamp"] = datetime.now(timezone.utc).isoformat()
+    return report
@@ -0,0 +1,227 @@
+"""
+Import Profiler v5.12.20
+═══════════════════════════════════════════════════════════════════════════════
+
+Records what the API process spends its startup on, in the same shape as
+`python -X importtime`, so the numbers are available from a running worker
+(GET /health/imports) instead of only from a one-off local run.
+
+While installed, builtins.__import__ is wrapped. Every module that is not yet
+in sys.modules is timed; nested imports are charged to their importer's
+cumulative time and subtracted from its self time, exactly like importtime.
+Submodules named in a fromlist (`from . import child`) get their own record;
+ones pulled in through importlib.import_module() are charged to the
+statement that triggered them.
+
+Milestones (`mark()`) record wall-clock points such as "app_created", "ready"
+and "warm_up_done" relative to process start.
+
+Only stdlib (and psutil, for the process start time) is imported here:
+main.py installs the profiler before anything else so fastapi, pandas and
+the routers are all captured. It is uninstalled
+once the warm-up finishes, so request-time local imports are never wrapped.
+
+Usage:
+    import import_profiler
+
+    import_profiler.install()
+    ...
+    import_profiler.mark("ready")
+    import_profiler.get_import_profiler().report(limit=25)
+
+Author: Fuel Copilot Team
+Version: 5.12.20
+"""
+
+import builtins
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from importlib.util import resolve_name
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class ImportRecord:
+    """Timing for one first-time import"""
+
+    module: str
+    parent: Optional[str]
+    depth: int
+    self_seconds: float = 0.0
+    cumulative_seconds: float = 0.0
+
+
+def _process_start() -> float:
+    """Wall-clock start of this process (falls back to profiler creation)"""
+    try:
+        import psutil
+
+        return psutil.Process().create_time()
+    except Exception:
+        return time.time()
+
+
+class ImportProfiler:
+    """importtime-style profiler driven by a builtins.__import__ hook"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original = None
+        self._builtin_import = builtins.__import__
+        self._hook = self._import
+        self._records: Dict[str, ImportRecord] = {}
+        self._marks: Dict[str, float] = {}
+        self.installed_at: Optional[float] = None
+        self.process_start = _process_start()
+
+    @property
+    def installed(self) -> bool:
+        return self._original is not None
+
+    def install(self) -> None:
+        with self._lock:
+            if self._original is not None:
+                return
+            self._original = self._builtin_import = builtins.__import__
+            builtins.__import__ = self._hook
+            self.installed_at = time.time()
+
+    def uninstall(self) -> None:
+        with self._lock:
+            if self._original is None:
+                return
+            if builtins.__import__ is self._hook:
+                builtins.__import__ = self._original
+            self._original = None
+
+    def mark(self, name: str) -> None:
+        """Record a startup milestone (first call wins)"""
+        self._marks.setdefault(name, time.time())
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._builtin_import
+        try:
+            if level:
+                package = (globals or {}).get("__package__") or ""
+                resolved = resolve_name("." * level + name, package)
+            else:
+                resolved = name
+        except (ImportError, ValueError):
+            resolved = None
+        if not resolved:
+            return original(name, globals, locals, fromlist, level)
+        if resolved in sys.modules:
+            # `from pkg import submodule` / `from . import submodule`
+            resolved = self._pending_submodule(resolved, fromlist)
+            if resolved is None:
+                return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        record = ImportRecord(
+            module=resolved,
+            parent=stack[-1].module if stack else None,
+            depth=len(stack),
+        )
+        stack.append(record)
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            record.cumulative_seconds = elapsed
+            record.self_seconds += elapsed
+            if stack:
+                stack[-1].self_seconds -= elapsed
+            self._records.setdefault(resolved, record)
+
+    @staticmethod
+    def _pending_submodule(package: str, fromlist) -> Optional[str]:
+        if not fromlist:
+            return None
+        namespace = vars(sys.modules[package])
+        missing = [
+            item
+            for item in fromlist
+            if item != "*"
+            and item not in namespace
+            and f"{package}.{item}" not in sys.modules
+        ]
+        if not missing:
+            return None
+        if len(missing) == 1:
+            return f"{package}.{missing[0]}"
+        return f"{package}.{{{','.join(missing)}}}"
+
+    def records(self) -> List[ImportRecord]:
+        return list(self._records.values())
+
+    def report(self, limit: int = 25, min_ms: float = 0.0) -> Dict[str, Any]:
+        """Slowest imports by cumulative time plus startup milestones"""
+        records = self.records()
+        top_level = [r for r in records if r.depth == 0]
+        ranked = sorted(records, key=lambda r: r.cumulative_seconds, reverse=True)
+        ranked = [r for r in ranked if r.cumulative_seconds * 1000 >= min_ms]
+
+        return {
+            "installed": self.installed,
+            "modules_timed": len(records),
+            "total_import_seconds": round(
+                sum(r.cumulative_seconds for r in top_level), 4
+            ),
+            "milestones": {
+                name: round(at - self.process_start, 4)
+                for name, at in sorted(self._marks.items(), key=lambda kv: kv[1])
+            },
+            "slowest": [
+                {
+                    "module": r.module,
+                    "parent": r.parent,
+                    "depth": r.depth,
+                    "self_ms": round(r.self_seconds * 1000, 2),
+                    "cumulative_ms": round(r.cumulative_seconds * 1000, 2),
+                }
+                for r in ranked[:limit]
+            ],
+        }
+
+    def format_importtime(self, min_ms: float = 1.0) -> str:
+        """Render records in `python -X importtime` layout"""
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for r in self.records():
+            if r.cumulative_seconds * 1000 < min_ms:
+                continue
+            lines.append(
+                f"import time: {int(r.self_seconds * 1e6):>9} | "
+                f"{int(r.cumulative_seconds * 1e6):>10} | "
+                f"{'  ' * r.depth} {r.module}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        self._records.clear()
+        self._marks.clear()
+
+
+_profiler = ImportProfiler()
+
+
+def get_import_profiler() -> ImportProfiler:
+    return _profiler
+
+
+def install() -> ImportProfiler:
+    """Start profiling imports unless IMPORT_PROFILE=0"""
+    if os.getenv("IMPORT_PROFILE", "1").lower() not in ("0", "false", "no"):
+        _profiler.install()
+    return _profiler
+
+
+def mark(name: str) -> None:
+    _profiler.mark(name)
@@ -0,0 +1,232 @@
+"""
+Lazy Router Loading v5.12.20
+═══════════════════════════════════════════════════════════════════════════════
+
+Routers whose modules drag in heavy dependencies (sklearn/scipy via the ML
+models, the EKF manager, ...) are registered as lightweight placeholders
+instead of being imported while main.py loads. A worker therefore serves
+/health and the latest-state endpoints without paying for them.
+
+A placeholder is a Starlette route that sits exactly where the real routes
+would have been included, so route precedence is unchanged. It matches every
+request under its path prefix; the first such request imports the module in
+a worker thread, splices the real routes in place of the placeholder and
+re-dispatches the request through the router. After startup, warm_up()
+loads every remaining placeholder (and any preload modules) in the
+background, so normally no request ever waits on an import.
+
+A router whose import fails is dropped with the same warning main.py used to
+log, and its paths 404 as before.
+
+Usage:
+    lazy = LazyRouters(app)
+    lazy.add("routers.ml", path_prefix="/fuelAnalytics/api/ml")
+    ...
+    await lazy.warm_up(preload=["lstm_fuel_predictor"])
+
+Author: Fuel Copilot Team
+Version: 5.12.20
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRouter(BaseRoute):
+    """Placeholder route that imports and mounts a router on first use"""
+
+    def __init__(
+        self,
+        owner: "LazyRouters",
+        module: str,
+        attr: str = "router",
+        *,
+        path_prefix: str,
+        setup: Optional[str] = None,
+        include_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.owner = owner
+        self.module = module
+        self.attr = attr
+        self.path = path_prefix.rstrip("/")
+        self.name = f"lazy:{module}"
+        self.setup = setup
+        self.include_kwargs = include_kwargs or {}
+        self.state = "pending"
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.routes_added = 0
+        self.loaded_by: Optional[str] = None
+        self._router: Any = None
+        self._import_lock = threading.Lock()
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if self.state != "pending" or scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = scope["path"]
+        if path == self.path or path.startswith(self.path + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, __name: str, **path_params: Any):
+        raise NoMatchFound(__name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.load(reason="request")
+        await self.owner.app.router(scope, receive, send)
+
+    def _import(self) -> Any:
+        """Runs in a worker thread: the expensive part of loading"""
+        with self._import_lock:
+            if self._router is None:
+                router = getattr(importlib.import_module(self.module), self.attr)
+                if self.setup:
+                    module_name, _, func = self.setup.partition(":")
+                    getattr(importlib.import_module(module_name), func)()
+                self._router = router
+            return self._router
+
+    async def load(self, reason: str = "warm-up") -> bool:
+        """Import the router and splice its routes in place of this placeholder"""
+        if self.state != "pending":
+            return self.state == "loaded"
+
+        started = time.perf_counter()
+        try:
+            router = await asyncio.to_thread(self._import)
+        except Exception as e:
+            if self.state == "pending":
+                self.state = "failed"
+                self.error = str(e)
+                self.owner._remove(self)
+                logger.warning(f"⚠️ {self.module} router not available: {e}")
+            return False
+
+        # Back on the event loop: a concurrent load may have won the race
+        if self.state != "pending":
+            return self.state == "loaded"
+        self.routes_added = self.owner._splice(self, router)
+        self.state = "loaded"
+        self.loaded_by = reason
+        self.load_seconds = round(time.perf_counter() - started, 4)
+        logger.info(
+            f"✅ {self.module} router loaded on {reason} "
+            f"({self.routes_added} routes, {self.load_seconds:.2f}s)"
+        )
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "module": self.module,
+            "path_prefix": self.path,
+            "state": self.state,
+            "loaded_by": self.loaded_by,
+            "load_seconds": self.load_seconds,
+            "routes": self.routes_added,
+            "error": self.error,
+        }
+
+
+class LazyRouters:
+    """Placeholders registered on one app, plus the background warm-up"""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self.routers: List[LazyRouter] = []
+        self.preloaded: Dict[str, Any] = {}
+        self.warm_up_seconds: Optional[float] = None
+        app.state.lazy_routers = self
+
+    def add(
+        self,
+        module: str,
+        attr: str = "router",
+        *,
+        path_prefix: str,
+        setup: Optional[str] = None,
+        **include_kwargs: Any,
+    ) -> LazyRouter:
+        """
+        Register `module.attr` to be included on first use.
+
+        path_prefix must cover every path the router serves; include_kwargs
+        are passed to app.include_router(). setup ("module:function") runs
+        once after import, in the same worker thread.
+        """
+        placeholder = LazyRouter(
+            self,
+            module,
+            attr,
+            path_prefix=path_prefix,
+            setup=setup,
+            include_kwargs=include_kwargs,
+        )
+        self.app.router.routes.append(placeholder)
+        self.routers.append(placeholder)
+        return placeholder
+
+    def _splice(self, placeholder: LazyRouter, router: Any) -> int:
+        routes = self.app.router.routes
+        start = len(routes)
+        self.app.include_router(router, **placeholder.include_kwargs)
+        added = routes[start:]
+        del routes[start:]
+        index = routes.index(placeholder)
+        routes[index : index + 1] = added
+        self.app.openapi_schema = None
+        return len(added)
+
+    def _remove(self, placeholder: LazyRouter) -> None:
+        try:
+            self.app.router.routes.remove(placeholder)
+        except ValueError:
+            pass
+
+    @property
+    def pending(self) -> List[LazyRouter]:
+        return [r for r in self.routers if r.state == "pending"]
+
+    async def warm_up(
+        self,
+        preload: Iterable[str] = (),
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Load every pending router, then import `preload` modules.
+
+        Runs after startup as a background task; each import happens in a
+        worker thread so requests keep being served while it runs.
+        """
+        started = time.perf_counter()
+        for placeholder in self.pending:
+            await placeholder.load()
+        for module in preload:
+            t0 = time.perf_counter()
+            try:
+                await asyncio.to_thread(importlib.import_module, module)
+                self.preloaded[module] = round(time.perf_counter() - t0, 4)
+            except Exception as e:
+                self.preloaded[module] = f"failed: {e}"
+                logger.warning(f"⚠️ {module} not available: {e}")
+        self.warm_up_seconds = round(time.perf_counter() - started, 4)
+        logger.info(f"✅ Lazy router warm-up finished in {self.warm_up_seconds:.2f}s")
+        if on_done is not None:
+            on_done()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self.pending),
+            "warm_up_seconds": self.warm_up_seconds,
+            "routers": [r.status() for r in self.routers],
+            "preloaded": dict(self.preloaded),
+        }
@@ -11,12 +11,13 @@ Version: 1.0.1 - Enhanced error logging and crash detection
 
 import asyncio
 import logging
+import os
 import sys
 import traceback
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Coroutine, List, Optional
 
-from database_async_wrapper import async_db
+from database_async_wrapper import async_db, shutdown_db_executor
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -55,6 +56,7 @@ class LifecycleManager:
         """Initialize lifecycle manager"""
         self.cache: Optional[Any] = None
         self.db_pool: Optional[Any] = None
+        self.background_tasks: List[asyncio.Task] = []
 
     async def initialize_cache(self) -> None:
         """Initialize multi-layer cache connection"""
@@ -82,6 +84,114 @@ class LifecycleManager:
             log_crash(e, "Database Pool Initialization")
             # Don't crash - some endpoints still work without async
 
+    async def initialize_connection_pools(self) -> None:
+        """🆕 v5.12.16: Pre-open pooled connections so first requests skip the connect
+
+        🆕 v5.12.20: Also warms the Wialon pool, which database_pool no longer
+        connects at import time
+        """
+        from connection_manager import LOCAL, WIALON, get_connection_manager
+
+        warmed = await asyncio.to_thread(get_connection_manager().warm, LOCAL, WIALON)
+        logger.info(f"✅ Connection pools warmed: {warmed}")
+
+    def run_in_background(self, coro: Coroutine, name: str) -> asyncio.Task:
+        """🆕 v5.12.20: Run startup work that must not delay readiness"""
+
+        async def runner():
+            try:
+                await coro
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Background {name} failed: {e}")
+                log_crash(e, f"Background {name}")
+
+        task = asyncio.create_task(runner(), name=name)
+        self.background_tasks.append(task)
+        return task
+
+    async def warm_up(self) -> None:
+        """🆕 v5.12.20: Connections, sklearn-backed engines and trend state,
+        loaded off the startup path so /health answers immediately"""
+        await self.initialize_connection_pools()
+        await asyncio.to_thread(self.initialize_anomaly_training)
+        await asyncio.to_thread(self.initialize_trend_state)
+        await self.count_trucks()
+
+    def initialize_model_registry(self) -> None:
+        """🆕 v5.12.7: Preload ML artifacts in the background and watch for new versions"""
+        try:
+            from model_registry import get_model_registry
+
+            registry = get_model_registry()
+            registry.preload(background=True)
+            registry.start_watcher(interval_seconds=60)
+            logger.info("✅ Model registry preloading in background")
+        except Exception as e:
+            logger.warning(f"⚠️ Model registry initialization failed: {e}")
+
+    def initialize_anomaly_training(self) -> None:
+        """🆕 v5.12.8: Warm-start anomaly models and refit them in a process pool"""
+        try:
+            from ml_engines.anomaly_detection_v2 import (
+                get_anomaly_detector as get_consumption_detector,
+            )
+            from ml_engines.anomaly_detector import get_anomaly_detector
+            from ml_engines.anomaly_training import get_training_scheduler
+
+            get_anomaly_detector()
+            get_consumption_detector()
+            hours = float(os.getenv("ANOMALY_REFIT_HOURS", "6"))
+            get_training_scheduler().start(refit_interval_seconds=hours * 3600)
+            logger.info(f"✅ Anomaly training scheduler started (refit every {hours:g}h)")
+        except Exception as e:
+            logger.warning(f"⚠️ Anomaly training scheduler not started: {e}")
+
+    def initialize_trend_state(self) -> None:
+        """🆕 v5.12.10: Restore command center EWMA/CUSUM state with one bulk SELECT"""
+        try:
+            from fleet_command_center import get_command_center
+
+            loaded = get_command_center().load_trend_state()
+            logger.info(f"✅ Trend state restored ({loaded} keys)")
+        except Exception as e:
+            logger.warning(f"⚠️ Trend state not restored: {e}")
+
+    def initialize_write_behind(self) -> None:
+        """🆕 v5.12.12: Move command center persistence off the request path"""
+        try:
+            from fleet_command_center import get_command_center
+            from write_behind_queue import get_write_behind_queue
+
+            queue = get_write_behind_queue()
+            queue.start()
+            get_command_center().write_behind = queue
+        except Exception as e:
+            logger.warning(f"⚠️ Write-behind queue not started: {e}")
+
+    def initialize_partition_manager(self) -> None:
+        """
+        🆕 v5.12.17: Keep fuel_metrics partitions ahead and archive expired ones.
+
+        Opt-in: runs DDL against fuel_metrics, so it only starts with
+        PARTITION_MANAGER_ENABLED=true (dropping also needs PARTITION_DROP_ENABLED).
+        """
+        if os.getenv("PARTITION_MANAGER_ENABLED", "false").lower() not in (
+            "1",
+            "true",
+            "yes",
+        ):
+            logger.info("Partition manager disabled (PARTITION_MANAGER_ENABLED)")
+            return
+        try:
+            from partition_manager import get_partition_manager
+
+            hours = float(os.getenv("PARTITION_CHECK_HOURS", "24"))
+            get_partition_manager().start(interval_seconds=hours * 3600)
+        except Exception as e:
+            logger.warning(f"⚠️ Partition manager not started: {e}")
+
     async def count_trucks(self) -> Optional[int]:
         """
         Count available trucks on startup.
@@ -110,7 +220,11 @@ class LifecycleManager:
             # Initialize components in sequence
             await self.initialize_cache()
             await self.initialize_database_pool()
-            await self.count_trucks()
+            self.initialize_model_registry()
+            self.initialize_write_behind()
+            self.initialize_partition_manager()
+            # 🆕 v5.12.20: Serve /health while pools fill and engines load
+            self.run_in_background(self.warm_up(), "connection warm-up")
 
             logger.info("MySQL enhanced features: enabled")
             logger.info("=" * 80)
@@ -144,6 +258,24 @@ class LifecycleManager:
             logger.error(f"❌ Error closing pool: {e}")
             log_crash(e, "Database Pool Shutdown")
 
+    async def shutdown_background_tasks(self) -> None:
+        """🆕 v5.12.20: Cancel warm-up tasks that are still running"""
+        tasks, self.background_tasks = self.background_tasks, []
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def shutdown_connection_pools(self) -> None:
+        """🆕 v5.12.16: Dispose every pool owned by the connection manager"""
+        try:
+            from connection_manager import get_connection_manager
+
+            await get_connection_manager().aclose()
+            logger.info("✅ Connection pools disposed")
+        except Exception as e:
+            logger.error(f"❌ Error disposing connection pools: {e}")
+
     async def shutdown(self) -> None:
         """Execute all shutdown tasks"""
         logger.info("=" * 80)
@@ -153,9 +285,35 @@ class LifecycleManager:
 
         try:
             # Shutdown components in reverse order
+            await self.shutdown_background_tasks()
             await self.shutdown_cache()
             await self.shutdown_database_pool()
 
+            # 🆕 v5.12.21: Dedicated executor for the remaining sync DB calls
+            shutdown_db_executor()
+
+            from model_registry import get_model_registry
+
+            get_model_registry().stop_watcher()
+
+            from ml_engines.anomaly_training import get_training_scheduler
+
+            get_training_scheduler().stop()
+
+            from fleet_command_center import get_command_center
+
+            get_command_center().persist_trend_state()
+
+            from write_behind_queue import get_write_behind_queue
+
+            get_write_behind_queue().stop()
+
+            from partition_manager import get_partition_manager
+
+            get_partition_manager().stop()
+
+            await self.shutdown_connection_pools()
+
             logger.info("=" * 80)
             logger.info("✅ Clean shutdown completed")
             logger.info("=" * 80)
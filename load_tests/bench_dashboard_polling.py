@@ -0,0 +1,361 @@
+"""
+Dashboard Polling Benchmark
+===========================
+
+Concurrent dashboard clients polling the hot read endpoints (fleet summary,
+truck detail, refuels, alerts, KPIs), comparing:
+
+1. legacy:  sync DatabaseManager-style reads run in asyncio's default
+            executor - one pooled connection + one thread per call, pandas
+            round trip per query, N+1 alert/refuel reads, /kpis blocking
+            the event loop
+2. native:  database_async_reads on aiomysql - awaits on the pool, plain
+            dicts/tuples, batched refuel/alert queries
+
+By default both run in-process against a simulated MySQL: every query costs
+--db-ms of latency and returns fleet-sized canned rows, and each side gets
+the same number of connections. With --url the same polling mix is sent to a
+running API instead (measures whatever path that server is configured for).
+
+Reports throughput (req/s) and p50/p99 latency overall and per endpoint.
+
+Run:
+    python load_tests/bench_dashboard_polling.py [--clients 50] [--seconds 5]
+        [--trucks 45] [--db-ms 4] [--pool 15]
+    python load_tests/bench_dashboard_polling.py --url http://localhost:8000
+
+Author: Fuel Copilot Team
+Date: December 2025
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+import database_async_reads as reads  # noqa: E402
+from database_mysql import LATEST_TRUCK_DATA_COLUMNS  # noqa: E402
+
+ENDPOINTS = ("fleet", "truck", "refuels", "alerts", "kpis")
+API_PATHS = {
+    "fleet": "/fuelAnalytics/api/fleet",
+    "truck": "/fuelAnalytics/api/trucks/{truck_id}",
+    "refuels": "/fuelAnalytics/api/refuels?days=7",
+    "alerts": "/fuelAnalytics/api/alerts",
+    "kpis": "/fuelAnalytics/api/kpis?days=1",
+}
+
+
+# =============================================================================
+# Simulated MySQL
+# =============================================================================
+
+
+class FakeRows:
+    """Canned result sets, picked by SQL substring like the unit tests do"""
+
+    def __init__(self, n_trucks: int):
+        rng = random.Random(7)
+        now = datetime.now()
+        self.truck_ids = [f"TR{i:04d}" for i in range(n_trucks)]
+        columns = set(reads.FLEET_READ_COLUMNS) | set(LATEST_TRUCK_DATA_COLUMNS)
+        self.latest = []
+        for truck_id in self.truck_ids:
+            row = {c: None for c in columns}
+            row.update(
+                truck_id=truck_id,
+                timestamp_utc=now - timedelta(seconds=rng.randint(0, 1200)),
+                truck_status=rng.choice(["MOVING", "STOPPED", "OFFLINE"]),
+                estimated_pct=rng.uniform(5, 100),
+                sensor_pct=rng.uniform(5, 100),
+                mpg_current=rng.uniform(4, 8),
+                consumption_gph=rng.uniform(0.3, 2.5),
+                speed_mph=rng.uniform(0, 70),
+            )
+            self.latest.append(row)
+        self.averages = [(t, rng.uniform(5, 7), rng.uniform(0.5, 1)) for t in self.truck_ids]
+        self.events = [
+            {
+                "truck_id": t,
+                "timestamp_utc": now - timedelta(hours=rng.randint(1, 160)),
+                "refuel_gallons": rng.uniform(40, 150),
+                "fuel_level_after_pct": rng.uniform(80, 100),
+                "fuel_level_before_pct": rng.uniform(10, 40),
+            }
+            for t in self.truck_ids[::2]
+        ]
+        self.kpi = (
+            n_trucks * 100,
+            n_trucks,
+            900.0,
+            5400,
+            10.0,
+            n_trucks * 90,
+            60.0,
+            500,
+            70.0,
+            3000,
+        )
+
+    def answer(self, sql: str, params):
+        if "fuel_metrics_latest" in sql:
+            wanted = set((params or {}).get("truck_ids") or self.truck_ids)
+            return [dict(r) for r in self.latest if r["truck_id"] in wanted]
+        if "SELECT NOW()" in sql:
+            return [(datetime.now(),)]
+        if "dtc_events" in sql:
+            return [(3,)]
+        if "mpg_readings_24h" in sql:
+            return [
+                {
+                    "truck_id": t,
+                    "avg_mpg_24h": mpg,
+                    "mpg_readings_24h": 20,
+                    "avg_idle_gph_24h": idle,
+                    "idle_readings_24h": 10,
+                }
+                for t, mpg, idle in self.averages
+                if t == (params or {}).get("truck_id", t)
+            ]
+        if "avg_idle_gph_24h" in sql:
+            return self.averages
+        if "FROM refuel_events" in sql:
+            wanted = set(params["truck_ids"])
+            return [dict(r) for r in self.events if r["truck_id"] in wanted]
+        if "total_records" in sql or "SUM(" in sql:
+            return [self.kpi]
+        return []
+
+
+class FakeAioConnection:
+    """aiomysql connection whose queries await --db-ms on the event loop"""
+
+    def __init__(self, rows: FakeRows, db_seconds: float):
+        self.rows = rows
+        self.db_seconds = db_seconds
+
+    def cursor(self, cursor_class=None):
+        conn = self
+
+        class Cursor:
+            result = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, sql, params=None):
+                await asyncio.sleep(conn.db_seconds)
+                self.result = conn.rows.answer(sql, params)
+
+            async def fetchall(self):
+                return self.result
+
+        return Cursor()
+
+
+def install_native(rows: FakeRows, db_seconds: float, pool_size: int) -> None:
+    """Point database_async_reads at the simulated pool"""
+    pool = asyncio.Semaphore(pool_size)
+
+    class SimulatedConnection:
+        async def __aenter__(self):
+            await pool.acquire()
+            return FakeAioConnection(rows, db_seconds)
+
+        async def __aexit__(self, *exc):
+            pool.release()
+            return False
+
+    reads.AsyncConnection = SimulatedConnection
+    reads.get_allowed_trucks = lambda: set(rows.truck_ids)
+    reads.memory_cache = None  # measure the database path, not the cache
+
+
+class LegacyBackend:
+    """
+    The query pattern of the sync DatabaseManager reads: a blocking
+    round trip per query on one of `pool_size` SQLAlchemy connections,
+    results through a DataFrame and back to dicts
+    """
+
+    def __init__(self, rows: FakeRows, db_seconds: float, pool_size: int):
+        self.rows = rows
+        self.db_seconds = db_seconds
+        self.pool = threading.BoundedSemaphore(pool_size)
+
+    def _query(self, sql: str, params=None):
+        with self.pool:
+            time.sleep(self.db_seconds)
+            result = self.rows.answer(sql, params)
+        if result and isinstance(result[0], dict):
+            result = pd.DataFrame(result).to_dict("records")
+        return result
+
+    def fleet_summary(self):
+        # get_fleet_summary: latest + NOW + DTC, then _get_truck_details: latest + averages
+        self._query("fuel_metrics_latest")
+        self._query("SELECT NOW()")
+        self._query("dtc_events")
+        self._query("fuel_metrics_latest")
+        return self._query("avg_idle_gph_24h")
+
+    def truck(self, truck_id):
+        # get_latest_truck_data for the whole fleet + fleet averages, filtered after
+        latest = self._query("fuel_metrics_latest")
+        self._query("avg_mpg_24h")
+        return [r for r in latest if r["truck_id"] == truck_id]
+
+    def refuels(self):
+        trucks = self._query("fuel_metrics_latest")
+        result = []
+        for row in trucks:
+            params = {"truck_ids": (row["truck_id"],)}
+            events = self._query("FROM refuel_events", params)
+            if not events:
+                events = self._query("FROM fuel_metrics", params)
+            result += events
+        return result
+
+    def alerts(self):
+        trucks = self._query("fuel_metrics_latest")
+        for _ in trucks:
+            self._query("fuel_metrics_latest")  # get_truck_latest_record per truck
+        return trucks
+
+    def kpis(self):
+        return self._query("SUM(")
+
+
+# =============================================================================
+# Polling
+# =============================================================================
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def poll(call, clients: int, seconds: float, truck_ids) -> dict:
+    latencies = defaultdict(list)
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(n: int):
+        nonlocal errors
+        rng = random.Random(n)
+        while time.perf_counter() < deadline:
+            endpoint = ENDPOINTS[rng.randrange(len(ENDPOINTS))]
+            started = time.perf_counter()
+            try:
+                await call(endpoint, rng.choice(truck_ids))
+            except Exception:
+                errors += 1
+                continue
+            latencies[endpoint].append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return {"elapsed": time.perf_counter() - started, "latencies": latencies, "errors": errors}
+
+
+def report(name: str, result: dict) -> None:
+    every = [ms for values in result["latencies"].values() for ms in values]
+    if not every:
+        print(f"\n{name}: no successful requests ({result['errors']} errors)")
+        return
+    print(
+        f"\n{name}  {len(every) / result['elapsed']:8.1f} req/s   "
+        f"p50 {statistics.median(every):7.1f} ms   p99 {percentile(every, 99):7.1f} ms"
+        + (f"   errors {result['errors']}" if result["errors"] else "")
+    )
+    for endpoint in ENDPOINTS:
+        values = result["latencies"].get(endpoint)
+        if values:
+            print(
+                f"  {endpoint:<10} n={len(values):<6} "
+                f"p50 {statistics.median(values):7.1f} ms   p99 {percentile(values, 99):7.1f} ms"
+            )
+
+
+async def run_simulated(args) -> None:
+    rows = FakeRows(args.trucks)
+    db_seconds = args.db_ms / 1000
+
+    legacy = LegacyBackend(rows, db_seconds, args.pool)
+
+    async def legacy_call(endpoint, truck_id):
+        if endpoint == "kpis":
+            return legacy.kpis()  # old /kpis called get_kpi_summary() on the loop
+        if endpoint == "truck":
+            return await asyncio.to_thread(legacy.truck, truck_id)
+        method = "fleet_summary" if endpoint == "fleet" else endpoint
+        return await asyncio.to_thread(getattr(legacy, method))
+
+    install_native(rows, db_seconds, args.pool)
+    native = {
+        "fleet": lambda _: reads.fleet_summary(),
+        "truck": reads.truck_latest_record,
+        "refuels": lambda _: reads.all_refuels(7),
+        "alerts": lambda _: reads.active_alerts(),
+        "kpis": lambda _: reads.fleet_kpis(1),
+    }
+
+    async def native_call(endpoint, truck_id):
+        return await native[endpoint](truck_id)
+
+    print(
+        f"{args.clients} clients x {args.seconds:.0f}s, {args.trucks} trucks, "
+        f"{args.db_ms} ms/query, {args.pool} connections"
+    )
+    report(
+        "legacy (sync + default executor)",
+        await poll(legacy_call, args.clients, args.seconds, rows.truck_ids),
+    )
+    report("native (aiomysql)", await poll(native_call, args.clients, args.seconds, rows.truck_ids))
+
+
+async def run_http(args) -> None:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as http:
+        fleet = (await http.get(API_PATHS["fleet"])).json()
+        truck_ids = [t["truck_id"] for t in fleet.get("truck_details", [])] or ["CO0681"]
+
+        async def call(endpoint, truck_id):
+            response = await http.get(API_PATHS[endpoint].format(truck_id=truck_id))
+            response.raise_for_status()
+
+        print(f"{args.clients} clients x {args.seconds:.0f}s against {args.url}")
+        report("http", await poll(call, args.clients, args.seconds, truck_ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--trucks", type=int, default=45)
+    parser.add_argument("--db-ms", type=float, default=4)
+    parser.add_argument("--pool", type=int, default=15)
+    parser.add_argument("--url", help="poll a running API instead of the simulation")
+    args = parser.parse_args()
+
+    asyncio.run(run_http(args) if args.url else run_simulated(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Engine Health Fleet Benchmark
+=============================
+
+Compares EngineHealthAnalyzer.analyze_fleet_health paths:
+
+1. per-truck:  analyze_truck_health for every truck (pre-v5.12.13)
+2. vectorized: every threshold / baseline rule as a NumPy mask across the
+               fleet, baselines loaded with one query
+
+Baselines are pre-seeded in the analyzer cache, so the numbers measure rule
+evaluation only (the per-truck path additionally issues one baseline query
+per uncached truck in production).
+
+Run:
+    python load_tests/bench_engine_health.py [--sizes 100,1000,10000,50000]
+        [--repeat 3] [--abnormal-rate 0.02]
+
+Author: Fuel Copilot Team
+Date: December 2025
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from engine_health_engine import EngineHealthAnalyzer, SensorBaseline  # noqa: E402
+
+# (normal mean, std, abnormal low, abnormal high)
+SENSORS = {
+    "oil_pressure_psi": (45, 5, 15, 32),
+    "coolant_temp_f": (195, 6, 218, 235),
+    "oil_temp_f": (215, 8, 245, 265),
+    "battery_voltage": (14.0, 0.15, 12.5, 13.4),
+    "def_level_pct": (60, 20, 2, 12),
+    "engine_load_pct": (55, 15, 92, 99),
+}
+
+
+def _fleet(n, rng, abnormal_rate):
+    """Mostly healthy fleet; `abnormal_rate` of readings outside normal range"""
+    now = datetime.now(timezone.utc)
+    fleet, baselines = [], {}
+    for i in range(n):
+        truck_id = f"TR{i:06d}"
+        row = {
+            "truck_id": truck_id,
+            "timestamp_utc": now - timedelta(minutes=rng.choice([1, 3, 8, 40])),
+            "rpm": rng.choice([0, 700, 1300, 1500]),
+        }
+        for sensor, (mean, std, low, high) in SENSORS.items():
+            value = (
+                rng.uniform(low, high)
+                if rng.random() < abnormal_rate
+                else rng.gauss(mean, std)
+            )
+            row[sensor] = round(value, 1)
+        fleet.append(row)
+        baselines[truck_id] = {
+            "oil_pressure_psi": SensorBaseline("oil_pressure_psi", truck_id, mean_30d=45.0)
+        }
+    return fleet, baselines
+
+
+def _run(fleet, baselines, vectorized):
+    analyzer = EngineHealthAnalyzer(db_connection=object())
+    analyzer._baselines_cache = dict(baselines)
+    start = time.perf_counter()
+    summary = analyzer.analyze_fleet_health(fleet, vectorized=vectorized)
+    return time.perf_counter() - start, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine health fleet benchmark")
+    parser.add_argument("--sizes", default="100,1000,10000,50000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--abnormal-rate", type=float, default=0.02)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'trucks':>8} {'per-truck ms':>14} {'vectorized ms':>14} {'speedup':>8}  alerts")
+    for size in (int(s) for s in args.sizes.split(",")):
+        fleet, baselines = _fleet(size, rng, args.abnormal_rate)
+        per_truck = min(_run(fleet, baselines, False)[0] for _ in range(args.repeat))
+        vectorized, summary = min(
+            (_run(fleet, baselines, True) for _ in range(args.repeat)), key=lambda r: r[0]
+        )
+        alerts = len(summary.critical_alerts) + len(summary.warning_alerts)
+        print(
+            f"{size:>8} {per_truck * 1000:>14.1f} {vectorized * 1000:>14.1f} "
+            f"{per_truck / vectorized:>7.1f}x  {alerts}"
+        )
+
+
+if __name__ == "__main__":
+    main()
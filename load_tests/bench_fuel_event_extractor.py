@@ -0,0 +1,148 @@
+"""
+Fuel Event Extractor Benchmark
+==============================
+
+Times theft/refuel candidate extraction over a full fleet's fuel_metrics
+history (default: 45 trucks x 90 days, one reading every 2 minutes):
+
+1. row-by-row: theft_detection_engine._process_local_results over the
+               LAG()-windowed rows the old query returned (the LAG itself
+               was computed by MySQL and is not timed)
+2. columnar:   FuelColumns.from_rows + extract_fuel_drops over the raw rows
+               (what analyze_fuel_drops_advanced runs since v5.12.1), plus
+               extract_refuel_jumps on the same columns
+
+The row-by-row number excludes the five LAG() windows MySQL had to compute,
+so it is a lower bound for the old path, not a like-for-like baseline. The
+target is the columnar total staying within a few seconds for 90 days x full
+fleet, with a drop list identical to the row-by-row one.
+
+Run:
+    python load_tests/bench_fuel_event_extractor.py [--trucks 45] [--days 90]
+        [--interval-minutes 2] [--repeat 3]
+
+Author: Fuel Copilot Team
+Date: December 2025
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fuel_event_extractor import (  # noqa: E402
+    FuelColumns,
+    extract_fuel_drops,
+    extract_refuel_jumps,
+)
+from theft_detection_engine import (  # noqa: E402
+    CONFIG,
+    _process_local_results,
+    _process_local_rows,
+)
+
+
+def _fleet_rows(n_trucks, days, interval_minutes, rng):
+    """
+    fuel_metrics rows ordered by truck_id, timestamp_utc:
+    (truck_id, ts, est_pct, est_gal, sensor_pct, sensor_gal, status, odometer)
+    """
+    per_truck = int(days * 24 * 60 / interval_minutes)
+    start = datetime(2025, 9, 1)
+    step = timedelta(minutes=interval_minutes)
+    rows = []
+    for t in range(n_trucks):
+        truck_id = f"TR{t:04d}"
+        pct, odo = 80.0, 100000.0 + t * 1000
+        for k in range(per_truck):
+            event = rng.random()
+            if event < 0.001:
+                pct -= rng.uniform(10, 40)  # theft-like drop
+            elif event < 0.003:
+                pct += rng.uniform(20, 60)  # refuel
+            else:
+                pct -= rng.uniform(0, 0.3)
+            pct = min(max(pct, 5.0), 100.0)
+            moving = rng.random() < 0.5
+            if moving:
+                odo += rng.uniform(0, 2)
+            gal = pct * 2.0
+            rows.append(
+                (
+                    truck_id,
+                    start + k * step,
+                    pct,
+                    gal,
+                    pct,
+                    gal,
+                    "MOVING" if moving else "PARKED",
+                    round(odo, 1),
+                )
+            )
+    return rows
+
+
+def _with_lag(rows):
+    """The old query's LAG(est_pct, est_gal, ts, odometer, status) columns"""
+    out = []
+    prev = None
+    for row in rows:
+        if prev is not None and prev[0] == row[0]:
+            out.append(row + (prev[2], prev[3], prev[1], prev[7], prev[6]))
+        else:
+            out.append(row + (None, None, None, None, None))
+        prev = row
+    return out
+
+
+def _best(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuel event extractor benchmark")
+    parser.add_argument("--trucks", type=int, default=45)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--interval-minutes", type=float, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = _fleet_rows(args.trucks, args.days, args.interval_minutes, random.Random(0))
+    lag_rows = _with_lag(rows)
+    print(f"{args.trucks} trucks x {args.days} days = {len(rows):,} readings")
+
+    row_s, expected = _best(lambda: _process_local_results(lag_rows, {}), args.repeat)
+    load_s, cols = _best(
+        lambda: FuelColumns.from_rows(rows, odometer_idx=7, status_idx=6), args.repeat
+    )
+    drops_s, _ = _best(
+        lambda: extract_fuel_drops(
+            cols,
+            min_drop_pct=CONFIG.min_drop_pct,
+            min_drop_gal=CONFIG.min_drop_gallons,
+            max_gap_hours=CONFIG.max_time_window_hours,
+        ),
+        args.repeat,
+    )
+    jumps_s, jumps = _best(lambda: extract_refuel_jumps(cols, min_jump_pct=10), args.repeat)
+    total_s, actual = _best(lambda: _process_local_rows(rows), args.repeat)
+
+    print(f"{'row-by-row drops':<28} {row_s * 1000:>10.1f} ms  ({len(expected)} drops)")
+    print(f"{'  from_rows':<28} {load_s * 1000:>10.1f} ms")
+    print(f"{'  extract_fuel_drops':<28} {drops_s * 1000:>10.1f} ms")
+    print(f"{'  extract_refuel_jumps':<28} {jumps_s * 1000:>10.1f} ms  ({len(jumps['index'])} jumps)")
+    print(f"{'columnar drops (end to end)':<28} {total_s * 1000:>10.1f} ms  ({len(actual)} drops)")
+    print(f"identical results: {actual == expected}")
+
+
+if __name__ == "__main__":
+    main()
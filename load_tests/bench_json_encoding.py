@@ -0,0 +1,197 @@
+"""
+JSON Encoding Benchmark
+=======================
+
+Compares response encoding paths on fleet-sized payloads:
+
+1. FastAPI default:   response_model validation + jsonable_encoder + json
+2. FastAPI no model:  jsonable_encoder + json (e.g. JSONResponse / dict return)
+3. fast_json:         orjson via fast_json.dumps
+4. cached bytes:      memory_cache.get_encoded hit (what /fleet and the
+                      command-center dashboard serve on a cache hit)
+
+Payloads:
+- /fleet:                     FleetSummary with N trucks (~60 fields each)
+- /command-center/dashboard:  CommandCenterData.to_dict() with N*3 action items
+
+Run:
+    python load_tests/bench_json_encoding.py [--trucks 45] [--repeat 200]
+
+Author: Fuel Copilot Team
+Date: December 2025
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from fast_json import dumps  # noqa: E402
+from memory_cache import MemoryCache  # noqa: E402
+from models import FleetSummary  # noqa: E402
+
+
+def build_fleet_payload(n_trucks: int) -> dict:
+    rng = random.Random(1)
+    now = datetime(2025, 12, 20, 14, 0, 0)
+    details = []
+    for i in range(n_trucks):
+        truck = {
+            "truck_id": f"TR{i:04d}",
+            "timestamp_utc": now - timedelta(seconds=rng.randint(0, 900)),
+            "truck_status": rng.choice(["MOVING", "STOPPED", "PARKED", "OFFLINE"]),
+            "estimated_pct": rng.uniform(5, 100),
+            "sensor_pct": rng.uniform(5, 100),
+            "mpg_current": rng.choice([rng.uniform(4, 8), float("nan")]),
+            "speed_mph": rng.uniform(0, 70),
+            "latitude": rng.uniform(25, 45),
+            "longitude": rng.uniform(-120, -75),
+        }
+        for k in range(50):
+            truck[f"metric_{k}"] = rng.uniform(0, 1000)
+        details.append(truck)
+    return {
+        "total_trucks": n_trucks,
+        "active_trucks": n_trucks - 4,
+        "offline_trucks": 4,
+        "critical_count": 1,
+        "warning_count": 3,
+        "healthy_count": n_trucks - 4,
+        "avg_mpg": 5.8,
+        "avg_idle_gph": 0.82,
+        "truck_details": details,
+        "timestamp": now,
+        "data_source": "MySQL",
+    }
+
+
+def build_command_center_payload(n_trucks: int) -> dict:
+    from fleet_command_center import (
+        ActionItem,
+        ActionType,
+        CommandCenterData,
+        CostProjection,
+        FleetHealthScore,
+        IssueCategory,
+        Priority,
+        SensorStatus,
+        UrgencySummary,
+    )
+
+    rng = random.Random(2)
+    items = [
+        ActionItem(
+            id=f"ACT-{i:05d}",
+            truck_id=f"TR{i % n_trucks:04d}",
+            priority=rng.choice(list(Priority)),
+            priority_score=rng.uniform(0, 100),
+            category=rng.choice(list(IssueCategory)),
+            component="Sistema de enfriamiento",
+            title="Temperatura de refrigerante en aumento",
+            description="La temperatura ha subido de forma sostenida en los últimos 7 días " * 2,
+            days_to_critical=rng.uniform(1, 30),
+            cost_if_ignored="$8,000 - $15,000",
+            current_value="218°F",
+            trend="+2.1°F/día",
+            threshold="Crítico: >225°F",
+            confidence="HIGH",
+            action_type=rng.choice(list(ActionType)),
+            action_steps=["Revisar nivel de refrigerante", "Inspeccionar bomba de agua"],
+            icon="🌡️",
+            sources=["sensor_health", "trend_engine"],
+        )
+        for i in range(n_trucks * 3)
+    ]
+    data = CommandCenterData(
+        generated_at=datetime(2025, 12, 20, 14, 0).isoformat(),
+        fleet_health=FleetHealthScore(82, "Bueno", "stable", "Flota en buen estado"),
+        total_trucks=n_trucks,
+        trucks_analyzed=n_trucks,
+        urgency_summary=UrgencySummary(critical=2, high=5, medium=10, low=20, ok=8),
+        sensor_status=SensorStatus(gps_issues=1, voltage_issues=2, total_trucks=n_trucks),
+        cost_projection=CostProjection("$5,000", "$12,000", "$40,000"),
+        action_items=items,
+        critical_actions=items[:5],
+        high_priority_actions=items[5:15],
+        insights=[{"type": "info", "message": "MPG estable"}] * 10,
+        data_quality={"trucks_with_data": n_trucks},
+    )
+    return {"success": True, "data": data.to_dict(), "cached": False}
+
+
+def _sanitize(obj):
+    """What endpoints do today before the stdlib encoder (sanitize_nan)"""
+    if isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
+        return None
+    if isinstance(obj, dict):
+        return {k: _sanitize(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_sanitize(v) for v in obj]
+    return obj
+
+
+def _timeit(fn, repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench(name: str, payload: dict, repeat: int, model=None):
+    def default_path():
+        body = _sanitize(payload)
+        if model is not None:
+            body = model.model_validate(body).model_dump(mode="json")
+        return json.dumps(
+            jsonable_encoder(body), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()
+
+    def no_model_path():
+        return json.dumps(
+            jsonable_encoder(_sanitize(payload)), ensure_ascii=False, allow_nan=False
+        ).encode()
+
+    cache = MemoryCache(max_size=10, cleanup_interval=3600)
+    cache.set("k", payload, ttl=3600)
+    cache.get_encoded("k", dumps)
+
+    results = {
+        "fastapi default": _timeit(default_path, repeat),
+        "jsonable_encoder+json": _timeit(no_model_path, repeat),
+        "fast_json.dumps": _timeit(lambda: dumps(payload), repeat),
+        "cached bytes": _timeit(lambda: cache.get_encoded("k", dumps), repeat),
+    }
+    cache.shutdown()
+
+    size_kb = len(dumps(payload)) / 1024
+    print(f"\n{name}  ({size_kb:.0f} KB)")
+    base = results["fastapi default"]
+    for label, ms in results.items():
+        print(f"  {label:<24} {ms:8.3f} ms   x{base / ms:7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trucks", type=int, default=45)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    bench("/fleet", build_fleet_payload(args.trucks), args.repeat, model=FleetSummary)
+    bench(
+        "/command-center/dashboard",
+        build_command_center_payload(args.trucks),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+LSTM Inference Benchmark
+========================
+
+Compares LSTMFuelPredictor inference paths for one sync cycle:
+
+1. per-truck:   one forward pass per truck (batch of one, as the sync loop
+                did before v5.12.5)
+2. fleet batch: predict_batch - all trucks of a model family stacked into a
+                single tensor
+
+and the import cost of the inference runtime (lstm_fuel_predictor, NumPy
+only) vs importing TensorFlow (only if installed).
+
+Run:
+    python load_tests/bench_lstm_inference.py [--trucks 45] [--cycles 20]
+
+Author: Fuel Copilot Team
+Date: December 2025
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from lstm_fuel_predictor import LSTMFuelPredictor, NumpyLSTMModel  # noqa: E402
+
+
+def _random_model(rng) -> NumpyLSTMModel:
+    def w(*shape):
+        return (rng.normal(size=shape) * 0.2).astype(np.float32)
+
+    lstm = {"type": "lstm", "activation": "relu", "recurrent_activation": "sigmoid"}
+    return NumpyLSTMModel(
+        [
+            dict(lstm, return_sequences=True, kernel=w(1, 256), recurrent_kernel=w(64, 256), bias=w(256)),
+            dict(lstm, return_sequences=False, kernel=w(64, 128), recurrent_kernel=w(32, 128), bias=w(128)),
+            {"type": "dense", "activation": "relu", "kernel": w(32, 16), "bias": w(16)},
+            {"type": "dense", "activation": "linear", "kernel": w(16, 1), "bias": w(1)},
+        ]
+    )
+
+
+def _import_seconds(module: str) -> float:
+    code = f"import time; s = time.perf_counter(); import {module}; print(time.perf_counter() - s)"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=str(Path(__file__).resolve().parent.parent),
+    )
+    return float(out.stdout.strip().splitlines()[-1]) if out.returncode == 0 else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LSTM inference benchmark")
+    parser.add_argument("--trucks", type=int, default=45)
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    predictor = LSTMFuelPredictor(model_dir=tempfile.mkdtemp())
+    histories = {}
+    for i in range(args.trucks):
+        truck_id = f"TR{i:04d}"
+        predictor.runtime_models[truck_id] = _random_model(rng)
+        predictor.scalers[truck_id] = {"mean": 4.0, "std": 0.8}
+        histories[truck_id] = (4 + rng.normal(0, 0.5, predictor.sequence_length)).tolist()
+
+    def per_truck():
+        for truck_id, history in histories.items():
+            predictor.predict_batch({truck_id: history})
+
+    def batched():
+        predictor.predict_batch(histories)
+
+    for label, fn in (("per-truck", per_truck), ("fleet batch", batched)):
+        fn()  # warm-up (stacks weights once)
+        start = time.perf_counter()
+        for _ in range(args.cycles):
+            fn()
+        ms = (time.perf_counter() - start) / args.cycles * 1000
+        print(f"{label:<12} {ms:8.2f} ms / cycle ({args.trucks} trucks)")
+
+    print(f"\nimport lstm_fuel_predictor: {_import_seconds('lstm_fuel_predictor'):.2f}s")
+    tf = _import_seconds("tensorflow")
+    print(f"import tensorflow:          {'not installed' if tf != tf else f'{tf:.2f}s'}")
+
+
+if __name__ == "__main__":
+    main()
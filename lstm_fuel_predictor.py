@@ -7,28 +7,278 @@ Features:
 - Entrenamiento adaptativo por truck + ruta
 - Incorpora factores ambientales y de conducción
 - Validación de anomalías en predicciones
+
+🆕 v5.12.5: Runtime de inferencia sin TensorFlow
+- TensorFlow solo se importa para entrenar (o para convertir un .h5 viejo)
+- Los pesos entrenados se exportan a `{truck_id}_lstm_weights.npz` y la
+  inferencia corre con un forward pass LSTM en NumPy (NumpyLSTMModel)
+- predict_batch(): toda la flota en un solo tensor por familia de modelo
+  (misma arquitectura), con los pesos de cada truck apilados
 """
 
+import importlib.util
 import json
 import logging
+import sys
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
-try:
-    from tensorflow import keras
-    from tensorflow.keras import Sequential, layers
-    from tensorflow.keras.optimizers import Adam
-
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
-    logging.warning("⚠️ TensorFlow no disponible - LSTM deshabilitado")
+# 🆕 v5.12.5: No importar TensorFlow al cargar el módulo (segundos de startup
+# y cientos de MB en el proceso de sync y en la API). Solo se detecta.
+TENSORFLOW_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+if not TENSORFLOW_AVAILABLE:
+    logging.warning(
+        "⚠️ TensorFlow no disponible - entrenamiento LSTM deshabilitado "
+        "(inferencia NumPy disponible)"
+    )
 
 logger = logging.getLogger(__name__)
 
+_keras = None
+
+
+def _import_keras():
+    """Importa keras bajo demanda (entrenamiento / conversión de .h5)"""
+    global _keras
+    if _keras is None and TENSORFLOW_AVAILABLE:
+        start = time.perf_counter()
+        from tensorflow import keras
+
+        _keras = keras
+        logger.info(
+            f"📦 TensorFlow importado en {time.perf_counter() - start:.2f}s"
+        )
+    return _keras
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NUMPY RUNTIME
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)  # estable numéricamente
+
+
+_ACTIVATIONS = {
+    "relu": lambda x: np.maximum(x, 0.0),
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "linear": lambda x: x,
+}
+
+
+def _activation(name: str):
+    try:
+        return _ACTIVATIONS[name]
+    except KeyError:
+        raise ValueError(f"Activación no soportada en runtime NumPy: {name}")
+
+
+def _lstm_forward(
+    x: np.ndarray,
+    kernel: np.ndarray,
+    recurrent_kernel: np.ndarray,
+    bias: np.ndarray,
+    activation: str,
+    recurrent_activation: str,
+    return_sequences: bool,
+) -> np.ndarray:
+    """
+    Forward pass de una capa LSTM de Keras (gates en orden i, f, c, o).
+
+    Los pesos pueden ser de un solo modelo (kernel: (F, 4H)) o apilados
+    por truck (kernel: (B, F, 4H)); np.matmul resuelve ambos casos.
+
+    Args:
+        x: (B, T, F)
+
+    Returns:
+        (B, T, H) si return_sequences, si no (B, H)
+    """
+    act = _activation(activation)
+    rec_act = _activation(recurrent_activation)
+    batch, steps, _ = x.shape
+    units = recurrent_kernel.shape[-2]
+
+    # Proyección de entrada para todos los pasos en un solo matmul
+    xw = np.matmul(x, kernel) + bias[..., None, :]
+
+    h = np.zeros((batch, units), dtype=x.dtype)
+    c = np.zeros((batch, units), dtype=x.dtype)
+    outputs = np.empty((batch, steps, units), dtype=x.dtype) if return_sequences else None
+
+    for t in range(steps):
+        z = xw[:, t] + np.matmul(h[:, None, :], recurrent_kernel)[:, 0]
+        i = rec_act(z[:, :units])
+        f = rec_act(z[:, units : 2 * units])
+        g = act(z[:, 2 * units : 3 * units])
+        o = rec_act(z[:, 3 * units :])
+        c = f * c + i * g
+        h = o * act(c)
+        if outputs is not None:
+            outputs[:, t] = h
+
+    return outputs if outputs is not None else h
+
+
+def _dense_forward(
+    x: np.ndarray, kernel: np.ndarray, bias: np.ndarray, activation: str
+) -> np.ndarray:
+    """Dense sobre (B, D) con pesos de un modelo (D, E) o apilados (B, D, E)"""
+    return _activation(activation)(np.matmul(x[:, None, :], kernel)[:, 0] + bias)
+
+
+class NumpyLSTMModel:
+    """
+    Modelo LSTM exportado de Keras, ejecutado con NumPy.
+
+    Cada capa es un dict {"type": "lstm" | "dense", "activation", ...} con sus
+    arrays de pesos. Dropout no existe en inferencia y se omite al exportar.
+    """
+
+    WEIGHT_KEYS = {
+        "lstm": ("kernel", "recurrent_kernel", "bias"),
+        "dense": ("kernel", "bias"),
+    }
+
+    def __init__(self, layers: List[Dict[str, Any]]):
+        self.layers = layers
+
+    @property
+    def signature(self) -> Tuple:
+        """Arquitectura (tipos, formas, activaciones) - define la familia"""
+        return tuple(
+            (
+                layer["type"],
+                layer["kernel"].shape,
+                layer.get("activation"),
+                layer.get("recurrent_activation"),
+                layer.get("return_sequences"),
+            )
+            for layer in self.layers
+        )
+
+    @classmethod
+    def from_keras(cls, model) -> "NumpyLSTMModel":
+        """Convierte un modelo Sequential de Keras (LSTM / Dropout / Dense)"""
+        layers = []
+        for layer in model.layers:
+            kind = type(layer).__name__.lower()
+            config = layer.get_config()
+            weights = [np.asarray(w, dtype=np.float32) for w in layer.get_weights()]
+            if kind == "dropout":
+                continue
+            if kind == "lstm":
+                kernel, recurrent_kernel = weights[0], weights[1]
+                bias = (
+                    weights[2]
+                    if len(weights) > 2
+                    else np.zeros(kernel.shape[1], dtype=np.float32)
+                )
+                layers.append(
+                    {
+                        "type": "lstm",
+                        "activation": config.get("activation", "tanh"),
+                        "recurrent_activation": config.get(
+                            "recurrent_activation", "sigmoid"
+                        ),
+                        "return_sequences": bool(config.get("return_sequences", False)),
+                        "kernel": kernel,
+                        "recurrent_kernel": recurrent_kernel,
+                        "bias": bias,
+                    }
+                )
+            elif kind == "dense":
+                kernel = weights[0]
+                bias = (
+                    weights[1]
+                    if len(weights) > 1
+                    else np.zeros(kernel.shape[1], dtype=np.float32)
+                )
+                layers.append(
+                    {
+                        "type": "dense",
+                        "activation": config.get("activation", "linear"),
+                        "kernel": kernel,
+                        "bias": bias,
+                    }
+                )
+            else:
+                raise ValueError(f"Capa no soportada en runtime NumPy: {kind}")
+
+        converted = cls(layers)
+        for layer in layers:  # valida activaciones al exportar, no al predecir
+            _activation(layer["activation"])
+            if layer["type"] == "lstm":
+                _activation(layer["recurrent_activation"])
+        return converted
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """X: (B, T, F) → (B, salidas)"""
+        return _forward(self.layers, np.asarray(X, dtype=np.float32))
+
+    def save(self, path: Path):
+        spec = []
+        arrays = {}
+        for idx, layer in enumerate(self.layers):
+            spec.append({k: v for k, v in layer.items() if not isinstance(v, np.ndarray)})
+            for key in self.WEIGHT_KEYS[layer["type"]]:
+                arrays[f"{idx}_{key}"] = layer[key]
+        np.savez(path, spec=np.array(json.dumps(spec)), **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> "NumpyLSTMModel":
+        with np.load(path, allow_pickle=False) as data:
+            spec = json.loads(str(data["spec"]))
+            layers = []
+            for idx, layer in enumerate(spec):
+                for key in cls.WEIGHT_KEYS[layer["type"]]:
+                    layer[key] = data[f"{idx}_{key}"].astype(np.float32)
+                layers.append(layer)
+        return cls(layers)
+
+
+def _forward(layers: List[Dict[str, Any]], x: np.ndarray) -> np.ndarray:
+    for layer in layers:
+        if layer["type"] == "lstm":
+            x = _lstm_forward(
+                x,
+                layer["kernel"],
+                layer["recurrent_kernel"],
+                layer["bias"],
+                layer["activation"],
+                layer["recurrent_activation"],
+                layer["return_sequences"],
+            )
+        else:
+            x = _dense_forward(x, layer["kernel"], layer["bias"], layer["activation"])
+    return x
+
+
+def stack_models(models: List[NumpyLSTMModel]) -> List[Dict[str, Any]]:
+    """
+    Apila los pesos de N modelos de la misma familia en capas con un eje de
+    batch, para correr la flota completa en un solo forward pass.
+    """
+    stacked = []
+    for layers in zip(*(m.layers for m in models)):
+        first = layers[0]
+        layer = {k: v for k, v in first.items() if not isinstance(v, np.ndarray)}
+        for key in NumpyLSTMModel.WEIGHT_KEYS[first["type"]]:
+            layer[key] = np.stack([lyr[key] for lyr in layers])
+        stacked.append(layer)
+    return stacked
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PREDICTOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
 
 class LSTMFuelPredictor:
     """Predictor de consumo de combustible con LSTM"""
@@ -46,17 +296,32 @@ class LSTMFuelPredictor:
         self.tf_available = (
             TENSORFLOW_AVAILABLE  # Flag para indicar si TensorFlow está disponible
         )
-        self.models: Dict[str, keras.Model] = {}  # Modelos por truck_id
+        self.models: Dict[str, Any] = {}  # Modelos Keras por truck_id (entrenamiento)
+        self.runtime_models: Dict[str, NumpyLSTMModel] = {}  # Inferencia NumPy
         self.scalers: Dict[str, Dict] = {}  # MinMax scalers
         self.training_history: Dict[str, List] = {}  # Histórico de entrenamiento
 
         self.sequence_length = 60  # 60 observaciones anteriores (típicamente 60 min)
         self.prediction_horizons = [1, 4, 12, 24]  # Horas
 
-        if TENSORFLOW_AVAILABLE:
-            logger.info("✅ LSTM Predictor inicializado")
-        else:
-            logger.warning("⚠️ LSTM deshabilitado - instala tensorflow")
+        # 🆕 v5.12.5: Pesos apilados por familia, se invalidan al cambiar modelos
+        self._stacked_cache: Dict[Tuple, Tuple[Tuple[str, ...], List[Dict]]] = {}
+        self._missing: Dict[str, float] = {}  # truck_id → último intento de carga
+        self._stats = {
+            "batches": 0,
+            "predictions": 0,
+            "last_batch_trucks": 0,
+            "last_batch_families": 0,
+            "last_inference_ms": 0.0,
+            "total_inference_ms": 0.0,
+            "model_load_ms": 0.0,
+            "models_converted": 0,
+        }
+
+        logger.info(
+            "✅ LSTM Predictor inicializado (runtime NumPy"
+            f"{', entrenamiento con TensorFlow' if TENSORFLOW_AVAILABLE else ''})"
+        )
 
     def prepare_training_data(
         self,
@@ -100,24 +365,28 @@ class LSTMFuelPredictor:
 
     def build_model(self, truck_id: str, learning_rate: float = 0.001):
         """Construye y compila modelo LSTM para un truck"""
-        if not TENSORFLOW_AVAILABLE:
+        keras = _import_keras()
+        if keras is None:
             return None
 
-        model = Sequential(
+        model = keras.Sequential(
             [
-                layers.LSTM(
-                    64, activation="relu", input_shape=(self.sequence_length, 1)
+                keras.layers.LSTM(
+                    64,
+                    activation="relu",
+                    return_sequences=True,  # la segunda LSTM necesita la secuencia
+                    input_shape=(self.sequence_length, 1),
                 ),
-                layers.Dropout(0.2),
-                layers.LSTM(32, activation="relu"),
-                layers.Dropout(0.2),
-                layers.Dense(16, activation="relu"),
-                layers.Dense(1),
+                keras.layers.Dropout(0.2),
+                keras.layers.LSTM(32, activation="relu"),
+                keras.layers.Dropout(0.2),
+                keras.layers.Dense(16, activation="relu"),
+                keras.layers.Dense(1),
             ]
         )
 
         model.compile(
-            optimizer=Adam(learning_rate=learning_rate),
+            optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
             loss="mse",
             metrics=["mae"],
         )
@@ -186,8 +455,9 @@ class LSTMFuelPredictor:
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
-        # Persistir modelo
+        # Persistir modelo (.h5 + pesos NumPy para inferencia)
         self._save_model(truck_id)
+        self.export_numpy_model(truck_id)
 
         logger.info(f"✅ Modelo LSTM entrenado para {truck_id}")
         return {
@@ -219,48 +489,116 @@ class LSTMFuelPredictor:
                 "hours_ahead": 4
             }
         """
-        if not TENSORFLOW_AVAILABLE:
-            return {"status": "unavailable"}
-
-        if truck_id not in self.models:
-            # Intentar cargar modelo
-            if not self._load_model(truck_id):
-                return {"status": "no_model", "truck_id": truck_id}
+        return self.predict_batch({truck_id: recent_consumption}, hours_ahead)[truck_id]
 
-        if len(recent_consumption) < self.sequence_length:
-            return {
-                "status": "insufficient_history",
-                "required": self.sequence_length,
-                "available": len(recent_consumption),
-            }
-
-        try:
-            # Normalizar entrada
-            scaler = self.scalers.get(truck_id, {"mean": 0, "std": 1})
-            normalized = (
-                np.array(recent_consumption[-self.sequence_length :], dtype=np.float32)
-                - scaler["mean"]
-            ) / scaler["std"]
+    def predict_batch(
+        self,
+        recent_consumption: Dict[str, List[float]],
+        hours_ahead: int = 4,
+    ) -> Dict[str, Dict]:
+        """
+        🆕 v5.12.5: Predice consumo para toda la flota en un solo paso.
 
-            # Preparar input
-            X = normalized.reshape(1, self.sequence_length, 1)
+        Las secuencias de todos los trucks con modelo se agrupan por familia
+        (misma arquitectura) y cada familia corre un único forward pass con
+        los pesos de cada truck apilados en el eje de batch.
 
-            # Predicción
-            model = self.models[truck_id]
-            pred_normalized = model.predict(X, verbose=0)[0][0]
+        Args:
+            recent_consumption: {truck_id: últimas N observaciones (gph)}
+            hours_ahead: Horas a predecir (1, 4, 12, 24)
 
-            # Denormalizar
-            prediction = pred_normalized * scaler["std"] + scaler["mean"]
+        Returns:
+            {truck_id: resultado con el mismo formato que predict()}
+        """
+        results: Dict[str, Dict] = {}
+        families: Dict[Tuple, List[str]] = {}
+
+        for truck_id, history in recent_consumption.items():
+            model = self._get_runtime_model(truck_id)
+            if model is None:
+                results[truck_id] = (
+                    {"status": "no_model", "truck_id": truck_id}
+                    if TENSORFLOW_AVAILABLE or self._has_exported_models()
+                    else {"status": "unavailable"}
+                )
+                continue
+            if len(history) < self.sequence_length:
+                results[truck_id] = {
+                    "status": "insufficient_history",
+                    "required": self.sequence_length,
+                    "available": len(history),
+                }
+                continue
+            families.setdefault(model.signature, []).append(truck_id)
+
+        start = time.perf_counter()
+        for signature, truck_ids in families.items():
+            try:
+                results.update(
+                    self._predict_family(
+                        signature, truck_ids, recent_consumption, hours_ahead
+                    )
+                )
+            except Exception as e:
+                logger.error(f"❌ Error en predicción LSTM: {e}")
+                for truck_id in truck_ids:
+                    results[truck_id] = {"status": "prediction_failed", "error": str(e)}
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        predicted = sum(len(ids) for ids in families.values())
+        if predicted:
+            self._stats["batches"] += 1
+            self._stats["predictions"] += predicted
+            self._stats["last_batch_trucks"] = predicted
+            self._stats["last_batch_families"] = len(families)
+            self._stats["last_inference_ms"] = round(elapsed_ms, 3)
+            self._stats["total_inference_ms"] += elapsed_ms
+        return results
+
+    def _predict_family(
+        self,
+        signature: Tuple,
+        truck_ids: List[str],
+        recent_consumption: Dict[str, List[float]],
+        hours_ahead: int,
+    ) -> Dict[str, Dict]:
+        key = tuple(truck_ids)
+        cached = self._stacked_cache.get(signature)
+        if cached is None or cached[0] != key:
+            layers = stack_models([self.runtime_models[t] for t in truck_ids])
+            self._stacked_cache[signature] = (key, layers)
+        else:
+            layers = cached[1]
 
+        raw = np.array(
+            [recent_consumption[t][-self.sequence_length :] for t in truck_ids],
+            dtype=np.float32,
+        )
+        scalers = [self.scalers.get(t, {"mean": 0, "std": 1}) for t in truck_ids]
+        mean = np.array([s["mean"] for s in scalers], dtype=np.float32)
+        std = np.array([s["std"] for s in scalers], dtype=np.float32)
+
+        # Normalizar entrada: (B, T, 1)
+        X = ((raw - mean[:, None]) / std[:, None])[:, :, None]
+        pred_normalized = _forward(layers, X)[:, 0]
+
+        # Denormalizar
+        predictions = pred_normalized * std + mean
+
+        # Confidence basado en variancia histórica
+        recent_std = raw[:, -10:].std(axis=1)
+        recent_std[recent_std == 0] = 0.1
+
+        timestamp = datetime.now(timezone.utc).isoformat()
+        results = {}
+        for truck_id, prediction, r_std in zip(
+            truck_ids, predictions.tolist(), recent_std.tolist()
+        ):
             # Generar rango de confianza (±15%)
             lower = prediction * 0.85
             upper = prediction * 1.15
-
-            # Confidence basado en variancia histórica
-            recent_std = np.std(recent_consumption[-10:]) or 0.1
-            confidence = max(0.6, 1.0 - (recent_std / prediction) * 0.5)
-
-            return {
+            confidence = max(0.6, 1.0 - (r_std / prediction) * 0.5) if prediction else 0.6
+            results[truck_id] = {
                 "status": "success",
                 "truck_id": truck_id,
                 "hours_ahead": hours_ahead,
@@ -268,11 +606,83 @@ class LSTMFuelPredictor:
                 "lower_bound_gph": float(max(0, lower)),
                 "upper_bound_gph": float(upper),
                 "confidence": float(confidence),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": timestamp,
             }
+        return results
+
+    def _get_runtime_model(self, truck_id: str) -> Optional[NumpyLSTMModel]:
+        model = self.runtime_models.get(truck_id)
+        if model is not None:
+            return model
+        # No reintentar discos vacíos en cada ciclo
+        last_try = self._missing.get(truck_id)
+        if last_try is not None and time.time() - last_try < 300:
+            return None
+        if self._load_model(truck_id):
+            self._missing.pop(truck_id, None)
+            return self.runtime_models.get(truck_id)
+        self._missing[truck_id] = time.time()
+        return None
+
+    def _has_exported_models(self) -> bool:
+        return bool(self.runtime_models) or any(self.model_dir.glob("*_lstm_weights.npz"))
+
+    def export_numpy_model(self, truck_id: str) -> bool:
+        """
+        🆕 v5.12.5: Exporta el modelo Keras de un truck a pesos NumPy (.npz).
+
+        Requiere el modelo en memoria (entrenado o cargado desde .h5). Después
+        de exportar, la inferencia de ese truck no necesita TensorFlow.
+        """
+        model = self.models.get(truck_id)
+        if model is None:
+            return False
+        try:
+            runtime_model = NumpyLSTMModel.from_keras(model)
+
+            # Paridad con Keras sobre una entrada aleatoria
+            probe = np.random.default_rng(0).normal(
+                size=(2, self.sequence_length, 1)
+            ).astype(np.float32)
+            diff = float(
+                np.max(np.abs(runtime_model.predict(probe) - model.predict(probe, verbose=0)))
+            )
+            if diff > 1e-3:
+                logger.warning(f"⚠️ Export NumPy de {truck_id} difiere de Keras: {diff:.2e}")
+
+            runtime_model.save(self.model_dir / f"{truck_id}_lstm_weights.npz")
+            self._set_runtime_model(truck_id, runtime_model)
+            self._stats["models_converted"] += 1
+            logger.info(f"📤 Modelo LSTM de {truck_id} exportado a NumPy")
+            return True
         except Exception as e:
-            logger.error(f"❌ Error en predicción LSTM: {e}")
-            return {"status": "prediction_failed", "error": str(e)}
+            logger.error(f"❌ Error exportando modelo NumPy de {truck_id}: {e}")
+            return False
+
+    def export_all(self) -> Dict[str, bool]:
+        """Exporta a NumPy todos los modelos .h5 del directorio"""
+        results = {}
+        for model_path in sorted(self.model_dir.glob("*_lstm_model.h5")):
+            truck_id = model_path.name[: -len("_lstm_model.h5")]
+            if truck_id not in self.models and not self._load_keras_model(truck_id):
+                results[truck_id] = False
+                continue
+            results[truck_id] = self.export_numpy_model(truck_id)
+        return results
+
+    def _set_runtime_model(self, truck_id: str, model: NumpyLSTMModel):
+        self.runtime_models[truck_id] = model
+        self._stacked_cache.pop(model.signature, None)
+
+    def get_runtime_stats(self) -> Dict[str, Any]:
+        """Estadísticas de inferencia (tiempos por ciclo, carga de modelos)"""
+        stats = dict(self._stats)
+        stats["total_inference_ms"] = round(stats["total_inference_ms"], 3)
+        stats["model_load_ms"] = round(stats["model_load_ms"], 3)
+        stats["runtime_models"] = len(self.runtime_models)
+        stats["families"] = len({m.signature for m in self.runtime_models.values()})
+        stats["tensorflow_imported"] = "tensorflow" in sys.modules
+        return stats
 
     def _save_model(self, truck_id: str):
         """Persiste modelo a disco"""
@@ -292,26 +702,44 @@ class LSTMFuelPredictor:
         except Exception as e:
             logger.error(f"❌ Error guardando modelo: {e}")
 
-    def _load_model(self, truck_id: str) -> bool:
-        """Carga modelo desde disco"""
-        if not TENSORFLOW_AVAILABLE:
-            return False
+    def _load_scaler(self, truck_id: str):
+        scaler_path = self.model_dir / f"{truck_id}_scaler.json"
+        if scaler_path.exists():
+            with open(scaler_path) as f:
+                self.scalers[truck_id] = json.load(f)
 
-        try:
-            model_path = self.model_dir / f"{truck_id}_lstm_model.h5"
-            if model_path.exists():
-                self.models[truck_id] = keras.models.load_model(str(model_path))
+    def _load_keras_model(self, truck_id: str) -> bool:
+        keras = _import_keras()
+        model_path = self.model_dir / f"{truck_id}_lstm_model.h5"
+        if keras is None or not model_path.exists():
+            return False
+        self.models[truck_id] = keras.models.load_model(str(model_path))
+        self._load_scaler(truck_id)
+        return True
 
-                # Cargar scaler
-                scaler_path = self.model_dir / f"{truck_id}_scaler.json"
-                if scaler_path.exists():
-                    with open(scaler_path) as f:
-                        self.scalers[truck_id] = json.load(f)
+    def _load_model(self, truck_id: str) -> bool:
+        """
+        Carga modelo desde disco.
 
-                logger.info(f"📂 Modelo LSTM cargado para {truck_id}")
+        Prefiere los pesos NumPy exportados; si solo existe el .h5 (modelos
+        anteriores a v5.12.5) lo carga con Keras y lo exporta una vez.
+        """
+        start = time.perf_counter()
+        try:
+            weights_path = self.model_dir / f"{truck_id}_lstm_weights.npz"
+            if weights_path.exists():
+                self._set_runtime_model(truck_id, NumpyLSTMModel.load(weights_path))
+                self._load_scaler(truck_id)
+                logger.info(f"📂 Modelo LSTM (NumPy) cargado para {truck_id}")
                 return True
+
+            if self._load_keras_model(truck_id):
+                logger.info(f"📂 Modelo LSTM (.h5) cargado para {truck_id}")
+                return self.export_numpy_model(truck_id)
         except Exception as e:
             logger.error(f"❌ Error cargando modelo: {e}")
+        finally:
+            self._stats["model_load_ms"] += (time.perf_counter() - start) * 1000
 
         return False
 
@@ -7,8 +7,17 @@ Modern async API with HTTP polling (WebSocket removed for simplicity)
 🆕 v3.10.9: Removed WebSocket - dashboard uses HTTP polling
 🆕 v3.12.21: Unified version, fixed bugs from Phase 1 audit
 🆕 v4.0.0: Redis caching, distributed rate limiting, scalability improvements
+🆕 v5.12.20: Heavy routers load lazily; import profile at /health/imports
+🆕 v5.12.21: Hot dashboard reads run natively on aiomysql (database_async_reads)
+🆕 v5.12.22: /batch sections share one latest-state read (batch_graph)
+🆕 v5.12.23: ETag/304 for polled endpoints keyed by sync cycle (conditional_responses)
 """
 
+# 🆕 v5.12.20: Must run before any other import so the whole startup is profiled
+import import_profiler
+
+import_profiler.install()
+
 import asyncio
 import json
 import logging
@@ -192,6 +201,10 @@ except Exception as e:
     MEMORY_CACHE_AVAILABLE = False
     logger.warning(f"⚠️  Memory cache unavailable: {e}")
 
+# 🆕 v5.12.4: orjson-backed responses + encoded-bytes caching
+from fast_json import FastJSONResponse, cached_json_response
+from fast_json import dumps as fast_json_dumps
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🆕 v4.2: MODULAR ROUTERS
@@ -221,6 +234,16 @@ async def lifespan(app: FastAPI):
 
     # Startup
     await lifecycle_manager.startup()
+    import_profiler.mark("ready")
+
+    # 🆕 v5.12.20: Import deferred routers/engines while already serving
+    lifecycle_manager.run_in_background(
+        lazy_routers.warm_up(
+            preload=LAZY_PRELOAD_MODULES,
+            on_done=import_profiler.get_import_profiler().uninstall,
+        ),
+        "lazy router warm-up",
+    )
 
     yield  # App runs here
 
@@ -397,6 +420,12 @@ All responses follow this structure:
     ],
     lifespan=lifespan,  # 🔧 FIX v3.9.3: Use lifespan instead of on_event
 )
+import_profiler.mark("app_created")
+
+# 🆕 v5.12.20: Placeholders for routers that are imported on first use
+from lazy_routers import LazyRouters
+
+lazy_routers = LazyRouters(app)
 
 # 🆕 v3.12.21: Register centralized error handlers
 try:
@@ -425,22 +454,14 @@ except ImportError as e:
     logger.warning(f"⚠️ Health Check router not available: {e}")
 
 # 🆕 v7.0.0: Register ML/AI Router (LSTM + Isolation Forest)
-try:
-    from routers.ml import router as ml_router
-
-    app.include_router(ml_router)
-    logger.info("✅ Machine Learning router registered (LSTM + Theft Detection)")
-except ImportError as e:
-    logger.warning(f"⚠️ ML router not available: {e}")
+# 🆕 v5.12.20: Lazy - routers.ml pulls in sklearn/scipy (and TensorFlow when
+# installed); the routes are spliced in on first request or by the warm-up
+lazy_routers.add("routers.ml", path_prefix="/fuelAnalytics/api/ml")
 
 # 🆕 DEC 24 2025: Register Truck MPG History Router
-try:
-    from routers.truck_mpg_history import router as mpg_history_router
-
-    app.include_router(mpg_history_router)
-    logger.info("✅ Truck MPG History router registered")
-except ImportError as e:
-    logger.warning(f"⚠️ MPG History router not available: {e}")
+lazy_routers.add(
+    "routers.truck_mpg_history", path_prefix="/fuelAnalytics/api/v2/trucks"
+)
 
 # 🆕 DEC 25 2025: Register Driver Alerts Router
 try:
@@ -497,31 +518,22 @@ except ImportError as e:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 # 🆕 FASE 2A: EKF Integration & Diagnostics Endpoints
-try:
-    from ekf_diagnostics_endpoints import router as ekf_router
-    from ekf_integration import get_ekf_manager, initialize_ekf_manager
-
-    initialize_ekf_manager()
-    app.include_router(ekf_router)
-    logger.info("✅ FASE 2A: EKF Integration & Diagnostics endpoints registered")
-except ImportError as e:
-    logger.warning(f"⚠️ FASE 2A (EKF) not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ FASE 2A initialization error: {e}")
+# 🆕 v5.12.20: Lazy - the EKF manager is initialized when the router loads
+lazy_routers.add(
+    "ekf_diagnostics_endpoints",
+    path_prefix="/fuelAnalytics/api/ekf",
+    setup="ekf_integration:initialize_ekf_manager",
+)
 
 # 🆕 FASE 2B: ML Pipeline (LSTM Predictor, Anomaly Detection, Driver Scoring)
-try:
-    from ml_engines.anomaly_detection_v2 import get_anomaly_detector
-    from driver_behavior_scoring_v2 import get_behavior_scorer
-    from lstm_fuel_predictor import get_lstm_predictor
-
-    logger.info(
-        "✅ FASE 2B: ML Pipeline (LSTM + Anomaly Detection + Driver Scoring) loaded"
-    )
-except ImportError as e:
-    logger.warning(f"⚠️ FASE 2B (ML Pipeline) not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ FASE 2B initialization error: {e}")
+# 🆕 v5.12.20: Nothing here uses these names - they are imported by the
+# background warm-up instead of at module import
+LAZY_PRELOAD_MODULES = [
+    "ml_engines.anomaly_detection_v2",
+    "driver_behavior_scoring_v2",
+    "lstm_fuel_predictor",
+    "route_optimization_engine",
+]
 
 # 🆕 FASE 2C: Event-Driven Architecture (Kafka Event Bus + Microservices)
 try:
@@ -536,15 +548,8 @@ except Exception as e:
     logger.warning(f"⚠️ FASE 2C initialization error: {e}")
 
 # 🆕 v4.1.0: NEW FEATURES - Cache, WebSocket, ML, Driver Coaching
-try:
-    from new_features_integration import router as new_features_router
-
-    app.include_router(new_features_router)
-    logger.info("✅ New Features: Cache + WebSocket + ML + Coaching registered")
-except ImportError as e:
-    logger.warning(f"⚠️ New Features not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ New Features initialization error: {e}")
+# 🆕 v5.12.20: Lazy - ml_fuel_theft_detector imports sklearn at module level
+lazy_routers.add("new_features_integration", path_prefix="/fuelAnalytics/api/v2")
 
 # 🆕 API v2 Router - Main v2 endpoints
 try:
@@ -558,14 +563,7 @@ except Exception as e:
     logger.warning(f"⚠️ API v2 initialization error: {e}")
 
 # 🆕 FASE 2C: Route Optimization Engine
-try:
-    from route_optimization_engine import get_route_optimizer
-
-    logger.info("✅ FASE 2C: Route Optimization Engine loaded")
-except ImportError as e:
-    logger.warning(f"⚠️ FASE 2C (Routes) not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ FASE 2C Routes initialization error: {e}")
+# 🆕 v5.12.20: Preloaded by the warm-up (LAZY_PRELOAD_MODULES)
 
 # Prometheus metrics instrumentation
 if PROMETHEUS_AVAILABLE:
@@ -758,6 +756,20 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         return response
 
 
+# 🆕 v5.12.23: ETag/304 and cached gzipped bodies for the polled dashboard
+# reads, keyed by sync cycle version (inside the rate limiter, outside GZip)
+from conditional_responses import ConditionalResponseMiddleware
+
+app.add_middleware(
+    ConditionalResponseMiddleware,
+    routes={
+        "/fuelAnalytics/api/fleet": ("fuel_metrics", "dtc_events"),
+        "/fuelAnalytics/api/kpis": ("fuel_metrics",),
+        "/fuelAnalytics/api/alerts": ("fuel_metrics",),
+        "/fuelAnalytics/api/v2/command-center": None,
+    },
+)
+
 # Add rate limiting middleware
 app.add_middleware(RateLimitMiddleware)
 logger.info("✅ Rate limiting middleware enabled")
@@ -796,6 +808,11 @@ app.add_middleware(
 )
 logger.info(f"✅ CORS configured with {len(ALLOWED_ORIGINS)} allowed origins")
 
+# 🆕 v5.12.19: Per-route handler latency (outermost, so it includes middleware)
+from observability import RequestMetricsMiddleware
+
+app.add_middleware(RequestMetricsMiddleware)
+
 
 import traceback
 
@@ -1129,6 +1146,16 @@ async def get_cache_stats():
         from memory_cache import get_cache_status
 
         stats = get_cache_status()
+
+        # 🆕 v5.12.2: fuel_metrics time-series store hit rate / memory
+        from fuel_metrics_timeseries import get_timeseries_store
+
+        stats["timeseries"] = get_timeseries_store().get_stats()
+
+        # 🆕 v5.12.23: 304 / cached-body rate of the conditional response layer
+        from conditional_responses import get_conditional_cache
+
+        stats["conditional"] = get_conditional_cache().get_stats()
         return {"available": True, **stats}
     except ImportError:
         pass
@@ -1294,6 +1321,15 @@ async def comprehensive_health():
         )
 
 
+# observability metrics served by the API process (others live in the sync process)
+API_OBSERVABILITY_METRICS = [
+    "api_request_seconds",
+    "api_requests_total",
+    "notification_seconds",
+    "notifications_total",
+]
+
+
 # 📊 v6.3.0: Prometheus metrics endpoint
 @app.get("/fuelAnalytics/api/metrics")
 async def metrics():
@@ -1319,6 +1355,13 @@ async def metrics():
             )
 
         metrics_data = get_prometheus_metrics()
+
+        # 🆕 v5.12.19: Labeled API/notification histograms from observability
+        from observability import get_metrics
+
+        metrics_data += (
+            get_metrics().get_prometheus_format(names=API_OBSERVABILITY_METRICS).encode()
+        )
         return Response(content=metrics_data, media_type=CONTENT_TYPE_LATEST)
     except ImportError:
         return Response(
@@ -1343,6 +1386,73 @@ class BatchRequest(BaseModel):
     endpoints: List[str] = Field(default=[], max_length=10)
     truck_ids: Optional[List[str]] = None  # Optional truck IDs for truck-specific data
     days: Optional[int] = Field(default=7, ge=1, le=90)  # Limit days range
+    # 🆕 v5.12.22: Per-section timeout (default BATCH_SECTION_TIMEOUT)
+    section_timeout: Optional[float] = Field(default=None, gt=0, le=60)
+
+
+def _build_batch_graph(days: int, section_timeout: Optional[float] = None):
+    """
+    🆕 v5.12.22: Per-request dependency graph for the batch endpoints.
+
+    fleet, alerts and refuels share one latest-state read (only made when
+    one of them misses its cache); every section keeps the cache entry the
+    standalone endpoint uses.
+    """
+    from batch_graph import BatchGraph
+
+    graph = BatchGraph(section_timeout)
+
+    def cached(key: str, ttl: int, fetch):
+        async def section(batch):
+            if MEMORY_CACHE_AVAILABLE and memory_cache:
+                hit = memory_cache.get(key)
+                if hit:
+                    return hit
+            value = await fetch(batch)
+            if MEMORY_CACHE_AVAILABLE and memory_cache:
+                memory_cache.set(key, value, ttl=ttl)
+            return value
+
+        return section
+
+    async def latest_states(batch):
+        return await async_db.get_latest_states()
+
+    async def fleet(batch):
+        summary = await async_db.get_fleet_summary(
+            latest=await batch.get("latest_states")
+        )
+        summary["data_source"] = "MySQL" if db.mysql_available else "CSV"
+        return summary
+
+    async def alerts(batch):
+        return await async_db.get_active_alerts(latest=await batch.get("latest_states"))
+
+    async def refuels(batch):
+        return await async_db.get_all_refuels(
+            days, latest=await batch.get("latest_states")
+        )
+
+    async def kpis(batch):
+        return await async_db.get_fleet_kpis()
+
+    async def efficiency(batch):
+        return await async_db.get_efficiency_rankings()
+
+    async def maintenance(batch):
+        # Get maintenance/engine health alerts
+        from engine_health_engine import get_fleet_health_alerts
+
+        return get_fleet_health_alerts() if "get_fleet_health_alerts" in dir() else []
+
+    graph.shared("latest_states", latest_states)
+    graph.section("fleet", cached("fleet_summary", 30, fleet))
+    graph.section("alerts", cached("active_alerts", 60, alerts))
+    graph.section("refuels", refuels)
+    graph.section("kpis", cached("kpis_data", 60, kpis))
+    graph.section("efficiency", efficiency)
+    graph.section("maintenance", maintenance)
+    return graph
 
 
 @app.post("/fuelAnalytics/api/batch", tags=["Batch"])
@@ -1353,6 +1463,11 @@ async def batch_fetch(request: BatchRequest):
     Reduces HTTP round-trips for dashboard initial load.
     Instead of 5-10 separate API calls, frontend makes ONE batch call.
 
+    🆕 v5.12.22: Sections run concurrently over a per-request dependency
+    graph (batch_graph): fleet, alerts and refuels share one latest-state
+    read, each section has its own timeout (`section_timeout`), and
+    `timings_ms` reports per-section and shared-read timings.
+
     Available endpoints:
     - "fleet": Fleet summary with all trucks
     - "alerts": Active alerts
@@ -1371,127 +1486,15 @@ async def batch_fetch(request: BatchRequest):
 
     Returns combined response with all requested data.
     """
-    import asyncio
-    from concurrent.futures import ThreadPoolExecutor
-
-    results = {}
-    errors = {}
-
-    async def fetch_fleet():
-        try:
-            cache_key = "fleet_summary"
-            if MEMORY_CACHE_AVAILABLE and memory_cache:
-                cached = memory_cache.get(cache_key)
-                if cached:
-                    return cached
-            summary = await async_db.get_fleet_summary()
-            summary["data_source"] = "MySQL" if db.mysql_available else "CSV"
-            if MEMORY_CACHE_AVAILABLE and memory_cache:
-                memory_cache.set(cache_key, summary, ttl=30)
-            return summary
-        except Exception as e:
-            raise Exception(f"Fleet fetch error: {e}")
-
-    async def fetch_alerts():
-        try:
-            cache_key = "active_alerts"
-            if MEMORY_CACHE_AVAILABLE and memory_cache:
-                cached = memory_cache.get(cache_key)
-                if cached:
-                    return cached
-            alerts = await async_db.get_active_alerts()
-            if MEMORY_CACHE_AVAILABLE and memory_cache:
-                memory_cache.set(cache_key, alerts, ttl=60)
-            return alerts
-        except Exception as e:
-            raise Exception(f"Alerts fetch error: {e}")
-
-    async def fetch_refuels():
-        try:
-            days = request.days or 7
-            return await async_db.get_all_refuels(days)
-        except Exception as e:
-            raise Exception(f"Refuels fetch error: {e}")
-
-    async def fetch_kpis():
-        try:
-            cache_key = "kpis_data"
-            if MEMORY_CACHE_AVAILABLE and memory_cache:
-                cached = memory_cache.get(cache_key)
-                if cached:
-                    return cached
-            # Get KPI data
-            kpis = (
-                await async_db.get_fleet_kpis()
-                if hasattr(async_db, "get_fleet_kpis")
-                else {}
-            )
-            if MEMORY_CACHE_AVAILABLE and memory_cache:
-                memory_cache.set(cache_key, kpis, ttl=60)
-            return kpis
-        except Exception as e:
-            raise Exception(f"KPIs fetch error: {e}")
-
-    async def fetch_efficiency():
-        try:
-            # Use the existing efficiency rankings logic
-            rankings = (
-                await async_db.get_efficiency_rankings()
-                if hasattr(async_db, "get_efficiency_rankings")
-                else []
-            )
-            return rankings
-        except Exception as e:
-            raise Exception(f"Efficiency fetch error: {e}")
-
-    async def fetch_maintenance():
-        try:
-            # Get maintenance/engine health alerts
-            from engine_health_engine import get_fleet_health_alerts
-
-            alerts = (
-                get_fleet_health_alerts() if "get_fleet_health_alerts" in dir() else []
-            )
-            return alerts
-        except Exception as e:
-            raise Exception(f"Maintenance fetch error: {e}")
-
-    # Map endpoint names to fetch functions
-    endpoint_map = {
-        "fleet": fetch_fleet,
-        "alerts": fetch_alerts,
-        "refuels": fetch_refuels,
-        "kpis": fetch_kpis,
-        "efficiency": fetch_efficiency,
-        "maintenance": fetch_maintenance,
-    }
-
-    # Fetch all requested endpoints in parallel
-    tasks = []
-    endpoint_names = []
-
-    for endpoint in request.endpoints:
-        if endpoint in endpoint_map:
-            tasks.append(endpoint_map[endpoint]())
-            endpoint_names.append(endpoint)
-        else:
-            errors[endpoint] = f"Unknown endpoint: {endpoint}"
-
-    if tasks:
-        # Execute all fetches concurrently
-        fetch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for name, result in zip(endpoint_names, fetch_results):
-            if isinstance(result, Exception):
-                errors[name] = str(result)
-            else:
-                results[name] = result
+    graph = _build_batch_graph(request.days or 7, request.section_timeout)
+    batch = await graph.run(request.endpoints)
 
     return {
         "success": True,
-        "data": results,
-        "errors": errors if errors else None,
-        "fetched_endpoints": list(results.keys()),
+        "data": batch.data,
+        "errors": batch.errors if batch.errors else None,
+        "fetched_endpoints": list(batch.data.keys()),
+        "timings_ms": batch.timings,
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
 
@@ -1507,67 +1510,36 @@ async def batch_dashboard():
     - Recent refuels (7 days)
 
     This replaces 3 separate API calls with 1, reducing latency by ~60%.
+
+    🆕 v5.12.22: Same dependency graph as /batch - one shared latest-state
+    read, per-section timeouts and `timings_ms`.
     """
     try:
-        import asyncio
-
-        # Fetch all in parallel
-        fleet_task = asyncio.create_task(_fetch_fleet_for_batch())
-        alerts_task = asyncio.create_task(_fetch_alerts_for_batch())
-        refuels_task = asyncio.create_task(_fetch_refuels_for_batch(7))
-
-        fleet, alerts, refuels = await asyncio.gather(
-            fleet_task, alerts_task, refuels_task, return_exceptions=True
-        )
+        batch = await _build_batch_graph(7).run(["fleet", "alerts", "refuels"])
 
         return {
             "success": True,
-            "fleet": fleet if not isinstance(fleet, Exception) else None,
-            "alerts": alerts if not isinstance(alerts, Exception) else [],
-            "refuels": refuels if not isinstance(refuels, Exception) else [],
+            "fleet": batch.data.get("fleet"),
+            "alerts": batch.data.get("alerts", []),
+            "refuels": batch.data.get("refuels", []),
+            "errors": batch.errors if batch.errors else None,
+            "timings_ms": batch.timings,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch dashboard error: {e}")
 
 
-async def _fetch_fleet_for_batch():
-    """Helper for batch fleet fetch"""
-    cache_key = "fleet_summary"
-    if MEMORY_CACHE_AVAILABLE and memory_cache:
-        cached = memory_cache.get(cache_key)
-        if cached:
-            return cached
-    summary = await async_db.get_fleet_summary()
-    summary["data_source"] = "MySQL" if db.mysql_available else "CSV"
-    if MEMORY_CACHE_AVAILABLE and memory_cache:
-        memory_cache.set(cache_key, summary, ttl=30)
-    return summary
-
-
-async def _fetch_alerts_for_batch():
-    """Helper for batch alerts fetch"""
-    cache_key = "active_alerts"
-    if MEMORY_CACHE_AVAILABLE and memory_cache:
-        cached = memory_cache.get(cache_key)
-        if cached:
-            return cached
-    alerts = await async_db.get_active_alerts()
-    if MEMORY_CACHE_AVAILABLE and memory_cache:
-        memory_cache.set(cache_key, alerts, ttl=60)
-    return alerts
-
-
-async def _fetch_refuels_for_batch(days: int):
-    """Helper for batch refuels fetch"""
-    return await async_db.get_all_refuels(days)
-
-
 # ============================================================================
 # FLEET ENDPOINTS
 # ============================================================================
 
 
+def _encode_fleet_summary(summary: Dict[str, Any]) -> bytes:
+    """Validate against FleetSummary (same filtering as response_model) and encode"""
+    return fast_json_dumps(FleetSummary.model_validate(summary).model_dump())
+
+
 @app.get("/fuelAnalytics/api/fleet", response_model=FleetSummary, tags=["Fleet"])
 async def get_fleet_summary():
     """
@@ -1579,16 +1551,19 @@ async def get_fleet_summary():
     - Brief status for each truck
 
     Data is refreshed every 30 seconds from Kalman-filtered estimates.
+
+    🆕 v5.12.4: The summary is validated against FleetSummary once per cache
+    entry and its encoded JSON bytes are served on every cache hit.
     """
     try:
         cache_key = "fleet_summary"
 
         # Try memory cache first (fast, always available)
         if MEMORY_CACHE_AVAILABLE and memory_cache:
-            cached_data = memory_cache.get(cache_key)
-            if cached_data:
+            cached_response = cached_json_response(cache_key, _encode_fleet_summary)
+            if cached_response is not None:
                 logger.debug("⚡ Fleet summary from memory cache")
-                return cached_data
+                return cached_response
 
         # Use async wrapper for non-blocking database access
         summary = await async_db.get_fleet_summary()
@@ -1598,8 +1573,10 @@ async def get_fleet_summary():
 
         # Cache for 30 seconds (matches data refresh interval)
         if MEMORY_CACHE_AVAILABLE and memory_cache:
-            memory_cache.set(cache_key, summary, ttl=30)
+            encoded = _encode_fleet_summary(summary)
+            memory_cache.set(cache_key, summary, ttl=30, encoded=encoded)
             logger.debug("💾 Fleet summary cached for 30s")
+            return FastJSONResponse(encoded)
 
         # 🔍 DEBUG Dec 23: Check what's in truck_details
         if summary and "truck_details" in summary and summary["truck_details"]:
@@ -1938,6 +1915,9 @@ async def get_truck_history(
     hours: int = Query(
         24, ge=1, le=168, description="Hours of history to fetch (1-168)"
     ),
+    max_points: Optional[int] = Query(
+        None, ge=10, le=5000, description="Downsample to at most N points (LTTB)"
+    ),
 ):
     """
     Get historical data for a truck
@@ -1945,8 +1925,10 @@ async def get_truck_history(
     Args:
         truck_id: Truck identifier
         hours: Number of hours of history (default 24, max 168)
+        max_points: Optional point budget for charts
 
     🔧 FIX v6.2.2: Never throw 500, always return empty list on error
+    🆕 v5.12.3: max_points reduces week-long views with LTTB
 
     Returns:
         List of historical data points
@@ -1971,12 +1953,22 @@ async def get_truck_history(
                     "timestamp": rec.get("timestamp"),
                     "mpg": mpg_valid,
                     "idle_gph": sanitize_nan(rec.get("idle_consumption_gph")),
-                    "fuel_percent": sanitize_nan(rec.get("fuel_percent")),
+                    "fuel_percent": sanitize_nan(rec.get("estimated_pct")),
                     "speed_mph": sanitize_nan(rec.get("speed_mph")),
                     "status": rec.get("status"),
                 }
             )
 
+        if max_points:
+            from downsampling import downsample_records
+
+            history = downsample_records(
+                history,
+                max_points,
+                x_key="timestamp",
+                y_keys=("fuel_percent", "mpg", "speed_mph"),
+            )
+
         return history
     except HTTPException:
         raise
@@ -2008,9 +2000,12 @@ async def get_truck_history_v2(
     hours: int = Query(
         24, ge=1, le=168, description="Hours of history to fetch (1-168)"
     ),
+    max_points: Optional[int] = Query(
+        None, ge=10, le=5000, description="Downsample to at most N points (LTTB)"
+    ),
 ):
     """V2 API alias for get_truck_history"""
-    return await get_truck_history(truck_id, hours)
+    return await get_truck_history(truck_id, hours, max_points)
 
 
 @app.get("/fuelAnalytics/api/v2/trucks/{truck_id}/refuels", tags=["Trucks v2"])
@@ -2670,9 +2665,8 @@ async def get_kpis(
                 return cached_data
 
         # 3. Compute from database
-        from database_mysql import get_kpi_summary
-
-        kpi_data = get_kpi_summary(days_back=days)
+        # 🆕 v5.12.21: aiomysql path - no longer blocks the event loop
+        kpi_data = await async_db.get_fleet_kpis(days)
 
         # Cache the result (shorter TTL for daily, longer for weekly/monthly)
         cache_ttl = 60 if days == 1 else 300  # 1 min for daily, 5 min for longer
@@ -3341,10 +3335,12 @@ async def get_truck_sensor_history(
     truck_id: str,
     hours: int = Query(default=48, ge=1, le=168),
     sensor_type: str = Query(default="fuel_lvl"),
+    max_points: Optional[int] = Query(default=None, ge=10, le=5000),
 ):
     """
     Get raw sensor history from MySQL for specific truck
     NEW FEATURE: Access historical sensor readings
+    🆕 v5.12.3: max_points downsamples with LTTB
     """
     try:
         df = get_raw_sensor_history(truck_id, hours_back=hours, sensor_type=sensor_type)
@@ -3358,11 +3354,15 @@ async def get_truck_sensor_history(
                 "count": 0,
             }
 
+        from downsampling import downsample_records
+
         return {
             "truck_id": truck_id,
             "sensor_type": sensor_type,
             "hours": hours,
-            "data": df.to_dict("records"),
+            "data": downsample_records(
+                df.to_dict("records"), max_points, "timestamp_utc", ("value",)
+            ),
             "count": len(df),
         }
 
@@ -3374,13 +3374,17 @@ async def get_truck_sensor_history(
 async def get_truck_fuel_trend(
     truck_id: str,
     hours: int = Query(default=48, ge=1, le=168),
+    max_points: Optional[int] = Query(default=None, ge=10, le=5000),
 ):
     """
     Get fuel consumption trend analysis
     NEW FEATURE: Shows fuel level changes and consumption rate
+    🆕 v5.12.3: max_points returns a downsampled timeline + min/max/avg bands
     """
     try:
-        trend = get_fuel_consumption_trend(truck_id, hours_back=hours)
+        trend = get_fuel_consumption_trend(
+            truck_id, hours_back=hours, max_points=max_points
+        )
         return trend
 
     except Exception as e:
@@ -3508,35 +3512,26 @@ async def get_fleet_health_summary():
 
         # 🔧 v2.0: Fallback to fuel_metrics data
         # Calculate health from existing fuel_metrics data
-        from sqlalchemy import text
-
         from database_mysql import get_sqlalchemy_engine
+        from src.repositories.latest_state_repository import get_latest_states
 
         engine = get_sqlalchemy_engine()
         with engine.connect() as conn:
-            result = conn.execute(
-                text(
-                    """
-                SELECT 
-                    t1.truck_id,
-                    t1.truck_status,
-                    t1.estimated_pct,
-                    t1.sensor_pct,
-                    t1.drift_pct,
-                    t1.coolant_temp_f,
-                    t1.speed_mph,
-                    t1.rpm,
-                    t1.timestamp_utc
-                FROM fuel_metrics t1
-                INNER JOIN (
-                    SELECT truck_id, MAX(timestamp_utc) as max_time
-                    FROM fuel_metrics
-                    WHERE timestamp_utc > NOW() - INTERVAL 24 HOUR
-                    GROUP BY truck_id
-                ) t2 ON t1.truck_id = t2.truck_id AND t1.timestamp_utc = t2.max_time
-                ORDER BY t1.truck_id
-            """
-                )
+            # 🆕 v5.12.15: Latest row per truck from fuel_metrics_latest
+            result = get_latest_states(
+                conn,
+                columns=[
+                    "truck_id",
+                    "truck_status",
+                    "estimated_pct",
+                    "sensor_pct",
+                    "drift_pct",
+                    "coolant_temp_f",
+                    "speed_mph",
+                    "rpm",
+                    "timestamp_utc",
+                ],
+                max_age_hours=24,
             )
 
             trucks_list = []
@@ -3546,15 +3541,15 @@ async def get_fleet_health_summary():
             critical = 0
 
             for row in result:
-                truck_id = row[0]
-                status = row[1]
-                estimated_pct = row[2]
-                sensor_pct = row[3]
-                drift_pct = row[4]
-                coolant_temp = row[5]
-                speed = row[6]
-                rpm = row[7]
-                timestamp = row[8]
+                truck_id = row["truck_id"]
+                status = row["truck_status"]
+                estimated_pct = row["estimated_pct"]
+                sensor_pct = row["sensor_pct"]
+                drift_pct = row["drift_pct"]
+                coolant_temp = row["coolant_temp_f"]
+                speed = row["speed_mph"]
+                rpm = row["rpm"]
+                timestamp = row["timestamp_utc"]
 
                 # Calculate health score based on available data
                 health_score = 100.0
@@ -3947,53 +3942,46 @@ async def get_predictive_alerts(
     before they become critical problems.
     """
     try:
-        from sqlalchemy import text
-
         from database_mysql import get_sqlalchemy_engine
+        from src.repositories.latest_state_repository import get_latest_states
 
-        # Get current truck data from fuel_metrics
+        # 🆕 v5.12.15: Current truck data from fuel_metrics_latest
         engine = get_sqlalchemy_engine()
-        query = text(
-            """
-            SELECT 
-                fm.truck_id,
-                fm.truck_status as status,
-                fm.sensor_pct as fuel_pct,
-                fm.estimated_pct,
-                fm.mpg_current as mpg,
-                fm.consumption_gph,
-                fm.drift_pct,
-                fm.drift_warning,
-                fm.timestamp_utc
-            FROM fuel_metrics fm
-            INNER JOIN (
-                SELECT truck_id, MAX(timestamp_utc) as max_ts
-                FROM fuel_metrics
-                WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL 2 HOUR)
-                GROUP BY truck_id
-            ) latest ON fm.truck_id = latest.truck_id AND fm.timestamp_utc = latest.max_ts
-        """
+        rows = get_latest_states(
+            engine,
+            columns=[
+                "truck_id",
+                "truck_status",
+                "sensor_pct",
+                "estimated_pct",
+                "mpg_current",
+                "consumption_gph",
+                "drift_pct",
+                "drift_warning",
+                "timestamp_utc",
+            ],
+            max_age_hours=2,
         )
 
-        with engine.connect() as conn:
-            result = conn.execute(query)
-            rows = result.fetchall()
-
         truck_data = []
         for row in rows:
             truck_data.append(
                 {
-                    "truck_id": row[0],
-                    "truck_status": row[1],
-                    "status": row[1],
-                    "fuel_pct": row[2],
-                    "estimated_pct": row[3],
-                    "mpg": row[4],
-                    "mpg_current": row[4],
-                    "consumption_gph": row[5],
-                    "drift_pct": row[6],
-                    "drift_warning": row[7],
-                    "timestamp": row[8].isoformat() if row[8] else None,
+                    "truck_id": row["truck_id"],
+                    "truck_status": row["truck_status"],
+                    "status": row["truck_status"],
+                    "fuel_pct": row["sensor_pct"],
+                    "estimated_pct": row["estimated_pct"],
+                    "mpg": row["mpg_current"],
+                    "mpg_current": row["mpg_current"],
+                    "consumption_gph": row["consumption_gph"],
+                    "drift_pct": row["drift_pct"],
+                    "drift_warning": row["drift_warning"],
+                    "timestamp": (
+                        row["timestamp_utc"].isoformat()
+                        if row["timestamp_utc"]
+                        else None
+                    ),
                 }
             )
 
@@ -4692,7 +4680,7 @@ async def get_command_center():
         # Get command center data
         data = orchestrator.get_command_center_data()
 
-        return JSONResponse(content=data)
+        return FastJSONResponse(content=data)
 
     except Exception as e:
         logger.error(f"❌ Error in /api/v2/command-center: {e}", exc_info=True)
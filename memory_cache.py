@@ -3,7 +3,7 @@ Memory Cache - Simple in-memory caching for Fuel Copilot
 Zero dependencies, instant performance boost for heavy endpoints
 
 Author: Fuel Copilot Team
-Version: v1.0.0
+Version: v1.1.0
 Date: December 2025
 
 Usage:
@@ -40,6 +40,7 @@ class CacheEntry:
     expires_at: float
     created_at: float = field(default_factory=time.time)
     hits: int = 0
+    encoded: Optional[bytes] = None  # 🆕 v1.1.0: serialized JSON of value
 
 
 class MemoryCache:
@@ -63,6 +64,7 @@ class MemoryCache:
             "misses": 0,
             "sets": 0,
             "evictions": 0,
+            "encoded_hits": 0,
         }
 
         # Start background cleanup thread
@@ -96,9 +98,14 @@ class MemoryCache:
             self._stats["hits"] += 1
             return entry.value
 
-    def set(self, key: str, value: Any, ttl: int = 30) -> None:
+    def set(
+        self, key: str, value: Any, ttl: int = 30, encoded: Optional[bytes] = None
+    ) -> None:
         """
         Set value in cache with TTL (time-to-live in seconds).
+
+        `encoded` optionally stores the already-serialized JSON of `value`
+        so responses can be served without encoding again.
         """
         with self._lock:
             # Evict if at max capacity
@@ -109,9 +116,43 @@ class MemoryCache:
                 value=value,
                 expires_at=time.time() + ttl,
                 created_at=time.time(),
+                encoded=encoded,
             )
             self._stats["sets"] += 1
 
+    def get_encoded(
+        self, key: str, encoder: Callable[[Any], bytes]
+    ) -> Optional[bytes]:
+        """
+        🆕 v1.1.0: Get the serialized form of a cached value.
+
+        Encodes with `encoder` on first access and keeps the bytes with the
+        entry until it is replaced or expires. Use one encoder per key.
+        Returns None if key doesn't exist or is expired.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+
+            if entry is None or time.time() > entry.expires_at:
+                if entry is not None:
+                    del self._cache[key]
+                self._stats["misses"] += 1
+                return None
+
+            entry.hits += 1
+            self._stats["hits"] += 1
+            if entry.encoded is not None:
+                self._stats["encoded_hits"] += 1
+                return entry.encoded
+            value = entry.value
+
+        # Encode outside the lock; a concurrent set() wins over this result
+        encoded = encoder(value)
+        with self._lock:
+            if self._cache.get(key) is entry:
+                entry.encoded = encoded
+        return encoded
+
     def delete(self, key: str) -> bool:
         """Delete a key from cache. Returns True if key existed."""
         with self._lock:
@@ -160,6 +201,7 @@ class MemoryCache:
                 "hit_rate_pct": round(hit_rate, 2),
                 "sets": self._stats["sets"],
                 "evictions": self._stats["evictions"],
+                "encoded_hits": self._stats["encoded_hits"],
             }
 
     def _evict_oldest(self) -> None:
@@ -202,6 +244,21 @@ class MemoryCache:
 cache = MemoryCache(max_size=500)
 
 
+def make_cache_key(func_name: str, args: tuple = (), kwargs: Optional[Dict] = None) -> str:
+    """
+    Cache key used by @cached: "<name>:<args>:<k=v sorted by k>".
+
+    Code that reads or fills a @cached entry without calling the function
+    (e.g. an async path sharing the entry) should build the key here, or use
+    the decorated function's `cache_key(*args, **kwargs)`.
+    """
+    args_key = ":".join(str(a) for a in args) if args else ""
+    kwargs_key = (
+        ":".join(f"{k}={v}" for k, v in sorted(kwargs.items())) if kwargs else ""
+    )
+    return f"{func_name}:{args_key}:{kwargs_key}".rstrip(":")
+
+
 def cached(ttl_seconds: int = 30, key_prefix: str = ""):
     """
     Decorator for caching function results.
@@ -218,18 +275,12 @@ def cached(ttl_seconds: int = 30, key_prefix: str = ""):
     """
 
     def decorator(func: Callable) -> Callable:
+        func_name = key_prefix or func.__name__
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Build cache key from function name and arguments
-            func_name = key_prefix or func.__name__
-            args_key = ":".join(str(a) for a in args) if args else ""
-            kwargs_key = (
-                ":".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
-                if kwargs
-                else ""
-            )
-
-            cache_key = f"{func_name}:{args_key}:{kwargs_key}".rstrip(":")
+            cache_key = make_cache_key(func_name, args, kwargs)
 
             # Try cache first
             result = cache.get(cache_key)
@@ -247,9 +298,12 @@ def cached(ttl_seconds: int = 30, key_prefix: str = ""):
             return result
 
         # Add method to invalidate this function's cache
-        wrapper.invalidate = lambda: cache.invalidate_pattern(
-            key_prefix or func.__name__
+        wrapper.invalidate = lambda: cache.invalidate_pattern(func_name)
+        # Key a given call would use (for readers sharing the entry)
+        wrapper.cache_key = lambda *args, **kwargs: make_cache_key(
+            func_name, args, kwargs
         )
+        wrapper.ttl_seconds = ttl_seconds
 
         return wrapper
 
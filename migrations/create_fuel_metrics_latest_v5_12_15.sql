@@ -0,0 +1,154 @@
+-- ============================================
+-- v5.12.15: fuel_metrics_latest (one row per truck)
+-- ============================================
+-- Maintained by the sync cycle in the same transaction as its
+-- fuel_metrics insert. Read through
+-- src/repositories/latest_state_repository.get_latest_states().
+-- The sync process also creates/seeds this table on startup.
+
+USE fuel_copilot;
+
+CREATE TABLE IF NOT EXISTS fuel_metrics_latest (
+    timestamp_utc DATETIME NOT NULL,
+    truck_id VARCHAR(20) NOT NULL,
+    carrier_id VARCHAR(50),
+    truck_status VARCHAR(20),
+    latitude FLOAT,
+    longitude FLOAT,
+    speed_mph FLOAT,
+    estimated_liters FLOAT,
+    estimated_gallons FLOAT,
+    estimated_pct FLOAT,
+    sensor_pct FLOAT,
+    sensor_liters FLOAT,
+    sensor_gallons FLOAT,
+    consumption_lph FLOAT,
+    consumption_gph FLOAT,
+    mpg_current FLOAT,
+    cost_per_mile FLOAT,
+    rpm INT,
+    engine_hours FLOAT,
+    odometer_mi FLOAT,
+    odom_delta_mi FLOAT,
+    altitude_ft FLOAT,
+    hdop FLOAT,
+    coolant_temp_f FLOAT,
+    gear INT,
+    engine_brake_active INT,
+    obd_speed_mph FLOAT,
+    oil_level_pct FLOAT,
+    barometric_pressure_inhg FLOAT,
+    pto_hours FLOAT,
+    accel_rate_mpss FLOAT,
+    harsh_accel INT,
+    harsh_brake INT,
+    idle_gph FLOAT,
+    idle_method VARCHAR(50),
+    idle_mode VARCHAR(50),
+    drift_pct FLOAT,
+    drift_warning VARCHAR(10),
+    anchor_detected VARCHAR(10),
+    anchor_type VARCHAR(20),
+    data_age_min FLOAT,
+    oil_pressure_psi FLOAT,
+    oil_temp_f FLOAT,
+    battery_voltage FLOAT,
+    engine_load_pct FLOAT,
+    def_level_pct FLOAT,
+    ambient_temp_f FLOAT,
+    intake_air_temp_f FLOAT,
+    trans_temp_f FLOAT,
+    fuel_temp_f FLOAT,
+    intercooler_temp_f FLOAT,
+    intake_press_kpa FLOAT,
+    retarder_level INT,
+    sats INT,
+    pwr_int FLOAT,
+    terrain_factor FLOAT,
+    gps_quality VARCHAR(100),
+    idle_hours_ecu FLOAT,
+    dtc INT,
+    dtc_code VARCHAR(255),
+    mpg_expected FLOAT,
+    mpg_deviation_pct FLOAT,
+    mpg_status VARCHAR(20),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (truck_id),
+    INDEX idx_timestamp (timestamp_utc)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Seed from the last 7 days of fuel_metrics
+INSERT INTO fuel_metrics_latest (timestamp_utc, truck_id, carrier_id, truck_status, latitude, longitude, speed_mph, estimated_liters, estimated_gallons, estimated_pct, sensor_pct, sensor_liters, sensor_gallons, consumption_lph, consumption_gph, mpg_current, cost_per_mile, rpm, engine_hours, odometer_mi, odom_delta_mi, altitude_ft, hdop, coolant_temp_f, gear, engine_brake_active, obd_speed_mph, oil_level_pct, barometric_pressure_inhg, pto_hours, accel_rate_mpss, harsh_accel, harsh_brake, idle_gph, idle_method, idle_mode, drift_pct, drift_warning, anchor_detected, anchor_type, data_age_min, oil_pressure_psi, oil_temp_f, battery_voltage, engine_load_pct, def_level_pct, ambient_temp_f, intake_air_temp_f, trans_temp_f, fuel_temp_f, intercooler_temp_f, intake_press_kpa, retarder_level, sats, pwr_int, terrain_factor, gps_quality, idle_hours_ecu, dtc, dtc_code, mpg_expected, mpg_deviation_pct, mpg_status)
+SELECT fm.timestamp_utc, fm.truck_id, fm.carrier_id, fm.truck_status, fm.latitude, fm.longitude, fm.speed_mph, fm.estimated_liters, fm.estimated_gallons, fm.estimated_pct, fm.sensor_pct, fm.sensor_liters, fm.sensor_gallons, fm.consumption_lph, fm.consumption_gph, fm.mpg_current, fm.cost_per_mile, fm.rpm, fm.engine_hours, fm.odometer_mi, fm.odom_delta_mi, fm.altitude_ft, fm.hdop, fm.coolant_temp_f, fm.gear, fm.engine_brake_active, fm.obd_speed_mph, fm.oil_level_pct, fm.barometric_pressure_inhg, fm.pto_hours, fm.accel_rate_mpss, fm.harsh_accel, fm.harsh_brake, fm.idle_gph, fm.idle_method, fm.idle_mode, fm.drift_pct, fm.drift_warning, fm.anchor_detected, fm.anchor_type, fm.data_age_min, fm.oil_pressure_psi, fm.oil_temp_f, fm.battery_voltage, fm.engine_load_pct, fm.def_level_pct, fm.ambient_temp_f, fm.intake_air_temp_f, fm.trans_temp_f, fm.fuel_temp_f, fm.intercooler_temp_f, fm.intake_press_kpa, fm.retarder_level, fm.sats, fm.pwr_int, fm.terrain_factor, fm.gps_quality, fm.idle_hours_ecu, fm.dtc, fm.dtc_code, fm.mpg_expected, fm.mpg_deviation_pct, fm.mpg_status
+FROM fuel_metrics fm
+INNER JOIN (
+    SELECT truck_id, MAX(timestamp_utc) AS max_time
+    FROM fuel_metrics
+    WHERE timestamp_utc > NOW() - INTERVAL 7 DAY
+    GROUP BY truck_id
+) latest ON fm.truck_id = latest.truck_id AND fm.timestamp_utc = latest.max_time
+ON DUPLICATE KEY UPDATE
+    fuel_metrics_latest.carrier_id = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(carrier_id), fuel_metrics_latest.carrier_id),
+    fuel_metrics_latest.truck_status = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(truck_status), fuel_metrics_latest.truck_status),
+    fuel_metrics_latest.latitude = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(latitude), fuel_metrics_latest.latitude),
+    fuel_metrics_latest.longitude = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(longitude), fuel_metrics_latest.longitude),
+    fuel_metrics_latest.speed_mph = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(speed_mph), fuel_metrics_latest.speed_mph),
+    fuel_metrics_latest.estimated_liters = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(estimated_liters), fuel_metrics_latest.estimated_liters),
+    fuel_metrics_latest.estimated_gallons = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(estimated_gallons), fuel_metrics_latest.estimated_gallons),
+    fuel_metrics_latest.estimated_pct = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(estimated_pct), fuel_metrics_latest.estimated_pct),
+    fuel_metrics_latest.sensor_pct = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(sensor_pct), fuel_metrics_latest.sensor_pct),
+    fuel_metrics_latest.sensor_liters = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(sensor_liters), fuel_metrics_latest.sensor_liters),
+    fuel_metrics_latest.sensor_gallons = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(sensor_gallons), fuel_metrics_latest.sensor_gallons),
+    fuel_metrics_latest.consumption_lph = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(consumption_lph), fuel_metrics_latest.consumption_lph),
+    fuel_metrics_latest.consumption_gph = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(consumption_gph), fuel_metrics_latest.consumption_gph),
+    fuel_metrics_latest.mpg_current = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(mpg_current), fuel_metrics_latest.mpg_current),
+    fuel_metrics_latest.cost_per_mile = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(cost_per_mile), fuel_metrics_latest.cost_per_mile),
+    fuel_metrics_latest.rpm = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(rpm), fuel_metrics_latest.rpm),
+    fuel_metrics_latest.engine_hours = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(engine_hours), fuel_metrics_latest.engine_hours),
+    fuel_metrics_latest.odometer_mi = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(odometer_mi), fuel_metrics_latest.odometer_mi),
+    fuel_metrics_latest.odom_delta_mi = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(odom_delta_mi), fuel_metrics_latest.odom_delta_mi),
+    fuel_metrics_latest.altitude_ft = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(altitude_ft), fuel_metrics_latest.altitude_ft),
+    fuel_metrics_latest.hdop = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(hdop), fuel_metrics_latest.hdop),
+    fuel_metrics_latest.coolant_temp_f = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(coolant_temp_f), fuel_metrics_latest.coolant_temp_f),
+    fuel_metrics_latest.gear = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(gear), fuel_metrics_latest.gear),
+    fuel_metrics_latest.engine_brake_active = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(engine_brake_active), fuel_metrics_latest.engine_brake_active),
+    fuel_metrics_latest.obd_speed_mph = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(obd_speed_mph), fuel_metrics_latest.obd_speed_mph),
+    fuel_metrics_latest.oil_level_pct = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(oil_level_pct), fuel_metrics_latest.oil_level_pct),
+    fuel_metrics_latest.barometric_pressure_inhg = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(barometric_pressure_inhg), fuel_metrics_latest.barometric_pressure_inhg),
+    fuel_metrics_latest.pto_hours = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(pto_hours), fuel_metrics_latest.pto_hours),
+    fuel_metrics_latest.accel_rate_mpss = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(accel_rate_mpss), fuel_metrics_latest.accel_rate_mpss),
+    fuel_metrics_latest.harsh_accel = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(harsh_accel), fuel_metrics_latest.harsh_accel),
+    fuel_metrics_latest.harsh_brake = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(harsh_brake), fuel_metrics_latest.harsh_brake),
+    fuel_metrics_latest.idle_gph = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(idle_gph), fuel_metrics_latest.idle_gph),
+    fuel_metrics_latest.idle_method = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(idle_method), fuel_metrics_latest.idle_method),
+    fuel_metrics_latest.idle_mode = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(idle_mode), fuel_metrics_latest.idle_mode),
+    fuel_metrics_latest.drift_pct = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(drift_pct), fuel_metrics_latest.drift_pct),
+    fuel_metrics_latest.drift_warning = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(drift_warning), fuel_metrics_latest.drift_warning),
+    fuel_metrics_latest.anchor_detected = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(anchor_detected), fuel_metrics_latest.anchor_detected),
+    fuel_metrics_latest.anchor_type = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(anchor_type), fuel_metrics_latest.anchor_type),
+    fuel_metrics_latest.data_age_min = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(data_age_min), fuel_metrics_latest.data_age_min),
+    fuel_metrics_latest.oil_pressure_psi = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(oil_pressure_psi), fuel_metrics_latest.oil_pressure_psi),
+    fuel_metrics_latest.oil_temp_f = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(oil_temp_f), fuel_metrics_latest.oil_temp_f),
+    fuel_metrics_latest.battery_voltage = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(battery_voltage), fuel_metrics_latest.battery_voltage),
+    fuel_metrics_latest.engine_load_pct = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(engine_load_pct), fuel_metrics_latest.engine_load_pct),
+    fuel_metrics_latest.def_level_pct = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(def_level_pct), fuel_metrics_latest.def_level_pct),
+    fuel_metrics_latest.ambient_temp_f = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(ambient_temp_f), fuel_metrics_latest.ambient_temp_f),
+    fuel_metrics_latest.intake_air_temp_f = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(intake_air_temp_f), fuel_metrics_latest.intake_air_temp_f),
+    fuel_metrics_latest.trans_temp_f = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(trans_temp_f), fuel_metrics_latest.trans_temp_f),
+    fuel_metrics_latest.fuel_temp_f = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(fuel_temp_f), fuel_metrics_latest.fuel_temp_f),
+    fuel_metrics_latest.intercooler_temp_f = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(intercooler_temp_f), fuel_metrics_latest.intercooler_temp_f),
+    fuel_metrics_latest.intake_press_kpa = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(intake_press_kpa), fuel_metrics_latest.intake_press_kpa),
+    fuel_metrics_latest.retarder_level = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(retarder_level), fuel_metrics_latest.retarder_level),
+    fuel_metrics_latest.sats = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(sats), fuel_metrics_latest.sats),
+    fuel_metrics_latest.pwr_int = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(pwr_int), fuel_metrics_latest.pwr_int),
+    fuel_metrics_latest.terrain_factor = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(terrain_factor), fuel_metrics_latest.terrain_factor),
+    fuel_metrics_latest.gps_quality = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(gps_quality), fuel_metrics_latest.gps_quality),
+    fuel_metrics_latest.idle_hours_ecu = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(idle_hours_ecu), fuel_metrics_latest.idle_hours_ecu),
+    fuel_metrics_latest.dtc = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(dtc), fuel_metrics_latest.dtc),
+    fuel_metrics_latest.dtc_code = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(dtc_code), fuel_metrics_latest.dtc_code),
+    fuel_metrics_latest.mpg_expected = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(mpg_expected), fuel_metrics_latest.mpg_expected),
+    fuel_metrics_latest.mpg_deviation_pct = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(mpg_deviation_pct), fuel_metrics_latest.mpg_deviation_pct),
+    fuel_metrics_latest.mpg_status = IF(VALUES(timestamp_utc) >= fuel_metrics_latest.timestamp_utc, VALUES(mpg_status), fuel_metrics_latest.mpg_status),
+    fuel_metrics_latest.timestamp_utc = GREATEST(fuel_metrics_latest.timestamp_utc, VALUES(timestamp_utc));
+
+SELECT COUNT(*) AS trucks_in_latest_state FROM fuel_metrics_latest;
@@ -49,6 +49,8 @@ class AnomalyDetector:
         self.scalers: Dict[str, StandardScaler] = {}
         self.anomaly_history: Dict[str, List[Dict]] = {}
         self.thresholds: Dict[str, Dict] = {}
+        # 🆕 v5.12.8: Entrenamiento en segundo plano (ml_engines.anomaly_training)
+        self.training_scheduler = None
 
         if SKLEARN_AVAILABLE:
             logger.info("✅ Anomaly Detector inicializado")
@@ -126,6 +128,30 @@ class AnomalyDetector:
             logger.error(f"❌ Error entrenando detector: {e}")
             return {"status": "training_failed", "error": str(e)}
 
+    def train_fleet(self, days: int = 7, feature_store=None) -> Dict[str, Dict]:
+        """
+        🆕 v5.12.6: Entrena los detectores de toda la flota con una sola
+        consulta (FleetFeatureStore.consumption_features)
+
+        Returns:
+            {truck_id: resultado de train_detector}
+        """
+        if feature_store is None:
+            from ml_engines.feature_store import get_feature_store
+
+            feature_store = get_feature_store()
+
+        features = feature_store.consumption_features(days)
+        results = {}
+        for truck_id, rows in features.groupby("truck_id", sort=True):
+            results[truck_id] = self.train_detector(
+                truck_id,
+                consumption_data=rows["consumption_gph"].tolist(),
+                speed_data=rows["speed_mph"].tolist(),
+                idle_pct_data=rows["idle_pct"].tolist(),
+            )
+        return results
+
     def detect_anomalies(
         self,
         truck_id: str,
@@ -159,10 +185,15 @@ class AnomalyDetector:
             return {"is_anomaly": False, "status": "unavailable"}
 
         if truck_id not in self.models:
+            # 🆕 v5.12.8: Nunca entrenar en la ruta de la petición
+            scheduled = self.training_scheduler is not None
+            if scheduled:
+                self.training_scheduler.request("consumption", [truck_id])
             return {
                 "is_anomaly": False,
                 "status": "model_not_found",
                 "truck_id": truck_id,
+                "training_scheduled": scheduled,
             }
 
         try:
@@ -327,34 +358,49 @@ class AnomalyDetector:
         speed: List[float],
     ):
         """Computa umbrales adaptativos por truck"""
-        consumption = np.array(consumption)
-        speed = np.array(speed)
-
-        # Filtrar observaciones en idle (speed < 5 mph)
-        idle_mask = speed < 5
-        idle_consumption = consumption[idle_mask] if any(idle_mask) else consumption
-
-        # Filtrar observaciones en highway (speed > 50 mph)
-        highway_mask = speed > 50
-        highway_consumption = (
-            consumption[highway_mask] if any(highway_mask) else consumption
-        )
-
-        self.thresholds[truck_id] = {
-            "consumption_mean_gph": float(np.mean(consumption)),
-            "consumption_max_gph": float(np.percentile(consumption, 95)),
-            "consumption_std_gph": float(np.std(consumption)),
-            "idle_max_gph": (
-                float(np.percentile(idle_consumption, 90))
-                if len(idle_consumption) > 0
-                else 0.5
-            ),
-            "highway_max_gph": (
-                float(np.percentile(highway_consumption, 95))
-                if len(highway_consumption) > 0
-                else 4.0
-            ),
-        }
+        self.thresholds[truck_id] = compute_thresholds(consumption, speed)
+
+    def install_trained(self, truck_id: str, artifact: Dict):
+        """
+        🆕 v5.12.8: Instala un modelo entrenado por AnomalyTrainingScheduler
+        (target "consumption"); reemplaza al anterior de forma atómica
+        """
+        self.scalers[truck_id] = artifact["scaler"]
+        self.models[truck_id] = artifact["model"]
+        if "thresholds" in artifact:
+            self.thresholds[truck_id] = artifact["thresholds"]
+
+
+def compute_thresholds(consumption, speed) -> Dict[str, float]:
+    """Umbrales adaptativos de consumo (idle / highway) de un truck"""
+    consumption = np.asarray(consumption, dtype=np.float64)
+    speed = np.asarray(speed, dtype=np.float64)
+
+    # Filtrar observaciones en idle (speed < 5 mph)
+    idle_mask = speed < 5
+    idle_consumption = consumption[idle_mask] if any(idle_mask) else consumption
+
+    # Filtrar observaciones en highway (speed > 50 mph)
+    highway_mask = speed > 50
+    highway_consumption = (
+        consumption[highway_mask] if any(highway_mask) else consumption
+    )
+
+    return {
+        "consumption_mean_gph": float(np.mean(consumption)),
+        "consumption_max_gph": float(np.percentile(consumption, 95)),
+        "consumption_std_gph": float(np.std(consumption)),
+        "idle_max_gph": (
+            float(np.percentile(idle_consumption, 90))
+            if len(idle_consumption) > 0
+            else 0.5
+        ),
+        "highway_max_gph": (
+            float(np.percentile(highway_consumption, 95))
+            if len(highway_consumption) > 0
+            else 4.0
+        ),
+    }
 
 
 # Instancia global
@@ -366,4 +412,9 @@ def get_anomaly_detector() -> AnomalyDetector:
     global _anomaly_detector
     if _anomaly_detector is None:
         _anomaly_detector = AnomalyDetector()
+        if SKLEARN_AVAILABLE:
+            # 🆕 v5.12.8: Modelos guardados + entrenamiento en segundo plano
+            from ml_engines.anomaly_training import get_training_scheduler
+
+            get_training_scheduler().attach("consumption", _anomaly_detector)
     return _anomaly_detector
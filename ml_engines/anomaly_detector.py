@@ -2,6 +2,15 @@
 Anomaly Detection Engine using Isolation Forest
 Detects fuel theft, sensor malfunctions, and unusual consumption patterns
 Part of ML/AI Roadmap - Feature #3
+
+🆕 v5.12.6: Fleet training/scoring (train_fleet, detect_fleet,
+get_fleet_anomalies) reads features from the shared FleetFeatureStore - one
+fuel_metrics query for the whole fleet instead of 2-3 per truck.
+
+🆕 v5.12.8: With a training scheduler attached (get_anomaly_detector does
+this), missing or stale models are fitted in a background process pool
+(ml_engines.anomaly_training) instead of on the request path; the last good
+model keeps serving until the refit lands.
 """
 
 import logging
@@ -16,6 +25,8 @@ from pymysql.cursors import DictCursor
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
+from ml_engines.feature_store import ANOMALY_FEATURES, FleetFeatureStore, get_feature_store
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -55,13 +66,15 @@ class AnomalyDetector:
     - Unusual Consumption: MPG far outside normal range for conditions
     """
 
-    def __init__(self, db_connection=None):
+    def __init__(self, db_connection=None, feature_store: Optional[FleetFeatureStore] = None):
         """
         Initialize anomaly detector
 
         Args:
             db_connection: Optional database connection. If None, creates new connection.
+            feature_store: Fleet feature store (default: shared instance)
         """
+        self.feature_store = feature_store or get_feature_store()
         if db_connection:
             self.db = db_connection
         else:
@@ -84,6 +97,8 @@ class AnomalyDetector:
         # Models (trained on-demand)
         self.models: Dict[str, IsolationForest] = {}
         self.scalers: Dict[str, StandardScaler] = {}
+        # 🆕 v5.12.8: AnomalyTrainingScheduler (None = train inline)
+        self.training_scheduler = None
 
     def extract_features(
         self, truck_id: str, period_days: int = 7, min_samples: int = 50
@@ -107,6 +122,13 @@ class AnomalyDetector:
         Returns:
             NumPy array of features (n_samples, n_features) or None
         """
+        extracted = self._extract_rows(truck_id, period_days, min_samples)
+        return extracted[0] if extracted else None
+
+    def _extract_rows(
+        self, truck_id: str, period_days: int, min_samples: int
+    ) -> Optional[Tuple[np.ndarray, List[datetime]]]:
+        """Features and their timestamps from a single per-truck query"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=period_days)
 
@@ -114,6 +136,7 @@ class AnomalyDetector:
             cursor.execute(
                 """
                 SELECT 
+                    timestamp_utc,
                     mpg_current,
                     estimated_pct as fuel_level_pct,
                     idle_hours_ecu / NULLIF(engine_hours, 0) * 100 as idle_pct,
@@ -143,6 +166,7 @@ class AnomalyDetector:
 
         # Extract features
         features = []
+        timestamps = []
         for row in rows:
             if row["mpg_current"] is None:
                 continue
@@ -161,11 +185,12 @@ class AnomalyDetector:
                 continue
 
             features.append(feature_vector)
+            timestamps.append(row.get("timestamp_utc"))
 
         if len(features) < min_samples:
             return None
 
-        return np.array(features)
+        return np.array(features), timestamps
 
     def train_model(self, truck_id: str, period_days: int = 30) -> bool:
         """
@@ -186,6 +211,11 @@ class AnomalyDetector:
             logger.warning(f"Cannot train model for {truck_id}: insufficient data")
             return False
 
+        self._fit(truck_id, features)
+        return True
+
+    def _fit(self, truck_id: str, features: np.ndarray):
+        """Scale features and train the truck's Isolation Forest"""
         # Scale features
         scaler = StandardScaler()
         features_scaled = scaler.fit_transform(features)
@@ -206,7 +236,11 @@ class AnomalyDetector:
         logger.info(
             f"Trained anomaly model for {truck_id} with {len(features)} samples"
         )
-        return True
+
+    def install_trained(self, truck_id: str, artifact: Dict):
+        """Install a model fitted by AnomalyTrainingScheduler (target "fuel")"""
+        self.scalers[truck_id] = artifact["scaler"]
+        self.models[truck_id] = artifact["model"]
 
     def detect_anomalies(
         self, truck_id: str, check_period_days: int = 1, retrain: bool = False
@@ -223,19 +257,32 @@ class AnomalyDetector:
             List of detected anomalies
         """
         # Train model if not exists or retrain requested
-        if truck_id not in self.models or retrain:
+        if self.training_scheduler is not None:
+            # 🆕 v5.12.8: Fit in the background, serve the last good model
+            if truck_id not in self.models or retrain:
+                self.training_scheduler.request("fuel", [truck_id])
+            if truck_id not in self.models:
+                return []
+        elif truck_id not in self.models or retrain:
             success = self.train_model(truck_id)
             if not success:
                 return []
 
-        # Get recent data
-        features = self.extract_features(
+        # Get recent data (features and timestamps from the same rows)
+        extracted = self._extract_rows(
             truck_id, period_days=check_period_days, min_samples=1
         )
 
-        if features is None:
+        if extracted is None:
             return []
 
+        features, timestamps = extracted
+        return self._score(truck_id, features, timestamps)
+
+    def _score(
+        self, truck_id: str, features: np.ndarray, timestamps: List[datetime]
+    ) -> List[AnomalyDetection]:
+        """Score feature rows with the truck's model and build anomalies"""
         # Scale features
         scaler = self.scalers[truck_id]
         features_scaled = scaler.transform(features)
@@ -244,26 +291,6 @@ class AnomalyDetector:
         predictions = self.models[truck_id].predict(features_scaled)
         scores = self.models[truck_id].decision_function(features_scaled)
 
-        # Get timestamps
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=check_period_days)
-
-        with self.db.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT timestamp_utc
-                FROM fuel_metrics
-                WHERE truck_id = %s
-                  AND timestamp_utc >= %s
-                  AND timestamp_utc <= %s
-                  AND mpg_current IS NOT NULL
-                ORDER BY timestamp_utc
-            """,
-                (truck_id, start_date, end_date),
-            )
-
-            timestamps = [row["timestamp_utc"] for row in cursor.fetchall()]
-
         # Build anomaly list
         anomalies = []
         feature_names = [
@@ -302,6 +329,70 @@ class AnomalyDetector:
 
         return anomalies
 
+    # ═══════════════════════════════════════════════════════════════════════════
+    # 🆕 v5.12.6: FLEET PATH (one fuel_metrics query via FleetFeatureStore)
+    # ═══════════════════════════════════════════════════════════════════════════
+
+    def train_fleet(
+        self, period_days: int = 30, min_samples: int = 100
+    ) -> Dict[str, bool]:
+        """
+        Train every truck's model from the fleet feature store
+
+        Returns:
+            {truck_id: trained}
+        """
+        features = self.feature_store.anomaly_features(period_days)
+        results = {}
+        for truck_id, rows in features.groupby("truck_id", sort=True):
+            if len(rows) < min_samples:
+                results[truck_id] = False
+                continue
+            self._fit(truck_id, rows[list(ANOMALY_FEATURES)].to_numpy(dtype=np.float64))
+            results[truck_id] = True
+        return results
+
+    def detect_fleet(
+        self, check_period_days: int = 1, retrain: bool = False, train_days: int = 30
+    ) -> Dict[str, List[AnomalyDetection]]:
+        """
+        Detect anomalies for every truck with data in the last check_period_days
+
+        Missing models are trained from the same cached fleet window, so a
+        cold fleet run costs a single database round-trip. With a training
+        scheduler they are queued for the process pool instead and those
+        trucks are skipped until their model is installed.
+        """
+        # Load the training window first so the scoring window is a slice of it
+        self.feature_store.get_window(max(train_days, check_period_days))
+        recent = self.feature_store.anomaly_features(check_period_days)
+        truck_ids = sorted(recent["truck_id"].unique())
+
+        untrained = [t for t in truck_ids if retrain or t not in self.models]
+        if untrained and self.training_scheduler is not None:
+            self.training_scheduler.request("fuel", untrained)
+        elif untrained:
+            history = self.feature_store.anomaly_features(max(train_days, check_period_days))
+            history = history[history["truck_id"].isin(untrained)]
+            for truck_id, rows in history.groupby("truck_id", sort=False):
+                if len(rows) >= 100:
+                    self._fit(
+                        truck_id, rows[list(ANOMALY_FEATURES)].to_numpy(dtype=np.float64)
+                    )
+                else:
+                    logger.warning(f"Cannot train model for {truck_id}: insufficient data")
+
+        fleet = {}
+        for truck_id, rows in recent.groupby("truck_id", sort=True):
+            if truck_id not in self.models:
+                continue
+            fleet[truck_id] = self._score(
+                truck_id,
+                rows[list(ANOMALY_FEATURES)].to_numpy(dtype=np.float64),
+                [ts.to_pydatetime() for ts in rows["timestamp_utc"]],
+            )
+        return fleet
+
     def _classify_anomaly(self, features: Dict[str, float]) -> Tuple[str, str]:
         """
         Classify anomaly type based on feature values
@@ -381,29 +472,11 @@ class AnomalyDetector:
         Returns:
             Dictionary mapping truck_id to list of anomalies
         """
-        # Get all trucks
-        with self.db.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT DISTINCT truck_id
-                FROM fuel_metrics
-                WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL %s DAY)
-                ORDER BY truck_id
-            """,
-                (check_period_days,),
-            )
-
-            truck_ids = [row["truck_id"] for row in cursor.fetchall()]
-
         severity_levels = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
         min_severity_level = severity_levels.get(min_severity, 0)
 
         fleet_anomalies = {}
-        for truck_id in truck_ids:
-            anomalies = self.detect_anomalies(
-                truck_id, check_period_days=check_period_days
-            )
-
+        for truck_id, anomalies in self.detect_fleet(check_period_days).items():
             # Filter by severity
             filtered_anomalies = [
                 a
@@ -482,8 +555,11 @@ _anomaly_detector_instance = None
 
 
 def get_anomaly_detector(db_connection=None) -> AnomalyDetector:
-    """Get singleton instance of AnomalyDetector"""
+    """Get singleton instance of AnomalyDetector (served by the training scheduler)"""
     global _anomaly_detector_instance
     if _anomaly_detector_instance is None:
+        from ml_engines.anomaly_training import get_training_scheduler
+
         _anomaly_detector_instance = AnomalyDetector(db_connection=db_connection)
+        get_training_scheduler().attach("fuel", _anomaly_detector_instance)
     return _anomaly_detector_instance
@@ -0,0 +1,535 @@
+"""
+Anomaly Training Scheduler v5.12.8
+═══════════════════════════════════════════════════════════════════════════════
+
+Trains the per-truck Isolation Forest models off the request path.
+
+`AnomalyDetector.detect_anomalies` (ml_engines.anomaly_detector) used to fit a
+model synchronously the first time a truck was requested, and the consumption
+detector in ml_engines.anomaly_detection_v2 had no trained models at all until
+someone called train_detector. After a restart the first anomaly requests
+blocked for seconds per truck. The scheduler instead:
+
+- fits every truck of a target in a ProcessPoolExecutor (one truck per task,
+  single-threaded forests so workers don't oversubscribe the CPU); the
+  features come from the shared FleetFeatureStore in one query
+- installs each model as soon as its task finishes - detectors keep serving
+  the last good model until the refit replaces it, and a failed fit never
+  removes one
+- persists models in a compact artifact store (compressed joblib, one file
+  per truck, atomic replace) that detectors warm-start from
+- runs on one dispatcher thread: on-demand requests for missing trucks are
+  coalesced, and the whole fleet is refit on a fixed interval
+- reports fleet training wall time, per-truck fit time and worker CPU
+  utilization
+
+Targets:
+    fuel         ml_engines.anomaly_detector.AnomalyDetector (6 features)
+    consumption  ml_engines.anomaly_detection_v2.AnomalyDetector (gph/speed/idle)
+
+Usage:
+    scheduler = get_training_scheduler()
+    scheduler.attach("fuel", detector)      # loads stored models
+    scheduler.request("fuel", ["RA9250"])   # background, returns immediately
+    scheduler.start(refit_interval_seconds=6 * 3600)
+    scheduler.get_stats()
+
+Author: Fuel Copilot Team
+Version: 5.12.8
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ml_engines.feature_store import (
+    ANOMALY_FEATURES,
+    FEATURE_SET_VERSION,
+    FleetFeatureStore,
+    get_feature_store,
+)
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+DEFAULT_ARTIFACT_DIR = Path(__file__).resolve().parent.parent / "models" / "anomaly"
+
+
+@dataclass(frozen=True)
+class TrainingTarget:
+    """What to fit for one family of per-truck detectors"""
+
+    name: str
+    feature_set: str  # FleetFeatureStore method returning per-row features
+    columns: Tuple[str, ...]
+    period_days: int
+    min_samples: int
+    dtype: str = "float64"
+    contamination: float = 0.05
+    n_estimators: int = 100
+    random_state: int = 42
+    with_thresholds: bool = False  # consumption thresholds (anomaly_detection_v2)
+
+
+TARGETS: Dict[str, TrainingTarget] = {
+    "fuel": TrainingTarget(
+        name="fuel",
+        feature_set="anomaly_features",
+        columns=tuple(ANOMALY_FEATURES),
+        period_days=30,
+        min_samples=100,
+    ),
+    "consumption": TrainingTarget(
+        name="consumption",
+        feature_set="consumption_features",
+        columns=("consumption_gph", "speed_mph", "idle_pct"),
+        period_days=7,
+        min_samples=10,
+        dtype="float32",
+        with_thresholds=True,
+    ),
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WORKER (runs in the process pool - must stay importable and picklable)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _train_truck(truck_id: str, features: np.ndarray, target: TrainingTarget) -> Dict[str, Any]:
+    """Fit scaler + Isolation Forest for one truck and return the artifact"""
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+
+    scaler = StandardScaler()
+    scaled = scaler.fit_transform(features)
+    model = IsolationForest(
+        contamination=target.contamination,
+        n_estimators=target.n_estimators,
+        random_state=target.random_state,
+        n_jobs=1,
+    )
+    predictions = model.fit_predict(scaled)
+
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "target": target.name,
+        "truck_id": truck_id,
+        "feature_set_version": FEATURE_SET_VERSION,
+        "scaler": scaler,
+        "model": model,
+        "n_samples": int(len(features)),
+        "anomalies": int((predictions == -1).sum()),
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if target.with_thresholds:
+        from ml_engines.anomaly_detection_v2 import compute_thresholds
+
+        artifact["thresholds"] = compute_thresholds(features[:, 0], features[:, 1])
+
+    artifact["fit_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    artifact["cpu_seconds"] = time.process_time() - cpu_started
+    return artifact
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ARTIFACT STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class AnomalyArtifactStore:
+    """
+    One compressed joblib file per truck: <root>/<target>/<truck_id>.joblib
+
+    Files are written to a temp name and os.replace'd, so readers never see
+    a partial artifact.
+    """
+
+    def __init__(self, root: Optional[Path] = None, compress: int = 3):
+        self.root = Path(root) if root else DEFAULT_ARTIFACT_DIR
+        self.compress = compress
+
+    @staticmethod
+    def _filename(truck_id: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", truck_id) + ".joblib"
+
+    def path(self, target: str, truck_id: str) -> Path:
+        return self.root / target / self._filename(truck_id)
+
+    def save(self, target: str, truck_id: str, artifact: Dict[str, Any]) -> Path:
+        import joblib
+
+        path = self.path(target, truck_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        joblib.dump(artifact, tmp, compress=self.compress)
+        os.replace(tmp, path)
+        return path
+
+    def load_target(self, target: str) -> Dict[str, Dict[str, Any]]:
+        """All usable artifacts of a target, keyed by truck_id"""
+        import joblib
+
+        artifacts = {}
+        directory = self.root / target
+        if not directory.is_dir():
+            return artifacts
+        for path in sorted(directory.glob("*.joblib")):
+            try:
+                artifact = joblib.load(path)
+            except Exception as e:
+                logger.warning(f"⚠️ Skipping unreadable anomaly model {path.name}: {e}")
+                continue
+            if (
+                not isinstance(artifact, dict)
+                or artifact.get("format") != ARTIFACT_FORMAT
+                or artifact.get("feature_set_version") != FEATURE_SET_VERSION
+            ):
+                continue
+            artifacts[artifact["truck_id"]] = artifact
+        return artifacts
+
+    def size_bytes(self) -> int:
+        if not self.root.is_dir():
+            return 0
+        return sum(p.stat().st_size for p in self.root.rglob("*.joblib"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SCHEDULER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class AnomalyTrainingScheduler:
+    """Background per-truck training in a process pool"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        store: Optional[AnomalyArtifactStore] = None,
+        feature_store: Optional[FleetFeatureStore] = None,
+    ):
+        if max_workers is None:
+            max_workers = int(
+                os.getenv(
+                    "ANOMALY_TRAINING_WORKERS", max(1, min(4, (os.cpu_count() or 2) - 1))
+                )
+            )
+        self.max_workers = max_workers
+        self.store = store or AnomalyArtifactStore()
+        self.feature_store = feature_store or get_feature_store()
+
+        self._detectors: Dict[str, Any] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[Optional[str], Optional[List[str]]]]" = queue.Queue()
+        self._pending: Dict[str, set] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self.refit_interval_seconds: Optional[float] = None
+        self._next_refit: Optional[float] = None
+
+        self._last_runs: Dict[str, Dict[str, Any]] = {}
+        self._totals = {"runs": 0, "trained": 0, "failed": 0, "requests": 0}
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Detectors
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def attach(self, target: str, detector) -> int:
+        """
+        Serve `target` models to `detector` (via detector.install_trained)
+
+        Stored artifacts are installed right away. Returns how many were loaded.
+        """
+        if target not in TARGETS:
+            raise ValueError(f"Unknown training target: {target}")
+        with self._lock:
+            self._detectors[target] = detector
+            self._pending.setdefault(target, set())
+        detector.training_scheduler = self
+
+        loaded = self.store.load_target(target)
+        for truck_id, artifact in loaded.items():
+            detector.install_trained(truck_id, artifact)
+        if loaded:
+            logger.info(f"✅ Loaded {len(loaded)} stored '{target}' anomaly models")
+        return len(loaded)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Training
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: the API process runs threads, forking it is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def train_fleet(
+        self,
+        target: str,
+        truck_ids: Optional[Iterable[str]] = None,
+        period_days: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fit (or refit) the models of `target` in the process pool and block
+        until every truck is done. Models are installed as they finish.
+
+        Returns:
+            Run summary (also kept as last_run in get_stats)
+        """
+        spec = TARGETS[target]
+        detector = self._detectors.get(target)
+        if detector is None:
+            raise ValueError(f"No detector attached for target '{target}'")
+
+        started = time.perf_counter()
+        frame = getattr(self.feature_store, spec.feature_set)(period_days or spec.period_days)
+        if truck_ids is not None:
+            frame = frame[frame["truck_id"].isin(set(truck_ids))]
+
+        jobs: Dict[str, np.ndarray] = {}
+        insufficient: List[str] = []
+        for truck_id, rows in frame.groupby("truck_id", sort=True):
+            if len(rows) < spec.min_samples:
+                insufficient.append(truck_id)
+                continue
+            jobs[truck_id] = rows[list(spec.columns)].to_numpy(dtype=spec.dtype)
+
+        trained: List[str] = []
+        failed: Dict[str, str] = {}
+        fit_ms: List[float] = []
+        worker_cpu = 0.0
+        if jobs:
+            executor = self._get_executor()
+            futures = {
+                executor.submit(_train_truck, truck_id, matrix, spec): truck_id
+                for truck_id, matrix in jobs.items()
+            }
+            for future in as_completed(futures):
+                truck_id = futures[future]
+                try:
+                    artifact = future.result()
+                except BrokenProcessPool as e:
+                    failed[truck_id] = str(e) or "worker process died"
+                    self._reset_executor()
+                    continue
+                except Exception as e:
+                    failed[truck_id] = str(e)
+                    continue
+
+                # Last good model keeps serving until this point
+                detector.install_trained(truck_id, artifact)
+                try:
+                    self.store.save(target, truck_id, artifact)
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not persist anomaly model {truck_id}: {e}")
+                trained.append(truck_id)
+                fit_ms.append(artifact["fit_ms"])
+                worker_cpu += artifact["cpu_seconds"]
+
+        wall = time.perf_counter() - started
+        workers = min(self.max_workers, max(1, len(jobs)))
+        run = {
+            "target": target,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "trucks": len(jobs) + len(insufficient),
+            "trained": len(trained),
+            "insufficient_data": len(insufficient),
+            "failed": len(failed),
+            "errors": dict(list(failed.items())[:5]),
+            "wall_seconds": round(wall, 3),
+            "worker_cpu_seconds": round(worker_cpu, 3),
+            "workers": workers,
+            # share of the pool's capacity spent fitting during the run
+            "cpu_utilization_pct": round(worker_cpu / (wall * workers) * 100, 1) if wall else 0.0,
+            "fit_ms_avg": round(float(np.mean(fit_ms)), 1) if fit_ms else None,
+            "fit_ms_max": round(float(np.max(fit_ms)), 1) if fit_ms else None,
+        }
+        with self._lock:
+            self._last_runs[target] = run
+            self._totals["runs"] += 1
+            self._totals["trained"] += len(trained)
+            self._totals["failed"] += len(failed)
+
+        if failed:
+            logger.warning(f"⚠️ Anomaly training '{target}': {len(failed)} trucks failed")
+        logger.info(
+            f"✅ Anomaly training '{target}': {len(trained)}/{len(jobs)} trucks "
+            f"in {wall:.1f}s ({run['cpu_utilization_pct']}% of {workers} workers)"
+        )
+        return run
+
+    def _reset_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Background dispatcher
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def request(self, target: str, truck_ids: Optional[Iterable[str]] = None) -> bool:
+        """
+        Queue training for some trucks (None = whole fleet). Never blocks.
+
+        Returns False if every requested truck is already queued.
+        """
+        if target not in self._detectors:
+            return False
+        ids = None if truck_ids is None else list(truck_ids)
+        with self._lock:
+            pending = self._pending[target]
+            if ids is not None:
+                ids = [t for t in ids if t not in pending]
+                if not ids:
+                    return False
+                pending.update(ids)
+            self._totals["requests"] += 1
+            self._idle.clear()
+            self._queue.put((target, ids))
+        self._ensure_thread()
+        return True
+
+    def start(self, refit_interval_seconds: Optional[float] = 6 * 3600):
+        """
+        Start the dispatcher with a periodic fleet refit
+
+        Targets without any model are trained right away.
+        """
+        self.refit_interval_seconds = refit_interval_seconds
+        self._next_refit = time.time() + refit_interval_seconds if refit_interval_seconds else None
+        for target, detector in list(self._detectors.items()):
+            if not detector.models:
+                self.request(target)
+        self._ensure_thread()
+        self._queue.put((None, None))  # wake the loop to pick up the interval
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._queue.put((None, None))
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self._reset_executor()
+        self._stop.clear()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued training has finished (tests / scripts)"""
+        return self._idle.wait(timeout)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="anomaly-training", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            timeout = None
+            if self._next_refit is not None:
+                timeout = max(0.0, self._next_refit - time.time())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._next_refit = time.time() + self.refit_interval_seconds
+                for target in list(self._detectors):
+                    self._queue.put((target, None))
+                continue
+
+            # Coalesce everything queued so far: one pool run per target
+            batch: Dict[str, Optional[set]] = {}
+            while item is not None:
+                target, ids = item
+                if target is not None:
+                    if ids is None or batch.get(target, set()) is None:
+                        batch[target] = None
+                    else:
+                        batch.setdefault(target, set()).update(ids)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            for target, ids in batch.items():
+                if self._stop.is_set():
+                    break
+                try:
+                    self.train_fleet(target, None if ids is None else sorted(ids))
+                except Exception as e:
+                    logger.error(f"❌ Anomaly training '{target}' failed: {e}")
+                finally:
+                    with self._lock:
+                        if ids is None:
+                            self._pending[target].clear()
+                        else:
+                            self._pending[target].difference_update(ids)
+
+            with self._lock:
+                if self._queue.empty():
+                    self._idle.set()
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Stats
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "refit_interval_seconds": self.refit_interval_seconds,
+                "next_refit_in_seconds": (
+                    round(max(0.0, self._next_refit - time.time()))
+                    if self._next_refit
+                    else None
+                ),
+                "targets": {
+                    target: {
+                        "models_served": len(detector.models),
+                        "pending": len(self._pending[target]),
+                        "last_run": self._last_runs.get(target),
+                    }
+                    for target, detector in self._detectors.items()
+                },
+                "artifact_store_kb": round(self.store.size_bytes() / 1024, 1),
+                **self._totals,
+            }
+
+
+# Global instance
+_training_scheduler: Optional[AnomalyTrainingScheduler] = None
+_training_scheduler_lock = threading.Lock()
+
+
+def get_training_scheduler() -> AnomalyTrainingScheduler:
+    """Get or create the global anomaly training scheduler"""
+    global _training_scheduler
+    if _training_scheduler is None:
+        with _training_scheduler_lock:
+            if _training_scheduler is None:
+                _training_scheduler = AnomalyTrainingScheduler()
+    return _training_scheduler
@@ -271,8 +271,28 @@ class DriverClusteringEngine:
             logger.warning(f"Not enough valid drivers ({len(features_list)})")
             return False
 
+        return self.fit_features(pd.DataFrame(features_list, index=truck_ids))
+
+    def fit_features(self, features: pd.DataFrame) -> bool:
+        """
+        🆕 v5.12.6: Train on a precomputed feature matrix (one row per truck,
+        index truck_id, columns self.feature_names) - e.g. from
+        FleetFeatureStore.driver_features().
+
+        Returns:
+            True if training successful
+        """
+        if len(features) < self.n_clusters:
+            logger.warning(f"Not enough valid drivers ({len(features)})")
+            return False
+
+        features = features[self.feature_names]
+        self.driver_features = {
+            truck_id: row for truck_id, row in features.iterrows()
+        }
+
         # Create feature matrix
-        X = pd.DataFrame(features_list)
+        X = features.reset_index(drop=True)
         X = X.fillna(X.median())
 
         # Scale features
@@ -289,7 +309,7 @@ class DriverClusteringEngine:
         # Label clusters based on centroid characteristics
         self._label_clusters()
 
-        logger.info(f"✅ Driver clustering trained on {len(features_list)} drivers")
+        logger.info(f"✅ Driver clustering trained on {len(features)} drivers")
         return True
 
     def _label_clusters(self):
@@ -519,19 +539,30 @@ def get_driver_data(truck_id: str, days: int = 30) -> pd.DataFrame:
 def get_all_drivers_data(days: int = 30) -> Dict[str, pd.DataFrame]:
     """
     Fetch data for all drivers in the fleet.
+
+    🆕 v5.12.6: One fleet-wide query through the shared feature store instead
+    of one query per truck.
     """
     from config import get_allowed_trucks
 
-    drivers_data = {}
+    from ml_engines.feature_store import get_feature_store
+
     trucks = get_allowed_trucks()
 
     # 🔧 v5.5.2: Added detailed logging for debugging
     logger.info(f"ML Clustering: Fetching data for {len(trucks)} trucks")
 
-    for truck_id in trucks:
-        data = get_driver_data(truck_id, days)
+    try:
+        window = get_feature_store().get_window(days)
+    except Exception as e:
+        logger.error(f"Error fetching fleet driver data: {e}")
+        return {}
+
+    drivers_data = {}
+    window = window[window["truck_id"].isin(trucks)]
+    for truck_id, data in window.groupby("truck_id", sort=False):
         if len(data) >= 10:
-            drivers_data[truck_id] = data
+            drivers_data[truck_id] = data.reset_index(drop=True)
             logger.debug(f"ML: {truck_id} has {len(data)} records - included")
         else:
             logger.debug(f"ML: {truck_id} has {len(data)} records - skipped (min 10)")
@@ -542,6 +573,24 @@ def get_all_drivers_data(days: int = 30) -> Dict[str, pd.DataFrame]:
     return drivers_data
 
 
+def get_all_driver_features(days: int = 30) -> pd.DataFrame:
+    """
+    🆕 v5.12.6: Clustering features for every allowed truck, computed with
+    vectorized groupby operations on the fleet window (one query).
+    """
+    from config import get_allowed_trucks
+
+    from ml_engines.feature_store import get_feature_store
+
+    features = get_feature_store().driver_features(days)
+    allowed = set(get_allowed_trucks())
+    features = features[features.index.isin(allowed)]
+    logger.info(
+        f"ML Clustering: {len(features)}/{len(allowed)} drivers with sufficient data"
+    )
+    return features
+
+
 def analyze_driver_clusters(days: int = 30) -> Dict[str, Any]:
     """
     Main entry point: Analyze and cluster all drivers.
@@ -565,26 +614,30 @@ def analyze_driver_clusters(days: int = 30) -> Dict[str, Any]:
 
     logger.info(f"Starting driver clustering analysis ({days} days of data)")
 
-    # Fetch data
-    drivers_data = get_all_drivers_data(days)
+    # 🆕 v5.12.6: Fleet feature matrix (one query, vectorized features)
+    try:
+        driver_features = get_all_driver_features(days)
+    except Exception as e:
+        logger.error(f"Error fetching fleet driver features: {e}")
+        driver_features = pd.DataFrame()
 
-    if len(drivers_data) < 4:
+    if len(driver_features) < 4:
         return {
-            "error": f"Insufficient data: only {len(drivers_data)} drivers with data",
+            "error": f"Insufficient data: only {len(driver_features)} drivers with data",
             "minimum_required": 4,
         }
 
     # Determine optimal cluster count (min of 4 or driver count)
-    n_clusters = min(4, len(drivers_data))
+    n_clusters = min(4, len(driver_features))
 
     # Create and fit model
     engine = DriverClusteringEngine(n_clusters=n_clusters)
-    success = engine.fit(drivers_data)
+    success = engine.fit_features(driver_features)
 
     if not success:
         return {
             "error": "Clustering failed - could not train model",
-            "drivers_found": len(drivers_data),
+            "drivers_found": len(driver_features),
         }
 
     # Get results
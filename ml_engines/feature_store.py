@@ -0,0 +1,381 @@
+"""
+Fleet Feature Store v5.12.6
+═══════════════════════════════════════════════════════════════════════════════
+
+Shared, fleet-wide feature extraction for the ML engines.
+
+AnomalyDetector, DriverClusteringEngine and anomaly_detection_v2 each pulled
+fuel_metrics one truck at a time (the anomaly detector twice per truck: once
+for features, once for timestamps). This store pulls the window for every
+truck in ONE query, keeps it as a single DataFrame, and derives each engine's
+feature matrix with vectorized groupby operations:
+
+- anomaly_features():      per-row IsolationForest features (lags / rates)
+- driver_features():       one row of clustering features per truck
+- consumption_features():  per-row consumption / speed / idle for v2
+
+Raw windows and derived matrices are cached per (feature set, window,
+FEATURE_SET_VERSION) for TTL_SECONDS. A request for a window shorter than
+the widest cached one is sliced from it, so training (30d) and scoring (1d)
+the whole fleet costs one database round-trip.
+
+Usage:
+    store = get_feature_store()
+    feats = store.anomaly_features(days=30)        # truck_id, timestamp_utc, ...
+    X = store.truck_matrix(feats, "CO0681", ANOMALY_FEATURES)
+    drivers = store.driver_features(days=30)       # indexed by truck_id
+
+Author: Fuel Copilot Team
+Version: 5.12.6
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when any feature definition changes - invalidates cached matrices
+FEATURE_SET_VERSION = 1
+
+RAW_COLUMNS: Tuple[str, ...] = (
+    "truck_id",
+    "timestamp_utc",
+    "mpg_current",
+    "estimated_pct",
+    "estimated_gallons",
+    "speed_mph",
+    "rpm",
+    "consumption_gph",
+    "engine_hours",
+    "idle_hours",
+    "truck_status",
+    "odometer_miles",
+)
+
+ANOMALY_FEATURES: Tuple[str, ...] = (
+    "mpg_current",
+    "fuel_level_pct",
+    "idle_pct",
+    "speed_avg",
+    "fuel_flow_rate",
+    "fuel_change_rate",
+)
+
+DRIVER_FEATURES: Tuple[str, ...] = (
+    "avg_mpg",
+    "idle_pct",
+    "avg_speed",
+    "speed_consistency",
+    "fuel_efficiency_score",
+    "high_rpm_pct",
+    "harsh_events_per_hour",
+)
+
+CONSUMPTION_FEATURES: Tuple[str, ...] = ("consumption_gph", "speed_mph", "idle_pct")
+
+_RAW_QUERY = """
+    SELECT
+        truck_id,
+        timestamp_utc,
+        mpg_current,
+        estimated_pct,
+        estimated_gallons,
+        speed_mph,
+        rpm,
+        consumption_gph,
+        engine_hours,
+        idle_hours_ecu AS idle_hours,
+        truck_status,
+        odometer_mi AS odometer_miles
+    FROM fuel_metrics
+    WHERE timestamp_utc >= :since
+    ORDER BY truck_id, timestamp_utc
+"""
+
+
+class FleetFeatureStore:
+    """
+    Thread-safe cache of fleet-wide fuel_metrics windows and feature matrices.
+
+    `query_fn(sql, params) -> pd.DataFrame` runs the window SELECT; by default
+    it uses the shared SQLAlchemy engine of the local database.
+    """
+
+    TTL_SECONDS = 600
+
+    def __init__(
+        self,
+        query_fn: Optional[Callable[[str, Dict[str, Any]], pd.DataFrame]] = None,
+        ttl_seconds: int = TTL_SECONDS,
+    ):
+        self._query_fn = query_fn or self._default_query
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+
+        # Widest raw window fetched: (days, fetched_at, until, frame)
+        self._raw: Optional[Tuple[int, float, datetime, pd.DataFrame]] = None
+        self._features: Dict[Tuple[str, int, int], Tuple[float, pd.DataFrame]] = {}
+
+        self._queries = 0
+        self._query_ms = 0.0
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _default_query(sql: str, params: Dict[str, Any]) -> pd.DataFrame:
+        from sqlalchemy import text
+
+        from database_mysql import get_sqlalchemy_engine
+
+        with get_sqlalchemy_engine().connect() as conn:
+            return pd.read_sql(text(sql), conn, params=params)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Raw window
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def get_window(self, days: int) -> pd.DataFrame:
+        """All trucks' fuel_metrics rows of the last `days`, sorted by truck/time"""
+        with self._lock:
+            now = time.time()
+            if self._raw is not None:
+                cached_days, fetched_at, until, frame = self._raw
+                if now - fetched_at < self.ttl_seconds and days <= cached_days:
+                    since = until - timedelta(days=days)
+                    return frame[frame["timestamp_utc"] >= since]
+
+            until = datetime.utcnow()
+            start = time.perf_counter()
+            frame = self._query_fn(_RAW_QUERY, {"since": until - timedelta(days=days)})
+            self._queries += 1
+            self._query_ms += (time.perf_counter() - start) * 1000
+
+            frame = self._normalize(frame)
+            self._raw = (days, now, until, frame)
+            self._features.clear()
+            logger.info(
+                f"🧮 Feature store: loaded {len(frame)} rows / "
+                f"{frame['truck_id'].nunique()} trucks ({days}d) in one query"
+            )
+            return frame
+
+    @staticmethod
+    def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+        frame = frame.reindex(columns=list(RAW_COLUMNS))
+        frame["timestamp_utc"] = pd.to_datetime(frame["timestamp_utc"])
+        for col in RAW_COLUMNS:
+            if col not in ("truck_id", "timestamp_utc", "truck_status"):
+                frame[col] = pd.to_numeric(frame[col], errors="coerce")
+        return frame.sort_values(["truck_id", "timestamp_utc"], kind="stable").reset_index(
+            drop=True
+        )
+
+    def _cached(self, name: str, days: int, build: Callable[[pd.DataFrame], pd.DataFrame]):
+        key = (name, days, FEATURE_SET_VERSION)
+        with self._lock:
+            window = self.get_window(days)  # refreshes / clears derived cache on expiry
+            entry = self._features.get(key)
+            if entry is not None:
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            result = build(window)
+            self._features[key] = (time.time(), result)
+            return result
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Feature sets
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def anomaly_features(self, days: int) -> pd.DataFrame:
+        """
+        IsolationForest features per row (ml_engines.anomaly_detector).
+
+        Same definitions as the former per-truck SQL: rows with a positive
+        mpg_current and a fuel level; lags are taken within each truck over
+        those rows; hour deltas follow TIMESTAMPDIFF(HOUR) (whole hours, 0 →
+        NULL); NULL features become 0.
+        """
+        return self._cached("anomaly", days, _build_anomaly_features)
+
+    def driver_features(self, days: int, min_rows: int = 10) -> pd.DataFrame:
+        """One row of DriverClusteringEngine features per truck (index: truck_id)"""
+        return self._cached(
+            f"driver:{min_rows}", days, lambda w: _build_driver_features(w, min_rows)
+        )
+
+    def consumption_features(self, days: int) -> pd.DataFrame:
+        """consumption_gph / speed_mph / idle_pct per row (anomaly_detection_v2)"""
+        return self._cached("consumption", days, _build_consumption_features)
+
+    @staticmethod
+    def truck_matrix(
+        features: pd.DataFrame, truck_id: str, columns: Sequence[str]
+    ) -> np.ndarray:
+        """Feature matrix (n_rows, n_columns) of one truck from a fleet frame"""
+        rows = features[features["truck_id"] == truck_id]
+        return rows[list(columns)].to_numpy(dtype=np.float64)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Maintenance
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def invalidate(self):
+        with self._lock:
+            self._raw = None
+            self._features.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            raw = self._raw
+            return {
+                "feature_set_version": FEATURE_SET_VERSION,
+                "window_days": raw[0] if raw else None,
+                "rows": len(raw[3]) if raw else 0,
+                "trucks": int(raw[3]["truck_id"].nunique()) if raw else 0,
+                "age_seconds": round(time.time() - raw[1], 1) if raw else None,
+                "cached_feature_sets": len(self._features),
+                "queries": self._queries,
+                "query_ms_total": round(self._query_ms, 1),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VECTORIZED BUILDERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _build_anomaly_features(window: pd.DataFrame) -> pd.DataFrame:
+    rows = window[
+        (window["mpg_current"] > 0) & window["estimated_pct"].notna()
+    ].reset_index(drop=True)
+    by_truck = rows.groupby("truck_id", sort=False)
+
+    prev_ts = by_truck["timestamp_utc"].shift()
+    hours = np.floor((rows["timestamp_utc"] - prev_ts).dt.total_seconds() / 3600)
+    hours = hours.where(hours != 0)  # NULLIF(..., 0)
+    engine_hours = rows["engine_hours"].where(rows["engine_hours"] != 0)
+
+    features = pd.DataFrame(
+        {
+            "truck_id": rows["truck_id"],
+            "timestamp_utc": rows["timestamp_utc"],
+            "mpg_current": rows["mpg_current"],
+            "fuel_level_pct": rows["estimated_pct"],
+            "idle_pct": rows["idle_hours"] / engine_hours * 100,
+            "speed_avg": rows["speed_mph"],
+            "fuel_flow_rate": rows["estimated_gallons"] / hours,
+            "fuel_change_rate": (
+                rows["estimated_pct"] - by_truck["estimated_pct"].shift()
+            )
+            / hours,
+        }
+    )
+    numeric = list(ANOMALY_FEATURES)
+    features[numeric] = features[numeric].fillna(0.0)
+    finite = np.isfinite(features[numeric].to_numpy(dtype=np.float64)).all(axis=1)
+    return features[finite].reset_index(drop=True)
+
+
+def _build_driver_features(window: pd.DataFrame, min_rows: int) -> pd.DataFrame:
+    """Vectorized DriverClusteringEngine.extract_driver_features for all trucks"""
+    counts = window.groupby("truck_id", sort=False).size()
+    data = window[window["truck_id"].isin(counts[counts >= min_rows].index)]
+    if data.empty:
+        return pd.DataFrame(columns=list(DRIVER_FEATURES))
+
+    by_truck = data.groupby("truck_id", sort=False)
+    agg = by_truck.agg(
+        n=("speed_mph", "size"),
+        total_fuel=("consumption_gph", "sum"),
+        odo_min=("odometer_miles", "min"),
+        odo_max=("odometer_miles", "max"),
+        eng_min=("engine_hours", "min"),
+        eng_max=("engine_hours", "max"),
+        idle_min=("idle_hours", "min"),
+        idle_max=("idle_hours", "max"),
+    )
+
+    distance = agg["odo_max"] - agg["odo_min"]
+    avg_mpg = (distance / agg["total_fuel"]).where(
+        (agg["total_fuel"] > 0) & (distance > 0), 6.0
+    )
+
+    engine_range = agg["eng_max"] - agg["eng_min"]
+    idle_rows = (data["truck_status"] == "idle").groupby(data["truck_id"], sort=False).sum()
+    idle_pct = ((agg["idle_max"] - agg["idle_min"]) / engine_range * 100).where(
+        engine_range > 0, idle_rows / agg["n"] * 100
+    )
+    idle_pct = np.minimum(idle_pct, 50)  # Cap at 50% (NaN stays NaN)
+
+    moving = data[data["speed_mph"] > 5].groupby("truck_id", sort=False)["speed_mph"]
+    moving_mean = moving.mean().reindex(agg.index)
+    moving_std = moving.std().reindex(agg.index)
+    moving_n = moving.size().reindex(agg.index).fillna(0)
+
+    avg_speed = moving_mean.where(moving_n > 0, 0.0)
+    speed_consistency = (100 - np.minimum(moving_std * 2, 50)).where(moving_n > 5, 50.0)
+
+    fuel_efficiency_score = np.minimum(avg_mpg / 8.0, 1.0) * 50 + np.fmax(
+        0, 50 - idle_pct * 2
+    )
+
+    high_rpm = (data["rpm"] > 1800).groupby(data["truck_id"], sort=False).sum()
+    high_rpm_pct = high_rpm / agg["n"] * 100
+
+    speed_jump = by_truck["speed_mph"].diff().abs() > 10
+    harsh = speed_jump.groupby(data["truck_id"], sort=False).sum()
+    harsh_per_hour = (harsh / np.maximum(agg["n"] / 60, 1)).where(agg["n"] > 5, 0.0)
+
+    return pd.DataFrame(
+        {
+            "avg_mpg": avg_mpg,
+            "idle_pct": idle_pct,
+            "avg_speed": avg_speed,
+            "speed_consistency": speed_consistency,
+            "fuel_efficiency_score": fuel_efficiency_score,
+            "high_rpm_pct": high_rpm_pct,
+            "harsh_events_per_hour": harsh_per_hour,
+        },
+        index=agg.index,
+    ).astype(float)
+
+
+def _build_consumption_features(window: pd.DataFrame) -> pd.DataFrame:
+    rows = window[window["consumption_gph"].notna()]
+    engine_hours = rows["engine_hours"].where(rows["engine_hours"] != 0)
+    return pd.DataFrame(
+        {
+            "truck_id": rows["truck_id"],
+            "timestamp_utc": rows["timestamp_utc"],
+            "consumption_gph": rows["consumption_gph"],
+            "speed_mph": rows["speed_mph"].fillna(0.0),
+            "idle_pct": (rows["idle_hours"] / engine_hours * 100).fillna(0.0),
+        }
+    ).reset_index(drop=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SINGLETON
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_feature_store: Optional[FleetFeatureStore] = None
+_feature_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FleetFeatureStore:
+    """Get or create the process-wide feature store"""
+    global _feature_store
+    if _feature_store is None:
+        with _feature_store_lock:
+            if _feature_store is None:
+                _feature_store = FleetFeatureStore()
+    return _feature_store
@@ -303,13 +303,18 @@ class MLFuelTheftDetector:
         print(f"💾 Model saved to {filepath}")
 
     def load_model(self, filepath: str):
-        """Load trained model from disk"""
-        data = joblib.load(filepath)
+        """Load trained model from disk (shared, memory-mapped via model_registry)"""
+        from model_registry import get_model_registry
+
+        data = get_model_registry().load(filepath, on_swap=self._apply_model_data)
+        self._apply_model_data(data)
+        print(f"📂 Model loaded from {filepath}")
+
+    def _apply_model_data(self, data: Dict):
         self.model = data["model"]
         self.scaler = data["scaler"]
         self.feature_names = data["feature_names"]
         self.is_trained = data["is_trained"]
-        print(f"📂 Model loaded from {filepath}")
 
 
 # =====================================================
@@ -22,6 +22,7 @@ from typing import Dict, List, Optional, Tuple
 import joblib
 import numpy as np
 import pandas as pd
+from sklearn.base import clone
 from sklearn.preprocessing import StandardScaler
 
 try:
@@ -159,6 +160,7 @@ class LSTMMaintenancePredictor:
         # Group by truck
         X_sequences = []
         y_labels = [] if labels is not None else None
+        scaler = self.scaler
 
         for truck_id in df["truck_id"].unique():
             truck_data = df[df["truck_id"] == truck_id].sort_values("timestamp_utc")
@@ -166,8 +168,9 @@ class LSTMMaintenancePredictor:
             # Extract features
             features_data = truck_data[self.feature_names].values
 
-            # Normalize
-            features_scaled = self.scaler.fit_transform(features_data)
+            # Normalize (fresh copy: a loaded scaler is the registry's shared one)
+            scaler = clone(self.scaler)
+            features_scaled = scaler.fit_transform(features_data)
 
             # Create sequences
             for i in range(len(features_scaled) - self.sequence_length):
@@ -201,6 +204,7 @@ class LSTMMaintenancePredictor:
 
                     y_labels.append(label)
 
+        self.scaler = scaler
         X = np.array(X_sequences)
         y = np.array(y_labels) if y_labels else None
 
@@ -365,11 +369,19 @@ class LSTMMaintenancePredictor:
         self.model = load_model(self.model_path)
 
         if os.path.exists(self.scaler_path):
-            self.scaler = joblib.load(self.scaler_path)
+            # 🆕 v5.12.7: Shared copy kept current by model_registry
+            from model_registry import get_model_registry
+
+            self.scaler = get_model_registry().load(
+                self.scaler_path, on_swap=self._set_scaler
+            )
 
         logger.info(f"Loaded model from {self.model_path}")
         return True
 
+    def _set_scaler(self, scaler):
+        self.scaler = scaler
+
     def save_model(self):
         """Save model and scaler"""
         if self.model is None:
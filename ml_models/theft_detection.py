@@ -24,6 +24,7 @@ from typing import Dict, List, Optional, Tuple
 import joblib
 import numpy as np
 import pandas as pd
+from sklearn.base import clone
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
@@ -143,11 +144,17 @@ class TheftDetectionModel:
         # Prepare features
         X = self.prepare_features(df)
 
+        # Fit fresh copies: after load_model() self.model / self.scaler are the
+        # registry's shared instances, used by every detector in the process
+        scaler = clone(self.scaler)
+        model = clone(self.model)
+
         # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        X_scaled = scaler.fit_transform(X)
 
         # Train model
-        self.model.fit(X_scaled)
+        model.fit(X_scaled)
+        self.model, self.scaler = model, scaler
 
         # Evaluate on training data
         predictions = self.model.predict(X_scaled)
@@ -291,14 +298,24 @@ class TheftDetectionModel:
             logger.warning(f"Model file not found: {self.model_path}")
             return False
 
-        self.model = joblib.load(self.model_path)
+        # 🆕 v5.12.7: Shared, memory-mapped copies kept current by model_registry
+        from model_registry import get_model_registry
+
+        registry = get_model_registry()
+        self.model = registry.load(self.model_path, on_swap=self._set_model)
 
         if os.path.exists(self.scaler_path):
-            self.scaler = joblib.load(self.scaler_path)
+            self.scaler = registry.load(self.scaler_path, on_swap=self._set_scaler)
 
         logger.info(f"Loaded model from {self.model_path}")
         return True
 
+    def _set_model(self, model):
+        self.model = model
+
+    def _set_scaler(self, scaler):
+        self.scaler = scaler
+
     def save_model(self):
         """Save model and scaler"""
         if self.model is None:
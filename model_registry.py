@@ -0,0 +1,376 @@
+"""
+Model Registry v5.12.7
+═══════════════════════════════════════════════════════════════════════════════
+
+One place that loads the ML artifacts in `models/` for the whole process.
+
+The theft detectors (ml_fuel_theft_detector, ml_models/theft_detection,
+theft_detection_ml) and the maintenance LSTM scaler used to joblib/pickle
+load their files independently, usually on the first request that needed
+them. The registry instead:
+
+- loads each artifact once per process, either at startup in a background
+  thread (preload) or lazily on first use - concurrent callers wait for the
+  same load
+- memory-maps NumPy arrays (joblib `mmap_mode="r"`), so every uvicorn worker
+  maps the same read-only pages instead of holding a private copy
+- versions artifacts by file mtime/size and hot-swaps them atomically: the
+  new version is fully loaded before it replaces the old one, and
+  subscribers are notified so they refresh their references
+- reports load time and RSS growth per model
+
+Memory-mapped files must never be rewritten in place (a truncated mapping
+crashes the process with SIGBUS). Each version is therefore mapped from an
+immutable snapshot `models/.mmap/<name>.<version><suffix>`; trainers keep
+writing to the normal path. Workers loading the same version share the
+same snapshot file.
+
+Usage:
+    registry = get_model_registry()
+    registry.preload()                              # background thread
+    model = registry.load("models/theft_detector.pkl", on_swap=self._set_model)
+    registry.refresh()                              # hot-swap changed files
+    registry.get_stats()
+
+Author: Fuel Copilot Team
+Version: 5.12.7
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import joblib
+
+    JOBLIB_AVAILABLE = True
+except ImportError:  # pragma: no cover - joblib ships with scikit-learn
+    joblib = None
+    JOBLIB_AVAILABLE = False
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover
+    psutil = None
+
+MODEL_DIR = Path(os.getenv("MODEL_DIR", "models"))
+SNAPSHOT_DIRNAME = ".mmap"
+SNAPSHOTS_KEPT = 2  # per artifact: current + previous (still mapped by slow workers)
+
+# Artifacts preloaded at startup (name → path)
+DEFAULT_ARTIFACTS: Dict[str, Path] = {
+    "fuel_theft_detector": MODEL_DIR / "fuel_theft_detector.joblib",
+    "theft_detection_rf": MODEL_DIR / "theft_detection_rf.pkl",
+    "theft_detector": MODEL_DIR / "theft_detector.pkl",
+    "theft_scaler": MODEL_DIR / "theft_scaler.pkl",
+    "lstm_scaler": MODEL_DIR / "lstm_scaler.pkl",
+}
+
+
+def _rss_bytes() -> int:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _file_version(path: Path) -> Optional[str]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+@dataclass
+class ModelEntry:
+    """One registered artifact and its currently served version"""
+
+    name: str
+    path: Path
+    obj: Any = None
+    version: Optional[str] = None
+    generation: int = 0
+    loaded_at: Optional[float] = None
+    load_seconds: float = 0.0
+    rss_delta_bytes: int = 0
+    size_bytes: int = 0
+    mapped_from: Optional[Path] = None
+    error: Optional[str] = None
+    subscribers: List[Callable[[Any], None]] = field(default_factory=list)
+    load_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "path": str(self.path),
+            "loaded": self.obj is not None,
+            "type": type(self.obj).__name__ if self.obj is not None else None,
+            "version": self.version,
+            "generation": self.generation,
+            "loaded_at": self.loaded_at,
+            "load_ms": round(self.load_seconds * 1000, 2),
+            "rss_delta_mb": round(self.rss_delta_bytes / 1024 / 1024, 2),
+            "size_mb": round(self.size_bytes / 1024 / 1024, 3),
+            "mmap": self.mapped_from is not None,
+            "error": self.error,
+        }
+
+
+class ModelRegistry:
+    """Thread-safe, process-wide registry of memory-mapped ML artifacts"""
+
+    def __init__(self, mmap_mode: Optional[str] = "r"):
+        self.mmap_mode = mmap_mode
+        self._entries: Dict[str, ModelEntry] = {}
+        self._by_path: Dict[Path, str] = {}
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._swaps = 0
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Registration / access
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def register(self, name: str, path) -> ModelEntry:
+        path = Path(path)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.path.resolve() != path.resolve():
+                entry = ModelEntry(name=name, path=path)
+                self._entries[name] = entry
+                self._by_path[path.resolve()] = name
+            return entry
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Current object of a registered artifact (loads it on first use)"""
+        entry = self._entries.get(name)
+        if entry is None:
+            return default
+        if entry.obj is None and entry.version is None:
+            self._load(entry)
+        return entry.obj if entry.obj is not None else default
+
+    def load(
+        self,
+        path,
+        name: Optional[str] = None,
+        on_swap: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        """
+        Load an artifact by path through the registry.
+
+        Registers it (name defaults to the file stem) and returns the shared
+        object. `on_swap(new_obj)` is called after every later hot swap.
+
+        Raises:
+            FileNotFoundError: the file does not exist
+        """
+        path = Path(path)
+        with self._lock:
+            name = name or self._by_path.get(path.resolve()) or path.stem
+            entry = self.register(name, path)
+            if on_swap is not None and on_swap not in entry.subscribers:
+                entry.subscribers.append(on_swap)
+
+        self._load(entry)  # no-op unless the file changed since the last load
+        if entry.obj is None:
+            if not path.exists():
+                raise FileNotFoundError(str(path))
+            raise RuntimeError(f"Could not load model {name}: {entry.error}")
+        return entry.obj
+
+    def entry(self, name: str) -> Optional[ModelEntry]:
+        return self._entries.get(name)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Loading / hot swap
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def _snapshot(self, entry: ModelEntry, version: str) -> Path:
+        """Immutable copy of the current file to memory-map (shared by workers)"""
+        snap_dir = entry.path.parent / SNAPSHOT_DIRNAME
+        snap_dir.mkdir(exist_ok=True)
+        snapshot = snap_dir / f"{entry.name}.{version}{entry.path.suffix}"
+        if not snapshot.exists():
+            tmp = snapshot.with_name(f"{snapshot.name}.{os.getpid()}.tmp")
+            shutil.copyfile(entry.path, tmp)
+            os.replace(tmp, snapshot)  # atomic; concurrent workers write identical bytes
+            self._prune_snapshots(snap_dir, entry.name, keep=snapshot)
+        return snapshot
+
+    @staticmethod
+    def _prune_snapshots(snap_dir: Path, name: str, keep: Path):
+        # Unlinking a file another process still maps is safe on POSIX
+        old = sorted(
+            (p for p in snap_dir.glob(f"{name}.*") if p != keep and not p.name.endswith(".tmp")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for path in old[SNAPSHOTS_KEPT - 1 :]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _load(self, entry: ModelEntry, force: bool = False) -> bool:
+        """Load the file's current version; swap it in if it changed"""
+        with entry.load_lock:  # single flight per artifact
+            version = _file_version(entry.path)
+            if version is None:
+                entry.error = "file not found"
+                return False
+            if version == entry.version and not force:
+                return False
+
+            start = time.perf_counter()
+            rss_before = _rss_bytes()
+            try:
+                if not JOBLIB_AVAILABLE:
+                    raise ImportError("joblib not installed")
+                source = self._snapshot(entry, version) if self.mmap_mode else entry.path
+                obj = joblib.load(source, mmap_mode=self.mmap_mode)
+            except Exception as e:
+                entry.error = str(e)
+                entry.version = version  # don't retry a broken file until it changes
+                logger.error(f"❌ Model registry: could not load {entry.name}: {e}")
+                return False
+
+            previous = entry.obj
+            with self._lock:  # atomic swap
+                entry.obj = obj
+                entry.version = version
+                entry.generation += 1
+                entry.loaded_at = time.time()
+                entry.load_seconds = time.perf_counter() - start
+                entry.rss_delta_bytes = max(0, _rss_bytes() - rss_before)
+                entry.size_bytes = entry.path.stat().st_size
+                entry.mapped_from = source if self.mmap_mode else None
+                entry.error = None
+                subscribers = list(entry.subscribers)
+                if previous is not None:
+                    self._swaps += 1
+
+        logger.info(
+            f"📦 Model registry: {entry.name} v{version} "
+            f"{'hot-swapped' if previous is not None else 'loaded'} in "
+            f"{entry.load_seconds * 1000:.0f} ms"
+        )
+        if previous is not None:
+            for callback in subscribers:
+                try:
+                    callback(obj)
+                except Exception as e:
+                    logger.warning(f"⚠️ Model registry: swap callback for {entry.name} failed: {e}")
+        return True
+
+    def reload(self, name: str, force: bool = False) -> bool:
+        """Reload one artifact if its file changed (or always with force)"""
+        entry = self._entries.get(name)
+        return self._load(entry, force=force) if entry is not None else False
+
+    def refresh(self) -> List[str]:
+        """Hot-swap every loaded artifact whose file changed; returns names"""
+        swapped = []
+        for entry in list(self._entries.values()):
+            if entry.obj is not None and _file_version(entry.path) != entry.version:
+                if self._load(entry):
+                    swapped.append(entry.name)
+        return swapped
+
+    def preload(self, background: bool = True) -> Optional[threading.Thread]:
+        """Load every registered artifact now (or in a daemon thread)"""
+
+        def _run():
+            start = time.perf_counter()
+            for entry in list(self._entries.values()):
+                if entry.obj is None and entry.path.exists():
+                    self._load(entry)
+            logger.info(
+                f"📦 Model registry: preloaded {sum(1 for e in self._entries.values() if e.obj is not None)}"
+                f"/{len(self._entries)} models in {time.perf_counter() - start:.2f}s"
+            )
+
+        if not background:
+            _run()
+            return None
+        thread = threading.Thread(target=_run, name="model-registry-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def start_watcher(self, interval_seconds: float = 60.0):
+        """Poll model files and hot-swap changed ones"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+
+        def _watch():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.warning(f"⚠️ Model registry watcher error: {e}")
+
+        self._watcher = threading.Thread(target=_watch, name="model-registry-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Stats
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {name: e.to_dict() for name, e in self._entries.items()}
+            swaps = self._swaps
+        stats: Dict[str, Any] = {
+            "models": models,
+            "loaded": sum(1 for m in models.values() if m["loaded"]),
+            "registered": len(models),
+            "hot_swaps": swaps,
+            "mmap_mode": self.mmap_mode,
+            "total_load_ms": round(sum(m["load_ms"] for m in models.values()), 2),
+            "process_rss_mb": round(_rss_bytes() / 1024 / 1024, 1),
+        }
+        if psutil is not None:
+            try:
+                stats["process_shared_mb"] = round(
+                    psutil.Process().memory_info().shared / 1024 / 1024, 1
+                )
+            except AttributeError:  # not reported on every platform
+                pass
+        return stats
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SINGLETON
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create the process-wide model registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = ModelRegistry()
+                for name, path in DEFAULT_ARTIFACTS.items():
+                    registry.register(name, path)
+                _registry = registry
+    return _registry
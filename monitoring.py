@@ -131,6 +131,11 @@ if PROMETHEUS_AVAILABLE:
         "fuel_copilot_errors_total", "Total errors", ["error_type"], registry=registry
     )
 
+    # 🆕 v5.12.18: per-statement DB profile (top N by total time), read at scrape
+    from query_profiler import QueryProfileCollector
+
+    registry.register(QueryProfileCollector())
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # HEALTH CHECK FUNCTIONS
@@ -10,6 +10,7 @@ Features:
 - Use IQR outlier filtering for clean data
 - Store baselines in database for persistence
 - Compare current readings against learned baseline
+- Optional incremental store (mpg_baseline_store) for O(1) reads
 
 Usage:
     service = MPGBaselineService(db_pool)
@@ -239,14 +240,17 @@ class MPGBaselineService:
     # Minimum samples required for baseline
     MIN_SAMPLES = 10
 
-    def __init__(self, db_pool=None):
+    def __init__(self, db_pool=None, baseline_store=None):
         """
         Initialize service.
 
         Args:
             db_pool: Database connection pool (aiomysql)
+            baseline_store: Optional MPGBaselineStore with incremental baselines
+                maintained by the sync cycle (see mpg_baseline_store.py)
         """
         self.db_pool = db_pool
+        self.baseline_store = baseline_store
         self._baselines_cache: dict[str, MPGBaseline] = {}
 
     async def calculate_baseline(
@@ -355,6 +359,15 @@ class MPGBaselineService:
         # Cache result
         self._baselines_cache[truck_id] = baseline
 
+        # Seed the incremental store so later reads don't hit history again
+        if self.baseline_store is not None:
+            try:
+                self.baseline_store.rebuild_from_readings(
+                    truck_id, [(row[0], row[1]) for row in rows if len(row) > 1]
+                )
+            except Exception as e:
+                logger.debug(f"[{truck_id}] Could not seed baseline store: {e}")
+
         logger.info(
             f"[{truck_id}] Baseline calculated: {baseline.baseline_mpg:.2f} MPG "
             f"(σ={baseline.std_dev:.2f}, n={baseline.sample_count}, conf={baseline.confidence})"
@@ -419,11 +432,13 @@ class MPGBaselineService:
         Returns:
             DeviationAnalysis with status and recommendations
         """
-        # Get baseline from cache or use default
+        # Get baseline from cache, incremental store, or use default
         if baseline is None:
-            baseline = self._baselines_cache.get(
-                truck_id, MPGBaseline(truck_id=truck_id)
-            )
+            baseline = self._baselines_cache.get(truck_id)
+        if baseline is None and self.baseline_store is not None:
+            baseline = self.baseline_store.get_baseline(truck_id)
+        if baseline is None:
+            baseline = MPGBaseline(truck_id=truck_id)
 
         # Calculate deviation
         if baseline.baseline_mpg > 0:
@@ -510,6 +525,9 @@ class MPGBaselineService:
         Returns:
             Summary dict with fleet-wide statistics
         """
+        if not self._baselines_cache and self.baseline_store is not None:
+            return self.baseline_store.get_fleet_summary()
+
         if not self._baselines_cache:
             return {
                 "total_trucks": 0,
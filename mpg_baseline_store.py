@@ -0,0 +1,763 @@
+"""
+MPG Baseline Store v5.7.7
+═══════════════════════════════════════════════════════════════════════════════
+
+Incremental per-truck MPG baselines maintained from the sync cycle.
+
+MPGBaselineService recomputes IQR filtering and percentiles from up to 5000
+raw fuel_metrics rows every time a baseline is requested. This store keeps a
+bounded summary per truck instead:
+
+- One histogram per UTC day (0.05 MPG bins) - at most WINDOW_DAYS + 1 days;
+  older days are dropped, so the baseline covers the same 30 days as the
+  history query and never turns into an all-time baseline
+- Reads merge the days in the window and apply the batch rules (IQR fences,
+  interpolated percentiles) to the merged bins; the result is cached until
+  the next update or until the window moves to a new day
+
+Every sync cycle feeds the MPG it just computed (`update`), reads are served
+from the cache (`get_baseline`, `get_fleet_summary`), and the state is
+persisted as a compact JSON array per truck. Recomputing from history is only
+used as a background backfill (on sync startup for unseen trucks, or on demand
+from the API - a rebuilt truck is adopted by the sync process on its next save).
+
+Usage:
+    store = get_baseline_store()
+
+    # Sync cycle
+    store.update("CO0681", mpg=5.9, timestamp=ts, speed_mph=58.0)
+
+    # API
+    baseline = store.get_baseline("CO0681")     # MPGBaseline or None
+    summary = store.get_fleet_summary()
+
+    # Background rebuild from fuel_metrics (own connection)
+    store.start_background_backfill(get_local_connection)
+
+Author: Fuel Analytics Team
+Version: 5.7.7
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from mpg_baseline_service import (
+    MPGBaseline,
+    MPGBaselineService,
+    calculate_percentile,
+    get_confidence_level,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PER-TRUCK WINDOWED BASELINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+BIN_WIDTH = 0.05  # MPG resolution of the daily histograms
+DAY_SECONDS = 86400
+
+
+class DailyMPGHistogram:
+    """One UTC day of readings for one truck: counts per BIN_WIDTH bin"""
+
+    __slots__ = ("day", "first_ts", "last_ts", "bins")
+
+    def __init__(self, day: int):
+        self.day = day
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.bins: dict[int, int] = {}
+
+    def add(self, mpg: float, timestamp: float) -> None:
+        key = int(round(mpg / BIN_WIDTH))
+        self.bins[key] = self.bins.get(key, 0) + 1
+        if self.first_ts is None or timestamp < self.first_ts:
+            self.first_ts = timestamp
+        if self.last_ts is None or timestamp > self.last_ts:
+            self.last_ts = timestamp
+
+    def to_list(self) -> list:
+        return [self.day, self.first_ts, self.last_ts, sorted(self.bins.items())]
+
+    @classmethod
+    def from_list(cls, data: list) -> "DailyMPGHistogram":
+        hist = cls(int(data[0]))
+        hist.first_ts = data[1]
+        hist.last_ts = data[2]
+        hist.bins = {int(k): int(c) for k, c in data[3]}
+        return hist
+
+
+class _BinnedValues:
+    """Sorted view of merged histogram bins, indexable by rank"""
+
+    def __init__(self, bins: dict[int, int]):
+        self.keys = sorted(bins)
+        self.counts = [bins[k] for k in self.keys]
+        self.n = sum(self.counts)
+
+    def at(self, rank: int) -> float:
+        for key, count in zip(self.keys, self.counts):
+            if rank < count:
+                return key * BIN_WIDTH
+            rank -= count
+        return self.keys[-1] * BIN_WIDTH
+
+    def percentile(self, percentile: int) -> float:
+        """Same linear interpolation as `calculate_percentile`"""
+        if self.n == 0:
+            return 0.0
+        rank = (self.n - 1) * percentile / 100
+        lower = int(rank)
+        upper = min(lower + 1, self.n - 1)
+        lower_value = self.at(lower)
+        return lower_value + (self.at(upper) - lower_value) * (rank - lower)
+
+
+class StreamingMPGBaseline:
+    """
+    MPG baseline state for one truck: a histogram per day, at most
+    WINDOW_DAYS + 1 of them.
+
+    Reads merge the days inside the window and apply the batch rules of
+    MPGBaselineService (IQR fences from `filter_outliers_iqr`, percentiles
+    from `calculate_percentile`) to the merged bins, so a reading ages out
+    of the baseline exactly when it leaves the history query's window.
+    """
+
+    IQR_MULTIPLIER = 1.5
+
+    __slots__ = ("truck_id", "window_days", "days", "rebuilt_at")
+
+    def __init__(self, truck_id: str, window_days: int = 30):
+        self.truck_id = truck_id
+        self.window_days = window_days
+        self.days: dict[int, DailyMPGHistogram] = {}
+        # When a backfill last replaced this state (adopted across processes)
+        self.rebuilt_at: Optional[float] = None
+
+    def _first_day(self, now: float) -> int:
+        return int((now - self.window_days * DAY_SECONDS) // DAY_SECONDS)
+
+    def add(self, mpg: float, timestamp: float, now: Optional[float] = None) -> bool:
+        """
+        Add one validated MPG reading.
+
+        Returns:
+            True if the reading falls inside the window (and was stored)
+        """
+        first_day = self._first_day(time.time() if now is None else now)
+        day = int(timestamp // DAY_SECONDS)
+        if day < first_day:
+            return False
+        hist = self.days.get(day)
+        if hist is None:
+            hist = self.days[day] = DailyMPGHistogram(day)
+            self.prune(first_day)
+        hist.add(mpg, timestamp)
+        return True
+
+    def prune(self, first_day: int) -> None:
+        """Drop days that left the window"""
+        for day in [d for d in self.days if d < first_day]:
+            del self.days[day]
+
+    def window(self, now: Optional[float] = None) -> list[DailyMPGHistogram]:
+        first_day = self._first_day(time.time() if now is None else now)
+        return [h for d, h in sorted(self.days.items()) if d >= first_day]
+
+    def raw_count(self, now: Optional[float] = None) -> int:
+        """Readings inside the window, before outlier filtering"""
+        return sum(sum(h.bins.values()) for h in self.window(now))
+
+    def to_baseline(self, now: Optional[float] = None) -> MPGBaseline:
+        """Materialize the window as an MPGBaseline (O(days x bins))"""
+        now = time.time() if now is None else now
+        window = self.window(now)
+
+        merged: dict[int, int] = {}
+        for hist in window:
+            for key, count in hist.bins.items():
+                merged[key] = merged.get(key, 0) + count
+        values = _BinnedValues(merged)
+
+        first_ts = window[0].first_ts if window else None
+        last_ts = window[-1].last_ts if window else None
+        days = 0
+        if first_ts is not None and last_ts is not None:
+            days = min(
+                self.window_days,
+                max(1, math.ceil((last_ts - first_ts) / DAY_SECONDS)),
+            )
+        baseline = MPGBaseline(
+            truck_id=self.truck_id,
+            days_analyzed=days,
+            last_calculated=(
+                datetime.fromtimestamp(last_ts, tz=timezone.utc).replace(tzinfo=None)
+                if last_ts
+                else None
+            ),
+        )
+        baseline.sample_count = values.n
+        if values.n < MPGBaselineService.MIN_SAMPLES:
+            baseline.confidence = "INSUFFICIENT"
+            return baseline
+
+        # IQR fences exactly as filter_outliers_iqr (q1 = sorted[n // 4])
+        q1 = values.at(values.n // 4)
+        q3 = values.at((3 * values.n) // 4)
+        lower = q1 - self.IQR_MULTIPLIER * (q3 - q1)
+        upper = q3 + self.IQR_MULTIPLIER * (q3 - q1)
+        filtered = {k: c for k, c in merged.items() if lower <= k * BIN_WIDTH <= upper}
+        if sum(filtered.values()) < 5:
+            # Too aggressive filtering, use original
+            filtered = merged
+        kept = _BinnedValues(filtered)
+
+        n = kept.n
+        mean = sum(k * BIN_WIDTH * c for k, c in filtered.items()) / n
+        m2 = sum(c * (k * BIN_WIDTH - mean) ** 2 for k, c in filtered.items())
+
+        baseline.sample_count = n
+        baseline.baseline_mpg = mean
+        baseline.std_dev = math.sqrt(m2 / (n - 1)) if n > 1 else 0.8
+        baseline.min_mpg = kept.keys[0] * BIN_WIDTH
+        baseline.max_mpg = kept.keys[-1] * BIN_WIDTH
+        baseline.percentile_25 = kept.percentile(25)
+        baseline.percentile_75 = kept.percentile(75)
+        baseline.confidence = get_confidence_level(n, days)
+        return baseline
+
+    def to_list(self) -> list:
+        """Compact serialization (one JSON array per truck)"""
+        return [self.rebuilt_at, [h.to_list() for _, h in sorted(self.days.items())]]
+
+    @classmethod
+    def from_list(
+        cls, truck_id: str, data: list, window_days: int = 30
+    ) -> "StreamingMPGBaseline":
+        state = cls(truck_id, window_days)
+        state.rebuilt_at = data[0]
+        for item in data[1]:
+            hist = DailyMPGHistogram.from_list(item)
+            state.days[hist.day] = hist
+        return state
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FLEET STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _to_epoch(timestamp) -> float:
+    """Accept datetime (naive = UTC), epoch float or None"""
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class MPGBaselineStore:
+    """
+    Fleet-wide incremental MPG baselines.
+
+    The sync process owns the persisted file (updates + periodic save);
+    API processes read it and pick up new versions by file mtime.
+    """
+
+    DEFAULT_STORE_FILE = "data/mpg_baseline_sketches.json"
+    SAVE_INTERVAL = 100  # Save every N updates
+    RELOAD_CHECK_SECONDS = 30  # How often readers look for a newer file
+    WINDOW_DAYS = 30  # Days of readings a baseline covers (and backfill reads)
+    STORE_VERSION = 2  # v1 files (all-time P² sketches) are rebuilt by backfill
+
+    BACKFILL_QUERY = """
+        SELECT truck_id, mpg_current, timestamp_utc
+        FROM fuel_metrics
+        WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL %s DAY)
+          AND mpg_current BETWEEN %s AND %s
+          AND speed_mph >= %s
+          {truck_filter}
+        ORDER BY truck_id, timestamp_utc
+    """
+
+    def __init__(self, store_file: str = None, auto_load: bool = True):
+        self._states: dict[str, StreamingMPGBaseline] = {}
+        self._materialized: dict[str, MPGBaseline] = {}
+        self._materialized_day = 0  # window start the cached reads belong to
+        self._fleet_summary: Optional[dict] = None
+        self._store_file = store_file or self.DEFAULT_STORE_FILE
+        self._lock = threading.RLock()
+        self._update_count = 0
+        self._dirty = False
+        self._file_mtime = 0.0
+        self._last_reload_check = 0.0
+        self._backfill_thread: Optional[threading.Thread] = None
+
+        if auto_load:
+            self.load_from_file(self._store_file)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Writes (sync cycle)
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def update(
+        self,
+        truck_id: str,
+        mpg: Optional[float],
+        timestamp=None,
+        speed_mph: Optional[float] = None,
+        min_speed_mph: float = 10.0,
+    ) -> bool:
+        """
+        Feed one MPG value from the sync cycle.
+
+        Applies the same filters as the history query (valid MPG range,
+        moving above `min_speed_mph`).
+
+        Returns:
+            True if the reading was accepted into the baseline
+        """
+        if mpg is None:
+            return False
+        if not (
+            MPGBaselineService.MIN_VALID_MPG <= mpg <= MPGBaselineService.MAX_VALID_MPG
+        ):
+            return False
+        if speed_mph is not None and speed_mph < min_speed_mph:
+            return False
+
+        with self._lock:
+            state = self._states.get(truck_id)
+            if state is None:
+                state = StreamingMPGBaseline(truck_id, self.WINDOW_DAYS)
+                self._states[truck_id] = state
+            accepted = state.add(float(mpg), _to_epoch(timestamp))
+            self._invalidate(truck_id)
+
+            self._dirty = True
+            self._update_count += 1
+            if self._update_count >= self.SAVE_INTERVAL:
+                self._auto_save()
+
+        return accepted
+
+    def rebuild_from_readings(self, truck_id: str, rows: Iterable) -> MPGBaseline:
+        """
+        Replace a truck's state from historical (mpg, timestamp) rows.
+
+        Readings older than the window are dropped, as the sync cycle would.
+        The state is stamped `rebuilt_at` so a sync process saving the same
+        file adopts it instead of overwriting it (see `save_to_file`).
+        """
+        readings = [
+            (float(mpg), _to_epoch(ts))
+            for mpg, ts in rows
+            if mpg is not None
+            and MPGBaselineService.MIN_VALID_MPG
+            <= float(mpg)
+            <= MPGBaselineService.MAX_VALID_MPG
+        ]
+        now = time.time()
+        state = StreamingMPGBaseline(truck_id, self.WINDOW_DAYS)
+        state.rebuilt_at = now
+        for mpg, ts in readings:
+            state.add(mpg, ts, now)
+
+        with self._lock:
+            self._states[truck_id] = state
+            self._invalidate(truck_id)
+            self._dirty = True
+
+        return self.get_baseline(truck_id)
+
+    def backfill_rows(self, rows: Iterable) -> int:
+        """
+        Rebuild baselines from (truck_id, mpg, timestamp) rows.
+
+        Returns:
+            Number of trucks rebuilt
+        """
+        by_truck: dict[str, list] = {}
+        for truck_id, mpg, ts in rows:
+            by_truck.setdefault(truck_id, []).append((mpg, ts))
+
+        for truck_id, readings in by_truck.items():
+            self.rebuild_from_readings(truck_id, readings)
+
+        return len(by_truck)
+
+    def backfill_from_connection(
+        self,
+        connection,
+        truck_ids: Optional[list[str]] = None,
+        days: int = None,
+        min_speed_mph: float = 10.0,
+    ) -> int:
+        """
+        Rebuild baselines from fuel_metrics with ONE query (DB-API connection).
+
+        Args:
+            connection: pymysql connection (tuple cursor)
+            truck_ids: Only rebuild these trucks (None = all with data)
+            days: History window (default and maximum WINDOW_DAYS)
+            min_speed_mph: Minimum speed to exclude idle
+
+        Returns:
+            Number of trucks rebuilt
+        """
+        days = min(days or self.WINDOW_DAYS, self.WINDOW_DAYS)
+        started = time.time()
+        params = [
+            days,
+            MPGBaselineService.MIN_VALID_MPG,
+            MPGBaselineService.MAX_VALID_MPG,
+            min_speed_mph,
+        ]
+        truck_filter = ""
+        if truck_ids is not None:
+            if not truck_ids:
+                return 0
+            truck_filter = f"AND truck_id IN ({', '.join(['%s'] * len(truck_ids))})"
+            params.extend(truck_ids)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                self.BACKFILL_QUERY.format(truck_filter=truck_filter), tuple(params)
+            )
+            rows = cursor.fetchall()
+
+        if rows and isinstance(rows[0], dict):
+            rows = [(r["truck_id"], r["mpg_current"], r["timestamp_utc"]) for r in rows]
+
+        rebuilt = self.backfill_rows(rows)
+        logger.info(
+            f"📊 MPG baseline backfill: {rebuilt} trucks from {len(rows)} rows "
+            f"in {time.time() - started:.2f}s"
+        )
+        return rebuilt
+
+    def start_background_backfill(
+        self,
+        connection_factory: Callable,
+        truck_ids: Optional[list[str]] = None,
+        days: int = None,
+        min_speed_mph: float = 10.0,
+        save: bool = True,
+    ) -> bool:
+        """
+        Run `backfill_from_connection` in a daemon thread on its own connection.
+
+        Returns:
+            False if a backfill is already running
+        """
+        if self._backfill_thread is not None and self._backfill_thread.is_alive():
+            logger.info("MPG baseline backfill already running, skipping")
+            return False
+
+        def _run():
+            connection = None
+            try:
+                connection = connection_factory()
+                self.backfill_from_connection(
+                    connection,
+                    truck_ids=truck_ids,
+                    days=days,
+                    min_speed_mph=min_speed_mph,
+                )
+                if save:
+                    self.save_to_file(self._store_file)
+            except Exception as e:
+                logger.error(f"MPG baseline backfill failed: {e}")
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+        self._backfill_thread = threading.Thread(
+            target=_run, name="mpg-baseline-backfill", daemon=True
+        )
+        self._backfill_thread.start()
+        return True
+
+    def missing_trucks(self, truck_ids: Iterable[str]) -> list[str]:
+        """Trucks that do not have enough samples in the window for a baseline"""
+        now = time.time()
+        with self._lock:
+            return [
+                t
+                for t in truck_ids
+                if t not in self._states
+                or self._states[t].raw_count(now) < MPGBaselineService.MIN_SAMPLES
+            ]
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Reads (API) - O(1)
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def get_baseline(self, truck_id: str) -> Optional[MPGBaseline]:
+        """Current baseline for a truck, or None if never seen"""
+        self._maybe_reload()
+        with self._lock:
+            self._roll_window()
+            cached = self._materialized.get(truck_id)
+            if cached is not None:
+                return cached
+            state = self._states.get(truck_id)
+            if state is None:
+                return None
+            baseline = state.to_baseline()
+            self._materialized[truck_id] = baseline
+            return baseline
+
+    def has_baseline(self, truck_id: str) -> bool:
+        """True if the truck has enough samples to be served from the store"""
+        baseline = self.get_baseline(truck_id)
+        return baseline is not None and baseline.confidence != "INSUFFICIENT"
+
+    def get_all_baselines(self) -> dict[str, MPGBaseline]:
+        """All trucks with a usable baseline"""
+        self._maybe_reload()
+        with self._lock:
+            truck_ids = list(self._states)
+        result = {}
+        for truck_id in truck_ids:
+            baseline = self.get_baseline(truck_id)
+            if baseline is not None and baseline.confidence != "INSUFFICIENT":
+                result[truck_id] = baseline
+        return result
+
+    def get_fleet_summary(self) -> dict:
+        """
+        Fleet summary in the same shape as MPGBaselineService.get_fleet_summary.
+
+        Cached until the next update, so repeated dashboard reads are O(1).
+        """
+        self._maybe_reload()
+        with self._lock:
+            self._roll_window()
+            if self._fleet_summary is not None:
+                return self._fleet_summary
+
+        baselines = list(self.get_all_baselines().values())
+        now = time.time()
+        with self._lock:
+            low_confidence = sum(
+                1
+                for s in self._states.values()
+                if 0 < s.raw_count(now) < MPGBaselineService.MIN_SAMPLES
+            )
+
+        if not baselines:
+            summary = {
+                "total_trucks": 0,
+                "avg_baseline_mpg": 5.7,
+                "trucks_high_confidence": 0,
+                "trucks_low_confidence": low_confidence,
+                "baselines": [],
+            }
+        else:
+            summary = {
+                "total_trucks": len(baselines),
+                "avg_baseline_mpg": round(
+                    sum(b.baseline_mpg for b in baselines) / len(baselines), 2
+                ),
+                "trucks_high_confidence": sum(
+                    1 for b in baselines if b.confidence in ("HIGH", "VERY_HIGH")
+                ),
+                "trucks_low_confidence": low_confidence
+                + sum(1 for b in baselines if b.confidence == "LOW"),
+                "baselines": [
+                    b.to_dict() for b in sorted(baselines, key=lambda x: x.truck_id)
+                ],
+            }
+
+        with self._lock:
+            self._fleet_summary = summary
+        return summary
+
+    def get_stats(self) -> dict:
+        """Store health for monitoring endpoints"""
+        now = time.time()
+        with self._lock:
+            return {
+                "trucks": len(self._states),
+                "ready": sum(
+                    1
+                    for s in self._states.values()
+                    if s.raw_count(now) >= MPGBaselineService.MIN_SAMPLES
+                ),
+                "window_days": self.WINDOW_DAYS,
+                "pending_updates": self._update_count,
+                "dirty": self._dirty,
+                "store_file": self._store_file,
+                "backfill_running": bool(
+                    self._backfill_thread and self._backfill_thread.is_alive()
+                ),
+            }
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Persistence
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def save_to_file(self, filepath: str = None):
+        """
+        Atomically save all states as compact JSON.
+
+        If another process replaced the file since we last read or wrote it
+        (an API-triggered backfill), its rebuilt trucks are adopted first so
+        this save doesn't overwrite them.
+        """
+        filepath = filepath or self._store_file
+        self._adopt_rebuilt(filepath)
+        with self._lock:
+            data = {
+                "version": self.STORE_VERSION,
+                "saved_at": time.time(),
+                "trucks": {t: s.to_list() for t, s in self._states.items()},
+            }
+            self._dirty = False
+            self._update_count = 0
+
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self._file_mtime = path.stat().st_mtime
+        logger.debug(f"💾 Saved MPG baseline sketches for {len(data['trucks'])} trucks")
+
+    def load_from_file(self, filepath: str = None):
+        """Load states from file (trucks in the file replace in-memory ones)"""
+        filepath = filepath or self._store_file
+        path = Path(filepath)
+        if not path.exists():
+            logger.info(f"No MPG baseline store at {filepath}, starting fresh")
+            return
+
+        try:
+            mtime = path.stat().st_mtime
+            states = self._read_states(path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load MPG baseline store: {e}")
+            return
+        if states is None:
+            logger.info(f"Old MPG baseline store format at {filepath}, rebuilding")
+            self._file_mtime = mtime
+            return
+
+        with self._lock:
+            self._states.update(states)
+            self._materialized.clear()
+            self._fleet_summary = None
+            self._file_mtime = mtime
+
+        logger.info(f"Loaded MPG baseline sketches for {len(states)} trucks")
+
+    def _read_states(self, path: Path) -> Optional[dict[str, StreamingMPGBaseline]]:
+        """States in the file, or None for an older store version"""
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != self.STORE_VERSION:
+            return None
+        return {
+            truck_id: StreamingMPGBaseline.from_list(truck_id, values, self.WINDOW_DAYS)
+            for truck_id, values in data.get("trucks", {}).items()
+        }
+
+    def _adopt_rebuilt(self, filepath: str):
+        """Take trucks another process rebuilt more recently than we did"""
+        try:
+            path = Path(filepath)
+            if not path.exists() or path.stat().st_mtime <= self._file_mtime:
+                return
+            states = self._read_states(path) or {}
+        except Exception as e:
+            logger.debug(f"Could not check MPG baseline store for rebuilds: {e}")
+            return
+
+        with self._lock:
+            adopted = 0
+            for truck_id, state in states.items():
+                ours = self._states.get(truck_id)
+                if state.rebuilt_at is not None and (
+                    ours is None
+                    or ours.rebuilt_at is None
+                    or state.rebuilt_at > ours.rebuilt_at
+                ):
+                    self._states[truck_id] = state
+                    self._invalidate(truck_id)
+                    adopted += 1
+        if adopted:
+            logger.info(f"Adopted {adopted} rebuilt MPG baselines from {filepath}")
+
+    def flush(self):
+        """Save pending updates (call at end of sync cycle / on shutdown)"""
+        if self._dirty:
+            self._auto_save()
+
+    def _auto_save(self):
+        try:
+            self.save_to_file(self._store_file)
+        except Exception as e:
+            logger.error(f"MPG baseline store auto-save failed: {e}")
+
+    def _maybe_reload(self):
+        """Pick up a newer file written by the sync process"""
+        now = time.time()
+        if now - self._last_reload_check < self.RELOAD_CHECK_SECONDS:
+            return
+        self._last_reload_check = now
+        try:
+            mtime = os.path.getmtime(self._store_file)
+        except OSError:
+            return
+        if mtime > self._file_mtime:
+            self.load_from_file(self._store_file)
+
+    def _roll_window(self):
+        """Drop cached reads once the window start moves to a new day"""
+        first_day = int((time.time() - self.WINDOW_DAYS * DAY_SECONDS) // DAY_SECONDS)
+        if first_day != self._materialized_day:
+            self._materialized.clear()
+            self._fleet_summary = None
+            self._materialized_day = first_day
+
+    def _invalidate(self, truck_id: str):
+        self._materialized.pop(truck_id, None)
+        self._fleet_summary = None
+
+
+# Global store instance
+_baseline_store: Optional[MPGBaselineStore] = None
+
+
+def get_baseline_store() -> MPGBaselineStore:
+    """Get or create global MPG baseline store"""
+    global _baseline_store
+    if _baseline_store is None:
+        _baseline_store = MPGBaselineStore()
+    return _baseline_store
+
+
+def shutdown_baseline_store():
+    """Call on service shutdown to persist pending updates"""
+    global _baseline_store
+    if _baseline_store is not None:
+        _baseline_store.flush()
+        logger.info("MPG baseline store shutdown complete")
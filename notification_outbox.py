@@ -0,0 +1,861 @@
+"""
+Notification Outbox v5.12.24
+═══════════════════════════════════════════════════════════════════════════════
+
+Durable outbox plus async dispatcher for the notifications the sync cycle
+raises (DTC / voltage / theft / sensor alerts, refuel SMS + email, FleetBooster
+fuel levels and DTCs). Those used to be sent inline, per truck: every Twilio,
+SMTP or FleetBooster call (5-10s timeouts) held up the rest of the cycle, and
+a provider outage lost the notification.
+
+Now the sync cycle only appends a row to a local SQLite table (WAL, well
+under a millisecond) and moves on. A dispatcher - an asyncio loop on its own
+thread - delivers the rows:
+
+- per-channel concurrency limits (AlertManager keeps its rate-limit state
+  unlocked, so alerts go one at a time; FleetBooster posts run in parallel)
+- batching: refuels waiting in the outbox go out as ONE digest per recipient
+  (one SMS per number, one email) instead of one message per truck
+- retries with exponential backoff when a delivery raises (or an alert
+  sender reports it sent nothing); after NOTIFICATION_MAX_ATTEMPTS a row is
+  parked as 'dead'
+- dedupe: a kind's dedupe key is ignored while an earlier row with the same
+  key that was delivered (or is being delivered) is younger than the kind's
+  window (the old per-truck refuel cooldown). A row with the same key that is
+  still waiting takes the newer payload instead, so e.g. only the newest
+  FleetBooster fuel level is sent and nothing is dropped in favour of a row
+  that may still fail
+
+Payloads are pickled, so senders receive exactly the objects the sync cycle
+queued (datetimes, dataclasses ...), as they did when called inline.
+
+Rows survive restarts: rows left 'sending' by a crashed dispatcher become
+pending again once their lease expires. Sent and dead rows are purged after
+NOTIFICATION_RETENTION_HOURS.
+
+Usage:
+    enqueue_notification("dtc", "CO0681", {"dtc_info": dtc}, dedupe_key=...)
+
+    dispatcher = get_notification_dispatcher()
+    dispatcher.start()
+    ...
+    dispatcher.stop()
+
+    get_notification_outbox().get_stats()
+
+Author: Fuel Copilot Team
+Version: 5.12.24
+"""
+
+import asyncio
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_OUTBOX_PATH = os.getenv(
+    "NOTIFICATION_OUTBOX_PATH", "data/notification_outbox.db"
+)
+# Delivery attempts before a row is parked as 'dead'
+NOTIFICATION_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "6"))
+# Backoff after the n-th failure: base * 2^(n-1), capped
+NOTIFICATION_RETRY_BASE_SECONDS = float(
+    os.getenv("NOTIFICATION_RETRY_BASE_SECONDS", "30")
+)
+NOTIFICATION_RETRY_MAX_SECONDS = float(
+    os.getenv("NOTIFICATION_RETRY_MAX_SECONDS", "1800")
+)
+# Sent / dead rows are kept this long for inspection
+NOTIFICATION_RETENTION_HOURS = float(os.getenv("NOTIFICATION_RETENTION_HOURS", "48"))
+
+# A 'sending' row whose lease ran out (dispatcher died) is retried
+LEASE_SECONDS = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    truck_id TEXT,
+    payload BLOB NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    lease_until REAL,
+    sent_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due
+    ON notification_outbox (channel, status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_outbox_dedupe
+    ON notification_outbox (dedupe_key, created_at);
+"""
+
+
+@dataclass(frozen=True)
+class NotificationKind:
+    """Where a kind of notification goes and how duplicates are handled"""
+
+    channel: str
+    # Seconds a delivered row's dedupe key blocks later rows (0 = never)
+    dedupe_seconds: float = 0
+
+
+KINDS: Dict[str, NotificationKind] = {
+    "dtc": NotificationKind("alerts", dedupe_seconds=3600),
+    "voltage": NotificationKind("alerts"),
+    "theft_confirmed": NotificationKind("alerts"),
+    "sensor_issue": NotificationKind("alerts"),
+    # 30 minute per-truck cooldown, as send_refuel_notification had
+    "refuel": NotificationKind("refuel", dedupe_seconds=1800),
+    # FleetBooster takes one fuel level per truck per minute; send the newest
+    "fb_fuel": NotificationKind("fleetbooster", dedupe_seconds=60),
+    "fb_dtc": NotificationKind("fleetbooster", dedupe_seconds=3600),
+}
+
+
+@dataclass
+class OutboxRecord:
+    id: int
+    kind: str
+    channel: str
+    truck_id: Optional[str]
+    payload: Dict[str, Any]
+    attempts: int
+    created_at: float
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OUTBOX (SQLite)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class NotificationOutbox:
+    """SQLite-backed queue of notifications waiting for delivery"""
+
+    def __init__(
+        self,
+        path: str = NOTIFICATION_OUTBOX_PATH,
+        kinds: Optional[Dict[str, NotificationKind]] = None,
+        max_attempts: int = NOTIFICATION_MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.kinds = dict(kinds or KINDS)
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Called after every accepted row (the dispatcher's wake-up)
+        self.on_enqueue: Optional[Callable[[], None]] = None
+        self._stats = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "duplicates": 0,
+            "sent": 0,
+            "retried": 0,
+            "dead": 0,
+            "enqueue_errors": 0,
+            "last_error": None,
+        }
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # One connection shared by the sync and dispatcher threads, under _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # PRODUCERS
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def enqueue(
+        self,
+        kind: str,
+        truck_id: Optional[str],
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str] = None,
+    ) -> str:
+        """
+        Store one notification. Returns 'queued', 'coalesced' or 'duplicate'.
+
+        dedupe_key defaults to "<kind>:<truck_id>" for kinds with a dedupe
+        window; kinds without one are never deduplicated. Within the window a
+        row still pending takes the new payload ('coalesced'); a row sent or
+        being sent makes this one a 'duplicate'.
+        """
+        spec = self.kinds.get(kind)
+        if spec is None:
+            raise ValueError(f"Unknown notification kind: {kind}")
+        if dedupe_key is None and spec.dedupe_seconds:
+            dedupe_key = f"{kind}:{truck_id}"
+        body = _encode_payload(payload)
+        now = self._clock()
+
+        with self._lock:
+            if dedupe_key and spec.dedupe_seconds:
+                # Dead rows never went out, so they never block a new one
+                existing = self._conn.execute(
+                    "SELECT id, status FROM notification_outbox "
+                    "WHERE dedupe_key = ? AND created_at >= ? "
+                    "AND status IN ('pending', 'sending', 'sent') "
+                    "ORDER BY id DESC LIMIT 1",
+                    (dedupe_key, now - spec.dedupe_seconds),
+                ).fetchone()
+                if existing is not None:
+                    if existing[1] == "pending":
+                        self._conn.execute(
+                            "UPDATE notification_outbox SET payload = ? WHERE id = ?",
+                            (body, existing[0]),
+                        )
+                        self._conn.commit()
+                        self._stats["coalesced"] += 1
+                        return "coalesced"
+                    self._stats["duplicates"] += 1
+                    return "duplicate"
+
+            self._conn.execute(
+                "INSERT INTO notification_outbox "
+                "(kind, channel, truck_id, payload, dedupe_key, created_at, "
+                "next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, spec.channel, truck_id, body, dedupe_key, now, now),
+            )
+            self._conn.commit()
+            self._stats["enqueued"] += 1
+
+        if self.on_enqueue is not None:
+            self.on_enqueue()
+        return "queued"
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # CONSUMER SIDE
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def claim(
+        self, channel: str, limit: int, include_waiting: bool = False
+    ) -> List[OutboxRecord]:
+        """
+        Lease up to `limit` due rows of a channel (oldest first).
+
+        include_waiting: once any row is due, also take fresh rows not yet
+        due (digests pick up everything waiting, not only what has lingered)
+        """
+        now = self._clock()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, kind, channel, truck_id, payload, attempts, created_at "
+                "FROM notification_outbox "
+                "WHERE channel = ? AND status = 'pending' AND next_attempt_at <= ? "
+                "ORDER BY id LIMIT ?",
+                (channel, now, limit),
+            ).fetchall()
+            if rows and include_waiting and len(rows) < limit:
+                rows += self._conn.execute(
+                    "SELECT id, kind, channel, truck_id, payload, attempts, created_at "
+                    "FROM notification_outbox "
+                    "WHERE channel = ? AND status = 'pending' AND attempts = 0 "
+                    "AND next_attempt_at > ? ORDER BY id LIMIT ?",
+                    (channel, now, limit - len(rows)),
+                ).fetchall()
+            if not rows:
+                return []
+            ids = [row[0] for row in rows]
+            self._conn.execute(
+                f"UPDATE notification_outbox SET status = 'sending', lease_until = ? "
+                f"WHERE id IN ({', '.join('?' * len(ids))})",
+                [now + LEASE_SECONDS, *ids],
+            )
+            self._conn.commit()
+
+        return [
+            OutboxRecord(
+                id=row[0],
+                kind=row[1],
+                channel=row[2],
+                truck_id=row[3],
+                payload=_decode_payload(row[4]),
+                attempts=row[5],
+                created_at=row[6],
+            )
+            for row in rows
+        ]
+
+    def mark_sent(self, records: List[OutboxRecord]) -> None:
+        ids = [r.id for r in records]
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE notification_outbox SET status = 'sent', sent_at = ?, "
+                f"lease_until = NULL WHERE id IN ({', '.join('?' * len(ids))})",
+                [self._clock(), *ids],
+            )
+            self._conn.commit()
+            self._stats["sent"] += len(ids)
+
+    def mark_failed(self, records: List[OutboxRecord], error: str) -> int:
+        """Schedule a retry with backoff, or park as dead. Returns rows parked."""
+        now = self._clock()
+        dead = 0
+        with self._lock:
+            for record in records:
+                attempts = record.attempts + 1
+                if attempts >= self.max_attempts:
+                    status, next_attempt = "dead", now
+                    dead += 1
+                else:
+                    status = "pending"
+                    next_attempt = now + retry_delay(attempts)
+                self._conn.execute(
+                    "UPDATE notification_outbox SET status = ?, attempts = ?, "
+                    "next_attempt_at = ?, lease_until = NULL, last_error = ? "
+                    "WHERE id = ?",
+                    (status, attempts, next_attempt, error[:500], record.id),
+                )
+            self._conn.commit()
+            self._stats["retried"] += len(records) - dead
+            self._stats["dead"] += dead
+            self._stats["last_error"] = error[:500]
+        return dead
+
+    def recover_expired_leases(self) -> int:
+        """Make rows left 'sending' by a dead dispatcher pending again"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE notification_outbox SET status = 'pending', lease_until = NULL "
+                "WHERE status = 'sending' AND lease_until < ?",
+                (self._clock(),),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def purge(self, older_than_hours: float = NOTIFICATION_RETENTION_HOURS) -> int:
+        """Delete sent and dead rows older than the retention window"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM notification_outbox "
+                "WHERE status IN ('sent', 'dead') AND created_at < ?",
+                (self._clock() - older_than_hours * 3600,),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # STATS
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """{channel: {status: rows}}"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT channel, status, COUNT(*) FROM notification_outbox "
+                "GROUP BY channel, status"
+            ).fetchall()
+        counts: Dict[str, Dict[str, int]] = {}
+        for channel, status, n in rows:
+            counts.setdefault(channel, {})[status] = n
+        return counts
+
+    def get_stats(self) -> Dict[str, Any]:
+        counts = self.counts()
+        return {
+            "path": self.path,
+            "pending": sum(c.get("pending", 0) for c in counts.values()),
+            "by_channel": counts,
+            **self._stats,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _encode_payload(payload: Dict[str, Any]) -> bytes:
+    """
+    Pickle, not JSON: senders get back the same types they got inline. The
+    outbox is a local file only this process writes, so unpickling is safe.
+    """
+    return pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_payload(stored) -> Dict[str, Any]:
+    # Rows written by the first v5.12.24 builds hold JSON text
+    if isinstance(stored, str):
+        return json.loads(stored)
+    return pickle.loads(stored)
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after the `attempts`-th failed delivery"""
+    return min(
+        NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        NOTIFICATION_RETRY_MAX_SECONDS,
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CHANNELS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@dataclass(frozen=True)
+class ChannelSpec:
+    """
+    How one channel is delivered.
+
+    deliver(records) runs in a worker thread and raises to have the whole
+    batch retried; returning means delivered (or deliberately skipped).
+    """
+
+    deliver: Callable[[List[OutboxRecord]], None]
+    # Deliveries of this channel in flight at once
+    concurrency: int = 1
+    # Rows per deliver() call (> 1 = digest)
+    batch_size: int = 1
+
+
+def _deliver_alerts(records: List[OutboxRecord]) -> None:
+    """
+    AlertManager alerts; it rate-limits and picks SMS / email itself. The
+    senders return False instead of raising, so a False from a send that was
+    attempted raises here to get the row retried. Rate-limited alerts and
+    unconfigured channels are deliberate skips - retrying can't change them.
+    """
+    import alert_service
+
+    senders = {
+        "dtc": alert_service.send_dtc_alert,
+        "voltage": alert_service.send_voltage_alert,
+        "theft_confirmed": alert_service.send_theft_confirmed_alert,
+        "sensor_issue": alert_service.send_sensor_issue_alert,
+    }
+    manager = alert_service.get_alert_manager()
+    for record in records:
+        if senders[record.kind](truck_id=record.truck_id, **record.payload):
+            continue
+        outcome = manager.last_send_outcome()
+        if outcome in ("rate_limited", "not_configured"):
+            logger.debug(f"{record.kind} alert for {record.truck_id} skipped: {outcome}")
+            continue
+        raise RuntimeError(
+            f"{record.kind} alert for {record.truck_id} not delivered ({outcome})"
+        )
+
+
+def _deliver_fleetbooster(records: List[OutboxRecord]) -> None:
+    """
+    FleetBooster pushes. Like _deliver_alerts: the integration returns False
+    instead of raising, so a failed POST raises here to get the row retried;
+    its 60s rate limit, duplicate DTCs and invalid fuel data are skips.
+    """
+    from fleetbooster_integration import (
+        last_send_outcome,
+        send_dtc_alert,
+        send_fuel_level_update,
+    )
+
+    for record in records:
+        if record.kind == "fb_fuel":
+            sent = send_fuel_level_update(truck_id=record.truck_id, **record.payload)
+        else:
+            sent = send_dtc_alert(truck_id=record.truck_id, **record.payload)
+        if sent:
+            continue
+        outcome = last_send_outcome()
+        if outcome != "failed":
+            logger.debug(f"{record.kind} push for {record.truck_id} skipped: {outcome}")
+            continue
+        raise RuntimeError(f"{record.kind} push for {record.truck_id} not delivered")
+
+
+def format_refuel_digest(records: List[OutboxRecord]) -> Tuple[str, str]:
+    """(email subject, message) for one or more refuels"""
+    lines = []
+    for record in records:
+        p = record.payload
+        when = datetime.fromisoformat(p["timestamp_utc"]).strftime("%Y-%m-%d %H:%M UTC")
+        lines.append(
+            f"Truck: {record.truck_id}\n"
+            f"Added: +{p['gallons_added']:.1f} gal\n"
+            f"Before: {p['fuel_before']:.1f}% → After: {p['fuel_after']:.1f}%\n"
+            f"Time: {when}"
+        )
+
+    if len(records) == 1:
+        p = records[0].payload
+        subject = (
+            f"⛽ Refuel Detected: {records[0].truck_id} +{p['gallons_added']:.1f} gal"
+        )
+        return subject, "⛽ REFUEL DETECTED\n" + lines[0]
+
+    total = sum(r.payload["gallons_added"] for r in records)
+    subject = f"⛽ {len(records)} Refuels Detected: +{total:.1f} gal"
+    return subject, f"⛽ {len(records)} REFUELS DETECTED\n\n" + "\n\n".join(lines)
+
+
+def _deliver_refuel_digest(records: List[OutboxRecord]) -> None:
+    """
+    One SMS per TWILIO_TO_NUMBERS recipient and one email to ALERT_TO /
+    ALERT_EMAIL_TO for every refuel waiting. Raises (retry) only when a
+    channel is configured and nothing went out.
+    """
+    subject, message = format_refuel_digest(records)
+    trucks = ", ".join(sorted({r.truck_id for r in records}))
+    attempted = sent = 0
+
+    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
+    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+    from_number = os.getenv("TWILIO_FROM_NUMBER")
+    to_numbers = [
+        n.strip() for n in os.getenv("TWILIO_TO_NUMBERS", "").split(",") if n.strip()
+    ]
+    if account_sid and auth_token and from_number and to_numbers:
+        try:
+            from twilio.rest import Client
+
+            client = Client(account_sid, auth_token)
+            for to_number in to_numbers:
+                attempted += 1
+                try:
+                    client.messages.create(
+                        body=message, from_=from_number, to=to_number
+                    )
+                    logger.info(f"📱 Refuel SMS sent to {to_number} ({trucks})")
+                    sent += 1
+                except Exception as sms_err:
+                    logger.error(f"❌ SMS failed to {to_number}: {sms_err}")
+        except ImportError:
+            logger.warning("📱 Twilio library not installed - SMS disabled")
+    else:
+        logger.debug("📱 SMS not configured (missing Twilio env vars)")
+
+    smtp_user = os.getenv("SMTP_USER")
+    smtp_pass = os.getenv("SMTP_PASS")
+    # Support both variable names
+    alert_to = os.getenv("ALERT_TO") or os.getenv("ALERT_EMAIL_TO")
+    if smtp_user and smtp_pass and alert_to:
+        import smtplib
+        from email.message import EmailMessage
+
+        attempted += 1
+        try:
+            msg = EmailMessage()
+            msg["From"] = smtp_user
+            msg["To"] = alert_to
+            msg["Subject"] = subject
+            msg.set_content(message)
+
+            with smtplib.SMTP(
+                os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+                int(os.getenv("SMTP_PORT", "587")),
+                timeout=10,
+            ) as server:
+                server.starttls()
+                server.login(smtp_user, smtp_pass)
+                server.send_message(msg)
+            logger.info(f"📧 Refuel email sent to {alert_to} ({trucks})")
+            sent += 1
+        except Exception as e:
+            logger.error(f"❌ Email notification error: {e}")
+    else:
+        logger.debug("📧 Email not configured (missing SMTP env vars)")
+
+    # Partial success is success: retrying would repeat what did go out
+    if attempted and not sent:
+        raise RuntimeError(f"Refuel digest not delivered ({trucks})")
+
+
+CHANNELS: Dict[str, ChannelSpec] = {
+    "alerts": ChannelSpec(_deliver_alerts, concurrency=1),
+    "refuel": ChannelSpec(_deliver_refuel_digest, concurrency=1, batch_size=50),
+    "fleetbooster": ChannelSpec(_deliver_fleetbooster, concurrency=4),
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DISPATCHER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class NotificationDispatcher:
+    """asyncio loop on a daemon thread delivering the outbox, channel by channel"""
+
+    def __init__(
+        self,
+        outbox: NotificationOutbox,
+        channels: Optional[Dict[str, ChannelSpec]] = None,
+        poll_seconds: float = 2.0,
+    ):
+        self.outbox = outbox
+        self.channels = dict(channels or CHANNELS)
+        self.poll_seconds = poll_seconds
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+        self._wake: Dict[str, asyncio.Event] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_purge = 0.0
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # LIFECYCLE
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def start(self) -> None:
+        """Start the dispatcher thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self._main(ready)),
+            name="notification-dispatcher",
+            daemon=True,
+        )
+        self._thread.start()
+        ready.wait(5)
+        self.outbox.on_enqueue = self.wake
+        logger.info(
+            "📬 Notification dispatcher started ("
+            + ", ".join(
+                f"{name} x{spec.concurrency}" for name, spec in self.channels.items()
+            )
+            + ")"
+        )
+
+    def stop(self, timeout: float = 15.0) -> None:
+        """Stop after the deliveries in flight; the rest stays in the outbox"""
+        self.outbox.on_enqueue = None
+        self._stopping = True
+        self.wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self) -> None:
+        """Check the outbox now instead of at the next poll (thread-safe)"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        for event in list(self._wake.values()):
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # loop closed meanwhile
+                return
+
+    async def _main(self, ready: threading.Event) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = {name: asyncio.Event() for name in self.channels}
+        workers = sum(spec.concurrency for spec in self.channels.values())
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="notify"
+        )
+        ready.set()
+        try:
+            self.outbox.recover_expired_leases()
+            await asyncio.gather(*(self._channel_loop(name) for name in self.channels))
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._loop = None
+
+    async def _channel_loop(self, name: str) -> None:
+        """Claim and deliver while there are free slots; sleep when idle"""
+        spec = self.channels[name]
+        slots = asyncio.Semaphore(spec.concurrency)
+        in_flight = set()
+
+        while not self._stopping:
+            await slots.acquire()
+            try:
+                batch = self._claim(name, spec)
+            except Exception as e:  # never let the dispatcher die
+                logger.error(f"Notification outbox claim failed ({name}): {e}")
+                batch = []
+            if not batch:
+                slots.release()
+                self._maintain()
+                await self._idle(name)
+                continue
+
+            async def run(batch=batch):
+                try:
+                    await self._deliver(name, spec, batch)
+                finally:
+                    slots.release()
+
+            task = asyncio.create_task(run())
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _idle(self, name: str) -> None:
+        event = self._wake[name]
+        try:
+            await asyncio.wait_for(event.wait(), timeout=self.poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+
+    def _claim(self, name: str, spec: ChannelSpec) -> List[OutboxRecord]:
+        return self.outbox.claim(
+            name, spec.batch_size, include_waiting=spec.batch_size > 1
+        )
+
+    async def _deliver(
+        self, name: str, spec: ChannelSpec, batch: List[OutboxRecord]
+    ) -> bool:
+        """Deliver one batch in a worker thread and record the outcome"""
+        metrics = _get_metrics()
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, spec.deliver, batch)
+        except Exception as e:
+            dead = self.outbox.mark_failed(batch, f"{type(e).__name__}: {e}")
+            logger.warning(
+                f"⚠️ Notification delivery failed ({name}, {len(batch)} row(s)"
+                f"{f', {dead} dead' if dead else ''}): {e}"
+            )
+            if metrics is not None:
+                metrics.inc(
+                    "notification_outbox_total",
+                    len(batch) - dead,
+                    labels={"channel": name, "result": "retry"},
+                )
+                if dead:
+                    metrics.inc(
+                        "notification_outbox_total",
+                        dead,
+                        labels={"channel": name, "result": "dead"},
+                    )
+            return False
+
+        self.outbox.mark_sent(batch)
+        if metrics is not None:
+            metrics.observe(
+                "notification_outbox_seconds",
+                time.perf_counter() - started,
+                labels={"channel": name},
+            )
+            metrics.inc(
+                "notification_outbox_total",
+                len(batch),
+                labels={"channel": name, "result": "sent"},
+            )
+        return True
+
+    def _maintain(self) -> None:
+        """Lease recovery and purge, at most once a minute"""
+        if time.time() - self._last_purge < 60:
+            return
+        self._last_purge = time.time()
+        try:
+            self.outbox.recover_expired_leases()
+            self.outbox.purge()
+            metrics = _get_metrics()
+            if metrics is not None:
+                metrics.set(
+                    "notification_outbox_pending", self.outbox.get_stats()["pending"]
+                )
+        except Exception as e:
+            logger.debug(f"Notification outbox maintenance failed: {e}")
+
+    async def drain(self) -> int:
+        """Deliver everything due now (in this event loop). Returns batches sent."""
+        delivered = 0
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=sum(s.concurrency for s in self.channels.values())
+            )
+        while True:
+            batches = [
+                (name, spec, batch)
+                for name, spec in self.channels.items()
+                for batch in [self._claim(name, spec)]
+                if batch
+            ]
+            if not batches:
+                return delivered
+            results = await asyncio.gather(
+                *(self._deliver(name, spec, batch) for name, spec, batch in batches)
+            )
+            delivered += sum(results)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "channels": {
+                name: {"concurrency": s.concurrency, "batch_size": s.batch_size}
+                for name, s in self.channels.items()
+            },
+            "outbox": self.outbox.get_stats(),
+        }
+
+
+def _get_metrics():
+    try:
+        from observability import get_metrics
+
+        return get_metrics()
+    except Exception:
+        return None
+
+
+# Global instances
+_outbox: Optional[NotificationOutbox] = None
+_dispatcher: Optional[NotificationDispatcher] = None
+_lock = threading.Lock()
+
+
+def get_notification_outbox() -> NotificationOutbox:
+    """Get or create the global notification outbox"""
+    global _outbox
+    if _outbox is None:
+        with _lock:
+            if _outbox is None:
+                _outbox = NotificationOutbox()
+    return _outbox
+
+
+def get_notification_dispatcher() -> NotificationDispatcher:
+    """Get or create the global dispatcher for the global outbox"""
+    global _dispatcher
+    if _dispatcher is None:
+        outbox = get_notification_outbox()
+        with _lock:
+            if _dispatcher is None:
+                _dispatcher = NotificationDispatcher(outbox)
+    return _dispatcher
+
+
+def enqueue_notification(
+    kind: str,
+    truck_id: Optional[str],
+    payload: Dict[str, Any],
+    dedupe_key: Optional[str] = None,
+) -> bool:
+    """
+    Queue a notification from the sync cycle. Never raises: a broken outbox
+    must not stop a sync cycle. Returns True if a row was queued/updated.
+    """
+    try:
+        outbox = get_notification_outbox()
+        return outbox.enqueue(kind, truck_id, payload, dedupe_key) != "duplicate"
+    except Exception as e:
+        logger.warning(f"⚠️ Could not queue {kind} notification for {truck_id}: {e}")
+        if _outbox is not None:
+            _outbox._stats["enqueue_errors"] += 1
+        return False
@@ -7,6 +7,11 @@ Provides production-grade monitoring:
 - System diagnostics
 - Alert integration
 
+🆕 v5.12.19: MetricsRegistry keeps real label sets, writes counters and
+histograms to per-thread shards merged at scrape time, and buckets with
+bisect. sync_cycle reports each stage into sync_stage_seconds{stage=...},
+API handlers into api_request_seconds{route=...} (RequestMetricsMiddleware).
+
 Author: Fuel Copilot Team
 Version: 1.0.0
 Date: November 26, 2025
@@ -15,8 +20,10 @@ Date: November 26, 2025
 import time
 import logging
 import threading
+from bisect import bisect_left
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from http.server import HTTPServer, BaseHTTPRequestHandler
@@ -39,27 +46,55 @@ class MetricType(Enum):
     SUMMARY = "summary"  # Similar to histogram, different aggregation
 
 
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label sets beyond this per metric are folded into {overflow="true"} so a
+# bad label (raw URL, truck_id on a hot path) can't grow memory without bound
+MAX_SERIES_PER_METRIC = 500
+_OVERFLOW_KEY = (("overflow", "true"),)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [
+        '{}="{}"'.format(
+            k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for k, v in key
+    ]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
 @dataclass
 class Metric:
-    """Single metric with labels"""
+    """Metric family: name, type and histogram buckets (values live in shards)"""
 
     name: str
     type: MetricType
     help: str
-    value: float = 0.0
-    labels: Dict[str, str] = field(default_factory=dict)
-
-    # For histograms
     buckets: List[float] = field(default_factory=list)
-    bucket_counts: Dict[float, int] = field(default_factory=dict)
-    sum: float = 0.0
-    count: int = 0
+    # Label sets seen so far (bounded by MAX_SERIES_PER_METRIC)
+    series: set = field(default_factory=set)
 
 
 class MetricsRegistry:
     """
     Prometheus-compatible metrics registry
 
+    Counters and histograms are written to a per-thread shard (no lock on the
+    hot path) and merged when scraped; gauges are last-write-wins and keep a
+    single locked value per label set. Histogram buckets are found with
+    bisect and stored non-cumulative, so observe() is O(log buckets).
+
     Usage:
         metrics = MetricsRegistry()
 
@@ -74,138 +109,371 @@ class MetricsRegistry:
         # Histogram
         metrics.histogram("processing_seconds", "Processing time",
                          buckets=[0.1, 0.5, 1.0, 5.0])
-        metrics.observe("processing_seconds", 0.234)
+        metrics.observe("processing_seconds", 0.234, labels={"stage": "kalman"})
+        metrics.quantile("processing_seconds", 0.95, labels={"stage": "kalman"})
+
+        # Timing
+        with metrics.time("processing_seconds", {"stage": "db_write"}):
+            ...
     """
 
     def __init__(self, prefix: str = "fuel_copilot"):
         self.prefix = prefix
         self._metrics: Dict[str, Metric] = {}
         self._lock = threading.Lock()
+        self._local = threading.local()
+        # (owning thread, shard); shards of finished threads fold into _retired
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
 
     def _full_name(self, name: str) -> str:
         """Get full metric name with prefix"""
         return f"{self.prefix}_{name}"
 
-    def counter(self, name: str, help: str):
-        """Register a counter metric"""
+    def _register(self, name: str, type: MetricType, help: str, buckets=()):
         full_name = self._full_name(name)
         with self._lock:
             if full_name not in self._metrics:
                 self._metrics[full_name] = Metric(
-                    name=full_name,
-                    type=MetricType.COUNTER,
-                    help=help,
+                    name=full_name, type=type, help=help, buckets=sorted(buckets)
                 )
 
+    def counter(self, name: str, help: str):
+        """Register a counter metric"""
+        self._register(name, MetricType.COUNTER, help)
+
     def gauge(self, name: str, help: str):
         """Register a gauge metric"""
-        full_name = self._full_name(name)
-        with self._lock:
-            if full_name not in self._metrics:
-                self._metrics[full_name] = Metric(
-                    name=full_name,
-                    type=MetricType.GAUGE,
-                    help=help,
-                )
+        self._register(name, MetricType.GAUGE, help)
 
     def histogram(self, name: str, help: str, buckets: List[float] = None):
         """Register a histogram metric"""
-        full_name = self._full_name(name)
-        if buckets is None:
-            buckets = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+        self._register(
+            name,
+            MetricType.HISTOGRAM,
+            help,
+            DEFAULT_BUCKETS if buckets is None else buckets,
+        )
 
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _series_key(self, metric: Metric, labels: Optional[Dict[str, str]]):
+        key = _label_key(labels)
+        if key in metric.series:
+            return key
         with self._lock:
-            if full_name not in self._metrics:
-                self._metrics[full_name] = Metric(
-                    name=full_name,
-                    type=MetricType.HISTOGRAM,
-                    help=help,
-                    buckets=sorted(buckets),
-                    bucket_counts={b: 0 for b in buckets},
-                )
+            if key not in metric.series:
+                if len(metric.series) >= MAX_SERIES_PER_METRIC:
+                    key = _OVERFLOW_KEY
+                metric.series.add(key)
+        return key
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _add(self, name: str, value: float, labels: Optional[Dict[str, str]]):
+        metric = self._metrics.get(self._full_name(name))
+        if metric is None or metric.type is MetricType.HISTOGRAM:
+            return
+        key = (metric.name, self._series_key(metric, labels))
+        if metric.type is MetricType.COUNTER:
+            # Only this thread writes its shard, so read-modify-write is safe
+            shard = self._shard()
+            shard[key] = shard.get(key, 0.0) + value
+        else:
+            with self._lock:
+                self._gauges[key] = self._gauges.get(key, 0.0) + value
 
     def inc(self, name: str, value: float = 1.0, labels: Dict[str, str] = None):
-        """Increment a counter"""
-        full_name = self._full_name(name)
-        with self._lock:
-            if full_name in self._metrics:
-                self._metrics[full_name].value += value
+        """Increment a counter (or gauge)"""
+        self._add(name, value, labels)
 
-    def dec(self, name: str, value: float = 1.0):
+    def dec(self, name: str, value: float = 1.0, labels: Dict[str, str] = None):
         """Decrement a gauge"""
-        full_name = self._full_name(name)
-        with self._lock:
-            if full_name in self._metrics:
-                self._metrics[full_name].value -= value
+        self._add(name, -value, labels)
 
-    def set(self, name: str, value: float):
+    def set(self, name: str, value: float, labels: Dict[str, str] = None):
         """Set a gauge value"""
-        full_name = self._full_name(name)
+        metric = self._metrics.get(self._full_name(name))
+        if metric is None or metric.type is not MetricType.GAUGE:
+            return
+        key = (metric.name, self._series_key(metric, labels))
         with self._lock:
-            if full_name in self._metrics:
-                self._metrics[full_name].value = value
+            self._gauges[key] = value
 
-    def observe(self, name: str, value: float):
+    def observe(self, name: str, value: float, labels: Dict[str, str] = None):
         """Observe a value for histogram"""
-        full_name = self._full_name(name)
-        with self._lock:
-            if full_name in self._metrics:
-                metric = self._metrics[full_name]
-                metric.sum += value
-                metric.count += 1
+        metric = self._metrics.get(self._full_name(name))
+        if metric is None or metric.type is not MetricType.HISTOGRAM:
+            return
+        key = (metric.name, self._series_key(metric, labels))
+        shard = self._shard()
+        cells = shard.get(key)
+        if cells is None:
+            # per-bucket counts (last one is +Inf), then the sum
+            cells = shard[key] = [0] * (len(metric.buckets) + 1) + [0.0]
+        cells[bisect_left(metric.buckets, value)] += 1
+        cells[-1] += value
+
+    @contextmanager
+    def time(self, name: str, labels: Dict[str, str] = None):
+        """Observe the wall time of a block into histogram `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def stage_timer(self, name: str, **labels: str) -> "StageTimer":
+        """Lap timer observing consecutive pipeline stages into `name`"""
+        return StageTimer(self, name, labels)
+
+    # ------------------------------------------------------------------
+    # Scrape
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _merge_into(target: dict, shard: dict) -> None:
+        for key, value in shard.items():
+            if isinstance(value, list):
+                cells = target.get(key)
+                if cells is None:
+                    target[key] = list(value)
+                else:
+                    for i, v in enumerate(value):
+                        cells[i] += v
+            else:
+                target[key] = target.get(key, 0.0) + value
 
-                for bucket in metric.buckets:
-                    if value <= bucket:
-                        metric.bucket_counts[bucket] += 1
+    def _snapshot(self) -> Tuple[dict, Dict[Tuple[str, LabelKey], float]]:
+        """Merged counter/histogram values and a copy of the gauges"""
+        merged: dict = {}
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._merge_into(self._retired, shard)
+            self._shards = live
+            self._merge_into(merged, self._retired)
+            for _, shard in live:
+                # dict.copy() is atomic under the GIL
+                self._merge_into(merged, shard.copy())
+            gauges = dict(self._gauges)
+        return merged, gauges
+
+    def _series(self, metric: Metric, merged: dict, gauges: dict):
+        """(label key, value or cells) per series; one zero series if none yet"""
+        source = gauges if metric.type is MetricType.GAUGE else merged
+        series = sorted(
+            (key[1], value) for key, value in source.items() if key[0] == metric.name
+        )
+        if series:
+            return series
+        if metric.type is MetricType.HISTOGRAM:
+            return [((), [0] * (len(metric.buckets) + 1) + [0.0])]
+        return [((), 0.0)]
+
+    @staticmethod
+    def _estimate_quantile(buckets: List[float], cells: list, q: float) -> float:
+        """Linear interpolation inside the bucket holding rank q (like
+        Prometheus histogram_quantile); +Inf observations clamp to the top
+        finite bucket"""
+        total = sum(cells[:-1])
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(cells[:-1]):
+            if count and seen + count >= rank:
+                if i == len(buckets):
+                    return buckets[-1] if buckets else 0.0
+                lower = buckets[i - 1] if i else 0.0
+                return lower + (buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return buckets[-1] if buckets else 0.0
+
+    def quantile(
+        self, name: str, q: float, labels: Dict[str, str] = None
+    ) -> Optional[float]:
+        """Estimated q-quantile of a histogram series (None if unknown)"""
+        metric = self._metrics.get(self._full_name(name))
+        if metric is None or metric.type is not MetricType.HISTOGRAM:
+            return None
+        merged, _ = self._snapshot()
+        cells = merged.get((metric.name, _label_key(labels)))
+        if cells is None:
+            return None
+        return self._estimate_quantile(metric.buckets, cells, q)
+
+    def _histogram_json(self, metric: Metric, cells: list) -> Dict:
+        cumulative = 0
+        buckets = {}
+        for bucket, count in zip(metric.buckets, cells):
+            cumulative += count
+            buckets[bucket] = cumulative
+        return {
+            "sum": cells[-1],
+            "count": sum(cells[:-1]),
+            "buckets": buckets,
+            "p50": self._estimate_quantile(metric.buckets, cells, 0.50),
+            "p95": self._estimate_quantile(metric.buckets, cells, 0.95),
+            "p99": self._estimate_quantile(metric.buckets, cells, 0.99),
+        }
 
-    def get_prometheus_format(self) -> str:
-        """Export metrics in Prometheus format"""
+    def summary(self, name: str) -> List[Dict]:
+        """count/sum/p50/p95/p99 for every series of histogram `name`"""
+        metric = self._metrics.get(self._full_name(name))
+        if metric is None or metric.type is not MetricType.HISTOGRAM:
+            return []
+        merged, _ = self._snapshot()
+        rows = []
+        for key, cells in self._series(metric, merged, {}):
+            stats = self._histogram_json(metric, cells)
+            del stats["buckets"]
+            rows.append({"labels": dict(key), **stats})
+        return rows
+
+    def get_prometheus_format(self, names: List[str] = None) -> str:
+        """Export metrics in Prometheus format (optionally only `names`)"""
         lines = []
+        merged, gauges = self._snapshot()
+        wanted = None if names is None else {self._full_name(n) for n in names}
 
-        with self._lock:
-            for metric in self._metrics.values():
-                # Help and type
-                lines.append(f"# HELP {metric.name} {metric.help}")
-                lines.append(f"# TYPE {metric.name} {metric.type.value}")
+        for metric in list(self._metrics.values()):
+            if wanted is not None and metric.name not in wanted:
+                continue
+            # Help and type
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type.value}")
 
+            for key, value in self._series(metric, merged, gauges):
                 if metric.type == MetricType.HISTOGRAM:
-                    # Histogram buckets
-                    for bucket in metric.buckets:
-                        count = metric.bucket_counts.get(bucket, 0)
-                        lines.append(f'{metric.name}_bucket{{le="{bucket}"}} {count}')
-                    lines.append(f'{metric.name}_bucket{{le="+Inf"}} {metric.count}')
-                    lines.append(f"{metric.name}_sum {metric.sum}")
-                    lines.append(f"{metric.name}_count {metric.count}")
+                    # Histogram buckets (cumulative)
+                    cumulative = 0
+                    for bucket, count in zip(metric.buckets, value):
+                        cumulative += count
+                        labels = _format_labels(key, f'le="{bucket}"')
+                        lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+                    count = cumulative + value[-2]
+                    labels = _format_labels(key, 'le="+Inf"')
+                    lines.append(f"{metric.name}_bucket{labels} {count}")
+                    lines.append(f"{metric.name}_sum{_format_labels(key)} {value[-1]}")
+                    lines.append(f"{metric.name}_count{_format_labels(key)} {count}")
                 else:
                     # Counter or Gauge
-                    lines.append(f"{metric.name} {metric.value}")
+                    lines.append(f"{metric.name}{_format_labels(key)} {value}")
 
-                lines.append("")
+            lines.append("")
 
         return "\n".join(lines)
 
     def get_json_format(self) -> Dict:
-        """Export metrics as JSON"""
+        """Export metrics as JSON (histograms include p50/p95/p99)"""
         result = {}
+        merged, gauges = self._snapshot()
 
-        with self._lock:
-            for name, metric in self._metrics.items():
-                if metric.type == MetricType.HISTOGRAM:
-                    result[name] = {
-                        "type": "histogram",
-                        "sum": metric.sum,
-                        "count": metric.count,
-                        "buckets": metric.bucket_counts,
-                    }
-                else:
-                    result[name] = {
-                        "type": metric.type.value,
-                        "value": metric.value,
-                    }
+        for name, metric in list(self._metrics.items()):
+            series = self._series(metric, merged, gauges)
+            if metric.type == MetricType.HISTOGRAM:
+                values = [(key, self._histogram_json(metric, v)) for key, v in series]
+            else:
+                values = [(key, {"value": v}) for key, v in series]
+
+            if len(values) == 1 and values[0][0] == ():
+                result[name] = {"type": metric.type.value, **values[0][1]}
+            else:
+                result[name] = {
+                    "type": metric.type.value,
+                    "series": [{"labels": dict(key), **v} for key, v in values],
+                }
 
         return result
 
 
+class StageTimer:
+    """
+    Laps through a pipeline: each lap(stage) observes the time since the
+    previous lap (or restart) into one histogram labeled by stage.
+
+    Usage:
+        laps = metrics.stage_timer("sync_stage_seconds")
+        for truck in trucks:
+            laps.restart()
+            fetch(truck)
+            laps.lap("fetch")
+            save(truck)
+            laps.lap("db_write")
+    """
+
+    def __init__(self, registry: MetricsRegistry, name: str, labels: Dict[str, str]):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.totals: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def restart(self) -> None:
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> float:
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self.registry.observe(self.name, elapsed, {**self.labels, "stage": stage})
+        self.totals[stage] = self.totals.get(stage, 0.0) + elapsed
+        return elapsed
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware: api_request_seconds / api_requests_total per route.
+
+    Labels use the matched route template (/trucks/{truck_id}), not the raw
+    path, so series stay bounded.
+
+    Usage:
+        app.add_middleware(RequestMetricsMiddleware)
+    """
+
+    def __init__(self, app, metrics: MetricsRegistry = None):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics = self.metrics or get_metrics()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            labels = {"method": scope.get("method", ""), "route": route}
+            metrics.observe("api_request_seconds", time.perf_counter() - start, labels)
+            metrics.inc("api_requests_total", labels={**labels, "status": str(status)})
+
+
 # ============================================================================
 # HEALTH CHECKS
 # ============================================================================
@@ -339,6 +607,8 @@ class ObservabilityHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         if self.path == "/metrics":
             self._handle_metrics()
+        elif self.path == "/metrics/json":
+            self._handle_metrics_json()
         elif self.path == "/health":
             self._handle_health()
         elif self.path == "/health/live":
@@ -359,6 +629,17 @@ class ObservabilityHandler(BaseHTTPRequestHandler):
         else:
             self.send_error(503, "Metrics not available")
 
+    def _handle_metrics_json(self):
+        """Handle /metrics/json endpoint (histograms with p50/p95/p99)"""
+        if self.metrics_registry:
+            content = json.dumps(self.metrics_registry.get_json_format(), default=str)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(content.encode())
+        else:
+            self.send_error(503, "Metrics not available")
+
     def _handle_health(self):
         """Handle /health endpoint (full report)"""
         if self.health_checker:
@@ -408,6 +689,7 @@ class ObservabilityServer:
 
     Provides:
     - GET /metrics - Prometheus metrics
+    - GET /metrics/json - Metrics as JSON, histograms with p50/p95/p99
     - GET /health - Full health report
     - GET /health/live - Liveness probe
     - GET /health/ready - Readiness probe
@@ -553,6 +835,44 @@ _metrics.gauge("refuels_last_gallons", "Gallons in last refuel")
 _metrics.counter("mysql_retries_total", "Total MySQL retry attempts")
 _metrics.counter("mysql_failures_total", "Total MySQL failures")
 
+# 🆕 v5.12.19: Per-stage sync timings, notification delivery and API latency
+SYNC_STAGE_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+_metrics.histogram(
+    "sync_stage_seconds",
+    "Sync cycle time per stage (per truck for truck stages)",
+    buckets=SYNC_STAGE_BUCKETS,
+)
+_metrics.histogram(
+    "sync_cycle_seconds",
+    "Full sync cycle time",
+    buckets=[1.0, 2.5, 5.0, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0],
+)
+_metrics.histogram("notification_seconds", "Alert delivery time per channel")
+_metrics.counter("notifications_total", "Alert deliveries by channel and result")
+_metrics.histogram("api_request_seconds", "API handler latency by route")
+_metrics.counter("api_requests_total", "API requests by route and status")
+
+# 🆕 v5.12.24: Notification outbox (sync-cycle notifications delivered async)
+_metrics.counter("notification_outbox_total", "Outbox deliveries by channel and result")
+_metrics.histogram("notification_outbox_seconds", "Outbox delivery time per batch")
+_metrics.gauge("notification_outbox_pending", "Notifications waiting in the outbox")
+
 
 def get_metrics() -> MetricsRegistry:
     """Get global metrics registry"""
@@ -19,10 +19,13 @@ Usage:
     python partition_fuel_metrics.py --dry-run    # Preview changes
     python partition_fuel_metrics.py --execute    # Apply changes
     python partition_fuel_metrics.py --status     # Check partition status
+    python partition_fuel_metrics.py --maintain   # Create upcoming / archive expired
+                                                  # partitions once (partition_manager)
 """
 
 import os
 import sys
+import json
 import argparse
 import logging
 from datetime import datetime, timedelta
@@ -351,10 +354,17 @@ def main():
         "--status", action="store_true", help="Show current partition status"
     )
     parser.add_argument("--add-partition", type=str, help="Add partition for YYYY-MM")
+    parser.add_argument(
+        "--maintain",
+        action="store_true",
+        help="Run one partition_manager cycle (pre-create + archive/drop)",
+    )
 
     args = parser.parse_args()
 
-    if not any([args.dry_run, args.execute, args.status, args.add_partition]):
+    if not any(
+        [args.dry_run, args.execute, args.status, args.add_partition, args.maintain]
+    ):
         parser.print_help()
         return
 
@@ -364,7 +374,17 @@ def main():
         sys.exit(1)
 
     try:
-        if args.status:
+        if args.maintain:
+            # 🆕 v5.12.17: Same cycle the API runs on a timer
+            from contextlib import nullcontext
+
+            from partition_manager import PartitionManager
+
+            summary = PartitionManager(connect=lambda: nullcontext(conn)).run_cycle()
+            conn.commit()
+            print(json.dumps(summary, indent=2))
+
+        elif args.status:
             status = check_current_partitions(conn)
             print("\n" + "=" * 60)
             print("FUEL_METRICS TABLE STATUS")
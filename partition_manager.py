@@ -0,0 +1,722 @@
+"""
+Partition Manager v5.12.17
+═══════════════════════════════════════════════════════════════════════════════
+
+Scheduled partition lifecycle and cold-data archival for fuel_metrics.
+
+partition_fuel_metrics.py / migrations/partition_fuel_metrics_v3_12_21.sql
+partition the table by month but only print the SQL for adding or dropping
+partitions. This module runs that lifecycle on a timer:
+
+    1. Pre-create monthly partitions `months_ahead` months into the future
+       (the MAXVALUE catch-all is reorganized, so rows never pile up in it)
+    2. Partitions older than `retention_months` are streamed to a compressed
+       Parquet file (zstd, one file per partition) and the row count is
+       verified
+    3. Only with PARTITION_DROP_ENABLED=true and an absolute
+       FUEL_METRICS_ARCHIVE_DIR is the verified partition then dropped;
+       otherwise it is archived once and kept in MySQL
+    4. Every archived partition is recorded in manifest.json
+
+The scheduler itself is opt-in (PARTITION_MANAGER_ENABLED, see
+lifecycle_manager).
+
+Readers do not need to know where a row lives: with_archived() appends the
+archived rows for the part of a requested range that is older than the
+archive horizon (read_archived() returns just those rows). Endpoints capped
+below the retention window never touch the archive; long-range
+history/exports get the same columns either way.
+
+Both partition layouts in the tree are supported:
+    RANGE COLUMNS(timestamp_utc)  p202512    (partition_fuel_metrics.py)
+    RANGE (TO_DAYS(timestamp_utc)) p_2025_12 (v3.12.21 migration)
+
+Only one process runs a cycle at a time (MySQL GET_LOCK), so every API
+worker can start the scheduler.
+
+Usage:
+    from partition_manager import get_partition_manager, with_archived
+
+    get_partition_manager().start(interval_seconds=24 * 3600)
+    df = with_archived(df, start, end, columns, truck_ids=["CO0681"])
+
+Author: Fuel Copilot Team
+Version: 5.12.17
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pymysql
+from pymysql.constants import FIELD_TYPE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TABLE = "fuel_metrics"
+ARCHIVE_DIR = Path(os.getenv("FUEL_METRICS_ARCHIVE_DIR", "data/archive/fuel_metrics"))
+# DROP PARTITION is irreversible: off unless explicitly enabled
+DROP_ENABLED = os.getenv("PARTITION_DROP_ENABLED", "false").lower() in ("1", "true", "yes")
+MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+RETENTION_MONTHS = int(os.getenv("FUEL_METRICS_RETENTION_MONTHS", "12"))
+ARCHIVE_BATCH_ROWS = 50_000
+LOCK_NAME = "fuel_copilot_partition_manager"
+
+_UNDERSCORE_NAME = re.compile(r"^p_\d{4}_\d{2}$")
+_INT_TYPES = {
+    FIELD_TYPE.TINY,
+    FIELD_TYPE.SHORT,
+    FIELD_TYPE.LONG,
+    FIELD_TYPE.LONGLONG,
+    FIELD_TYPE.INT24,
+    FIELD_TYPE.YEAR,
+}
+_FLOAT_TYPES = {
+    FIELD_TYPE.FLOAT,
+    FIELD_TYPE.DOUBLE,
+    FIELD_TYPE.DECIMAL,
+    FIELD_TYPE.NEWDECIMAL,
+}
+_DATETIME_TYPES = {FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP}
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` after day's month"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """fuel_metrics stores naive UTC timestamps"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PARTITION LAYOUT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One fuel_metrics partition (upper is None for the MAXVALUE catch-all)"""
+
+    name: str
+    upper: Optional[date]
+    rows: int = 0
+
+
+@dataclass(frozen=True)
+class PartitionLayout:
+    """How the existing partitions are named and bounded"""
+
+    range_columns: bool
+    underscore_names: bool
+
+    @classmethod
+    def detect(cls, method: str, names: Sequence[str]) -> "PartitionLayout":
+        return cls(
+            range_columns=method.upper().startswith("RANGE COLUMNS"),
+            underscore_names=any(_UNDERSCORE_NAME.match(n) for n in names),
+        )
+
+    def name(self, month: date) -> str:
+        if self.underscore_names:
+            return f"p_{month.year}_{month.month:02d}"
+        return f"p{month.year}{month.month:02d}"
+
+    def bound(self, upper: date) -> str:
+        if self.range_columns:
+            return f"'{upper.isoformat()}'"
+        return f"TO_DAYS('{upper.isoformat()}')"
+
+    def parse_bound(self, description: Optional[str]) -> Optional[date]:
+        if description is None or description.upper() == "MAXVALUE":
+            return None
+        text = description.strip().strip("'")
+        if self.range_columns:
+            return date.fromisoformat(text[:10])
+        # TO_DAYS('0001-01-01') = 366
+        return date.fromordinal(int(text) - 365)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ARCHIVE (manifest + Parquet reads)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class FuelMetricsArchive:
+    """Parquet files of dropped partitions, indexed by manifest.json"""
+
+    def __init__(self, directory: Path = ARCHIVE_DIR, table: str = TABLE):
+        self.directory = Path(directory)
+        self.table = table
+        self._lock = threading.Lock()
+        self._entries: List[Dict[str, Any]] = []
+        self._mtime: Optional[float] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / "manifest.json"
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Archived partitions (re-read when another process updates the manifest)"""
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            return []
+        with self._lock:
+            if mtime != self._mtime:
+                with open(self.manifest_path) as f:
+                    self._entries = json.load(f)["entries"]
+                self._mtime = mtime
+            return list(self._entries)
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        """Add or replace the manifest entry for entry["partition"]"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = [
+            e for e in self.entries() if e["partition"] != entry["partition"]
+        ] + [entry]
+        entries.sort(key=lambda e: e["end"])
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"table": self.table, "entries": entries}, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+        with self._lock:
+            self._entries = entries
+            self._mtime = self.manifest_path.stat().st_mtime
+
+    def horizon(self) -> Optional[datetime]:
+        """Rows older than this live in the archive, not in MySQL"""
+        ends = [e["end"] for e in self.entries() if e.get("dropped")]
+        return datetime.fromisoformat(max(ends)) if ends else None
+
+    def read_range(
+        self,
+        start: datetime,
+        end: datetime,
+        columns: Optional[Sequence[str]] = None,
+        truck_ids: Optional[Sequence[str]] = None,
+        carrier_id: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Archived rows with start <= timestamp_utc <= end"""
+        start, end = _naive_utc(start), _naive_utc(end)
+        frames = []
+        for entry in self.entries():
+            if not entry.get("dropped"):
+                continue
+            lower = entry.get("start")
+            if datetime.fromisoformat(entry["end"]) <= start or (
+                lower and datetime.fromisoformat(lower) > end
+            ):
+                continue
+            path = self.directory / entry["file"]
+            available = set(pq.read_schema(path).names)
+            filters = [
+                ("timestamp_utc", ">=", pd.Timestamp(start)),
+                ("timestamp_utc", "<=", pd.Timestamp(end)),
+            ]
+            if truck_ids is not None:
+                filters.append(("truck_id", "in", list(truck_ids)))
+            if carrier_id and carrier_id != "*" and "carrier_id" in available:
+                filters.append(("carrier_id", "=", carrier_id))
+            wanted = (
+                [c for c in columns if c in available] if columns is not None else None
+            )
+            table = pq.read_table(path, columns=wanted, filters=filters)
+            frames.append(table.to_pandas())
+
+        if not frames:
+            return pd.DataFrame(columns=list(columns) if columns is not None else [])
+        df = pd.concat(frames, ignore_index=True)
+        # Columns added after a partition was archived come back as NaN
+        return df.reindex(columns=list(columns)) if columns is not None else df
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self.entries()
+        horizon = self.horizon()
+        return {
+            "directory": str(self.directory),
+            "partitions": len(entries),
+            "rows": sum(e["rows"] for e in entries),
+            "bytes": sum(e["bytes"] for e in entries),
+            "horizon": horizon.isoformat() if horizon else None,
+        }
+
+
+_archive: Optional[FuelMetricsArchive] = None
+_warned_missing_parquet = False
+
+
+def get_archive() -> FuelMetricsArchive:
+    global _archive
+    if _archive is None:
+        _archive = FuelMetricsArchive()
+    return _archive
+
+
+def reaches_archive(start: datetime) -> bool:
+    """True when rows at/after start may be in the archive instead of MySQL"""
+    horizon = get_archive().horizon()
+    return horizon is not None and _naive_utc(start) < horizon
+
+
+def read_archived(
+    start: datetime,
+    end: datetime,
+    columns: Sequence[str],
+    truck_ids: Optional[Sequence[str]] = None,
+    carrier_id: Optional[str] = None,
+) -> pd.DataFrame:
+    """Archived fuel_metrics rows of [start, end] (empty if none or unreadable)"""
+    global _warned_missing_parquet
+
+    if not reaches_archive(start):
+        return pd.DataFrame(columns=list(columns))
+    if not PARQUET_AVAILABLE:
+        if not _warned_missing_parquet:
+            logger.warning(
+                "⚠️ pyarrow not installed - archived fuel_metrics ranges are not readable"
+            )
+            _warned_missing_parquet = True
+        return pd.DataFrame(columns=list(columns))
+
+    archive = get_archive()
+    return archive.read_range(
+        start, min(_naive_utc(end), archive.horizon()), columns, truck_ids, carrier_id
+    )
+
+
+def with_archived(
+    df: pd.DataFrame,
+    start: datetime,
+    end: datetime,
+    columns: Sequence[str],
+    truck_ids: Optional[Sequence[str]] = None,
+    carrier_id: Optional[str] = None,
+    descending: bool = False,
+    limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Append archived fuel_metrics rows to a MySQL result for the same range.
+
+    `df` is what the hot table returned for [start, end]; when start is older
+    than the archive horizon, the archived rows for [start, horizon) are
+    added and the result is re-sorted by timestamp_utc. Otherwise df is
+    returned unchanged.
+    """
+    if not reaches_archive(start):
+        return df
+    archived = read_archived(start, end, columns, truck_ids, carrier_id)
+    if archived.empty:
+        return df
+
+    frames = [f for f in (archived, df) if not f.empty]
+    merged = pd.concat(frames, ignore_index=True)
+    if "timestamp_utc" in merged.columns:
+        merged["timestamp_utc"] = pd.to_datetime(merged["timestamp_utc"])
+        merged = merged.sort_values(
+            "timestamp_utc", ascending=not descending, kind="stable"
+        ).reset_index(drop=True)
+    if limit is not None:
+        merged = merged.head(limit)
+    return merged
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PARTITION MANAGER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _default_connection() -> ContextManager:
+    from connection_manager import LOCAL, get_connection_manager
+
+    return get_connection_manager().connection(LOCAL)
+
+
+def _arrow_column(field_type: int):
+    """(arrow type, value converter) for a pymysql result column"""
+    if field_type in _INT_TYPES:
+        return pa.int64(), None
+    if field_type in _FLOAT_TYPES:
+        return pa.float64(), float
+    if field_type in _DATETIME_TYPES:
+        return pa.timestamp("us"), None
+    if field_type == FIELD_TYPE.DATE:
+        return pa.date32(), None
+    return pa.string(), lambda v: (
+        v.decode("utf-8", "replace") if isinstance(v, bytes) else str(v)
+    )
+
+
+class PartitionManager:
+    """Keeps fuel_metrics partitions ahead of time and archives expired ones"""
+
+    def __init__(
+        self,
+        connect: Callable[[], ContextManager] = _default_connection,
+        archive: Optional[FuelMetricsArchive] = None,
+        table: str = TABLE,
+        months_ahead: int = MONTHS_AHEAD,
+        retention_months: int = RETENTION_MONTHS,
+        batch_rows: int = ARCHIVE_BATCH_ROWS,
+        drop_expired: bool = DROP_ENABLED,
+    ):
+        self._connect = connect
+        self.archive = archive or get_archive()
+        self.table = table
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.batch_rows = batch_rows
+        self.drop_expired = drop_expired
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def list_partitions(self, conn) -> Tuple[PartitionLayout, List[Partition]]:
+        """Current partitions in bound order (empty if the table is not partitioned)"""
+        with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute(
+                """
+                SELECT PARTITION_NAME, PARTITION_METHOD, PARTITION_DESCRIPTION,
+                       TABLE_ROWS
+                FROM INFORMATION_SCHEMA.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE()
+                  AND TABLE_NAME = %s
+                  AND PARTITION_NAME IS NOT NULL
+                ORDER BY PARTITION_ORDINAL_POSITION
+                """,
+                (self.table,),
+            )
+            rows = cursor.fetchall()
+
+        if not rows:
+            return PartitionLayout(range_columns=True, underscore_names=False), []
+        layout = PartitionLayout.detect(
+            rows[0]["PARTITION_METHOD"], [r["PARTITION_NAME"] for r in rows]
+        )
+        return layout, [
+            Partition(
+                name=r["PARTITION_NAME"],
+                upper=layout.parse_bound(r["PARTITION_DESCRIPTION"]),
+                rows=int(r["TABLE_ROWS"] or 0),
+            )
+            for r in rows
+        ]
+
+    def expired_partitions(
+        self, partitions: List[Partition], today: date
+    ) -> List[Tuple[Partition, Optional[date]]]:
+        """(partition, lower bound) pairs entirely older than the retention window"""
+        cutoff = add_months(month_start(today), -self.retention_months)
+        expired = []
+        lower = None
+        for partition in partitions:
+            if partition.upper is None or partition.upper > cutoff:
+                break
+            expired.append((partition, lower))
+            lower = partition.upper
+        return expired
+
+    # ------------------------------------------------------------------
+    # DDL
+    # ------------------------------------------------------------------
+
+    def future_partitions_sql(
+        self, layout: PartitionLayout, partitions: List[Partition], today: date
+    ) -> Tuple[Optional[str], List[str]]:
+        """ALTER statement creating the missing monthly partitions, and their names"""
+        bounded = [p.upper for p in partitions if p.upper is not None]
+        catch_all = next((p for p in partitions if p.upper is None), None)
+        target = add_months(month_start(today), self.months_ahead + 1)
+        month = max(bounded) if bounded else month_start(today)
+
+        defs, names = [], []
+        while month < target:
+            upper = add_months(month, 1)
+            names.append(layout.name(month))
+            defs.append(
+                f"PARTITION {names[-1]} VALUES LESS THAN ({layout.bound(upper)})"
+            )
+            month = upper
+        if not defs:
+            return None, []
+
+        if catch_all is None:
+            return (
+                f"ALTER TABLE {self.table} ADD PARTITION ({', '.join(defs)})",
+                names,
+            )
+        defs.append(f"PARTITION {catch_all.name} VALUES LESS THAN MAXVALUE")
+        return (
+            f"ALTER TABLE {self.table} REORGANIZE PARTITION {catch_all.name} "
+            f"INTO ({', '.join(defs)})",
+            names,
+        )
+
+    def ensure_future_partitions(
+        self,
+        conn,
+        today: date,
+        layout: PartitionLayout,
+        partitions: List[Partition],
+    ) -> List[str]:
+        sql, names = self.future_partitions_sql(layout, partitions, today)
+        if sql:
+            with conn.cursor() as cursor:
+                cursor.execute(sql)
+            logger.info(f"🗂️ Created {self.table} partitions: {', '.join(names)}")
+        return names
+
+    def archive_partition(
+        self, conn, partition: Partition, lower: Optional[date]
+    ) -> Dict[str, Any]:
+        """Stream one partition to Parquet and verify the row count"""
+        self.archive.directory.mkdir(parents=True, exist_ok=True)
+        filename = f"{self.table}_{partition.name}.parquet"
+        path = self.archive.directory / filename
+        tmp = path.with_suffix(".parquet.tmp")
+
+        written = 0
+        writer = None
+        try:
+            # Unbuffered cursor: a month of readings never sits in memory at once
+            with conn.cursor(pymysql.cursors.SSCursor) as cursor:
+                cursor.execute(
+                    f"SELECT * FROM {self.table} PARTITION ({partition.name})"
+                )
+                columns = [(d[0], *_arrow_column(d[1])) for d in cursor.description]
+                schema = pa.schema([(name, typ) for name, typ, _ in columns])
+                writer = pq.ParquetWriter(tmp, schema, compression="zstd")
+                while True:
+                    rows = cursor.fetchmany(self.batch_rows)
+                    if not rows:
+                        break
+                    arrays = []
+                    for i, (_, typ, convert) in enumerate(columns):
+                        values = [row[i] for row in rows]
+                        if convert is not None:
+                            values = [None if v is None else convert(v) for v in values]
+                        arrays.append(pa.array(values, type=typ))
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                    written += len(rows)
+            writer.close()
+            writer = None
+
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {self.table} PARTITION ({partition.name})"
+                )
+                row = cursor.fetchone()
+            expected = list(row.values())[0] if isinstance(row, dict) else row[0]
+            if pq.read_metadata(tmp).num_rows != written or written != expected:
+                raise RuntimeError(
+                    f"row count mismatch for {partition.name}: "
+                    f"{written} written, {expected} in MySQL"
+                )
+            os.replace(tmp, path)
+        finally:
+            if writer is not None:
+                writer.close()
+            if tmp.exists():
+                tmp.unlink()
+
+        return {
+            "partition": partition.name,
+            "file": filename,
+            "start": lower.isoformat() if lower else None,
+            "end": partition.upper.isoformat(),
+            "rows": written,
+            "bytes": path.stat().st_size,
+            "archived_at": datetime.now(timezone.utc).isoformat(),
+            "dropped": False,
+        }
+
+    def drop_partition(self, conn, name: str) -> None:
+        with conn.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {self.table} DROP PARTITION {name}")
+
+    # ------------------------------------------------------------------
+    # Cycle
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _cycle_lock(self, conn):
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+            row = cursor.fetchone()
+        acquired = (list(row.values())[0] if isinstance(row, dict) else row[0]) == 1
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+
+    def run_cycle(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """Create upcoming partitions, then archive + drop expired ones"""
+        today = today or datetime.now(timezone.utc).date()
+        summary: Dict[str, Any] = {
+            "run_at": datetime.now(timezone.utc).isoformat(),
+            "created": [],
+            "archived": [],
+            "dropped": [],
+            "errors": [],
+        }
+        start = time.perf_counter()
+
+        with self._connect() as conn, self._cycle_lock(conn) as acquired:
+            if not acquired:
+                summary["skipped"] = "another process holds the partition lock"
+            else:
+                layout, partitions = self.list_partitions(conn)
+                if not partitions:
+                    summary["skipped"] = f"{self.table} is not partitioned"
+                else:
+                    summary["created"] = self.ensure_future_partitions(
+                        conn, today, layout, partitions
+                    )
+                    self._archive_expired(conn, partitions, today, summary)
+
+        summary["duration_s"] = round(time.perf_counter() - start, 2)
+        self.last_run = summary
+        return summary
+
+    def _archive_expired(self, conn, partitions, today, summary) -> None:
+        expired = self.expired_partitions(partitions, today)
+        if not expired:
+            return
+        if not PARQUET_AVAILABLE:
+            summary["errors"].append("pyarrow not installed - nothing archived")
+            logger.warning(
+                f"⚠️ {len(expired)} expired {self.table} partitions kept: "
+                "pyarrow is required to archive before dropping"
+            )
+            return
+
+        drop = self.drop_expired
+        if drop and not self.archive.directory.is_absolute():
+            drop = False
+            summary["errors"].append(
+                "FUEL_METRICS_ARCHIVE_DIR must be an absolute path - nothing dropped"
+            )
+            logger.warning(
+                f"⚠️ Not dropping {self.table} partitions: archive directory "
+                f"'{self.archive.directory}' is relative; set FUEL_METRICS_ARCHIVE_DIR "
+                "to durable storage"
+            )
+        archived = {e["partition"] for e in self.archive.entries()}
+
+        for partition, lower in expired:
+            if not drop and partition.name in archived:
+                continue  # archive-only mode: exported on an earlier cycle
+            try:
+                entry = self.archive_partition(conn, partition, lower)
+                self.archive.record(entry)
+                summary["archived"].append(partition.name)
+                if not drop:
+                    logger.info(
+                        f"🧊 Archived {partition.name} ({entry['rows']:,} rows); "
+                        "kept in MySQL (PARTITION_DROP_ENABLED is off)"
+                    )
+                    continue
+                self.drop_partition(conn, partition.name)
+                # Readers only switch to the file once MySQL no longer has the rows
+                self.archive.record({**entry, "dropped": True})
+                summary["dropped"].append(partition.name)
+                logger.info(
+                    f"🧊 Archived {partition.name} ({entry['rows']:,} rows, "
+                    f"{entry['bytes'] / 1024 / 1024:.1f} MB) and dropped it"
+                )
+            except Exception as e:
+                # Keep the older partitions first: stop at the first failure
+                summary["errors"].append(f"{partition.name}: {e}")
+                logger.error(f"❌ Archiving {partition.name} failed: {e}")
+                break
+
+    # ------------------------------------------------------------------
+    # Scheduler
+    # ------------------------------------------------------------------
+
+    def start(self, interval_seconds: float = 24 * 3600) -> None:
+        """Run a cycle now and then every interval_seconds (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval_seconds,),
+            name="partition-manager",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(
+            f"🗂️ Partition manager started (every {interval_seconds / 3600:g}h, "
+            f"{self.months_ahead} months ahead, {self.retention_months} months hot)"
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, interval_seconds: float) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_cycle()
+            except Exception as e:  # never let the scheduler die
+                logger.error(f"Partition manager cycle failed: {e}")
+            self._stop.wait(interval_seconds)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "table": self.table,
+            "months_ahead": self.months_ahead,
+            "retention_months": self.retention_months,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "parquet_available": PARQUET_AVAILABLE,
+            "last_run": self.last_run,
+            "archive": self.archive.stats(),
+        }
+
+
+_partition_manager: Optional[PartitionManager] = None
+_partition_manager_lock = threading.Lock()
+
+
+def get_partition_manager() -> PartitionManager:
+    """Get or create the global partition manager"""
+    global _partition_manager
+    if _partition_manager is None:
+        with _partition_manager_lock:
+            if _partition_manager is None:
+                _partition_manager = PartitionManager()
+    return _partition_manager
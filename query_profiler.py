@@ -0,0 +1,580 @@
+"""
+Query Profiler v5.12.18
+═══════════════════════════════════════════════════════════════════════════════
+
+Per-statement profiling and slow-query capture for every connection owned by
+connection_manager (pymysql pools, the SQLAlchemy engines built on them and
+the aiomysql pools).
+
+Each connection's query() is wrapped when it is created, so every cursor
+class and every caller (text() + pandas, DictCursor, SSCursor, aiomysql)
+is covered without touching call sites. Per statement the profiler records:
+
+    - fingerprint: SQL with literals/placeholders replaced by ? and
+      IN / VALUES lists collapsed, so one query shape = one entry
+    - wall time (total / max), calls, errors, rows returned or affected
+    - bytes: estimated from a sample of the returned rows
+    - callers: the first frame outside the DB stack (file:line (function))
+
+Aggregates are bounded (`max_statements` fingerprints; the cheapest one is
+evicted when full). Statements slower than SLOW_QUERY_MS are kept in a ring
+of recent slow queries and, at most once per `explain_interval_seconds` per
+fingerprint, EXPLAINed on a separate pooled connection in a background
+thread.
+
+Exposed through GET /fuelAnalytics/api/admin/queries (top-N by total time)
+and as fuel_copilot_db_statement_* series in the Prometheus registry.
+
+Usage:
+    from query_profiler import get_query_profiler
+
+    get_query_profiler().top(20, order_by="total_seconds")
+    get_query_profiler().slow_queries(50)
+
+Author: Fuel Copilot Team
+Version: 5.12.18
+"""
+
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+PROFILER_ENABLED = os.getenv("QUERY_PROFILER_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+MAX_STATEMENTS = int(os.getenv("QUERY_PROFILER_MAX_STATEMENTS", "1000"))
+
+# Longer statements (bulk INSERTs) are fingerprinted on their prefix
+FINGERPRINT_MAX_CHARS = 4096
+SAMPLE_SQL_MAX_CHARS = 2000
+BYTES_SAMPLE_ROWS = 50
+MAX_CALLERS = 10
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FINGERPRINTS / CALLERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# One left-to-right pass so quotes inside comments and "#"/"--" inside
+# strings are each read correctly
+_STRINGS_OR_COMMENTS = re.compile(
+    r"(?P<str>'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\")"
+    r"|/\*.*?\*/|--[^\n]*|#[^\n]*",
+    re.S,
+)
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+")
+_NUMBERS = re.compile(
+    r"(?<![\w.])-?(?:0x[0-9a-f]+|\d+(?:\.\d+)?(?:e[+-]?\d+)?)(?!\w)", re.I
+)
+_NULL_LITERAL = re.compile(r"\bNULL\b", re.I)
+_VALUE_TUPLE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_TUPLES = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalized statement shape: literals -> ?, lists -> (...), one-line
+
+    Not memoized: statements carry inlined literals, so the raw text rarely
+    repeats and a cache would only pin large SQL strings.
+    """
+    text = sql[:FINGERPRINT_MAX_CHARS]
+    text = _STRINGS_OR_COMMENTS.sub(lambda m: "?" if m.group("str") else " ", text)
+    text = _PLACEHOLDERS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _NULL_LITERAL.sub("?", text)
+    text = _VALUE_TUPLE.sub("(...)", text)
+    text = _REPEATED_TUPLES.sub("(...)", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    if len(sql) > FINGERPRINT_MAX_CHARS:
+        text += " …"
+    return text
+
+
+def query_id(fp: str) -> str:
+    return hashlib.blake2b(fp.encode(), digest_size=6).hexdigest()
+
+
+class CallerResolver:
+    """First stack frame outside the given files/packages, as file.py:line (func)"""
+
+    def __init__(self, *paths: str):
+        self._paths = tuple(os.path.normcase(os.path.abspath(p)) for p in paths)
+        self._internal: Dict[str, bool] = {}
+
+    def __call__(self) -> str:
+        frame = sys._getframe(1)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            internal = self._internal.get(filename)
+            if internal is None:
+                internal = os.path.normcase(os.path.abspath(filename)).startswith(
+                    self._paths
+                ) or filename.startswith("<")
+                self._internal[filename] = internal
+            if not internal:
+                return (
+                    f"{os.path.basename(filename)}:{frame.f_lineno} "
+                    f"({frame.f_code.co_name})"
+                )
+            frame = frame.f_back
+        return "unknown"
+
+
+def _module_path(name: str) -> Optional[str]:
+    """Package directory or module file, located without importing it"""
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin:
+        return None
+    if spec.submodule_search_locations:
+        return os.path.dirname(spec.origin)
+    return spec.origin
+
+
+_caller = CallerResolver(
+    *filter(
+        None,
+        [
+            __file__,
+            os.path.join(os.path.dirname(__file__), "connection_manager.py"),
+            _module_path("contextlib"),
+            _module_path("asyncio"),
+            _module_path("concurrent"),
+            _module_path("threading"),
+            _module_path("pymysql"),
+            _module_path("aiomysql"),
+            _module_path("sqlalchemy"),
+            _module_path("pandas"),
+        ],
+    )
+)
+
+
+def _estimate_bytes(rows) -> int:
+    """Result size extrapolated from the first BYTES_SAMPLE_ROWS rows"""
+    n = len(rows)
+    if not n:
+        return 0
+    sample = rows[:BYTES_SAMPLE_ROWS]
+    size = 0
+    for row in sample:
+        for value in row:
+            size += len(value) if isinstance(value, (str, bytes)) else 8
+    return size * n // len(sample)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# AGGREGATES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@dataclass
+class StatementStats:
+    """Aggregate for one fingerprint"""
+
+    query_id: str
+    fingerprint: str
+    verb: str
+    sample_sql: str
+    calls: int = 0
+    errors: int = 0
+    slow_calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    callers: Dict[str, int] = field(default_factory=dict)
+    explain: Optional[List[Dict[str, Any]]] = None
+    explained_at: Optional[float] = None
+    first_seen: float = field(default_factory=time.time)
+    last_seen: float = 0.0
+
+    def to_dict(self, include_explain: bool = False) -> Dict[str, Any]:
+        data = {
+            "query_id": self.query_id,
+            "fingerprint": self.fingerprint,
+            "verb": self.verb,
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow_calls": self.slow_calls,
+            "total_seconds": round(self.total_seconds, 4),
+            "avg_ms": (
+                round(self.total_seconds / self.calls * 1000, 3) if self.calls else 0.0
+            ),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "rows": self.rows,
+            "avg_rows": round(self.rows / self.calls, 1) if self.calls else 0.0,
+            "bytes_est": self.bytes,
+            "callers": dict(
+                sorted(self.callers.items(), key=lambda kv: -kv[1])[:MAX_CALLERS]
+            ),
+            "has_explain": self.explain is not None,
+        }
+        if include_explain:
+            data["sample_sql"] = self.sample_sql
+            data["explain"] = self.explain
+        return data
+
+
+_ORDERINGS: Dict[str, Callable[[StatementStats], float]] = {
+    "total_seconds": lambda s: s.total_seconds,
+    "avg_ms": lambda s: s.total_seconds / s.calls if s.calls else 0.0,
+    "max_ms": lambda s: s.max_seconds,
+    "calls": lambda s: s.calls,
+    "rows": lambda s: s.rows,
+    "bytes_est": lambda s: s.bytes,
+}
+
+
+class QueryProfiler:
+    """Bounded per-fingerprint aggregates + recent slow statements"""
+
+    def __init__(
+        self,
+        enabled: bool = PROFILER_ENABLED,
+        slow_query_ms: float = SLOW_QUERY_MS,
+        max_statements: int = MAX_STATEMENTS,
+        max_slow: int = 200,
+        explain_interval_seconds: float = 600.0,
+    ):
+        self.enabled = enabled
+        self.slow_seconds = slow_query_ms / 1000.0
+        self.max_statements = max_statements
+        self.explain_interval_seconds = explain_interval_seconds
+        self._lock = threading.Lock()
+        self._stats: Dict[str, StatementStats] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=max_slow)
+        self._evicted = 0
+        self._since = time.time()
+        self._explainer: Optional[ThreadPoolExecutor] = None
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        sql,
+        seconds: float,
+        result=None,
+        error: bool = False,
+        source: str = "",
+        explain: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        if isinstance(sql, (bytes, bytearray)):
+            sql = sql.decode("utf-8", "replace")
+        if sql.lstrip()[:7].upper() == "EXPLAIN":
+            return
+
+        rows = nbytes = 0
+        if result is not None:
+            if result.rows is not None:
+                rows = len(result.rows)
+                nbytes = _estimate_bytes(result.rows)
+            elif result.affected_rows and result.affected_rows > 0:
+                rows = result.affected_rows
+
+        fp = fingerprint(sql)
+        caller = _caller()
+        slow = seconds >= self.slow_seconds
+        want_explain = False
+
+        with self._lock:
+            stats = self._stats.get(fp)
+            if stats is None:
+                if len(self._stats) >= self.max_statements:
+                    self._evict()
+                stats = StatementStats(
+                    query_id=query_id(fp),
+                    fingerprint=fp,
+                    verb=(fp.split(" ", 1)[0] or "?").upper(),
+                    sample_sql=sql[:SAMPLE_SQL_MAX_CHARS],
+                )
+                self._stats[fp] = stats
+            stats.calls += 1
+            stats.total_seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            stats.rows += rows
+            stats.bytes += nbytes
+            stats.last_seen = time.time()
+            if error:
+                stats.errors += 1
+            if caller in stats.callers or len(stats.callers) < MAX_CALLERS:
+                stats.callers[caller] = stats.callers.get(caller, 0) + 1
+
+            if slow:
+                stats.slow_calls += 1
+                stats.sample_sql = sql[:SAMPLE_SQL_MAX_CHARS]
+                self._slow.append(
+                    {
+                        "at": stats.last_seen,
+                        "query_id": stats.query_id,
+                        "source": source,
+                        "seconds": round(seconds, 4),
+                        "rows": rows,
+                        "caller": caller,
+                        "error": error,
+                        "sql": sql[:SAMPLE_SQL_MAX_CHARS],
+                    }
+                )
+                want_explain = (
+                    explain is not None
+                    and not error
+                    and stats.verb in EXPLAINABLE
+                    and len(sql) <= FINGERPRINT_MAX_CHARS
+                    and (
+                        stats.explained_at is None
+                        or stats.last_seen - stats.explained_at
+                        >= self.explain_interval_seconds
+                    )
+                )
+                if want_explain:
+                    # Claimed now so concurrent slow calls don't all EXPLAIN
+                    stats.explained_at = stats.last_seen
+
+        if want_explain:
+            logger.warning(
+                f"🐢 Slow query {stats.query_id} ({seconds * 1000:.0f} ms, "
+                f"{rows} rows) from {caller}: {fp[:200]}"
+            )
+            self._submit_explain(stats, sql, explain)
+
+    def _evict(self) -> None:
+        """Drop the fingerprint that has cost the least so far (lock held)"""
+        victim = min(self._stats.values(), key=lambda s: s.total_seconds)
+        del self._stats[victim.fingerprint]
+        self._evicted += 1
+
+    def _submit_explain(self, stats: StatementStats, sql: str, connect) -> None:
+        if self._explainer is None:
+            with self._lock:
+                if self._explainer is None:
+                    self._explainer = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="query-explain"
+                    )
+        try:
+            self._explainer.submit(self._run_explain, stats, sql, connect)
+        except RuntimeError:  # executor shut down
+            pass
+
+    def _run_explain(self, stats: StatementStats, sql: str, connect) -> None:
+        try:
+            conn = connect()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("EXPLAIN " + sql.replace("%", "%%"))
+                    rows = cursor.fetchall()
+                    names = [d[0] for d in cursor.description or ()]
+            finally:
+                conn.close()
+            stats.explain = [
+                row if isinstance(row, dict) else dict(zip(names, row)) for row in rows
+            ]
+        except Exception as e:
+            stats.explain = [{"error": str(e)[:300]}]
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def top(self, n: int = 20, order_by: str = "total_seconds") -> List[Dict[str, Any]]:
+        key = _ORDERINGS.get(order_by)
+        if key is None:
+            raise ValueError(f"order_by must be one of {', '.join(sorted(_ORDERINGS))}")
+        with self._lock:
+            ranked = sorted(self._stats.values(), key=key, reverse=True)[:n]
+            return [s.to_dict() for s in ranked]
+
+    def statement(self, qid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for stats in self._stats.values():
+                if stats.query_id == qid:
+                    return stats.to_dict(include_explain=True)
+        return None
+
+    def slow_queries(self, n: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._slow)[-n:][::-1]
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = list(self._stats.values())
+            return {
+                "enabled": self.enabled,
+                "since": self._since,
+                "slow_query_ms": self.slow_seconds * 1000,
+                "statements": len(stats),
+                "evicted": self._evicted,
+                "calls": sum(s.calls for s in stats),
+                "total_seconds": round(sum(s.total_seconds for s in stats), 3),
+                "slow_calls": sum(s.slow_calls for s in stats),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self._evicted = 0
+            self._since = time.time()
+
+    def shutdown(self) -> None:
+        if self._explainer is not None:
+            self._explainer.shutdown(wait=False, cancel_futures=True)
+            self._explainer = None
+
+
+_profiler: Optional[QueryProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_query_profiler() -> QueryProfiler:
+    """Process-wide QueryProfiler"""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = QueryProfiler()
+    return _profiler
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONNECTION INSTRUMENTATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def instrument_pymysql(conn, source: str, explain: Optional[Callable] = None) -> None:
+    """Wrap a pymysql connection's query() (every cursor class goes through it)"""
+    if getattr(conn, "_profiled", False):
+        return
+    query = conn.query
+    profiler = get_query_profiler()
+
+    def profiled_query(sql, unbuffered=False):
+        if not profiler.enabled:
+            return query(sql, unbuffered)
+        start = time.perf_counter()
+        try:
+            affected = query(sql, unbuffered)
+        except Exception:
+            profiler.record(sql, time.perf_counter() - start, error=True, source=source)
+            raise
+        profiler.record(
+            sql,
+            time.perf_counter() - start,
+            None if unbuffered else conn._result,
+            source=source,
+            explain=explain,
+        )
+        return affected
+
+    conn.query = profiled_query
+    conn._profiled = True
+
+
+def instrument_aiomysql(conn, source: str, explain: Optional[Callable] = None) -> None:
+    """Same as instrument_pymysql for an aiomysql connection"""
+    if getattr(conn, "_profiled", False):
+        return
+    query = conn.query
+    profiler = get_query_profiler()
+
+    async def profiled_query(sql, unbuffered=False):
+        if not profiler.enabled:
+            return await query(sql, unbuffered)
+        start = time.perf_counter()
+        try:
+            affected = await query(sql, unbuffered)
+        except Exception:
+            profiler.record(sql, time.perf_counter() - start, error=True, source=source)
+            raise
+        profiler.record(
+            sql,
+            time.perf_counter() - start,
+            None if unbuffered else conn._result,
+            source=source,
+            explain=explain,
+        )
+        return affected
+
+    conn.query = profiled_query
+    conn._profiled = True
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROMETHEUS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class QueryProfileCollector:
+    """Top-N statements by total time as fuel_copilot_db_statement_* series"""
+
+    def __init__(self, profiler: Optional[QueryProfiler] = None, top_n: int = 25):
+        self._profiler = profiler
+        self.top_n = top_n
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        profiler = self._profiler or get_query_profiler()
+        labels = ["query_id", "verb", "statement"]
+        seconds = CounterMetricFamily(
+            "fuel_copilot_db_statement_seconds",
+            "Wall time spent in a statement fingerprint (top N by total time)",
+            labels=labels,
+        )
+        calls = CounterMetricFamily(
+            "fuel_copilot_db_statement_calls",
+            "Executions of a statement fingerprint",
+            labels=labels,
+        )
+        rows = CounterMetricFamily(
+            "fuel_copilot_db_statement_rows",
+            "Rows returned or affected by a statement fingerprint",
+            labels=labels,
+        )
+        slow = CounterMetricFamily(
+            "fuel_copilot_db_statement_slow_calls",
+            "Executions slower than SLOW_QUERY_MS",
+            labels=labels,
+        )
+        max_seconds = GaugeMetricFamily(
+            "fuel_copilot_db_statement_max_seconds",
+            "Slowest execution of a statement fingerprint",
+            labels=labels,
+        )
+        for stats in profiler.top(self.top_n):
+            values = [stats["query_id"], stats["verb"], stats["fingerprint"][:120]]
+            seconds.add_metric(values, stats["total_seconds"])
+            calls.add_metric(values, stats["calls"])
+            rows.add_metric(values, stats["rows"])
+            slow.add_metric(values, stats["slow_calls"])
+            max_seconds.add_metric(values, stats["max_ms"] / 1000)
+        yield from (seconds, calls, rows, slow, max_seconds)
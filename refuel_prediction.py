@@ -23,6 +23,7 @@ logger = logging.getLogger(__name__)
 
 # Centralized database connection
 from db_connection import get_pymysql_connection as get_db_connection
+from src.repositories.latest_state_repository import get_latest_states
 
 
 # =============================================================================
@@ -398,33 +399,18 @@ class RefuelPredictionEngine:
     def _get_fleet_status(self, carrier_id: Optional[str] = None) -> List[Dict]:
         """Get current fuel status for all trucks."""
         try:
+            # 🆕 v5.12.15: Latest row per truck from fuel_metrics_latest
             with get_db_connection() as conn:
-                with conn.cursor() as cursor:
-                    where = ""
-                    params = []
-
-                    if carrier_id and carrier_id != "*":
-                        where = "WHERE carrier_id = %s"
-                        params = [carrier_id]
+                rows = get_latest_states(
+                    conn,
+                    columns=["truck_id", "carrier_id", "estimated_pct AS fuel_pct"],
+                )
 
-                    cursor.execute(
-                        f"""
-                        SELECT 
-                            truck_id,
-                            carrier_id,
-                            estimated_pct as fuel_pct,
-                            200 as tank_capacity
-                        FROM fuel_metrics
-                        WHERE (truck_id, timestamp_utc) IN (
-                            SELECT truck_id, MAX(timestamp_utc)
-                            FROM fuel_metrics
-                            {where}
-                            GROUP BY truck_id
-                        )
-                        """,
-                        params,
-                    )
-                    return list(cursor.fetchall())
+            if carrier_id and carrier_id != "*":
+                rows = [row for row in rows if row["carrier_id"] == carrier_id]
+            for row in rows:
+                row["tank_capacity"] = 200
+            return rows
 
         except Exception as e:
             logger.error(f"Error getting fleet status: {e}")
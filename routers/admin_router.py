@@ -7,13 +7,17 @@
 ║  - GET /admin/carriers  → List all carriers                                    ║
 ║  - GET /admin/users     → List all users                                       ║
 ║  - GET /admin/stats     → System-wide statistics                               ║
+║  - GET /admin/queries   → Top SQL statements by total time (profiler)          ║
+║  - GET /admin/queries/slow        → Recent statements over SLOW_QUERY_MS       ║
+║  - GET /admin/queries/{query_id}  → One statement with sample SQL + EXPLAIN    ║
+║  - DELETE /admin/queries          → Reset the query profile                    ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 
 @version 5.6.0
 @date December 2025
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 import logging
 
 logger = logging.getLogger(__name__)
@@ -139,3 +143,68 @@ async def get_admin_stats(current_user: TokenData = Depends(require_super_admin)
     except Exception as e:
         logger.error(f"Error getting admin stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# 🆕 v5.12.18: per-statement query profile (see query_profiler.py)
+@router.get("/queries")
+async def get_query_profile(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: str = Query("total_seconds"),
+    current_user: TokenData = Depends(require_super_admin),
+):
+    """
+    Top statement fingerprints by total time (or avg_ms, max_ms, calls, rows,
+    bytes_est) since the last reset (super_admin only).
+    """
+    from query_profiler import get_query_profiler
+
+    profiler = get_query_profiler()
+    try:
+        statements = profiler.top(limit, order_by=order_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"summary": profiler.summary(), "statements": statements}
+
+
+@router.get("/queries/slow")
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=200),
+    current_user: TokenData = Depends(require_super_admin),
+):
+    """
+    Most recent statements slower than SLOW_QUERY_MS (super_admin only).
+    """
+    from query_profiler import get_query_profiler
+
+    profiler = get_query_profiler()
+    return {
+        "slow_query_ms": profiler.slow_seconds * 1000,
+        "queries": profiler.slow_queries(limit),
+    }
+
+
+@router.get("/queries/{query_id}")
+async def get_query_statement(
+    query_id: str, current_user: TokenData = Depends(require_super_admin)
+):
+    """
+    One statement fingerprint with its latest sample SQL and EXPLAIN plan
+    (super_admin only).
+    """
+    from query_profiler import get_query_profiler
+
+    statement = get_query_profiler().statement(query_id)
+    if statement is None:
+        raise HTTPException(status_code=404, detail=f"Unknown query_id {query_id}")
+    return statement
+
+
+@router.delete("/queries")
+async def reset_query_profile(current_user: TokenData = Depends(require_super_admin)):
+    """
+    Clear all statement aggregates and slow queries (super_admin only).
+    """
+    from query_profiler import get_query_profiler
+
+    get_query_profiler().reset()
+    return {"status": "reset"}
@@ -19,6 +19,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from database import db
+from fast_json import cache_json_response, cached_json_response
 from models import Alert  # 🔧 Use Alert model from models.py
 from observability import logger
 
@@ -442,12 +443,17 @@ async def get_unified_alerts(
     try:
         from cache_service import get_cache
 
-        cache = await get_cache()
         cache_key = f"alerts:unified:{include_predictive}:{include_diagnostics}:{include_system}:{days_ahead}"
 
+        # 🆕 v5.12.4: Already-encoded response bytes
+        cached_response = cached_json_response(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+        cache = await get_cache()
         cached = await cache.get(cache_key)
         if cached:
-            return JSONResponse(content=cached)
+            return cache_json_response(cache_key, cached, ttl=30)
 
         result = {
             "system_alerts": [],
@@ -520,7 +526,7 @@ async def get_unified_alerts(
 
         # Cache for 30 seconds
         await cache.set(cache_key, result, ttl=30)
-        return JSONResponse(content=result)
+        return cache_json_response(cache_key, result, ttl=30)
 
     except Exception as e:
         logger.error(f"Error in unified alerts: {e}")
@@ -10,12 +10,11 @@
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
-import os
 import logging
 from typing import Optional
 from datetime import datetime, timezone, timedelta
 from fastapi import APIRouter, Query, HTTPException
-import pymysql
+from connection_manager import LOCAL, WIALON, get_connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -31,29 +30,13 @@ router = APIRouter(
 
 
 def get_wialon_connection():
-    """Get connection to Wialon DB"""
-    return pymysql.connect(
-        host=os.getenv("WIALON_DB_HOST", "localhost"),
-        port=int(os.getenv("WIALON_DB_PORT", "3306")),
-        user=os.getenv("WIALON_DB_USER", ""),
-        password=os.getenv("WIALON_DB_PASS", ""),
-        database=os.getenv("WIALON_DB_NAME", "wialon_collect"),
-        charset="utf8mb4",
-        cursorclass=pymysql.cursors.DictCursor,
-    )
+    """Get connection to Wialon DB (pooled - close() returns it to the pool)"""
+    return get_connection_manager().checkout(WIALON)
 
 
 def get_fuel_db_connection():
-    """Get connection to Fuel Analytics DB"""
-    return pymysql.connect(
-        host=os.getenv("MYSQL_HOST", "localhost"),
-        port=int(os.getenv("MYSQL_PORT", "3306")),
-        user=os.getenv("MYSQL_USER", "root"),
-        password=os.getenv("MYSQL_PASSWORD", ""),
-        database=os.getenv("MYSQL_DATABASE", "fuel_analytics"),
-        charset="utf8mb4",
-        cursorclass=pymysql.cursors.DictCursor,
-    )
+    """Get connection to Fuel Analytics DB (pooled - close() returns it to the pool)"""
+    return get_connection_manager().checkout(LOCAL)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
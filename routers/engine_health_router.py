@@ -12,6 +12,19 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/fuelAnalytics/api", tags=["Engine Health"])
 
+# 🆕 v5.12.15: Latest-state columns fed to EngineHealthAnalyzer.analyze_fleet_health
+ENGINE_HEALTH_COLUMNS = [
+    "truck_id",
+    "timestamp_utc",
+    "oil_pressure_psi",
+    "coolant_temp_f",
+    "oil_temp_f",
+    "battery_voltage",
+    "def_level_pct",
+    "engine_load_pct",
+    "rpm",
+]
+
 
 @router.get("/engine-health/fleet-summary")
 async def get_engine_health_fleet_summary():
@@ -25,43 +38,19 @@ async def get_engine_health_fleet_summary():
     """
     try:
         from database_mysql import get_sqlalchemy_engine
-        from sqlalchemy import text
+        from src.repositories.latest_state_repository import get_latest_states
         from engine_health_engine import EngineHealthAnalyzer
 
         engine = get_sqlalchemy_engine()
         analyzer = EngineHealthAnalyzer()
 
-        query = """
-            SELECT 
-                fm.truck_id,
-                fm.timestamp_utc,
-                fm.oil_pressure_psi,
-                fm.coolant_temp_f,
-                fm.oil_temp_f,
-                fm.battery_voltage,
-                fm.def_level_pct,
-                fm.engine_load_pct,
-                fm.rpm,
-                fm.speed_mph,
-                fm.truck_status
-            FROM fuel_metrics fm
-            INNER JOIN (
-                SELECT truck_id, MAX(timestamp_utc) as max_ts
-                FROM fuel_metrics
-                WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL 30 MINUTE)
-                GROUP BY truck_id
-            ) latest ON fm.truck_id = latest.truck_id 
-                     AND fm.timestamp_utc = latest.max_ts
-            ORDER BY fm.truck_id
-        """
-
-        with engine.connect() as conn:
-            result = conn.execute(text(query))
-            rows = result.fetchall()
-            columns = result.keys()
-
-        fleet_data = [dict(zip(columns, row)) for row in rows]
-        summary = analyzer.analyze_fleet_health(fleet_data)
+        # 🆕 v5.12.15: Latest row per truck from fuel_metrics_latest
+        fleet_data = get_latest_states(
+            engine,
+            columns=ENGINE_HEALTH_COLUMNS + ["speed_mph", "truck_status"],
+            max_age_hours=0.5,
+        )
+        summary = analyzer.analyze_fleet_health(fleet_data, vectorized=True)
 
         return summary.to_dict()
 
@@ -548,38 +537,16 @@ async def trigger_health_analysis():
         from database_mysql import get_sqlalchemy_engine
         from sqlalchemy import text
         from engine_health_engine import EngineHealthAnalyzer
+        from src.repositories.latest_state_repository import get_latest_states
 
         engine = get_sqlalchemy_engine()
         analyzer = EngineHealthAnalyzer()
 
-        query = """
-            SELECT 
-                fm.truck_id,
-                fm.timestamp_utc,
-                fm.oil_pressure_psi,
-                fm.coolant_temp_f,
-                fm.oil_temp_f,
-                fm.battery_voltage,
-                fm.def_level_pct,
-                fm.engine_load_pct,
-                fm.rpm
-            FROM fuel_metrics fm
-            INNER JOIN (
-                SELECT truck_id, MAX(timestamp_utc) as max_ts
-                FROM fuel_metrics
-                WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL 15 MINUTE)
-                GROUP BY truck_id
-            ) latest ON fm.truck_id = latest.truck_id 
-                     AND fm.timestamp_utc = latest.max_ts
-        """
-
-        with engine.connect() as conn:
-            result = conn.execute(text(query))
-            rows = result.fetchall()
-            columns = result.keys()
-
-        fleet_data = [dict(zip(columns, row)) for row in rows]
-        summary = analyzer.analyze_fleet_health(fleet_data)
+        # 🆕 v5.12.15: Latest row per truck from fuel_metrics_latest
+        fleet_data = get_latest_states(
+            engine, columns=ENGINE_HEALTH_COLUMNS, max_age_hours=0.25
+        )
+        summary = analyzer.analyze_fleet_health(fleet_data, vectorized=True)
 
         alerts_saved = 0
         try:
@@ -616,6 +583,15 @@ async def trigger_health_analysis():
         except Exception as save_error:
             logger.warning(f"Could not save alerts (table may not exist): {save_error}")
 
+        # 🆕 v5.12.11: New alerts -> Command Center recomputes that source
+        if alerts_saved:
+            try:
+                from fleet_command_center import get_command_center
+
+                get_command_center().invalidate_sources("engine_health_alerts")
+            except Exception as e:
+                logger.debug(f"Could not invalidate command center alerts: {e}")
+
         return {
             "status": "completed",
             "trucks_analyzed": len(fleet_data),
@@ -31,33 +31,41 @@ async def export_fleet_report(
     try:
         import io
         from database_mysql import get_sqlalchemy_engine
-        from sqlalchemy import text
+        from src.repositories.latest_state_repository import get_latest_states
 
         engine = get_sqlalchemy_engine()
 
-        query = """
-            SELECT 
-                truck_id,
-                truck_status as status,
-                COALESCE(sensor_pct, 0) as fuel_pct,
-                COALESCE(estimated_pct, 0) as estimated_fuel_pct,
-                COALESCE(drift_pct, 0) as drift_pct,
-                COALESCE(mpg_current, 0) as current_mpg,
-                COALESCE(avg_mpg_24h, 0) as avg_mpg_24h,
-                COALESCE(consumption_gph, 0) as consumption_gph,
-                COALESCE(idle_consumption_gph, 0) as idle_gph,
-                COALESCE(speed, 0) as speed_mph,
-                latitude,
-                longitude,
-                timestamp_utc as last_update
-            FROM truck_data_latest
-            WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL :days DAY)
-            ORDER BY truck_id
-        """
-
-        with engine.connect() as conn:
-            result = conn.execute(text(query), {"days": days})
-            data = [dict(row._mapping) for row in result.fetchall()]
+        # 🆕 v5.12.15: Read fuel_metrics_latest (truck_data_latest is not maintained)
+        data = get_latest_states(
+            engine,
+            columns=[
+                "truck_id",
+                "truck_status AS status",
+                "sensor_pct AS fuel_pct",
+                "estimated_pct AS estimated_fuel_pct",
+                "drift_pct",
+                "mpg_current AS current_mpg",
+                "consumption_gph",
+                "idle_gph",
+                "speed_mph",
+                "latitude",
+                "longitude",
+                "timestamp_utc AS last_update",
+            ],
+            max_age_hours=days * 24,
+        )
+        for row in data:
+            for key in (
+                "fuel_pct",
+                "estimated_fuel_pct",
+                "drift_pct",
+                "current_mpg",
+                "consumption_gph",
+                "idle_gph",
+                "speed_mph",
+            ):
+                if row[key] is None:
+                    row[key] = 0
 
         if not data:
             raise HTTPException(
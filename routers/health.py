@@ -7,6 +7,8 @@
 ║  - /health (basic health check)                                                ║
 ║  - /status (detailed status)                                                   ║
 ║  - /cache/stats (cache statistics)                                             ║
+║  - /db/pools (connection pool statistics)                                      ║
+║  - /db/partitions (fuel_metrics partition lifecycle / archive status)          ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
@@ -14,7 +16,8 @@ import os
 import logging
 from datetime import datetime, timezone
 from fastapi import APIRouter
-import pymysql
+
+from connection_manager import LOCAL, WIALON, get_connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -31,40 +34,12 @@ router = APIRouter(
 
 def check_wialon_db() -> dict:
     """Check Wialon database connectivity"""
-    try:
-        conn = pymysql.connect(
-            host=os.getenv("WIALON_DB_HOST", "localhost"),
-            port=int(os.getenv("WIALON_DB_PORT", "3306")),
-            user=os.getenv("WIALON_DB_USER", ""),
-            password=os.getenv("WIALON_DB_PASS", ""),
-            database=os.getenv("WIALON_DB_NAME", "wialon_collect"),
-            connect_timeout=5,
-        )
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        conn.close()
-        return {"status": "healthy", "message": "Connected"}
-    except Exception as e:
-        return {"status": "unhealthy", "message": str(e)}
+    return get_connection_manager().health_check(WIALON)[WIALON]
 
 
 def check_fuel_db() -> dict:
     """Check Fuel Analytics database connectivity"""
-    try:
-        conn = pymysql.connect(
-            host=os.getenv("MYSQL_HOST", "localhost"),
-            port=int(os.getenv("MYSQL_PORT", "3306")),
-            user=os.getenv("MYSQL_USER", "root"),
-            password=os.getenv("MYSQL_PASSWORD", ""),
-            database=os.getenv("MYSQL_DATABASE", "fuel_analytics"),
-            connect_timeout=5,
-        )
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        conn.close()
-        return {"status": "healthy", "message": "Connected"}
-    except Exception as e:
-        return {"status": "unhealthy", "message": str(e)}
+    return get_connection_manager().health_check(LOCAL)[LOCAL]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -149,3 +124,35 @@ async def cache_statistics():
                 "error": str(e),
             },
         }
+
+
+@router.get("/db/pools")
+async def connection_pool_statistics():
+    """
+    🆕 v5.12.16: Connection pool statistics.
+    Checkout latency / wait histograms, pool occupancy and held connections
+    that look leaked, per named pool and driver.
+    """
+    manager = get_connection_manager()
+    return {
+        "status": "success",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "leaks": manager.check_leaks(),
+        "pools": manager.stats(),
+    }
+
+
+@router.get("/db/partitions")
+async def partition_status():
+    """
+    🆕 v5.12.17: fuel_metrics partition lifecycle.
+    Last maintenance cycle (partitions created / archived / dropped) and the
+    Parquet archive: file count, rows, size and the archive horizon.
+    """
+    from partition_manager import get_partition_manager
+
+    return {
+        "status": "success",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **get_partition_manager().status(),
+    }
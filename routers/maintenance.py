@@ -13,12 +13,11 @@
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
 
-import os
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query
-import pymysql
+from connection_manager import LOCAL, WIALON, get_connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -34,31 +33,13 @@ router = APIRouter(
 
 
 def get_fuel_db_connection():
-    """Get connection to Fuel Analytics DB for maintenance alerts"""
-    return pymysql.connect(
-        host=os.getenv("MYSQL_HOST", "localhost"),
-        port=int(os.getenv("MYSQL_PORT", "3306")),
-        user=os.getenv("MYSQL_USER", "root"),
-        password=os.getenv("MYSQL_PASSWORD", ""),
-        database=os.getenv("MYSQL_DATABASE", "fuel_analytics"),
-        charset="utf8mb4",
-        cursorclass=pymysql.cursors.DictCursor,
-    )
+    """Get connection to Fuel Analytics DB for maintenance alerts (pooled - close() returns it to the pool)"""
+    return get_connection_manager().checkout(LOCAL)
 
 
 def get_wialon_connection():
-    """Get connection to Wialon DB for sensor data"""
-    return pymysql.connect(
-        host=os.getenv("WIALON_DB_HOST", "localhost"),
-        port=int(os.getenv("WIALON_DB_PORT", "3306")),
-        user=os.getenv("WIALON_DB_USER", ""),
-        password=os.getenv("WIALON_DB_PASS", ""),
-        database=os.getenv("WIALON_DB_NAME", "wialon_collect"),
-        charset="utf8mb4",
-        cursorclass=pymysql.cursors.DictCursor,
-        connect_timeout=5,
-        read_timeout=10,
-    )
+    """Get connection to Wialon DB for sensor data (pooled - close() returns it to the pool)"""
+    return get_connection_manager().checkout(WIALON)
 
 
 def fetch_sensor_data() -> list:
@@ -10,11 +10,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
 import pandas as pd
-import pymysql
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from config import get_local_db_config
+from connection_manager import get_connection_manager
 from ml_models.lstm_maintenance import TENSORFLOW_AVAILABLE, get_maintenance_predictor
 from ml_models.theft_detection import get_theft_detector
 
@@ -23,6 +23,12 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/fuelAnalytics/api/ml", tags=["Machine Learning"])
 
 
+def _local_connection():
+    """Pooled connection to the local DB (close() returns it to the pool)"""
+    manager = get_connection_manager()
+    return manager.checkout(manager.pool_for(get_local_db_config()))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # REQUEST/RESPONSE MODELS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -117,7 +123,7 @@ async def predict_maintenance(
         predictor = get_maintenance_predictor()
 
         # Fetch sensor data from database
-        conn = pymysql.connect(**get_local_db_config())
+        conn = _local_connection()
 
         query = """
             SELECT 
@@ -181,7 +187,7 @@ async def predict_fleet_maintenance(
         predictor = get_maintenance_predictor()
 
         # Get all active trucks
-        conn = pymysql.connect(**get_local_db_config())
+        conn = _local_connection()
 
         # Get trucks with recent data
         trucks_query = """
@@ -304,7 +310,7 @@ async def get_recent_theft_predictions(
     """
     try:
         detector = get_theft_detector()
-        conn = pymysql.connect(**get_local_db_config())
+        conn = _local_connection()
 
         # Get recent theft events from database
         query = """
@@ -414,7 +420,6 @@ async def _train_lstm(request: MLTrainingRequest) -> MLTrainingResponse:
         raise HTTPException(status_code=503, detail="TensorFlow not installed")
 
     predictor = get_maintenance_predictor()
-    conn = pymysql.connect(**get_local_db_config())
 
     # Fetch training data
     # TODO: Implement actual training data query with maintenance labels
@@ -432,7 +437,7 @@ async def _train_lstm(request: MLTrainingRequest) -> MLTrainingResponse:
 async def _train_theft_detector(request: MLTrainingRequest) -> MLTrainingResponse:
     """Train theft detection model"""
     detector = get_theft_detector()
-    conn = pymysql.connect(**get_local_db_config())
+    conn = _local_connection()
 
     # Fetch historical theft events
     query = """
@@ -514,4 +519,20 @@ async def get_ml_status():
     except Exception as e:
         status["models"]["theft_detection"] = {"loaded": False, "error": str(e)}
 
+    # 🆕 v5.12.7: Shared artifacts (load time, RSS, version per model)
+    try:
+        from model_registry import get_model_registry
+
+        status["registry"] = get_model_registry().get_stats()
+    except Exception as e:
+        status["registry"] = {"error": str(e)}
+
+    # 🆕 v5.12.8: Background anomaly training (fleet time, CPU utilization)
+    try:
+        from ml_engines.anomaly_training import get_training_scheduler
+
+        status["anomaly_training"] = get_training_scheduler().get_stats()
+    except Exception as e:
+        status["anomaly_training"] = {"error": str(e)}
+
     return status
@@ -9,12 +9,16 @@ Endpoints:
 - GET /mpg-baseline/fleet - Get baselines for all trucks
 - GET /mpg-baseline/{truck_id}/deviation - Analyze current MPG vs baseline
 - POST /mpg-baseline/calculate - Trigger baseline recalculation
+
+Reads are served from the incremental store (mpg_baseline_store) kept up to
+date by the sync cycle; history queries are only a fallback for trucks the
+store hasn't seen yet, or for non-default windows.
 """
 
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
@@ -125,13 +129,19 @@ async def get_truck_baseline(
             filter_outliers_iqr,
             get_confidence_level,
         )
+        from mpg_baseline_store import get_baseline_store
+
+        # Fast path: incremental baseline maintained by the sync cycle
+        store = get_baseline_store()
+        if days == store.WINDOW_DAYS and store.has_baseline(truck_id):
+            return MPGBaselineResponse(**store.get_baseline(truck_id).to_dict())
 
         with get_local_db_session() as session:
             # Query MPG data
             result = session.execute(
                 text(
                     """
-                SELECT mpg_current
+                SELECT mpg_current, timestamp_utc
                 FROM fuel_metrics
                 WHERE truck_id = :truck_id
                   AND timestamp_utc >= DATE_SUB(NOW(), INTERVAL :days DAY)
@@ -163,6 +173,10 @@ async def get_truck_baseline(
                     last_calculated=datetime.utcnow().isoformat(),
                 )
 
+            # Seed the store so the next request is served without history
+            if days == store.WINDOW_DAYS:
+                store.rebuild_from_readings(truck_id, rows)
+
             # Filter outliers
             filtered = filter_outliers_iqr(mpg_values, multiplier=1.5)
 
@@ -215,11 +229,19 @@ async def analyze_deviation(
     - CRITICAL_HIGH: Extremely high, likely sensor error
     """
     try:
-        from database_pool import get_pool
         from mpg_baseline_service import MPGBaselineService
+        from mpg_baseline_store import get_baseline_store
+
+        store = get_baseline_store()
+        if store.has_baseline(truck_id):
+            service = MPGBaselineService(baseline_store=store)
+            analysis = service.analyze_deviation(truck_id, current_mpg)
+            return DeviationResponse(**analysis.to_dict())
+
+        from database_pool import get_pool
 
         pool = await get_pool()
-        service = MPGBaselineService(db_pool=pool)
+        service = MPGBaselineService(db_pool=pool, baseline_store=store)
 
         # First get baseline
         baseline = await service.calculate_baseline(truck_id, days=30)
@@ -252,6 +274,17 @@ async def get_fleet_baselines(
     Returns summary statistics and individual baselines for each truck
     with sufficient data.
     """
+    try:
+        from mpg_baseline_store import get_baseline_store
+
+        store = get_baseline_store()
+        if days == store.WINDOW_DAYS:
+            summary = store.get_fleet_summary()
+            if summary["total_trucks"] > 0:
+                return FleetBaselineResponse(**summary)
+    except Exception as e:
+        logger.debug(f"Baseline store unavailable, computing from history: {e}")
+
     try:
         import statistics
         from datetime import datetime
@@ -371,8 +404,19 @@ async def compare_to_fleet(truck_id: str, days: int = Query(30, ge=7, le=365)):
     Shows whether the truck performs above, at, or below fleet average.
     """
     try:
+        from mpg_baseline_service import compare_to_fleet_average
+        from mpg_baseline_store import get_baseline_store
+
+        store = get_baseline_store()
+        if days == store.WINDOW_DAYS and store.has_baseline(truck_id):
+            summary = store.get_fleet_summary()
+            result = compare_to_fleet_average(
+                store.get_baseline(truck_id), summary["avg_baseline_mpg"]
+            )
+            return FleetComparisonResponse(**result)
+
         from database_pool import get_pool
-        from mpg_baseline_service import MPGBaselineService, compare_to_fleet_average
+        from mpg_baseline_service import MPGBaselineService
 
         pool = await get_pool()
         service = MPGBaselineService(db_pool=pool)
@@ -409,47 +453,45 @@ async def compare_to_fleet(truck_id: str, days: int = Query(30, ge=7, le=365)):
 
 
 @router.post("/calculate")
-async def trigger_calculation(request: CalculationRequest):
+async def trigger_calculation(
+    request: CalculationRequest, background_tasks: BackgroundTasks
+):
     """
-    Trigger baseline recalculation for specified trucks or entire fleet.
-
-    Use this to force recalculation after significant data changes.
+    Trigger a background baseline backfill for specified trucks or entire fleet.
+
+    Rebuilds the incremental store from fuel_metrics history (one query for
+    the requested trucks, at most the store's 30-day window) without blocking
+    the request, and saves it to the store file. The sync process adopts the
+    rebuilt trucks on its next save and other API workers on their next
+    reload. Use this after significant data changes; normal reads never
+    recompute from history.
     """
     try:
-        from database_pool import get_pool
-        from mpg_baseline_service import MPGBaselineService
-
-        pool = await get_pool()
-        service = MPGBaselineService(db_pool=pool)
-
-        if request.truck_ids:
-            # Calculate for specific trucks
-            results = {}
-            for truck_id in request.truck_ids:
-                baseline = await service.calculate_baseline(
-                    truck_id, days=request.days, min_speed_mph=request.min_speed_mph
-                )
-                results[truck_id] = baseline.to_dict()
-
-            return {
-                "status": "completed",
-                "trucks_processed": len(results),
-                "baselines": results,
-            }
-        else:
-            # Calculate for entire fleet
-            baselines = await service.calculate_fleet_baselines(
-                days=request.days, min_speed_mph=request.min_speed_mph
-            )
+        from database_pool import get_local_engine
+        from mpg_baseline_store import get_baseline_store
+
+        store = get_baseline_store()
+        engine = get_local_engine()
+
+        background_tasks.add_task(
+            store.start_background_backfill,
+            engine.raw_connection,
+            truck_ids=request.truck_ids,
+            days=request.days,
+            min_speed_mph=request.min_speed_mph,
+        )
 
-            return {
-                "status": "completed",
-                "trucks_processed": len(baselines),
-                "summary": service.get_fleet_summary(),
-            }
+        return {
+            "status": "scheduled",
+            "trucks_requested": (
+                len(request.truck_ids) if request.truck_ids else "all"
+            ),
+            "days": min(request.days, store.WINDOW_DAYS),
+            "store": store.get_stats(),
+        }
 
     except ImportError:
         return {"status": "skipped", "message": "Database not available"}
     except Exception as e:
-        logger.error(f"Error calculating baselines: {e}")
+        logger.error(f"Error scheduling baseline backfill: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -35,45 +35,34 @@ async def get_next_refuel_prediction(
     """
     try:
         from database_mysql import get_sqlalchemy_engine
-        from sqlalchemy import text
+        from src.repositories.latest_state_repository import get_latest_states
 
         engine = get_sqlalchemy_engine()
 
-        query = """
-            SELECT 
-                fm.truck_id,
-                fm.sensor_pct as current_fuel_pct,
-                fm.estimated_pct as kalman_fuel_pct,
-                fm.mpg_current as avg_mpg_24h,
-                fm.consumption_gph as avg_consumption_gph_24h,
-                CASE WHEN fm.truck_status = 'IDLE' THEN fm.consumption_gph ELSE 0.8 END as avg_idle_gph_24h,
-                fm.truck_status,
-                fm.speed_mph as speed,
-                fm.timestamp_utc
-            FROM fuel_metrics fm
-            INNER JOIN (
-                SELECT truck_id, MAX(timestamp_utc) as max_ts
-                FROM fuel_metrics
-                WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL 2 HOUR)
-                GROUP BY truck_id
-            ) latest ON fm.truck_id = latest.truck_id AND fm.timestamp_utc = latest.max_ts
-            WHERE fm.truck_id IS NOT NULL
-        """
-
-        if truck_id:
-            query += " AND fm.truck_id = :truck_id"
-
-        with engine.connect() as conn:
-            if truck_id:
-                result = conn.execute(text(query), {"truck_id": truck_id})
-            else:
-                result = conn.execute(text(query))
-
-            rows = result.fetchall()
+        # 🆕 v5.12.15: Latest row per truck from fuel_metrics_latest
+        rows = get_latest_states(
+            engine,
+            columns=[
+                "truck_id",
+                "sensor_pct AS current_fuel_pct",
+                "estimated_pct AS kalman_fuel_pct",
+                "mpg_current AS avg_mpg_24h",
+                "consumption_gph AS avg_consumption_gph_24h",
+                "truck_status",
+                "speed_mph AS speed",
+                "timestamp_utc",
+            ],
+            truck_ids=[truck_id] if truck_id else None,
+            max_age_hours=2,
+        )
 
         predictions = []
-        for row in rows:
-            row_dict = dict(row._mapping)
+        for row_dict in rows:
+            row_dict["avg_idle_gph_24h"] = (
+                row_dict["avg_consumption_gph_24h"]
+                if row_dict["truck_status"] == "IDLE"
+                else 0.8
+            )
 
             current_pct = (
                 row_dict.get("kalman_fuel_pct")
@@ -9,6 +9,11 @@ Endpoints:
 - GET /refuels/analytics - Advanced refuel analytics
 - GET /theft-analysis - Fuel theft detection
 - GET /export/refuels - Export refuels to CSV
+
+Refuel endpoints read refuel_events, which wialon_sync_enhanced fills after
+detect_multiple_refuels has run its rules on extract_refuel_jumps candidates;
+no fuel_metrics scan happens here, so there is nothing left to vectorize.
+/theft-analysis runs analyze_fuel_drops_advanced (extract_fuel_drops).
 """
 
 from datetime import datetime
@@ -19,6 +24,7 @@ from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from database import db
+from fast_json import cache_json_response, cached_json_response
 from observability import logger
 
 router = APIRouter(prefix="/fuelAnalytics/api", tags=["Refuels"])
@@ -136,11 +142,17 @@ async def get_theft_analysis(
     try:
         from cache_service import get_cache
 
-        cache = await get_cache()
         cache_key = f"theft:analysis:{algorithm}:{days}d"
+
+        # 🆕 v5.12.4: Already-encoded response bytes
+        cached_response = cached_json_response(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+        cache = await get_cache()
         cached = await cache.get(cache_key)
         if cached:
-            return JSONResponse(content=cached)
+            return cache_json_response(cache_key, cached, ttl=60)
 
         if algorithm == "advanced":
             try:
@@ -164,7 +176,7 @@ async def get_theft_analysis(
             analysis = get_fuel_theft_analysis(days_back=days)
 
         await cache.set(cache_key, analysis, ttl=60)
-        return JSONResponse(content=analysis)
+        return cache_json_response(cache_key, analysis, ttl=60)
     except Exception as e:
         logger.error(f"Error in theft analysis: {e}")
         raise HTTPException(
@@ -6,12 +6,16 @@ Per-truck MPG history endpoint for frontend visualization
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
+import numpy as np
 import pymysql
 from fastapi import APIRouter, HTTPException, Query
 from logger_config import get_logger
 from pydantic import BaseModel
 
 from database_mysql import get_db_connection
+from downsampling import as_epoch, bands_to_records, bucket_bands, lttb_indices
+from fuel_metrics_timeseries import columns_to_records, get_timeseries_store
+from truck_specs_engine import get_expected_mpg
 
 logger = get_logger(__name__)
 
@@ -28,6 +32,16 @@ class MPGHistoryPoint(BaseModel):
     consumption_gph: Optional[float] = None
 
 
+class MPGBand(BaseModel):
+    """min/max/avg MPG of one time bucket"""
+
+    timestamp: datetime
+    min: float
+    max: float
+    avg: float
+    count: int
+
+
 class TruckMPGHistory(BaseModel):
     """Complete MPG history for a truck"""
 
@@ -39,12 +53,20 @@ class TruckMPGHistory(BaseModel):
     max_mpg: float
     baseline_mpg: Optional[float] = None
     deviation_pct: Optional[float] = None
+    total_points: Optional[int] = None
+    bands: Optional[List[MPGBand]] = None
 
 
 @router.get("/{truck_id}/mpg-history", response_model=TruckMPGHistory)
 async def get_truck_mpg_history(
     truck_id: str,
     hours: int = Query(24, ge=1, le=168, description="Hours of history (1-168)"),
+    max_points: Optional[int] = Query(
+        None,
+        ge=10,
+        le=5000,
+        description="Downsample to at most N points (LTTB) and add min/max/avg bands",
+    ),
 ):
     """
     Get MPG history for a specific truck
@@ -54,64 +76,89 @@ async def get_truck_mpg_history(
     Args:
         truck_id: Truck identifier
         hours: Number of hours to retrieve (default 24, max 168 = 1 week)
+        max_points: Optional point budget; statistics still use every reading
 
     Returns:
         MPG history with statistics and baseline comparison
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(pymysql.cursors.DictCursor)
-
-        # Calculate time range
-        end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(hours=hours)
-
-        # Get MPG history - only valid readings
-        cursor.execute(
-            """
-            SELECT 
-                timestamp_utc,
-                mpg_current as mpg,
-                truck_status,
-                speed_mph,
-                consumption_gph
-            FROM fuel_metrics
-            WHERE truck_id = %s
-                AND timestamp_utc >= %s
-                AND timestamp_utc <= %s
-                AND mpg_current > 3.5 AND mpg_current < 12  -- Valid MPG range
-                AND truck_status = 'MOVING'  -- Only moving MPG
-            ORDER BY timestamp_utc ASC
-        """,
-            (truck_id, start_time, end_time),
+        # 🆕 v5.12.2: MPG points from the in-process fuel_metrics time-series store
+        records = None
+        cols = get_timeseries_store().get_columns(
+            truck_id,
+            hours,
+            ["mpg_current", "truck_status", "speed_mph", "consumption_gph"],
         )
+        if cols is not None:
+            mpg = cols["mpg_current"]
+            with np.errstate(invalid="ignore"):
+                valid = (mpg > 3.5) & (mpg < 12) & (cols["truck_status"] == "MOVING")
+            records = columns_to_records(
+                {
+                    "timestamp_utc": cols["timestamp_utc"][valid],
+                    "mpg": mpg[valid],
+                    "truck_status": cols["truck_status"][valid],
+                    "speed_mph": cols["speed_mph"][valid],
+                    "consumption_gph": cols["consumption_gph"][valid],
+                }
+            )
 
-        records = cursor.fetchall()
+        baseline_mpg = None
+        if records is None:
+            # Store not warm yet for this truck: read MySQL directly
+            end_time = datetime.now(timezone.utc)
+            start_time = end_time - timedelta(hours=hours)
+
+            conn = get_db_connection()
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    # Get MPG history - only valid readings
+                    cursor.execute(
+                        """
+                        SELECT 
+                            timestamp_utc,
+                            mpg_current as mpg,
+                            truck_status,
+                            speed_mph,
+                            consumption_gph
+                        FROM fuel_metrics
+                        WHERE truck_id = %s
+                            AND timestamp_utc >= %s
+                            AND timestamp_utc <= %s
+                            AND mpg_current > 3.5 AND mpg_current < 12  -- Valid MPG range
+                            AND truck_status = 'MOVING'  -- Only moving MPG
+                        ORDER BY timestamp_utc ASC
+                    """,
+                        (truck_id, start_time, end_time),
+                    )
+                    records = cursor.fetchall()
+
+                    # Get baseline MPG from truck_specs
+                    if records:
+                        cursor.execute(
+                            """
+                            SELECT baseline_mpg_loaded
+                            FROM truck_specs
+                            WHERE truck_id = %s
+                        """,
+                            (truck_id,),
+                        )
+                        baseline_row = cursor.fetchone()
+                        baseline_mpg = (
+                            baseline_row["baseline_mpg_loaded"] if baseline_row else None
+                        )
+            finally:
+                conn.close()
+        else:
+            # 🆕 v5.12.2: Served from memory - baseline from the cached truck_specs
+            baseline_mpg = get_expected_mpg(truck_id)
 
         if not records:
-            cursor.close()
-            conn.close()
             raise HTTPException(
                 status_code=404,
                 detail=f"No MPG history found for {truck_id} in last {hours} hours",
             )
 
-        # Get baseline MPG from truck_specs
-        cursor.execute(
-            """
-            SELECT baseline_mpg_loaded
-            FROM truck_specs
-            WHERE truck_id = %s
-        """,
-            (truck_id,),
-        )
-
-        baseline_row = cursor.fetchone()
-        baseline_mpg = baseline_row["baseline_mpg_loaded"] if baseline_row else None
-
-        cursor.close()
-        conn.close()
-
         # Convert to data points
         data_points = [
             MPGHistoryPoint(
@@ -130,6 +177,22 @@ async def get_truck_mpg_history(
         min_mpg = min(mpg_values)
         max_mpg = max(mpg_values)
 
+        # 🆕 v5.12.3: Reduce points for the chart after computing statistics
+        bands = None
+        if max_points and len(data_points) > max_points:
+            # naive timestamp_utc is UTC, not host-local time
+            epochs = as_epoch([p.timestamp for p in data_points])
+            values = np.array(mpg_values, dtype=float)
+            bands = [
+                MPGBand(**band)
+                for band in bands_to_records(
+                    bucket_bands(epochs, values, max(1, max_points // 4))
+                )
+            ]
+            data_points = [
+                data_points[i] for i in lttb_indices(epochs, values, max_points)
+            ]
+
         # Calculate deviation from baseline
         deviation_pct = None
         if baseline_mpg and baseline_mpg > 0:
@@ -146,6 +209,8 @@ async def get_truck_mpg_history(
             deviation_pct=(
                 round(deviation_pct, 1) if deviation_pct is not None else None
             ),
+            total_points=len(mpg_values),
+            bands=bands,
         )
 
     except HTTPException:
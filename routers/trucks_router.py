@@ -22,6 +22,7 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from database import db
+from downsampling import downsample_records, record_bands
 from observability import logger
 
 # Try importing optional dependencies
@@ -205,6 +206,9 @@ async def get_truck_refuel_history(
 async def get_truck_history(
     truck_id: str,
     hours: int = Query(24, ge=1, le=168, description="Hours of history (1-168)"),
+    max_points: Optional[int] = Query(
+        None, ge=10, le=5000, description="Downsample to at most N points (LTTB)"
+    ),
 ):
     """Get historical data for a truck."""
     try:
@@ -226,13 +230,18 @@ async def get_truck_history(
                     "timestamp": rec.get("timestamp"),
                     "mpg": mpg_valid,
                     "idle_gph": sanitize_nan(rec.get("idle_consumption_gph")),
-                    "fuel_percent": sanitize_nan(rec.get("fuel_percent")),
+                    "fuel_percent": sanitize_nan(rec.get("estimated_pct")),
                     "speed_mph": sanitize_nan(rec.get("speed_mph")),
                     "status": rec.get("status"),
                 }
             )
 
-        return history
+        return downsample_records(
+            history,
+            max_points,
+            x_key="timestamp",
+            y_keys=("fuel_percent", "mpg", "speed_mph"),
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -243,6 +252,9 @@ async def get_truck_history(
 async def get_truck_sensor_history(
     truck_id: str,
     hours: int = Query(24, ge=1, le=168, description="Hours of history"),
+    max_points: Optional[int] = Query(
+        None, ge=10, le=5000, description="Downsample to at most N points (LTTB)"
+    ),
 ):
     """Get sensor history with drift analysis for a truck."""
     try:
@@ -264,7 +276,12 @@ async def get_truck_sensor_history(
 
         return {
             "truck_id": truck_id,
-            "data": sensor_data,
+            "data": downsample_records(
+                sensor_data,
+                max_points,
+                x_key="timestamp",
+                y_keys=("sensor_pct", "estimated_pct"),
+            ),
             "hours": hours,
         }
     except Exception as e:
@@ -277,6 +294,12 @@ async def get_truck_sensor_history(
 async def get_truck_fuel_trend(
     truck_id: str,
     hours: int = Query(24, ge=1, le=168, description="Hours of history"),
+    max_points: Optional[int] = Query(
+        None,
+        ge=10,
+        le=5000,
+        description="Downsample to at most N points (LTTB) and add min/max/avg bands",
+    ),
 ):
     """Get fuel level trend for a truck."""
     try:
@@ -296,11 +319,18 @@ async def get_truck_fuel_trend(
                 }
             )
 
-        return {
+        response = {
             "truck_id": truck_id,
-            "data": trend_data,
+            "data": downsample_records(
+                trend_data, max_points, x_key="timestamp", y_keys=("fuel_pct",)
+            ),
             "hours": hours,
         }
+        if max_points and len(trend_data) > max_points:
+            response["bands"] = record_bands(
+                trend_data, "timestamp", "fuel_pct", n_buckets=max_points // 4
+            )
+        return response
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching fuel trend: {str(e)}"
@@ -9,6 +9,11 @@ Features:
 - Track sensor health over time
 - Alert on potential sensor failures
 - Nelson Rules statistical analysis
+
+🆕 v5.12.9: Anomaly, health and fleet reads are served from the streaming
+SensorStatsStore (Welford / EWMA / rolling quantiles per truck and sensor,
+fed by the sync cycle) whenever it covers the requested window; the SQL scan
+below stays as the fallback.
 """
 
 import logging
@@ -152,8 +157,27 @@ class SensorAnomalyDetector:
         },
     }
 
-    def __init__(self):
-        pass
+    def __init__(self, stats_store=None):
+        self._stats_store = stats_store
+
+    # =========================================================================
+    # 🆕 v5.12.9: STREAMING STATS (O(1) reads)
+    # =========================================================================
+    @property
+    def stats_store(self):
+        if self._stats_store is None:
+            from sensor_stats_store import get_sensor_stats_store
+
+            self._stats_store = get_sensor_stats_store()
+        return self._stats_store
+
+    def _streamed(self, truck_id: str, sensor_name: str, hours: int) -> bool:
+        """True if the stats store has this sensor's full history for `hours`"""
+        try:
+            return self.stats_store.covers(truck_id, sensor_name, hours)
+        except Exception as e:
+            logger.debug(f"Sensor stats store unavailable: {e}")
+            return False
 
     # =========================================================================
     # ANOMALY DETECTION
@@ -174,6 +198,27 @@ class SensorAnomalyDetector:
             logger.error(f"Unknown sensor: {sensor_name}")
             return []
 
+        if self._streamed(truck_id, sensor_name, hours):
+            return [
+                SensorAnomaly(
+                    truck_id=truck_id,
+                    sensor_name=sensor_name,
+                    anomaly_type=kind,
+                    severity=severity,
+                    timestamp=datetime.fromtimestamp(ts, tz=timezone.utc).replace(
+                        tzinfo=None
+                    ),
+                    value=value,
+                    expected_value=expected,
+                    deviation=deviation,
+                    duration_minutes=duration,
+                    description=description,
+                )
+                for ts, kind, severity, value, expected, deviation, duration, description in (
+                    self.stats_store.get_anomalies(truck_id, sensor_name, hours)
+                )
+            ]
+
         # Get sensor data
         data = self._get_sensor_data(truck_id, sensor_config["column"], hours)
 
@@ -325,6 +370,19 @@ class SensorAnomalyDetector:
         hours: int,
     ) -> List[Dict]:
         """Get sensor data from database."""
+        # 🆕 v5.12.2: In-process fuel_metrics time-series store first
+        try:
+            from fuel_metrics_timeseries import columns_to_records, get_timeseries_store
+
+            cols = get_timeseries_store().get_columns(truck_id, hours, [column])
+            if cols is not None:
+                return [
+                    {"timestamp": rec["timestamp_utc"], "value": rec[column]}
+                    for rec in columns_to_records(cols)
+                ]
+        except Exception as e:
+            logger.debug(f"Time-series store unavailable for {truck_id}: {e}")
+
         try:
             with get_db_connection() as conn:
                 with conn.cursor() as cursor:
@@ -362,6 +420,25 @@ class SensorAnomalyDetector:
         - Data completeness
         - Deviation from expected values
         """
+        if self._streamed(truck_id, sensor_name, 168):
+            store = self.stats_store
+            day = store.get_counts(truck_id, sensor_name, 24)
+            week = store.get_counts(truck_id, sensor_name, 168)
+            return self._build_health(
+                truck_id,
+                sensor_name,
+                last_reading=store.last_reading(truck_id, sensor_name),
+                count_24h=day["count"],
+                count_7d=week["count"],
+                critical_24h=day["critical"],
+                high_24h=day["high"],
+                stuck_24h=day["stuck"] > 0,
+                noise_24h=day["noise"] > 0,
+                avg_deviation=(
+                    week["deviation_sum"] / week["count"] if week["count"] else 0
+                ),
+            )
+
         # Get recent anomalies
         anomalies_24h = self.detect_anomalies(truck_id, sensor_name, 24)
         anomalies_7d = self.detect_anomalies(truck_id, sensor_name, 168)
@@ -371,15 +448,43 @@ class SensorAnomalyDetector:
         data = self._get_sensor_data(truck_id, sensor_config["column"], 1)
         last_reading = data[-1]["timestamp"] if data else None
 
+        # Calculate average deviation
+        deviations = [a.deviation for a in anomalies_7d if a.deviation is not None]
+        avg_deviation = statistics.mean(deviations) if deviations else 0
+
+        return self._build_health(
+            truck_id,
+            sensor_name,
+            last_reading=last_reading,
+            count_24h=len(anomalies_24h),
+            count_7d=len(anomalies_7d),
+            critical_24h=sum(1 for a in anomalies_24h if a.severity == "critical"),
+            high_24h=sum(1 for a in anomalies_24h if a.severity == "high"),
+            stuck_24h=any(a.anomaly_type == AnomalyType.STUCK for a in anomalies_24h),
+            noise_24h=any(a.anomaly_type == AnomalyType.NOISE for a in anomalies_24h),
+            avg_deviation=avg_deviation,
+        )
+
+    def _build_health(
+        self,
+        truck_id: str,
+        sensor_name: str,
+        last_reading: Optional[datetime],
+        count_24h: int,
+        count_7d: int,
+        critical_24h: int,
+        high_24h: int,
+        stuck_24h: bool,
+        noise_24h: bool,
+        avg_deviation: float,
+    ) -> SensorHealth:
+        """Score health from anomaly counts (shared by the SQL and stream paths)"""
         # Calculate health score
-        anomaly_penalty_24h = len(anomalies_24h) * 5  # 5 points per anomaly
-        anomaly_penalty_7d = len(anomalies_7d) * 0.5  # 0.5 points per older anomaly
+        anomaly_penalty_24h = count_24h * 5  # 5 points per anomaly
+        anomaly_penalty_7d = count_7d * 0.5  # 0.5 points per older anomaly
 
         # Check severity distribution
-        critical_count = sum(1 for a in anomalies_24h if a.severity == "critical")
-        high_count = sum(1 for a in anomalies_24h if a.severity == "high")
-
-        severity_penalty = critical_count * 20 + high_count * 10
+        severity_penalty = critical_24h * 20 + high_24h * 10
 
         # Base score
         health_score = max(
@@ -397,9 +502,9 @@ class SensorAnomalyDetector:
             status = "failed"
 
         # Calculate trend
-        if len(anomalies_24h) < len(anomalies_7d) / 7:
+        if count_24h < count_7d / 7:
             trend = "improving"
-        elif len(anomalies_24h) > len(anomalies_7d) / 7 * 2:
+        elif count_24h > count_7d / 7 * 2:
             trend = "degrading"
         else:
             trend = "stable"
@@ -408,25 +513,21 @@ class SensorAnomalyDetector:
         recommendations = []
         if status == "failing" or status == "failed":
             recommendations.append("Schedule sensor inspection/replacement")
-        if critical_count > 0:
+        if critical_24h > 0:
             recommendations.append("Investigate recent dropouts or erratic readings")
-        if any(a.anomaly_type == AnomalyType.STUCK for a in anomalies_24h):
+        if stuck_24h:
             recommendations.append("Check sensor wiring connections")
-        if any(a.anomaly_type == AnomalyType.NOISE for a in anomalies_24h):
+        if noise_24h:
             recommendations.append("Consider signal filtering or grounding check")
 
-        # Calculate average deviation
-        deviations = [a.deviation for a in anomalies_7d if a.deviation is not None]
-        avg_deviation = statistics.mean(deviations) if deviations else 0
-
         return SensorHealth(
             truck_id=truck_id,
             sensor_name=sensor_name,
             health_score=health_score,
             status=status,
             last_reading=last_reading,
-            anomaly_count_24h=len(anomalies_24h),
-            anomaly_count_7d=len(anomalies_7d),
+            anomaly_count_24h=count_24h,
+            anomaly_count_7d=count_7d,
             avg_deviation=avg_deviation,
             trend=trend,
             recommendations=recommendations,
@@ -441,31 +542,40 @@ class SensorAnomalyDetector:
         sensor_name: str = "fuel_level",
     ) -> Dict[str, Any]:
         """Get sensor health status for all trucks in fleet."""
-        # Get all trucks
-        try:
-            with get_db_connection() as conn:
-                with conn.cursor() as cursor:
-                    where = ""
-                    params = []
-
-                    if carrier_id and carrier_id != "*":
-                        where = "WHERE carrier_id = %s"
-                        params = [carrier_id]
+        # 🆕 v5.12.9: Active trucks straight from the stats store (no carrier filter)
+        trucks = None
+        if not carrier_id or carrier_id == "*":
+            try:
+                trucks = self.stats_store.truck_ids(sensor_name, active_hours=24) or None
+            except Exception as e:
+                logger.debug(f"Sensor stats store unavailable: {e}")
 
-                    cursor.execute(
-                        f"""
-                        SELECT DISTINCT truck_id
-                        FROM fuel_metrics
-                        WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
-                        {where.replace('WHERE', 'AND') if where else ''}
-                        """,
-                        params,
-                    )
-                    trucks = [r["truck_id"] for r in cursor.fetchall()]
+        # Get all trucks
+        if trucks is None:
+            try:
+                with get_db_connection() as conn:
+                    with conn.cursor() as cursor:
+                        where = ""
+                        params = []
+
+                        if carrier_id and carrier_id != "*":
+                            where = "WHERE carrier_id = %s"
+                            params = [carrier_id]
+
+                        cursor.execute(
+                            f"""
+                            SELECT DISTINCT truck_id
+                            FROM fuel_metrics
+                            WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
+                            {where.replace('WHERE', 'AND') if where else ''}
+                            """,
+                            params,
+                        )
+                        trucks = [r["truck_id"] for r in cursor.fetchall()]
 
-        except Exception as e:
-            logger.error(f"Error getting trucks: {e}")
-            trucks = []
+            except Exception as e:
+                logger.error(f"Error getting trucks: {e}")
+                trucks = []
 
         # Analyze each truck
         truck_health = []
@@ -0,0 +1,769 @@
+"""
+Sensor Stats Store v5.12.9
+═══════════════════════════════════════════════════════════════════════════════
+
+Incremental per-(truck, sensor) statistics and anomaly counters maintained
+from the sync cycle.
+
+SensorAnomalyDetector used to pull 24h (and 7d for health) of a column per
+truck per sensor and rerun mean/stdev plus every rule scan from scratch;
+get_fleet_sensor_status multiplied that by every truck. This store keeps a
+constant-size streaming state per (truck, sensor) instead:
+
+- Welford running mean / variance, min / max
+- EWMA mean / variance (span EWMA_SPAN readings) - the spike rule scores
+  each reading against the recent regime, not the whole history
+- Rolling quantiles (p05 / p50 / p95) over the last WINDOW_SIZE readings
+- The detector's rules evaluated per reading (out of range, >3σ spike,
+  stuck, rapid change, dropout, alternating noise)
+- Hourly anomaly counters for the last 7 days and the most recent anomalies
+
+Every sync cycle feeds the row it just wrote (`update`); health and anomaly
+reads are O(1) per truck. The sync process owns the persisted JSON file and
+API processes reload it by mtime (same model as mpg_baseline_store). After a
+restart, trucks the store hasn't seen are replayed from fuel_metrics in a
+background backfill.
+
+Usage:
+    store = get_sensor_stats_store()
+
+    # Sync cycle
+    store.update("CO0681", metrics, timestamp=metrics["timestamp_utc"])
+
+    # API
+    store.covers("CO0681", "fuel_level", hours=24)
+    store.get_anomalies("CO0681", "fuel_level", hours=24)
+    store.get_counts("CO0681", "fuel_level", hours=168)
+    store.get_sensor_stats("CO0681", "fuel_level")
+
+Author: Fuel Copilot Team
+Version: 5.12.9
+"""
+
+import bisect
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RULE PARAMETERS (same as SensorAnomalyDetector.detect_anomalies)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+WARMUP_READINGS = 10  # batch path needs >= 10 readings before scoring
+SPIKE_Z = 3.0
+STUCK_READINGS = 10
+NOISE_ALTERNATIONS = 14
+DROPOUT_FROM = 10.0
+
+EWMA_SPAN = 120  # readings (~30 min at the 15s sync interval)
+WINDOW_SIZE = 120  # rolling quantile window
+QUANTILES = (0.05, 0.5, 0.95)
+HISTORY_HOURS = 168  # hourly counters kept (7d health)
+RECENT_ANOMALIES = 200
+
+# Hourly slot layout: [count, critical, high, stuck, noise, deviation_sum]
+_COUNT, _CRITICAL, _HIGH, _STUCK, _NOISE, _DEV_SUM = range(6)
+
+
+def _to_epoch(timestamp) -> float:
+    """Accept datetime (naive = UTC), epoch float or None"""
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+def _quantile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated quantile (numpy default) of a sorted list"""
+    n = len(sorted_values)
+    if n == 0:
+        return None
+    pos = (n - 1) * q
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, n - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PER-(TRUCK, SENSOR) STREAMING STATE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class StreamingSensorStats:
+    """
+    Constant-size statistics + rule state for one sensor of one truck.
+
+    Anomalies are tuples (ts, type, severity, value, expected, deviation,
+    duration_minutes, description) so they serialize as JSON arrays.
+    """
+
+    __slots__ = (
+        "count",
+        "mean",
+        "m2",
+        "min_value",
+        "max_value",
+        "ewma",
+        "ewm_var",
+        "origin_ts",
+        "first_ts",
+        "last_ts",
+        "prev",
+        "prev_diff",
+        "stuck_count",
+        "alternations",
+        "window",
+        "window_ts",
+        "sorted_window",
+        "hourly",
+        "recent",
+    )
+
+    ALPHA = 2.0 / (EWMA_SPAN + 1)
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_value = math.inf
+        self.max_value = -math.inf
+        self.ewma = 0.0
+        self.ewm_var = 0.0
+        self.origin_ts: Optional[float] = None  # history is complete from here
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.prev: Optional[float] = None
+        self.prev_diff = 0.0
+        self.stuck_count = 0
+        self.alternations = 0
+        self.window: deque = deque(maxlen=WINDOW_SIZE)
+        self.window_ts: deque = deque(maxlen=WINDOW_SIZE)
+        self.sorted_window: List[float] = []
+        self.hourly: Dict[int, List[float]] = {}
+        self.recent: deque = deque(maxlen=RECENT_ANOMALIES)
+
+    @property
+    def std_dev(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2 / (self.count - 1), 0.0))
+
+    @property
+    def ewm_std(self) -> float:
+        return math.sqrt(max(self.ewm_var, 0.0))
+
+    def add(self, value: float, ts: float, config: Dict[str, Any]) -> List[tuple]:
+        """Feed one reading; returns the anomalies it triggered"""
+        found: List[tuple] = []
+        prev = self.prev
+        center = self.ewma if self.count else value
+
+        # 1. Out of range
+        if value < config["min"] or value > config["max"]:
+            found.append(
+                (
+                    ts,
+                    "out_of_range",
+                    "high",
+                    value,
+                    (config["min"] + config["max"]) / 2,
+                    value - center,
+                    0,
+                    f"Value {value:.1f} outside valid range [{config['min']}-{config['max']}]",
+                )
+            )
+
+        # 2. Spike against the recent regime (>3σ of the EWMA)
+        std = self.ewm_std
+        if self.count >= WARMUP_READINGS and std > 0:
+            z_score = abs(value - self.ewma) / std
+            if z_score > SPIKE_Z:
+                found.append(
+                    (
+                        ts,
+                        "spike",
+                        "medium" if z_score < 4 else "high",
+                        value,
+                        self.ewma,
+                        z_score,
+                        0,
+                        f"Value {value:.1f} is {z_score:.1f}σ from mean ({self.ewma:.1f})",
+                    )
+                )
+
+        if prev is not None:
+            diff = value - prev
+
+            # 3. Stuck sensor
+            if diff == 0:
+                self.stuck_count += 1
+                if self.stuck_count >= STUCK_READINGS:
+                    minutes = self.stuck_count // 2
+                    found.append(
+                        (
+                            ts,
+                            "stuck",
+                            "high",
+                            value,
+                            None,
+                            0,
+                            minutes,
+                            f"Sensor stuck at {value:.1f} for {minutes} minutes",
+                        )
+                    )
+                    self.stuck_count = 0
+            else:
+                self.stuck_count = 0
+
+            # 4. Rapid change
+            change = abs(diff)
+            if change > config["max_change_per_30s"] * 2:
+                found.append(
+                    (
+                        ts,
+                        "spike",
+                        "medium",
+                        value,
+                        prev,
+                        change,
+                        0,
+                        f"Rapid change: {prev:.1f} → {value:.1f} (Δ{change:.1f})",
+                    )
+                )
+
+            # 5. Dropout
+            if value == 0 and prev > DROPOUT_FROM:
+                found.append(
+                    (ts, "dropout", "critical", value, prev, prev, 0, f"Sensor dropout: {prev:.1f} → 0")
+                )
+
+            # 6. Alternating noise (needs two consecutive differences)
+            if len(self.window) >= 2:
+                if diff * self.prev_diff < 0:
+                    self.alternations += 1
+                else:
+                    if self.alternations >= NOISE_ALTERNATIONS:
+                        back = self.alternations // 2
+                        mid_ts = (
+                            self.window_ts[-back]
+                            if back <= len(self.window_ts)
+                            else self.window_ts[0]
+                        )
+                        found.append(
+                            (
+                                mid_ts,
+                                "noise",
+                                "low",
+                                value,
+                                self.ewma,
+                                std,
+                                back,
+                                f"High noise detected: {self.alternations} alternating readings",
+                            )
+                        )
+                    self.alternations = 0
+            self.prev_diff = diff
+
+        # Welford
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min_value = min(self.min_value, value)
+        self.max_value = max(self.max_value, value)
+
+        # EWMA mean / variance
+        if self.count == 1:
+            self.ewma, self.ewm_var = value, 0.0
+        else:
+            diff_ewma = value - self.ewma
+            incr = self.ALPHA * diff_ewma
+            self.ewma += incr
+            self.ewm_var = (1 - self.ALPHA) * (self.ewm_var + diff_ewma * incr)
+
+        # Rolling window (sorted copy for quantiles)
+        if len(self.window) == WINDOW_SIZE:
+            oldest = self.window[0]
+            del self.sorted_window[bisect.bisect_left(self.sorted_window, oldest)]
+        self.window.append(value)
+        self.window_ts.append(ts)
+        bisect.insort(self.sorted_window, value)
+
+        if self.first_ts is None:
+            self.first_ts = ts
+        if self.origin_ts is None:
+            self.origin_ts = ts
+        self.last_ts = ts if self.last_ts is None else max(self.last_ts, ts)
+        self.prev = value
+
+        for anomaly in found:
+            self._record(anomaly)
+        return found
+
+    def _record(self, anomaly: tuple):
+        hour = int(anomaly[0] // 3600)
+        slot = self.hourly.get(hour)
+        if slot is None:
+            slot = self.hourly[hour] = [0, 0, 0, 0, 0, 0.0]
+            oldest = hour - HISTORY_HOURS
+            for h in [h for h in self.hourly if h <= oldest]:
+                del self.hourly[h]
+        severity, kind = anomaly[2], anomaly[1]
+        slot[_COUNT] += 1
+        slot[_CRITICAL] += severity == "critical"
+        slot[_HIGH] += severity == "high"
+        slot[_STUCK] += kind == "stuck"
+        slot[_NOISE] += kind == "noise"
+        slot[_DEV_SUM] += anomaly[5] or 0.0
+        self.recent.append(anomaly)
+
+    def counts(self, hours: int, now: float) -> List[float]:
+        """Summed hourly slots for the last `hours` (hour granularity)"""
+        first_hour = int((now - hours * 3600) // 3600)
+        total = [0, 0, 0, 0, 0, 0.0]
+        for hour, slot in self.hourly.items():
+            if hour >= first_hour:
+                for i, v in enumerate(slot):
+                    total[i] += v
+        return total
+
+    def quantiles(self) -> Dict[str, Optional[float]]:
+        return {f"p{int(q * 100):02d}": _quantile(self.sorted_window, q) for q in QUANTILES}
+
+    def to_list(self) -> list:
+        """Compact serialization (one JSON array per truck/sensor)"""
+        return [
+            self.count,
+            self.mean,
+            self.m2,
+            None if math.isinf(self.min_value) else self.min_value,
+            None if math.isinf(self.max_value) else self.max_value,
+            self.ewma,
+            self.ewm_var,
+            self.origin_ts,
+            self.first_ts,
+            self.last_ts,
+            self.prev,
+            self.prev_diff,
+            self.stuck_count,
+            self.alternations,
+            list(self.window),
+            list(self.window_ts),
+            [[h] + s for h, s in self.hourly.items()],
+            [list(a) for a in self.recent],
+        ]
+
+    @classmethod
+    def from_list(cls, data: list) -> "StreamingSensorStats":
+        state = cls()
+        (
+            state.count,
+            state.mean,
+            state.m2,
+            min_value,
+            max_value,
+            state.ewma,
+            state.ewm_var,
+            state.origin_ts,
+            state.first_ts,
+            state.last_ts,
+            state.prev,
+            state.prev_diff,
+            state.stuck_count,
+            state.alternations,
+            window,
+            window_ts,
+            hourly,
+            recent,
+        ) = data
+        state.min_value = math.inf if min_value is None else min_value
+        state.max_value = -math.inf if max_value is None else max_value
+        state.window.extend(window)
+        state.window_ts.extend(window_ts)
+        state.sorted_window = sorted(state.window)
+        state.hourly = {int(row[0]): list(row[1:]) for row in hourly}
+        state.recent.extend(tuple(a) for a in recent)
+        return state
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FLEET STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+class SensorStatsStore:
+    """
+    Fleet-wide incremental sensor statistics.
+
+    The sync process owns the persisted file (updates + periodic save);
+    API processes read it and pick up new versions by file mtime.
+    """
+
+    DEFAULT_STORE_FILE = "data/sensor_stats.json"
+    SAVE_INTERVAL = 200  # Save every N truck updates
+    RELOAD_CHECK_SECONDS = 30  # How often readers look for a newer file
+    COVERAGE_SLACK_SECONDS = 600  # a sync gap this short still counts as covered
+
+    BACKFILL_QUERY = """
+        SELECT timestamp_utc, {columns}
+        FROM fuel_metrics
+        WHERE truck_id = %s
+          AND timestamp_utc >= DATE_SUB(NOW(), INTERVAL %s HOUR)
+        ORDER BY timestamp_utc
+    """
+
+    def __init__(
+        self,
+        store_file: str = None,
+        auto_load: bool = True,
+        sensors: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        if sensors is None:
+            from sensor_anomaly import SensorAnomalyDetector
+
+            sensors = SensorAnomalyDetector.SENSORS
+        self.sensors = sensors
+        self._states: Dict[Tuple[str, str], StreamingSensorStats] = {}
+        self._store_file = store_file or self.DEFAULT_STORE_FILE
+        self._lock = threading.RLock()
+        self._update_count = 0
+        self._dirty = False
+        self._file_mtime = 0.0
+        self._last_reload_check = 0.0
+        self._backfill_thread: Optional[threading.Thread] = None
+
+        if auto_load:
+            self.load_from_file(self._store_file)
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Writes (sync cycle)
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def update(self, truck_id: str, readings: Dict[str, Any], timestamp=None) -> int:
+        """
+        Feed one fuel_metrics row (column → value) for every configured sensor.
+
+        Returns:
+            Number of anomalies triggered by this row
+        """
+        ts = _to_epoch(timestamp)
+        found = 0
+        with self._lock:
+            for sensor_name, config in self.sensors.items():
+                value = readings.get(config["column"])
+                if value is None:
+                    continue
+                key = (truck_id, sensor_name)
+                state = self._states.get(key)
+                if state is None:
+                    state = self._states[key] = StreamingSensorStats()
+                found += len(state.add(float(value), ts, config))
+
+            self._dirty = True
+            self._update_count += 1
+            if self._update_count >= self.SAVE_INTERVAL:
+                self._auto_save()
+        return found
+
+    def rebuild_from_rows(self, truck_id: str, rows: Iterable[Dict[str, Any]], since: float):
+        """
+        Replace a truck's states by replaying historical rows oldest-first.
+
+        `since` is where the replayed history starts, so the truck counts as
+        covered from there even if its first reading is later.
+        """
+        states: Dict[str, StreamingSensorStats] = {}
+        for sensor_name in self.sensors:
+            state = StreamingSensorStats()
+            state.origin_ts = since
+            states[sensor_name] = state
+
+        for row in sorted(rows, key=lambda r: _to_epoch(r["timestamp_utc"])):
+            ts = _to_epoch(row["timestamp_utc"])
+            for sensor_name, config in self.sensors.items():
+                value = row.get(config["column"])
+                if value is not None:
+                    states[sensor_name].add(float(value), ts, config)
+
+        with self._lock:
+            for sensor_name, state in states.items():
+                self._states[(truck_id, sensor_name)] = state
+            self._dirty = True
+
+    def backfill_from_connection(
+        self,
+        connection,
+        truck_ids: Iterable[str],
+        hours: int = HISTORY_HOURS,
+    ) -> int:
+        """
+        Rebuild trucks from fuel_metrics (one query per truck, so memory stays
+        bounded by a single truck's history).
+
+        Returns:
+            Number of trucks rebuilt
+        """
+        started = time.time()
+        columns = [config["column"] for config in self.sensors.values()]
+        sql = self.BACKFILL_QUERY.format(columns=", ".join(columns))
+        rebuilt = 0
+        for truck_id in truck_ids:
+            since = time.time() - hours * 3600
+            with connection.cursor() as cursor:
+                cursor.execute(sql, (truck_id, hours))
+                rows = cursor.fetchall()
+            if rows and not isinstance(rows[0], dict):
+                names = ["timestamp_utc"] + columns
+                rows = [dict(zip(names, r)) for r in rows]
+            self.rebuild_from_rows(truck_id, rows, since)
+            rebuilt += 1
+
+        logger.info(
+            f"📊 Sensor stats backfill: {rebuilt} trucks in {time.time() - started:.2f}s"
+        )
+        return rebuilt
+
+    def start_background_backfill(
+        self,
+        connection_factory: Callable,
+        truck_ids: Iterable[str],
+        hours: int = HISTORY_HOURS,
+        save: bool = True,
+    ) -> bool:
+        """
+        Run `backfill_from_connection` in a daemon thread on its own connection.
+
+        Returns:
+            False if a backfill is already running
+        """
+        if self._backfill_thread is not None and self._backfill_thread.is_alive():
+            logger.info("Sensor stats backfill already running, skipping")
+            return False
+        truck_ids = list(truck_ids)
+
+        def _run():
+            connection = None
+            try:
+                connection = connection_factory()
+                self.backfill_from_connection(connection, truck_ids, hours=hours)
+                if save:
+                    self.save_to_file(self._store_file)
+            except Exception as e:
+                logger.error(f"Sensor stats backfill failed: {e}")
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+        self._backfill_thread = threading.Thread(
+            target=_run, name="sensor-stats-backfill", daemon=True
+        )
+        self._backfill_thread.start()
+        return True
+
+    def missing_trucks(self, truck_ids: Iterable[str], hours: int = HISTORY_HOURS) -> List[str]:
+        """Trucks whose history in the store doesn't reach back `hours`"""
+        return [t for t in truck_ids if not self.covers(t, None, hours, reload=False)]
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Reads (API) - O(1) per truck
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def covers(
+        self, truck_id: str, sensor_name: Optional[str], hours: int, reload: bool = True
+    ) -> bool:
+        """
+        True if the store has the truck's full history for the last `hours`
+        (sensor_name=None: any sensor).
+        """
+        if reload:
+            self._maybe_reload()
+        since = time.time() - hours * 3600 + self.COVERAGE_SLACK_SECONDS
+        names = [sensor_name] if sensor_name else list(self.sensors)
+        with self._lock:
+            for name in names:
+                state = self._states.get((truck_id, name))
+                if state is not None and state.origin_ts is not None and state.origin_ts <= since:
+                    return True
+        return False
+
+    def get_anomalies(self, truck_id: str, sensor_name: str, hours: int) -> List[tuple]:
+        """Most recent anomalies (oldest first) within the last `hours`"""
+        self._maybe_reload()
+        since = time.time() - hours * 3600
+        with self._lock:
+            state = self._states.get((truck_id, sensor_name))
+            if state is None:
+                return []
+            return [a for a in state.recent if a[0] >= since]
+
+    def get_counts(self, truck_id: str, sensor_name: str, hours: int) -> Dict[str, float]:
+        """Anomaly counters for the last `hours` (hour granularity)"""
+        self._maybe_reload()
+        with self._lock:
+            state = self._states.get((truck_id, sensor_name))
+            slot = state.counts(hours, time.time()) if state else [0, 0, 0, 0, 0, 0.0]
+        return {
+            "count": int(slot[_COUNT]),
+            "critical": int(slot[_CRITICAL]),
+            "high": int(slot[_HIGH]),
+            "stuck": int(slot[_STUCK]),
+            "noise": int(slot[_NOISE]),
+            "deviation_sum": slot[_DEV_SUM],
+        }
+
+    def last_reading(self, truck_id: str, sensor_name: str) -> Optional[datetime]:
+        with self._lock:
+            state = self._states.get((truck_id, sensor_name))
+            if state is None or state.last_ts is None:
+                return None
+        return datetime.fromtimestamp(state.last_ts, tz=timezone.utc).replace(tzinfo=None)
+
+    def get_sensor_stats(self, truck_id: str, sensor_name: str) -> Optional[Dict[str, Any]]:
+        """Running statistics of one sensor (None if never seen)"""
+        self._maybe_reload()
+        with self._lock:
+            state = self._states.get((truck_id, sensor_name))
+            if state is None:
+                return None
+            return {
+                "count": state.count,
+                "mean": state.mean,
+                "std_dev": state.std_dev,
+                "min": None if math.isinf(state.min_value) else state.min_value,
+                "max": None if math.isinf(state.max_value) else state.max_value,
+                "ewma": state.ewma,
+                "ewm_std": state.ewm_std,
+                "last_value": state.prev,
+                **state.quantiles(),
+            }
+
+    def truck_ids(self, sensor_name: str, active_hours: int = 24) -> List[str]:
+        """Trucks with a reading of `sensor_name` in the last `active_hours`"""
+        self._maybe_reload()
+        since = time.time() - active_hours * 3600
+        with self._lock:
+            return sorted(
+                truck_id
+                for (truck_id, name), state in self._states.items()
+                if name == sensor_name and state.last_ts is not None and state.last_ts >= since
+            )
+
+    def get_stats(self) -> dict:
+        """Store health for monitoring endpoints"""
+        with self._lock:
+            return {
+                "trucks": len({truck_id for truck_id, _ in self._states}),
+                "states": len(self._states),
+                "pending_updates": self._update_count,
+                "dirty": self._dirty,
+                "store_file": self._store_file,
+                "backfill_running": bool(
+                    self._backfill_thread and self._backfill_thread.is_alive()
+                ),
+            }
+
+    # ───────────────────────────────────────────────────────────────────────────
+    # Persistence
+    # ───────────────────────────────────────────────────────────────────────────
+
+    def save_to_file(self, filepath: str = None):
+        """Atomically save all states as compact JSON"""
+        filepath = filepath or self._store_file
+        with self._lock:
+            data = {
+                "version": 1,
+                "saved_at": time.time(),
+                "states": {
+                    f"{truck_id}|{sensor}": s.to_list()
+                    for (truck_id, sensor), s in self._states.items()
+                },
+            }
+            self._dirty = False
+            self._update_count = 0
+
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        self._file_mtime = path.stat().st_mtime
+        logger.debug(f"💾 Saved sensor stats for {len(data['states'])} truck/sensor pairs")
+
+    def load_from_file(self, filepath: str = None):
+        """Load states from file (states in the file replace in-memory ones)"""
+        filepath = filepath or self._store_file
+        path = Path(filepath)
+        if not path.exists():
+            logger.info(f"No sensor stats store at {filepath}, starting fresh")
+            return
+
+        try:
+            mtime = path.stat().st_mtime
+            with open(path, "r") as f:
+                data = json.load(f)
+            states = {}
+            for key, values in data.get("states", {}).items():
+                truck_id, sensor = key.rsplit("|", 1)
+                states[(truck_id, sensor)] = StreamingSensorStats.from_list(values)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load sensor stats store: {e}")
+            return
+
+        with self._lock:
+            self._states.update(states)
+            self._file_mtime = mtime
+
+        logger.info(f"Loaded sensor stats for {len(states)} truck/sensor pairs")
+
+    def flush(self):
+        """Save pending updates (call at end of sync cycle / on shutdown)"""
+        if self._dirty:
+            self._auto_save()
+
+    def _auto_save(self):
+        try:
+            self.save_to_file(self._store_file)
+        except Exception as e:
+            logger.error(f"Sensor stats store auto-save failed: {e}")
+
+    def _maybe_reload(self):
+        """Pick up a newer file written by the sync process"""
+        now = time.time()
+        if now - self._last_reload_check < self.RELOAD_CHECK_SECONDS:
+            return
+        self._last_reload_check = now
+        try:
+            mtime = os.path.getmtime(self._store_file)
+        except OSError:
+            return
+        if mtime > self._file_mtime:
+            self.load_from_file(self._store_file)
+
+
+# Global store instance
+_sensor_stats_store: Optional[SensorStatsStore] = None
+
+
+def get_sensor_stats_store() -> SensorStatsStore:
+    """Get or create global sensor stats store"""
+    global _sensor_stats_store
+    if _sensor_stats_store is None:
+        _sensor_stats_store = SensorStatsStore()
+    return _sensor_stats_store
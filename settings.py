@@ -71,6 +71,19 @@ class DatabaseSettings:
     pool_recycle: int = field(
         default_factory=lambda: _get_env_int("MYSQL_POOL_RECYCLE", 3600)
     )
+    # 🆕 v5.12.16: connection_manager sizing / leak detection
+    pool_timeout: int = field(
+        default_factory=lambda: _get_env_int("MYSQL_POOL_TIMEOUT", 30)
+    )
+    async_pool_min_size: int = field(
+        default_factory=lambda: _get_env_int("DB_POOL_MIN_SIZE", 5)
+    )
+    async_pool_max_size: int = field(
+        default_factory=lambda: _get_env_int("DB_POOL_MAX_SIZE", 20)
+    )
+    leak_threshold_seconds: float = field(
+        default_factory=lambda: _get_env_float("DB_LEAK_THRESHOLD_SECONDS", 60.0)
+    )
 
     def get_connection_dict(self) -> Dict:
         """Return connection dictionary for pymysql."""
@@ -85,6 +98,43 @@ class DatabaseSettings:
         }
 
 
+@dataclass
+class WialonDatabaseSettings:
+    """Wialon (wialon_collect) MySQL configuration - read-only source DB."""
+
+    host: str = field(default_factory=lambda: _get_env("WIALON_DB_HOST", "localhost"))
+    port: int = field(default_factory=lambda: _get_env_int("WIALON_DB_PORT", 3306))
+    user: str = field(default_factory=lambda: _get_env("WIALON_DB_USER", ""))
+    password: str = field(default_factory=lambda: _get_env("WIALON_DB_PASS", ""))
+    database: str = field(
+        default_factory=lambda: _get_env("WIALON_DB_NAME", "wialon_collect")
+    )
+    charset: str = "utf8mb4"
+
+    # Connection pool
+    pool_size: int = field(
+        default_factory=lambda: _get_env_int("WIALON_DB_POOL_SIZE", 5)
+    )
+    max_overflow: int = field(
+        default_factory=lambda: _get_env_int("WIALON_DB_MAX_OVERFLOW", 5)
+    )
+    pool_recycle: int = field(
+        default_factory=lambda: _get_env_int("WIALON_DB_POOL_RECYCLE", 1800)
+    )
+    pool_timeout: int = field(
+        default_factory=lambda: _get_env_int("WIALON_DB_POOL_TIMEOUT", 30)
+    )
+    async_pool_min_size: int = field(
+        default_factory=lambda: _get_env_int("WIALON_DB_POOL_MIN_SIZE", 1)
+    )
+    async_pool_max_size: int = field(
+        default_factory=lambda: _get_env_int("WIALON_DB_POOL_MAX_SIZE", 10)
+    )
+    leak_threshold_seconds: float = field(
+        default_factory=lambda: _get_env_float("DB_LEAK_THRESHOLD_SECONDS", 60.0)
+    )
+
+
 # =============================================================================
 # REDIS SETTINGS
 # =============================================================================
@@ -451,6 +501,7 @@ class Settings:
     def _initialize(self):
         """Initialize all settings."""
         self.database = DatabaseSettings()
+        self.wialon_db = WialonDatabaseSettings()
         self.redis = RedisSettings()
         self.auth = AuthSettings()
         self.alerts = AlertSettings()
@@ -512,6 +563,7 @@ def get_settings() -> Settings:
 
 # Export commonly used settings
 DATABASE = settings.database
+WIALON_DB = settings.wialon_db
 REDIS = settings.redis
 AUTH = settings.auth
 ALERTS = settings.alerts
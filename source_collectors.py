@@ -0,0 +1,226 @@
+"""
+Source Collectors v5.12.11
+═══════════════════════════════════════════════════════════════════════════════
+
+Independently cached data-source collectors that refresh concurrently.
+
+The Fleet Command Center combines several expensive sources (predictive
+maintenance, ML anomalies, sensor health, DB alerts, DTC events, real-time
+predictive). Each one is wrapped in a SourceCollector with its own TTL and
+the sync-cycle inputs it depends on. A refresh only recomputes collectors
+that are stale - TTL expired, an input source changed in the sync cycle,
+explicitly invalidated, or never computed - and runs those in a thread pool.
+Everything else is served from the collector's last result.
+
+Usage:
+    runner = SourceCollectorRunner([
+        SourceCollector("dtc_events", collect_dtcs, ttl_seconds=120,
+                        inputs=("dtc_events",)),
+        ...
+    ])
+    results, meta = runner.collect()
+    results["dtc_events"]          # last value of the collector
+    meta["sources"]["dtc_events"]  # {"cached": True, "latency_ms": ..., ...}
+
+Author: Fuel Copilot Team
+Version: 5.12.11
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceCollector:
+    """One cached data source"""
+
+    name: str
+    collect: Callable[[], Any]
+    ttl_seconds: float = 60.0
+    # Sync-cycle sources (see sync_cycle_state) whose changes invalidate the result
+    inputs: Tuple[str, ...] = ()
+    default: Any = None
+
+    # Runtime state
+    value: Any = None
+    has_value: bool = False
+    computed_at: float = 0.0
+    versions: Dict[str, int] = field(default_factory=dict)
+    dirty: bool = False
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    last_ms: float = 0.0
+    total_ms: float = 0.0
+    last_reason: Optional[str] = None
+    last_error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def stale_reason(self, versions: Dict[str, int], now: float) -> Optional[str]:
+        """Why the cached value can't be served (None if it can)"""
+        if not self.has_value:
+            return "empty"
+        if self.dirty:
+            return "invalidated"
+        for source in self.inputs:
+            if versions.get(source, 0) != self.versions.get(source, 0):
+                return f"input:{source}"
+        if now - self.computed_at >= self.ttl_seconds:
+            return "ttl"
+        return None
+
+
+def _sync_versions() -> Dict[str, int]:
+    try:
+        from sync_cycle_state import get_sync_cycle_state
+
+        return get_sync_cycle_state().versions()
+    except Exception as e:
+        logger.debug(f"Sync cycle versions unavailable: {e}")
+        return {}
+
+
+class SourceCollectorRunner:
+    """Refreshes stale collectors concurrently and serves the rest from cache"""
+
+    def __init__(
+        self,
+        collectors: Iterable[SourceCollector],
+        max_workers: Optional[int] = None,
+        versions_fn: Callable[[], Dict[str, int]] = _sync_versions,
+    ):
+        self.collectors: Dict[str, SourceCollector] = {c.name: c for c in collectors}
+        self._max_workers = max_workers or max(len(self.collectors), 1)
+        self._versions_fn = versions_fn
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="cc-source"
+                )
+            return self._executor
+
+    def _refresh(self, collector: SourceCollector, versions: Dict[str, int], force: bool):
+        """Recompute one collector (single-flight per collector)"""
+        with collector.lock:
+            # Another request may have refreshed it while we waited for the lock
+            reason = "forced" if force else collector.stale_reason(versions, time.time())
+            if reason is None:
+                collector.hits += 1
+                return False
+
+            collector.dirty = False
+            started = time.perf_counter()
+            try:
+                collector.value = collector.collect()
+                collector.last_error = None
+            except Exception as e:
+                collector.errors += 1
+                collector.last_error = str(e)
+                logger.warning(f"⚠️ Source '{collector.name}' failed: {e}")
+                if not collector.has_value:
+                    collector.value = collector.default
+            collector.last_ms = (time.perf_counter() - started) * 1000
+            collector.total_ms += collector.last_ms
+            collector.misses += 1
+            collector.last_reason = reason
+            collector.has_value = True
+            collector.computed_at = time.time()
+            collector.versions = {s: versions.get(s, 0) for s in collector.inputs}
+            return True
+
+    def collect(
+        self, force: bool = False, names: Optional[Iterable[str]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Return the value of every collector, refreshing the stale ones in parallel.
+
+        Args:
+            force: Recompute every collector regardless of cache state
+            names: Restrict to these collectors (default: all)
+
+        Returns:
+            (results by name, metadata with per-source latency / cache stats)
+        """
+        started = time.perf_counter()
+        selected = [
+            self.collectors[n] for n in (names if names is not None else self.collectors)
+        ]
+        versions = self._versions_fn()
+        now = time.time()
+
+        stale = [c for c in selected if force or c.stale_reason(versions, now)]
+        refreshed: Dict[str, bool] = {}
+        if len(stale) == 1:
+            refreshed[stale[0].name] = self._refresh(stale[0], versions, force)
+        elif stale:
+            executor = self._get_executor()
+            futures = {
+                c.name: executor.submit(self._refresh, c, versions, force) for c in stale
+            }
+            for name, future in futures.items():
+                refreshed[name] = future.result()
+
+        sources = {}
+        for c in selected:
+            computed = refreshed.get(c.name, False)
+            if c.name not in refreshed:
+                c.hits += 1
+            sources[c.name] = {
+                "cached": not computed,
+                "latency_ms": round(c.last_ms, 1) if computed else 0.0,
+                "compute_ms": round(c.last_ms, 1),
+                "age_seconds": round(time.time() - c.computed_at, 1),
+                "ttl_seconds": c.ttl_seconds,
+                "refresh_reason": c.last_reason if computed else None,
+                "hits": c.hits,
+                "misses": c.misses,
+                "hit_rate": round(c.hits / (c.hits + c.misses), 3),
+                "error": c.last_error,
+            }
+
+        meta = {
+            "sources": sources,
+            "recomputed": sorted(n for n, done in refreshed.items() if done),
+            "collect_ms": round((time.perf_counter() - started) * 1000, 1),
+            "sync_versions": versions,
+        }
+        return {c.name: c.value for c in selected}, meta
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Mark one collector (or all) dirty so the next collect recomputes it"""
+        for c in self.collectors.values():
+            if name is None or c.name == name:
+                c.dirty = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            c.name: {
+                "hits": c.hits,
+                "misses": c.misses,
+                "errors": c.errors,
+                "avg_compute_ms": round(c.total_ms / c.misses, 1) if c.misses else 0.0,
+                "last_compute_ms": round(c.last_ms, 1),
+                "age_seconds": (
+                    round(time.time() - c.computed_at, 1) if c.has_value else None
+                ),
+                "ttl_seconds": c.ttl_seconds,
+                "inputs": list(c.inputs),
+            }
+            for c in self.collectors.values()
+        }
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,405 @@
+"""
+SPC Engine v5.12.14 - Incremental Nelson rules over ring buffers
+═══════════════════════════════════════════════════════════════════════════════
+
+TruckHealthMonitor used to rebuild a list of the last 20 readings on every
+reading and rescan it with NelsonRulesChecker. This engine keeps, per
+(truck, sensor) key:
+
+- a fixed-size NumPy ring buffer of the most recent readings
+- the control limits (center, sigma) the counters were computed against
+- run-length counters / short bit masks for every Nelson rule
+
+so each new reading is an O(1) update. When the caller's limits move more
+than `limit_tolerance` σ away from the stored ones, the counters are rebuilt
+from the ring buffer (at most `capacity` points).
+
+All eight Nelson rules:
+    1. One point > 3σ from the mean
+    2. Nine points in a row on the same side of the mean
+    3. Six points in a row steadily increasing or decreasing
+    4. Fourteen points in a row alternating up and down
+    5. Two of three points in a row > 2σ (same side)
+    6. Four of five points in a row > 1σ (same side)
+    7. Fifteen points in a row within 1σ (stratification / stuck sensor)
+    8. Eight points in a row > 1σ, on both sides of the mean (mixture)
+
+Comparisons follow NelsonRulesChecker exactly (strict inequalities; a point
+equal to the mean counts as "below" for rule 2), so the engine, the checker
+and the vectorized batch mode agree point for point.
+
+Usage:
+    engine = SPCEngine()
+    engine.observe(("CO0681", "coolant_temp"), 192.4)       # every reading
+    engine.violations(("CO0681", "coolant_temp"), mean, std)  # -> (2, 7)
+
+    # Backfill a whole history in one vectorized pass
+    matrix = evaluate_series(values, mean, std)  # (n, 8) bool, column r-1
+
+Author: Fuel Copilot Team
+Version: 5.12.14
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RULE_NUMBERS = (1, 2, 3, 4, 5, 6, 7, 8)
+
+# Points a rule needs before it can fire
+RULE_WINDOWS = {1: 1, 2: 9, 3: 6, 4: 14, 5: 3, 6: 5, 7: 15, 8: 8}
+
+# The ring buffer must hold the longest rule window to rebuild counters
+MIN_CAPACITY = max(RULE_WINDOWS.values())
+DEFAULT_CAPACITY = 32
+
+# Rebuild counters when the limits move more than this many stored σ
+DEFAULT_LIMIT_TOLERANCE = 0.1
+
+_MASK_3 = 0b111
+_MASK_5 = 0b11111
+_MASK_8 = 0xFF
+
+
+class _SeriesState:
+    """Ring buffer and Nelson counters for one (truck, sensor) key"""
+
+    __slots__ = (
+        "buf",
+        "pos",
+        "count",
+        "center",
+        "sigma",
+        "scored",
+        "last_z",
+        "prev",
+        "prev_sign",
+        "inc_run",
+        "dec_run",
+        "alt_run",
+        "above_run",
+        "below_run",
+        "within_run",
+        "outside_run",
+        "above2",
+        "below2",
+        "above1",
+        "below1",
+    )
+
+    def __init__(self, capacity: int):
+        self.buf = np.empty(capacity, dtype=np.float64)
+        self.pos = 0
+        self.count = 0
+        self.center: Optional[float] = None
+        self.sigma: Optional[float] = None
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        self.scored = 0
+        self.last_z = 0.0
+        self.prev: Optional[float] = None
+        self.prev_sign = 0
+        self.inc_run = 0
+        self.dec_run = 0
+        self.alt_run = 0
+        self.above_run = 0
+        self.below_run = 0
+        self.within_run = 0
+        self.outside_run = 0
+        self.above2 = 0
+        self.below2 = 0
+        self.above1 = 0
+        self.below1 = 0
+
+    def values(self) -> np.ndarray:
+        """Buffered readings in chronological order"""
+        capacity = len(self.buf)
+        if self.count < capacity:
+            return self.buf[: self.count].copy()
+        return np.concatenate((self.buf[self.pos :], self.buf[: self.pos]))
+
+    def push(self, value: float) -> None:
+        self.buf[self.pos] = value
+        self.pos = (self.pos + 1) % len(self.buf)
+        if self.count < len(self.buf):
+            self.count += 1
+
+    def step(self, value: float) -> None:
+        """Fold one reading into the counters (O(1))"""
+        # Rules 3/4 only look at consecutive differences
+        if self.prev is not None:
+            diff = value - self.prev
+            sign = 1 if diff > 0 else (-1 if diff < 0 else 0)
+            self.inc_run = self.inc_run + 1 if sign > 0 else 0
+            self.dec_run = self.dec_run + 1 if sign < 0 else 0
+            if sign != 0 and sign == -self.prev_sign:
+                self.alt_run += 1
+            else:
+                self.alt_run = 0
+            self.prev_sign = sign
+        self.prev = value
+
+        if self.sigma is None:
+            return
+
+        z = (value - self.center) / self.sigma
+        self.last_z = z
+        self.scored += 1
+
+        if value > self.center:
+            self.above_run += 1
+            self.below_run = 0
+        else:
+            self.below_run += 1
+            self.above_run = 0
+
+        abs_z = abs(z)
+        self.within_run = self.within_run + 1 if abs_z < 1.0 else 0
+        self.outside_run = self.outside_run + 1 if abs_z > 1.0 else 0
+
+        self.above2 = ((self.above2 << 1) | (z > 2.0)) & _MASK_3
+        self.below2 = ((self.below2 << 1) | (z < -2.0)) & _MASK_3
+        self.above1 = ((self.above1 << 1) | (z > 1.0)) & _MASK_8
+        self.below1 = ((self.below1 << 1) | (z < -1.0)) & _MASK_8
+
+    def rules(self) -> Tuple[int, ...]:
+        """Nelson rules violated at the most recent reading"""
+        if self.sigma is None or self.scored == 0:
+            return ()
+
+        fired = []
+        n = self.scored
+        if abs(self.last_z) > 3.0:
+            fired.append(1)
+        if self.above_run >= 9 or self.below_run >= 9:
+            fired.append(2)
+        if self.inc_run >= 5 or self.dec_run >= 5:
+            fired.append(3)
+        if self.alt_run >= 12:
+            fired.append(4)
+        if n >= 3 and (
+            bin(self.above2).count("1") >= 2 or bin(self.below2).count("1") >= 2
+        ):
+            fired.append(5)
+        if n >= 5 and (
+            bin(self.above1 & _MASK_5).count("1") >= 4
+            or bin(self.below1 & _MASK_5).count("1") >= 4
+        ):
+            fired.append(6)
+        if self.within_run >= 15:
+            fired.append(7)
+        if self.outside_run >= 8 and self.above1 and self.below1:
+            fired.append(8)
+        return tuple(fired)
+
+
+# =============================================================================
+# Vectorized batch mode
+# =============================================================================
+
+
+def _run_lengths(flags: np.ndarray) -> np.ndarray:
+    """Length of the run of True values ending at each position"""
+    idx = np.arange(len(flags))
+    last_false = np.maximum.accumulate(np.where(flags, -1, idx))
+    return idx - last_false
+
+
+def _window_counts(flags: np.ndarray, window: int) -> np.ndarray:
+    """Number of True values in the trailing window ending at each position"""
+    csum = np.concatenate(([0], np.cumsum(flags, dtype=np.int64)))
+    idx = np.arange(1, len(flags) + 1)
+    return csum[idx] - csum[np.maximum(idx - window, 0)]
+
+
+def evaluate_series(
+    values: Union[Sequence[float], np.ndarray], mean: float, std: float
+) -> np.ndarray:
+    """
+    Evaluate all eight Nelson rules at every point of a series at once.
+
+    Args:
+        values: Readings in chronological order
+        mean: Control-chart center line
+        std: Control-chart sigma
+
+    Returns:
+        Boolean matrix of shape (len(values), 8); column r-1 is rule r.
+        All False when std <= 0 (same as NelsonRulesChecker).
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    out = np.zeros((n, 8), dtype=bool)
+    if n == 0 or not std or std <= 0:
+        return out
+
+    z = (x - mean) / std
+    idx = np.arange(n)
+
+    out[:, 0] = np.abs(z) > 3.0
+
+    above = x > mean
+    out[:, 1] = (_run_lengths(above) >= 9) | (_run_lengths(~above) >= 9)
+
+    if n > 1:
+        diff = np.diff(x)
+        sign = np.sign(diff).astype(np.int8)
+        inc = _run_lengths(sign > 0)
+        dec = _run_lengths(sign < 0)
+        out[1:, 2] = (inc >= 5) | (dec >= 5)
+        if n > 2:
+            alternating = (sign[1:] != 0) & (sign[1:] == -sign[:-1])
+            out[2:, 3] = _run_lengths(alternating) >= 12
+
+    out[:, 4] = (
+        (_window_counts(z > 2.0, 3) >= 2) | (_window_counts(z < -2.0, 3) >= 2)
+    ) & (idx >= 2)
+
+    out[:, 5] = (
+        (_window_counts(z > 1.0, 5) >= 4) | (_window_counts(z < -1.0, 5) >= 4)
+    ) & (idx >= 4)
+
+    out[:, 6] = _run_lengths(np.abs(z) < 1.0) >= 15
+
+    out[:, 7] = (
+        (_run_lengths(np.abs(z) > 1.0) >= 8)
+        & (_window_counts(z > 1.0, 8) > 0)
+        & (_window_counts(z < -1.0, 8) > 0)
+    )
+    return out
+
+
+def violated_rules(row: np.ndarray) -> Tuple[int, ...]:
+    """Rule numbers set in one row of an evaluate_series() matrix"""
+    return tuple(int(i) + 1 for i in np.flatnonzero(row))
+
+
+# =============================================================================
+# Incremental engine
+# =============================================================================
+
+
+class SPCEngine:
+    """
+    Incremental Nelson rules for many (truck, sensor) keys.
+
+    Thread-safe: the sync cycle feeds readings while API requests read
+    reports.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        limit_tolerance: float = DEFAULT_LIMIT_TOLERANCE,
+    ):
+        self.capacity = max(int(capacity), MIN_CAPACITY)
+        self.limit_tolerance = limit_tolerance
+        self._lock = threading.RLock()
+        self._series: Dict[Hashable, _SeriesState] = {}
+        self._stats = {
+            "readings": 0,
+            "queries": 0,
+            "rebaselines": 0,
+            "backfilled_points": 0,
+        }
+
+    def _state(self, key: Hashable) -> _SeriesState:
+        state = self._series.get(key)
+        if state is None:
+            state = _SeriesState(self.capacity)
+            self._series[key] = state
+        return state
+
+    def observe(self, key: Hashable, value: float) -> None:
+        """Append one reading; counters advance against the stored limits"""
+        with self._lock:
+            state = self._state(key)
+            state.push(value)
+            state.step(value)
+            self._stats["readings"] += 1
+
+    def violations(self, key: Hashable, mean: float, std: float) -> Tuple[int, ...]:
+        """
+        Nelson rules violated at the latest reading of `key`.
+
+        Counters are rebuilt from the ring buffer only when (mean, std) moved
+        beyond the tolerance since they were last set.
+        """
+        with self._lock:
+            self._stats["queries"] += 1
+            state = self._series.get(key)
+            if state is None or state.count == 0 or not std or std <= 0:
+                return ()
+            if self._limits_moved(state, mean, std):
+                self._rebaseline(state, mean, std)
+            return state.rules()
+
+    def _limits_moved(self, state: _SeriesState, mean: float, std: float) -> bool:
+        if state.sigma is None:
+            return True
+        tolerance = self.limit_tolerance * state.sigma
+        return (
+            abs(mean - state.center) > tolerance
+            or abs(std - state.sigma) > tolerance
+        )
+
+    def _rebaseline(self, state: _SeriesState, mean: float, std: float) -> None:
+        state.center = float(mean)
+        state.sigma = float(std)
+        state.reset_counters()
+        for value in state.values().tolist():
+            state.step(value)
+        self._stats["rebaselines"] += 1
+
+    def load(self, key: Hashable, values: Sequence[float]) -> None:
+        """Replace the buffered history of `key` (limits are re-derived lazily)"""
+        with self._lock:
+            state = _SeriesState(self.capacity)
+            for value in list(values)[-self.capacity :]:
+                state.push(float(value))
+                state.step(float(value))
+            self._series[key] = state
+
+    def backfill(
+        self,
+        key: Hashable,
+        values: Sequence[float],
+        mean: float,
+        std: float,
+    ) -> np.ndarray:
+        """
+        Score a whole history in one vectorized pass and seed `key` with it.
+
+        Returns:
+            evaluate_series() matrix for `values`
+        """
+        matrix = evaluate_series(values, mean, std)
+        with self._lock:
+            self.load(key, values)
+            if std and std > 0:
+                self._rebaseline(self._series[key], mean, std)
+            self._stats["backfilled_points"] += len(matrix)
+        return matrix
+
+    def series_length(self, key: Hashable) -> int:
+        """Number of buffered readings for `key` (≤ capacity)"""
+        with self._lock:
+            state = self._series.get(key)
+            return state.count if state is not None else 0
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._series.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "keys": len(self._series),
+                "capacity": self.capacity,
+                **self._stats,
+            }
@@ -2,12 +2,15 @@
 
 from .def_repository import DEFRepository
 from .dtc_repository import DTCRepository
+from .latest_state_repository import LATEST_STATE_TABLE, get_latest_states
 from .sensor_repository import SensorRepository
 from .truck_repository import TruckRepository
 
 __all__ = [
     "DEFRepository",
     "DTCRepository",
+    "LATEST_STATE_TABLE",
     "SensorRepository",
     "TruckRepository",
+    "get_latest_states",
 ]
@@ -8,8 +8,10 @@ DEF data is stored in fuel_metrics.def_level_pct column.
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 import logging
-import pymysql
-from pymysql import cursors
+
+from connection_manager import get_connection_manager
+
+from .latest_state_repository import get_latest_states
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +22,12 @@ class DEFRepository:
     def __init__(self, db_config: Dict[str, Any]):
         self.db_config = db_config
         logger.info(f"DEFRepository initialized for DB: {db_config.get('database')}")
+        # 🆕 v5.12.16: Shared pool for this config (repositories are built per request)
+        self._pool = get_connection_manager().pool_for(db_config)
 
     def _get_connection(self):
-        """Get database connection."""
-        return pymysql.connect(**self.db_config, cursorclass=cursors.DictCursor)
+        """Get pooled database connection (close() returns it to the pool)."""
+        return get_connection_manager().checkout(self._pool)
 
     def get_def_level(self, truck_id: str) -> Optional[float]:
         """Get current DEF level for a truck."""
@@ -67,25 +71,16 @@ class DEFRepository:
         """Get trucks with DEF level below threshold."""
         conn = self._get_connection()
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        fm1.truck_id,
-                        fm1.def_level_pct,
-                        fm1.timestamp_utc
-                    FROM fuel_metrics fm1
-                    WHERE timestamp_utc = (
-                        SELECT MAX(timestamp_utc)
-                        FROM fuel_metrics fm2
-                        WHERE fm2.truck_id = fm1.truck_id
-                    )
-                    AND fm1.def_level_pct < %s
-                    AND fm1.def_level_pct IS NOT NULL
-                    ORDER BY fm1.def_level_pct ASC
-                """, (threshold,))
-                trucks = cursor.fetchall()
-                logger.debug(f"Found {len(trucks)} trucks with DEF < {threshold}%")
-                return trucks
+            trucks = [
+                row
+                for row in get_latest_states(
+                    conn, columns=["truck_id", "def_level_pct", "timestamp_utc"]
+                )
+                if row["def_level_pct"] is not None and row["def_level_pct"] < threshold
+            ]
+            trucks.sort(key=lambda row: row["def_level_pct"])
+            logger.debug(f"Found {len(trucks)} trucks with DEF < {threshold}%")
+            return trucks
         finally:
             conn.close()
 
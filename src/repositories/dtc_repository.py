@@ -8,8 +8,10 @@ DTC data is stored in fuel_metrics.dtc and fuel_metrics.dtc_code columns.
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 import logging
-import pymysql
-from pymysql import cursors
+
+from connection_manager import get_connection_manager
+
+from .latest_state_repository import get_latest_states
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +22,12 @@ class DTCRepository:
     def __init__(self, db_config: Dict[str, Any]):
         self.db_config = db_config
         logger.info(f"DTCRepository initialized for DB: {db_config.get('database')}")
+        # 🆕 v5.12.16: Shared pool for this config (repositories are built per request)
+        self._pool = get_connection_manager().pool_for(db_config)
 
     def _get_connection(self):
-        """Get database connection."""
-        return pymysql.connect(**self.db_config, cursorclass=cursors.DictCursor)
+        """Get pooled database connection (close() returns it to the pool)."""
+        return get_connection_manager().checkout(self._pool)
 
     def get_active_dtcs(self, truck_id: str) -> List[Dict[str, Any]]:
         """Get current active DTCs for a truck."""
@@ -84,25 +88,15 @@ class DTCRepository:
         """Get all active DTCs across the fleet."""
         conn = self._get_connection()
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        fm1.truck_id,
-                        fm1.dtc,
-                        fm1.dtc_code,
-                        fm1.timestamp_utc
-                    FROM fuel_metrics fm1
-                    WHERE timestamp_utc = (
-                        SELECT MAX(timestamp_utc)
-                        FROM fuel_metrics fm2
-                        WHERE fm2.truck_id = fm1.truck_id
-                    )
-                    AND (fm1.dtc IS NOT NULL OR fm1.dtc_code IS NOT NULL)
-                    ORDER BY fm1.truck_id
-                """)
-                dtcs = cursor.fetchall()
-                logger.debug(f"Found {len(dtcs)} trucks with active DTCs")
-                return dtcs
+            dtcs = [
+                row
+                for row in get_latest_states(
+                    conn, columns=["truck_id", "dtc", "dtc_code", "timestamp_utc"]
+                )
+                if row["dtc"] is not None or row["dtc_code"] is not None
+            ]
+            logger.debug(f"Found {len(dtcs)} trucks with active DTCs")
+            return dtcs
         finally:
             conn.close()
 
@@ -0,0 +1,398 @@
+"""
+Latest State Repository - one row per truck, maintained by the sync cycle
+
+"Latest row per truck" used to be computed at ~28 call sites with
+MAX(timestamp_utc) GROUP BY joins or correlated subqueries over the whole
+fuel_metrics table. The sync cycle now upserts the row it writes to
+fuel_metrics into fuel_metrics_latest (PRIMARY KEY truck_id) in the same
+transaction, and every reader goes through get_latest_states(): a primary-key
+scan of ~N trucks rows instead of a range aggregation.
+
+get_latest_states() accepts a pymysql connection or a SQLAlchemy
+Engine/Connection, so repositories, routers and database_mysql share it.
+If fuel_metrics_latest does not exist yet (migration not applied, sync not
+started), it falls back to the old MAX(timestamp_utc) join.
+
+Usage:
+    rows = get_latest_states(
+        conn,
+        columns=["truck_id", "truck_status AS status", "estimated_pct"],
+        truck_ids=allowed_trucks,
+        max_age_hours=24,
+    )
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pymysql import cursors
+
+logger = logging.getLogger(__name__)
+
+LATEST_STATE_TABLE = "fuel_metrics_latest"
+
+# Same columns, same order as the INSERT in
+# wialon_sync_enhanced.save_to_fuel_metrics (the upsert reuses its values)
+LATEST_STATE_COLUMNS = (
+    "timestamp_utc",
+    "truck_id",
+    "carrier_id",
+    "truck_status",
+    "latitude",
+    "longitude",
+    "speed_mph",
+    "estimated_liters",
+    "estimated_gallons",
+    "estimated_pct",
+    "sensor_pct",
+    "sensor_liters",
+    "sensor_gallons",
+    "consumption_lph",
+    "consumption_gph",
+    "mpg_current",
+    "cost_per_mile",
+    "rpm",
+    "engine_hours",
+    "odometer_mi",
+    "odom_delta_mi",
+    "altitude_ft",
+    "hdop",
+    "coolant_temp_f",
+    "gear",
+    "engine_brake_active",
+    "obd_speed_mph",
+    "oil_level_pct",
+    "barometric_pressure_inhg",
+    "pto_hours",
+    "accel_rate_mpss",
+    "harsh_accel",
+    "harsh_brake",
+    "idle_gph",
+    "idle_method",
+    "idle_mode",
+    "drift_pct",
+    "drift_warning",
+    "anchor_detected",
+    "anchor_type",
+    "data_age_min",
+    "oil_pressure_psi",
+    "oil_temp_f",
+    "battery_voltage",
+    "engine_load_pct",
+    "def_level_pct",
+    "ambient_temp_f",
+    "intake_air_temp_f",
+    "trans_temp_f",
+    "fuel_temp_f",
+    "intercooler_temp_f",
+    "intake_press_kpa",
+    "retarder_level",
+    "sats",
+    "pwr_int",
+    "terrain_factor",
+    "gps_quality",
+    "idle_hours_ecu",
+    "dtc",
+    "dtc_code",
+    "mpg_expected",
+    "mpg_deviation_pct",
+    "mpg_status",
+)
+
+_STRING_COLUMNS = {
+    "truck_id": "VARCHAR(20) NOT NULL",
+    "carrier_id": "VARCHAR(50)",
+    "truck_status": "VARCHAR(20)",
+    "idle_method": "VARCHAR(50)",
+    "idle_mode": "VARCHAR(50)",
+    "drift_warning": "VARCHAR(10)",
+    "anchor_detected": "VARCHAR(10)",
+    "anchor_type": "VARCHAR(20)",
+    "gps_quality": "VARCHAR(100)",
+    "dtc_code": "VARCHAR(255)",
+    "mpg_status": "VARCHAR(20)",
+}
+_INT_COLUMNS = {
+    "rpm",
+    "gear",
+    "engine_brake_active",
+    "harsh_accel",
+    "harsh_brake",
+    "retarder_level",
+    "sats",
+    "dtc",
+}
+
+
+def _column_ddl(name: str) -> str:
+    if name == "timestamp_utc":
+        return "timestamp_utc DATETIME NOT NULL"
+    if name in _STRING_COLUMNS:
+        return f"{name} {_STRING_COLUMNS[name]}"
+    if name in _INT_COLUMNS:
+        return f"{name} INT"
+    return f"{name} FLOAT"
+
+
+CREATE_LATEST_STATE_TABLE = (
+    f"CREATE TABLE IF NOT EXISTS {LATEST_STATE_TABLE} (\n    "
+    + ",\n    ".join(_column_ddl(c) for c in LATEST_STATE_COLUMNS)
+    + ",\n    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+    " ON UPDATE CURRENT_TIMESTAMP,\n"
+    "    PRIMARY KEY (truck_id),\n"
+    "    INDEX idx_timestamp (timestamp_utc)\n"
+    ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+)
+
+# Older rows (replays, historical backfill) never overwrite newer state.
+# timestamp_utc is assigned last: MySQL evaluates the SET list left to right.
+# Target columns are qualified so the INSERT ... SELECT seed is unambiguous.
+_T = LATEST_STATE_TABLE
+_NEWER = f"VALUES(timestamp_utc) >= {_T}.timestamp_utc"
+_UPSERT_ASSIGNMENTS = ",\n    ".join(
+    [
+        f"{_T}.{c} = IF({_NEWER}, VALUES({c}), {_T}.{c})"
+        for c in LATEST_STATE_COLUMNS
+        if c not in ("truck_id", "timestamp_utc")
+    ]
+    + [
+        f"{_T}.timestamp_utc = GREATEST({_T}.timestamp_utc, VALUES(timestamp_utc))"
+    ]
+)
+
+UPSERT_LATEST_STATE = (
+    f"INSERT INTO {LATEST_STATE_TABLE} ({', '.join(LATEST_STATE_COLUMNS)})\n"
+    f"VALUES ({', '.join(['%s'] * len(LATEST_STATE_COLUMNS))})\n"
+    f"ON DUPLICATE KEY UPDATE\n    {_UPSERT_ASSIGNMENTS}"
+)
+
+_SEED_LATEST_STATE = (
+    f"INSERT INTO {LATEST_STATE_TABLE} ({', '.join(LATEST_STATE_COLUMNS)})\n"
+    f"SELECT {', '.join('fm.' + c for c in LATEST_STATE_COLUMNS)}\n"
+    "FROM fuel_metrics fm\n"
+    "INNER JOIN (\n"
+    "    SELECT truck_id, MAX(timestamp_utc) AS max_time\n"
+    "    FROM fuel_metrics\n"
+    "    WHERE timestamp_utc > NOW() - INTERVAL %s DAY\n"
+    "    GROUP BY truck_id\n"
+    ") latest ON fm.truck_id = latest.truck_id AND fm.timestamp_utc = latest.max_time\n"
+    f"ON DUPLICATE KEY UPDATE\n    {_UPSERT_ASSIGNMENTS}"
+)
+
+_COLUMN_SPEC = re.compile(r"^\s*(\w+)(?:\s+as\s+(\w+))?\s*$", re.IGNORECASE)
+
+_MISSING_TABLE_ERRNO = 1146
+
+
+# =============================================================================
+# Write side (sync cycle)
+# =============================================================================
+
+
+def upsert_latest_state(cursor, values: Sequence[Any]) -> None:
+    """
+    Upsert one truck's latest row.
+
+    Args:
+        cursor: Cursor on the connection that inserted into fuel_metrics
+            (so both writes share a transaction)
+        values: The fuel_metrics INSERT values, in LATEST_STATE_COLUMNS order
+    """
+    cursor.execute(UPSERT_LATEST_STATE, values)
+
+
+def ensure_latest_state_table(connection, seed_days: int = 7) -> int:
+    """
+    Create fuel_metrics_latest if needed and seed it from fuel_metrics when empty.
+
+    Returns:
+        Number of trucks seeded (0 when the table already had rows)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_LATEST_STATE_TABLE)
+        cursor.execute(f"SELECT 1 FROM {LATEST_STATE_TABLE} LIMIT 1")
+        if cursor.fetchone():
+            return 0
+        cursor.execute(_SEED_LATEST_STATE, (seed_days,))
+        seeded = cursor.rowcount
+    connection.commit()
+    logger.info(f"📌 Seeded {LATEST_STATE_TABLE} with {seeded} trucks")
+    return seeded
+
+
+# =============================================================================
+# Read side (the single latest-state accessor)
+# =============================================================================
+
+
+def _select_list(columns: Sequence[str]) -> str:
+    parts = []
+    for spec in columns:
+        match = _COLUMN_SPEC.match(spec)
+        if not match or match.group(1) not in LATEST_STATE_COLUMNS:
+            raise ValueError(f"Unknown latest-state column: {spec!r}")
+        name, alias = match.groups()
+        parts.append(f"t.{name} AS {alias or name}")
+    return ", ".join(parts)
+
+
+def _build_query(
+    select_list: str,
+    fallback: bool,
+    truck_ids: Optional[List[str]],
+    max_age_seconds: Optional[int],
+    sqlalchemy_style: bool,
+) -> str:
+    def ph(name: str) -> str:
+        return f":{name}" if sqlalchemy_style else f"%({name})s"
+
+    where = []
+    if truck_ids is not None:
+        where.append(f"truck_id IN {ph('truck_ids')}")
+    if max_age_seconds is not None:
+        where.append(f"timestamp_utc > NOW() - INTERVAL {ph('max_age')} SECOND")
+
+    if not fallback:
+        conditions = " AND ".join("t." + w for w in where)
+        return (
+            f"SELECT {select_list} FROM {LATEST_STATE_TABLE} t"
+            + (f" WHERE {conditions}" if conditions else "")
+            + " ORDER BY t.truck_id"
+        )
+
+    inner_where = " WHERE " + " AND ".join(where) if where else ""
+    return (
+        f"SELECT {select_list} FROM fuel_metrics t"
+        " INNER JOIN ("
+        " SELECT truck_id, MAX(timestamp_utc) AS max_time"
+        f" FROM fuel_metrics{inner_where}"
+        " GROUP BY truck_id"
+        ") latest ON t.truck_id = latest.truck_id"
+        " AND t.timestamp_utc = latest.max_time"
+        " ORDER BY t.truck_id"
+    )
+
+
+def _is_missing_table(exc: Exception) -> bool:
+    orig = getattr(exc, "orig", exc)
+    args = getattr(orig, "args", ())
+    return bool(args) and args[0] == _MISSING_TABLE_ERRNO
+
+
+def _execute(conn, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # SQLAlchemy Engine / Connection
+    if hasattr(conn, "dialect"):
+        from sqlalchemy import bindparam, text
+        from sqlalchemy.engine import Engine
+
+        stmt = text(sql)
+        if "truck_ids" in params:
+            stmt = stmt.bindparams(bindparam("truck_ids", expanding=True))
+        if isinstance(conn, Engine):
+            with conn.connect() as sa_conn:
+                return [dict(r) for r in sa_conn.execute(stmt, params).mappings()]
+        return [dict(r) for r in conn.execute(stmt, params).mappings()]
+
+    # pymysql connection
+    if "truck_ids" in params:
+        params = {**params, "truck_ids": tuple(params["truck_ids"])}
+    with conn.cursor(cursors.DictCursor) as cursor:
+        cursor.execute(sql, params)
+        return list(cursor.fetchall())
+
+
+def _prepare(
+    columns: Optional[Sequence[str]],
+    truck_ids: Optional[Iterable[str]],
+    max_age_hours: Optional[float],
+) -> Optional[Tuple[str, Optional[List[str]], Optional[int], Dict[str, Any]]]:
+    """Select list, id filter, age filter and bind params (None = no trucks)"""
+    select_list = _select_list(columns or LATEST_STATE_COLUMNS)
+
+    params: Dict[str, Any] = {}
+    ids: Optional[List[str]] = None
+    if truck_ids is not None:
+        ids = list(truck_ids)
+        if not ids:
+            return None
+        params["truck_ids"] = ids
+    max_age_seconds = None
+    if max_age_hours is not None:
+        max_age_seconds = int(max_age_hours * 3600)
+        params["max_age"] = max_age_seconds
+    return select_list, ids, max_age_seconds, params
+
+
+def get_latest_states(
+    conn,
+    columns: Optional[Sequence[str]] = None,
+    truck_ids: Optional[Iterable[str]] = None,
+    max_age_hours: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Latest fuel_metrics row per truck.
+
+    Args:
+        conn: pymysql connection, or SQLAlchemy Engine/Connection
+        columns: Column names, optionally "column AS alias"
+            (default: all LATEST_STATE_COLUMNS)
+        truck_ids: Restrict to these trucks (None = all)
+        max_age_hours: Only trucks that reported within this many hours
+
+    Returns:
+        One dict per truck, ordered by truck_id
+    """
+    prepared = _prepare(columns, truck_ids, max_age_hours)
+    if prepared is None:
+        return []
+    select_list, ids, max_age_seconds, params = prepared
+
+    sqlalchemy_style = hasattr(conn, "dialect")
+    sql = _build_query(select_list, False, ids, max_age_seconds, sqlalchemy_style)
+    try:
+        return _execute(conn, sql, params)
+    except Exception as e:
+        if not _is_missing_table(e):
+            raise
+        logger.warning(
+            f"{LATEST_STATE_TABLE} missing - falling back to MAX(timestamp_utc) scan"
+        )
+
+    sql = _build_query(select_list, True, ids, max_age_seconds, sqlalchemy_style)
+    return _execute(conn, sql, params)
+
+
+async def aget_latest_states(
+    conn,
+    columns: Optional[Sequence[str]] = None,
+    truck_ids: Optional[Iterable[str]] = None,
+    max_age_hours: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    get_latest_states() for an aiomysql connection.
+
+    🆕 v5.12.21: Used by the native async read paths (database_async_reads)
+    """
+    from aiomysql import DictCursor
+
+    prepared = _prepare(columns, truck_ids, max_age_hours)
+    if prepared is None:
+        return []
+    select_list, ids, max_age_seconds, params = prepared
+    if "truck_ids" in params:
+        params["truck_ids"] = tuple(params["truck_ids"])
+
+    for fallback in (False, True):
+        sql = _build_query(select_list, fallback, ids, max_age_seconds, False)
+        try:
+            async with conn.cursor(DictCursor) as cursor:
+                await cursor.execute(sql, params)
+                return list(await cursor.fetchall())
+        except Exception as e:
+            if fallback or not _is_missing_table(e):
+                raise
+            logger.warning(
+                f"{LATEST_STATE_TABLE} missing - falling back to MAX(timestamp_utc) scan"
+            )
+    return []
@@ -8,8 +8,10 @@ Sensors are stored as columns in fuel_metrics table.
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 import logging
-import pymysql
-from pymysql import cursors
+
+from connection_manager import get_connection_manager
+
+from .latest_state_repository import get_latest_states
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +22,12 @@ class SensorRepository:
     def __init__(self, db_config: Dict[str, Any]):
         self.db_config = db_config
         logger.info(f"SensorRepository initialized for DB: {db_config.get('database')}")
+        # 🆕 v5.12.16: Shared pool for this config (repositories are built per request)
+        self._pool = get_connection_manager().pool_for(db_config)
 
     def _get_connection(self):
-        """Get database connection."""
-        return pymysql.connect(**self.db_config, cursorclass=cursors.DictCursor)
+        """Get pooled database connection (close() returns it to the pool)."""
+        return get_connection_manager().checkout(self._pool)
 
     def get_truck_sensors(self, truck_id: str) -> Dict[str, Any]:
         """Get latest sensor readings for a truck from fuel_metrics."""
@@ -100,28 +104,21 @@ class SensorRepository:
         """Get latest sensor readings for all trucks."""
         conn = self._get_connection()
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        fm1.truck_id,
-                        fm1.timestamp_utc,
-                        fm1.coolant_temp_f,
-                        fm1.oil_pressure_psi,
-                        fm1.oil_temp_f,
-                        fm1.battery_voltage,
-                        fm1.engine_load_pct,
-                        fm1.def_level_pct
-                    FROM fuel_metrics fm1
-                    WHERE timestamp_utc = (
-                        SELECT MAX(timestamp_utc)
-                        FROM fuel_metrics fm2
-                        WHERE fm2.truck_id = fm1.truck_id
-                    )
-                    ORDER BY fm1.truck_id
-                """)
-                sensors = cursor.fetchall()
-                logger.debug(f"Fetched sensors for {len(sensors)} trucks")
-                return sensors
+            sensors = get_latest_states(
+                conn,
+                columns=[
+                    "truck_id",
+                    "timestamp_utc",
+                    "coolant_temp_f",
+                    "oil_pressure_psi",
+                    "oil_temp_f",
+                    "battery_voltage",
+                    "engine_load_pct",
+                    "def_level_pct",
+                ],
+            )
+            logger.debug(f"Fetched sensors for {len(sensors)} trucks")
+            return sensors
         finally:
             conn.close()
 
@@ -9,8 +9,9 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import pymysql
-from pymysql import cursors
+from connection_manager import get_connection_manager
+
+from .latest_state_repository import get_latest_states
 
 logger = logging.getLogger(__name__)
 
@@ -21,72 +22,60 @@ class TruckRepository:
     def __init__(self, db_config: Dict[str, Any], pool_size: int = 5):
         self.db_config = db_config
         logger.info(f"TruckRepository initialized for DB: {db_config.get('database')}")
+        # 🆕 v5.12.16: Shared pool for this config (repositories are built per request)
+        self._pool = get_connection_manager().pool_for(db_config)
 
     def _get_connection(self):
-        """Get database connection."""
-        return pymysql.connect(**self.db_config, cursorclass=cursors.DictCursor)
+        """Get pooled database connection (close() returns it to the pool)."""
+        return get_connection_manager().checkout(self._pool)
 
     def get_all_trucks(self) -> List[Dict[str, Any]]:
-        """Get all trucks in the fleet from fuel_metrics (latest data per truck)."""
+        """Get all trucks in the fleet (latest data per truck)."""
         conn = self._get_connection()
         try:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT 
-                        truck_id,
-                        truck_status as status,
-                        estimated_pct as fuel_level,
-                        speed_mph as speed,
-                        timestamp_utc as last_update,
-                        mpg_current as mpg,
-                        idle_gph
-                    FROM fuel_metrics fm1
-                    WHERE timestamp_utc = (
-                        SELECT MAX(timestamp_utc) 
-                        FROM fuel_metrics fm2 
-                        WHERE fm2.truck_id = fm1.truck_id
-                    )
-                    ORDER BY truck_id
-                """
-                )
-                trucks = cursor.fetchall()
-                logger.debug(f"Fetched {len(trucks)} trucks")
-                return trucks
+            trucks = get_latest_states(
+                conn,
+                columns=[
+                    "truck_id",
+                    "truck_status AS status",
+                    "estimated_pct AS fuel_level",
+                    "speed_mph AS speed",
+                    "timestamp_utc AS last_update",
+                    "mpg_current AS mpg",
+                    "idle_gph",
+                ],
+            )
+            logger.debug(f"Fetched {len(trucks)} trucks")
+            return trucks
         finally:
             conn.close()
 
     def get_truck_by_id(self, truck_id: str) -> Optional[Dict[str, Any]]:
-        """Get latest truck data by ID from fuel_metrics."""
+        """Get latest truck data by ID from fuel_metrics_latest."""
         conn = self._get_connection()
         try:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT 
-                        truck_id,
-                        truck_status as status,
-                        estimated_pct as fuel_level_pct,
-                        speed_mph,
-                        timestamp_utc as last_update,
-                        mpg_current as mpg,
-                        idle_gph,
-                        rpm,
-                        latitude,
-                        longitude
-                    FROM fuel_metrics
-                    WHERE truck_id = %s
-                    ORDER BY timestamp_utc DESC
-                    LIMIT 1
-                """,
-                    (truck_id,),
-                )
-                truck = cursor.fetchone()
-                if truck:
-                    logger.debug(f"Truck found: {truck_id}")
-                else:
-                    logger.warning(f"Truck not found: {truck_id}")
-                return truck
+            rows = get_latest_states(
+                conn,
+                columns=[
+                    "truck_id",
+                    "truck_status AS status",
+                    "estimated_pct AS fuel_level_pct",
+                    "speed_mph",
+                    "timestamp_utc AS last_update",
+                    "mpg_current AS mpg",
+                    "idle_gph",
+                    "rpm",
+                    "latitude",
+                    "longitude",
+                ],
+                truck_ids=[truck_id],
+            )
+            truck = rows[0] if rows else None
+            if truck:
+                logger.debug(f"Truck found: {truck_id}")
+            else:
+                logger.warning(f"Truck not found: {truck_id}")
+            return truck
         finally:
             conn.close()
 
@@ -123,25 +112,14 @@ class TruckRepository:
         """Get trucks that haven't reported in specified hours."""
         conn = self._get_connection()
         try:
-            with conn.cursor() as cursor:
-                cutoff = datetime.utcnow() - timedelta(hours=hours)
-                cursor.execute(
-                    """
-                    SELECT DISTINCT truck_id
-                    FROM fuel_metrics fm1
-                    WHERE timestamp_utc = (
-                        SELECT MAX(timestamp_utc)
-                        FROM fuel_metrics fm2
-                        WHERE fm2.truck_id = fm1.truck_id
-                    )
-                    AND timestamp_utc < %s
-                    ORDER BY truck_id
-                """,
-                    (cutoff,),
-                )
-                offline = [row["truck_id"] for row in cursor.fetchall()]
-                logger.debug(f"Found {len(offline)} offline trucks (>{hours}h)")
-                return offline
+            cutoff = datetime.utcnow() - timedelta(hours=hours)
+            offline = [
+                row["truck_id"]
+                for row in get_latest_states(conn, columns=["truck_id", "timestamp_utc"])
+                if row["timestamp_utc"] < cutoff
+            ]
+            logger.debug(f"Found {len(offline)} offline trucks (>{hours}h)")
+            return offline
         finally:
             conn.close()
 
@@ -183,24 +161,13 @@ class TruckRepository:
         """Get trucks that have reported in the last specified hours."""
         conn = self._get_connection()
         try:
-            with conn.cursor() as cursor:
-                cutoff = datetime.utcnow() - timedelta(hours=hours)
-                cursor.execute(
-                    """
-                    SELECT DISTINCT truck_id
-                    FROM fuel_metrics fm1
-                    WHERE timestamp_utc = (
-                        SELECT MAX(timestamp_utc)
-                        FROM fuel_metrics fm2
-                        WHERE fm2.truck_id = fm1.truck_id
-                    )
-                    AND timestamp_utc >= %s
-                    ORDER BY truck_id
-                """,
-                    (cutoff,),
-                )
-                active = [row["truck_id"] for row in cursor.fetchall()]
-                logger.debug(f"Found {len(active)} active trucks (<{hours}h)")
-                return active
+            cutoff = datetime.utcnow() - timedelta(hours=hours)
+            active = [
+                row["truck_id"]
+                for row in get_latest_states(conn, columns=["truck_id", "timestamp_utc"])
+                if row["timestamp_utc"] >= cutoff
+            ]
+            logger.debug(f"Found {len(active)} active trucks (<{hours}h)")
+            return active
         finally:
             conn.close()
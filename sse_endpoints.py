@@ -8,7 +8,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import AsyncGenerator, Optional, Dict, Any
+from typing import Any, AsyncGenerator, Dict, List, Optional
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -73,67 +73,67 @@ class SSEManager:
 sse_manager = SSEManager()
 
 
-async def get_fleet_updates() -> AsyncGenerator[Dict[str, Any], None]:
-    """Generate fleet status updates from database."""
+def _fetch_latest_fleet_states() -> List[Dict[str, Any]]:
+    """Latest row per truck that reported in the last hour (fuel_metrics_latest)"""
     from database_pool import get_db_connection
+    from src.repositories.latest_state_repository import get_latest_states
+
+    with get_db_connection() as conn:
+        return get_latest_states(
+            conn,
+            columns=[
+                "truck_id",
+                "sensor_pct",
+                "estimated_pct",
+                "mpg_current",
+                "speed_mph",
+                "truck_status",
+                "latitude",
+                "longitude",
+                "timestamp_utc",
+            ],
+            max_age_hours=1,
+        )
+
 
+async def get_fleet_updates() -> AsyncGenerator[Dict[str, Any], None]:
+    """Generate fleet status updates from database."""
     while True:
         try:
-            async with get_db_connection() as conn:
-                # Get latest metrics per truck
-                result = await conn.execute(
-                    """
-                    SELECT 
-                        m.truck_id,
-                        m.sensor_pct,
-                        m.estimated_pct,
-                        m.mpg_current,
-                        m.speed_mph,
-                        m.truck_status,
-                        m.latitude,
-                        m.longitude,
-                        m.timestamp_utc
-                    FROM fuel_metrics m
-                    INNER JOIN (
-                        SELECT truck_id, MAX(timestamp_utc) as max_ts
-                        FROM fuel_metrics
-                        WHERE timestamp_utc >= DATE_SUB(NOW(), INTERVAL 1 HOUR)
-                        GROUP BY truck_id
-                    ) latest ON m.truck_id = latest.truck_id 
-                        AND m.timestamp_utc = latest.max_ts
-                """
+            # 🆕 v5.12.15: Latest metrics per truck from the sync-maintained
+            # latest-state table (blocking DB call kept off the event loop)
+            rows = await asyncio.to_thread(_fetch_latest_fleet_states)
+
+            trucks = []
+            for row in rows:
+                trucks.append(
+                    {
+                        "truck_id": row["truck_id"],
+                        "fuel_pct": round(
+                            row["estimated_pct"] or row["sensor_pct"] or 0, 1
+                        ),
+                        "mpg": round(row["mpg_current"] or 0, 2),
+                        "speed": round(row["speed_mph"] or 0, 1),
+                        "status": row["truck_status"] or "unknown",
+                        "location": (
+                            {"lat": row["latitude"], "lng": row["longitude"]}
+                            if row["latitude"] and row["longitude"]
+                            else None
+                        ),
+                        "last_update": (
+                            row["timestamp_utc"].isoformat()
+                            if row["timestamp_utc"]
+                            else None
+                        ),
+                    }
                 )
 
-                trucks = []
-                for row in result:
-                    trucks.append(
-                        {
-                            "truck_id": row.truck_id,
-                            "fuel_pct": round(
-                                row.estimated_pct or row.sensor_pct or 0, 1
-                            ),
-                            "mpg": round(row.mpg_current or 0, 2),
-                            "speed": round(row.speed_mph or 0, 1),
-                            "status": row.truck_status or "unknown",
-                            "location": (
-                                {"lat": row.latitude, "lng": row.longitude}
-                                if row.latitude and row.longitude
-                                else None
-                            ),
-                            "last_update": (
-                                row.timestamp_utc.isoformat()
-                                if row.timestamp_utc
-                                else None
-                            ),
-                        }
-                    )
-
-                yield {
-                    "type": "fleet_update",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "truck_count": len(trucks),
-                    "trucks": trucks,
-                }
+            yield {
+                "type": "fleet_update",
+                "timestamp": datetime.utcnow().isoformat(),
+                "truck_count": len(trucks),
+                "trucks": trucks,
+            }
 
         except Exception as e:
             logger.error(f"Error fetching fleet updates: {e}")
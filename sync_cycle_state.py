@@ -0,0 +1,166 @@
+"""
+Sync Cycle State v5.12.11
+═══════════════════════════════════════════════════════════════════════════════
+
+Per-source data versions published by the sync cycle.
+
+The sync process (wialon_sync_enhanced) and the API run in different
+processes. At the end of every cycle the sync publishes a tiny JSON marker
+with a monotonically increasing cycle number and, for each table it wrote
+(fuel_metrics, dtc_events, refuel_events, ...), the cycle in which that
+source last changed. API-side caches compare these versions with the ones
+they were computed from to know whether their inputs changed, instead of
+recomputing on every request.
+
+Usage:
+    # Sync cycle
+    state = get_sync_cycle_state()
+    state.mark("fuel_metrics", inserted)
+    state.mark("dtc_events")
+    state.publish()                      # end of cycle
+
+    # API
+    versions = get_sync_cycle_state().versions()   # {"fuel_metrics": 812, ...}
+
+Author: Fuel Copilot Team
+Version: 5.12.11
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "cache/sync_cycle.json"
+
+
+class SyncCycleState:
+    """Cycle counter + per-source versions shared through a marker file"""
+
+    RELOAD_CHECK_SECONDS = 1.0
+
+    def __init__(self, state_file: str = STATE_FILE):
+        self._state_file = state_file
+        self._lock = threading.Lock()
+        self._cycle = 0
+        self._versions: Dict[str, int] = {}
+        self._completed_at: Optional[float] = None
+        self._pending: Dict[str, int] = {}
+        self._file_mtime = 0.0
+        self._last_reload_check = 0.0
+        self._load()
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # WRITER (sync process)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def mark(self, source: str, count: int = 1) -> None:
+        """Record that `source` received `count` new rows in the current cycle"""
+        if count:
+            with self._lock:
+                self._pending[source] = self._pending.get(source, 0) + count
+
+    def publish(self) -> int:
+        """Close the current cycle and write the marker file. Returns the cycle."""
+        with self._lock:
+            self._cycle += 1
+            for source in self._pending:
+                self._versions[source] = self._cycle
+            changed = dict(self._pending)
+            self._pending.clear()
+            self._completed_at = time.time()
+            data = {
+                "cycle": self._cycle,
+                "completed_at": self._completed_at,
+                "versions": dict(self._versions),
+                "changed": changed,
+            }
+
+        try:
+            path = Path(self._state_file)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._file_mtime = path.stat().st_mtime
+        except Exception as e:
+            logger.warning(f"⚠️ Could not publish sync cycle state: {e}")
+        return data["cycle"]
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # READER (API process)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    @property
+    def cycle(self) -> int:
+        self._maybe_reload()
+        return self._cycle
+
+    def versions(self) -> Dict[str, int]:
+        """Cycle in which each source last changed (empty without a sync process)"""
+        self._maybe_reload()
+        with self._lock:
+            return dict(self._versions)
+
+    def get_stats(self) -> Dict:
+        self._maybe_reload()
+        with self._lock:
+            return {
+                "cycle": self._cycle,
+                "completed_at": self._completed_at,
+                "age_seconds": (
+                    round(time.time() - self._completed_at, 1)
+                    if self._completed_at
+                    else None
+                ),
+                "versions": dict(self._versions),
+            }
+
+    def _load(self) -> None:
+        try:
+            path = Path(self._state_file)
+            mtime = path.stat().st_mtime
+            with open(path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Could not read sync cycle state: {e}")
+            return
+
+        with self._lock:
+            self._cycle = int(data.get("cycle", 0))
+            self._versions = {k: int(v) for k, v in data.get("versions", {}).items()}
+            self._completed_at = data.get("completed_at")
+            self._file_mtime = mtime
+
+    def _maybe_reload(self) -> None:
+        """Pick up a newer marker written by the sync process"""
+        now = time.time()
+        if now - self._last_reload_check < self.RELOAD_CHECK_SECONDS:
+            return
+        self._last_reload_check = now
+        try:
+            mtime = os.path.getmtime(self._state_file)
+        except OSError:
+            return
+        if mtime > self._file_mtime:
+            self._load()
+
+
+# Global instance
+_sync_cycle_state: Optional[SyncCycleState] = None
+
+
+def get_sync_cycle_state() -> SyncCycleState:
+    """Get or create global sync cycle state"""
+    global _sync_cycle_state
+    if _sync_cycle_state is None:
+        _sync_cycle_state = SyncCycleState()
+    return _sync_cycle_state
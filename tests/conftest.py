@@ -64,3 +64,14 @@ def enable_rate_limiting():
         os.environ["SKIP_RATE_LIMIT"] = original
     else:
         os.environ["SKIP_RATE_LIMIT"] = "1"
+
+
+@pytest.fixture(autouse=True)
+def reset_command_center_sources():
+    """v5.12.11: Command center sources are cached across calls - start each test cold"""
+    yield
+    import sys
+
+    fcc = sys.modules.get("fleet_command_center")
+    if fcc is not None and fcc._command_center is not None:
+        fcc._command_center.invalidate_sources()
@@ -185,6 +185,53 @@ class TestEmailAlertService:
         assert service.config == config
 
 
+class TestSendOutcome:
+    """🆕 v5.12.24: last_send_outcome() and failed sends not rate-limiting retries"""
+
+    def _manager(self, email_sent):
+        from alert_service import AlertManager
+
+        manager = AlertManager()
+        manager.twilio.config = MagicMock(is_configured=lambda: False)
+        manager.email.config = MagicMock(is_configured=lambda: True)
+        manager.email.send_email = MagicMock(return_value=email_sent)
+        manager.email.format_alert_email = MagicMock(return_value=("s", "p", "h"))
+        return manager
+
+    def _alert(self):
+        from alert_service import Alert, AlertType, AlertPriority
+
+        return Alert(
+            alert_type=AlertType.VOLTAGE_ALERT,
+            priority=AlertPriority.HIGH,
+            truck_id="ABC123",
+            message="Low voltage",
+        )
+
+    def test_failed_send_can_be_retried(self):
+        manager = self._manager(email_sent=False)
+
+        assert manager.send_alert(self._alert(), channels=["email"]) is False
+        assert manager.last_send_outcome() == "failed"
+        assert "ABC123" not in manager._last_alert_by_truck
+
+        manager.email.send_email.return_value = True
+        assert manager.send_alert(self._alert(), channels=["email"]) is True
+        assert manager.last_send_outcome() == "sent"
+
+    def test_rate_limited_and_unconfigured(self):
+        manager = self._manager(email_sent=True)
+        manager.send_alert(self._alert(), channels=["email"])
+
+        assert manager.send_alert(self._alert(), channels=["email"]) is False
+        assert manager.last_send_outcome() == "rate_limited"
+
+        manager._last_alert_by_truck.clear()
+        manager._last_alert_by_type.clear()
+        assert manager.send_alert(self._alert(), channels=["sms"]) is False
+        assert manager.last_send_outcome() == "not_configured"
+
+
 class TestAlertFormatting:
     """Test alert message formatting"""
 
@@ -0,0 +1,146 @@
+"""
+Tests for Anomaly Training Scheduler v5.12.8
+
+Tests cover:
+- Fleet training in a real process pool installs and persists every model
+- Requests never train on the caller's thread; last good model keeps serving
+- Warm start from the artifact store (both detector targets)
+- Run metrics (wall time, worker CPU, utilization)
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from ml_engines import anomaly_detection_v2
+from ml_engines.anomaly_detector import AnomalyDetector
+from ml_engines.anomaly_training import (
+    TARGETS,
+    AnomalyArtifactStore,
+    AnomalyTrainingScheduler,
+    _train_truck,
+)
+from ml_engines.feature_store import FleetFeatureStore
+from tests.test_feature_store import _fleet_window
+
+
+@pytest.fixture(scope="module")
+def window():
+    return _fleet_window(n_trucks=4, rows_per_truck=300)
+
+
+@pytest.fixture
+def feature_store(window):
+    return FleetFeatureStore(
+        query_fn=lambda sql, params: window[window["timestamp_utc"] >= params["since"]].copy()
+    )
+
+
+@pytest.fixture
+def scheduler(tmp_path, feature_store):
+    s = AnomalyTrainingScheduler(
+        max_workers=2, store=AnomalyArtifactStore(tmp_path), feature_store=feature_store
+    )
+    yield s
+    s.stop()
+
+
+def _detector(feature_store):
+    return AnomalyDetector(db_connection=MagicMock(), feature_store=feature_store)
+
+
+class TestFleetTraining:
+    def test_process_pool_trains_and_persists(self, scheduler, feature_store, tmp_path):
+        detector = _detector(feature_store)
+        scheduler.attach("fuel", detector)
+        run = scheduler.train_fleet("fuel")
+
+        assert run["trained"] == 4 and run["failed"] == 0
+        assert run["wall_seconds"] > 0 and run["worker_cpu_seconds"] > 0
+        assert 0 < run["cpu_utilization_pct"] <= 100 * 1.05
+        assert set(detector.models) == {f"T{i:03d}" for i in range(4)}
+        assert len(list((tmp_path / "fuel").glob("*.joblib"))) == 4
+
+        anomalies = detector.detect_fleet(check_period_days=1)
+        assert set(anomalies) == set(detector.models)
+
+    def test_worker_matches_inline_fit(self, feature_store):
+        features = feature_store.anomaly_features(30)
+        matrix = features[features["truck_id"] == "T001"][
+            list(TARGETS["fuel"].columns)
+        ].to_numpy(dtype=np.float64)
+
+        artifact = _train_truck("T001", matrix, TARGETS["fuel"])
+        detector = _detector(feature_store)
+        detector._fit("T001", matrix)
+
+        scaled = detector.scalers["T001"].transform(matrix)
+        np.testing.assert_allclose(
+            artifact["model"].decision_function(artifact["scaler"].transform(matrix)),
+            detector.models["T001"].decision_function(scaled),
+        )
+
+
+class TestBackground:
+    def test_request_does_not_block_and_keeps_old_model(self, scheduler, feature_store):
+        detector = _detector(feature_store)
+        scheduler.attach("fuel", detector)
+
+        gate = threading.Event()
+        real_train = scheduler.train_fleet
+
+        def slow_train(*args, **kwargs):
+            gate.wait(5)
+            return real_train(*args, **kwargs)
+
+        scheduler.train_fleet = slow_train
+        assert detector.detect_anomalies("T000") == []  # queued, not trained inline
+        assert "T000" not in detector.models
+
+        gate.set()
+        assert scheduler.wait_idle(timeout=120)
+        first = detector.models["T000"]
+        assert set(detector.models) == {"T000"}
+
+        # Refit requested: the old model serves until the new one is installed
+        gate.clear()
+        detector.detect_anomalies("T000", retrain=True)
+        assert detector.models["T000"] is first
+        gate.set()
+        assert scheduler.wait_idle(timeout=120)
+        assert detector.models["T000"] is not first
+
+    def test_duplicate_requests_coalesce(self, scheduler, feature_store):
+        scheduler.attach("fuel", _detector(feature_store))
+        scheduler._ensure_thread = lambda: None  # keep the queue untouched
+
+        assert scheduler.request("fuel", ["T000", "T001"])
+        assert not scheduler.request("fuel", ["T001"])
+        assert scheduler.get_stats()["targets"]["fuel"]["pending"] == 2
+
+
+class TestWarmStart:
+    def test_attach_loads_stored_models(self, scheduler, feature_store, tmp_path):
+        v2 = anomaly_detection_v2.AnomalyDetector()
+        scheduler.attach("consumption", v2)
+        scheduler.train_fleet("consumption")
+
+        restarted = anomaly_detection_v2.AnomalyDetector()
+        loaded = AnomalyTrainingScheduler(
+            store=AnomalyArtifactStore(tmp_path), feature_store=feature_store
+        ).attach("consumption", restarted)
+
+        assert loaded == 4
+        assert set(restarted.thresholds) == set(v2.thresholds)
+        result = restarted.detect_anomalies("T002", 3.0, 45.0, 10.0)
+        assert "is_anomaly" in result and "status" not in result
+
+    def test_unknown_truck_schedules_training(self, scheduler):
+        v2 = anomaly_detection_v2.AnomalyDetector()
+        scheduler.attach("consumption", v2)
+        scheduler._ensure_thread = lambda: None
+
+        result = v2.detect_anomalies("T009", 3.0, 45.0, 10.0)
+        assert result["status"] == "model_not_found" and result["training_scheduled"]
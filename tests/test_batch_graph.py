@@ -0,0 +1,190 @@
+"""
+Tests for Batch Dependency Graph v5.12.22
+
+Tests cover:
+- Shared results computed once per request and awaited by every section
+- Sections run concurrently; results reported in request order
+- Per-section timeouts that do not cancel shared work for other sections
+- Unknown endpoints, section errors and timings
+- /batch and /batch/dashboard wiring (one latest-state read for all sections)
+"""
+
+import asyncio
+
+import pytest
+
+from batch_graph import BatchGraph
+
+
+def _graph(timeout=1.0, shared_delay=0.0, calls=None):
+    calls = calls if calls is not None else []
+    graph = BatchGraph(section_timeout=timeout)
+
+    async def latest(batch):
+        calls.append("latest")
+        await asyncio.sleep(shared_delay)
+        return ["T1", "T2"]
+
+    async def fleet(batch):
+        return {"trucks": len(await batch.get("latest"))}
+
+    async def alerts(batch):
+        return [f"alert-{t}" for t in await batch.get("latest")]
+
+    async def slow(batch):
+        await batch.get("latest")
+        await asyncio.sleep(5)
+
+    async def broken(batch):
+        raise RuntimeError("db down")
+
+    graph.shared("latest", latest)
+    graph.section("fleet", fleet)
+    graph.section("alerts", alerts)
+    graph.section("slow", slow)
+    graph.section("broken", broken)
+    return graph, calls
+
+
+class TestBatchGraph:
+    def test_shared_result_computed_once(self):
+        graph, calls = _graph(shared_delay=0.02)
+
+        result = asyncio.run(graph.run(["alerts", "fleet"]))
+
+        assert calls == ["latest"]
+        assert result.data == {
+            "alerts": ["alert-T1", "alert-T2"],
+            "fleet": {"trucks": 2},
+        }
+        assert list(result.data) == ["alerts", "fleet"]
+        assert result.errors == {}
+        assert set(result.timings["sections"]) == {"alerts", "fleet"}
+        assert result.timings["shared"]["latest"] >= 20
+        assert result.timings["total"] >= result.timings["shared"]["latest"]
+
+    def test_shared_result_not_computed_when_unused(self):
+        graph, calls = _graph()
+        graph.section("static", lambda batch: asyncio.sleep(0, result=1))
+
+        result = asyncio.run(graph.run(["static"]))
+
+        assert result.data == {"static": 1}
+        assert calls == [] and result.timings["shared"] == {}
+
+    def test_timeout_does_not_cancel_shared_work(self):
+        # slow times out while latest is still running; fleet still gets it
+        graph, calls = _graph(timeout=0.1, shared_delay=0.05)
+
+        result = asyncio.run(graph.run(["slow", "fleet"]))
+
+        assert result.errors == {"slow": "Timed out after 0.1s"}
+        assert result.data == {"fleet": {"trucks": 2}}
+        assert calls == ["latest"]
+        assert result.timings["sections"]["slow"] < 1000
+
+    def test_sections_run_concurrently(self):
+        graph = BatchGraph(section_timeout=1)
+        for name in ("a", "b", "c"):
+            graph.section(name, lambda batch: asyncio.sleep(0.1, result=True))
+
+        result = asyncio.run(graph.run(["a", "b", "c"]))
+
+        assert result.timings["total"] < 250
+
+    def test_errors_and_unknown_endpoints(self):
+        graph, _ = _graph()
+
+        result = asyncio.run(graph.run(["broken", "nope", "fleet", "fleet"]))
+
+        assert result.data == {"fleet": {"trucks": 2}}
+        assert result.errors == {
+            "broken": "Broken fetch error: db down",
+            "nope": "Unknown endpoint: nope",
+        }
+        assert "nope" not in result.timings["sections"]
+
+    def test_unknown_shared_result(self):
+        graph = BatchGraph()
+
+        async def section(batch):
+            return await batch.get("missing")
+
+        graph.section("x", section)
+
+        assert "x" in asyncio.run(graph.run(["x"])).errors
+
+
+class TestBatchEndpoints:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        import main
+
+        calls = []
+
+        async def get_latest_states():
+            calls.append("latest_states")
+            return [{"truck_id": "T1"}]
+
+        async def get_fleet_summary(latest=None):
+            calls.append(("fleet", latest))
+            return {"total_trucks": len(latest)}
+
+        async def get_active_alerts(latest=None):
+            calls.append(("alerts", latest))
+            return []
+
+        async def get_all_refuels(days, latest=None):
+            calls.append(("refuels", days, latest))
+            return []
+
+        async def get_fleet_kpis(days=1):
+            await asyncio.sleep(5)
+
+        for func in (
+            get_latest_states,
+            get_fleet_summary,
+            get_active_alerts,
+            get_all_refuels,
+            get_fleet_kpis,
+        ):
+            monkeypatch.setattr(main.async_db, func.__name__, func)
+        monkeypatch.setattr(main, "MEMORY_CACHE_AVAILABLE", False)
+        client = TestClient(main.app)
+        client.calls = calls
+        return client
+
+    def test_batch_shares_latest_states_and_times_out_slow_sections(self, client):
+        response = client.post(
+            "/fuelAnalytics/api/batch",
+            json={
+                "endpoints": ["fleet", "alerts", "refuels", "kpis"],
+                "days": 3,
+                "section_timeout": 0.2,
+            },
+        )
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["fetched_endpoints"] == ["fleet", "alerts", "refuels"]
+        assert body["data"]["fleet"]["total_trucks"] == 1
+        assert body["errors"] == {"kpis": "Timed out after 0.2s"}
+        assert client.calls.count("latest_states") == 1
+        assert ("refuels", 3, [{"truck_id": "T1"}]) in client.calls
+        assert set(body["timings_ms"]["sections"]) == {
+            "fleet",
+            "alerts",
+            "refuels",
+            "kpis",
+        }
+        assert "latest_states" in body["timings_ms"]["shared"]
+
+    def test_batch_dashboard(self, client):
+        body = client.get("/fuelAnalytics/api/batch/dashboard").json()
+
+        assert body["success"] and body["fleet"]["total_trucks"] == 1
+        assert body["alerts"] == [] and body["refuels"] == []
+        assert client.calls.count("latest_states") == 1
+        assert body["timings_ms"]["total"] >= 0
@@ -0,0 +1,201 @@
+"""
+Tests for Conditional Responses v5.12.23
+
+Tests cover:
+- ETag per (path, params, data version); 304 on If-None-Match without
+  running the handler
+- Cached (gzipped) bodies served per version; GZipMiddleware does not
+  compress them again
+- Version changes of relevant vs unrelated sync sources, and the time epoch
+- Pass-through without a sync cycle, for errors and for other routes
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+
+import conditional_responses
+from conditional_responses import (
+    ConditionalCache,
+    ConditionalResponseMiddleware,
+    compute_etag,
+    etag_matches,
+)
+
+PAYLOAD = {"trucks": [{"truck_id": f"T{i}", "mpg": 6.5} for i in range(100)]}
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    state = {"cycle": 10, "versions": {"fuel_metrics": 10, "dtc_events": 4}}
+
+    def fake():
+        if not state["cycle"]:
+            return None
+        return state["cycle"], dict(state["versions"])
+
+    monkeypatch.setattr(conditional_responses, "_sync_versions", fake)
+    return state
+
+
+@pytest.fixture
+def app(versions):
+    calls = []
+    api = FastAPI()
+
+    @api.get("/fleet")
+    async def fleet(days: int = 1):
+        calls.append(days)
+        return {**PAYLOAD, "days": days}
+
+    @api.get("/broken")
+    async def broken():
+        calls.append("broken")
+        raise HTTPException(status_code=503, detail="down")
+
+    @api.get("/other")
+    async def other():
+        calls.append("other")
+        return {"ok": True}
+
+    cache = ConditionalCache(max_entries=4)
+    api.add_middleware(
+        ConditionalResponseMiddleware,
+        routes={"/fleet": ("fuel_metrics",), "/broken": None},
+        cache=cache,
+    )
+    api.add_middleware(GZipMiddleware, minimum_size=1000)
+    api.state.calls = calls
+    api.state.cache = cache
+    return api
+
+
+class TestConditionalMiddleware:
+    def test_304_and_cached_body_skip_the_handler(self, app):
+        client = TestClient(app)
+
+        first = client.get("/fleet")
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["vary"] == "Accept-Encoding"
+        assert first.json()["days"] == 1
+
+        not_modified = client.get("/fleet", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+        again = client.get("/fleet")
+        assert again.json() == first.json()
+        assert again.headers["etag"] == etag
+
+        assert app.state.calls == [1]
+        stats = app.state.cache.get_stats()
+        assert (stats["misses"], stats["not_modified"], stats["body_hits"]) == (
+            1,
+            1,
+            1,
+        )
+        assert stats["bytes_saved"] > 0
+
+    def test_gzip_body_compressed_once(self, app):
+        raw = TestClient(app).get("/fleet", headers={"Accept-Encoding": "gzip"})
+        entry = app.state.cache.get(raw.headers["etag"], "gzip")
+
+        # stored gzipped, served as-is (not gzipped again by GZipMiddleware)
+        assert gzip.decompress(entry.body).startswith(b'{"trucks"')
+        assert int(raw.headers["content-length"]) == len(entry.body)
+
+    def test_identity_variant_cached_separately(self, app):
+        client = TestClient(app)
+        etag = client.get("/fleet").headers["etag"]
+
+        plain = client.get("/fleet", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in plain.headers
+        assert plain.headers["etag"] == etag
+        assert plain.json()["days"] == 1
+        assert app.state.calls == [1, 1]
+
+    def test_relevant_version_change_invalidates(self, app, versions):
+        client = TestClient(app)
+        etag = client.get("/fleet").headers["etag"]
+
+        versions["cycle"] = 11
+        versions["versions"]["dtc_events"] = 11  # /fleet does not read it
+        assert client.get("/fleet", headers={"If-None-Match": etag}).status_code == 304
+
+        versions["versions"]["fuel_metrics"] = 11
+        changed = client.get("/fleet", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert app.state.calls == [1, 1]
+
+    def test_params_are_part_of_the_key(self, app):
+        client = TestClient(app)
+
+        a = client.get("/fleet?days=7&x=1").headers["etag"]
+        b = client.get("/fleet?x=1&days=7").headers["etag"]
+        c = client.get("/fleet?days=3").headers["etag"]
+
+        assert a == b and a != c
+        assert app.state.calls == [7, 3]
+
+    def test_no_sync_cycle_passes_through(self, app, versions):
+        versions["cycle"] = 0
+        client = TestClient(app)
+
+        response = client.get("/fleet", headers={"If-None-Match": "*"})
+        client.get("/fleet")
+
+        assert response.status_code == 200 and "etag" not in response.headers
+        assert app.state.calls == [1, 1]
+        assert app.state.cache.get_stats()["bypassed"] == 2
+
+    def test_errors_and_other_routes_untouched(self, app):
+        client = TestClient(app)
+
+        for _ in range(2):
+            broken = client.get("/broken")
+            assert broken.status_code == 503 and "etag" not in broken.headers
+        other = client.get("/other")
+
+        assert "etag" not in other.headers
+        assert app.state.calls == ["broken", "broken", "other"]
+        assert app.state.cache.get_stats()["entries"] == 0
+
+    def test_lru_bound(self, app):
+        client = TestClient(app)
+        for days in range(6):
+            client.get(f"/fleet?days={days}")
+
+        assert app.state.cache.get_stats()["entries"] == 4
+
+
+class TestEtags:
+    def test_epoch_rolls_etag(self, versions):
+        max_age = conditional_responses.CONDITIONAL_MAX_AGE
+        now = 1_000 * max_age
+
+        same = compute_etag("/fleet", b"", None, now=now + max_age - 1)
+        assert compute_etag("/fleet", b"", None, now=now) == same
+        assert compute_etag("/fleet", b"", None, now=now + max_age) != same
+
+    def test_any_source_uses_cycle(self, versions):
+        etag = compute_etag("/cc", b"", None, now=0)
+        versions["cycle"] = 11
+
+        assert compute_etag("/cc", b"", None, now=0) != etag
+
+    def test_if_none_match_parsing(self):
+        etag = 'W/"abc"'
+
+        assert etag_matches('W/"abc"', etag)
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('"x", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('W/"abd"', etag)
@@ -0,0 +1,238 @@
+"""
+Tests for Connection Manager v5.12.16
+
+Tests cover:
+- Connections are reused across checkouts (one connect per pooled slot)
+- Checkout/wait histograms and timeout counting
+- Ping-after-idle replaces stale connections
+- Leak detection and one-shot leak reporting
+- pool_for() identity mapping and ad-hoc pools
+- PoolConfig built from settings
+- New pooled connections are wrapped by the query profiler
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import exc as sa_exc
+
+import connection_manager
+from connection_manager import (
+    LOCAL,
+    WIALON,
+    ConnectionManager,
+    LatencyHistogram,
+    PoolConfig,
+)
+
+
+def _config(**overrides):
+    values = dict(
+        host="db.local",
+        port=3306,
+        user="fuel",
+        password="secret",
+        database="fuel_copilot",
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    values.update(overrides)
+    return PoolConfig(**values)
+
+
+@pytest.fixture
+def connect():
+    with patch.object(connection_manager.pymysql, "connect") as connect:
+        connect.side_effect = lambda **kwargs: MagicMock(name="conn")
+        yield connect
+
+
+@pytest.fixture
+def manager(connect):
+    manager = ConnectionManager(
+        {
+            LOCAL: _config(),
+            WIALON: _config(host="wialon.remote", database="wialon_collect"),
+        }
+    )
+    yield manager
+    manager.dispose()
+
+
+class TestHistogram:
+    def test_quantiles(self):
+        hist = LatencyHistogram(buckets=(0.001, 0.01, 0.1))
+        for seconds in [0.0005] * 90 + [0.05] * 9 + [2.0]:
+            hist.observe(seconds)
+
+        assert hist.count == 100
+        assert hist.quantile(0.5) == 0.001
+        assert hist.quantile(0.95) == 0.1
+        assert hist.quantile(1.0) == 2.0
+        assert hist.snapshot()["buckets"] == {0.001: 90, 0.01: 90, 0.1: 99}
+
+    def test_empty(self):
+        assert LatencyHistogram().snapshot()["p99_ms"] == 0.0
+
+
+class TestCheckout:
+    def test_connections_are_reused(self, manager, connect):
+        for _ in range(5):
+            with manager.connection(LOCAL) as conn:
+                conn.cursor()
+
+        assert connect.call_count == 1
+        kwargs = connect.call_args.kwargs
+        assert kwargs["host"] == "db.local"
+        assert kwargs["autocommit"] is True
+
+    def test_checkout_and_wait_counted(self, manager):
+        first = manager.checkout(LOCAL)
+        first.close()
+        manager.checkout(LOCAL).close()
+
+        pymysql_stats = manager.stats()[LOCAL]["drivers"]["pymysql"]
+        assert pymysql_stats["checkouts"] == 2
+        # Only the first checkout found the pool empty
+        assert pymysql_stats["waits"] == 1
+        assert pymysql_stats["checkout"]["count"] == 2
+        assert pymysql_stats["held"]["count"] == 2
+
+    def test_timeout_counted(self, manager):
+        held = [manager.checkout(LOCAL) for _ in range(2)]
+
+        manager.pool(LOCAL)._raw_pool._timeout = 0.01
+        with pytest.raises(sa_exc.TimeoutError):
+            manager.checkout(LOCAL)
+
+        assert manager.stats()[LOCAL]["drivers"]["pymysql"]["timeouts"] == 1
+        for conn in held:
+            conn.close()
+
+    def test_warm(self, manager, connect):
+        assert manager.warm(LOCAL) == {LOCAL: 2}
+        assert connect.call_count == 2
+        assert manager.stats()[LOCAL]["pymysql_pool"]["idle"] == 2
+
+    def test_warm_failure_is_not_raised(self, manager, connect):
+        connect.side_effect = OSError("refused")
+
+        assert manager.warm(LOCAL) == {LOCAL: "refused"}
+
+
+class TestHealth:
+    def test_idle_connection_pinged_and_replaced(self, manager, connect):
+        conn = manager.checkout(LOCAL)
+        stale = conn.dbapi_connection
+        stale.ping.side_effect = OSError("gone away")
+        record = conn._connection_record
+        conn.close()
+        record.info["checked_in_at"] -= 60
+
+        fresh = manager.checkout(LOCAL)
+
+        assert fresh.dbapi_connection is not stale
+        assert connect.call_count == 2
+        assert manager.stats()[LOCAL]["stale_replaced"] == 1
+        fresh.close()
+
+    def test_recent_connection_not_pinged(self, manager):
+        conn = manager.checkout(LOCAL)
+        dbapi = conn.dbapi_connection
+        conn.close()
+
+        manager.checkout(LOCAL).close()
+
+        dbapi.ping.assert_not_called()
+
+    def test_leak_reported_once(self, connect):
+        manager = ConnectionManager({LOCAL: _config(leak_threshold_seconds=0)})
+        conn = manager.checkout(LOCAL)
+        time.sleep(0.01)
+
+        with patch.object(connection_manager.logger, "warning") as warning:
+            leaks = manager.check_leaks()[LOCAL]
+            manager.check_leaks()
+
+        assert len(leaks) == 1
+        assert "test_connection_manager.py" in leaks[0]["caller"]
+        assert warning.call_count == 1
+        assert manager.stats()[LOCAL]["leaks_reported"] == 1
+
+        conn.close()
+        assert manager.check_leaks()[LOCAL] == []
+        manager.dispose()
+
+    def test_health_check(self, manager):
+        assert manager.health_check(LOCAL)[LOCAL]["status"] == "healthy"
+
+
+class TestProfiling:
+    def test_new_connections_are_profiled(self, manager, connect, monkeypatch):
+        import query_profiler
+
+        profiler = query_profiler.QueryProfiler(enabled=True)
+        monkeypatch.setattr(query_profiler, "_profiler", profiler)
+        connect.side_effect = lambda **kwargs: MagicMock(name="conn", _profiled=False)
+
+        with manager.connection(LOCAL) as conn:
+            conn.query("SELECT * FROM trucks WHERE truck_id = 'T1'")
+            dbapi = conn.dbapi_connection
+
+        assert dbapi._profiled is True
+        (stats,) = profiler.top()
+        assert stats["fingerprint"] == "SELECT * FROM trucks WHERE truck_id = ?"
+        assert "test_connection_manager.py" in next(iter(stats["callers"]))
+
+
+class TestPoolFor:
+    def test_known_database_maps_to_named_pool(self, manager):
+        config = {
+            "host": "wialon.remote",
+            "port": "3306",
+            "user": "fuel",
+            "password": "secret",
+            "db": "wialon_collect",
+        }
+
+        assert manager.pool_for(config) == WIALON
+
+    def test_unknown_database_gets_adhoc_pool(self, manager, connect):
+        config = {
+            "host": "127.0.0.1",
+            "port": 3307,
+            "user": "reports",
+            "password": "pw",
+            "database": "archive",
+        }
+
+        name = manager.pool_for(config)
+        assert name == manager.pool_for(config)
+        assert name not in (LOCAL, WIALON)
+
+        pool = manager.pool(name)
+        assert pool.config.database == "archive"
+        assert pool.config.pool_size == 2
+
+        manager.checkout(name).close()
+        assert connect.call_args.kwargs["port"] == 3307
+
+    def test_unknown_pool_name(self, manager):
+        with pytest.raises(KeyError):
+            manager.pool("nope")
+
+
+class TestSettings:
+    def test_from_settings(self, monkeypatch):
+        monkeypatch.setenv("WIALON_DB_POOL_SIZE", "7")
+        monkeypatch.setenv("DB_LEAK_THRESHOLD_SECONDS", "15")
+        from settings import DatabaseSettings, WialonDatabaseSettings
+
+        wialon = PoolConfig.from_settings(WialonDatabaseSettings())
+        local = PoolConfig.from_settings(DatabaseSettings())
+
+        assert wialon.pool_size == 7
+        assert wialon.leak_threshold_seconds == 15
+        assert local.leak_threshold_seconds == 15
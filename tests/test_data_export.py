@@ -0,0 +1,80 @@
+"""
+Tests for Data Export v5.12.17 summary aggregation
+
+Tests cover:
+- Hot (SQL) and archived (Parquet) per-truck partials merge to the same
+  summary as one aggregate over all rows
+- Sums / averages with no values stay NULL (min_count=1)
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_export import DataExporter
+
+
+def _rows(truck_id, start, n, mpg=6.0):
+    return pd.DataFrame(
+        {
+            "timestamp_utc": [start + timedelta(hours=i) for i in range(n)],
+            "truck_id": truck_id,
+            "carrier_id": "C1",
+            "estimated_pct": np.linspace(80, 40, n),
+            "mpg_current": mpg,
+            "mileage_delta": 10.0,
+            "consumption_gph": 4.0,
+            "idle_duration_minutes": 5.0,
+        }
+    )
+
+
+def _as_sql(partials):
+    """MySQL returns SUM() of FLOAT columns as Decimal"""
+    out = partials.copy()
+    for column in ("fuel_pct_sum", "mpg_sum", "total_miles", "total_gallons"):
+        out[column] = [None if pd.isna(v) else Decimal(str(v)) for v in out[column]]
+    return out
+
+
+class TestSummaryPartials:
+    def test_hot_and_archived_merge_like_one_aggregate(self):
+        archived = _rows("T1", datetime(2025, 1, 1), 24)
+        hot = pd.concat(
+            [_rows("T1", datetime(2026, 1, 1), 10, mpg=8.0), _rows("T2", datetime(2026, 1, 1), 5)],
+            ignore_index=True,
+        )
+
+        summary = DataExporter._combine_summary_partials(
+            [_as_sql(DataExporter._summary_partials(hot)), DataExporter._summary_partials(archived)]
+        )
+
+        t1 = summary.set_index("truck_id").loc["T1"]
+        both = pd.concat([archived, hot[hot.truck_id == "T1"]])
+        assert t1["data_points"] == 34
+        assert t1["first_reading"] == datetime(2025, 1, 1)
+        assert t1["last_reading"] == datetime(2026, 1, 1, 9)
+        assert t1["avg_mpg"] == pytest.approx(both["mpg_current"].mean())
+        assert t1["avg_fuel_pct"] == pytest.approx(both["estimated_pct"].mean())
+        assert t1["total_gallons"] == pytest.approx(34 * 2.0)
+        assert list(summary["truck_id"]) == ["T1", "T2"]
+
+    def test_no_values_stay_null(self):
+        rows = _rows("T1", datetime(2025, 1, 1), 3)
+        rows["mpg_current"] = None
+        rows["mileage_delta"] = None
+
+        summary = DataExporter._combine_summary_partials(
+            [DataExporter._summary_partials(rows), DataExporter._summary_partials(rows.iloc[:0])]
+        )
+
+        assert pd.isna(summary.loc[0, "avg_mpg"])
+        assert pd.isna(summary.loc[0, "total_miles"])
+        assert summary.loc[0, "total_idle_minutes"] == 15.0
+
+    def test_nothing_to_summarize(self):
+        empty = DataExporter._summary_partials(_rows("T1", datetime(2025, 1, 1), 0))
+        assert DataExporter._combine_summary_partials([empty]).empty
@@ -0,0 +1,419 @@
+"""
+Tests for Async Read Paths v5.12.22
+
+Tests cover:
+- Fleet summary, truck detail, refuels, alerts and KPIs over a fake aiomysql
+  connection, built with the same helpers as the sync path
+- Query counts (one connection, no per-truck round trips)
+- Shared latest-state rows reused by fleet, alerts and refuels (v5.12.22)
+- aget_latest_states() missing-table fallback
+- AsyncDatabaseWrapper native path, sync fallback and dedicated executor
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import database_async_reads as reads
+from database import sort_alerts
+from database_async_wrapper import AsyncDatabaseWrapper
+from src.repositories.latest_state_repository import aget_latest_states
+
+NOW = datetime(2025, 12, 20, 14, 0, 0)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql, params=None):
+        self.conn.queries.append((sql, params))
+        for marker, result in self.conn.responses:
+            if marker in sql:
+                if isinstance(result, Exception):
+                    raise result
+                self.rows = result(params) if callable(result) else result
+                return
+        self.rows = []
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    """aiomysql connection answering by SQL substring, first match wins"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.queries = []
+        self.checkouts = 0
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self)
+
+    def __call__(self):
+        conn = self
+
+        class Checkout:
+            async def __aenter__(self):
+                conn.checkouts += 1
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Checkout()
+
+
+def _latest(truck_id, status, minutes_ago=1, **values):
+    row = {c: None for c in reads.FLEET_READ_COLUMNS}
+    row.update(
+        truck_id=truck_id,
+        truck_status=status,
+        timestamp_utc=NOW - timedelta(minutes=minutes_ago),
+        estimated_pct=60.0,
+        sensor_pct=58.0,
+        mpg_current=6.0,
+        consumption_gph=0.8,
+    )
+    row.update(values)
+    return row
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    def install(responses):
+        conn = FakeConnection(responses)
+        monkeypatch.setattr(reads, "AsyncConnection", conn)
+        monkeypatch.setattr(reads, "memory_cache", None)
+        monkeypatch.setattr(reads, "get_allowed_trucks", lambda: {"T1", "T2"})
+        return conn
+
+    return install
+
+
+class TestFleetSummary:
+    def test_one_connection_four_queries(self, fake_db):
+        conn = fake_db(
+            [
+                (
+                    "fuel_metrics_latest",
+                    [
+                        _latest("T1", "MOVING", sensor_pct=40.0),
+                        _latest("T2", "OFFLINE", minutes_ago=30),
+                    ],
+                ),
+                ("SELECT NOW()", [(NOW,)]),
+                ("dtc_events", [(1,)]),
+                ("avg_idle_gph_24h", [("T1", 6.44, None)]),
+            ]
+        )
+
+        summary = asyncio.run(reads.fleet_summary())
+
+        assert conn.checkouts == 1 and len(conn.queries) == 4
+        assert summary["total_trucks"] == 2
+        assert summary["active_trucks"] == 1 and summary["offline_trucks"] == 1
+        assert summary["active_dtcs"] == 1
+        assert summary["data_source"] == "MySQL"
+        assert summary["critical_count"] == 1  # the OFFLINE truck
+        details = {t["truck_id"]: t for t in summary["truck_details"]}
+        assert details["T1"]["mpg"] == 6.4  # 24h average wins over current
+        assert details["T1"]["sensor_pct"] == 40.0
+        # allowed trucks are bound as one tuple parameter
+        assert sorted(conn.queries[0][1]["truck_ids"]) == ["T1", "T2"]
+
+    def test_missing_dtc_table_counts_zero(self, fake_db):
+        fake_db(
+            [
+                ("fuel_metrics_latest", [_latest("T1", "MOVING")]),
+                ("SELECT NOW()", [(NOW,)]),
+                ("dtc_events", RuntimeError("no dtc_events")),
+            ]
+        )
+
+        assert asyncio.run(reads.fleet_summary())["active_dtcs"] == 0
+
+    def test_shared_latest_rows_narrowed_to_allowed_trucks(self, fake_db):
+        conn = fake_db(
+            [
+                ("SELECT NOW()", [(NOW,)]),
+                ("dtc_events", [(0,)]),
+            ]
+        )
+        shared = [_latest("T1", "MOVING"), _latest("T9", "MOVING")]
+
+        summary = asyncio.run(reads.fleet_summary(latest=shared))
+
+        assert len(conn.queries) == 3  # no latest-state read of its own
+        assert [t["truck_id"] for t in summary["truck_details"]] == ["T1"]
+
+    def test_no_rows_returns_none(self, fake_db):
+        fake_db([("fuel_metrics_latest", [])])
+
+        assert asyncio.run(reads.fleet_summary()) is None
+
+
+class TestTruckDetail:
+    def test_shaped_like_sync_record(self, fake_db):
+        row = {c: None for c in reads.LATEST_TRUCK_DATA_COLUMNS}
+        row.update(
+            truck_id="T1",
+            truck_status="STOPPED",
+            timestamp_utc=NOW,
+            mpg_current=9.5,
+            consumption_gph=1.0,
+            battery_voltage=12.5,
+            gps_quality="GOOD|sats=10|acc=3m",
+        )
+        conn = fake_db(
+            [
+                ("fuel_metrics_latest", [row]),
+                (
+                    "avg_mpg_24h",
+                    [
+                        {
+                            "truck_id": "T1",
+                            "avg_mpg_24h": 6.1,
+                            "mpg_readings_24h": 12,
+                            "avg_idle_gph_24h": 0.7,
+                            "idle_readings_24h": 5,
+                        }
+                    ],
+                ),
+            ]
+        )
+
+        record = asyncio.run(reads.truck_latest_record("T1"))
+
+        assert conn.queries[0][1]["truck_ids"] == ("T1",)
+        assert conn.queries[1][1] == {"truck_id": "T1"}
+        assert record["mpg_current"] == 8.2
+        assert record["consumption_lph"] == 3.79
+        assert record["timestamp"] == NOW.isoformat()
+        assert record["idle_gph"] == 0.7  # 24h average, enough readings
+        assert record["voltage_status"] == "NORMAL"
+        assert record["gps_quality"] == "GOOD"
+
+    def test_unknown_truck_returns_none(self, fake_db):
+        conn = fake_db([("fuel_metrics_latest", [])])
+
+        assert asyncio.run(reads.truck_latest_record("NOPE")) is None
+        assert len(conn.queries) == 1
+
+
+class TestRefuels:
+    def test_events_first_then_one_fallback_query(self, fake_db):
+        def metrics(params):
+            assert params["truck_ids"] == ("T2",)
+            return [
+                {
+                    "truck_id": "T2",
+                    "timestamp_utc": NOW - timedelta(hours=2),
+                    "refuel_gallons": 80.0,
+                    "fuel_level_after_pct": 90.0,
+                    "fuel_level_after_gallons": 180.0,
+                }
+            ]
+
+        conn = fake_db(
+            [
+                ("fuel_metrics_latest", [{"truck_id": "T1"}, {"truck_id": "T2"}]),
+                (
+                    "FROM refuel_events",
+                    [
+                        {
+                            "truck_id": "T1",
+                            "timestamp_utc": NOW - timedelta(days=1),
+                            "refuel_gallons": 100.0,
+                            "fuel_level_after_pct": 95.0,
+                            "fuel_level_before_pct": 40.0,
+                        }
+                    ],
+                ),
+                ("FROM fuel_metrics\n", metrics),
+            ]
+        )
+
+        refuels = asyncio.run(reads.all_refuels(7))
+
+        assert len(conn.queries) == 3
+        assert [r["truck_id"] for r in refuels] == ["T2", "T1"]  # newest first
+        assert refuels[1]["source"] == "refuel_events"
+        assert refuels[0]["gallons"] == 80.0
+        assert "%(days_back)s" in conn.queries[1][0]
+
+    def test_missing_refuel_events_table_uses_fuel_metrics(self, fake_db):
+        conn = fake_db(
+            [
+                ("FROM refuel_events", RuntimeError("1146")),
+                ("FROM fuel_metrics\n", []),
+            ]
+        )
+
+        assert asyncio.run(reads.refuel_history("T1", 30)) == []
+        assert len(conn.queries) == 2
+
+
+class TestAlertsAndKpis:
+    def test_alerts_from_one_latest_state_read(self, fake_db):
+        now = datetime.now()
+        conn = fake_db(
+            [
+                (
+                    "fuel_metrics_latest",
+                    [
+                        {
+                            "truck_id": "T1",
+                            "timestamp_utc": now - timedelta(minutes=30),
+                            "consumption_gph": 0.5,
+                            "mpg_current": None,
+                            "estimated_pct": 50.0,
+                        },
+                        {
+                            "truck_id": "T2",
+                            "timestamp_utc": now,
+                            "consumption_gph": 2.0,
+                            "mpg_current": None,
+                            "estimated_pct": 10.0,
+                        },
+                    ],
+                )
+            ]
+        )
+
+        alerts = asyncio.run(reads.active_alerts())
+
+        assert len(conn.queries) == 1
+        assert sorted((a["truck_id"], a["type"]) for a in alerts) == [
+            ("T1", "offline"),
+            ("T2", "high_idle"),
+            ("T2", "low_fuel"),
+        ]
+        assert alerts == sort_alerts(list(alerts))  # sync path ordering
+
+    def test_alerts_and_refuels_reuse_shared_rows(self, fake_db):
+        conn = fake_db([("FROM fuel_metrics\n", [])])
+        shared = [
+            {
+                "truck_id": "T1",
+                "timestamp_utc": datetime.now(),
+                "consumption_gph": 0.5,
+                "mpg_current": 6.0,
+                "estimated_pct": 50.0,
+            }
+        ]
+
+        assert asyncio.run(reads.active_alerts(latest=shared)) == []
+        assert asyncio.run(reads.all_refuels(7, latest=shared)) == []
+        assert not any("fuel_metrics_latest" in sql for sql, _ in conn.queries)
+
+    def test_kpis_from_tuple_row_and_cached(self, fake_db, monkeypatch):
+        from database_mysql import get_kpi_summary
+        from memory_cache import MemoryCache
+
+        conn = fake_db(
+            [("FROM fuel_metrics", [(600, 2, 300.0, 60, 10.0, 10, 60.0, 10, 70.0, 70)])]
+        )
+        cache = MemoryCache(max_size=10, cleanup_interval=3600)
+        monkeypatch.setattr(reads, "memory_cache", cache)
+
+        kpis = asyncio.run(reads.fleet_kpis(1))
+        again = asyncio.run(reads.fleet_kpis(1))
+
+        assert kpis is again and len(conn.queries) == 1
+        assert kpis["fleet_avg_mpg"] == 5.0
+        assert kpis["truck_count"] == 2
+        assert conn.queries[0][1] == {"days_back": 1}
+        # same entry the sync @cached get_kpi_summary(days_back=1) reads
+        assert cache.get(get_kpi_summary.cache_key(days_back=1)) is kpis
+        cache.shutdown()
+
+
+class TestLatestStateFallback:
+    def test_missing_table_falls_back_to_fuel_metrics(self):
+        missing = Exception(1146, "Table 'fuel_metrics_latest' doesn't exist")
+        conn = FakeConnection(
+            [
+                ("FROM fuel_metrics_latest", missing),
+                ("MAX(timestamp_utc)", [{"truck_id": "T1"}]),
+            ]
+        )
+
+        rows = asyncio.run(
+            aget_latest_states(conn, columns=["truck_id"], truck_ids=["T1"])
+        )
+
+        assert rows == [{"truck_id": "T1"}]
+        assert len(conn.queries) == 2
+
+    def test_empty_truck_list_skips_query(self):
+        conn = FakeConnection([])
+
+        assert asyncio.run(aget_latest_states(conn, truck_ids=[])) == []
+        assert conn.queries == []
+
+
+class FakeManager:
+    mysql_available = True
+
+    def __init__(self):
+        self.threads = []
+
+    def get_fleet_summary(self):
+        self.threads.append(threading.current_thread().name)
+        return {"total_trucks": 0, "data_source": "CSV"}
+
+    def get_alerts(self):
+        self.threads.append(threading.current_thread().name)
+        return [{"type": "sync"}]
+
+
+class TestWrapper:
+    def test_native_path_used(self, monkeypatch):
+        async def native_alerts(latest=None):
+            return [{"type": "native"}]
+
+        monkeypatch.setattr(reads, "active_alerts", native_alerts)
+        manager = FakeManager()
+        wrapper = AsyncDatabaseWrapper(manager, native_reads=True)
+
+        assert asyncio.run(wrapper.get_alerts()) == [{"type": "native"}]
+        assert manager.threads == []
+        assert wrapper.stats["active_alerts"]["native"] == 1
+
+    def test_errors_and_empty_results_fall_back_to_sync(self, monkeypatch):
+        async def broken(latest=None):
+            raise ConnectionRefusedError("mysql down")
+
+        async def nothing(latest=None):
+            return None
+
+        monkeypatch.setattr(reads, "active_alerts", broken)
+        monkeypatch.setattr(reads, "fleet_summary", nothing)
+        manager = FakeManager()
+        wrapper = AsyncDatabaseWrapper(manager, native_reads=True)
+
+        assert asyncio.run(wrapper.get_active_alerts()) == [{"type": "sync"}]
+        assert asyncio.run(wrapper.get_fleet_summary())["data_source"] == "CSV"
+        assert wrapper.stats["active_alerts"]["native_errors"] == 1
+        assert wrapper.stats["fleet_summary"]["sync"] == 1
+        assert all(name.startswith("api-db") for name in manager.threads)
+
+    def test_native_reads_disabled(self, monkeypatch):
+        monkeypatch.setenv("API_NATIVE_READS", "false")
+        manager = FakeManager()
+
+        wrapper = AsyncDatabaseWrapper(manager)
+
+        assert not wrapper.native_reads
+        assert asyncio.run(wrapper.get_alerts()) == [{"type": "sync"}]
@@ -0,0 +1,141 @@
+"""
+Tests for Downsampling Engine v5.12.3
+
+Tests cover:
+- LTTB point budget, endpoints and spike preservation
+- min/max buckets keep every extreme
+- min/max/avg bands
+- downsample_records on ascending / descending row dicts
+- Week-long view response size
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from downsampling import (
+    bucket_bands,
+    downsample_records,
+    lttb_indices,
+    minmax_indices,
+    record_bands,
+)
+
+
+@pytest.fixture
+def week_series():
+    """One week of 30s fuel level readings with a refuel and a theft-like drop"""
+    rng = np.random.default_rng(3)
+    n = 7 * 24 * 120
+    x = 1_765_000_000 + np.arange(n, dtype=float) * 30
+    y = 90 - np.cumsum(np.abs(rng.normal(0.002, 0.001, n)))
+    y[n // 3 :] += 40  # refuel
+    y[2 * n // 3 : 2 * n // 3 + 20] -= 25  # short drop
+    return x, y + rng.normal(0, 0.1, n)
+
+
+class TestLTTB:
+    def test_budget_and_endpoints(self, week_series):
+        x, y = week_series
+        idx = lttb_indices(x, y, 500)
+
+        assert len(idx) <= 500
+        assert idx[0] == 0 and idx[-1] == len(x) - 1
+        assert np.all(np.diff(idx) > 0)
+
+    def test_keeps_short_drop(self, week_series):
+        x, y = week_series
+        idx = lttb_indices(x, y, 300)
+        assert y[idx].min() == pytest.approx(y.min(), abs=1.0)
+
+    def test_small_input_untouched(self):
+        x = np.arange(5, dtype=float)
+        assert lttb_indices(x, x, 10).tolist() == [0, 1, 2, 3, 4]
+
+    def test_nan_skipped(self):
+        x = np.arange(100, dtype=float)
+        y = np.sin(x)
+        y[::7] = np.nan
+        idx = lttb_indices(x, y, 20)
+        assert not np.isnan(y[idx]).any()
+
+
+class TestMinMax:
+    def test_keeps_global_extremes(self, week_series):
+        x, y = week_series
+        idx = minmax_indices(x, y, 400)
+
+        assert len(idx) <= 400
+        assert y.argmax() in idx and y.argmin() in idx
+
+
+class TestBands:
+    def test_bands_cover_all_points(self, week_series):
+        x, y = week_series
+        bands = bucket_bands(x, y, 100)
+
+        assert len(bands["x"]) == 100
+        assert bands["count"].sum() == len(y)
+        assert bands["min"].min() == y.min()
+        assert bands["max"].max() == y.max()
+        assert np.all(bands["min"] <= bands["avg"]) and np.all(bands["avg"] <= bands["max"])
+
+    def test_record_bands(self):
+        start = datetime(2025, 12, 1)
+        rows = [
+            {"timestamp": (start + timedelta(minutes=i)).isoformat(), "fuel_pct": i}
+            for i in range(100)
+        ]
+        bands = record_bands(rows, "timestamp", "fuel_pct", n_buckets=10)
+        assert len(bands) == 10
+        assert bands[0]["min"] == 0 and bands[-1]["max"] == 99
+
+
+class TestRecords:
+    def _rows(self, n=2000, descending=False):
+        start = datetime(2025, 12, 1)
+        rows = [
+            {
+                "timestamp": (start + timedelta(minutes=i)).isoformat(),
+                "fuel_percent": None,
+                "mpg": 6 + np.sin(i / 50),
+            }
+            for i in range(n)
+        ]
+        return rows[::-1] if descending else rows
+
+    def test_falls_through_to_next_series(self):
+        rows = self._rows()
+        out = downsample_records(rows, 100, "timestamp", ("fuel_percent", "mpg"))
+        assert len(out) <= 100
+        assert out[0] is rows[0] and out[-1] is rows[-1]
+
+    def test_rows_with_null_driving_value_stay_eligible(self):
+        # Truck idles for the second half of the window: mpg is NULL there
+        rows = self._rows()
+        for row in rows[1000:]:
+            row["mpg"] = None
+        out = downsample_records(rows, 100, "timestamp", ("mpg",))
+        assert len(out) <= 100
+        assert out[-1] is rows[-1]
+        assert sum(r["mpg"] is None for r in out) > 30
+
+    def test_descending_order_preserved(self):
+        rows = self._rows(descending=True)
+        out = downsample_records(rows, 100, "timestamp", ("mpg",))
+        stamps = [r["timestamp"] for r in out]
+        assert stamps == sorted(stamps, reverse=True)
+        assert out[0] is rows[0]
+
+    def test_noop_without_budget_or_series(self):
+        rows = self._rows(n=50)
+        assert downsample_records(rows, None, "timestamp", ("mpg",)) is rows
+        assert downsample_records(rows, 10, "timestamp", ("missing",)) is rows
+
+    def test_week_view_order_of_magnitude_smaller(self):
+        rows = self._rows(n=7 * 24 * 60)
+        full = json.dumps(rows)
+        reduced = json.dumps(downsample_records(rows, 500, "timestamp", ("mpg",)))
+        assert len(reduced) * 10 < len(full)
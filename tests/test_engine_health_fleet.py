@@ -0,0 +1,129 @@
+"""
+Tests for vectorized fleet health analysis v5.12.13
+
+Tests cover:
+- Parity of analyze_fleet_health(vectorized=True) with the per-truck path
+  (alerts, counts, trucks by status, sensor coverage, cooldown)
+- Fleet baselines loaded with a single query, cached trucks skipped
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from engine_health_engine import EngineHealthAnalyzer, SensorBaseline
+
+SENSOR_RANGES = {
+    "oil_pressure_psi": (10, 70),
+    "coolant_temp_f": (120, 240),
+    "oil_temp_f": (170, 270),
+    "battery_voltage": (11.5, 15.5),
+    "def_level_pct": (0, 40),
+    "engine_load_pct": (10, 100),
+}
+
+
+def _fleet(n, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    fleet, baselines = [], {}
+    for i in range(n):
+        truck_id = f"TR{i:04d}"
+        age = rng.choice([1, 5, 14, 30])
+        timestamp = now - timedelta(minutes=age)
+        row = {
+            "truck_id": truck_id,
+            "timestamp_utc": timestamp.isoformat() if i % 2 else timestamp,
+            "rpm": rng.choice([None, 0, 650, 1400]),
+        }
+        for sensor, (low, high) in SENSOR_RANGES.items():
+            row[sensor] = None if rng.random() < 0.1 else round(rng.uniform(low, high), 1)
+        fleet.append(row)
+
+        baselines[truck_id] = {}
+        if rng.random() < 0.7:
+            baselines[truck_id]["oil_pressure_psi"] = SensorBaseline(
+                "oil_pressure_psi", truck_id, mean_30d=rng.choice([0, 45.0, 55.0])
+            )
+            baselines[truck_id]["battery_voltage"] = SensorBaseline(
+                "battery_voltage", truck_id, mean_7d=13.9
+            )
+    return fleet, baselines
+
+
+def _analyzer(baselines):
+    analyzer = EngineHealthAnalyzer(db_connection=MagicMock())
+    analyzer._baselines_cache = dict(baselines)  # both paths read from the cache
+    return analyzer
+
+
+def _alert_key(alert):
+    d = alert.to_dict()
+    d.pop("timestamp")
+    return tuple(sorted((k, str(v)) for k, v in d.items()))
+
+
+def _assert_same(per_truck, fleet):
+    assert per_truck.total_trucks == fleet.total_trucks
+    assert per_truck.trucks_by_status == fleet.trucks_by_status
+    assert per_truck.sensor_coverage == fleet.sensor_coverage
+    for attr in ("critical_alerts", "warning_alerts"):
+        expected = sorted(_alert_key(a) for a in getattr(per_truck, attr))
+        assert sorted(_alert_key(a) for a in getattr(fleet, attr)) == expected, attr
+    assert fleet.to_dict()["summary"] == per_truck.to_dict()["summary"]
+
+
+class TestVectorizedParity:
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_matches_per_truck_path(self, seed):
+        fleet, baselines = _fleet(400, seed)
+        per_truck = _analyzer(baselines).analyze_fleet_health(fleet)
+        vectorized = _analyzer(baselines).analyze_fleet_health(fleet, vectorized=True)
+
+        assert per_truck.trucks_critical and per_truck.trucks_warning
+        assert any(a.category.value == "trend" for a in per_truck.warning_alerts)
+        _assert_same(per_truck, vectorized)
+
+    def test_cooldown_applies_across_calls(self):
+        fleet, baselines = _fleet(200)
+        per_truck, vectorized = _analyzer(baselines), _analyzer(baselines)
+        for _ in range(2):  # second run: non-critical alerts suppressed
+            _assert_same(
+                per_truck.analyze_fleet_health(fleet),
+                vectorized.analyze_fleet_health(fleet, vectorized=True),
+            )
+        assert set(vectorized._alert_cooldown) == set(per_truck._alert_cooldown)
+
+    def test_empty_fleet(self):
+        summary = EngineHealthAnalyzer().analyze_fleet_health([], vectorized=True)
+        assert summary.total_trucks == 0 and summary.critical_alerts == []
+
+
+class TestFleetBaselines:
+    def test_single_query_for_uncached_trucks(self):
+        now = datetime.now(timezone.utc)
+        conn = MagicMock()
+        conn.execute.return_value = [
+            ("oil_pressure_psi", 48.0, 3.0, 40.0, 60.0, 48.0, 500, 30, now, "T2"),
+            ("coolant_temp_f", 195.0, 5.0, 180.0, 210.0, 195.0, 500, 30, now, "T2"),
+        ]
+        conn.__enter__ = MagicMock(return_value=conn)
+        conn.__exit__ = MagicMock(return_value=False)
+        engine = MagicMock()
+        engine.connect.return_value = conn
+
+        analyzer = EngineHealthAnalyzer(db_connection=MagicMock())
+        cached = {"oil_pressure_psi": SensorBaseline("oil_pressure_psi", "T1", mean_30d=50)}
+        analyzer._baselines_cache["T1"] = cached
+
+        with patch("database_pool.get_local_engine", return_value=engine):
+            fleet = analyzer._get_fleet_baselines(["T1", "T2", "T3"])
+
+        assert conn.execute.call_count == 1
+        assert conn.execute.call_args[0][1]["truck_ids"] == ["T2", "T3"]
+        assert fleet["T1"] is cached
+        assert fleet["T2"]["oil_pressure_psi"].mean_30d == 48.0
+        assert "T3" not in fleet
+        assert set(analyzer._baselines_cache) == {"T1", "T2"}
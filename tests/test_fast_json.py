@@ -0,0 +1,145 @@
+"""
+Tests for Fast JSON Responses v5.12.4
+
+Tests cover:
+- Output parity with FastAPI's jsonable_encoder + json path
+- NaN / NumPy / Decimal / pandas / dataclass handling
+- Stdlib fallback when orjson is missing
+- memory_cache encoded-bytes caching
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+import fast_json
+from fast_json import FastJSONResponse, cache_json_response, cached_json_response, dumps
+from memory_cache import MemoryCache
+
+
+class Priority(Enum):
+    HIGH = "high"
+    LOW = "low"
+
+
+@dataclass
+class ActionItem:
+    truck_id: str
+    priority: Priority
+    created: datetime
+    score: float
+    tags: List[str] = field(default_factory=list)
+
+
+def _payload():
+    return {
+        "generated_at": datetime(2025, 12, 1, 8, 30, 15, 123000),
+        "utc": datetime(2025, 12, 1, tzinfo=timezone.utc),
+        "day": date(2025, 12, 1),
+        "trucks": [
+            {"truck_id": f"T{i:03d}", "mpg": 5.5 + i / 10, "status": "MOVING", "alerts": i}
+            for i in range(50)
+        ],
+        "items": [ActionItem("T001", Priority.HIGH, datetime(2025, 12, 1), 87.5, ["oil"])],
+        "nested": {"a": [1, 2, {"b": None}], "ok": True},
+    }
+
+
+class TestParity:
+    def test_same_json_as_fastapi_default(self):
+        payload = _payload()
+        expected = json.loads(json.dumps(jsonable_encoder(payload)))
+        assert json.loads(dumps(payload)) == expected
+
+    def test_nan_and_inf_become_null(self):
+        out = json.loads(dumps({"a": float("nan"), "b": float("inf"), "c": np.float64("nan")}))
+        assert out == {"a": None, "b": None, "c": None}
+
+    def test_numpy_values(self):
+        out = json.loads(
+            dumps(
+                {
+                    "i": np.int64(3),
+                    "f": np.float32(1.5),
+                    "arr": np.array([1.0, np.nan]),
+                    "obj": np.array(["x", None], dtype=object),
+                    "flag": np.bool_(True),
+                }
+            )
+        )
+        assert out == {"i": 3, "f": 1.5, "arr": [1.0, None], "obj": ["x", None], "flag": True}
+
+    def test_decimal_pandas_and_sets(self):
+        out = json.loads(
+            dumps(
+                {
+                    "dec_int": Decimal("12"),
+                    "dec": Decimal("1.25"),
+                    "ts": pd.Timestamp("2025-12-01 10:00:00"),
+                    "tags": {"a"},
+                    "pair": (1, 2),
+                }
+            )
+        )
+        assert out["dec_int"] == 12 and out["dec"] == 1.25
+        assert out["ts"] == "2025-12-01T10:00:00"
+        assert out["tags"] == ["a"] and out["pair"] == [1, 2]
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        payload = _payload()
+        payload["nan"] = float("nan")
+        fast = json.loads(dumps(payload))
+
+        monkeypatch.setattr(fast_json, "ORJSON_AVAILABLE", False)
+        assert json.loads(dumps(payload)) == fast
+
+
+class TestResponse:
+    def test_renders_payload_and_passes_bytes_through(self):
+        assert FastJSONResponse({"a": 1}).body == b'{"a":1}'
+        assert FastJSONResponse(b'{"pre":true}').body == b'{"pre":true}'
+        assert FastJSONResponse({}).media_type == "application/json"
+
+
+class TestEncodedCache:
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        cache = MemoryCache(max_size=10, cleanup_interval=3600)
+        monkeypatch.setattr("memory_cache.cache", cache)
+        yield cache
+        cache.shutdown()
+
+    def test_encodes_once_per_entry(self, cache):
+        calls = []
+
+        def encoder(value):
+            calls.append(value)
+            return dumps(value)
+
+        cache.set("k", {"a": 1})
+        assert cache.get_encoded("k", encoder) == b'{"a":1}'
+        assert cache.get_encoded("k", encoder) == b'{"a":1}'
+        assert len(calls) == 1
+        assert cache.get_stats()["encoded_hits"] == 1
+
+        cache.set("k", {"a": 2})
+        assert cache.get_encoded("k", encoder) == b'{"a":2}'
+        assert len(calls) == 2
+
+    def test_miss_returns_none(self, cache):
+        assert cache.get_encoded("missing", dumps) is None
+        assert cached_json_response("missing") is None
+
+    def test_cache_json_response_roundtrip(self, cache):
+        response = cache_json_response("fleet", {"trucks": [1, 2]}, ttl=30)
+        assert response.body == b'{"trucks":[1,2]}'
+        assert cache.get("fleet") == {"trucks": [1, 2]}
+        assert cached_json_response("fleet").body == response.body
@@ -0,0 +1,163 @@
+"""
+Tests for Fleet Feature Store v5.12.6
+
+Tests cover:
+- One query serves every feature set and every shorter window
+- Vectorized driver features == DriverClusteringEngine.extract_driver_features
+- Anomaly feature lags stay within each truck (TIMESTAMPDIFF(HOUR) semantics)
+- AnomalyDetector fleet training/scoring on a single round-trip
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_engines.anomaly_detector import AnomalyDetector
+from ml_engines.driver_clustering import DriverClusteringEngine
+from ml_engines.feature_store import (
+    ANOMALY_FEATURES,
+    DRIVER_FEATURES,
+    FleetFeatureStore,
+)
+
+
+def _fleet_window(n_trucks=6, rows_per_truck=600, step_minutes=30):
+    rng = np.random.default_rng(5)
+    now = datetime.utcnow()
+    frames = []
+    for t in range(n_trucks):
+        n = rows_per_truck
+        ts = [now - timedelta(minutes=step_minutes * (n - i)) for i in range(n)]
+        speed = np.clip(rng.normal(40 + t * 3, 20, n), 0, 75)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "truck_id": f"T{t:03d}",
+                    "timestamp_utc": ts,
+                    "mpg_current": np.where(rng.random(n) < 0.1, np.nan, rng.normal(6, 0.5, n)),
+                    "estimated_pct": np.clip(80 - np.arange(n) * 0.05 + rng.normal(0, 1, n), 0, 100),
+                    "estimated_gallons": rng.uniform(50, 150, n),
+                    "speed_mph": speed,
+                    "rpm": rng.normal(1400 + t * 50, 300, n),
+                    "consumption_gph": rng.uniform(0.5, 8, n),
+                    "engine_hours": 1000 + t + np.arange(n) * 0.5,
+                    "idle_hours": 200 + np.arange(n) * 0.1 * (t + 1) / n_trucks,
+                    "truck_status": np.where(speed > 5, "MOVING", "idle"),
+                    "odometer_miles": 50000 + np.cumsum(speed * step_minutes / 60),
+                }
+            )
+        )
+    # One truck without odometer / engine hours exercises the fallbacks
+    frames[-1]["odometer_miles"] = np.nan
+    frames[-1]["engine_hours"] = np.nan
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def window():
+    return _fleet_window()
+
+
+@pytest.fixture
+def store(window):
+    calls = []
+
+    def query_fn(sql, params):
+        calls.append(params)
+        return window[window["timestamp_utc"] >= params["since"]].copy()
+
+    s = FleetFeatureStore(query_fn=query_fn)
+    s.calls = calls
+    return s
+
+
+class TestCaching:
+    def test_one_query_for_all_feature_sets(self, store):
+        store.get_window(30)
+        store.anomaly_features(30)
+        store.anomaly_features(1)
+        store.driver_features(7)
+        store.consumption_features(7)
+        store.anomaly_features(30)
+
+        assert len(store.calls) == 1
+        stats = store.get_stats()
+        assert stats["queries"] == 1 and stats["hits"] == 1
+
+    def test_wider_window_or_expiry_refetches(self, store):
+        store.get_window(1)
+        store.get_window(7)
+        assert len(store.calls) == 2
+
+        store.ttl_seconds = 0
+        store.get_window(1)
+        assert len(store.calls) == 3
+
+    def test_shorter_window_is_sliced(self, store, window):
+        store.get_window(30)
+        one_day = store.get_window(1)
+        assert one_day["timestamp_utc"].min() >= window["timestamp_utc"].max() - timedelta(
+            days=1, minutes=1
+        )
+
+
+class TestDriverFeatures:
+    def test_parity_with_engine(self, store, window):
+        fleet = store.driver_features(30)
+        engine = DriverClusteringEngine()
+
+        assert list(fleet.columns) == list(DRIVER_FEATURES)
+        for truck_id, rows in window.groupby("truck_id"):
+            expected = engine.extract_driver_features(rows.reset_index(drop=True))
+            got = fleet.loc[truck_id]
+            for name in DRIVER_FEATURES:
+                assert got[name] == pytest.approx(expected[name], rel=1e-9, nan_ok=True), name
+
+    def test_fit_features_clusters_fleet(self, store):
+        engine = DriverClusteringEngine(n_clusters=3)
+        assert engine.fit_features(store.driver_features(30))
+        assert len(engine.get_all_clusters()) == 6
+
+
+class TestAnomalyFeatures:
+    def test_rows_filtered_and_lags_within_truck(self, store):
+        feats = store.anomaly_features(30)
+
+        assert (feats["mpg_current"] > 0).all()
+        first_rows = feats.groupby("truck_id").head(1)
+        assert (first_rows["fuel_change_rate"] == 0).all()
+        assert (first_rows["fuel_flow_rate"] == 0).all()
+        assert np.isfinite(feats[list(ANOMALY_FEATURES)].to_numpy()).all()
+
+    def test_whole_hour_deltas(self):
+        t0 = datetime.utcnow() - timedelta(hours=5)
+        frame = pd.DataFrame(
+            {
+                "truck_id": "T1",
+                "timestamp_utc": [t0, t0 + timedelta(minutes=30), t0 + timedelta(minutes=150)],
+                "mpg_current": 6.0,
+                "estimated_pct": [80.0, 79.0, 75.0],
+                "estimated_gallons": 100.0,
+            }
+        )
+        store = FleetFeatureStore(query_fn=lambda sql, params: frame.copy())
+        feats = store.anomaly_features(1)
+
+        # 30 min → 0 whole hours → NULL → 0; 120 min → 2 hours
+        assert feats["fuel_change_rate"].tolist() == [0.0, 0.0, -2.0]
+        assert feats["fuel_flow_rate"].tolist() == [0.0, 0.0, 50.0]
+
+
+class TestAnomalyDetectorFleet:
+    def test_detect_fleet_single_round_trip(self, store):
+        detector = AnomalyDetector(db_connection=MagicMock(), feature_store=store)
+        fleet = detector.get_fleet_anomalies(check_period_days=1)
+
+        assert len(store.calls) == 1
+        assert set(detector.models) == {f"T{i:03d}" for i in range(6)}
+        for truck_id, anomalies in fleet.items():
+            assert all(a.truck_id == truck_id for a in anomalies)
+            assert all(isinstance(a.timestamp, datetime) for a in anomalies)
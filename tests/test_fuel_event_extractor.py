@@ -0,0 +1,240 @@
+"""
+Tests for Fuel Event Extractor v5.12.1
+
+Tests cover:
+- FuelColumns construction and LAG semantics at truck boundaries
+- extract_fuel_drops parity with theft_detection_engine._process_local_results
+- extract_refuel_jumps candidates and detect_multiple_refuels parity
+- Fleet-scale throughput, including row → column conversion
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from fuel_event_extractor import FuelColumns, extract_fuel_drops, extract_refuel_jumps
+
+
+def _golden_rows(trucks=8, readings=600, seed=1234):
+    """
+    Synthetic fuel_metrics rows ordered by truck_id, timestamp_utc:
+    (truck_id, ts, est_pct, est_gal, sensor_pct, sensor_gal, status, odometer)
+    with consumption, theft-like drops, refuels, zero levels, long gaps and
+    missing odometers.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for t in range(trucks):
+        truck_id = f"T{t:03d}"
+        ts = datetime(2025, 12, 1)
+        pct = 80.0
+        odo = 100000.0 + t * 1000
+        for _ in range(readings):
+            ts += timedelta(minutes=rng.choice([1, 5, 15, 30, 90, 600]))
+            event = rng.random()
+            if event < 0.03:
+                pct -= rng.uniform(10, 40)  # theft-like drop
+            elif event < 0.06:
+                pct += rng.uniform(20, 60)  # refuel
+            elif event < 0.07:
+                pct = 0.0  # sensor disconnect
+            else:
+                pct -= rng.uniform(0, 1.5)
+            pct = min(max(pct, 0.0), 100.0)
+            status = rng.choice(["MOVING", "STOPPED", "PARKED", "OFFLINE"])
+            if status == "MOVING":
+                odo += rng.uniform(0, 20)
+            odometer = None if rng.random() < 0.05 else Decimal(str(round(odo, 1)))
+            gal = pct * 2.0
+            rows.append(
+                (truck_id, ts, pct, gal, pct, gal, status, odometer)
+            )
+    return rows
+
+
+def _with_lag(rows):
+    """Emulate the old SQL: append LAG(est_pct, est_gal, ts, odometer, status)"""
+    out = []
+    for i, row in enumerate(rows):
+        prev = rows[i - 1] if i > 0 and rows[i - 1][0] == row[0] else None
+        lag = (
+            (prev[2], prev[3], prev[1], prev[7], prev[6])
+            if prev
+            else (None, None, None, None, None)
+        )
+        out.append(tuple(row) + lag)
+    return out
+
+
+class TestFuelColumns:
+    """Tests for the columnar container"""
+
+    def test_prev_valid_masks_truck_boundaries(self):
+        rows = [
+            ("A", datetime(2025, 1, 1, 0, 0), 50, 100),
+            ("A", datetime(2025, 1, 1, 0, 5), 40, 80),
+            ("B", datetime(2025, 1, 1, 0, 0), 30, 60),
+        ]
+        cols = FuelColumns.from_rows(rows)
+        assert cols.prev_valid.tolist() == [False, True, False]
+
+    def test_none_values_become_nan(self):
+        rows = [("A", datetime(2025, 1, 1), None, Decimal("10.5"))]
+        cols = FuelColumns.from_rows(rows)
+        assert np.isnan(cols.level_pct[0])
+        assert cols.level_gal[0] == 10.5
+
+    def test_from_history_handles_aware_timestamps(self):
+        history = [
+            {"timestamp": datetime(2025, 1, 1, tzinfo=timezone.utc), "fuel_pct": 10},
+            {"timestamp": datetime(2025, 1, 1, 1, tzinfo=timezone.utc), "fuel_pct": 90},
+        ]
+        jumps = extract_refuel_jumps(FuelColumns.from_history("A", history))
+        assert jumps["index"].tolist() == [1]
+        assert jumps["gap_hours"][0] == pytest.approx(1.0)
+
+    def test_mixed_column_types(self):
+        plus_two = timezone(timedelta(hours=2))
+        rows = [
+            ("A", datetime(2025, 1, 1, 2, tzinfo=plus_two), "12.5", None),
+            ("A", None, Decimal("40.25"), 80),
+        ]
+        cols = FuelColumns.from_rows(rows)
+        assert cols.timestamps[0] == np.datetime64("2025-01-01T00:00:00", "us")
+        assert np.isnat(cols.timestamps[1])
+        assert cols.level_pct.tolist() == [12.5, 40.25]
+        assert np.isnan(cols.level_gal[0]) and cols.level_gal[1] == 80.0
+
+    def test_empty(self):
+        cols = FuelColumns.from_rows([])
+        assert len(extract_fuel_drops(cols, 10, 15, 6)["index"]) == 0
+        assert len(extract_refuel_jumps(cols)["index"]) == 0
+
+
+class TestDropParity:
+    """Columnar drops must match the row-by-row theft engine exactly"""
+
+    def test_matches_process_local_results(self):
+        from theft_detection_engine import _process_local_results, _process_local_rows
+
+        rows = _golden_rows()
+        expected = _process_local_results(_with_lag(rows), {})
+        actual = _process_local_rows(rows)
+
+        assert len(expected) > 20
+        assert actual == expected
+
+    def test_drop_fields(self):
+        rows = [
+            ("A", datetime(2025, 1, 1, 0, 0), 60.0, 120.0, 60.0, 120.0, "PARKED", 1000),
+            ("A", datetime(2025, 1, 1, 0, 20), 40.0, 80.0, 40.0, 80.0, "PARKED", 1002),
+        ]
+        cols = FuelColumns.from_rows(rows, odometer_idx=7, status_idx=6)
+        drops = extract_fuel_drops(cols, 10, 15, 6)
+
+        assert drops["index"].tolist() == [1]
+        assert drops["drop_pct"][0] == 20.0
+        assert drops["drop_gal"][0] == 40.0
+        assert drops["gap_minutes"][0] == 20.0
+        assert drops["miles_driven"][0] == 2.0
+
+    def test_gap_over_window_rejected(self):
+        rows = [
+            ("A", datetime(2025, 1, 1, 0, 0), 60.0, 120.0),
+            ("A", datetime(2025, 1, 1, 7, 0), 40.0, 80.0),
+        ]
+        drops = extract_fuel_drops(FuelColumns.from_rows(rows), 10, 15, 6)
+        assert len(drops["index"]) == 0
+
+
+class TestRefuelJumps:
+    """Refuel candidate pre-filter"""
+
+    def test_only_increases_returned(self):
+        base = datetime(2025, 12, 17)
+        history = [
+            {"timestamp": base, "fuel_pct": 6.0},
+            {"timestamp": base + timedelta(minutes=30), "fuel_pct": 65.0},
+            {"timestamp": base + timedelta(hours=5), "fuel_pct": 44.0},
+            {"timestamp": base + timedelta(hours=20), "fuel_pct": 100.0},
+            {"timestamp": None, "fuel_pct": 100.0},
+        ]
+        jumps = extract_refuel_jumps(FuelColumns.from_history("PC1280", history))
+
+        assert jumps["index"].tolist() == [1, 3]
+        assert jumps["jump_pct"].tolist() == pytest.approx([59.0, 56.0])
+
+    def test_detect_multiple_refuels_parity(self):
+        from wialon_sync_enhanced import detect_multiple_refuels, detect_refuel
+
+        rows = _golden_rows(trucks=1, readings=400, seed=99)
+        history = [{"timestamp": r[1], "fuel_pct": r[4]} for r in rows]
+
+        expected = []
+        for i in range(1, len(history)):
+            prev, curr = history[i - 1], history[i]
+            event = detect_refuel(
+                sensor_pct=curr["fuel_pct"],
+                estimated_pct=prev["fuel_pct"],
+                last_sensor_pct=prev["fuel_pct"],
+                time_gap_hours=(curr["timestamp"] - prev["timestamp"]).total_seconds()
+                / 3600,
+                truck_status="UNKNOWN",
+                tank_capacity_gal=200,
+                truck_id="T000",
+            )
+            if event:
+                event["timestamp"] = curr["timestamp"]
+                expected.append(event)
+
+        actual = detect_multiple_refuels(history, None, 200, truck_id="T000")
+
+        assert len(expected) > 0
+        assert actual == expected
+
+
+class TestThroughput:
+    """Fleet-scale extraction stays fast"""
+
+    def test_fleet_scale(self):
+        n_trucks, per_truck = 50, 4000
+        rng = np.random.default_rng(0)
+        truck_ids = np.repeat(np.array([f"T{i}" for i in range(n_trucks)], dtype=object), per_truck)
+        start = np.datetime64("2025-10-01T00:00:00", "us")
+        steps = rng.integers(1, 30, size=n_trucks * per_truck) * np.timedelta64(60, "s")
+        timestamps = start + np.cumsum(steps)
+        pct = rng.uniform(0, 100, size=n_trucks * per_truck)
+        cols = FuelColumns(
+            truck_ids=truck_ids,
+            timestamps=timestamps.astype("datetime64[us]"),
+            level_pct=pct,
+            level_gal=pct * 2,
+            odometer=np.cumsum(rng.uniform(0, 1, size=len(pct))),
+            status=np.full(len(pct), "PARKED", dtype=object),
+        )
+
+        started = time.perf_counter()
+        drops = extract_fuel_drops(cols, 10, 15, 6)
+        jumps = extract_refuel_jumps(cols, min_jump_pct=10)
+        elapsed = time.perf_counter() - started
+
+        assert len(drops["index"]) > 0 and len(jumps["index"]) > 0
+        assert elapsed < 2.0
+
+    def test_from_rows_scale(self):
+        start = datetime(2025, 10, 1)
+        rows = [
+            (f"T{i // 5000}", start + timedelta(minutes=i % 5000), 50.0, 100.0)
+            for i in range(200_000)
+        ]
+
+        started = time.perf_counter()
+        cols = FuelColumns.from_rows(rows)
+        elapsed = time.perf_counter() - started
+
+        assert len(cols) == 200_000 and cols.prev_valid.sum() == 200_000 - 40
+        assert elapsed < 2.0
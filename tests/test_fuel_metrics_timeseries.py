@@ -0,0 +1,238 @@
+"""
+Tests for Fuel Metrics Time-Series Store v5.12.2
+
+Tests cover:
+- TruckSeries append / trim / growth
+- Miss → load, hit on covered windows, reload of wider windows
+- Tailing by timestamp_utc high-water mark
+- Byte-bounded LRU eviction and stats
+- aggregate / resample helpers
+- /mpg-history served from the store without opening MySQL
+"""
+
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from fuel_metrics_timeseries import (
+    NUMERIC_COLUMNS,
+    TEXT_COLUMNS,
+    FuelMetricsTimeSeriesStore,
+    TruckSeries,
+    columns_to_records,
+)
+
+
+def _row(truck_id, epoch, mpg=6.0, status="MOVING", speed=55.0):
+    values = {name: None for name in NUMERIC_COLUMNS}
+    values.update(mpg_current=mpg, speed_mph=speed, estimated_pct=50.0)
+    ts = datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
+    return (
+        (truck_id, ts)
+        + tuple(values[n] for n in NUMERIC_COLUMNS)
+        + (status, None, "HIGH")
+    )
+
+
+class FakeDB:
+    """Records queries and serves rows from an in-memory table"""
+
+    def __init__(self):
+        self.rows = []
+        self.queries = []
+
+    def __call__(self, sql, params):
+        self.queries.append(params)
+        since = params["since"].replace(tzinfo=timezone.utc).timestamp()
+        if "truck_id" in params:
+            rows = [
+                r
+                for r in self.rows
+                if r[0] == params["truck_id"]
+                and r[1].replace(tzinfo=timezone.utc).timestamp() >= since
+            ]
+        else:
+            rows = [
+                r
+                for r in self.rows
+                if r[1].replace(tzinfo=timezone.utc).timestamp() > since
+            ]
+        return sorted(rows, key=lambda r: (r[0], r[1]))
+
+
+@pytest.fixture
+def db():
+    fake = FakeDB()
+    now = time.time()
+    for truck in ("T001", "T002"):
+        for i in range(100):
+            fake.rows.append(_row(truck, now - (100 - i) * 600, mpg=5 + i % 3))
+    return fake
+
+
+@pytest.fixture
+def store(db):
+    return FuelMetricsTimeSeriesStore(query_fn=db)
+
+
+class TestTruckSeries:
+    def _arrays(self, epochs):
+        n = len(epochs)
+        return (
+            np.array(epochs, dtype=np.float64),
+            np.ones((len(NUMERIC_COLUMNS), n)),
+            np.zeros((len(TEXT_COLUMNS), n), dtype=np.int16),
+        )
+
+    def test_append_grows_and_skips_old_rows(self):
+        series = TruckSeries("T001")
+        assert series.append(*self._arrays(range(1000))) == 1000
+        assert series.append(*self._arrays([998, 999, 1000, 1001])) == 2
+        assert series.size == 1002
+        assert series.timestamps[: series.size].tolist() == list(range(1002))
+
+    def test_trim_moves_window(self):
+        series = TruckSeries("T001")
+        series.append(*self._arrays(range(10)))
+        series.covered_from = 0
+        series.trim(4)
+        assert series.timestamps[: series.size].tolist() == [4, 5, 6, 7, 8, 9]
+        assert series.covered_from == 4
+
+
+class TestStoreQueries:
+    def test_miss_then_hit(self, store, db):
+        first = store.get_columns("T001", 6, ["mpg_current"])
+        second = store.get_columns("T001", 6, ["mpg_current"])
+
+        assert 35 <= len(first["timestamp_utc"]) <= 36
+        np.testing.assert_array_equal(first["mpg_current"], second["mpg_current"])
+        assert len(db.queries) == 1
+        stats = store.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_wider_window_reloads(self, store, db):
+        store.get_columns("T001", 6)
+        store.get_columns("T001", 72)
+        assert len(db.queries) == 2
+
+    def test_records_decode_text_and_nulls(self, store):
+        records = store.get_records("T001", 1, descending=True)
+        assert records[0]["timestamp_utc"] > records[-1]["timestamp_utc"]
+        assert records[0]["truck_status"] == "MOVING"
+        assert records[0]["idle_method"] is None
+        assert records[0]["confidence_indicator"] == "HIGH"
+        assert records[0]["rpm"] is None
+
+    def test_unknown_column_or_window_not_served(self, store, db):
+        assert store.get_columns("T001", 6, ["latitude"]) is None
+        assert store.get_columns("T001", 500) is None
+        assert db.queries == []
+
+    def test_db_error_returns_none(self):
+        def broken(sql, params):
+            raise RuntimeError("MySQL down")
+
+        store = FuelMetricsTimeSeriesStore(query_fn=broken)
+        assert store.get_records("T001", 24) is None
+        assert store.get_stats()["errors"] == 1
+
+    def test_tail_appends_new_rows(self, store, db):
+        store.get_columns("T001", 6)
+        db.rows.append(_row("T001", time.time() - 1, mpg=9.9))
+        db.rows.append(_row("T003", time.time() - 1))
+        store._last_tail = 0  # force the next read to tail
+
+        cols = store.get_columns("T001", 6, ["mpg_current"])
+
+        assert cols["mpg_current"][-1] == 9.9
+        stats = store.get_stats()
+        assert stats["tail_runs"] == 1
+        assert stats["tail_rows"] == 1  # T003 is not resident
+        assert stats["trucks"] == 1
+
+    def test_eviction_by_bytes(self, db):
+        store = FuelMetricsTimeSeriesStore(query_fn=db, max_bytes=1)
+        store.get_columns("T001", 6)
+        store.get_columns("T002", 6)
+
+        stats = store.get_stats()
+        assert stats["trucks"] == 1
+        assert stats["evictions"] == 1
+        assert store._series.get("T002") is not None
+
+    def test_aggregate(self, store):
+        agg = store.aggregate("T001", 24, "mpg_current")
+        cols = store.get_columns("T001", 24, ["mpg_current"])
+        assert agg["count"] == len(cols["mpg_current"])
+        assert agg["mean"] == pytest.approx(cols["mpg_current"].mean())
+        assert agg["min"] == 5 and agg["max"] == 7
+
+    def test_resample_buckets(self, store):
+        buckets = store.resample("T001", 24, "mpg_current", bucket_seconds=3600)
+        assert buckets["count"].sum() == 100
+        assert (buckets["min"] <= buckets["mean"]).all()
+        assert (buckets["mean"] <= buckets["max"]).all()
+        assert np.all(np.diff(buckets["timestamp_utc"]) > 0)
+
+
+def test_columns_to_records():
+    cols = {
+        "timestamp_utc": np.array([0.0, 60.0]),
+        "mpg_current": np.array([np.nan, 6.5]),
+        "truck_status": np.array(["STOPPED", None], dtype=object),
+    }
+    records = columns_to_records(cols)
+    assert records[0] == {
+        "timestamp_utc": datetime(1970, 1, 1),
+        "mpg_current": None,
+        "truck_status": "STOPPED",
+    }
+    assert records[1]["mpg_current"] == 6.5
+
+
+def test_mpg_history_served_from_store_without_db(store, monkeypatch):
+    import asyncio
+
+    from routers import truck_mpg_history
+
+    def no_db():
+        raise AssertionError("MySQL opened although the store served the truck")
+
+    monkeypatch.setattr(truck_mpg_history, "get_timeseries_store", lambda: store)
+    monkeypatch.setattr(truck_mpg_history, "get_db_connection", no_db)
+    monkeypatch.setattr(truck_mpg_history, "get_expected_mpg", lambda truck_id: 6.0)
+
+    history = asyncio.run(
+        truck_mpg_history.get_truck_mpg_history("T001", hours=24, max_points=None)
+    )
+
+    assert history.total_points == 100
+    assert history.baseline_mpg == 6.0
+    assert history.deviation_pct == pytest.approx(-0.2)  # avg 5.99 vs 6.0
+
+
+def test_mpg_history_bands_are_utc_on_non_utc_host(store, monkeypatch):
+    import asyncio
+
+    from routers import truck_mpg_history
+
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset not available")
+    monkeypatch.setenv("TZ", "America/Chicago")
+    time.tzset()
+    monkeypatch.setattr(truck_mpg_history, "get_timeseries_store", lambda: store)
+    monkeypatch.setattr(truck_mpg_history, "get_expected_mpg", lambda truck_id: None)
+    try:
+        history = asyncio.run(
+            truck_mpg_history.get_truck_mpg_history("T001", hours=24, max_points=20)
+        )
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
+
+    first = min(p.timestamp for p in history.data_points)
+    assert history.bands[0].timestamp == first
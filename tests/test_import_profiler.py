@@ -0,0 +1,121 @@
+"""
+Tests for Import Profiler v5.12.20
+
+Tests cover:
+- First-time imports are timed with importtime-style self/cumulative split
+- Already-imported modules and relative imports resolve correctly
+- install()/uninstall() restore builtins.__import__
+- Milestones and the -X importtime text layout
+"""
+
+import builtins
+import sys
+import textwrap
+
+import pytest
+
+from import_profiler import ImportProfiler
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    name = f"profiled_pkg_{tmp_path.name}"
+    pkg = tmp_path / name
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from . import child\n")
+    (pkg / "child.py").write_text(textwrap.dedent("""
+            import time
+
+            time.sleep(0.02)
+            """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    for module in [m for m in sys.modules if m.startswith(name)]:
+        del sys.modules[module]
+
+
+@pytest.fixture
+def profiler():
+    profiler = ImportProfiler()
+    profiler.install()
+    yield profiler
+    profiler.uninstall()
+
+
+class TestImportProfiler:
+    def test_nested_imports_split_self_and_cumulative(self, profiler, package):
+        __import__(package)
+        profiler.uninstall()
+
+        records = {r.module: r for r in profiler.records()}
+        parent = records[package]
+        child = records[f"{package}.child"]
+
+        assert child.parent == package and child.depth == 1
+        assert child.cumulative_seconds >= 0.02
+        assert parent.cumulative_seconds >= child.cumulative_seconds
+        assert parent.self_seconds == pytest.approx(
+            parent.cumulative_seconds - child.cumulative_seconds, abs=1e-6
+        )
+        # children complete first, as in -X importtime output
+        modules = [r.module for r in profiler.records()]
+        assert modules.index(f"{package}.child") < modules.index(package)
+
+    def test_cached_modules_not_recorded(self, profiler):
+        import json  # noqa: F401
+
+        assert "json" not in {r.module for r in profiler.records()}
+
+    def test_install_uninstall(self):
+        original = builtins.__import__
+        profiler = ImportProfiler()
+
+        profiler.install()
+        assert builtins.__import__ == profiler._import and profiler.installed
+        profiler.uninstall()
+
+        assert builtins.__import__ is original
+        assert not profiler.installed
+
+    def test_report_and_importtime_text(self, profiler, package):
+        profiler.mark("ready")
+        profiler.mark("ready")
+        __import__(package)
+
+        report = profiler.report(limit=1)
+        assert report["slowest"][0]["module"] == package
+        assert report["total_import_seconds"] >= 0.02
+        assert list(report["milestones"]) == ["ready"]
+
+        text = profiler.format_importtime(min_ms=10)
+        assert text.splitlines()[0] == (
+            "import time: self [us] | cumulative | imported package"
+        )
+        assert text.splitlines()[-1].endswith(f" {package}")
+        assert f"   {package}.child" in text
+
+
+class TestHealthEndpoint:
+    def test_health_imports_reports_profile_and_lazy_routers(self, monkeypatch):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        import health_check
+        from lazy_routers import LazyRouters
+
+        profiler = ImportProfiler()
+        profiler.mark("ready")
+        monkeypatch.setattr(health_check, "get_import_profiler", lambda: profiler)
+        app = FastAPI()
+        app.include_router(health_check.router)
+        LazyRouters(app).add("routers.ml", path_prefix="/fuelAnalytics/api/ml")
+        client = TestClient(app)
+
+        report = client.get("/health/imports", params={"limit": 5}).json()
+        assert "ready" in report["milestones"]
+        assert report["lazy_routers"]["pending"] == 1
+        assert report["lazy_routers"]["routers"][0]["module"] == "routers.ml"
+
+        text = client.get("/health/imports", params={"format": "importtime"})
+        assert text.text.startswith("import time: self [us]")
+        assert client.get("/health/imports?format=xml").status_code == 422
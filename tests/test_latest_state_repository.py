@@ -0,0 +1,155 @@
+"""
+Tests for Latest State Repository v5.12.15
+
+Tests cover:
+- fuel_metrics_latest columns match the sync-cycle INSERT
+- Upsert never lets an older row overwrite a newer one
+- Column/alias validation
+- pymysql and SQLAlchemy query building
+- Fallback to the MAX(timestamp_utc) scan when the table is missing
+"""
+
+import re
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pymysql
+import pytest
+from sqlalchemy import create_engine
+
+from src.repositories.latest_state_repository import (
+    LATEST_STATE_COLUMNS,
+    LATEST_STATE_TABLE,
+    UPSERT_LATEST_STATE,
+    ensure_latest_state_table,
+    get_latest_states,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _pymysql_conn(*results):
+    """Mock pymysql connection whose cursor executes return/raise `results` in order"""
+    conn = MagicMock(spec=["cursor", "commit"])
+    cursor = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    outcomes = list(results)
+
+    def execute(sql, params=None):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        cursor.fetchall.return_value = outcome
+
+    cursor.execute.side_effect = execute
+    return conn, cursor
+
+
+class TestSchema:
+    def test_columns_match_sync_insert(self):
+        source = (REPO_ROOT / "wialon_sync_enhanced.py").read_text()
+        match = re.search(r"INSERT INTO fuel_metrics\s*\((.*?)\)\s*VALUES", source, re.S)
+        assert match
+        insert_columns = tuple(c.strip() for c in match.group(1).split(","))
+
+        assert insert_columns == LATEST_STATE_COLUMNS
+
+    def test_upsert_is_guarded_by_timestamp(self):
+        update = UPSERT_LATEST_STATE.split("ON DUPLICATE KEY UPDATE", 1)[1]
+        assignments = [a.strip() for a in update.split(",\n")]
+
+        # timestamp_utc must be assigned last so the IF() guards see the old value
+        assert assignments[-1].startswith(f"{LATEST_STATE_TABLE}.timestamp_utc")
+        assert "GREATEST" in assignments[-1]
+        for assignment in assignments[:-1]:
+            assert "IF(VALUES(timestamp_utc) >=" in assignment
+        assert UPSERT_LATEST_STATE.count("%s") == len(LATEST_STATE_COLUMNS)
+
+    def test_ensure_seeds_empty_table(self):
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = None
+        cursor.rowcount = 12
+
+        assert ensure_latest_state_table(conn, seed_days=3) == 12
+        seed_sql, seed_params = cursor.execute.call_args_list[-1].args
+        assert "MAX(timestamp_utc)" in seed_sql
+        assert seed_params == (3,)
+        conn.commit.assert_called_once()
+
+    def test_ensure_skips_populated_table(self):
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (1,)
+
+        assert ensure_latest_state_table(conn) == 0
+        assert cursor.execute.call_count == 2
+
+
+class TestAccessor:
+    def test_pymysql_query(self):
+        rows = [{"truck_id": "T1", "status": "MOVING"}]
+        conn, cursor = _pymysql_conn(rows)
+
+        result = get_latest_states(
+            conn,
+            columns=["truck_id", "truck_status AS status"],
+            truck_ids=["T1", "T2"],
+            max_age_hours=1.5,
+        )
+
+        assert result == rows
+        sql, params = cursor.execute.call_args.args
+        assert f"FROM {LATEST_STATE_TABLE} t" in sql
+        assert "t.truck_status AS status" in sql
+        assert "t.truck_id IN %(truck_ids)s" in sql
+        assert params == {"truck_ids": ("T1", "T2"), "max_age": 5400}
+
+    def test_falls_back_when_table_missing(self):
+        rows = [{"truck_id": "T1"}]
+        missing = pymysql.err.ProgrammingError(1146, "Table doesn't exist")
+        conn, cursor = _pymysql_conn(missing, rows)
+
+        assert get_latest_states(conn, columns=["truck_id"]) == rows
+        fallback_sql = cursor.execute.call_args.args[0]
+        assert "FROM fuel_metrics t" in fallback_sql
+        assert "MAX(timestamp_utc)" in fallback_sql
+
+    def test_other_errors_propagate(self):
+        conn, _ = _pymysql_conn(pymysql.err.OperationalError(2006, "gone away"))
+
+        with pytest.raises(pymysql.err.OperationalError):
+            get_latest_states(conn)
+
+    def test_empty_truck_list_short_circuits(self):
+        conn, cursor = _pymysql_conn()
+
+        assert get_latest_states(conn, truck_ids=[]) == []
+        cursor.execute.assert_not_called()
+
+    @pytest.mark.parametrize("spec", ["nope", "truck_id; DROP TABLE x", "rpm AS"])
+    def test_rejects_unknown_columns(self, spec):
+        conn, _ = _pymysql_conn()
+
+        with pytest.raises(ValueError):
+            get_latest_states(conn, columns=[spec])
+
+    def test_sqlalchemy_engine(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"CREATE TABLE {LATEST_STATE_TABLE} (truck_id TEXT, mpg_current REAL)"
+            )
+            conn.exec_driver_sql(
+                f"INSERT INTO {LATEST_STATE_TABLE} VALUES ('T2', 6.1), ('T1', 5.5), ('T3', 7.0)"
+            )
+
+        result = get_latest_states(
+            engine, columns=["truck_id", "mpg_current AS mpg"], truck_ids=["T1", "T2"]
+        )
+
+        assert result == [
+            {"truck_id": "T1", "mpg": 5.5},
+            {"truck_id": "T2", "mpg": 6.1},
+        ]
@@ -0,0 +1,147 @@
+"""
+Tests for Lazy Router Loading v5.12.20
+
+Tests cover:
+- Placeholders import nothing until a request under their prefix arrives
+- Real routes are spliced in at the placeholder's position (precedence kept)
+- Setup hooks run once; failed imports fall back to 404
+- Background warm-up loads every pending router and preload module
+"""
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from lazy_routers import LazyRouters
+
+ROUTER_MODULE = """
+from fastapi import APIRouter
+
+SETUP_CALLS = []
+
+router = APIRouter(prefix="/api/heavy")
+
+
+@router.get("/items/{item_id}")
+def item(item_id: int):
+    return {"item": item_id, "source": "lazy"}
+
+
+@router.get("/shadowed")
+def shadowed():
+    return {"source": "lazy"}
+
+
+def setup():
+    SETUP_CALLS.append(1)
+"""
+
+
+@pytest.fixture
+def heavy_module(tmp_path, monkeypatch):
+    name = f"heavy_router_{tmp_path.name}"
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(ROUTER_MODULE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+def _app(module, **kwargs):
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"ok": True}
+
+    lazy = LazyRouters(app)
+    lazy.add(module, path_prefix="/api/heavy", **kwargs)
+
+    @app.get("/api/heavy/shadowed")
+    def shadowed():
+        return {"source": "main"}
+
+    return app, lazy
+
+
+class TestLazyRouter:
+    def test_not_imported_until_first_request(self, heavy_module):
+        app, lazy = _app(heavy_module, setup=f"{heavy_module}:setup")
+        client = TestClient(app)
+
+        assert client.get("/health").json() == {"ok": True}
+        assert heavy_module not in sys.modules
+
+        assert client.get("/api/heavy/items/7").json() == {
+            "item": 7,
+            "source": "lazy",
+        }
+        (status,) = lazy.status()["routers"]
+        assert status["state"] == "loaded"
+        assert status["loaded_by"] == "request"
+        assert status["routes"] == 2
+        assert sys.modules[heavy_module].SETUP_CALLS == [1]
+
+    def test_routes_take_placeholder_position(self, heavy_module):
+        app, _ = _app(heavy_module)
+        client = TestClient(app)
+
+        # Included before main's own /shadowed route, exactly as an eager
+        # include_router() call at that point would have been
+        assert client.get("/api/heavy/shadowed").json() == {"source": "lazy"}
+        paths = [r.path for r in app.router.routes]
+        assert paths.index("/api/heavy/shadowed") < len(paths) - 1
+        assert paths[-1] == "/api/heavy/shadowed"
+
+    def test_unrelated_prefix_not_matched(self, heavy_module):
+        app, lazy = _app(heavy_module)
+        client = TestClient(app)
+
+        assert client.get("/api/heavyweight").status_code == 404
+        assert lazy.pending
+
+    def test_failed_import_falls_back_to_404(self):
+        app = FastAPI()
+        lazy = LazyRouters(app)
+        lazy.add("no_such_router_module", path_prefix="/api/missing")
+        client = TestClient(app)
+
+        assert client.get("/api/missing/x").status_code == 404
+        (status,) = lazy.status()["routers"]
+        assert status["state"] == "failed"
+        assert "no_such_router_module" in status["error"]
+        assert not any(r in app.router.routes for r in lazy.routers)
+
+    def test_concurrent_first_requests_load_once(self, heavy_module):
+        app, lazy = _app(heavy_module, setup=f"{heavy_module}:setup")
+        (placeholder,) = lazy.routers
+
+        async def both():
+            return await asyncio.gather(placeholder.load(), placeholder.load())
+
+        assert asyncio.run(both()) == [True, True]
+        assert sys.modules[heavy_module].SETUP_CALLS == [1]
+        assert placeholder.routes_added == 2
+
+
+class TestWarmUp:
+    def test_loads_pending_and_preloads(self, heavy_module):
+        app, lazy = _app(heavy_module)
+        done = []
+
+        status = asyncio.run(
+            lazy.warm_up(
+                preload=["json", "no_such_preload_module"],
+                on_done=lambda: done.append(True),
+            )
+        )
+
+        assert status["pending"] == 0
+        assert status["routers"][0]["loaded_by"] == "warm-up"
+        assert isinstance(status["preloaded"]["json"], float)
+        assert status["preloaded"]["no_such_preload_module"].startswith("failed")
+        assert done == [True]
+        assert TestClient(app).get("/api/heavy/items/1").status_code == 200
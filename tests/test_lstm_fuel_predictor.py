@@ -0,0 +1,168 @@
+"""
+Tests for LSTM Fuel Predictor v5.12.5 (NumPy runtime)
+
+Tests cover:
+- NumPy LSTM forward pass vs a step-by-step reference (Keras gate order)
+- Stacked fleet batch == one model at a time
+- .npz export round trip
+- predict / predict_batch statuses and runtime stats
+- Module import does not pull in TensorFlow
+"""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from lstm_fuel_predictor import (
+    LSTMFuelPredictor,
+    NumpyLSTMModel,
+    _forward,
+    stack_models,
+)
+
+SEQ = 60
+
+
+def _random_model(seed: int) -> NumpyLSTMModel:
+    """Same architecture as LSTMFuelPredictor.build_model"""
+    rng = np.random.default_rng(seed)
+
+    def w(*shape):
+        return (rng.normal(size=shape) * 0.2).astype(np.float32)
+
+    return NumpyLSTMModel(
+        [
+            {
+                "type": "lstm",
+                "activation": "relu",
+                "recurrent_activation": "sigmoid",
+                "return_sequences": True,
+                "kernel": w(1, 256),
+                "recurrent_kernel": w(64, 256),
+                "bias": w(256),
+            },
+            {
+                "type": "lstm",
+                "activation": "relu",
+                "recurrent_activation": "sigmoid",
+                "return_sequences": False,
+                "kernel": w(64, 128),
+                "recurrent_kernel": w(32, 128),
+                "bias": w(128),
+            },
+            {"type": "dense", "activation": "relu", "kernel": w(32, 16), "bias": w(16)},
+            {"type": "dense", "activation": "linear", "kernel": w(16, 1), "bias": w(1)},
+        ]
+    )
+
+
+def _reference(model: NumpyLSTMModel, seq: np.ndarray) -> float:
+    """Plain per-step, per-sample LSTM (i, f, c, o gates)"""
+    sig = lambda v: 1 / (1 + np.exp(-v))  # noqa: E731
+    relu = lambda v: np.maximum(v, 0)  # noqa: E731
+    x = seq.astype(np.float64)
+    for layer in model.layers:
+        if layer["type"] == "lstm":
+            units = layer["recurrent_kernel"].shape[0]
+            h, c, outs = np.zeros(units), np.zeros(units), []
+            for xt in x:
+                z = xt @ layer["kernel"] + h @ layer["recurrent_kernel"] + layer["bias"]
+                i, f, g, o = np.split(z, 4)
+                c = sig(f) * c + sig(i) * relu(g)
+                h = sig(o) * relu(c)
+                outs.append(h)
+            x = np.array(outs) if layer["return_sequences"] else h
+        else:
+            x = x @ layer["kernel"] + layer["bias"]
+            x = relu(x) if layer["activation"] == "relu" else x
+    return float(x[0])
+
+
+@pytest.fixture
+def predictor(tmp_path):
+    p = LSTMFuelPredictor(model_dir=str(tmp_path))
+    for i in range(5):
+        truck_id = f"T{i:03d}"
+        p.runtime_models[truck_id] = _random_model(i)
+        p.scalers[truck_id] = {"mean": 4.0 + i / 10, "std": 0.8}
+    return p
+
+
+def _history(seed: int, n: int = SEQ):
+    rng = np.random.default_rng(100 + seed)
+    return (4 + rng.normal(0, 0.5, n)).tolist()
+
+
+class TestForward:
+    def test_matches_reference(self):
+        model = _random_model(1)
+        seq = np.random.default_rng(2).normal(size=(SEQ, 1)).astype(np.float32)
+        out = model.predict(seq[None])
+        assert out.shape == (1, 1)
+        assert out[0, 0] == pytest.approx(_reference(model, seq), rel=1e-4, abs=1e-5)
+
+    def test_stacked_equals_individual(self):
+        models = [_random_model(i) for i in range(4)]
+        X = np.random.default_rng(3).normal(size=(4, SEQ, 1)).astype(np.float32)
+
+        batched = _forward(stack_models(models), X)[:, 0]
+        single = [m.predict(X[i : i + 1])[0, 0] for i, m in enumerate(models)]
+        np.testing.assert_allclose(batched, single, rtol=1e-5, atol=1e-6)
+
+    def test_save_load_roundtrip(self, tmp_path):
+        model = _random_model(7)
+        path = tmp_path / "T007_lstm_weights.npz"
+        model.save(path)
+        loaded = NumpyLSTMModel.load(path)
+
+        assert loaded.signature == model.signature
+        X = np.ones((2, SEQ, 1), dtype=np.float32)
+        np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+    def test_unknown_activation_rejected(self):
+        model = _random_model(1)
+        model.layers[-1]["activation"] = "softplus"
+        with pytest.raises(ValueError):
+            model.predict(np.zeros((1, SEQ, 1), dtype=np.float32))
+
+
+class TestPredictor:
+    def test_batch_matches_single_predict(self, predictor):
+        histories = {f"T{i:03d}": _history(i) for i in range(5)}
+        batch = predictor.predict_batch(histories)
+
+        for truck_id, history in histories.items():
+            single = predictor.predict(truck_id, history)
+            assert batch[truck_id]["status"] == "success"
+            assert batch[truck_id]["prediction_gph"] == pytest.approx(
+                single["prediction_gph"], rel=1e-5
+            )
+
+        stats = predictor.get_runtime_stats()
+        assert stats["last_batch_families"] == 1
+        assert stats["runtime_models"] == 5
+
+    def test_statuses(self, predictor):
+        out = predictor.predict_batch(
+            {"T000": _history(0), "T001": _history(1, n=10), "UNKNOWN": _history(2)}
+        )
+        assert out["T000"]["status"] == "success"
+        assert out["T001"] == {"status": "insufficient_history", "required": SEQ, "available": 10}
+        assert out["UNKNOWN"]["status"] in ("no_model", "unavailable")
+
+    def test_loads_exported_weights_from_disk(self, tmp_path):
+        _random_model(3).save(tmp_path / "T900_lstm_weights.npz")
+        (tmp_path / "T900_scaler.json").write_text('{"mean": 5.0, "std": 1.0}')
+
+        p = LSTMFuelPredictor(model_dir=str(tmp_path))
+        result = p.predict("T900", _history(3))
+        assert result["status"] == "success"
+        assert p.scalers["T900"] == {"mean": 5.0, "std": 1.0}
+
+
+def test_import_does_not_load_tensorflow():
+    code = "import sys, lstm_fuel_predictor; print('tensorflow' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert out.stdout.strip() == "False"
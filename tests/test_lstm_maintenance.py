@@ -78,6 +78,23 @@ class TestLSTMMaintenancePredictor:
         # Should have multiple sequences
         assert X.shape[0] > 0
 
+    def test_prepare_sequences_leaves_loaded_scaler_untouched(
+        self, predictor, sample_sensor_data
+    ):
+        """A registry-shared scaler is never refit in place"""
+        from sklearn.preprocessing import StandardScaler
+
+        shared = StandardScaler().fit(np.zeros((2, 5)))
+        predictor.scaler = shared
+
+        predictor.prepare_sequences(sample_sensor_data)
+
+        assert np.all(shared.mean_ == 0)
+        assert predictor.scaler is not shared
+        assert predictor.scaler.mean_[0] == pytest.approx(
+            sample_sensor_data["oil_pressure"].mean()
+        )
+
     def test_predict_truck_insufficient_data(self, predictor):
         """Test prediction with insufficient data"""
         # Only 10 days of data (need 30)
@@ -110,6 +110,21 @@ class TestMemoryCacheDecorator:
         assert result3 == 3
         assert call_count == 2  # Only 2 unique calls
 
+    def test_cache_key_matches_stored_entry(self):
+        """cache_key() gives the key a call is stored under"""
+        from memory_cache import cache, cached
+
+        @cached(ttl_seconds=60, key_prefix="keyed_summary")
+        def keyed(days_back=1):
+            return {"days": days_back}
+
+        result = keyed(days_back=7)
+
+        assert keyed.cache_key(days_back=7) == "keyed_summary::days_back=7"
+        assert cache.get(keyed.cache_key(days_back=7)) is result
+        assert keyed.ttl_seconds == 60
+        keyed.invalidate()
+
 
 class TestMemoryCacheStats:
     """Test cache statistics"""
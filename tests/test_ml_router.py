@@ -23,7 +23,7 @@ def client():
 @pytest.fixture
 def mock_db_connection():
     """Mock database connection"""
-    with patch("routers.ml.pymysql.connect") as mock_connect:
+    with patch("routers.ml._local_connection") as mock_connect:
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
         mock_connect.return_value = mock_conn
@@ -462,7 +462,7 @@ class TestStatusEndpoint:
 class TestErrorHandling:
     """Test error handling scenarios"""
 
-    @patch("routers.ml.pymysql.connect")
+    @patch("routers.ml._local_connection")
     def test_database_connection_error(self, mock_connect, client):
         """Test database connection failure"""
         mock_connect.side_effect = Exception("Database connection failed")
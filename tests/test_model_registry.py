@@ -0,0 +1,140 @@
+"""
+Tests for Model Registry v5.12.7
+
+Tests cover:
+- One shared, memory-mapped object per artifact
+- Single-flight loading under concurrency
+- Atomic hot swap with subscriber callbacks and immutable snapshots
+- Preload / stats / missing files
+"""
+
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+import model_registry
+from model_registry import ModelRegistry
+
+
+def _dump_scaler(path, offset=0.0):
+    scaler = StandardScaler().fit(np.arange(20, dtype=float).reshape(10, 2) + offset)
+    joblib.dump(scaler, path)
+    return scaler
+
+
+def _bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    path = tmp_path / "theft_scaler.pkl"
+    _dump_scaler(path)
+    return path
+
+
+class TestLoading:
+    def test_shared_memory_mapped_object(self, artifact):
+        registry = ModelRegistry()
+        scaler = registry.load(artifact)
+
+        assert registry.load(artifact) is scaler
+        assert registry.get("theft_scaler") is scaler
+        assert isinstance(scaler.mean_, np.memmap)
+        assert scaler.transform([[1.0, 2.0]]).shape == (1, 2)
+
+        entry = registry.entry("theft_scaler")
+        assert entry.mapped_from.parent.name == model_registry.SNAPSHOT_DIRNAME
+        assert entry.mapped_from != artifact
+
+    def test_single_flight(self, artifact, monkeypatch):
+        calls = []
+        real_load = joblib.load
+
+        def slow_load(*args, **kwargs):
+            calls.append(args)
+            time.sleep(0.05)
+            return real_load(*args, **kwargs)
+
+        monkeypatch.setattr(model_registry.joblib, "load", slow_load)
+        registry = ModelRegistry()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.load(artifact)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+    def test_missing_file(self, tmp_path):
+        registry = ModelRegistry()
+        with pytest.raises(FileNotFoundError):
+            registry.load(tmp_path / "nope.pkl")
+        assert registry.get("nope") is None
+
+    def test_without_mmap(self, artifact):
+        scaler = ModelRegistry(mmap_mode=None).load(artifact)
+        assert not isinstance(scaler.mean_, np.memmap)
+
+
+class TestHotSwap:
+    def test_refresh_swaps_and_notifies(self, artifact):
+        registry = ModelRegistry()
+        swapped = []
+        old = registry.load(artifact, on_swap=swapped.append)
+
+        assert registry.refresh() == []
+
+        _dump_scaler(artifact, offset=100.0)
+        _bump_mtime(artifact)
+        assert registry.refresh() == ["theft_scaler"]
+
+        new = registry.get("theft_scaler")
+        assert new is not old and swapped == [new]
+        assert new.mean_[0] == pytest.approx(old.mean_[0] + 100)
+        # The old mapping is still readable after the file was rewritten
+        assert old.mean_[0] == pytest.approx(9.0)
+
+        stats = registry.get_stats()
+        assert stats["hot_swaps"] == 1
+        assert stats["models"]["theft_scaler"]["generation"] == 2
+
+    def test_broken_new_version_keeps_serving_old(self, artifact):
+        registry = ModelRegistry()
+        old = registry.load(artifact)
+
+        artifact.write_bytes(b"not a pickle")
+        _bump_mtime(artifact)
+        assert registry.refresh() == []
+        assert registry.get("theft_scaler") is old
+        assert registry.get_stats()["models"]["theft_scaler"]["error"]
+
+
+class TestPreloadAndStats:
+    def test_preload_background(self, tmp_path, artifact):
+        other = tmp_path / "lstm_scaler.pkl"
+        _dump_scaler(other)
+
+        registry = ModelRegistry()
+        registry.register("theft_scaler", artifact)
+        registry.register("lstm_scaler", other)
+        registry.register("absent", tmp_path / "absent.pkl")
+        registry.preload(background=True).join(timeout=10)
+
+        stats = registry.get_stats()
+        assert stats["loaded"] == 2 and stats["registered"] == 3
+        model = stats["models"]["lstm_scaler"]
+        assert model["loaded"] and model["mmap"] and model["load_ms"] > 0
+        assert model["type"] == "StandardScaler"
+        assert stats["process_rss_mb"] > 0
@@ -0,0 +1,279 @@
+"""
+Tests for MPG Baseline Store v5.7.7
+
+Tests cover:
+- Daily histograms vs exact percentiles / IQR filtering of the batch path
+- StreamingMPGBaseline window (readings age out after WINDOW_DAYS)
+- MPGBaselineStore updates, backfill, persistence, reload and adopting
+  trucks rebuilt by another process
+- MPGBaselineService integration (analyze_deviation / get_fleet_summary)
+"""
+
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from mpg_baseline_service import (
+    MPGBaselineService,
+    calculate_percentile,
+    filter_outliers_iqr,
+)
+from mpg_baseline_store import BIN_WIDTH, MPGBaselineStore, StreamingMPGBaseline
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MPGBaselineStore(store_file=str(tmp_path / "sketches.json"))
+
+
+def _readings(n=500, mean=6.0, sd=0.4, seed=42, days_ago=10):
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(days=days_ago)
+    return [(rng.gauss(mean, sd), start + timedelta(minutes=15 * i)) for i in range(n)]
+
+
+class TestStreamingMPGBaseline:
+    """Tests for per-truck windowed state"""
+
+    def test_matches_batch_statistics(self):
+        state = StreamingMPGBaseline("T001")
+        readings = _readings()
+        for mpg, ts in readings:
+            state.add(mpg, ts.timestamp())
+
+        filtered = filter_outliers_iqr([mpg for mpg, _ in readings])
+        baseline = state.to_baseline()
+
+        assert baseline.sample_count == pytest.approx(len(filtered), abs=3)
+        assert baseline.baseline_mpg == pytest.approx(
+            statistics.mean(filtered), abs=0.02
+        )
+        assert baseline.std_dev == pytest.approx(statistics.stdev(filtered), abs=0.02)
+        for attr, p in (("percentile_25", 25), ("percentile_75", 75)):
+            assert getattr(baseline, attr) == pytest.approx(
+                calculate_percentile(filtered, p), abs=BIN_WIDTH
+            )
+
+    def test_outlier_excluded_from_baseline(self):
+        state = StreamingMPGBaseline("T001")
+        for mpg, ts in _readings(n=50):
+            state.add(mpg, ts.timestamp())
+
+        assert state.add(11.9, time.time()) is True
+        assert state.raw_count() == 51
+        baseline = state.to_baseline()
+        assert baseline.sample_count <= 50
+        assert baseline.max_mpg < 11.9
+
+    def test_insufficient_samples(self):
+        state = StreamingMPGBaseline("T001")
+        for mpg, ts in _readings(n=5):
+            state.add(mpg, ts.timestamp())
+        assert state.to_baseline().confidence == "INSUFFICIENT"
+
+    def test_readings_age_out_of_window(self):
+        state = StreamingMPGBaseline("T001", window_days=30)
+        for mpg, ts in _readings(n=200, mean=5.0, days_ago=60):
+            state.add(mpg, ts.timestamp(), now=ts.timestamp())
+        for mpg, ts in _readings(n=200, mean=7.0, days_ago=5):
+            state.add(mpg, ts.timestamp())
+
+        baseline = state.to_baseline()
+        assert baseline.sample_count == pytest.approx(200, abs=5)
+        assert baseline.baseline_mpg == pytest.approx(7.0, abs=0.1)
+        assert baseline.days_analyzed <= 30
+        # old days are dropped, not just skipped
+        assert len(state.days) <= 31
+        assert state.add(6.0, time.time() - 40 * 86400) is False
+
+    def test_whole_window_expires(self):
+        state = StreamingMPGBaseline("T001", window_days=30)
+        for mpg, ts in _readings(n=100):
+            state.add(mpg, ts.timestamp())
+
+        later = time.time() + 45 * 86400
+        assert state.raw_count(later) == 0
+        assert state.to_baseline(later).confidence == "INSUFFICIENT"
+
+    def test_roundtrip(self):
+        state = StreamingMPGBaseline("T001")
+        for mpg, ts in _readings(n=100):
+            state.add(mpg, ts.timestamp())
+        state.rebuilt_at = 123.0
+
+        restored = StreamingMPGBaseline.from_list("T001", state.to_list())
+        assert restored.rebuilt_at == 123.0
+        assert restored.to_baseline().baseline_mpg == pytest.approx(
+            state.to_baseline().baseline_mpg
+        )
+
+
+class TestMPGBaselineStore:
+    """Tests for the fleet store"""
+
+    def test_update_filters_invalid_and_idle(self, store):
+        assert store.update("T001", None) is False
+        assert store.update("T001", 2.0) is False
+        assert store.update("T001", 15.0) is False
+        assert store.update("T001", 6.0, speed_mph=3.0) is False
+        assert store.update("T001", 6.0, speed_mph=55.0) is True
+
+    def test_get_baseline_unknown_truck(self, store):
+        assert store.get_baseline("NOPE") is None
+        assert store.has_baseline("NOPE") is False
+
+    def test_update_and_read(self, store):
+        for mpg, ts in _readings(n=200):
+            store.update("T001", mpg, timestamp=ts, speed_mph=60)
+
+        baseline = store.get_baseline("T001")
+        assert baseline.sample_count > 150
+        assert 5.8 < baseline.baseline_mpg < 6.2
+        assert store.has_baseline("T001")
+
+    def test_read_is_cached_until_update(self, store):
+        for mpg, ts in _readings(n=50):
+            store.update("T001", mpg, timestamp=ts)
+
+        first = store.get_baseline("T001")
+        assert store.get_baseline("T001") is first
+
+        store.update("T001", 6.0, timestamp=datetime(2026, 1, 1))
+        assert store.get_baseline("T001") is not first
+
+    def test_fleet_summary_shape(self, store):
+        for truck_id, mean in (("T001", 5.5), ("T002", 6.5)):
+            for mpg, ts in _readings(n=100, mean=mean):
+                store.update(truck_id, mpg, timestamp=ts)
+
+        summary = store.get_fleet_summary()
+        assert summary["total_trucks"] == 2
+        assert summary["avg_baseline_mpg"] == pytest.approx(6.0, abs=0.1)
+        assert [b["truck_id"] for b in summary["baselines"]] == ["T001", "T002"]
+        assert store.get_fleet_summary() is summary
+
+    def test_backfill_rows_replaces_state(self, store):
+        store.update("T001", 9.0)
+        rows = [("T001", mpg, ts) for mpg, ts in _readings(n=100)]
+        rows += [("T002", mpg, ts) for mpg, ts in _readings(n=100, mean=5.0)]
+
+        assert store.backfill_rows(rows) == 2
+        assert store.get_baseline("T001").baseline_mpg == pytest.approx(6.0, abs=0.1)
+        assert store.get_baseline("T002").baseline_mpg == pytest.approx(5.0, abs=0.1)
+
+    def test_backfill_from_connection_single_query(self, store):
+        rows = [("T001", mpg, ts) for mpg, ts in _readings(n=50)]
+        cursor = MagicMock()
+        cursor.fetchall.return_value = rows
+        connection = MagicMock()
+        connection.cursor.return_value.__enter__.return_value = cursor
+
+        assert store.backfill_from_connection(connection, truck_ids=["T001"]) == 1
+        cursor.execute.assert_called_once()
+        sql, params = cursor.execute.call_args[0]
+        assert "truck_id IN (%s)" in sql
+        assert params[-1] == "T001"
+        assert store.backfill_from_connection(connection, truck_ids=[]) == 0
+
+    def test_missing_trucks(self, store):
+        for mpg, ts in _readings(n=50):
+            store.update("T001", mpg, timestamp=ts)
+        assert store.missing_trucks(["T001", "T002"]) == ["T002"]
+
+    def test_save_and_load_roundtrip(self, store, tmp_path):
+        for mpg, ts in _readings(n=120):
+            store.update("T001", mpg, timestamp=ts)
+        store.flush()
+
+        restored = MPGBaselineStore(store_file=str(tmp_path / "sketches.json"))
+        original = store.get_baseline("T001")
+        loaded = restored.get_baseline("T001")
+
+        assert loaded.sample_count == original.sample_count
+        assert loaded.baseline_mpg == pytest.approx(original.baseline_mpg)
+        assert loaded.percentile_75 == pytest.approx(original.percentile_75, abs=1e-3)
+
+    def test_reader_picks_up_newer_file(self, tmp_path):
+        path = str(tmp_path / "sketches.json")
+        writer = MPGBaselineStore(store_file=path)
+        reader = MPGBaselineStore(store_file=path)
+        reader.RELOAD_CHECK_SECONDS = 0
+
+        for mpg, ts in _readings(n=50):
+            writer.update("T001", mpg, timestamp=ts)
+        writer.flush()
+
+        assert reader.get_baseline("T001") is not None
+
+    def test_rebuilt_trucks_adopted_by_sync_save(self, tmp_path):
+        path = str(tmp_path / "sketches.json")
+        sync = MPGBaselineStore(store_file=path)
+        for mpg, ts in _readings(n=50, mean=5.0):
+            sync.update("T001", mpg, timestamp=ts)
+            sync.update("T002", mpg, timestamp=ts)
+        sync.flush()
+
+        # API worker: POST /calculate rebuilds T001 and saves the file
+        api = MPGBaselineStore(store_file=path)
+        api.backfill_rows([("T001", mpg, ts) for mpg, ts in _readings(n=50)])
+        time.sleep(0.01)
+        api.save_to_file()
+
+        # The sync process' next save keeps the rebuild instead of clobbering it
+        sync.update("T002", 5.0)
+        sync.save_to_file()
+
+        reloaded = MPGBaselineStore(store_file=path)
+        assert reloaded.get_baseline("T001").baseline_mpg == pytest.approx(6.0, abs=0.1)
+        assert reloaded.get_baseline("T002").baseline_mpg == pytest.approx(5.0, abs=0.1)
+
+    def test_old_format_file_is_rebuilt(self, tmp_path):
+        path = tmp_path / "sketches.json"
+        path.write_text(json.dumps({"version": 1, "trucks": {"T001": [1, 1]}}))
+
+        store = MPGBaselineStore(store_file=str(path))
+        assert store.get_stats()["trucks"] == 0
+        assert store.missing_trucks(["T001"]) == ["T001"]
+
+    def test_corrupt_file_starts_fresh(self, tmp_path):
+        path = tmp_path / "sketches.json"
+        path.write_text("{not json")
+        assert MPGBaselineStore(store_file=str(path)).get_stats()["trucks"] == 0
+
+
+class TestServiceIntegration:
+    """MPGBaselineService reads from the store when provided"""
+
+    def test_analyze_deviation_uses_store(self, store):
+        for mpg, ts in _readings(n=200, mean=6.5, sd=0.3):
+            store.update("T001", mpg, timestamp=ts)
+
+        service = MPGBaselineService(baseline_store=store)
+        analysis = service.analyze_deviation("T001", current_mpg=6.5)
+
+        assert analysis.baseline_mpg == pytest.approx(6.5, abs=0.1)
+        assert analysis.status == "NORMAL"
+
+    def test_fleet_summary_falls_back_to_store(self, store):
+        for mpg, ts in _readings(n=100):
+            store.update("T001", mpg, timestamp=ts)
+
+        service = MPGBaselineService(baseline_store=store)
+        assert service.get_fleet_summary()["total_trucks"] == 1
+
+    def test_without_store_behaviour_unchanged(self):
+        service = MPGBaselineService()
+        assert service.analyze_deviation("T001", 5.7).baseline_mpg == 5.7
+        assert service.get_fleet_summary()["total_trucks"] == 0
+
+    def test_calculate_from_readings_seeds_store(self, store):
+        rows = [(mpg, ts) for mpg, ts in _readings(n=100)]
+        service = MPGBaselineService(baseline_store=store)
+        service._calculate_from_readings("T001", rows, days=30)
+
+        assert store.has_baseline("T001")
@@ -0,0 +1,370 @@
+"""
+Tests for Notification Outbox v5.12.24
+
+Tests cover:
+- Rows persisted in SQLite and still pending after a restart, payload types kept
+- Dedupe windows per kind against delivered rows; pending rows coalesce
+- Retries with exponential backoff, dead rows after max attempts
+- Alert senders returning False retried unless rate-limited / unconfigured
+- FleetBooster pushes retried on a failed POST, not on rate-limit / invalid skips
+- Refuels delivered as one digest; per-channel concurrency limits
+- Expired leases recovered; the threaded dispatcher delivering on enqueue
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+import notification_outbox
+from notification_outbox import (
+    ChannelSpec,
+    NotificationDispatcher,
+    NotificationOutbox,
+    format_refuel_digest,
+    retry_delay,
+)
+
+
+@dataclass
+class Reading:
+    value: Decimal
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def outbox(tmp_path, clock):
+    box = NotificationOutbox(str(tmp_path / "outbox.db"), clock=clock)
+    yield box
+    box.close()
+
+
+def _refuel(gallons=50.0):
+    return {
+        "gallons_added": gallons,
+        "fuel_before": 20.0,
+        "fuel_after": 80.0,
+        "timestamp_utc": "2026-01-05T14:30:00+00:00",
+    }
+
+
+class TestOutbox:
+    def test_rows_survive_restart(self, tmp_path, clock):
+        path = str(tmp_path / "outbox.db")
+        box = NotificationOutbox(path, clock=clock)
+        box.enqueue("voltage", "T1", {"voltage": 11.2, "priority_level": "CRITICAL"})
+        box.close()
+
+        reopened = NotificationOutbox(path, clock=clock)
+        [record] = reopened.claim("alerts", 10)
+
+        assert record.kind == "voltage" and record.truck_id == "T1"
+        assert record.payload == {"voltage": 11.2, "priority_level": "CRITICAL"}
+        reopened.close()
+
+    def test_payload_types_survive(self, outbox):
+        when = datetime(2026, 1, 5, 14, 30, tzinfo=timezone.utc)
+        payload = {"dtc_info": {"detected_at": when, "reading": Reading(Decimal("1.5"))}}
+        outbox.enqueue("dtc", "T1", payload)
+
+        [record] = outbox.claim("alerts", 10)
+
+        assert record.payload == payload
+        assert record.payload["dtc_info"]["detected_at"] is not when
+        assert isinstance(record.payload["dtc_info"]["detected_at"], datetime)
+
+    def test_dedupe_window(self, outbox, clock):
+        assert outbox.enqueue("refuel", "T1", _refuel()) == "queued"
+        assert outbox.enqueue("refuel", "T2", _refuel()) == "queued"
+        outbox.mark_sent(outbox.claim("refuel", 10))
+
+        assert outbox.enqueue("refuel", "T1", _refuel()) == "duplicate"
+        # kinds without a window are never deduplicated
+        for _ in range(2):
+            assert outbox.enqueue("voltage", "T1", {"voltage": 11.0}) == "queued"
+
+        clock.now += 1801
+        assert outbox.enqueue("refuel", "T1", _refuel()) == "queued"
+        stats = outbox.get_stats()
+        assert (stats["enqueued"], stats["duplicates"]) == (5, 1)
+
+    def test_pending_row_takes_newer_payload(self, outbox):
+        outbox.enqueue("refuel", "T1", _refuel(40.0))
+        assert outbox.enqueue("refuel", "T1", _refuel(55.0)) == "coalesced"
+
+        [record] = outbox.claim("refuel", 10)
+        assert record.payload["gallons_added"] == 55.0
+
+    def test_dead_row_does_not_block(self, outbox):
+        outbox.max_attempts = 1
+        outbox.enqueue("refuel", "T1", _refuel())
+        outbox.mark_failed(outbox.claim("refuel", 10), "smtp down")
+
+        assert outbox.enqueue("refuel", "T1", _refuel()) == "queued"
+
+    def test_fuel_levels_coalesce_while_pending(self, outbox, clock):
+        outbox.enqueue("fb_fuel", "T1", {"fuel_pct": 50.0})
+        assert outbox.enqueue("fb_fuel", "T1", {"fuel_pct": 49.5}) == "coalesced"
+
+        [record] = outbox.claim("fleetbooster", 10)
+        assert record.payload == {"fuel_pct": 49.5}
+
+        # already being sent: the next level within the window is dropped
+        assert outbox.enqueue("fb_fuel", "T1", {"fuel_pct": 49.0}) == "duplicate"
+        outbox.mark_sent([record])
+        clock.now += 61
+        assert outbox.enqueue("fb_fuel", "T1", {"fuel_pct": 48.0}) == "queued"
+
+    def test_unknown_kind(self, outbox):
+        with pytest.raises(ValueError):
+            outbox.enqueue("carrier_pigeon", "T1", {})
+
+    def test_backoff_and_dead_rows(self, outbox, clock):
+        outbox.max_attempts = 3
+        outbox.enqueue("voltage", "T1", {"voltage": 11.0})
+
+        for attempt in (1, 2):
+            [record] = outbox.claim("alerts", 10)
+            assert outbox.mark_failed([record], "timeout") == 0
+            assert outbox.claim("alerts", 10) == []  # backing off
+            clock.now += retry_delay(attempt)
+
+        [record] = outbox.claim("alerts", 10)
+        assert record.attempts == 2
+        assert outbox.mark_failed([record], "timeout") == 1
+
+        clock.now += 10_000
+        assert outbox.claim("alerts", 10) == []
+        assert outbox.counts() == {"alerts": {"dead": 1}}
+        assert retry_delay(2) == 2 * retry_delay(1)
+        assert retry_delay(50) == notification_outbox.NOTIFICATION_RETRY_MAX_SECONDS
+
+    def test_expired_leases_recovered_and_purge(self, outbox, clock):
+        outbox.enqueue("voltage", "T1", {"voltage": 11.0})
+        outbox.claim("alerts", 10)  # dispatcher dies holding the lease
+
+        assert outbox.recover_expired_leases() == 0
+        clock.now += notification_outbox.LEASE_SECONDS + 1
+        assert outbox.recover_expired_leases() == 1
+
+        [record] = outbox.claim("alerts", 10)
+        outbox.mark_sent([record])
+        clock.now += 49 * 3600
+        assert outbox.purge() == 1
+        assert outbox.counts() == {}
+
+
+class TestDispatcher:
+    def test_refuels_go_out_as_one_digest(self, outbox):
+        deliveries = []
+        dispatcher = NotificationDispatcher(
+            outbox,
+            channels={"refuel": ChannelSpec(deliveries.append, batch_size=50)},
+        )
+        for truck_id in ("T1", "T2", "T3"):
+            outbox.enqueue("refuel", truck_id, _refuel())
+
+        assert asyncio.run(dispatcher.drain()) == 1
+
+        [batch] = deliveries
+        assert [r.truck_id for r in batch] == ["T1", "T2", "T3"]
+        assert outbox.get_stats()["sent"] == 3
+
+        subject, message = format_refuel_digest(batch)
+        assert subject == "⛽ 3 Refuels Detected: +150.0 gal"
+        assert message.count("Truck: ") == 3
+        assert "2026-01-05 14:30 UTC" in message
+
+    def test_single_refuel_message_unchanged(self, outbox):
+        outbox.enqueue("refuel", "T1", _refuel())
+        [record] = outbox.claim("refuel", 10)
+
+        subject, message = format_refuel_digest([record])
+
+        assert subject == "⛽ Refuel Detected: T1 +50.0 gal"
+        assert message.startswith("⛽ REFUEL DETECTED\nTruck: T1\nAdded: +50.0 gal")
+
+    def test_failed_delivery_is_retried(self, outbox, clock):
+        calls = []
+
+        def flaky(records):
+            calls.append(len(records))
+            if len(calls) == 1:
+                raise ConnectionError("smtp down")
+
+        dispatcher = NotificationDispatcher(
+            outbox, channels={"alerts": ChannelSpec(flaky)}
+        )
+        outbox.enqueue("voltage", "T1", {"voltage": 11.0})
+
+        assert asyncio.run(dispatcher.drain()) == 0
+        assert outbox.get_stats()["last_error"] == "ConnectionError: smtp down"
+        clock.now += retry_delay(1)
+        assert asyncio.run(dispatcher.drain()) == 1
+        assert calls == [1, 1]
+        assert outbox.counts() == {"alerts": {"sent": 1}}
+
+    def test_channel_concurrency_limit(self, tmp_path):
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def slow(records):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+
+        dispatcher = NotificationDispatcher(
+            outbox,
+            channels={"fleetbooster": ChannelSpec(slow, concurrency=3)},
+            poll_seconds=0.05,
+        )
+        for i in range(9):
+            outbox.enqueue("fb_dtc", f"T{i}", {"dtc_code": "100.1"})
+
+        dispatcher.start()
+        try:
+            deadline = time.time() + 5
+            while outbox.get_stats()["sent"] < 9 and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            dispatcher.stop()
+
+        assert active["max"] == 3
+        assert outbox.get_stats()["sent"] == 9
+        outbox.close()
+
+    def test_enqueue_wakes_running_dispatcher(self, tmp_path):
+        outbox = NotificationOutbox(str(tmp_path / "outbox.db"))
+        delivered = threading.Event()
+        dispatcher = NotificationDispatcher(
+            outbox,
+            channels={"alerts": ChannelSpec(lambda records: delivered.set())},
+            poll_seconds=30,
+        )
+        dispatcher.start()
+        try:
+            outbox.enqueue("dtc", "T1", {"dtc_info": {"dtc_code": "100.1"}})
+            assert delivered.wait(2)
+        finally:
+            dispatcher.stop()
+
+        assert not dispatcher.get_stats()["running"]
+        outbox.close()
+
+
+class TestAlertDelivery:
+    """_deliver_alerts turns a False from alert_service into a retry"""
+
+    @pytest.fixture
+    def alerts(self, monkeypatch):
+        import alert_service
+
+        class Manager:
+            outcome = "failed"
+
+            def last_send_outcome(self):
+                return self.outcome
+
+        manager = Manager()
+        monkeypatch.setattr(alert_service, "get_alert_manager", lambda: manager)
+        monkeypatch.setattr(
+            alert_service, "send_voltage_alert", lambda **kw: manager.outcome == "sent"
+        )
+        return manager
+
+    def _record(self, outbox):
+        outbox.enqueue("voltage", "T1", {"voltage": 11.0, "priority_level": "CRITICAL"})
+        return outbox.claim("alerts", 10)
+
+    def test_failed_send_raises(self, outbox, alerts):
+        with pytest.raises(RuntimeError, match="not delivered"):
+            notification_outbox._deliver_alerts(self._record(outbox))
+
+    @pytest.mark.parametrize("outcome", ["sent", "rate_limited", "not_configured"])
+    def test_delivered_or_skipped(self, outbox, alerts, outcome):
+        alerts.outcome = outcome
+        notification_outbox._deliver_alerts(self._record(outbox))
+
+    def test_failed_send_is_retried_by_dispatcher(self, outbox, alerts, clock):
+        dispatcher = NotificationDispatcher(
+            outbox, channels={"alerts": notification_outbox.CHANNELS["alerts"]}
+        )
+        outbox.enqueue("voltage", "T1", {"voltage": 11.0, "priority_level": "CRITICAL"})
+
+        assert asyncio.run(dispatcher.drain()) == 0
+        assert outbox.counts() == {"alerts": {"pending": 1}}
+
+        alerts.outcome = "sent"
+        clock.now += retry_delay(1)
+        assert asyncio.run(dispatcher.drain()) == 1
+        assert outbox.counts() == {"alerts": {"sent": 1}}
+
+
+def test_enqueue_notification_never_raises(monkeypatch):
+    def broken():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(notification_outbox, "get_notification_outbox", broken)
+
+    assert notification_outbox.enqueue_notification("dtc", "T1", {}) is False
+
+
+class TestFleetBoosterDelivery:
+    """_deliver_fleetbooster retries failed POSTs, not rate-limit / duplicate skips"""
+
+    @pytest.fixture
+    def fb(self, monkeypatch):
+        fb = pytest.importorskip("fleetbooster_integration")
+        monkeypatch.setattr(fb, "_last_fuel_update", {})
+        monkeypatch.setattr(fb, "_last_dtc_alert", {})
+        fb.status_code = 500
+        monkeypatch.setattr(
+            fb.requests,
+            "post",
+            lambda *a, **kw: SimpleNamespace(status_code=fb.status_code, text=""),
+        )
+        return fb
+
+    def _fuel(self, outbox, pct=50.0):
+        outbox.enqueue("fb_fuel", "T1", {"fuel_pct": pct, "fuel_gallons": 100.0})
+        return outbox.claim("fleetbooster", 10)
+
+    def test_http_error_raises(self, outbox, fb):
+        with pytest.raises(RuntimeError, match="not delivered"):
+            notification_outbox._deliver_fleetbooster(self._fuel(outbox))
+        assert fb.last_send_outcome() == "failed"
+
+    def test_sent_then_rate_limited(self, outbox, fb):
+        records = self._fuel(outbox)
+        fb.status_code = 200
+        notification_outbox._deliver_fleetbooster(records)
+        assert fb.last_send_outcome() == "sent"
+
+        fb.status_code = 500  # not reached: inside the 60s window
+        notification_outbox._deliver_fleetbooster(records)
+        assert fb.last_send_outcome() == "rate_limited"
+
+    def test_invalid_fuel_is_skipped(self, outbox, fb):
+        notification_outbox._deliver_fleetbooster(self._fuel(outbox, pct=140.0))
+        assert fb.last_send_outcome() == "invalid"
@@ -136,6 +136,171 @@ class TestMetricsRegistry:
         assert "test_concurrent 10000" in output
 
 
+class TestLabeledMetrics:
+    """🆕 v5.12.19: label sets, sharded writes, bisect buckets, quantiles"""
+
+    def test_counter_labels_are_separate_series(self):
+        metrics = MetricsRegistry(prefix="test")
+        metrics.counter("requests_total", "Requests")
+
+        metrics.inc("requests_total", labels={"status": "ok", "route": "/a"})
+        metrics.inc("requests_total", labels={"route": "/a", "status": "ok"})
+        metrics.inc("requests_total", 3, labels={"status": "error", "route": "/a"})
+
+        output = metrics.get_prometheus_format()
+        assert 'test_requests_total{route="/a",status="ok"} 2.0' in output
+        assert 'test_requests_total{route="/a",status="error"} 3' in output
+
+        series = metrics.get_json_format()["test_requests_total"]["series"]
+        assert {"labels": {"route": "/a", "status": "ok"}, "value": 2.0} in series
+
+    def test_label_values_escaped(self):
+        metrics = MetricsRegistry(prefix="test")
+        metrics.counter("c", "C")
+
+        metrics.inc("c", labels={"path": 'a"b\\c'})
+
+        assert 'test_c{path="a\\"b\\\\c"} 1.0' in metrics.get_prometheus_format()
+
+    def test_labeled_histogram_buckets(self):
+        metrics = MetricsRegistry(prefix="test")
+        metrics.histogram("stage_seconds", "Stages", buckets=[0.1, 0.5, 1.0])
+
+        for value in (0.1, 0.3, 2.0):
+            metrics.observe("stage_seconds", value, labels={"stage": "fetch"})
+        metrics.observe("stage_seconds", 0.05, labels={"stage": "save"})
+
+        output = metrics.get_prometheus_format()
+        # le is inclusive: 0.1 lands in the 0.1 bucket
+        assert 'test_stage_seconds_bucket{stage="fetch",le="0.1"} 1' in output
+        assert 'test_stage_seconds_bucket{stage="fetch",le="1.0"} 2' in output
+        assert 'test_stage_seconds_bucket{stage="fetch",le="+Inf"} 3' in output
+        assert 'test_stage_seconds_count{stage="save"} 1' in output
+
+    def test_quantiles(self):
+        metrics = MetricsRegistry(prefix="test")
+        metrics.histogram("latency", "Latency", buckets=[0.1, 0.2, 0.4, 0.8])
+
+        for _ in range(90):
+            metrics.observe("latency", 0.05, labels={"route": "/x"})
+        for _ in range(10):
+            metrics.observe("latency", 0.3, labels={"route": "/x"})
+
+        assert metrics.quantile("latency", 0.5, {"route": "/x"}) < 0.1
+        assert 0.2 < metrics.quantile("latency", 0.95, {"route": "/x"}) <= 0.4
+        assert metrics.quantile("latency", 0.5, {"route": "/missing"}) is None
+
+        (row,) = metrics.summary("latency")
+        assert row["labels"] == {"route": "/x"}
+        assert row["count"] == 100
+        assert row["p50"] <= row["p95"] <= row["p99"] <= 0.4
+
+    def test_thread_shards_survive_thread_exit(self):
+        metrics = MetricsRegistry(prefix="test")
+        metrics.counter("jobs", "Jobs")
+        metrics.histogram("job_seconds", "Job time", buckets=[1.0])
+
+        def work():
+            for _ in range(500):
+                metrics.inc("jobs", labels={"kind": "a"})
+                metrics.observe("job_seconds", 0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        output = metrics.get_prometheus_format()
+        assert 'test_jobs{kind="a"} 4000' in output
+        assert "test_job_seconds_count 4000" in output
+        # Finished threads were folded into the retired shard
+        assert metrics._shards == []
+        assert 'test_jobs{kind="a"} 4000' in metrics.get_prometheus_format()
+
+    def test_series_cardinality_bounded(self, monkeypatch):
+        import observability
+
+        monkeypatch.setattr(observability, "MAX_SERIES_PER_METRIC", 2)
+        metrics = MetricsRegistry(prefix="test")
+        metrics.counter("hits", "Hits")
+
+        for i in range(5):
+            metrics.inc("hits", labels={"truck": f"T{i}"})
+
+        output = metrics.get_prometheus_format()
+        assert 'test_hits{overflow="true"} 3.0' in output
+
+    def test_names_filter(self):
+        metrics = MetricsRegistry(prefix="test")
+        metrics.counter("a", "A")
+        metrics.counter("b", "B")
+
+        output = metrics.get_prometheus_format(names=["b"])
+        assert "test_b" in output and "test_a" not in output
+
+    def test_stage_timer(self):
+        metrics = MetricsRegistry(prefix="test")
+        metrics.histogram("sync_stage_seconds", "Stages")
+        laps = metrics.stage_timer("sync_stage_seconds", process="sync")
+
+        time.sleep(0.01)
+        assert laps.lap("fetch") >= 0.01
+        laps.restart()
+        laps.lap("save")
+        laps.lap("save")
+
+        assert set(laps.totals) == {"fetch", "save"}
+        output = metrics.get_prometheus_format()
+        assert 'test_sync_stage_seconds_count{process="sync",stage="save"} 2' in output
+
+    def test_time_context_manager(self):
+        metrics = MetricsRegistry(prefix="test")
+        metrics.histogram("block_seconds", "Block")
+
+        with pytest.raises(ValueError):
+            with metrics.time("block_seconds", {"block": "x"}):
+                raise ValueError()
+
+        assert metrics.summary("block_seconds")[0]["count"] == 1
+
+
+class TestRequestMetricsMiddleware:
+    """🆕 v5.12.19: per-route API latency"""
+
+    def test_route_template_and_status(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from observability import RequestMetricsMiddleware
+
+        metrics = MetricsRegistry(prefix="test")
+        metrics.histogram("api_request_seconds", "Latency")
+        metrics.counter("api_requests_total", "Requests")
+
+        app = FastAPI()
+
+        @app.get("/trucks/{truck_id}")
+        def truck(truck_id: str):
+            return {"truck_id": truck_id}
+
+        app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+        client = TestClient(app)
+        client.get("/trucks/T1")
+        client.get("/trucks/T2")
+        client.get("/nope")
+
+        output = metrics.get_prometheus_format()
+        assert (
+            'test_api_requests_total{method="GET",route="/trucks/{truck_id}",'
+            'status="200"} 2.0'
+        ) in output
+        assert 'route="unmatched",status="404"' in output
+        assert (
+            'test_api_request_seconds_count{method="GET",route="/trucks/{truck_id}"} 2'
+        ) in output
+
+
 class TestHealthChecker:
     """Tests for HealthChecker"""
 
@@ -0,0 +1,384 @@
+"""
+Tests for Partition Manager v5.12.17
+
+Tests cover:
+- Both partition layouts (RANGE COLUMNS / TO_DAYS) are parsed and extended
+- Missing monthly partitions are created by reorganizing the catch-all
+- Expired partitions are archived to Parquet, verified, then dropped
+- Archive-only unless dropping is enabled with an absolute archive directory
+- Nothing is dropped when the archive does not match MySQL
+- with_archived() transparently merges archived ranges
+"""
+
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+from pymysql.constants import FIELD_TYPE
+
+import partition_manager
+from partition_manager import (
+    FuelMetricsArchive,
+    Partition,
+    PartitionLayout,
+    PartitionManager,
+    add_months,
+    with_archived,
+)
+
+pytest.importorskip("pyarrow")
+
+TODAY = date(2026, 10, 18)
+
+DESCRIPTION = (
+    ("id", FIELD_TYPE.LONGLONG),
+    ("timestamp_utc", FIELD_TYPE.DATETIME),
+    ("truck_id", FIELD_TYPE.VAR_STRING),
+    ("estimated_pct", FIELD_TYPE.DOUBLE),
+    ("refuel_amount", FIELD_TYPE.NEWDECIMAL),
+)
+
+
+def _rows(month: date, truck_ids=("T1", "T2"), per_truck=3):
+    rows = []
+    for t, truck_id in enumerate(truck_ids):
+        for i in range(per_truck):
+            ts = datetime(month.year, month.month, 1 + i, 12, t)
+            rows.append((len(rows) + 1, ts, truck_id, 50.0 + i, None))
+    return rows
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self.conn.statements.append(sql)
+        if sql.startswith("SELECT GET_LOCK"):
+            self._result = [(1 if self.conn.lock_free else 0,)]
+        elif sql.startswith("SELECT RELEASE_LOCK"):
+            self._result = [(1,)]
+        elif "INFORMATION_SCHEMA.PARTITIONS" in sql:
+            self._result = self.conn.partition_rows
+        elif sql.startswith("SELECT COUNT(*)"):
+            name = sql.split("PARTITION (")[1].rstrip(")")
+            self._result = [(self.conn.counts.get(name, len(self.conn.data[name])),)]
+        elif sql.startswith("SELECT *"):
+            name = sql.split("PARTITION (")[1].rstrip(")")
+            self.description = [
+                (n, t, None, None, None, None, True) for n, t in DESCRIPTION
+            ]
+            self._result = list(self.conn.data[name])
+        elif sql.startswith("ALTER TABLE"):
+            self._result = []
+
+    def fetchall(self):
+        result, self._result = self._result, []
+        return result
+
+    def fetchone(self):
+        return self._result.pop(0) if self._result else None
+
+    def fetchmany(self, size):
+        result, self._result = self._result[:size], self._result[size:]
+        return result
+
+
+class FakeConnection:
+    def __init__(self, partition_rows, data=None):
+        self.partition_rows = partition_rows
+        self.data = data or {}
+        self.counts = {}
+        self.statements = []
+        self.lock_free = True
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self)
+
+    def ddl(self):
+        return [s for s in self.statements if s.startswith("ALTER TABLE")]
+
+
+def _columns_layout(first: date, months: int):
+    """partition_fuel_metrics.py layout: pYYYYMM, RANGE COLUMNS"""
+    rows = []
+    for i in range(months):
+        month = add_months(first, i)
+        rows.append(
+            {
+                "PARTITION_NAME": f"p{month.year}{month.month:02d}",
+                "PARTITION_METHOD": "RANGE COLUMNS",
+                "PARTITION_DESCRIPTION": f"'{add_months(month, 1).isoformat()}'",
+                "TABLE_ROWS": 6,
+            }
+        )
+    rows.append(
+        {
+            "PARTITION_NAME": "p_future",
+            "PARTITION_METHOD": "RANGE COLUMNS",
+            "PARTITION_DESCRIPTION": "MAXVALUE",
+            "TABLE_ROWS": 0,
+        }
+    )
+    return rows
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    archive = FuelMetricsArchive(tmp_path / "archive")
+    monkeypatch.setattr(partition_manager, "_archive", archive)
+    return archive
+
+
+def _manager(conn, archive, **kwargs):
+    return PartitionManager(
+        connect=lambda: nullcontext(conn), archive=archive, batch_rows=4, **kwargs
+    )
+
+
+class TestLayout:
+    def test_to_days_bounds(self):
+        layout = PartitionLayout.detect("RANGE", ["p_2024_10", "p_future"])
+
+        assert layout.underscore_names and not layout.range_columns
+        # TO_DAYS('2024-11-01') in MySQL
+        assert layout.parse_bound("739556") == date(2024, 11, 1)
+        assert layout.parse_bound("MAXVALUE") is None
+        assert layout.name(date(2026, 1, 1)) == "p_2026_01"
+        assert layout.bound(date(2026, 2, 1)) == "TO_DAYS('2026-02-01')"
+
+    def test_range_columns_bounds(self):
+        layout = PartitionLayout.detect("RANGE COLUMNS", ["p202512", "p_future"])
+
+        assert layout.parse_bound("'2026-01-01'") == date(2026, 1, 1)
+        assert layout.name(date(2026, 1, 1)) == "p202601"
+        assert layout.bound(date(2026, 2, 1)) == "'2026-02-01'"
+
+    def test_add_months(self):
+        assert add_months(date(2025, 11, 20), 2) == date(2026, 1, 1)
+        assert add_months(date(2026, 1, 5), -13) == date(2024, 12, 1)
+
+
+class TestFuturePartitions:
+    def test_reorganizes_catch_all(self, archive):
+        manager = _manager(FakeConnection([]), archive, months_ahead=2)
+        layout = PartitionLayout(range_columns=False, underscore_names=True)
+        partitions = [
+            Partition("p_2026_09", date(2026, 10, 1)),
+            Partition("p_future", None),
+        ]
+
+        sql, names = manager.future_partitions_sql(layout, partitions, TODAY)
+
+        assert names == ["p_2026_10", "p_2026_11", "p_2026_12"]
+        assert sql.startswith(
+            "ALTER TABLE fuel_metrics REORGANIZE PARTITION p_future INTO ("
+        )
+        assert "PARTITION p_2026_12 VALUES LESS THAN (TO_DAYS('2027-01-01'))" in sql
+        assert sql.endswith("PARTITION p_future VALUES LESS THAN MAXVALUE)")
+
+    def test_nothing_to_create(self, archive):
+        manager = _manager(FakeConnection([]), archive, months_ahead=1)
+        layout = PartitionLayout(range_columns=True, underscore_names=False)
+        partitions = [
+            Partition("p202611", date(2026, 12, 1)),
+            Partition("p_future", None),
+        ]
+
+        assert manager.future_partitions_sql(layout, partitions, TODAY) == (None, [])
+
+    def test_adds_without_catch_all(self, archive):
+        manager = _manager(FakeConnection([]), archive, months_ahead=0)
+        layout = PartitionLayout(range_columns=True, underscore_names=False)
+
+        sql, names = manager.future_partitions_sql(
+            layout, [Partition("p202609", date(2026, 10, 1))], TODAY
+        )
+
+        assert names == ["p202610"]
+        assert sql == (
+            "ALTER TABLE fuel_metrics ADD PARTITION "
+            "(PARTITION p202610 VALUES LESS THAN ('2026-11-01'))"
+        )
+
+
+class TestCycle:
+    def _setup(self, archive, retention_months=12, drop_expired=True):
+        first = date(2025, 8, 1)
+        rows = _columns_layout(first, 15)
+        data = {
+            r["PARTITION_NAME"]: _rows(add_months(first, i))
+            for i, r in enumerate(rows[:-1])
+        }
+        conn = FakeConnection(rows, data)
+        return conn, _manager(
+            conn,
+            archive,
+            months_ahead=3,
+            retention_months=retention_months,
+            drop_expired=drop_expired,
+        )
+
+    def test_archives_then_drops_expired(self, archive):
+        conn, manager = self._setup(archive)
+
+        summary = manager.run_cycle(TODAY)
+
+        # 2025-08 and 2025-09 end on/before the 2025-10-01 cutoff
+        assert summary["archived"] == ["p202508", "p202509"]
+        assert summary["dropped"] == ["p202508", "p202509"]
+        assert summary["created"] == ["p202611", "p202612", "p202701"]
+        assert summary["errors"] == []
+
+        ddl = conn.ddl()
+        assert ddl[0].startswith("ALTER TABLE fuel_metrics REORGANIZE PARTITION")
+        assert ddl[1:] == [
+            "ALTER TABLE fuel_metrics DROP PARTITION p202508",
+            "ALTER TABLE fuel_metrics DROP PARTITION p202509",
+        ]
+        # every archived partition was read fully before its DROP
+        drop_at = conn.statements.index(ddl[1])
+        assert any(
+            s.startswith("SELECT COUNT(*)") and "p202508" in s
+            for s in conn.statements[:drop_at]
+        )
+
+        entries = archive.entries()
+        assert [e["partition"] for e in entries] == ["p202508", "p202509"]
+        assert all(e["dropped"] and e["rows"] == 6 for e in entries)
+        assert entries[1]["start"] == "2025-09-01"
+        assert archive.horizon() == datetime(2025, 10, 1)
+
+        df = archive.read_range(datetime(2025, 8, 1), datetime(2025, 10, 1))
+        assert len(df) == 12
+        assert df["refuel_amount"].isna().all()
+        assert str(df["timestamp_utc"].dtype).startswith("datetime64")
+
+    def test_count_mismatch_keeps_partition(self, archive):
+        conn, manager = self._setup(archive)
+        conn.counts["p202508"] = 7  # a row arrived while exporting
+
+        summary = manager.run_cycle(TODAY)
+
+        assert summary["dropped"] == []
+        assert "row count mismatch" in summary["errors"][0]
+        assert not any("DROP PARTITION" in s for s in conn.ddl())
+        assert archive.entries() == []
+        assert not list(archive.directory.glob("*.parquet*"))
+
+    def test_archive_only_by_default(self, archive, monkeypatch):
+        monkeypatch.delenv("PARTITION_DROP_ENABLED", raising=False)
+        assert partition_manager.DROP_ENABLED is False
+        conn, manager = self._setup(archive, drop_expired=partition_manager.DROP_ENABLED)
+
+        summary = manager.run_cycle(TODAY)
+
+        assert summary["archived"] == ["p202508", "p202509"]
+        assert summary["dropped"] == []
+        assert not any("DROP PARTITION" in s for s in conn.ddl())
+        assert not any(e["dropped"] for e in archive.entries())
+        assert archive.horizon() is None  # readers keep using MySQL
+
+        # already exported: the next cycle doesn't stream them again
+        assert manager.run_cycle(TODAY)["archived"] == []
+
+    def test_relative_archive_dir_never_drops(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        conn, manager = self._setup(FuelMetricsArchive("data/archive"))
+
+        summary = manager.run_cycle(TODAY)
+
+        assert summary["dropped"] == []
+        assert "absolute path" in summary["errors"][0]
+        assert not any("DROP PARTITION" in s for s in conn.ddl())
+
+    def test_skips_when_locked(self, archive):
+        conn, manager = self._setup(archive)
+        conn.lock_free = False
+
+        summary = manager.run_cycle(TODAY)
+
+        assert "skipped" in summary
+        assert conn.ddl() == []
+
+    def test_unpartitioned_table(self, archive):
+        conn = FakeConnection([])
+
+        summary = _manager(conn, archive).run_cycle(TODAY)
+
+        assert summary["skipped"] == "fuel_metrics is not partitioned"
+        assert conn.ddl() == []
+
+
+class TestWithArchived:
+    @pytest.fixture
+    def archived(self, archive):
+        first = date(2025, 8, 1)
+        rows = _columns_layout(first, 15)
+        data = {
+            r["PARTITION_NAME"]: _rows(add_months(first, i))
+            for i, r in enumerate(rows[:-1])
+        }
+        _manager(
+            FakeConnection(rows, data), archive, months_ahead=3, drop_expired=True
+        ).run_cycle(TODAY)
+        return archive
+
+    def test_merges_archived_range(self, archived):
+        hot = pd.DataFrame(
+            {
+                "timestamp_utc": [datetime(2025, 10, 2)],
+                "truck_id": ["T1"],
+                "estimated_pct": [40.0],
+            }
+        )
+
+        df = with_archived(
+            hot,
+            datetime(2025, 9, 1),
+            datetime(2025, 10, 31),
+            ["timestamp_utc", "truck_id", "estimated_pct", "odometer_mi"],
+            truck_ids=["T1"],
+            descending=True,
+        )
+
+        assert list(df["truck_id"].unique()) == ["T1"]
+        assert len(df) == 4
+        assert df["timestamp_utc"].is_monotonic_decreasing
+        assert df.iloc[0]["estimated_pct"] == 40.0
+        # column added after the partition was archived
+        assert df["odometer_mi"].isna().all()
+
+    def test_recent_range_untouched(self, archived):
+        hot = pd.DataFrame({"timestamp_utc": [datetime(2026, 10, 1)]})
+
+        assert (
+            with_archived(
+                hot, datetime(2026, 9, 1), datetime(2026, 10, 18), ["timestamp_utc"]
+            )
+            is hot
+        )
+
+    def test_limit_and_tz_aware_bounds(self, archived):
+        from datetime import timezone
+
+        end = datetime(2025, 10, 1, tzinfo=timezone.utc)
+        df = with_archived(
+            pd.DataFrame(),
+            end - timedelta(days=90),
+            end,
+            ["timestamp_utc", "truck_id"],
+            limit=5,
+        )
+
+        assert len(df) == 5
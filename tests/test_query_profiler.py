@@ -0,0 +1,278 @@
+"""
+Tests for Query Profiler v5.12.18
+
+Tests cover:
+- Fingerprints collapse literals, placeholders and IN / VALUES lists
+- Per-fingerprint aggregation (calls, rows, bytes, callers) and eviction
+- Slow statements are captured and EXPLAINed once per interval
+- pymysql / aiomysql connections are wrapped at query() level
+- Prometheus collector exports top statements
+"""
+
+import asyncio
+from concurrent.futures import wait
+from types import SimpleNamespace
+
+import pytest
+
+import query_profiler
+from query_profiler import (
+    QueryProfileCollector,
+    QueryProfiler,
+    fingerprint,
+    instrument_aiomysql,
+    instrument_pymysql,
+)
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = QueryProfiler(enabled=True, slow_query_ms=100, max_statements=3)
+    monkeypatch.setattr(query_profiler, "_profiler", profiler)
+    yield profiler
+    profiler.shutdown()
+
+
+def _result(rows=None, affected_rows=0):
+    return SimpleNamespace(rows=rows, affected_rows=affected_rows)
+
+
+class TestFingerprint:
+    def test_literals_and_placeholders(self):
+        sql = (
+            "SELECT * FROM fuel_metrics WHERE truck_id = 'T-101' "
+            "AND ts > %s AND carrier_id = %(carrier)s AND mpg > 5.5 "
+            "AND id IN (1, 2, 3) -- recent only"
+        )
+
+        assert fingerprint(sql) == (
+            "SELECT * FROM fuel_metrics WHERE truck_id = ? AND ts > ? "
+            "AND carrier_id = ? AND mpg > ? AND id IN (...)"
+        )
+
+    def test_same_shape_same_fingerprint(self):
+        a = fingerprint("SELECT x FROM t WHERE id IN (1,2) AND n = :name")
+        b = fingerprint("select x  FROM t\n WHERE id IN (7, 8, 9, 10) AND n = :other")
+
+        assert a.lower() == b.lower()
+
+    def test_multi_row_insert(self):
+        sql = "INSERT INTO t (a, b) VALUES (1, 'x'), (2, NULL), (3, 'it''s')"
+
+        assert fingerprint(sql) == "INSERT INTO t (a, b) VALUES (...)"
+
+    def test_comment_markers_inside_strings(self):
+        assert fingerprint("SELECT '#1 -- a' FROM t # tail") == "SELECT ? FROM t"
+
+    def test_identifiers_with_digits_kept(self):
+        assert fingerprint("SELECT col1, t2.x FROM p202510") == (
+            "SELECT col1, t2.x FROM p202510"
+        )
+
+
+class TestAggregation:
+    def test_counts_rows_bytes_and_callers(self, profiler):
+        for truck in ("T1", "T2"):
+            profiler.record(
+                f"SELECT truck_id FROM t WHERE truck_id = '{truck}'",
+                0.01,
+                _result(rows=[("abcd",), ("efgh",)]),
+            )
+        profiler.record("UPDATE t SET a = 1", 0.02, _result(affected_rows=5))
+
+        top = profiler.top(10)
+        assert [s["verb"] for s in top] == ["SELECT", "UPDATE"]
+        select = top[0]
+        assert select["calls"] == 2
+        assert select["rows"] == 4
+        assert select["bytes_est"] == 16
+        assert select["total_seconds"] == pytest.approx(0.02)
+        (caller,) = select["callers"]
+        assert caller.startswith("test_query_profiler.py:")
+        assert select["callers"][caller] == 2
+        assert top[1]["rows"] == 5
+
+    def test_order_by(self, profiler):
+        profiler.record("SELECT 1 FROM a", 0.05, _result(rows=[(1,)]))
+        for _ in range(3):
+            profiler.record("SELECT 1 FROM b", 0.001, _result(rows=[(1,)]))
+
+        assert profiler.top(1)[0]["fingerprint"] == "SELECT ? FROM a"
+        assert profiler.top(1, order_by="calls")[0]["fingerprint"] == (
+            "SELECT ? FROM b"
+        )
+        with pytest.raises(ValueError):
+            profiler.top(order_by="nope")
+
+    def test_cheapest_statement_evicted(self, profiler):
+        profiler.record("SELECT * FROM a", 0.05)
+        profiler.record("SELECT * FROM b", 0.001)
+        profiler.record("SELECT * FROM c", 0.03)
+        profiler.record("SELECT * FROM d", 0.02)
+
+        names = {s["fingerprint"][-1] for s in profiler.top(10)}
+        assert names == {"a", "c", "d"}
+        assert profiler.summary()["evicted"] == 1
+
+    def test_explain_statements_ignored(self, profiler):
+        profiler.record("EXPLAIN SELECT * FROM a", 1.0)
+
+        assert profiler.top() == []
+
+    def test_reset(self, profiler):
+        profiler.record("SELECT * FROM a", 1.0)
+        profiler.reset()
+
+        assert profiler.top() == [] and profiler.slow_queries() == []
+
+
+class FakeCursor:
+    description = (("id",), ("select_type",), ("table",), ("rows",))
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.conn.executed.append(sql)
+
+    def fetchall(self):
+        return [(1, "SIMPLE", "fuel_metrics", 120000)]
+
+
+class FakeExplainConnection:
+    def __init__(self):
+        self.executed = []
+        self.closed = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed += 1
+
+
+class TestSlowQueries:
+    def test_slow_query_captured_and_explained_once(self, profiler):
+        conn = FakeExplainConnection()
+        sql = "SELECT * FROM fuel_metrics WHERE mpg > 5 AND unit LIKE '5%'"
+
+        profiler.record(sql, 0.5, _result(rows=[]), explain=lambda: conn)
+        profiler.record(sql, 0.6, _result(rows=[]), explain=lambda: conn)
+        wait([profiler._explainer.submit(lambda: None)])
+
+        slow = profiler.slow_queries()
+        assert len(slow) == 2
+        assert slow[0]["seconds"] == 0.6
+        assert "test_query_profiler.py" in slow[0]["caller"]
+
+        assert conn.executed == ["EXPLAIN " + sql.replace("%", "%%")]
+        assert conn.closed == 1
+        detail = profiler.statement(slow[0]["query_id"])
+        assert detail["slow_calls"] == 2
+        assert detail["explain"] == [
+            {"id": 1, "select_type": "SIMPLE", "table": "fuel_metrics", "rows": 120000}
+        ]
+
+    def test_fast_and_insert_not_explained(self, profiler):
+        conn = FakeExplainConnection()
+
+        profiler.record("SELECT 1 FROM a", 0.01, explain=lambda: conn)
+        profiler.record("INSERT INTO a VALUES (1)", 0.5, explain=lambda: conn)
+
+        assert profiler._explainer is None
+        assert len(profiler.slow_queries()) == 1
+
+    def test_explain_failure_recorded(self, profiler):
+        def refuse():
+            raise OSError("pool exhausted")
+
+        profiler.record("SELECT * FROM a", 0.5, explain=refuse)
+        wait([profiler._explainer.submit(lambda: None)])
+
+        detail = profiler.statement(profiler.top()[0]["query_id"])
+        assert detail["explain"] == [{"error": "pool exhausted"}]
+
+
+class FakePyMySQL:
+    def __init__(self, rows=None, fail=False):
+        self._rows = rows
+        self._fail = fail
+        self._result = None
+
+    def query(self, sql, unbuffered=False):
+        if self._fail:
+            raise RuntimeError("lost connection")
+        self._result = _result(rows=self._rows)
+        return len(self._rows or ())
+
+
+class FakeAioMySQL(FakePyMySQL):
+    async def query(self, sql, unbuffered=False):
+        return FakePyMySQL.query(self, sql, unbuffered)
+
+
+class TestInstrumentation:
+    def test_pymysql_query_wrapped(self, profiler):
+        conn = FakePyMySQL(rows=[(1,), (2,)])
+        instrument_pymysql(conn, "local")
+        instrument_pymysql(conn, "local")  # idempotent
+
+        assert conn.query("SELECT id FROM t WHERE id > 3") == 2
+
+        stats = profiler.top()[0]
+        assert stats["fingerprint"] == "SELECT id FROM t WHERE id > ?"
+        assert stats["calls"] == 1 and stats["rows"] == 2
+
+    def test_errors_counted_and_reraised(self, profiler):
+        conn = FakePyMySQL(fail=True)
+        instrument_pymysql(conn, "local")
+
+        with pytest.raises(RuntimeError):
+            conn.query("SELECT 1 FROM t")
+
+        assert profiler.top()[0]["errors"] == 1
+
+    def test_unbuffered_rows_not_read(self, profiler):
+        conn = FakePyMySQL(rows=[(1,)])
+        instrument_pymysql(conn, "local")
+
+        conn.query("SELECT * FROM big", unbuffered=True)
+
+        assert profiler.top()[0]["rows"] == 0
+
+    def test_disabled(self, profiler):
+        profiler.enabled = False
+        conn = FakePyMySQL(rows=[])
+        instrument_pymysql(conn, "local")
+
+        conn.query("SELECT 1")
+
+        assert profiler.top() == []
+
+    def test_aiomysql_query_wrapped(self, profiler):
+        conn = FakeAioMySQL(rows=[(1,)])
+        instrument_aiomysql(conn, "wialon")
+
+        assert asyncio.run(conn.query("SELECT 1 FROM units")) == 1
+
+        assert profiler.top()[0]["fingerprint"] == "SELECT ? FROM units"
+
+
+class TestCollector:
+    def test_exports_top_statements(self, profiler):
+        pytest.importorskip("prometheus_client")
+        profiler.record("SELECT * FROM a", 0.25, _result(rows=[(1,)]))
+
+        families = {f.name: f for f in QueryProfileCollector(profiler).collect()}
+
+        sample = families["fuel_copilot_db_statement_seconds"].samples[0]
+        assert sample.value == 0.25
+        assert sample.labels["statement"] == "SELECT * FROM a"
+        assert sample.labels["verb"] == "SELECT"
+        assert families["fuel_copilot_db_statement_slow_calls"].samples[0].value == 1
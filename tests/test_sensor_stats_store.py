@@ -0,0 +1,185 @@
+"""
+Tests for Sensor Stats Store v5.12.9
+
+Tests cover:
+- Welford / EWMA / rolling quantiles vs statistics, pandas and numpy
+- Streamed rules == SensorAnomalyDetector batch rules on the same series
+- Persistence, reload and backfill from a DB-API connection
+- SensorAnomalyDetector served from the store without touching the database
+"""
+
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sensor_anomaly import SensorAnomalyDetector
+from sensor_stats_store import (
+    EWMA_SPAN,
+    WINDOW_SIZE,
+    SensorStatsStore,
+    StreamingSensorStats,
+)
+
+CONFIG = SensorAnomalyDetector.SENSORS["fuel_level"]
+
+
+def _series(n=1500, seed=3):
+    """Fuel level with a stuck run, a jump, a dropout and an alternating stretch"""
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(seconds=30 * n)
+    values = [60 - i * 0.01 + rng.gauss(0, 0.3) for i in range(n)]
+    values[200:230] = [55.0] * 30  # stuck
+    values[400] = values[399] + 25  # rapid change
+    values[700] = 0.0  # dropout
+    for i in range(900, 930):  # alternating noise
+        values[i] = 50 + (1.5 if i % 2 else -1.5)
+    values[1000] = 104.0  # out of range
+    return [(start + timedelta(seconds=30 * i), round(v, 3)) for i, v in enumerate(values)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SensorStatsStore(store_file=str(tmp_path / "sensor_stats.json"))
+
+
+def _non_statistical(anomalies):
+    """Rules that don't depend on the mean/σ estimate (stream == batch exactly)"""
+    return sorted(
+        (a.anomaly_type, a.timestamp.replace(microsecond=0), a.severity, a.duration_minutes)
+        for a in anomalies
+        if not (a.anomaly_type == "spike" and "σ" in a.description)
+    )
+
+
+class TestStreamingStats:
+    def test_welford_ewma_and_quantiles(self):
+        rng = np.random.default_rng(1)
+        values = rng.normal(40, 5, 600)
+        state = StreamingSensorStats()
+        for i, v in enumerate(values):
+            state.add(float(v), float(i), CONFIG)
+
+        assert state.mean == pytest.approx(statistics.mean(values))
+        assert state.std_dev == pytest.approx(statistics.stdev(values))
+
+        ewm = pd.Series(values).ewm(span=EWMA_SPAN, adjust=False)
+        assert state.ewma == pytest.approx(ewm.mean().iloc[-1])
+        assert state.ewm_std == pytest.approx(ewm.std(bias=True).iloc[-1], rel=1e-6)
+
+        window = values[-WINDOW_SIZE:]
+        q = state.quantiles()
+        assert q["p05"] == pytest.approx(np.quantile(window, 0.05))
+        assert q["p50"] == pytest.approx(np.median(window))
+        assert q["p95"] == pytest.approx(np.quantile(window, 0.95))
+
+    def test_rules_match_batch_detector(self, store, monkeypatch):
+        series = _series()
+        for ts, value in series:
+            store.update("T1", {"sensor_pct": value}, timestamp=ts)
+        streamed = store.get_anomalies("T1", "fuel_level", 24)
+
+        batch_detector = SensorAnomalyDetector(
+            stats_store=SensorStatsStore(store_file="/nonexistent/x.json", auto_load=False)
+        )
+        monkeypatch.setattr(
+            batch_detector,
+            "_get_sensor_data",
+            lambda *a: [{"timestamp": ts, "value": v} for ts, v in series],
+        )
+        batch = batch_detector.detect_anomalies("T1", "fuel_level", 24)
+
+        stream_detector = SensorAnomalyDetector(stats_store=store)
+        monkeypatch.setattr(store, "covers", lambda *a, **k: True)
+        from_store = stream_detector.detect_anomalies("T1", "fuel_level", 24)
+
+        assert len(from_store) == len(streamed)
+        assert {a.anomaly_type for a in from_store} >= {
+            "stuck",
+            "spike",
+            "dropout",
+            "noise",
+            "out_of_range",
+        }
+        assert _non_statistical(from_store) == _non_statistical(batch)
+
+
+class TestStore:
+    def test_persistence_and_reload(self, store, tmp_path):
+        for ts, value in _series():
+            store.update("T1", {"sensor_pct": value, "speed_mph": 50.0}, timestamp=ts)
+        store.save_to_file()
+
+        reader = SensorStatsStore(store_file=str(tmp_path / "sensor_stats.json"))
+        for sensor in ("fuel_level", "speed"):
+            assert reader.get_sensor_stats("T1", sensor) == pytest.approx(
+                store.get_sensor_stats("T1", sensor)
+            )
+        assert reader.get_anomalies("T1", "fuel_level", 24) == store.get_anomalies(
+            "T1", "fuel_level", 24
+        )
+        assert reader.truck_ids("speed") == ["T1"]
+
+        # Reader picks up a newer file from the sync process
+        store.update("T1", {"sensor_pct": 0.0}, timestamp=datetime.utcnow())
+        store.save_to_file()
+        reader._last_reload_check = 0
+        assert reader.get_sensor_stats("T1", "fuel_level")["last_value"] == 0.0
+
+    def test_backfill_covers_window(self, store):
+        rows = [(ts, value, None, 45.0, None) for ts, value in _series()]
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *a):
+                return False
+
+            def execute(self, sql, params):
+                self.params = params
+
+            def fetchall(self):
+                return rows
+
+        class Connection:
+            def cursor(self):
+                return Cursor()
+
+        assert store.missing_trucks(["T1", "T2"]) == ["T1", "T2"]
+        assert store.backfill_from_connection(Connection(), ["T1"]) == 1
+        assert store.covers("T1", "fuel_level", 168)
+        assert store.missing_trucks(["T1", "T2"]) == ["T2"]
+        assert store.get_sensor_stats("T1", "speed")["mean"] == pytest.approx(45.0)
+
+
+class TestDetectorFromStore:
+    def test_health_and_fleet_without_database(self, store, monkeypatch):
+        since = time.time() - 168 * 3600
+        for truck_id in ("T1", "T2"):
+            store.rebuild_from_rows(
+                truck_id,
+                [{"timestamp_utc": ts, "sensor_pct": v} for ts, v in _series(seed=len(truck_id))],
+                since,
+            )
+        detector = SensorAnomalyDetector(stats_store=store)
+
+        def no_db(*args, **kwargs):
+            raise AssertionError("database should not be queried")
+
+        monkeypatch.setattr(detector, "_get_sensor_data", no_db)
+        monkeypatch.setattr("sensor_anomaly.get_db_connection", no_db)
+
+        health = detector.get_sensor_health("T1", "fuel_level")
+        anomalies = store.get_anomalies("T1", "fuel_level", 24)
+        assert health.anomaly_count_24h == len(anomalies)
+        assert health.status == "failed"  # dropout + stuck + out of range
+        assert "Check sensor wiring connections" in health.recommendations
+        assert health.last_reading is not None
+
+        fleet = detector.get_fleet_sensor_status(sensor_name="fuel_level")
+        assert fleet["summary"]["total_trucks"] == 2
@@ -0,0 +1,167 @@
+"""
+Tests for Source Collectors / Sync Cycle State v5.12.11
+
+Tests cover:
+- Per-source TTL, sync-cycle input versions and explicit invalidation
+- Stale sources refresh concurrently, single-flight under concurrent requests
+- A failing source keeps serving its last value
+- Sync cycle marker written by the sync process and picked up by the API
+- FleetCommandCenter reports per-source latency / cache stats
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from fleet_command_center import FleetCommandCenter
+from source_collectors import SourceCollector, SourceCollectorRunner
+from sync_cycle_state import SyncCycleState
+
+
+class Counter:
+    def __init__(self, delay=0.0, value="v"):
+        self.calls = 0
+        self.delay = delay
+        self.value = value
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return f"{self.value}{self.calls}"
+
+
+@pytest.fixture
+def versions():
+    return {"fuel_metrics": 1, "dtc_events": 1}
+
+
+class TestCachePolicy:
+    def test_ttl_inputs_and_invalidation(self, versions):
+        fuel, dtc, ttl = Counter(), Counter(), Counter()
+        runner = SourceCollectorRunner(
+            [
+                SourceCollector("fuel", fuel, ttl_seconds=600, inputs=("fuel_metrics",)),
+                SourceCollector("dtc", dtc, ttl_seconds=600, inputs=("dtc_events",)),
+                SourceCollector("ttl", ttl, ttl_seconds=0.05),
+            ],
+            versions_fn=lambda: versions,
+        )
+
+        results, meta = runner.collect()
+        assert results == {"fuel": "v1", "dtc": "v1", "ttl": "v1"}
+        assert meta["recomputed"] == ["dtc", "fuel", "ttl"]
+
+        results, meta = runner.collect()
+        assert meta["recomputed"] == []
+        assert all(s["cached"] for s in meta["sources"].values())
+
+        versions["fuel_metrics"] = 2  # new sync cycle wrote fuel_metrics only
+        time.sleep(0.06)
+        results, meta = runner.collect()
+        assert meta["recomputed"] == ["fuel", "ttl"]
+        assert meta["sources"]["fuel"]["refresh_reason"] == "input:fuel_metrics"
+        assert meta["sources"]["ttl"]["refresh_reason"] == "ttl"
+        assert results["dtc"] == "v1" and dtc.calls == 1
+
+        runner.invalidate("dtc")
+        assert runner.collect()[1]["recomputed"] == ["dtc"]
+        assert runner.collect(force=True)[1]["recomputed"] == ["dtc", "fuel", "ttl"]
+        assert runner.get_stats()["dtc"]["misses"] == 3
+
+    def test_failing_source_keeps_last_value(self, versions):
+        calls = {"n": 0}
+
+        def flaky():
+            calls["n"] += 1
+            if calls["n"] > 1:
+                raise RuntimeError("db down")
+            return ["item"]
+
+        runner = SourceCollectorRunner(
+            [SourceCollector("flaky", flaky, ttl_seconds=0, default=[])],
+            versions_fn=lambda: versions,
+        )
+        assert runner.collect()[0]["flaky"] == ["item"]
+        results, meta = runner.collect()
+        assert results["flaky"] == ["item"]
+        assert meta["sources"]["flaky"]["error"] == "db down"
+
+
+class TestConcurrency:
+    def test_stale_sources_refresh_in_parallel(self, versions):
+        collectors = [
+            SourceCollector(f"s{i}", Counter(delay=0.2), ttl_seconds=60) for i in range(4)
+        ]
+        runner = SourceCollectorRunner(collectors, versions_fn=lambda: versions)
+
+        started = time.perf_counter()
+        _, meta = runner.collect()
+        assert time.perf_counter() - started < 0.6  # not 4 × 0.2s
+        assert all(s["latency_ms"] >= 190 for s in meta["sources"].values())
+        runner.shutdown()
+
+    def test_concurrent_requests_compute_once(self, versions):
+        slow = Counter(delay=0.2)
+        runner = SourceCollectorRunner(
+            [SourceCollector("slow", slow, ttl_seconds=60)], versions_fn=lambda: versions
+        )
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            values = list(pool.map(lambda _: runner.collect()[0]["slow"], range(4)))
+        assert slow.calls == 1
+        assert values == ["v1"] * 4
+
+
+class TestSyncCycleState:
+    def test_publish_and_reload(self, tmp_path):
+        path = str(tmp_path / "sync_cycle.json")
+        writer = SyncCycleState(path)
+        reader = SyncCycleState(path)
+
+        writer.mark("fuel_metrics", 40)
+        writer.mark("dtc_events", 0)  # nothing written -> version unchanged
+        assert writer.publish() == 1
+        writer.mark("dtc_events")
+        writer.publish()
+
+        reader._last_reload_check = 0
+        assert reader.versions() == {"fuel_metrics": 1, "dtc_events": 2}
+        assert reader.cycle == 2
+
+        # Restarted sync process continues the numbering
+        assert SyncCycleState(path).publish() == 3
+
+
+class TestCommandCenter:
+    def test_response_metadata_and_cached_sources(self):
+        with patch.object(
+            FleetCommandCenter, "_collect_dtc_events", autospec=True, return_value=[]
+        ) as dtc:
+            cc = FleetCommandCenter()
+            cc._source_runner._versions_fn = lambda: {"fuel_metrics": 7, "dtc_events": 3}
+            first = cc.generate_command_center_data()
+            second = cc.generate_command_center_data()
+
+        sources = second.data_quality["sources"]
+        assert set(sources) == set(FleetCommandCenter.SOURCE_CACHE_POLICY)
+        assert second.data_quality["recomputed_sources"] == []
+        assert all(s["cached"] and s["hits"] == 1 for s in sources.values())
+        assert len(first.data_quality["recomputed_sources"]) == len(sources)
+        assert dtc.call_count == 1
+        assert "sources" in second.to_dict()["data_quality"]
+
+    def test_db_outage_keeps_last_dtc_events(self):
+        cc = FleetCommandCenter()
+        cc._source_runner._versions_fn = lambda: {}
+        collector = cc._source_runner.collectors["dtc_events"]
+        collector.value, collector.has_value, collector.dirty = ["last"], True, True
+
+        with patch("database_mysql.get_sqlalchemy_engine", side_effect=RuntimeError("db down")):
+            results, meta = cc._source_runner.collect(names=["dtc_events"])
+
+        assert results["dtc_events"] == ["last"]
+        assert meta["sources"]["dtc_events"]["error"] == "db down"
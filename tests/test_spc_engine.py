@@ -0,0 +1,184 @@
+"""
+Tests for SPC Engine v5.12.14
+
+Tests cover:
+- Incremental counters == NelsonRulesChecker at every point (all 8 rules)
+- Vectorized batch mode == incremental mode
+- Rebaseline when control limits move
+- TruckHealthMonitor wired to the engine
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from spc_engine import SPCEngine, evaluate_series, violated_rules
+from truck_health_monitor import (
+    NELSON_RULES_BY_NUMBER,
+    NelsonRule,
+    NelsonRulesChecker,
+    TruckHealthMonitor,
+)
+
+
+def _checker_rules(values, mean, std):
+    """Rule numbers from the list-based checker"""
+    by_rule = {rule: number for number, rule in NELSON_RULES_BY_NUMBER.items()}
+    return tuple(
+        sorted(by_rule[v] for v in NelsonRulesChecker.check_all_rules(values, mean, std))
+    )
+
+
+def _patterned_series(n, seed):
+    """Noise with shifts, ramps, oscillation, stuck and mixture segments"""
+    rng = random.Random(seed)
+    values = []
+    while len(values) < n:
+        kind = rng.choice(["noise", "shift", "ramp", "osc", "stuck", "mix"])
+        length = rng.randint(5, 25)
+        for i in range(length):
+            if kind == "noise":
+                values.append(100 + rng.gauss(0, 10))
+            elif kind == "shift":
+                values.append(115 + rng.gauss(0, 4))
+            elif kind == "ramp":
+                values.append(90 + 2 * i)
+            elif kind == "osc":
+                values.append(100 + (6 if i % 2 else -6))
+            elif kind == "stuck":
+                values.append(100.0)
+            else:
+                values.append(100 + (15 if rng.random() < 0.5 else -15))
+    return values[:n]
+
+
+class TestParity:
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4])
+    def test_incremental_matches_checker(self, seed):
+        values = _patterned_series(400, seed)
+        engine = SPCEngine(limit_tolerance=0.0)
+        for i, value in enumerate(values):
+            engine.observe("k", value)
+            expected = _checker_rules(values[max(0, i - 19) : i + 1], 100, 10)
+            assert engine.violations("k", 100, 10) == expected, i
+
+    @pytest.mark.parametrize("seed", [5, 6])
+    def test_batch_matches_checker(self, seed):
+        values = _patterned_series(400, seed)
+        matrix = evaluate_series(values, 100, 10)
+
+        assert matrix.shape == (400, 8)
+        for i in range(len(values)):
+            expected = _checker_rules(values[: i + 1], 100, 10)
+            assert violated_rules(matrix[i]) == expected, i
+
+    def test_every_rule_fires(self):
+        values = _patterned_series(2000, 7)
+        matrix = evaluate_series(values, 100, 10)
+        assert matrix.any(axis=0).all()
+
+    def test_zero_std(self):
+        engine = SPCEngine()
+        engine.observe("k", 100.0)
+        assert engine.violations("k", 100, 0) == ()
+        assert not evaluate_series([100.0, 100.0], 100, 0).any()
+
+
+class TestEngine:
+    def test_rebaseline_on_limit_change(self):
+        engine = SPCEngine()
+        for _ in range(10):
+            engine.observe("k", 112.0)
+
+        # 112 is > 1σ above 100 with σ=10 ...
+        assert 6 in engine.violations("k", 100, 10)
+        # ... but well inside the limits once the center moves
+        assert engine.violations("k", 112, 10) == (2,)
+        assert engine.get_stats()["rebaselines"] == 2
+
+    def test_small_limit_drift_does_not_rebaseline(self):
+        engine = SPCEngine(limit_tolerance=0.1)
+        for value in _patterned_series(50, 8):
+            engine.observe("k", value)
+            engine.violations("k", 100 + random.uniform(-0.5, 0.5), 10)
+
+        assert engine.get_stats()["rebaselines"] == 1
+
+    def test_ring_buffer_is_bounded(self):
+        engine = SPCEngine(capacity=20)
+        for value in range(100):
+            engine.observe("k", float(value))
+
+        assert engine.series_length("k") == 20
+        assert engine._series["k"].values().tolist() == [float(v) for v in range(80, 100)]
+
+    def test_capacity_floor(self):
+        assert SPCEngine(capacity=4).capacity == 15
+
+    def test_backfill_seeds_incremental_state(self):
+        values = _patterned_series(300, 9)
+        engine = SPCEngine(limit_tolerance=0.0)
+        matrix = engine.backfill("k", values, 100, 10)
+
+        assert engine.violations("k", 100, 10) == violated_rules(matrix[-1])
+
+        engine.observe("k", 150.0)
+        assert engine.violations("k", 100, 10) == _checker_rules(
+            values[-19:] + [150.0], 100, 10
+        )
+
+    def test_incremental_is_constant_time(self):
+        engine = SPCEngine()
+        keys = [(f"T{i}", "coolant_temp") for i in range(500)]
+        for key in keys:
+            engine.backfill(key, [100 + random.gauss(0, 10) for _ in range(32)], 100, 10)
+
+        start = time.perf_counter()
+        for _ in range(10):
+            for key in keys:
+                engine.observe(key, 100 + random.gauss(0, 10))
+                engine.violations(key, 100, 10)
+        per_reading_us = (time.perf_counter() - start) / 5000 * 1e6
+
+        assert per_reading_us < 200
+
+
+class TestMonitorIntegration:
+    def test_monotonic_rise_flagged(self, tmp_path):
+        monitor = TruckHealthMonitor(data_dir=str(tmp_path / "health"))
+        base = datetime.now(timezone.utc) - timedelta(days=1)
+        rng = random.Random(11)
+
+        for i in range(60):
+            monitor.record_sensor_data(
+                truck_id="T1",
+                timestamp=base + timedelta(minutes=15 * i),
+                coolant_temp=190.0 + rng.gauss(0, 5),
+            )
+
+        alerts = []
+        for i in range(6):
+            alerts = monitor.record_sensor_data(
+                truck_id="T1",
+                timestamp=base + timedelta(minutes=15 * (60 + i)),
+                coolant_temp=186.0 + 1.5 * i,
+            )
+
+        assert alerts
+        assert NelsonRule.RULE_3_MONOTONIC in alerts[0].nelson_violations
+
+    def test_restored_history_is_seeded(self, tmp_path):
+        monitor = TruckHealthMonitor(data_dir=str(tmp_path / "health"))
+        now = datetime.now(timezone.utc)
+        monitor._sensor_cache["T1"] = {
+            "coolant_temp": [
+                (now - timedelta(minutes=15 * (30 - i)), 190.0 + (i % 7) - 3)
+                for i in range(30)
+            ]
+        }
+
+        monitor.record_sensor_data(truck_id="T1", timestamp=now, coolant_temp=191.0)
+
+        assert monitor._spc.series_length(("T1", "coolant_temp")) == 31
@@ -0,0 +1,162 @@
+"""
+Tests for Trend Engine v5.12.10
+
+Tests cover:
+- Batch EWMA/CUSUM == the scalar v1.5.0 formulas (incl. repeated keys)
+- FleetCommandCenter helpers backed by the engine
+- One batch update per fleet cycle
+- 10k keys per cycle in milliseconds
+- Bulk UPSERT / SELECT against cc_algorithm_state
+"""
+
+import random
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from fleet_command_center import FleetCommandCenter
+from trend_engine import TREND_UP, TrendEngine
+
+
+def _scalar_reference(readings, alpha=0.3, threshold=5.0):
+    """The original per-key dict implementation"""
+    ewma, cusum, out = {}, {}, []
+    for truck_id, sensor, value, target in readings:
+        key = f"{truck_id}:{sensor}"
+        ewma[key] = value if key not in ewma else alpha * value + (1 - alpha) * ewma[key]
+        high, low = cusum.get(key, (0.0, 0.0))
+        high = max(0, high + value - target)
+        low = min(0, low + value - target)
+        cusum[key] = (high, low)
+        out.append((ewma[key], high, low, high > threshold or abs(low) > threshold))
+    return out
+
+
+def _readings(n=2000, keys=150, seed=7):
+    rng = random.Random(seed)
+    return [
+        (f"T{rng.randrange(keys // 3):03d}", rng.choice(["oil", "cool", "volt"]),
+         rng.gauss(100, 8), 100.0)
+        for _ in range(n)
+    ]
+
+
+class TestBatchParity:
+    def test_batch_with_repeated_keys_matches_scalar(self):
+        readings = _readings()
+        engine = TrendEngine(capacity=16)  # forces growth
+        trucks, sensors, values, targets = map(list, zip(*readings))
+
+        # Same state whether fed as one batch or in chunks
+        half = len(readings) // 2
+        first = engine.update(trucks[:half], sensors[:half], values[:half], targets[:half])
+        second = engine.update(trucks[half:], sensors[half:], values[half:], targets[half:])
+
+        expected = np.array(_scalar_reference(readings), dtype=np.float64)
+        got = np.column_stack([
+            np.r_[first.ewma, second.ewma],
+            np.r_[first.cusum_high, second.cusum_high],
+            np.r_[first.cusum_low, second.cusum_low],
+            np.r_[first.alert, second.alert],
+        ])
+        np.testing.assert_allclose(got, expected, rtol=1e-12, atol=1e-9)
+
+    def test_command_center_helpers(self):
+        cc = FleetCommandCenter()
+        assert cc._calculate_ewma("T1", "oil", 50.0) == 50.0
+        assert cc._calculate_ewma("T1", "oil", 60.0) == pytest.approx(53.0)
+        assert cc._calculate_cusum("T1", "oil", 58.0, 50.0) == (8.0, 0.0, True)
+
+        batch = cc.detect_trends_batch(["T2", "T3"], ["oil", "oil"], [80.0, 50.0], [50.0, 50.0])
+        assert batch[1]["trend"] == "stable" and not batch[1]["cusum_alert"]
+        state = cc._trend_engine.snapshot("T2", "oil")
+        assert state["trend_direction"] == "UP" and state["baseline_mean"] == 50.0
+
+        single = cc._detect_trend_with_ewma_cusum("T4", "oil", [80.0], 50.0, persist=False)
+        assert batch[0] == single
+
+
+    def test_fleet_cycle_is_one_batch(self, monkeypatch):
+        cc = FleetCommandCenter()
+        batch = MagicMock(wraps=cc.detect_trends_batch)
+        monkeypatch.setattr(cc, "detect_trends_batch", batch)
+        monkeypatch.setattr(cc, "persist_anomaly", MagicMock())
+
+        trends = cc._update_fleet_trends(
+            {
+                "T1": {"oil_press": 140.0, "cool_temp": None, "idle_hours": 3.0},
+                "T2": {"oil_press": 75.0, "voltage": 13.8},
+            }
+        )
+
+        assert batch.call_count == 1
+        assert set(trends) == {("T1", "oil_press"), ("T2", "oil_press"), ("T2", "voltage")}
+        assert trends[("T1", "oil_press")]["cusum_alert"]
+        assert trends[("T2", "oil_press")]["trend"] == "stable"
+        cc.persist_anomaly.assert_called_once()
+        assert cc.persist_anomaly.call_args.kwargs["truck_id"] == "T1"
+
+
+class TestThroughput:
+    def test_ten_thousand_keys_per_cycle(self):
+        n = 12_000
+        trucks = [f"T{i // 12:04d}" for i in range(n)]
+        sensors = [f"s{i % 12}" for i in range(n)]
+        rng = np.random.default_rng(0)
+        engine = TrendEngine()
+        engine.update(trucks, sensors, rng.normal(100, 5, n), 100.0)  # key table warm-up
+
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            engine.update(trucks, sensors, rng.normal(100, 5, n), 100.0)
+            timings.append(time.perf_counter() - started)
+
+        assert len(engine) == n
+        assert min(timings) < 0.05, f"{min(timings) * 1000:.1f}ms for {n} keys"
+
+
+class TestPersistence:
+    def _engine(self, rows=None):
+        sql_engine = MagicMock()
+        conn = sql_engine.connect.return_value.__enter__.return_value
+        conn.execute.return_value.fetchall.return_value = rows or []
+        return sql_engine, conn
+
+    def test_bulk_upsert_only_dirty_keys(self):
+        engine = TrendEngine()
+        engine.update([f"T{i}" for i in range(2500)], "oil", np.arange(2500.0), 0.0)
+        engine.mark_trend(engine.indices("T1", "oil"), direction=TREND_UP, samples=3)
+
+        sql_engine, conn = self._engine()
+        assert engine.persist(sql_engine) == 2500
+        assert conn.execute.call_count == 3  # 1000-row chunks
+        assert conn.commit.call_count == 1
+        statement, params = conn.execute.call_args_list[0].args
+        assert "ON DUPLICATE KEY UPDATE" in str(statement)
+        assert params["truck_id_1"] == "T1" and params["trend_direction_1"] == "UP"
+        assert engine.get_stats()["dirty"] == 0
+
+        engine.update("T7", "oil", 1.0, 0.0)
+        assert engine.persist(sql_engine) == 1
+
+    def test_failed_flush_keeps_keys_dirty(self):
+        engine = TrendEngine()
+        engine.update("T1", "oil", 1.0, 0.0)
+        sql_engine, conn = self._engine()
+        conn.execute.side_effect = RuntimeError("db down")
+        assert engine.persist(sql_engine) == 0
+        assert engine.get_stats()["dirty"] == 1
+
+    def test_load_restores_state(self):
+        rows = [("T1", "oil", 42.0, 1.5, 3.0, -1.0, 40.0, 2.0, 9, "DOWN", -4.0)]
+        engine = TrendEngine()
+        assert engine.load(self._engine(rows)[0]) == 1
+
+        state = engine.snapshot("T1", "oil")
+        assert state["ewma_value"] == 42.0 and state["trend_direction"] == "DOWN"
+        update = engine.update("T1", "oil", 52.0, 40.0)
+        assert update.ewma[0] == pytest.approx(0.3 * 52 + 0.7 * 42)
+        assert update.cusum_high[0] == pytest.approx(15.0)
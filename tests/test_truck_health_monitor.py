@@ -338,6 +338,53 @@ class TestNelsonRulesChecker:
         result = NelsonRulesChecker.check_rule_7(values, mean, std)
         assert result is False
 
+    def test_rule_3_detects_monotonic_increase(self):
+        """Rule 3: 6 points steadily increasing should be detected"""
+        values = [100, 101, 102, 103, 104, 105]
+
+        assert NelsonRulesChecker.check_rule_3(values) is True
+
+    def test_rule_3_flat_step_breaks_run(self):
+        """Rule 3: An unchanged reading breaks the run"""
+        values = [100, 101, 102, 102, 104, 105]
+
+        assert NelsonRulesChecker.check_rule_3(values) is False
+
+    def test_rule_4_detects_oscillation(self):
+        """Rule 4: 14 points alternating up/down should be detected"""
+        values = [100 + (5 if i % 2 else -5) for i in range(14)]
+
+        assert NelsonRulesChecker.check_rule_4(values) is True
+        assert NelsonRulesChecker.check_rule_4(values[:13]) is False
+
+    def test_rule_6_detects_drift(self):
+        """Rule 6: 4 of 5 points > 1σ on the same side should be detected"""
+        mean = 100
+        std = 10
+        values = [112, 100, 115, 111, 113]
+
+        assert NelsonRulesChecker.check_rule_6(values, mean, std) is True
+        assert NelsonRulesChecker.check_rule_6([112, 100, 85, 111, 113], mean, std) is False
+
+    def test_rule_8_detects_mixture(self):
+        """Rule 8: 8 points > 1σ on both sides should be detected"""
+        mean = 100
+        std = 10
+        values = [115, 85, 116, 84, 115, 86, 114, 85]
+
+        assert NelsonRulesChecker.check_rule_8(values, mean, std) is True
+        # All on one side is a shift, not a mixture
+        assert NelsonRulesChecker.check_rule_8([115] * 8, mean, std) is False
+
+    def test_check_all_rules_reports_all_eight(self):
+        """check_all_rules covers rules 3, 4, 6 and 8"""
+        violations = NelsonRulesChecker.check_all_rules(
+            [100 + (15 if i % 2 else -15) for i in range(14)], 100, 10
+        )
+
+        assert NelsonRule.RULE_4_OSCILLATION in violations
+        assert NelsonRule.RULE_8_MIXTURE in violations
+
     def test_check_all_rules_empty(self):
         """Test check_all_rules with empty values"""
         violations = NelsonRulesChecker.check_all_rules([], 100, 10)
@@ -0,0 +1,69 @@
+"""
+Tests for Wialon 2ABC Integration v5.12.5
+
+Tests cover:
+- Per-minute resampling of the LSTM consumption history
+- Eviction of stale trucks and minutes outside the model window
+"""
+
+import time
+from unittest.mock import MagicMock
+
+from wialon_sync_2abc_integration import Wialon2ABCIntegration
+
+
+def _integration():
+    integration = Wialon2ABCIntegration.__new__(Wialon2ABCIntegration)
+    integration.lstm_predictor = MagicMock(sequence_length=60)
+    integration._consumption_history = {}
+    integration._pending_minute = {}
+    integration.last_predictions = {}
+    return integration
+
+
+def _feed(integration, truck_id, start, seconds, lph=37.8541):
+    for t in range(0, seconds, 30):
+        integration.record_consumption(
+            truck_id, {"fuel_rate": lph, "timestamp": start + t}
+        )
+
+
+class TestConsumptionHistory:
+    def test_thirty_second_samples_become_one_point_per_minute(self):
+        integration = _integration()
+        now = time.time()
+        start = now - now % 60 - 60 * 60
+        _feed(integration, "T1", start, 60 * 60)
+
+        recent = integration._recent_consumption(now=start + 60 * 60)
+        # 60 minutes fed; the last one is still open
+        assert len(recent["T1"]) == 59
+        assert recent["T1"][0] == 10.0
+
+    def test_minute_average(self):
+        integration = _integration()
+        integration.record_consumption("T1", {"fuel_rate": 37.8541, "timestamp": 600.0})
+        integration.record_consumption("T1", {"fuel_rate": 113.5623, "timestamp": 630.0})
+        integration.record_consumption("T1", {"fuel_rate": 0.0, "timestamp": 660.0})
+
+        assert list(integration._consumption_history["T1"]) == [(600.0, 20.0)]
+
+    def test_stale_trucks_are_evicted(self):
+        integration = _integration()
+        _feed(integration, "OLD", 0.0, 600)
+        _feed(integration, "LIVE", 10_000.0, 600)
+
+        recent = integration._recent_consumption(now=10_600.0)
+        assert set(recent) == {"LIVE"}
+        assert "OLD" not in integration._consumption_history
+        assert "OLD" not in integration._pending_minute
+
+    def test_minutes_outside_window_are_dropped(self):
+        integration = _integration()
+        _feed(integration, "T1", 0.0, 30 * 60)
+        _feed(integration, "T1", 60 * 60.0, 30 * 60)  # back after a 30 min gap
+
+        integration._recent_consumption(now=100 * 60.0)
+        minutes = [m for m, _ in integration._consumption_history["T1"]]
+        assert minutes[0] >= 40 * 60
+        assert len(minutes) == 29
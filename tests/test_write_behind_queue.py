@@ -0,0 +1,207 @@
+"""
+Tests for Write-Behind Queue v5.12.12
+
+Tests cover:
+- Multi-row INSERT / UPSERT statements per table
+- Flush on size and on interval from the background thread
+- Bounded buffer: drop vs. wait for room (backpressure), retry on failure
+- Data errors: bad rows isolated and dead-lettered, the rest written
+- FleetCommandCenter persistence routed through the queue
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import DataError
+
+from fleet_command_center import FleetCommandCenter, TruckRiskScore
+from write_behind_queue import COMMAND_CENTER_TABLES, WriteBehindQueue
+
+
+class FakeEngine:
+    """Records executed statements; optionally slow or failing"""
+
+    def __init__(self, delay=0.0, fail=False, bad=()):
+        self.delay = delay
+        self.fail = fail
+        self.bad = set(bad)  # truck_ids MySQL rejects (DataError)
+        self.statements = []
+        self.commits = 0
+        self.lock = threading.Lock()
+
+    def connect(self):
+        engine = self
+        conn = MagicMock()
+
+        def execute(statement, params):
+            if engine.fail:
+                raise RuntimeError("db down")
+            if engine.bad & {v for k, v in params.items() if k.startswith("truck_id_")}:
+                raise DataError("INSERT", params, Exception("Data too long"))
+            time.sleep(engine.delay)
+            with engine.lock:
+                engine.statements.append((str(statement), params))
+
+        def commit():
+            engine.commits += 1
+
+        conn.execute.side_effect = execute
+        conn.commit.side_effect = commit
+        conn.__enter__ = MagicMock(return_value=conn)
+        conn.__exit__ = MagicMock(return_value=False)
+        return conn
+
+    def rows(self, table):
+        return sum(
+            sum(1 for k in params if k.startswith("truck_id_"))
+            for sql, params in self.statements
+            if f"INSERT INTO {table} " in sql
+        )
+
+
+def _anomaly(i):
+    return {"truck_id": f"T{i}", "sensor_name": "oil", "anomaly_type": "CUSUM",
+            "severity": "HIGH", "sensor_value": float(i)}
+
+
+class TestStatements:
+    def test_multi_row_insert_and_upsert(self):
+        engine = FakeEngine()
+        queue = WriteBehindQueue(engine_fn=lambda: engine, batch_rows=100)
+        queue.submit_many("cc_anomaly_history", [_anomaly(i) for i in range(250)])
+        queue.submit("cc_algorithm_state", {"truck_id": "T1", "sensor_name": "oil"})
+
+        assert queue.flush() == 251
+        assert engine.rows("cc_anomaly_history") == 250
+        assert len(engine.statements) == 4  # 100 + 100 + 50, one upsert
+        sql, params = engine.statements[0]
+        assert sql.count("NOW()") == 100 and params["truck_id_99"] == "T99"
+        upsert = engine.statements[-1][0]
+        assert "ON DUPLICATE KEY UPDATE" in upsert and "truck_id = VALUES" not in upsert
+        assert len(queue) == 0
+
+    def test_specs_match_command_center_tables(self):
+        assert set(COMMAND_CENTER_TABLES) == {
+            "cc_risk_history",
+            "cc_anomaly_history",
+            "cc_correlation_events",
+            "cc_def_history",
+            "cc_algorithm_state",
+        }
+        with pytest.raises(ValueError):
+            WriteBehindQueue().submit("users", {})
+
+
+class TestFlusher:
+    def test_flush_on_size_and_interval(self):
+        engine = FakeEngine()
+        queue = WriteBehindQueue(
+            engine_fn=lambda: engine, batch_rows=50, flush_interval_seconds=0.3
+        )
+        queue.start()
+        try:
+            queue.submit_many("cc_anomaly_history", [_anomaly(i) for i in range(50)])
+            deadline = time.time() + 0.2
+            while engine.rows("cc_anomaly_history") < 50 and time.time() < deadline:
+                time.sleep(0.01)
+            assert engine.rows("cc_anomaly_history") == 50  # size, before the interval
+
+            queue.submit("cc_anomaly_history", _anomaly(99))
+            time.sleep(0.5)
+            assert engine.rows("cc_anomaly_history") == 51  # interval
+        finally:
+            queue.stop()
+        assert not queue.get_stats()["running"]
+
+    def test_failed_batch_is_retried(self):
+        engine = FakeEngine(fail=True)
+        queue = WriteBehindQueue(engine_fn=lambda: engine)
+        queue.submit_many("cc_anomaly_history", [_anomaly(i) for i in range(3)])
+        assert queue.flush() == 0
+        assert len(queue) == 3 and queue.get_stats()["errors"] == 1
+
+        engine.fail = False
+        assert queue.flush() == 3
+
+
+    def test_bad_rows_are_dead_lettered(self):
+        engine = FakeEngine(bad={"T3", "T40"})
+        queue = WriteBehindQueue(engine_fn=lambda: engine, batch_rows=100)
+        queue.submit_many("cc_anomaly_history", [_anomaly(i) for i in range(50)])
+
+        assert queue.flush() == 48
+        assert engine.rows("cc_anomaly_history") == 48
+        assert len(queue) == 0
+        stats = queue.get_stats()
+        assert stats["dead_lettered"] == 2 and stats["errors"] == 1
+        assert queue.flush() == 0  # nothing left to retry
+
+    def test_outage_while_isolating_requeues_the_rest(self):
+        engine = FakeEngine(bad={"T0"})
+        queue = WriteBehindQueue(engine_fn=lambda: engine, batch_rows=100)
+        queue.submit_many("cc_anomaly_history", [_anomaly(i) for i in range(8)])
+
+        calls = {"n": 0}
+        write = queue._write
+
+        def flaky_write(*args):
+            calls["n"] += 1
+            if calls["n"] == 3:  # whole batch, first half, then the DB goes away
+                engine.fail = True
+            return write(*args)
+
+        queue._write = flaky_write
+        assert queue.flush() == 0
+        assert len(queue) == 8 and queue.get_stats()["dead_lettered"] == 0
+
+
+class TestBackpressure:
+    def test_full_buffer_drops_without_waiting(self):
+        queue = WriteBehindQueue(engine_fn=FakeEngine, max_rows=10)
+        started = time.perf_counter()
+        accepted = queue.submit_many("cc_anomaly_history", [_anomaly(i) for i in range(15)])
+        assert time.perf_counter() - started < 0.05
+        assert accepted == 10 and queue.get_stats()["dropped"] == 5
+
+    def test_blocking_producer_waits_for_flusher(self):
+        engine = FakeEngine(delay=0.05)
+        queue = WriteBehindQueue(
+            engine_fn=lambda: engine, max_rows=10, batch_rows=10, flush_interval_seconds=60
+        )
+        queue.start()
+        try:
+            accepted = queue.submit_many(
+                "cc_anomaly_history", [_anomaly(i) for i in range(25)], block_seconds=5
+            )
+        finally:
+            queue.stop()
+        assert accepted == 25
+        assert engine.rows("cc_anomaly_history") == 25
+        assert queue.get_stats()["blocked"] >= 1 and queue.get_stats()["dropped"] == 0
+
+
+class TestCommandCenter:
+    def test_persistence_goes_through_queue(self, monkeypatch):
+        def no_db():
+            raise AssertionError("request path must not touch MySQL")
+
+        monkeypatch.setattr("database_mysql.get_sqlalchemy_engine", no_db)
+        engine = FakeEngine()
+        cc = FleetCommandCenter()
+        cc.write_behind = WriteBehindQueue(engine_fn=lambda: engine)
+
+        risk = TruckRiskScore(truck_id="T1", risk_score=80.0, risk_level="high")
+        assert cc.batch_persist_risk_scores([risk, risk]) == 2
+        assert cc.persist_anomaly("T1", "oil", "cusum", "high", 1.0)
+        assert cc.persist_correlation_event("T1", "overheat", "d", 0.9, ["a"], {"a": 1.0})
+        assert cc.persist_def_reading("T1", 12.5)
+        cc._detect_trend_with_ewma_cusum("T1", "oil", [100.0, 140.0], 100.0)
+        assert cc.persist_trend_state() == 1
+
+        cc.write_behind.flush()
+        for table in COMMAND_CENTER_TABLES:
+            assert engine.rows(table) >= 1, table
+        risk_params = next(p for s, p in engine.statements if "cc_risk_history" in s)
+        assert risk_params["risk_level_0"] == "HIGH"
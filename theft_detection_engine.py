@@ -41,6 +41,8 @@ import pymysql
 import yaml
 from sqlalchemy import text
 
+from fuel_event_extractor import FuelColumns, extract_fuel_drops
+
 # Import database engine for persistence
 try:
     from database_pool import get_local_engine
@@ -1396,8 +1398,66 @@ def _get_drops_from_wialon(
     return drops
 
 
+def _process_local_rows(results) -> List[FuelDrop]:
+    """
+    🆕 v4.3.0: Columnar drop extraction over raw fuel_metrics rows.
+
+    Rows are (truck_id, timestamp_utc, estimated_pct, estimated_gallons,
+    sensor_pct, sensor_gallons, truck_status, odometer_mi) ordered by
+    truck_id, timestamp_utc. The previous-row values that the old query got
+    from LAG() are computed with NumPy shifts, and all thresholds are applied
+    as vectorized masks - same results as _process_local_results.
+    """
+    if not results:
+        return []
+
+    cols = FuelColumns.from_rows(
+        results,
+        truck_idx=0,
+        timestamp_idx=1,
+        pct_idx=2,
+        gal_idx=3,
+        odometer_idx=7,
+        status_idx=6,
+    )
+    found = extract_fuel_drops(
+        cols,
+        min_drop_pct=CONFIG.min_drop_pct,
+        min_drop_gal=CONFIG.min_drop_gallons,
+        max_gap_hours=CONFIG.max_time_window_hours,
+    )
+
+    drops = []
+    for j, i in enumerate(found["index"]):
+        drops.append(
+            FuelDrop(
+                truck_id=results[i][0],
+                timestamp=results[i][1],
+                fuel_before_pct=float(found["prev_pct"][j]),
+                fuel_after_pct=float(found["curr_pct"][j]),
+                fuel_before_gal=float(found["prev_gal"][j]),
+                fuel_after_gal=float(found["curr_gal"][j]),
+                drop_pct=float(found["drop_pct"][j]),
+                drop_gal=float(found["drop_gal"][j]),
+                time_gap_minutes=float(found["gap_minutes"][j]),
+                odometer_before=float(found["prev_odometer"][j]),
+                odometer_after=float(found["odometer"][j]),
+                miles_driven=float(found["miles_driven"][j]),
+                prev_status=results[i - 1][6],
+                curr_status=results[i][6],
+            )
+        )
+
+    return drops
+
+
 def _process_local_results(results, unit_mapping: Dict[str, int]) -> List[FuelDrop]:
-    """Process results from local fuel_copilot database into FuelDrop objects."""
+    """
+    Process LAG()-windowed rows from local fuel_copilot database into FuelDrop objects.
+
+    Row-by-row reference implementation; analyze_fuel_drops_advanced now uses
+    the columnar _process_local_rows.
+    """
     drops = []
 
     for row in results:
@@ -1507,12 +1567,7 @@ def analyze_fuel_drops_advanced(days_back: int = 7) -> Dict[str, Any]:
                     sensor_pct,
                     sensor_gallons,
                     truck_status,
-                    odometer_mi,
-                    LAG(estimated_pct) OVER (PARTITION BY truck_id ORDER BY timestamp_utc) as prev_pct,
-                    LAG(estimated_gallons) OVER (PARTITION BY truck_id ORDER BY timestamp_utc) as prev_gal,
-                    LAG(timestamp_utc) OVER (PARTITION BY truck_id ORDER BY timestamp_utc) as prev_ts,
-                    LAG(odometer_mi) OVER (PARTITION BY truck_id ORDER BY timestamp_utc) as prev_odo,
-                    LAG(truck_status) OVER (PARTITION BY truck_id ORDER BY timestamp_utc) as prev_status
+                    odometer_mi
                 FROM fuel_metrics
                 WHERE timestamp_utc > NOW() - INTERVAL :days_back DAY
                   AND estimated_gallons IS NOT NULL
@@ -1525,7 +1580,8 @@ def analyze_fuel_drops_advanced(days_back: int = 7) -> Dict[str, Any]:
                 local_results = conn.execute(query, {"days_back": days_back}).fetchall()
 
             if local_results:
-                fuel_drops = _process_local_results(local_results, unit_mapping)
+                # 🆕 v4.3.0: LAG + thresholds computed columnar (NumPy) in one pass
+                fuel_drops = _process_local_rows(local_results)
                 logger.info(
                     f"📊 Found {len(fuel_drops)} significant drops from local DB"
                 )
@@ -113,10 +113,12 @@ class TheftDetectionML:
         """Load pre-trained model if available"""
         if THEFT_MODEL_PATH.exists() and SCALER_PATH.exists():
             try:
-                with open(THEFT_MODEL_PATH, 'rb') as f:
-                    self.model = pickle.load(f)
-                with open(SCALER_PATH, 'rb') as f:
-                    self.scaler = pickle.load(f)
+                # 🆕 v5.12.7: Shared, memory-mapped copies kept current by model_registry
+                from model_registry import get_model_registry
+
+                registry = get_model_registry()
+                self.model = registry.load(THEFT_MODEL_PATH, on_swap=self._set_model)
+                self.scaler = registry.load(SCALER_PATH, on_swap=self._set_scaler)
                 self.is_trained = True
                 logger.info("✅ Loaded pre-trained theft detection model")
             except Exception as e:
@@ -124,6 +126,12 @@ class TheftDetectionML:
                 self.model = None
                 self.scaler = None
     
+    def _set_model(self, model):
+        self.model = model
+
+    def _set_scaler(self, scaler):
+        self.scaler = scaler
+
     def _save_model(self):
         """Save trained model to disk"""
         try:
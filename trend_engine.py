@@ -0,0 +1,510 @@
+"""
+Trend Engine - Array-backed EWMA/CUSUM state for the Command Center
+═══════════════════════════════════════════════════════════════════
+
+Holds the EWMA/CUSUM state of every (truck, sensor) key in contiguous NumPy
+arrays indexed by a key table. A whole batch of readings is folded into the
+state with a handful of vector operations, so a fleet-wide cycle (10k+ keys)
+costs milliseconds instead of a Python loop per reading, and the state is
+written back to cc_algorithm_state with one multi-row upsert.
+
+Semantics are the same as the scalar FleetCommandCenter helpers:
+    EWMA_t  = α * X_t + (1 - α) * EWMA_{t-1}       (first reading seeds EWMA)
+    S⁺_t    = max(0, S⁺_{t-1} + (X_t - target))
+    S⁻_t    = min(0, S⁻_{t-1} + (X_t - target))
+    alert   = S⁺ > h or |S⁻| > h
+
+Readings for the same key inside one batch are applied in order: the batch
+is split into "rounds" by occurrence rank (1st reading of every key, then
+2nd, ...), and each round is one vectorized update.
+
+Author: Fuel Copilot Team
+Version: 5.12.10
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALPHA = 0.3
+DEFAULT_CUSUM_THRESHOLD = 5.0
+
+# cc_algorithm_state.trend_direction is ENUM('UP', 'DOWN', 'STABLE')
+TREND_STABLE = 0
+TREND_UP = 1
+TREND_DOWN = -1
+_TREND_NAMES = {TREND_UP: "UP", TREND_DOWN: "DOWN", TREND_STABLE: "STABLE"}
+_TREND_CODES = {
+    "UP": TREND_UP,
+    "INCREASING": TREND_UP,
+    "DOWN": TREND_DOWN,
+    "DECREASING": TREND_DOWN,
+}
+
+# Rows per INSERT statement (keeps packets well under max_allowed_packet)
+PERSIST_CHUNK_ROWS = 1000
+
+STATE_COLUMNS = (
+    "truck_id",
+    "sensor_name",
+    "ewma_value",
+    "ewma_variance",
+    "cusum_high",
+    "cusum_low",
+    "baseline_mean",
+    "baseline_std",
+    "samples_count",
+    "trend_direction",
+    "trend_slope",
+)
+
+
+@dataclass
+class TrendUpdate:
+    """Per-reading results of a batch update (aligned with the input order)"""
+
+    index: np.ndarray
+    ewma: np.ndarray
+    cusum_high: np.ndarray
+    cusum_low: np.ndarray
+    alert: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def _round_ranks(idx: np.ndarray) -> np.ndarray:
+    """Occurrence rank of every element among equal keys (0 for the first)"""
+    if len(idx) == 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.argsort(idx, kind="stable")
+    sorted_idx = idx[order]
+    starts = np.flatnonzero(np.r_[True, sorted_idx[1:] != sorted_idx[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, len(idx)]))
+    ranks = np.empty(len(idx), dtype=np.int64)
+    ranks[order] = np.arange(len(idx)) - group_start
+    return ranks
+
+
+class TrendEngine:
+    """
+    EWMA/CUSUM state for all (truck, sensor) keys in contiguous arrays.
+
+    Thread-safe: the command center may be driven from several request
+    threads while the flush runs.
+    """
+
+    def __init__(self, capacity: int = 1024, flush_interval_seconds: float = 30.0):
+        self.flush_interval_seconds = flush_interval_seconds
+        self._lock = threading.RLock()
+        self._index: Dict[Tuple[str, str], int] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._capacity = 0
+        self._allocate(max(capacity, 16))
+        self._last_flush = time.time()
+        self._stats = {
+            "updates": 0,
+            "readings": 0,
+            "update_ms_total": 0.0,
+            "last_update_ms": 0.0,
+            "flushes": 0,
+            "rows_persisted": 0,
+            "last_flush_ms": 0.0,
+            "flush_errors": 0,
+            "rows_loaded": 0,
+        }
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # KEY TABLE / STORAGE
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def _allocate(self, capacity: int) -> None:
+        def grow(name: str, dtype, fill) -> None:
+            new = np.full(capacity, fill, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                new[: len(old)] = old
+            setattr(self, name, new)
+
+        grow("ewma", np.float64, 0.0)
+        grow("ewma_var", np.float64, 0.0)
+        grow("ewma_count", np.int64, 0)
+        grow("cusum_high", np.float64, 0.0)
+        grow("cusum_low", np.float64, 0.0)
+        grow("baseline_mean", np.float64, np.nan)
+        grow("baseline_std", np.float64, np.nan)
+        grow("samples", np.int64, 0)
+        grow("trend", np.int8, TREND_STABLE)
+        grow("trend_slope", np.float64, np.nan)
+        grow("dirty", np.bool_, False)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._index
+
+    def _intern(self, truck_id: str, sensor_name: str) -> int:
+        key = (truck_id, sensor_name)
+        i = self._index.get(key)
+        if i is None:
+            i = len(self._keys)
+            if i >= self._capacity:
+                self._allocate(self._capacity * 2)
+            self._index[key] = i
+            self._keys.append(key)
+        return i
+
+    def indices(
+        self,
+        truck_ids: Union[str, Sequence[str]],
+        sensor_names: Union[str, Sequence[str]],
+        n: Optional[int] = None,
+    ) -> np.ndarray:
+        """Row indices for the given keys, registering unseen ones"""
+        with self._lock:
+            if isinstance(truck_ids, str) and isinstance(sensor_names, str):
+                i = self._intern(truck_ids, sensor_names)
+                return np.full(1 if n is None else n, i, dtype=np.int64)
+            if isinstance(truck_ids, str):
+                truck_ids = [truck_ids] * len(sensor_names)
+            elif isinstance(sensor_names, str):
+                sensor_names = [sensor_names] * len(truck_ids)
+            index = self._index
+            return np.fromiter(
+                (
+                    index[k] if k in index else self._intern(*k)
+                    for k in zip(truck_ids, sensor_names)
+                ),
+                dtype=np.int64,
+                count=len(truck_ids),
+            )
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # BATCH UPDATE
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def update(
+        self,
+        truck_ids: Union[str, Sequence[str]],
+        sensor_names: Union[str, Sequence[str]],
+        values: Union[float, Sequence[float], np.ndarray],
+        targets: Union[None, float, Sequence[float], np.ndarray] = None,
+        alpha: float = DEFAULT_ALPHA,
+        threshold: Union[float, np.ndarray] = DEFAULT_CUSUM_THRESHOLD,
+        ewma: bool = True,
+        cusum: bool = True,
+    ) -> TrendUpdate:
+        """
+        Fold a batch of readings into the state.
+
+        Args:
+            truck_ids: One truck ID per reading (or a single ID for all)
+            sensor_names: One sensor per reading (or a single sensor for all)
+            values: Reading values
+            targets: CUSUM target per reading (or scalar). Required if cusum.
+            alpha: EWMA smoothing factor
+            threshold: CUSUM alert threshold (scalar or per reading)
+            ewma: Update the EWMA state
+            cusum: Update the CUSUM state
+
+        Returns:
+            TrendUpdate with the state after each reading, in input order
+        """
+        started = time.perf_counter()
+        x = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        n = len(x)
+        with self._lock:
+            idx = self.indices(truck_ids, sensor_names, n)
+            if cusum:
+                if targets is None:
+                    raise ValueError("CUSUM update requires targets")
+                target = np.broadcast_to(np.asarray(targets, dtype=np.float64), (n,))
+                h = np.broadcast_to(np.asarray(threshold, dtype=np.float64), (n,))
+
+            out_ewma = np.full(n, np.nan)
+            out_high = np.zeros(n)
+            out_low = np.zeros(n)
+            out_alert = np.zeros(n, dtype=bool)
+
+            ranks = _round_ranks(idx)
+            rounds = int(ranks.max()) + 1 if n else 0
+            for r in range(rounds):
+                sel = np.flatnonzero(ranks == r) if rounds > 1 else np.arange(n)
+                k = idx[sel]
+                v = x[sel]
+
+                if ewma:
+                    prev = self.ewma[k]
+                    fresh = self.ewma_count[k] == 0
+                    new = np.where(fresh, v, alpha * v + (1 - alpha) * prev)
+                    diff = v - prev
+                    self.ewma_var[k] = np.where(
+                        fresh, 0.0, (1 - alpha) * (self.ewma_var[k] + alpha * diff * diff)
+                    )
+                    self.ewma[k] = new
+                    self.ewma_count[k] += 1
+                    out_ewma[sel] = new
+
+                if cusum:
+                    deviation = v - target[sel]
+                    high = np.maximum(0.0, self.cusum_high[k] + deviation)
+                    low = np.minimum(0.0, self.cusum_low[k] + deviation)
+                    self.cusum_high[k] = high
+                    self.cusum_low[k] = low
+                    out_high[sel] = high
+                    out_low[sel] = low
+                    out_alert[sel] = (high > h[sel]) | (np.abs(low) > h[sel])
+                else:
+                    out_high[sel] = self.cusum_high[k]
+                    out_low[sel] = self.cusum_low[k]
+
+            if n:
+                self.dirty[idx] = True
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats["updates"] += 1
+            self._stats["readings"] += n
+            self._stats["update_ms_total"] += elapsed_ms
+            self._stats["last_update_ms"] = elapsed_ms
+
+        return TrendUpdate(idx, out_ewma, out_high, out_low, out_alert)
+
+    def mark_trend(
+        self,
+        index: Union[int, np.ndarray],
+        baseline_mean: Union[None, float, np.ndarray] = None,
+        baseline_std: Union[None, float, np.ndarray] = None,
+        samples: Union[int, np.ndarray] = 0,
+        direction: Union[int, np.ndarray] = TREND_STABLE,
+        slope: Union[None, float, np.ndarray] = None,
+    ) -> None:
+        """Record the trend summary persisted alongside the EWMA/CUSUM state"""
+
+        def as_float(v):
+            return np.nan if v is None else v
+
+        with self._lock:
+            self.baseline_mean[index] = as_float(baseline_mean)
+            self.baseline_std[index] = as_float(baseline_std)
+            self.samples[index] = samples
+            self.trend[index] = direction
+            self.trend_slope[index] = as_float(slope)
+            self.dirty[index] = True
+
+    def snapshot(self, truck_id: str, sensor_name: str) -> Optional[Dict[str, Any]]:
+        """Current state of one key (None if never seen)"""
+        with self._lock:
+            i = self._index.get((truck_id, sensor_name))
+            if i is None:
+                return None
+            return self._row(i)
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        def opt(v: float) -> Optional[float]:
+            return None if np.isnan(v) else float(v)
+
+        truck_id, sensor_name = self._keys[i]
+        has_ewma = self.ewma_count[i] > 0
+        return {
+            "truck_id": truck_id,
+            "sensor_name": sensor_name,
+            "ewma_value": float(self.ewma[i]) if has_ewma else None,
+            "ewma_variance": float(self.ewma_var[i]) if has_ewma else None,
+            "cusum_high": float(self.cusum_high[i]),
+            "cusum_low": float(self.cusum_low[i]),
+            "baseline_mean": opt(self.baseline_mean[i]),
+            "baseline_std": opt(self.baseline_std[i]),
+            "samples_count": int(self.samples[i]),
+            "trend_direction": _TREND_NAMES[int(self.trend[i])],
+            "trend_slope": opt(self.trend_slope[i]),
+        }
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # PERSISTENCE (cc_algorithm_state)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def dirty_rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._row(int(i)) for i in np.flatnonzero(self.dirty[: len(self._keys)])]
+
+    def take_dirty_rows(self) -> List[Dict[str, Any]]:
+        """Dirty rows for an external writer (e.g. write-behind queue); clears the flags"""
+        with self._lock:
+            dirty_idx = np.flatnonzero(self.dirty[: len(self._keys)])
+            rows = [self._row(int(i)) for i in dirty_idx]
+            self.dirty[dirty_idx] = False
+            self._last_flush = time.time()
+            return rows
+
+    def flush_due(self) -> bool:
+        return time.time() - self._last_flush >= self.flush_interval_seconds
+
+    @staticmethod
+    def _upsert_sql(n_rows: int) -> str:
+        placeholders = ", ".join(
+            "("
+            + ", ".join(f":{c}_{r}" for c in STATE_COLUMNS)
+            + ", NOW())"
+            for r in range(n_rows)
+        )
+        updates = ",\n                ".join(
+            f"{c} = VALUES({c})" for c in STATE_COLUMNS[2:]
+        )
+        return f"""
+            INSERT INTO cc_algorithm_state (
+                {", ".join(STATE_COLUMNS)}, updated_at
+            ) VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE
+                {updates},
+                updated_at = NOW()
+        """
+
+    def persist(self, engine: Any = None, chunk_rows: int = PERSIST_CHUNK_ROWS) -> int:
+        """
+        Write every dirty key to cc_algorithm_state in one transaction.
+
+        One multi-row INSERT ... ON DUPLICATE KEY UPDATE per chunk of
+        `chunk_rows` keys. Dirty flags are cleared only after the commit.
+
+        Returns:
+            Number of rows upserted (0 on error or nothing to write)
+        """
+        with self._lock:
+            dirty_idx = np.flatnonzero(self.dirty[: len(self._keys)])
+            rows = [self._row(int(i)) for i in dirty_idx]
+            self._last_flush = time.time()
+        if not rows:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            from sqlalchemy import text
+
+            if engine is None:
+                from database_mysql import get_sqlalchemy_engine
+
+                engine = get_sqlalchemy_engine()
+
+            with engine.connect() as conn:
+                for start in range(0, len(rows), chunk_rows):
+                    chunk = rows[start : start + chunk_rows]
+                    params = {
+                        f"{c}_{r}": row[c]
+                        for r, row in enumerate(chunk)
+                        for c in STATE_COLUMNS
+                    }
+                    conn.execute(text(self._upsert_sql(len(chunk))), params)
+                conn.commit()
+        except ImportError:
+            logger.debug("📝 database_mysql not available - skipping trend state flush")
+            return 0
+        except Exception as e:
+            self._stats["flush_errors"] += 1
+            logger.warning(f"⚠️ Could not persist trend state: {e}")
+            return 0
+
+        with self._lock:
+            # Keys updated while we were writing stay dirty for the next flush
+            self.dirty[dirty_idx] = False
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats["flushes"] += 1
+            self._stats["rows_persisted"] += len(rows)
+            self._stats["last_flush_ms"] = elapsed_ms
+        logger.debug(f"💾 Trend state: {len(rows)} keys upserted in {elapsed_ms:.1f}ms")
+        return len(rows)
+
+    def persist_if_due(self, engine: Any = None) -> int:
+        """Flush dirty keys when the flush interval has elapsed"""
+        if not self.flush_due():
+            return 0
+        return self.persist(engine)
+
+    def load(self, engine: Any = None, truck_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Restore state for all keys (or the given trucks) with one SELECT.
+
+        Returns:
+            Number of keys loaded
+        """
+        try:
+            from sqlalchemy import text
+
+            if engine is None:
+                from database_mysql import get_sqlalchemy_engine
+
+                engine = get_sqlalchemy_engine()
+
+            sql = f"SELECT {', '.join(STATE_COLUMNS)} FROM cc_algorithm_state"
+            params: Dict[str, Any] = {}
+            if truck_ids is not None:
+                truck_ids = list(truck_ids)
+                if not truck_ids:
+                    return 0
+                names = [f"t{i}" for i in range(len(truck_ids))]
+                sql += f" WHERE truck_id IN ({', '.join(':' + n for n in names)})"
+                params = dict(zip(names, truck_ids))
+
+            with engine.connect() as conn:
+                rows = conn.execute(text(sql), params).fetchall()
+        except ImportError:
+            logger.debug("📝 database_mysql not available - skipping trend state load")
+            return 0
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load trend state: {e}")
+            return 0
+
+        def num(v, default=np.nan) -> float:
+            return default if v is None else float(v)
+
+        with self._lock:
+            for row in rows:
+                i = self._intern(str(row[0]), str(row[1]))
+                if row[2] is not None:
+                    self.ewma[i] = float(row[2])
+                    self.ewma_var[i] = num(row[3], 0.0)
+                    self.ewma_count[i] = max(int(row[8] or 0), 1)
+                self.cusum_high[i] = num(row[4], 0.0)
+                self.cusum_low[i] = num(row[5], 0.0)
+                self.baseline_mean[i] = num(row[6])
+                self.baseline_std[i] = num(row[7])
+                self.samples[i] = int(row[8] or 0)
+                self.trend[i] = _TREND_CODES.get(str(row[9] or "").upper(), TREND_STABLE)
+                self.trend_slope[i] = num(row[10])
+                self.dirty[i] = False
+            self._stats["rows_loaded"] += len(rows)
+        logger.info(f"📂 Trend state: restored {len(rows)} keys from cc_algorithm_state")
+        return len(rows)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._index.clear()
+            self._keys.clear()
+            for name in (
+                "ewma", "ewma_var", "ewma_count", "cusum_high", "cusum_low",
+                "baseline_mean", "baseline_std", "samples", "trend",
+                "trend_slope", "dirty",
+            ):
+                delattr(self, name)
+            self._allocate(self._capacity)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            updates = self._stats["updates"]
+            return {
+                "keys": len(self._keys),
+                "capacity": self._capacity,
+                "dirty": int(self.dirty[: len(self._keys)].sum()),
+                **self._stats,
+                "avg_update_ms": (
+                    round(self._stats["update_ms_total"] / updates, 3) if updates else 0.0
+                ),
+            }
+
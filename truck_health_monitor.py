@@ -25,8 +25,15 @@ Uses Shewhart/Nelson rules to detect sensor anomalies and predict maintenance ne
 🔍 NELSON RULES IMPLEMENTED:
 - Rule 1: Point > 3σ from mean (outlier)
 - Rule 2: 9+ consecutive points on same side of mean (shift)
+- Rule 3: 6+ consecutive points steadily increasing or decreasing (trend)
+- Rule 4: 14+ consecutive points alternating up and down (oscillation)
 - Rule 5: 2 of 3 consecutive points > 2σ from mean (trend)
+- Rule 6: 4 of 5 consecutive points > 1σ from mean (drift)
 - Rule 7: 15+ consecutive points within 1σ of mean (stratification - possible stuck sensor)
+- Rule 8: 8+ consecutive points > 1σ on both sides of mean (mixture)
+
+🆕 v5.12.14: Per-reading rule checks run on spc_engine.SPCEngine (ring buffers
+with incremental run-length counters, O(1) per reading).
 """
 
 import logging
@@ -50,6 +57,14 @@ except ImportError:
     np = None
     stats = None
 
+try:
+    from spc_engine import SPCEngine
+
+    SPC_ENGINE_AVAILABLE = True
+except ImportError:
+    SPC_ENGINE_AVAILABLE = False
+    SPCEngine = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,8 +96,25 @@ class NelsonRule(Enum):
 
     RULE_1_OUTLIER = "Rule 1: Point > 3σ (outlier)"
     RULE_2_SHIFT = "Rule 2: 9+ points same side of mean (shift)"
+    RULE_3_MONOTONIC = "Rule 3: 6+ points steadily increasing/decreasing (monotonic)"
+    RULE_4_OSCILLATION = "Rule 4: 14+ points alternating up/down (oscillation)"
     RULE_5_TREND = "Rule 5: 2 of 3 points > 2σ (trend)"
+    RULE_6_DRIFT = "Rule 6: 4 of 5 points > 1σ (drift)"
     RULE_7_STRATIFICATION = "Rule 7: 15+ points within 1σ (stuck sensor)"
+    RULE_8_MIXTURE = "Rule 8: 8+ points > 1σ on both sides (mixture)"
+
+
+# Nelson rule number -> NelsonRule (spc_engine reports rule numbers)
+NELSON_RULES_BY_NUMBER = {
+    1: NelsonRule.RULE_1_OUTLIER,
+    2: NelsonRule.RULE_2_SHIFT,
+    3: NelsonRule.RULE_3_MONOTONIC,
+    4: NelsonRule.RULE_4_OSCILLATION,
+    5: NelsonRule.RULE_5_TREND,
+    6: NelsonRule.RULE_6_DRIFT,
+    7: NelsonRule.RULE_7_STRATIFICATION,
+    8: NelsonRule.RULE_8_MIXTURE,
+}
 
 
 @dataclass
@@ -357,14 +389,30 @@ class NelsonRulesChecker:
         if NelsonRulesChecker.check_rule_2(values, mean):
             violations.append(NelsonRule.RULE_2_SHIFT)
 
+        # Rule 3: 6+ consecutive points steadily increasing or decreasing
+        if NelsonRulesChecker.check_rule_3(values):
+            violations.append(NelsonRule.RULE_3_MONOTONIC)
+
+        # Rule 4: 14+ consecutive points alternating up and down
+        if NelsonRulesChecker.check_rule_4(values):
+            violations.append(NelsonRule.RULE_4_OSCILLATION)
+
         # Rule 5: 2 of 3 consecutive points > 2σ from mean
         if NelsonRulesChecker.check_rule_5(values, mean, std):
             violations.append(NelsonRule.RULE_5_TREND)
 
+        # Rule 6: 4 of 5 consecutive points > 1σ from mean
+        if NelsonRulesChecker.check_rule_6(values, mean, std):
+            violations.append(NelsonRule.RULE_6_DRIFT)
+
         # Rule 7: 15+ consecutive points within 1σ (stratification)
         if NelsonRulesChecker.check_rule_7(values, mean, std):
             violations.append(NelsonRule.RULE_7_STRATIFICATION)
 
+        # Rule 8: 8+ consecutive points > 1σ on both sides (mixture)
+        if NelsonRulesChecker.check_rule_8(values, mean, std):
+            violations.append(NelsonRule.RULE_8_MIXTURE)
+
         return violations
 
     @staticmethod
@@ -401,6 +449,36 @@ class NelsonRulesChecker:
 
         return above_count == 9 or below_count == 9
 
+    @staticmethod
+    def check_rule_3(values: Sequence[Union[int, float]]) -> bool:
+        """
+        Rule 3: Six (or more) points in a row steadily increasing or decreasing.
+
+        Indicates: Trend - gradual degradation (e.g. rising coolant temp)
+        """
+        if len(values) < 6:
+            return False
+
+        last_6 = values[-6:]
+        diffs = [b - a for a, b in zip(last_6, last_6[1:])]
+        return all(d > 0 for d in diffs) or all(d < 0 for d in diffs)
+
+    @staticmethod
+    def check_rule_4(values: Sequence[Union[int, float]]) -> bool:
+        """
+        Rule 4: Fourteen (or more) points in a row alternate in direction.
+
+        Indicates: Oscillation - unstable regulation or a noisy connection
+        """
+        if len(values) < 14:
+            return False
+
+        last_14 = values[-14:]
+        diffs = [b - a for a, b in zip(last_14, last_14[1:])]
+        if any(d == 0 for d in diffs):
+            return False
+        return all((d1 > 0) != (d2 > 0) for d1, d2 in zip(diffs, diffs[1:]))
+
     @staticmethod
     def check_rule_5(
         values: Sequence[Union[int, float]], mean: float, std: float
@@ -423,6 +501,26 @@ class NelsonRulesChecker:
 
         return above_2sigma >= 2 or below_2sigma >= 2
 
+    @staticmethod
+    def check_rule_6(
+        values: Sequence[Union[int, float]], mean: float, std: float
+    ) -> bool:
+        """
+        Rule 6: Four of five consecutive points > 1σ from mean (same side).
+
+        Indicates: Small sustained shift, sensor drifting out of calibration
+        """
+        if len(values) < 5:
+            return False
+
+        last_5 = values[-5:]
+        z_scores = [calculate_z_score(v, mean, std) or 0 for v in last_5]
+
+        above_1sigma = sum(1 for z in z_scores if z > 1.0)
+        below_1sigma = sum(1 for z in z_scores if z < -1.0)
+
+        return above_1sigma >= 4 or below_1sigma >= 4
+
     @staticmethod
     def check_rule_7(
         values: Sequence[Union[int, float]], mean: float, std: float
@@ -443,6 +541,26 @@ class NelsonRulesChecker:
         # All points should be within 1σ
         return all(z < 1.0 for z in z_scores)
 
+    @staticmethod
+    def check_rule_8(
+        values: Sequence[Union[int, float]], mean: float, std: float
+    ) -> bool:
+        """
+        Rule 8: Eight points in a row > 1σ from mean, on both sides.
+
+        Indicates: Mixture - readings jumping between two regimes
+        (e.g. intermittent sensor or two sources reporting)
+        """
+        if len(values) < 8:
+            return False
+
+        last_8 = values[-8:]
+        z_scores = [calculate_z_score(v, mean, std) or 0 for v in last_8]
+
+        if not all(abs(z) > 1.0 for z in z_scores):
+            return False
+        return any(z > 0 for z in z_scores) and any(z < 0 for z in z_scores)
+
 
 # =============================================================================
 # Main Truck Health Monitor Class
@@ -489,6 +607,9 @@ class TruckHealthMonitor:
         # Alert history
         self._alert_history: List[HealthAlert] = []
 
+        # 🆕 v5.12.14: Incremental Nelson rules per (truck_id, sensor_key)
+        self._spc = SPCEngine() if SPC_ENGINE_AVAILABLE else None
+
         logger.info(
             f"🏥 TruckHealthMonitor initialized (scipy available: {SCIPY_AVAILABLE})"
         )
@@ -526,6 +647,9 @@ class TruckHealthMonitor:
         if truck_id not in self._sensor_cache:
             self._sensor_cache[truck_id] = {}
 
+        # Keep only last 30 days of data in memory
+        cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+
         # Process each sensor
         sensor_values = {
             SensorType.COOLANT_TEMP: coolant_temp,
@@ -555,15 +679,19 @@ class TruckHealthMonitor:
             if sensor_key not in self._sensor_cache[truck_id]:
                 self._sensor_cache[truck_id][sensor_key] = []
 
-            self._sensor_cache[truck_id][sensor_key].append((timestamp, value))
+            history = self._sensor_cache[truck_id][sensor_key]
+            if timestamp > cutoff:
+                history.append((timestamp, value))
+                if self._spc is not None:
+                    self._spc.observe((truck_id, sensor_key), value)
 
-            # Keep only last 30 days of data in memory
-            cutoff = datetime.now(timezone.utc) - timedelta(days=30)
-            self._sensor_cache[truck_id][sensor_key] = [
-                (ts, v)
-                for ts, v in self._sensor_cache[truck_id][sensor_key]
-                if ts > cutoff
-            ]
+            # 🆕 v5.12.14: Readings arrive in time order, so expired ones are a
+            # prefix - trim it in place instead of rebuilding the 30-day list
+            expired = 0
+            while expired < len(history) and history[expired][0] <= cutoff:
+                expired += 1
+            if expired:
+                del history[:expired]
 
             # Check for anomalies
             alert = self._check_sensor_anomaly(truck_id, sensor_type, value, timestamp)
@@ -642,8 +770,9 @@ class TruckHealthMonitor:
             return None
 
         # Check Nelson rules
-        recent_values = [v for _, v in history[-20:]]  # Last 20 readings
-        nelson_violations = NelsonRulesChecker.check_all_rules(recent_values, mean, std)
+        nelson_violations = self._nelson_violations(
+            truck_id, sensor_key, history, mean, std
+        )
 
         # Determine severity
         abs_z = abs(z_score)
@@ -694,6 +823,34 @@ class TruckHealthMonitor:
             timestamp=timestamp,
         )
 
+    def _nelson_violations(
+        self,
+        truck_id: str,
+        sensor_key: str,
+        history: List[Tuple[datetime, float]],
+        mean: float,
+        std: float,
+    ) -> List[NelsonRule]:
+        """
+        Nelson rules violated at the latest reading of a sensor.
+
+        Uses the incremental SPC engine (O(1) per reading); falls back to
+        rescanning the last 20 readings when numpy is not available.
+        """
+        if self._spc is None:
+            recent_values = [v for _, v in history[-20:]]  # Last 20 readings
+            return NelsonRulesChecker.check_all_rules(recent_values, mean, std)
+
+        key = (truck_id, sensor_key)
+        # History restored from disk or set directly hasn't been observed yet
+        if self._spc.series_length(key) < min(len(history), self._spc.capacity):
+            self._spc.load(key, [v for _, v in history[-self._spc.capacity :]])
+
+        return [
+            NELSON_RULES_BY_NUMBER[rule]
+            for rule in self._spc.violations(key, mean, std)
+        ]
+
     def get_truck_health_report(self, truck_id: str) -> Optional[TruckHealthReport]:
         """
         Generate comprehensive health report for a truck.
@@ -963,6 +1120,9 @@ class TruckHealthMonitor:
                     self._sensor_cache[truck_id][sensor] = [
                         (datetime.fromisoformat(ts), v) for ts, v in values
                     ]
+                    if self._spc is not None:
+                        # Re-seeded from the restored history on next check
+                        self._spc.forget((truck_id, sensor))
 
             logger.info(
                 f"📂 Health monitor state loaded: " f"{len(self._sensor_cache)} trucks"
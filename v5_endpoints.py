@@ -27,12 +27,14 @@ router = APIRouter(prefix="/fuelAnalytics/api/v5", tags=["v5-clean"])
 # DATABASE CONNECTION (inline to avoid import issues)
 # =============================================================================
 def get_db_connection():
-    """Get MySQL connection to fuel_copilot database."""
+    """Get pooled MySQL connection to fuel_copilot database (close() returns it)."""
     import os
-    import pymysql
-    from dotenv import load_dotenv
 
-    load_dotenv()
+    from connection_manager import get_connection_manager
+
+    # 🆕 v5.12.16: Checked out of the shared pool instead of connect() per call
+    # (creating the manager loads settings, which loads .env)
+    manager = get_connection_manager()
 
     _password = os.getenv("LOCAL_DB_PASS")
     if not _password:
@@ -40,17 +42,16 @@ def get_db_connection():
         return None
 
     try:
-        conn = pymysql.connect(
-            host=os.getenv("LOCAL_DB_HOST", "localhost"),
-            port=int(os.getenv("LOCAL_DB_PORT", 3306)),
-            user=os.getenv("LOCAL_DB_USER", "fuel_admin"),
-            password=_password,
-            database=os.getenv("LOCAL_DB_NAME", "fuel_copilot"),
-            cursorclass=pymysql.cursors.DictCursor,
-            connect_timeout=5,
-            read_timeout=10,
+        pool = manager.pool_for(
+            {
+                "host": os.getenv("LOCAL_DB_HOST", "localhost"),
+                "port": int(os.getenv("LOCAL_DB_PORT", 3306)),
+                "user": os.getenv("LOCAL_DB_USER", "fuel_admin"),
+                "password": _password,
+                "database": os.getenv("LOCAL_DB_NAME", "fuel_copilot"),
+            }
         )
-        return conn
+        return manager.checkout(pool)
     except Exception as e:
         logger.error(f"❌ DB connection failed: {e}")
         return None
@@ -17,12 +17,25 @@ Date: December 2025
 
 import json
 import logging
+import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def _sample_epoch(timestamp: Any) -> float:
+    """Timestamp de la muestra (datetime naive = UTC, epoch o None) → epoch"""
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    return time.time()
+
+
 class Wialon2ABCIntegration:
     """Integración de Fases 2A, 2B, 2C en el flujo Wialon"""
 
@@ -36,6 +49,13 @@ class Wialon2ABCIntegration:
         self.orchestrator = None
         self.route_optimizer = None
 
+        # 🆕 v5.12.5: Consumo reciente (gph) por truck para las secuencias LSTM,
+        # un promedio por minuto: (minuto_epoch, gph)
+        self._consumption_history: Dict[str, Deque[Tuple[float, float]]] = {}
+        # Minuto en curso por truck: [minuto_epoch, suma_gph, n_muestras]
+        self._pending_minute: Dict[str, List[float]] = {}
+        self.last_predictions: Dict[str, Dict[str, Any]] = {}
+
         self._initialize_managers()
 
     def _initialize_managers(self):
@@ -257,6 +277,70 @@ class Wialon2ABCIntegration:
             logger.error(f"Error scoring driver {driver_id}: {e}")
             return {}
 
+    # El LSTM se entrena con una observación por minuto (sequence_length = 60 min)
+    RESAMPLE_SECONDS = 60
+
+    def record_consumption(self, truck_id: str, sensor_data: Dict[str, Any]):
+        """
+        Agrega el consumo actual (fuel_rate L/h → gph) al historial del truck
+        usado como secuencia de entrada del LSTM (FASE 2B)
+
+        Las muestras del sync (~30s) se promedian por minuto, la cadencia del
+        modelo; el minuto entra al historial cuando llega una muestra de un
+        minuto posterior.
+        """
+        if not self.lstm_predictor:
+            return
+
+        fuel_rate_lph = sensor_data.get("fuel_rate")
+        if fuel_rate_lph is None:
+            return
+        try:
+            consumption_gph = float(fuel_rate_lph) / 3.78541
+        except (TypeError, ValueError):
+            return
+
+        epoch = _sample_epoch(sensor_data.get("timestamp"))
+        minute = epoch - epoch % self.RESAMPLE_SECONDS
+        pending = self._pending_minute.get(truck_id)
+        if pending is not None and pending[0] == minute:
+            pending[1] += consumption_gph
+            pending[2] += 1
+            return
+        if pending is not None and pending[0] > minute:
+            return  # muestra atrasada de un minuto ya cerrado
+
+        if pending is not None:
+            history = self._consumption_history.get(truck_id)
+            if history is None:
+                history = deque(maxlen=self.lstm_predictor.sequence_length)
+                self._consumption_history[truck_id] = history
+            history.append((pending[0], pending[1] / pending[2]))
+        self._pending_minute[truck_id] = [minute, consumption_gph, 1]
+
+    def _recent_consumption(self, now: Optional[float] = None) -> Dict[str, List[float]]:
+        """
+        Secuencias gph por truck dentro de la ventana del modelo.
+
+        Descarta los minutos más viejos que sequence_length minutos y elimina
+        los trucks sin muestras en la ventana (offline / dados de baja).
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.lstm_predictor.sequence_length * self.RESAMPLE_SECONDS
+        for truck_id in list(self._pending_minute):
+            if self._pending_minute[truck_id][0] < cutoff:
+                del self._pending_minute[truck_id]
+
+        recent = {}
+        for truck_id, history in list(self._consumption_history.items()):
+            while history and history[0][0] < cutoff:
+                history.popleft()
+            if not history:
+                del self._consumption_history[truck_id]
+                continue
+            recent[truck_id] = [gph for _, gph in history]
+        return recent
+
     def predict_fuel_consumption(
         self, truck_id: str, lookback_hours: int = 24
     ) -> Dict[str, Any]:
@@ -275,10 +359,9 @@ class Wialon2ABCIntegration:
 
         try:
             # Firma correcta: predict(truck_id, recent_consumption, hours_ahead)
-            # Por ahora usamos lista vacía ya que no tenemos historial reciente
             predictions = self.lstm_predictor.predict(
                 truck_id=truck_id,
-                recent_consumption=[],  # TODO: obtener consumo reciente de DB
+                recent_consumption=self._recent_consumption().get(truck_id, []),
                 hours_ahead=4,
             )
             return predictions
@@ -286,6 +369,42 @@ class Wialon2ABCIntegration:
             logger.error(f"Error predicting fuel for {truck_id}: {e}")
             return {}
 
+    def predict_fleet_consumption(self, hours_ahead: int = 4) -> Dict[str, Any]:
+        """
+        🆕 v5.12.5: Predicción LSTM de toda la flota en un solo batch
+
+        Llamar una vez por ciclo de sync (después de record_consumption de
+        cada truck) en lugar de predict_fuel_consumption por truck.
+
+        Returns:
+            {"predictions": {truck_id: resultado}, "trucks": N,
+             "predicted": M, "inference_ms": X}
+        """
+        if not self.lstm_predictor:
+            return {}
+        recent = self._recent_consumption()
+        if not recent:
+            return {}
+
+        start = time.perf_counter()
+        try:
+            predictions = self.lstm_predictor.predict_batch(
+                recent, hours_ahead=hours_ahead
+            )
+        except Exception as e:
+            logger.error(f"Error predicting fleet fuel consumption: {e}")
+            return {}
+
+        self.last_predictions = predictions
+        return {
+            "predictions": predictions,
+            "trucks": len(predictions),
+            "predicted": sum(
+                1 for p in predictions.values() if p.get("status") == "success"
+            ),
+            "inference_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
     def publish_event(self, topic: str, event_data: Dict[str, Any]) -> Optional[str]:
         """
         Publica evento al bus (FASE 2C)
@@ -319,6 +438,9 @@ class Wialon2ABCIntegration:
             "route_optimizer": self.route_optimizer is not None,
         }
 
+        if self.lstm_predictor:
+            status["lstm_runtime"] = self.lstm_predictor.get_runtime_stats()
+
         # Si orchestrator está disponible, obtener su estado
         if self.orchestrator:
             try:
@@ -48,10 +48,7 @@ from ml_engines.adaptive_refuel_thresholds import get_adaptive_thresholds
 from alert_service import (
     get_alert_manager,
     get_fuel_classifier,
-    send_dtc_alert,
     send_sensor_issue_alert,
-    send_theft_confirmed_alert,
-    send_voltage_alert,
 )
 from confidence_scoring import calculate_estimation_confidence
 from config import (
@@ -76,8 +73,8 @@ from enhanced_mpg_calculator import EnhancedMPGCalculator, EnvironmentalFactors
 # Import the existing sophisticated modules
 from estimator import AnchorDetector, AnchorType, FuelEstimator
 
-# 🆕 DEC 30 2025: FleetBooster integration for fuel levels & DTC alerts
-from fleetbooster_integration import send_dtc_alert, send_fuel_level_update
+# 🆕 v5.12.1: Columnar refuel candidate extraction
+from fuel_event_extractor import FuelColumns, extract_refuel_jumps
 
 # 🆕 v3.12.28: Import GPS quality for Kalman adaptive Q_L
 from gps_quality import analyze_fleet_gps_quality, analyze_gps_quality
@@ -90,6 +87,23 @@ from idle_engine import (
 )
 from mpg_engine import MPGConfig, MPGState, reset_mpg_state, update_mpg_state
 
+# 🆕 v5.7.7: Incremental MPG baselines (replaces per-request history recompute)
+from mpg_baseline_store import get_baseline_store
+
+# 🆕 v5.12.24: Notifications go through a durable outbox, delivered async
+from notification_outbox import enqueue_notification, get_notification_dispatcher
+from observability import ObservabilityServer, get_health_checker, get_metrics
+from sensor_stats_store import get_sensor_stats_store
+
+# 🆕 v5.12.11: Per-source data versions for API-side caches
+from sync_cycle_state import get_sync_cycle_state
+
+# 🆕 v5.12.15: One row per truck, upserted with each fuel_metrics insert
+from src.repositories.latest_state_repository import (
+    ensure_latest_state_table,
+    upsert_latest_state,
+)
+
 # 🆕 v5.11.0: Import predictive maintenance engine
 from predictive_maintenance_engine import get_predictive_maintenance_engine
 from sensor_health_monitor import get_sensor_health_monitor
@@ -986,8 +1000,14 @@ def detect_multiple_refuels(
 
     refuels_detected = []
 
-    # Process each pair of consecutive readings
-    for i in range(1, len(fuel_history)):
+    # 🆕 v5.12.1: Vectorized pre-filter - only pairs where the level went UP
+    # can ever be a refuel, so the full rules run on a handful of candidates
+    # instead of every consecutive pair
+    candidates = extract_refuel_jumps(
+        FuelColumns.from_history(truck_id, fuel_history)
+    )
+
+    for i in candidates["index"]:
         prev_reading = fuel_history[i - 1]
         curr_reading = fuel_history[i]
 
@@ -996,9 +1016,6 @@ def detect_multiple_refuels(
         prev_time = prev_reading.get("timestamp")
         curr_time = curr_reading.get("timestamp")
 
-        if None in (prev_pct, curr_pct, prev_time, curr_time):
-            continue
-
         # Calculate time gap
         time_delta = curr_time - prev_time
         time_gap_hours = time_delta.total_seconds() / 3600
@@ -1446,9 +1463,6 @@ def detect_fuel_theft(
 # REFUEL PERSISTENCE & NOTIFICATIONS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-# Cooldown tracker to avoid duplicate notifications
-_refuel_notification_cooldown: Dict[str, datetime] = {}
-
 # 🆕 v3.12.20: Pending refuels buffer for consecutive jump consolidation
 # When refueling, sensor may report: 10% → 40% → 80% → 100% in quick succession
 # This buffer accumulates all jumps and saves/notifies as ONE event
@@ -1646,103 +1660,27 @@ def send_refuel_notification(
     timestamp_utc: datetime,
 ) -> bool:
     """
-    Send SMS and Email notification for refuel event.
+    Queue SMS and Email notification for refuel event.
 
-    Uses environment variables for configuration:
-    - TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_FROM_NUMBER, TWILIO_TO_NUMBERS
-    - SMTP_SERVER, SMTP_PORT, SMTP_USER, SMTP_PASS, ALERT_TO/ALERT_EMAIL_TO
+    🆕 v5.12.24: Delivered by the notification dispatcher (one digest for
+    all refuels waiting), so a slow Twilio/SMTP no longer holds up the sync.
+    The outbox dedupes per truck for 30 minutes (the old cooldown).
 
-    Enforces 30 minute cooldown per truck to avoid spam.
+    Returns True if queued, False while the cooldown is active.
     """
-    global _refuel_notification_cooldown
-
-    # Check cooldown (30 minutes)
-    now = datetime.now(timezone.utc)
-    last_notification = _refuel_notification_cooldown.get(truck_id)
-    if last_notification:
-        minutes_since = (now - last_notification).total_seconds() / 60
-        if minutes_since < 30:
-            logger.info(
-                f"⏳ Notification cooldown active for {truck_id} ({minutes_since:.1f} min ago)"
-            )
-            return False
-
-    message = (
-        f"⛽ REFUEL DETECTED\n"
-        f"Truck: {truck_id}\n"
-        f"Added: +{gallons_added:.1f} gal\n"
-        f"Before: {fuel_before:.1f}% → After: {fuel_after:.1f}%\n"
-        f"Time: {timestamp_utc.strftime('%Y-%m-%d %H:%M UTC')}"
+    queued = enqueue_notification(
+        "refuel",
+        truck_id,
+        {
+            "gallons_added": gallons_added,
+            "fuel_before": fuel_before,
+            "fuel_after": fuel_after,
+            "timestamp_utc": timestamp_utc.isoformat(),
+        },
     )
-
-    success = False
-
-    # Try SMS via Twilio
-    try:
-        account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-        from_number = os.getenv("TWILIO_FROM_NUMBER")
-        to_numbers = os.getenv("TWILIO_TO_NUMBERS", "")
-
-        if account_sid and auth_token and from_number and to_numbers:
-            from twilio.rest import Client
-
-            client = Client(account_sid, auth_token)
-
-            for to_number in to_numbers.split(","):
-                to_number = to_number.strip()
-                if to_number:
-                    try:
-                        client.messages.create(
-                            body=message, from_=from_number, to=to_number
-                        )
-                        logger.info(f"📱 SMS sent to {to_number} for {truck_id} refuel")
-                        success = True
-                    except Exception as sms_err:
-                        logger.error(f"❌ SMS failed to {to_number}: {sms_err}")
-        else:
-            logger.debug("📱 SMS not configured (missing Twilio env vars)")
-    except ImportError:
-        logger.warning("📱 Twilio library not installed - SMS disabled")
-    except Exception as e:
-        logger.error(f"❌ SMS notification error: {e}")
-
-    # Try Email via SMTP
-    try:
-        import smtplib
-        from email.message import EmailMessage
-
-        smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        smtp_user = os.getenv("SMTP_USER")
-        smtp_pass = os.getenv("SMTP_PASS")
-        # Support both variable names
-        alert_to = os.getenv("ALERT_TO") or os.getenv("ALERT_EMAIL_TO")
-
-        if smtp_user and smtp_pass and alert_to:
-            msg = EmailMessage()
-            msg["From"] = smtp_user
-            msg["To"] = alert_to
-            msg["Subject"] = f"⛽ Refuel Detected: {truck_id} +{gallons_added:.1f} gal"
-            msg.set_content(message)
-
-            with smtplib.SMTP(smtp_server, smtp_port, timeout=10) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
-
-            logger.info(f"📧 Email sent to {alert_to} for {truck_id} refuel")
-            success = True
-        else:
-            logger.debug("📧 Email not configured (missing SMTP env vars)")
-    except Exception as e:
-        logger.error(f"❌ Email notification error: {e}")
-
-    # Update cooldown if any notification succeeded
-    if success:
-        _refuel_notification_cooldown[truck_id] = now
-
-    return success
+    if not queued:
+        logger.info(f"⏳ Notification cooldown active for {truck_id}")
+    return queued
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -3080,10 +3018,20 @@ def save_to_fuel_metrics(connection, metrics: Dict) -> int:
                 metrics.get("mpg_status"),
             )
 
+            # 🆕 v5.12.15: fuel_metrics row + fuel_metrics_latest upsert in one
+            # transaction, so latest-state readers never see one without the other
+            connection.begin()
             cursor.execute(query, values)
-            return cursor.rowcount
+            inserted = cursor.rowcount
+            upsert_latest_state(cursor, values)
+            connection.commit()
+            return inserted
 
     except Exception as e:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
         logger.error(f"Error saving metrics for {metrics.get('truck_id')}: {e}")
         return 0
 
@@ -3124,13 +3072,10 @@ def process_2abc_integrations(truck_id: str, sensor_data: Dict) -> Dict[str, Any
                 f"{anomaly_result.get('anomaly_type')} (confidence: {anomaly_result.get('confidence')})"
             )
 
-        # 🆕 FASE 2B: Predict fuel consumption (LSTM)
-        prediction_result = _wialon_2abc.predict_fuel_consumption(truck_id)
-        results["prediction"] = prediction_result
-        if prediction_result:
-            logger.debug(
-                f"[FASE 2B] LSTM prediction for {truck_id}: {prediction_result}"
-            )
+        # 🆕 FASE 2B: Feed LSTM input sequence; the prediction itself runs
+        # once per cycle for the whole fleet (process_2abc_fleet_predictions)
+        _wialon_2abc.record_consumption(truck_id, sensor_data)
+        results["prediction"] = _wialon_2abc.last_predictions.get(truck_id, {})
 
         # 🆕 FASE 2C: Publish event to bus
         event_id = _wialon_2abc.publish_event(
@@ -3151,6 +3096,25 @@ def process_2abc_integrations(truck_id: str, sensor_data: Dict) -> Dict[str, Any
     return results
 
 
+def process_2abc_fleet_predictions() -> Dict[str, Any]:
+    """
+    🆕 v5.12.5: FASE 2B LSTM predictions for the whole fleet in one batch
+
+    Runs once per sync cycle after every truck went through
+    process_2abc_integrations (which records each truck's consumption).
+    """
+    if not _wialon_2abc:
+        return {}
+
+    result = _wialon_2abc.predict_fleet_consumption()
+    if result.get("predicted"):
+        logger.info(
+            f"🧠 [FASE 2B] LSTM fleet inference: {result['predicted']}/{result['trucks']} "
+            f"trucks in {result['inference_ms']:.1f} ms"
+        )
+    return result
+
+
 def update_sensors_cache(connection, metrics: Dict, sensor_data: Dict) -> bool:
     """
     🆕 v6.4.1: Update truck_sensors_cache with latest sensor data.
@@ -3318,6 +3282,9 @@ def sync_cycle(
 ):
     """Single sync cycle with full Kalman processing - OPTIMIZED BATCH VERSION"""
     cycle_start = time.time()
+    # 🆕 v5.12.19: per-stage timings -> sync_stage_seconds{stage=...}
+    obs = get_metrics()
+    laps = obs.stage_timer("sync_stage_seconds")
 
     logger.info("═" * 70)
     logger.info(
@@ -3341,7 +3308,8 @@ def sync_cycle(
 
     # 🚀 OPTIMIZED: Get ALL truck data in ONE batch query
     logger.info("📊 Fetching data for all trucks in batch...")
-    all_truck_data = reader.get_all_trucks_data()
+    with obs.time("sync_stage_seconds", {"stage": "wialon_fetch"}):
+        all_truck_data = reader.get_all_trucks_data()
 
     if not all_truck_data:
         logger.warning("⚠️ No truck data retrieved from Wialon")
@@ -3352,6 +3320,7 @@ def sync_cycle(
     # Process each truck's data
     for truck_data in all_truck_data:
         truck_id = truck_data.truck_id
+        truck_start = time.perf_counter()
         try:
             # Convert TruckSensorData to dict format expected by process_truck
             sensor_data = {
@@ -3467,6 +3436,8 @@ def sync_cycle(
                 "engine_brake": getattr(truck_data, "engine_brake", None),
             }
 
+            laps.restart()
+
             # 🆕 v5.10.0: Process driver behavior detection
             try:
                 behavior_engine = get_behavior_engine()
@@ -3496,6 +3467,7 @@ def sync_cycle(
                 logger.debug(
                     f"Behavior detection error for {truck_id}: {behavior_error}"
                 )
+            laps.lap("driver_behavior")
 
             # 🆕 v5.11.0: Feed predictive maintenance engine with sensor data
             try:
@@ -3532,6 +3504,7 @@ def sync_cycle(
                 )
             except Exception as pm_error:
                 logger.debug(f"Predictive maintenance error for {truck_id}: {pm_error}")
+            laps.lap("predictive_maintenance")
 
             # 🆕 v3.12.28 / v5.7.5: Process DTC codes and generate alerts
             # Prefer dtc_code (actual codes like "100.4,157.3") over dtc (which may be just 0/1 flag)
@@ -3574,31 +3547,29 @@ def sync_cycle(
                         )
 
                         # Save to database with HYBRID info
-                        save_dtc_event_hybrid(
+                        if save_dtc_event_hybrid(
                             local_conn,
                             truck_id=truck_id,
                             dtc_info=dtc_result,
-                        )
+                        ):
+                            get_sync_cycle_state().mark("dtc_events")
 
                         # 🆕 DEC 30 2025: Send DTC alert to FleetBooster
-                        try:
-                            from fleetbooster_integration import (
-                                send_dtc_alert as send_fb_dtc,
-                            )
-
-                            send_fb_dtc(
-                                truck_id=truck_id,
-                                dtc_code=dtc_result.get("dtc_code", "UNKNOWN"),
-                                dtc_description=dtc_result.get(
+                        # 🆕 v5.12.24: Queued; the dispatcher delivers it
+                        dtc_code = dtc_result.get("dtc_code", "UNKNOWN")
+                        enqueue_notification(
+                            "fb_dtc",
+                            truck_id,
+                            {
+                                "dtc_code": dtc_code,
+                                "dtc_description": dtc_result.get(
                                     "description", "Unknown DTC"
                                 ),
-                                severity=dtc_result.get("severity", "WARNING"),
-                                system=dtc_result.get("category", "System"),
-                            )
-                        except Exception as fb_err:
-                            logger.debug(
-                                f"[{truck_id}] FleetBooster DTC alert failed: {fb_err}"
-                            )
+                                "severity": dtc_result.get("severity", "WARNING"),
+                                "system": dtc_result.get("category", "System"),
+                            },
+                            dedupe_key=f"fb_dtc:{truck_id}:{dtc_code}",
+                        )
 
                         # Send alerts based on severity
                         if dtc_result.get("is_critical"):
@@ -3612,7 +3583,12 @@ def sync_cycle(
                                 f"{dtc_result['dtc_code']} - {dtc_result['description']}"
                             )
                             # Send alert with HYBRID system info
-                            send_dtc_alert(truck_id=truck_id, dtc_info=dtc_result)
+                            enqueue_notification(
+                                "dtc",
+                                truck_id,
+                                {"dtc_info": dtc_result},
+                                dedupe_key=f"dtc:{truck_id}:{dtc_code}",
+                            )
 
                         elif dtc_result.get("severity") == "WARNING":
                             detailed = (
@@ -3625,13 +3601,19 @@ def sync_cycle(
                                 f"{dtc_result['dtc_code']} - {dtc_result['description']}"
                             )
                             # Send email for warnings (SMS only for CRITICAL)
-                            send_dtc_alert(truck_id=truck_id, dtc_info=dtc_result)
+                            enqueue_notification(
+                                "dtc",
+                                truck_id,
+                                {"dtc_info": dtc_result},
+                                dedupe_key=f"dtc:{truck_id}:{dtc_code}",
+                            )
 
                 except Exception as hybrid_dtc_error:
                     logger.error(
                         f"HYBRID DTC processing error for {truck_id}: {hybrid_dtc_error}",
                         exc_info=True,
                     )
+            laps.lap("dtc")
 
             # 🆕 v3.12.28 / v5.7.5: Process voltage alerts using pwr_ext (truck battery)
             # NOTE: pwr_int is GPS tracker backup battery (~3.78V), NOT truck voltage
@@ -3661,29 +3643,36 @@ def sync_cycle(
                                     f"🔋 CRITICAL VOLTAGE: {voltage_alert.message}"
                                 )
                                 # 🆕 v5.7.3: Send notification via alert_service
-                                send_voltage_alert(
-                                    truck_id=truck_id,
-                                    voltage=truck_data.pwr_ext,
-                                    priority_level="CRITICAL",
-                                    message=voltage_alert.message,
-                                    is_engine_running=is_running,
+                                enqueue_notification(
+                                    "voltage",
+                                    truck_id,
+                                    {
+                                        "voltage": truck_data.pwr_ext,
+                                        "priority_level": "CRITICAL",
+                                        "message": voltage_alert.message,
+                                        "is_engine_running": is_running,
+                                    },
                                 )
                             else:
                                 logger.info(
                                     f"🔋 Voltage Warning: {truck_id} - {voltage_alert.message}"
                                 )
                                 # 🆕 v5.7.3: Send email-only for warnings
-                                send_voltage_alert(
-                                    truck_id=truck_id,
-                                    voltage=truck_data.pwr_ext,
-                                    priority_level="WARNING",
-                                    message=voltage_alert.message,
-                                    is_engine_running=is_running,
+                                enqueue_notification(
+                                    "voltage",
+                                    truck_id,
+                                    {
+                                        "voltage": truck_data.pwr_ext,
+                                        "priority_level": "WARNING",
+                                        "message": voltage_alert.message,
+                                        "is_engine_running": is_running,
+                                    },
                                 )
                 except Exception as volt_error:
                     logger.debug(
                         f"Voltage processing error for {truck_id}: {volt_error}"
                     )
+            laps.lap("voltage")
 
             # 🆕 v3.12.28: Log GPS quality for monitoring
             if truck_data.sats is not None:
@@ -3702,6 +3691,7 @@ def sync_cycle(
                         )
                 except Exception as gps_error:
                     logger.debug(f"GPS quality error for {truck_id}: {gps_error}")
+            laps.lap("gps_quality")
 
             # 🆕 v5.7.2: Full idle validation against ECU
             if (
@@ -3749,6 +3739,7 @@ def sync_cycle(
                     logger.debug(
                         f"Idle validation error for {truck_id}: {idle_val_error}"
                     )
+            laps.lap("idle_validation")
 
             # 🆕 v5.12.0: Check for missed refuels in historical data
             # This fixes the issue where only ONE refuel per sync cycle was detected
@@ -3809,6 +3800,7 @@ def sync_cycle(
                 logger.debug(
                     f"Historical refuel detection error for {truck_id}: {hist_refuel_error}"
                 )
+            laps.lap("historical_refuels")
 
             # Full processing with Kalman
             metrics = process_truck(
@@ -3818,6 +3810,7 @@ def sync_cycle(
                 mpg_config=mpg_config,
                 idle_config=idle_config,
             )
+            laps.lap("process_truck")
 
             # Skip if processing failed
             if metrics is None:
@@ -3827,20 +3820,48 @@ def sync_cycle(
             # Save to database
             inserted = save_to_fuel_metrics(local_conn, metrics)
             total_inserted += inserted
+            get_sync_cycle_state().mark("fuel_metrics", inserted)
+            laps.lap("db_write")
 
-            # 🆕 DEC 30 2025: Send fuel level to FleetBooster (every 60 sec)
+            # 🆕 v5.7.7: Feed incremental MPG baseline (O(1) per truck)
             try:
-                send_fuel_level_update(
-                    truck_id=truck_id,
-                    fuel_pct=metrics.get("estimated_pct", metrics.get("sensor_pct", 0)),
-                    fuel_gallons=metrics.get(
-                        "estimated_gallons", metrics.get("sensor_gallons", 0)
-                    ),
-                    fuel_source="kalman" if metrics.get("estimated_pct") else "sensor",
-                    estimated_liters=metrics.get("estimated_liters"),
+                get_baseline_store().update(
+                    truck_id,
+                    metrics.get("mpg_current"),
+                    timestamp=metrics.get("timestamp_utc"),
+                    speed_mph=metrics.get("speed_mph"),
                 )
             except Exception as e:
-                logger.debug(f"[{truck_id}] FleetBooster fuel update failed: {e}")
+                logger.debug(f"[{truck_id}] MPG baseline store update failed: {e}")
+
+            # 🆕 v5.12.9: Feed streaming sensor stats (O(1) per truck)
+            try:
+                get_sensor_stats_store().update(
+                    truck_id, metrics, timestamp=metrics.get("timestamp_utc")
+                )
+            except Exception as e:
+                logger.debug(f"[{truck_id}] Sensor stats store update failed: {e}")
+            laps.lap("baseline_stores")
+
+            # 🆕 DEC 30 2025: Send fuel level to FleetBooster (every 60 sec)
+            # 🆕 v5.12.24: Queued (newest level per truck wins) - no HTTP here
+            enqueue_notification(
+                "fb_fuel",
+                truck_id,
+                {
+                    "fuel_pct": metrics.get(
+                        "estimated_pct", metrics.get("sensor_pct", 0)
+                    ),
+                    "fuel_gallons": metrics.get(
+                        "estimated_gallons", metrics.get("sensor_gallons", 0)
+                    ),
+                    "fuel_source": (
+                        "kalman" if metrics.get("estimated_pct") else "sensor"
+                    ),
+                    "estimated_liters": metrics.get("estimated_liters"),
+                },
+            )
+            laps.lap("fleetbooster")
 
             # 🆕 FASES 2A, 2B, 2C: Process through ML pipeline + Event Bus
             try:
@@ -3854,6 +3875,7 @@ def sync_cycle(
                     )
             except Exception as e:
                 logger.warning(f"[{truck_id}] 2ABC integration error: {e}")
+            laps.lap("ml_pipeline")
 
             # 🆕 DEC 30 2025: Add calculated fuel_lvl_pct and fuel_lvl_gal to sensor_data
             # This allows update_sensors_cache to save the converted % and gal values
@@ -3862,8 +3884,11 @@ def sync_cycle(
 
             # 🆕 v6.4.1: Update sensors cache (replaces sensor_cache_updater.py)
             update_sensors_cache(local_conn, metrics, sensor_data)
+            laps.lap("sensors_cache")
 
             trucks_processed += 1
+            obs.inc("trucks_processed_total")
+            obs.observe("truck_processing_seconds", time.perf_counter() - truck_start)
 
             # 🆕 v5.7.2: Track calculated idle hours for ECU validation
             if metrics.get("idle_mode") != "ENGINE_OFF" and metrics.get("idle_gph"):
@@ -3948,6 +3973,7 @@ def sync_cycle(
                     import traceback
 
                     traceback.print_exc()
+                laps.lap("refuel_save")
 
                 # 🆕 v3.12.27: Process fuel events with intelligent classification
                 # This differentiates THEFT from SENSOR_ISSUE by monitoring recovery
@@ -3983,14 +4009,19 @@ def sync_cycle(
                                 logger.warning(
                                     f"🚨 {truck_id}: THEFT CONFIRMED - sending alert"
                                 )
-                                send_theft_confirmed_alert(
-                                    truck_id=truck_id,
-                                    fuel_drop_gallons=fuel_event.get("drop_gal", 0),
-                                    fuel_drop_pct=fuel_event.get("drop_pct", 0),
-                                    time_waited_minutes=fuel_event.get(
-                                        "time_waited_minutes", 0
-                                    ),
-                                    location=location,
+                                enqueue_notification(
+                                    "theft_confirmed",
+                                    truck_id,
+                                    {
+                                        "fuel_drop_gallons": fuel_event.get(
+                                            "drop_gal", 0
+                                        ),
+                                        "fuel_drop_pct": fuel_event.get("drop_pct", 0),
+                                        "time_waited_minutes": fuel_event.get(
+                                            "time_waited_minutes", 0
+                                        ),
+                                        "location": location,
+                                    },
                                 )
 
                             elif classification == "SENSOR_ISSUE":
@@ -4003,14 +4034,19 @@ def sync_cycle(
                                     f"to {fuel_event.get('drop_fuel_pct', 0):.1f}%, "
                                     f"recovered to {fuel_event.get('current_fuel_pct', 0):.1f}%"
                                 )
-                                send_sensor_issue_alert(
-                                    truck_id=truck_id,
-                                    drop_pct=fuel_event.get("drop_pct", 0),
-                                    drop_gal=fuel_event.get("drop_gal", 0),
-                                    recovery_info=recovery_info,
-                                    volatility=fuel_classifier.get_sensor_volatility(
-                                        truck_id
-                                    ),
+                                enqueue_notification(
+                                    "sensor_issue",
+                                    truck_id,
+                                    {
+                                        "drop_pct": fuel_event.get("drop_pct", 0),
+                                        "drop_gal": fuel_event.get("drop_gal", 0),
+                                        "recovery_info": recovery_info,
+                                        "volatility": (
+                                            fuel_classifier.get_sensor_volatility(
+                                                truck_id
+                                            )
+                                        ),
+                                    },
                                 )
 
                             elif classification == "THEFT_SUSPECTED":
@@ -4031,6 +4067,7 @@ def sync_cycle(
 
                 except Exception as e:
                     logger.error(f"Error in fuel classifier for {truck_id}: {e}")
+                laps.lap("fuel_events")
 
                 # Log with details
                 status_emoji = {
@@ -4072,10 +4109,13 @@ def sync_cycle(
 
         except Exception as e:
             logger.error(f"Error processing {truck_id}: {e}")
+            obs.inc("errors_total")
             import traceback
 
             traceback.print_exc()
 
+    laps.restart()
+
     # 🔧 v5.17.1: Reduced timeout since refuels are now saved immediately
     # This is just a safety net for backwards compatibility
     stale_refuels = flush_stale_pending_refuels(max_age_minutes=2)
@@ -4100,6 +4140,7 @@ def sync_cycle(
                 )
         except Exception as e:
             logger.error(f"Error saving stale refuel for {finalized['truck_id']}: {e}")
+    laps.lap("pending_refuels")
 
     # 🆕 v5.7.1: Cache latest sensor data for /alerts/diagnostics endpoint
     # Using file-based cache since sync is synchronous and cache_service is async
@@ -4144,11 +4185,31 @@ def sync_cycle(
             logger.debug(f"📦 Cached sensor data for {len(sensor_cache)} trucks")
     except Exception as cache_error:
         logger.debug(f"Could not cache sensor data: {cache_error}")
+    laps.lap("fleet_sensor_cache")
+
+    # 🆕 v5.12.5: Batched LSTM inference for all trucks seen this cycle
+    try:
+        process_2abc_fleet_predictions()
+    except Exception as e:
+        logger.warning(f"2ABC fleet prediction error: {e}")
+    laps.lap("fleet_predictions")
 
     # Save states periodically
     state_manager.save_states()
+    get_baseline_store().flush()
+    get_sensor_stats_store().flush()
+    laps.lap("state_save")
+
+    # 🆕 v5.12.11: Tell API-side caches which sources changed this cycle
+    sync_state = get_sync_cycle_state()
+    sync_state.mark("refuel_events", refuel_count)
+    sync_state.publish()
+    laps.lap("cache_publish")
 
     cycle_duration = time.time() - cycle_start
+    obs.observe("sync_cycle_seconds", cycle_duration)
+    obs.set("cycle_duration_seconds", cycle_duration)
+    obs.set("active_trucks", trucks_processed)
 
     # Summary
     logger.info("─" * 70)
@@ -4166,6 +4227,11 @@ def sync_cycle(
         f"⏱️ Cycle completed in {cycle_duration:.2f}s. "
         f"Trucks: {trucks_processed}, Records: {total_inserted}"
     )
+    slowest = sorted(laps.totals.items(), key=lambda kv: -kv[1])[:5]
+    logger.info(
+        "   ⏱️ Slowest stages: "
+        + ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in slowest)
+    )
     logger.info("")
 
 
@@ -4178,6 +4244,16 @@ def main():
     # Initialize state manager
     state_manager = StateManager()
 
+    # 🆕 v5.12.19: /metrics (+ /metrics/json with per-stage p50/p95/p99)
+    metrics_port = int(os.getenv("SYNC_METRICS_PORT", "9090"))
+    if metrics_port:
+        try:
+            ObservabilityServer(
+                get_metrics(), get_health_checker(), port=metrics_port
+            ).start()
+        except OSError as e:
+            logger.warning(f"⚠️ Sync metrics server not started on {metrics_port}: {e}")
+
     # Configuration
     mpg_config = MPGConfig()
     idle_config = IdleConfig()
@@ -4208,6 +4284,42 @@ def main():
         logger.error(f"❌ Failed to connect to Local MySQL: {e}")
         return
 
+    # 🆕 v5.12.15: Latest-state table must exist before the first upsert
+    try:
+        ensure_latest_state_table(local_conn)
+    except Exception as e:
+        logger.error(f"❌ Failed to prepare fuel_metrics_latest: {e}")
+        return
+
+    # 🆕 v5.7.7: Backfill MPG baselines from history for trucks the store hasn't seen
+    baseline_store = get_baseline_store()
+    missing_baselines = baseline_store.missing_trucks(filtered_mapping.keys())
+    if missing_baselines:
+        logger.info(
+            f"📊 Backfilling MPG baselines for {len(missing_baselines)} trucks in background"
+        )
+        baseline_store.start_background_backfill(
+            get_local_connection, truck_ids=missing_baselines
+        )
+
+    # 🆕 v5.12.9: Replay the last 7 days of sensor readings for uncovered trucks
+    sensor_stats_store = get_sensor_stats_store()
+    missing_sensor_stats = sensor_stats_store.missing_trucks(filtered_mapping.keys())
+    if missing_sensor_stats:
+        logger.info(
+            f"📊 Backfilling sensor stats for {len(missing_sensor_stats)} trucks in background"
+        )
+        sensor_stats_store.start_background_backfill(
+            get_local_connection, truck_ids=missing_sensor_stats
+        )
+
+    # 🆕 v5.12.24: Deliver queued notifications (and any left from last run)
+    notification_dispatcher = get_notification_dispatcher()
+    try:
+        notification_dispatcher.start()
+    except Exception as e:
+        logger.error(f"❌ Notification dispatcher not started: {e}")
+
     try:
         while True:
             try:
@@ -4235,6 +4347,8 @@ def main():
     except KeyboardInterrupt:
         logger.info("⚠️ KeyboardInterrupt - Stopping...")
         state_manager.save_states()
+        baseline_store.flush()
+        sensor_stats_store.flush()
     except Exception as main_error:
         logger.error(f"❌ FATAL ERROR in main loop: {main_error}")
         import traceback
@@ -4243,6 +4357,8 @@ def main():
         state_manager.save_states()
     finally:
         logger.info("🔚 Shutting down...")
+        # Deliveries in flight finish; the rest waits in the outbox
+        notification_dispatcher.stop()
         try:
             reader.disconnect()
         except (AttributeError, Exception) as e:
@@ -0,0 +1,431 @@
+"""
+Write-Behind Queue v5.12.12
+═══════════════════════════════════════════════════════════════════════════════
+
+Asynchronous, bounded write-behind buffer for Command Center persistence.
+
+FleetCommandCenter used to open a connection and INSERT one row per risk
+score / anomaly / correlation / DEF reading while building a response. With
+the queue attached, those calls only append a row to an in-memory buffer and
+return; a background flusher writes each table with multi-row
+INSERT ... VALUES (...), (...) statements when the buffer reaches
+`batch_rows` or every `flush_interval_seconds`, whichever comes first.
+
+Bounded buffering / backpressure:
+    - At most `max_rows` rows are buffered across all tables
+    - When full, submit() waits up to `block_seconds` for the flusher to make
+      room (0 = never wait, the request path default) and then drops the row,
+      counting it in stats["dropped"]
+    - Failed batches are retried on the next flush while there is room
+    - A batch rejected for its data (DataError / IntegrityError) is split
+      until the bad rows are isolated; those are logged and counted in
+      stats["dead_lettered"] instead of being retried forever
+
+Usage:
+    queue = get_write_behind_queue()
+    queue.start()
+    queue.submit("cc_anomaly_history", {"truck_id": "CO0681", ...})
+    queue.stop()   # final flush on shutdown
+
+Author: Fuel Copilot Team
+Version: 5.12.12
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from trend_engine import STATE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Multi-row INSERT layout for one table"""
+
+    table: str
+    columns: Tuple[str, ...]
+    # Column filled with NOW() by MySQL (None = none)
+    now_column: Optional[str] = None
+    # Key columns for INSERT ... ON DUPLICATE KEY UPDATE (empty = plain INSERT)
+    upsert_keys: Tuple[str, ...] = ()
+
+    def insert_sql(self, n_rows: int) -> str:
+        columns = list(self.columns) + ([self.now_column] if self.now_column else [])
+        now = ", NOW()" if self.now_column else ""
+        values = ", ".join(
+            "(" + ", ".join(f":{c}_{r}" for c in self.columns) + now + ")"
+            for r in range(n_rows)
+        )
+        sql = f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES {values}"
+        if self.upsert_keys:
+            updates = [
+                f"{c} = VALUES({c})" for c in self.columns if c not in self.upsert_keys
+            ]
+            if self.now_column:
+                updates.append(f"{self.now_column} = NOW()")
+            sql += " ON DUPLICATE KEY UPDATE " + ", ".join(updates)
+        return sql
+
+    def params(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {f"{c}_{r}": row.get(c) for r, row in enumerate(rows) for c in self.columns}
+
+
+# v1.5.0 FASE 5.6 tables (migrations/add_command_center_history_v1_5_0.sql)
+COMMAND_CENTER_TABLES: Dict[str, TableSpec] = {
+    spec.table: spec
+    for spec in (
+        TableSpec(
+            "cc_risk_history",
+            (
+                "truck_id",
+                "risk_score",
+                "risk_level",
+                "active_issues_count",
+                "days_since_maintenance",
+            ),
+            now_column="timestamp",
+        ),
+        TableSpec(
+            "cc_anomaly_history",
+            (
+                "truck_id",
+                "sensor_name",
+                "anomaly_type",
+                "severity",
+                "sensor_value",
+                "ewma_value",
+                "cusum_value",
+                "threshold_used",
+                "z_score",
+            ),
+            now_column="detected_at",
+        ),
+        TableSpec(
+            "cc_correlation_events",
+            (
+                "truck_id",
+                "pattern_name",
+                "pattern_description",
+                "confidence",
+                "sensors_involved",
+                "sensor_values",
+                "predicted_component",
+                "predicted_failure_days",
+                "recommended_action",
+            ),
+            now_column="detected_at",
+        ),
+        TableSpec(
+            "cc_def_history",
+            (
+                "truck_id",
+                "def_level",
+                "fuel_used_since_refill",
+                "estimated_def_used",
+                "consumption_rate",
+                "is_refill_event",
+            ),
+            now_column="timestamp",
+        ),
+        TableSpec(
+            "cc_algorithm_state",
+            STATE_COLUMNS,
+            now_column="updated_at",
+            upsert_keys=("truck_id", "sensor_name"),
+        ),
+    )
+}
+
+
+def _is_data_error(error: Exception) -> bool:
+    """Rejected because of the rows themselves - retrying them can't succeed"""
+    try:
+        from sqlalchemy import exc
+    except ImportError:
+        return False
+    return isinstance(error, (exc.DataError, exc.IntegrityError))
+
+
+def _default_engine():
+    from database_mysql import get_sqlalchemy_engine
+
+    return get_sqlalchemy_engine()
+
+
+class WriteBehindQueue:
+    """Bounded per-table row buffers flushed in the background"""
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, TableSpec]] = None,
+        engine_fn: Callable[[], Any] = _default_engine,
+        max_rows: int = 20000,
+        batch_rows: int = 500,
+        flush_interval_seconds: float = 5.0,
+        block_seconds: float = 0.0,
+    ):
+        self.tables = dict(tables or COMMAND_CENTER_TABLES)
+        self._engine_fn = engine_fn
+        self.max_rows = max_rows
+        self.batch_rows = batch_rows
+        self.flush_interval_seconds = flush_interval_seconds
+        self.block_seconds = block_seconds
+
+        self._buffers: Dict[str, Deque[Dict[str, Any]]] = {t: deque() for t in self.tables}
+        self._size = 0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_drop_log = 0.0
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "dropped": 0,
+            "blocked": 0,
+            "flushes": 0,
+            "statements": 0,
+            "errors": 0,
+            "dead_lettered": 0,
+            "last_flush_ms": 0.0,
+            "last_error": None,
+        }
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # PRODUCERS
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def submit(
+        self, table: str, row: Dict[str, Any], block_seconds: Optional[float] = None
+    ) -> bool:
+        """Buffer one row. Returns False if it was dropped (buffer full)."""
+        return self.submit_many(table, [row], block_seconds) == 1
+
+    def submit_many(
+        self,
+        table: str,
+        rows: Iterable[Dict[str, Any]],
+        block_seconds: Optional[float] = None,
+    ) -> int:
+        """Buffer rows for `table`. Returns how many were accepted."""
+        if table not in self.tables:
+            raise ValueError(f"Unknown write-behind table: {table}")
+        rows = list(rows)
+        wait = self.block_seconds if block_seconds is None else block_seconds
+        deadline = time.monotonic() + wait
+        accepted = 0
+
+        with self._cond:
+            for row in rows:
+                if self._size >= self.max_rows and wait > 0:
+                    self._stats["blocked"] += 1
+                    self._cond.notify_all()  # wake the flusher to make room
+                    while self._size >= self.max_rows:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not self._cond.wait(remaining):
+                            break
+                if self._size >= self.max_rows:
+                    break
+                self._buffers[table].append(row)
+                self._size += 1
+                accepted += 1
+
+            self._stats["submitted"] += accepted
+            dropped = len(rows) - accepted
+            if dropped:
+                self._stats["dropped"] += dropped
+            if len(self._buffers[table]) >= self.batch_rows:
+                self._cond.notify_all()
+
+        if dropped and time.time() - self._last_drop_log > 60:
+            self._last_drop_log = time.time()
+            logger.warning(
+                f"⚠️ Write-behind buffer full ({self.max_rows} rows) - "
+                f"dropped {dropped} {table} row(s)"
+            )
+        return accepted
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # FLUSHER
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def start(self) -> None:
+        """Start the background flusher (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cc-write-behind", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"💾 Write-behind queue started (batch {self.batch_rows} rows, "
+            f"every {self.flush_interval_seconds:g}s, max {self.max_rows} buffered)"
+        )
+
+    def stop(self, flush: bool = True, timeout: float = 10.0) -> None:
+        """Stop the flusher and write what is left"""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def _batch_ready(self) -> bool:
+        return any(len(b) >= self.batch_rows for b in self._buffers.values())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval_seconds
+                while not self._stop.is_set() and not self._batch_ready():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            if self._stop.is_set():
+                break
+            try:
+                self.flush()
+            except Exception as e:  # never let the flusher die
+                logger.error(f"Write-behind flusher error: {e}")
+
+    def flush(self) -> int:
+        """Write every buffered row now. Returns rows written."""
+        with self._flush_lock:
+            with self._cond:
+                pending = {t: list(b) for t, b in self._buffers.items() if b}
+                for t in pending:
+                    self._buffers[t].clear()
+                self._size = 0
+                self._cond.notify_all()  # producers waiting for room
+            if not pending:
+                return 0
+
+            started = time.perf_counter()
+            written = 0
+            try:
+                engine = self._engine_fn()
+            except Exception as e:
+                self._record_error(e)
+                self._requeue(pending)
+                return 0
+
+            for table, rows in pending.items():
+                spec = self.tables[table]
+                try:
+                    self._write(engine, spec, rows)
+                    written += len(rows)
+                except Exception as e:
+                    self._record_error(e, table)
+                    if _is_data_error(e):
+                        written += self._write_isolating(engine, spec, rows)
+                    else:
+                        self._requeue({table: rows})
+
+            self._stats["written"] += written
+            self._stats["flushes"] += 1
+            self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            if written:
+                logger.debug(f"💾 Write-behind: {written} rows in {self._stats['last_flush_ms']}ms")
+            return written
+
+    def _write(self, engine: Any, spec: TableSpec, rows: List[Dict[str, Any]]) -> None:
+        """Multi-row INSERTs of `batch_rows` rows, committed together"""
+        from sqlalchemy import text
+
+        with engine.connect() as conn:
+            for start in range(0, len(rows), self.batch_rows):
+                chunk = rows[start : start + self.batch_rows]
+                conn.execute(text(spec.insert_sql(len(chunk))), spec.params(chunk))
+                self._stats["statements"] += 1
+            conn.commit()
+
+    def _write_isolating(
+        self, engine: Any, spec: TableSpec, rows: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Bisect a batch that hit a data error: write the good halves, dead-letter
+        single rows that still fail. A transient error requeues what is left.
+
+        Returns:
+            Rows written
+        """
+        written = 0
+        parts = [rows]
+        while parts:
+            part = parts.pop()
+            try:
+                self._write(engine, spec, part)
+                written += len(part)
+            except Exception as e:
+                if not _is_data_error(e):
+                    self._record_error(e, spec.table)
+                    self._requeue({spec.table: [r for p in [part] + parts[::-1] for r in p]})
+                    break
+                if len(part) == 1:
+                    self._dead_letter(spec.table, part[0], e)
+                else:
+                    mid = len(part) // 2
+                    parts += [part[mid:], part[:mid]]
+        return written
+
+    def _dead_letter(self, table: str, row: Dict[str, Any], error: Exception) -> None:
+        self._stats["dead_lettered"] += 1
+        logger.error(f"❌ Write-behind dead letter ({table}): {error} - row: {row}")
+
+    def _requeue(self, pending: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Put failed rows back in front, keeping the buffer bound"""
+        with self._cond:
+            for table, rows in pending.items():
+                room = max(self.max_rows - self._size, 0)
+                keep = rows[-room:] if room else []
+                self._buffers[table].extendleft(reversed(keep))
+                self._size += len(keep)
+                self._stats["dropped"] += len(rows) - len(keep)
+
+    def _record_error(self, error: Exception, table: Optional[str] = None) -> None:
+        self._stats["errors"] += 1
+        self._stats["last_error"] = f"{table}: {error}" if table else str(error)
+        logger.warning(f"⚠️ Write-behind flush failed{f' for {table}' if table else ''}: {error}")
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # STATS
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            buffered = {t: len(b) for t, b in self._buffers.items() if b}
+            size = self._size
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "buffered": size,
+            "buffered_by_table": buffered,
+            "max_rows": self.max_rows,
+            "batch_rows": self.batch_rows,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            **self._stats,
+        }
+
+
+# Global instance
+_write_behind_queue: Optional[WriteBehindQueue] = None
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """Get or create the global Command Center write-behind queue"""
+    global _write_behind_queue
+    if _write_behind_queue is None:
+        _write_behind_queue = WriteBehindQueue()
+    return _write_behind_queue